@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import Annotated
@@ -10,6 +11,11 @@ from fastapi import Depends, Header, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.apps.admin_api.candidate_access.session_cache import (
+    CACHE_KIND_MAX,
+    CACHE_KIND_WEB,
+    get_candidate_access_session_cache,
+)
 from backend.apps.admin_api.max_auth import validate_max_init_data
 from backend.core.dependencies import get_async_session
 from backend.core.settings import get_settings
@@ -109,6 +115,17 @@ async def get_max_candidate_access_principal(
             message="Candidate access session was not found.",
         )
 
+    provider_user_id = str(validated_init_data.user.user_id)
+    principal_cache = get_candidate_access_session_cache()
+    validated_at = time.time()
+    cached = await principal_cache.get(CACHE_KIND_MAX, session_token)
+    if (
+        cached is not None
+        and cached.principal.provider_user_id == provider_user_id
+        and cached.provider_session_id == str(validated_init_data.query_id).strip()
+    ):
+        return cached.principal
+
     now = _utcnow()
     session_lookup = await session.execute(
         select(CandidateAccessSession).where(
@@ -177,7 +194,6 @@ async def get_max_candidate_access_principal(
             message="Candidate access session does not belong to MAX launch channel.",
         )
 
-    provider_user_id = str(validated_init_data.user.user_id)
     if str(access_session.provider_user_id or "").strip() != provider_user_id:
         _raise_candidate_access_http_error(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -227,7 +243,7 @@ async def get_max_candidate_access_principal(
     journey_session.payload_json = journey_payload
     await session.commit()
 
-    return CandidateAccessPrincipal(
+    principal = CandidateAccessPrincipal(
         candidate_id=access_session.candidate_id,
         application_id=access_session.application_id,
         access_session_id=access_session.id,
@@ -240,6 +256,15 @@ async def get_max_candidate_access_principal(
         journey_session_id=access_session.journey_session_id,
         session_version_snapshot=access_session.session_version_snapshot,
     )
+    await principal_cache.put(
+        CACHE_KIND_MAX,
+        session_token,
+        principal,
+        provider_session_id=access_session.provider_session_id,
+        session_expires_at=access_session.expires_at,
+        validated_at=validated_at,
+    )
+    return principal
 
 
 async def get_web_candidate_access_principal(
@@ -262,6 +287,12 @@ async def get_web_candidate_access_principal(
             message="Candidate access session was not found.",
         )
 
+    principal_cache = get_candidate_access_session_cache()
+    validated_at = time.time()
+    cached = await principal_cache.get(CACHE_KIND_WEB, session_token)
+    if cached is not None:
+        return cached.principal
+
     now = _utcnow()
     session_lookup = await session.execute(
         select(CandidateAccessSession).where(
@@ -367,7 +398,7 @@ async def get_web_candidate_access_principal(
     journey_session.payload_json = journey_payload
     await session.commit()
 
-    return CandidateAccessPrincipal(
+    principal = CandidateAccessPrincipal(
         candidate_id=access_session.candidate_id,
         application_id=access_session.application_id,
         access_session_id=access_session.id,
@@ -380,6 +411,15 @@ async def get_web_candidate_access_principal(
         journey_session_id=access_session.journey_session_id,
         session_version_snapshot=access_session.session_version_snapshot,
     )
+    await principal_cache.put(
+        CACHE_KIND_WEB,
+        session_token,
+        principal,
+        provider_session_id=access_session.provider_session_id,
+        session_expires_at=access_session.expires_at,
+        validated_at=validated_at,
+    )
+    return principal
 
 
 def is_candidate_social_verified(candidate: User | None) -> bool:
@@ -16,10 +16,10 @@ from sqlalchemy.orm import selectinload
 
 from backend.apps.bot.config import (
     PASS_THRESHOLD,
-    TEST2_QUESTIONS,
     TIME_LIMIT,
+    ensure_questions_bank,
+    get_questions,
     get_questions_bank_version,
-    refresh_questions_bank,
 )
 from backend.apps.bot.services.base import calculate_score
 from backend.apps.bot.services.broadcast import (
@@ -587,9 +587,9 @@ def _replace_test2_payload(
     step_state.payload_json = payload
 
 
-def _test2_questions() -> list[dict[str, Any]]:
-    refresh_questions_bank()
-    return list(TEST2_QUESTIONS)
+async def _test2_questions() -> list[dict[str, Any]]:
+    await ensure_questions_bank()
+    return get_questions("test2")
 
 
 def _serialize_test2_attempts(raw_attempts: dict[str, Any] | None) -> dict[str, Any]:
@@ -894,7 +894,7 @@ async def load_candidate_test2_state(
         step_state.status = CandidateJourneyStepStatus.PENDING.value
         await session.flush()
 
-    questions = _test2_questions()
+    questions = await _test2_questions()
     payload = _test2_payload(step_state)
     attempts = _serialize_test2_attempts(payload.get("attempts"))
     current_question_index = _current_test2_question_index(
@@ -949,7 +949,7 @@ async def submit_candidate_test2_answer(
         step_key=TEST2_STEP_KEY,
         step_type="quiz",
     )
-    questions = _test2_questions()
+    questions = await _test2_questions()
     if question_index < 0 or question_index >= len(questions):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Test2 question index.")
 
@@ -0,0 +1,462 @@
+"""Short-lived cache of validated candidate access principals.
+
+Candidate mini-app screens (booking, test2, chat) poll the candidate-access API
+every few seconds, and every call used to re-run the ``CandidateAccessSession``
+lookup, the journey/candidate loads and a commit. A successfully validated
+principal is now kept for ``candidate_access_cache_ttl_seconds``:
+
+- in a small per-process LRU (no I/O on a hit);
+- in Redis, HMAC-signed with the session secret, so other workers share it.
+
+Entries never outlive the access session itself. Anything that can invalidate a
+principal (revocation, expiry, journey ``session_version`` bump, candidate
+deactivation) is picked up by ORM flush hooks; after commit the local entries are
+dropped synchronously, the shared entries are deleted and an invalidation message
+is broadcast so every admin_api worker drops its LRU copy as well.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from backend.core.content_updates import (
+    ContentUpdateEvent,
+    publish_content_update,
+    run_content_updates_subscriber,
+)
+from backend.core.settings import get_settings
+from backend.domain.candidates.models import (
+    CandidateAccessSession,
+    CandidateAccessSessionStatus,
+    CandidateJourneySession,
+    User,
+)
+
+logger = logging.getLogger(__name__)
+
+CANDIDATE_ACCESS_INVALIDATION_CHANNEL = "recruitsmart:candidate_access_invalidations"
+KIND_CANDIDATE_ACCESS_INVALIDATED = "candidate_access_invalidated"
+
+CACHE_KIND_MAX = "max"
+CACHE_KIND_WEB = "web"
+
+DEFAULT_MAX_ENTRIES = 4096
+_REDIS_PREFIX = "candidate_access:principal:"
+_REDIS_CANDIDATE_PREFIX = "candidate_access:candidate:"
+_SIGNING_CONTEXT = b"candidate-access-cache:v1:"
+_SESSION_INFO_KEY = "candidate_access_invalidations"
+
+
+@dataclass(frozen=True)
+class CachedCandidateAccess:
+    principal: Any
+    provider_session_id: str
+    expires_at: float
+    validated_at: float
+
+
+@dataclass
+class CandidateAccessCacheStats:
+    local_hits: int = 0
+    shared_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    rejected_signatures: int = 0
+    invalidations: int = 0
+
+
+def _as_epoch(value: datetime | None) -> float | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
+
+
+def _default_shared_client():
+    try:
+        from backend.core.cache import get_cache
+
+        return get_cache().client
+    except RuntimeError:
+        return None
+
+
+class CandidateAccessSessionCache:
+    """Two-level (process LRU + signed Redis) cache keyed by access-session token."""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: int,
+        secret: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        shared_client_factory: Callable[[], Any] | None = _default_shared_client,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl_seconds = max(0, int(ttl_seconds))
+        self.max_entries = max(1, int(max_entries))
+        self._signing_key = hashlib.sha256(_SIGNING_CONTEXT + secret.encode("utf-8")).digest()
+        self._shared_client_factory = shared_client_factory
+        self._clock = clock
+        self._local: OrderedDict[str, CachedCandidateAccess] = OrderedDict()
+        self._by_candidate: dict[int, set[str]] = {}
+        # candidate_id -> wall-clock time of the last invalidation; used to refuse
+        # principals validated before a revocation that raced with the request.
+        self._invalidated_at: dict[int, float] = {}
+        self.stats = CandidateAccessCacheStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def _cache_key(self, kind: str, token: str) -> str:
+        # Raw session tokens are credentials and never leave the process.
+        return hashlib.sha256(f"{kind}:{token}".encode("utf-8")).hexdigest()
+
+    def _sign(self, body: bytes) -> str:
+        return hmac.new(self._signing_key, body, hashlib.sha256).hexdigest()
+
+    def _shared_client(self):
+        if self._shared_client_factory is None:
+            return None
+        try:
+            return self._shared_client_factory()
+        except Exception:
+            logger.debug("candidate_access_cache.shared_client_unavailable", exc_info=True)
+            return None
+
+    def _is_fresh(self, entry: CachedCandidateAccess, now: float) -> bool:
+        if entry.expires_at <= now:
+            return False
+        candidate_id = int(entry.principal.candidate_id)
+        invalidated_at = self._invalidated_at.get(candidate_id)
+        return invalidated_at is None or entry.validated_at > invalidated_at
+
+    def _remember(self, key: str, entry: CachedCandidateAccess) -> None:
+        self._local[key] = entry
+        self._local.move_to_end(key)
+        self._by_candidate.setdefault(int(entry.principal.candidate_id), set()).add(key)
+        while len(self._local) > self.max_entries:
+            old_key, old_entry = self._local.popitem(last=False)
+            self._forget_index(old_key, old_entry)
+
+    def _forget_index(self, key: str, entry: CachedCandidateAccess) -> None:
+        candidate_id = int(entry.principal.candidate_id)
+        keys = self._by_candidate.get(candidate_id)
+        if keys is None:
+            return
+        keys.discard(key)
+        if not keys:
+            self._by_candidate.pop(candidate_id, None)
+
+    def _drop_local(self, key: str) -> None:
+        entry = self._local.pop(key, None)
+        if entry is not None:
+            self._forget_index(key, entry)
+
+    def _encode(self, entry: CachedCandidateAccess) -> str:
+        body = json.dumps(
+            {
+                "principal": asdict(entry.principal),
+                "provider_session_id": entry.provider_session_id,
+                "expires_at": entry.expires_at,
+                "validated_at": entry.validated_at,
+            },
+            separators=(",", ":"),
+            sort_keys=True,
+        ).encode("utf-8")
+        return f"{self._sign(body)}.{body.decode('utf-8')}"
+
+    def _decode(self, raw: Any) -> CachedCandidateAccess | None:
+        from backend.apps.admin_api.candidate_access.auth import CandidateAccessPrincipal
+
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8", errors="replace")
+        signature, _, body = str(raw or "").partition(".")
+        if not body or not hmac.compare_digest(signature, self._sign(body.encode("utf-8"))):
+            self.stats.rejected_signatures += 1
+            return None
+        try:
+            data = json.loads(body)
+            return CachedCandidateAccess(
+                principal=CandidateAccessPrincipal(**data["principal"]),
+                provider_session_id=str(data.get("provider_session_id") or ""),
+                expires_at=float(data["expires_at"]),
+                validated_at=float(data["validated_at"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    async def get(self, kind: str, token: str) -> CachedCandidateAccess | None:
+        if not self.enabled or not token:
+            return None
+        key = self._cache_key(kind, token)
+        now = self._clock()
+        entry = self._local.get(key)
+        if entry is not None:
+            if self._is_fresh(entry, now):
+                self._local.move_to_end(key)
+                self.stats.local_hits += 1
+                return entry
+            self._drop_local(key)
+
+        client = self._shared_client()
+        if client is not None:
+            try:
+                raw = await client.get(_REDIS_PREFIX + key)
+            except Exception:
+                logger.debug("candidate_access_cache.shared_get_failed", exc_info=True)
+                raw = None
+            if raw is not None:
+                shared = self._decode(raw)
+                if shared is not None and self._is_fresh(shared, now):
+                    self._remember(key, shared)
+                    self.stats.shared_hits += 1
+                    return shared
+        self.stats.misses += 1
+        return None
+
+    async def put(
+        self,
+        kind: str,
+        token: str,
+        principal: Any,
+        *,
+        provider_session_id: str | None,
+        session_expires_at: datetime | None,
+        validated_at: float,
+    ) -> None:
+        if not self.enabled or not token:
+            return
+        session_expiry = _as_epoch(session_expires_at)
+        expires_at = validated_at + self.ttl_seconds
+        if session_expiry is not None:
+            expires_at = min(expires_at, session_expiry)
+        entry = CachedCandidateAccess(
+            principal=principal,
+            provider_session_id=str(provider_session_id or "").strip(),
+            expires_at=expires_at,
+            validated_at=validated_at,
+        )
+        if not self._is_fresh(entry, self._clock()):
+            return
+        key = self._cache_key(kind, token)
+        self._remember(key, entry)
+        self.stats.stores += 1
+
+        client = self._shared_client()
+        if client is None:
+            return
+        ttl_ms = max(1, int((expires_at - validated_at) * 1000))
+        candidate_key = f"{_REDIS_CANDIDATE_PREFIX}{int(principal.candidate_id)}"
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.set(_REDIS_PREFIX + key, self._encode(entry), px=ttl_ms)
+            pipe.sadd(candidate_key, key)
+            pipe.pexpire(candidate_key, self.ttl_seconds * 1000)
+            await pipe.execute()
+        except Exception:
+            logger.debug("candidate_access_cache.shared_put_failed", exc_info=True)
+
+    def invalidate_local(self, candidate_ids: Iterable[int]) -> None:
+        now = self._clock()
+        for candidate_id in {int(value) for value in candidate_ids}:
+            self._invalidated_at[candidate_id] = now
+            for key in list(self._by_candidate.get(candidate_id, ())):
+                self._drop_local(key)
+            self.stats.invalidations += 1
+        # Invalidation marks only matter while a principal could still be cached.
+        horizon = now - max(self.ttl_seconds, 1)
+        if len(self._invalidated_at) > self.max_entries:
+            self._invalidated_at = {
+                cid: at for cid, at in self._invalidated_at.items() if at > horizon
+            }
+
+    async def invalidate_shared(self, candidate_ids: Iterable[int]) -> None:
+        client = self._shared_client()
+        if client is None:
+            return
+        for candidate_id in {int(value) for value in candidate_ids}:
+            candidate_key = f"{_REDIS_CANDIDATE_PREFIX}{candidate_id}"
+            try:
+                members = await client.smembers(candidate_key)
+                keys = [
+                    _REDIS_PREFIX + (m.decode("utf-8") if isinstance(m, bytes) else str(m))
+                    for m in members or ()
+                ]
+                await client.delete(candidate_key, *keys)
+            except Exception:
+                logger.debug(
+                    "candidate_access_cache.shared_invalidate_failed",
+                    exc_info=True,
+                    extra={"candidate_id": candidate_id},
+                )
+
+    def clear(self) -> None:
+        self._local.clear()
+        self._by_candidate.clear()
+        self._invalidated_at.clear()
+
+
+_cache: CandidateAccessSessionCache | None = None
+_cache_config: tuple[int, str] | None = None
+_background_tasks: set[asyncio.Task] = set()
+
+
+def get_candidate_access_session_cache() -> CandidateAccessSessionCache:
+    """Return the process-wide cache configured from the current settings."""
+    global _cache, _cache_config
+    settings = get_settings()
+    config = (
+        int(getattr(settings, "candidate_access_cache_ttl_seconds", 0) or 0),
+        str(getattr(settings, "session_secret", "") or ""),
+    )
+    if _cache is None or _cache_config != config:
+        _cache = CandidateAccessSessionCache(ttl_seconds=config[0], secret=config[1])
+        _cache_config = config
+    return _cache
+
+
+async def invalidate_candidate_access(candidate_ids: Iterable[int]) -> None:
+    """Drop cached principals of ``candidate_ids`` everywhere (best effort beyond this process)."""
+    ids = sorted({int(value) for value in candidate_ids})
+    if not ids:
+        return
+    cache = get_candidate_access_session_cache()
+    cache.invalidate_local(ids)
+    await cache.invalidate_shared(ids)
+    await publish_content_update(
+        KIND_CANDIDATE_ACCESS_INVALIDATED,
+        {"candidate_ids": ids},
+        channel=CANDIDATE_ACCESS_INVALIDATION_CHANNEL,
+    )
+
+
+def _track_background(coro) -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        coro.close()
+        return
+    task = loop.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _attr_changed(obj: Any, name: str) -> bool:
+    return inspect(obj).attrs[name].history.has_changes()
+
+
+def _collect_invalidations(session: Session, flush_context, instances) -> None:
+    affected: set[int] = session.info.setdefault(_SESSION_INFO_KEY, set())
+    for obj in session.dirty:
+        if isinstance(obj, CandidateAccessSession):
+            if (
+                _attr_changed(obj, "status")
+                and obj.status != CandidateAccessSessionStatus.ACTIVE.value
+            ) or (_attr_changed(obj, "revoked_at") and obj.revoked_at is not None):
+                affected.add(int(obj.candidate_id))
+        elif isinstance(obj, CandidateJourneySession):
+            if _attr_changed(obj, "session_version"):
+                affected.add(int(obj.candidate_id))
+        elif isinstance(obj, User):
+            if _attr_changed(obj, "is_active") and not obj.is_active:
+                affected.add(int(obj.id))
+    for obj in session.deleted:
+        if isinstance(obj, (CandidateAccessSession, CandidateJourneySession)):
+            affected.add(int(obj.candidate_id))
+        elif isinstance(obj, User) and obj.id is not None:
+            affected.add(int(obj.id))
+    if not affected:
+        session.info.pop(_SESSION_INFO_KEY, None)
+
+
+def _apply_invalidations(session: Session) -> None:
+    affected = session.info.pop(_SESSION_INFO_KEY, None)
+    if not affected:
+        return
+    # Local drop happens before control returns to the committing caller; the
+    # shared delete and broadcast follow on the running loop.
+    get_candidate_access_session_cache().invalidate_local(affected)
+    _track_background(invalidate_candidate_access(affected))
+
+
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_SESSION_INFO_KEY, None)
+
+
+def install_candidate_access_invalidation_hooks() -> None:
+    """Register ORM hooks that invalidate cached principals on commit (idempotent)."""
+    if event.contains(Session, "before_flush", _collect_invalidations):
+        return
+    event.listen(Session, "before_flush", _collect_invalidations)
+    event.listen(Session, "after_commit", _apply_invalidations)
+    event.listen(Session, "after_rollback", _discard_invalidations)
+
+
+async def _apply_invalidation_event(event_: ContentUpdateEvent) -> None:
+    if event_.kind != KIND_CANDIDATE_ACCESS_INVALIDATED:
+        return
+    try:
+        ids = [int(value) for value in event_.payload.get("candidate_ids") or ()]
+    except (TypeError, ValueError):
+        return
+    cache = get_candidate_access_session_cache()
+    cache.invalidate_local(ids)
+    # The publisher may run without a shared cache client (admin_ui).
+    await cache.invalidate_shared(ids)
+
+
+async def run_candidate_access_invalidation_listener(
+    *,
+    redis_url: str,
+    stop_event: asyncio.Event,
+    retry_delay_seconds: float = 5.0,
+) -> None:
+    """Apply invalidation broadcasts from other processes until ``stop_event`` is set."""
+    while not stop_event.is_set():
+        try:
+            await run_content_updates_subscriber(
+                redis_url=redis_url,
+                stop_event=stop_event,
+                on_event=_apply_invalidation_event,
+                channel=CANDIDATE_ACCESS_INVALIDATION_CHANNEL,
+            )
+        except Exception:
+            logger.warning("candidate_access_cache.listener_failed", exc_info=True)
+        if stop_event.is_set():
+            break
+        # Broadcasts sent while disconnected are lost; start from an empty LRU.
+        get_candidate_access_session_cache().clear()
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=retry_delay_seconds)
+        except asyncio.TimeoutError:
+            pass
+
+
+__all__ = [
+    "CACHE_KIND_MAX",
+    "CACHE_KIND_WEB",
+    "CANDIDATE_ACCESS_INVALIDATION_CHANNEL",
+    "CachedCandidateAccess",
+    "CandidateAccessCacheStats",
+    "CandidateAccessSessionCache",
+    "get_candidate_access_session_cache",
+    "install_candidate_access_invalidation_hooks",
+    "invalidate_candidate_access",
+    "run_candidate_access_invalidation_listener",
+]
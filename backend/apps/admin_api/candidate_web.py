@@ -5,9 +5,7 @@ from __future__ import annotations
 import hashlib
 import os
 import re
-import time
 import uuid
-from collections import defaultdict, deque
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Annotated, Any
@@ -103,6 +101,7 @@ from backend.apps.admin_api.candidate_access.router import (
 )
 from backend.apps.admin_api.max_launch import _sqlite_next_pk
 from backend.core.dependencies import get_async_session
+from backend.core.rate_limit import RateLimit, RateLimitScope, get_rate_limiter
 from backend.core.settings import Settings, get_settings
 from backend.domain.candidates.journey import append_journey_event
 from backend.domain.candidates.max_launch_invites import (
@@ -180,8 +179,11 @@ BOOTSTRAP_RATE_LIMIT_WINDOW_SECONDS = 60
 BOOTSTRAP_RATE_LIMIT_MAX_ATTEMPTS = 20
 MUTATION_RATE_LIMIT_WINDOW_SECONDS = 60
 MUTATION_RATE_LIMIT_MAX_ATTEMPTS = 30
-_bootstrap_attempts: dict[str, deque[float]] = defaultdict(deque)
-_mutation_attempts: dict[str, deque[float]] = defaultdict(deque)
+# Shared (Redis) budgets per scope; a request must fit all of its scopes.
+BOOTSTRAP_IP_RATE_LIMIT = RateLimit(BOOTSTRAP_RATE_LIMIT_MAX_ATTEMPTS, BOOTSTRAP_RATE_LIMIT_WINDOW_SECONDS)
+BOOTSTRAP_CAMPAIGN_RATE_LIMIT = RateLimit(600, BOOTSTRAP_RATE_LIMIT_WINDOW_SECONDS)
+MUTATION_SESSION_RATE_LIMIT = RateLimit(MUTATION_RATE_LIMIT_MAX_ATTEMPTS, MUTATION_RATE_LIMIT_WINDOW_SECONDS)
+MUTATION_IP_RATE_LIMIT = RateLimit(10 * MUTATION_RATE_LIMIT_MAX_ATTEMPTS, MUTATION_RATE_LIMIT_WINDOW_SECONDS)
 
 
 class CandidateWebBootstrapRequest(BaseModel):
@@ -317,10 +319,12 @@ def _raise_candidate_web_http_error(
     status_code: int,
     code: str,
     message: str,
+    headers: dict[str, str] | None = None,
 ) -> None:
     raise HTTPException(
         status_code=status_code,
         detail={"code": code, "message": message},
+        headers=headers,
     )
 
 
@@ -367,56 +371,56 @@ def _bootstrap_rate_limit_key(request: Request) -> str:
     return request.client.host if request.client else "unknown"
 
 
-def _mutation_rate_limit_key(request: Request) -> str:
-    ip_key = _bootstrap_rate_limit_key(request)
+def _session_rate_limit_key(request: Request) -> str:
     session_token = str(request.headers.get(CANDIDATE_ACCESS_SESSION_HEADER, "") or "").strip()
-    session_key = hashlib.sha256(session_token.encode("utf-8")).hexdigest()[:16] if session_token else "missing"
-    return f"{ip_key}:{session_key}"
+    return hashlib.sha256(session_token.encode("utf-8")).hexdigest()[:16] if session_token else "missing"
 
 
-def _enforce_rate_limit_bucket(
+async def _enforce_rate_limit(
     *,
-    attempts: dict[str, deque[float]],
-    key: str,
-    max_attempts: int,
-    window_seconds: int,
+    namespace: str,
+    scopes: list[RateLimitScope],
     code: str,
     message: str,
 ) -> None:
-    now = time.monotonic()
-    bucket = attempts[key]
-    while bucket and now - bucket[0] > window_seconds:
-        bucket.popleft()
-    if len(bucket) >= max_attempts:
+    decision = await get_rate_limiter().check(namespace, scopes)
+    if not decision.allowed:
         _raise_candidate_web_http_error(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             code=code,
             message=message,
+            headers={"Retry-After": str(decision.retry_after_seconds)},
         )
-    bucket.append(now)
 
 
-def _enforce_bootstrap_rate_limit(request: Request, settings: Settings) -> None:
+async def _enforce_bootstrap_rate_limit(
+    request: Request,
+    settings: Settings,
+    *,
+    campaign: str | None = None,
+) -> None:
     if not getattr(settings, "rate_limit_enabled", False):
         return
-    _enforce_rate_limit_bucket(
-        attempts=_bootstrap_attempts,
-        key=_bootstrap_rate_limit_key(request),
-        max_attempts=BOOTSTRAP_RATE_LIMIT_MAX_ATTEMPTS,
-        window_seconds=BOOTSTRAP_RATE_LIMIT_WINDOW_SECONDS,
+    await _enforce_rate_limit(
+        namespace="candidate_web:bootstrap",
+        scopes=[
+            RateLimitScope("ip", _bootstrap_rate_limit_key(request), BOOTSTRAP_IP_RATE_LIMIT),
+            RateLimitScope("campaign", campaign or "", BOOTSTRAP_CAMPAIGN_RATE_LIMIT),
+        ],
         code="rate_limited",
         message="Too many candidate link attempts. Try again later.",
     )
 
 
-def _enforce_mutation_rate_limit(request: Request, settings: Settings) -> None:
+async def _enforce_mutation_rate_limit(request: Request, settings: Settings) -> None:
     if not getattr(settings, "rate_limit_enabled", False):
         return
-    _enforce_rate_limit_bucket(
-        attempts=_mutation_attempts,
-        key=_mutation_rate_limit_key(request),
-        max_attempts=MUTATION_RATE_LIMIT_MAX_ATTEMPTS,
-        window_seconds=MUTATION_RATE_LIMIT_WINDOW_SECONDS,
+    await _enforce_rate_limit(
+        namespace="candidate_web:mutation",
+        scopes=[
+            RateLimitScope("ip", _bootstrap_rate_limit_key(request), MUTATION_IP_RATE_LIMIT),
+            RateLimitScope("session", _session_rate_limit_key(request), MUTATION_SESSION_RATE_LIMIT),
+        ],
         code="rate_limited",
         message="Too many candidate actions. Try again later.",
     )
@@ -1273,7 +1277,7 @@ async def _start_public_provider_verification(
     session: AsyncSession,
     settings: Settings,
 ) -> tuple[CandidateWebCampaign, Any]:
-    _enforce_bootstrap_rate_limit(http_request, settings)
+    await _enforce_bootstrap_rate_limit(http_request, settings, campaign=normalize_campaign_slug(slug))
     provider_value = normalize_public_provider(provider)
     async with session.begin():
         campaign = await _ensure_public_campaign_available(
@@ -1413,7 +1417,7 @@ async def get_public_candidate_verification_status(
             code="public_intake_disabled",
             message="Public candidate intake is disabled.",
         )
-    _enforce_bootstrap_rate_limit(http_request, settings)
+    await _enforce_bootstrap_rate_limit(http_request, settings)
     poll_hash = hash_public_token(str(poll_token or "").strip())
     async with session.begin():
         intake = await session.scalar(
@@ -1483,7 +1487,7 @@ async def locally_confirm_public_candidate_verification(
             code="public_intake_disabled",
             message="Public candidate intake is disabled.",
         )
-    _enforce_bootstrap_rate_limit(http_request, settings)
+    await _enforce_bootstrap_rate_limit(http_request, settings)
     provider = normalize_public_provider(request.provider)
     if provider not in {PUBLIC_PROVIDER_TELEGRAM, PUBLIC_PROVIDER_MAX, PUBLIC_PROVIDER_HH}:
         _raise_candidate_web_http_error(
@@ -1611,7 +1615,7 @@ async def exchange_public_candidate_session(
             code="public_intake_disabled",
             message="Public candidate intake is disabled.",
         )
-    _enforce_bootstrap_rate_limit(http_request, settings)
+    await _enforce_bootstrap_rate_limit(http_request, settings)
     handoff_hash = hash_public_token(str(request.handoff_code or "").strip())
     async with session.begin():
         intake = await session.scalar(
@@ -1710,7 +1714,7 @@ async def bootstrap_candidate_web(
             code="candidate_web_disabled",
             message="Browser candidate pilot is disabled.",
         )
-    _enforce_bootstrap_rate_limit(http_request, settings)
+    await _enforce_bootstrap_rate_limit(http_request, settings)
     async with session.begin():
         candidate, token, journey_session, access_session, reused = await _bootstrap_browser_candidate(
             session,
@@ -1768,7 +1772,7 @@ async def start_candidate_web_telegram_verification(
     session: Annotated[AsyncSession, Depends(get_async_session)],
     settings: Annotated[Settings, Depends(get_settings)],
 ) -> CandidateVerificationResponse:
-    _enforce_mutation_rate_limit(http_request, settings)
+    await _enforce_mutation_rate_limit(http_request, settings)
     candidate = await _load_candidate_or_raise(session, int(principal.candidate_id))
     if is_candidate_social_verified(candidate):
         return await _build_verification_response(candidate, session=session, settings=settings)
@@ -1796,7 +1800,7 @@ async def start_candidate_web_max_verification(
     session: Annotated[AsyncSession, Depends(get_async_session)],
     settings: Annotated[Settings, Depends(get_settings)],
 ) -> CandidateVerificationResponse:
-    _enforce_mutation_rate_limit(http_request, settings)
+    await _enforce_mutation_rate_limit(http_request, settings)
     candidate = await _load_candidate_or_raise(session, int(principal.candidate_id))
     if is_candidate_social_verified(candidate):
         return await _build_verification_response(candidate, session=session, settings=settings)
@@ -1830,7 +1834,7 @@ async def start_candidate_web_hh_verification(
     session: Annotated[AsyncSession, Depends(get_async_session)],
     settings: Annotated[Settings, Depends(get_settings)],
 ) -> CandidateVerificationResponse:
-    _enforce_mutation_rate_limit(http_request, settings)
+    await _enforce_mutation_rate_limit(http_request, settings)
     candidate = await _load_candidate_or_raise(session, int(principal.candidate_id))
     if await is_candidate_hh_verified(session, int(candidate.id)):
         return await _build_verification_response(candidate, session=session, settings=settings)
@@ -1987,7 +1991,7 @@ async def locally_confirm_candidate_web_telegram_verification(
             code="local_verification_disabled",
             message="Local verification is disabled.",
         )
-    _enforce_mutation_rate_limit(http_request, settings)
+    await _enforce_mutation_rate_limit(http_request, settings)
     candidate = await _load_candidate_or_raise(session, int(principal.candidate_id))
     if not is_candidate_social_verified(candidate):
         invite = await ensure_candidate_invite_token(
@@ -2021,7 +2025,7 @@ async def locally_confirm_candidate_web_max_verification(
             code="local_verification_disabled",
             message="Local verification is disabled.",
         )
-    _enforce_mutation_rate_limit(http_request, settings)
+    await _enforce_mutation_rate_limit(http_request, settings)
     candidate = await _load_candidate_or_raise(session, int(principal.candidate_id))
     if not is_candidate_social_verified(candidate):
         try:
@@ -2063,7 +2067,7 @@ async def locally_confirm_candidate_web_hh_verification(
             code="local_verification_disabled",
             message="Local verification is disabled.",
         )
-    _enforce_mutation_rate_limit(http_request, settings)
+    await _enforce_mutation_rate_limit(http_request, settings)
     candidate = await _load_candidate_or_raise(session, int(principal.candidate_id))
     try:
         result = await upsert_candidate_hh_identity(
@@ -2122,7 +2126,7 @@ async def save_candidate_web_booking_context(
     session: Annotated[AsyncSession, Depends(get_async_session)],
     settings: Annotated[Settings, Depends(get_settings)],
 ) -> CandidateBookingContextInfo:
-    _enforce_mutation_rate_limit(http_request, settings)
+    await _enforce_mutation_rate_limit(http_request, settings)
     await _ensure_candidate_web_booking_ready(principal, session)
     return await _shared_save_booking_context(request, principal, session)
 
@@ -2135,7 +2139,7 @@ async def save_candidate_web_manual_availability(
     session: Annotated[AsyncSession, Depends(get_async_session)],
     settings: Annotated[Settings, Depends(get_settings)],
 ) -> CandidateManualAvailabilityResponse:
-    _enforce_mutation_rate_limit(http_request, settings)
+    await _enforce_mutation_rate_limit(http_request, settings)
     await _ensure_candidate_web_booking_ready(principal, session)
     return await _shared_save_manual_availability(request, principal, session)
 
@@ -2157,7 +2161,7 @@ async def save_candidate_web_test1_answers(
     session: Annotated[AsyncSession, Depends(get_async_session)],
     settings: Annotated[Settings, Depends(get_settings)],
 ) -> CandidateTest1Response:
-    _enforce_mutation_rate_limit(http_request, settings)
+    await _enforce_mutation_rate_limit(http_request, settings)
     await _ensure_candidate_web_test_access(principal, session)
     return await _shared_save_test1_answers(request, principal, session)
 
@@ -2169,7 +2173,7 @@ async def complete_candidate_web_test1(
     session: Annotated[AsyncSession, Depends(get_async_session)],
     settings: Annotated[Settings, Depends(get_settings)],
 ) -> CandidateTest1Response:
-    _enforce_mutation_rate_limit(http_request, settings)
+    await _enforce_mutation_rate_limit(http_request, settings)
     await _ensure_candidate_web_test_access(principal, session)
     return await _shared_complete_test1(principal, session)
 
@@ -2190,7 +2194,7 @@ async def submit_candidate_web_test2_answer(
     session: Annotated[AsyncSession, Depends(get_async_session)],
     settings: Annotated[Settings, Depends(get_settings)],
 ) -> CandidateTest2Response:
-    _enforce_mutation_rate_limit(http_request, settings)
+    await _enforce_mutation_rate_limit(http_request, settings)
     return await _shared_submit_test2_answer(request, principal, session)
 
 
@@ -2209,7 +2213,7 @@ async def confirm_candidate_web_intro_day(
     session: Annotated[AsyncSession, Depends(get_async_session)],
     settings: Annotated[Settings, Depends(get_settings)],
 ) -> CandidateIntroDayResponse:
-    _enforce_mutation_rate_limit(http_request, settings)
+    await _enforce_mutation_rate_limit(http_request, settings)
     return await _shared_confirm_intro_day(principal, session)
 
 
@@ -2240,7 +2244,7 @@ async def create_candidate_web_booking(
     session: Annotated[AsyncSession, Depends(get_async_session)],
     settings: Annotated[Settings, Depends(get_settings)],
 ) -> BookingInfo:
-    _enforce_mutation_rate_limit(http_request, settings)
+    await _enforce_mutation_rate_limit(http_request, settings)
     await _ensure_candidate_web_booking_ready(principal, session)
     return await _shared_create_booking(request, principal, session)
 
@@ -2253,7 +2257,7 @@ async def confirm_candidate_web_booking(
     session: Annotated[AsyncSession, Depends(get_async_session)],
     settings: Annotated[Settings, Depends(get_settings)],
 ) -> BookingInfo:
-    _enforce_mutation_rate_limit(http_request, settings)
+    await _enforce_mutation_rate_limit(http_request, settings)
     await _ensure_candidate_web_booking_ready(principal, session)
     return await _shared_confirm_booking(booking_id, principal, session)
 
@@ -2267,7 +2271,7 @@ async def reschedule_candidate_web_booking(
     session: Annotated[AsyncSession, Depends(get_async_session)],
     settings: Annotated[Settings, Depends(get_settings)],
 ) -> BookingInfo:
-    _enforce_mutation_rate_limit(http_request, settings)
+    await _enforce_mutation_rate_limit(http_request, settings)
     await _ensure_candidate_web_booking_ready(principal, session)
     return await _shared_reschedule_booking(booking_id, request, principal, session)
 
@@ -2281,7 +2285,7 @@ async def cancel_candidate_web_booking(
     session: Annotated[AsyncSession, Depends(get_async_session)],
     settings: Annotated[Settings, Depends(get_settings)],
 ):
-    _enforce_mutation_rate_limit(http_request, settings)
+    await _enforce_mutation_rate_limit(http_request, settings)
     await _ensure_candidate_web_booking_ready(principal, session)
     return await _shared_cancel_booking(booking_id, request, principal, session)
 
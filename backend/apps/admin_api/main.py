@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import time
 from contextlib import asynccontextmanager
@@ -17,6 +18,10 @@ from backend.apps.admin_api.admin import mount_admin
 from backend.apps.admin_api.candidate_access.router import (
     router as candidate_access_router,
 )
+from backend.apps.admin_api.candidate_access.session_cache import (
+    install_candidate_access_invalidation_hooks,
+    run_candidate_access_invalidation_listener,
+)
 from backend.apps.admin_api.candidate_web import (
     api_router as candidate_web_api_router,
 )
@@ -27,7 +32,9 @@ from backend.apps.admin_api.hh_integration import router as hh_integration_route
 from backend.apps.admin_api.hh_sync import router as hh_sync_router
 from backend.apps.admin_api.max_launch import router as max_launch_router
 from backend.apps.admin_api.max_miniapp import router as max_miniapp_router
+from backend.apps.admin_api.max_webhook import dispatch_max_update
 from backend.apps.admin_api.max_webhook import router as max_webhook_router
+from backend.apps.admin_api.max_webhook_worker import MaxWebhookIngestWorker
 from backend.apps.admin_api.slot_assignments import router as slot_assignments_router
 from backend.apps.admin_api.webapp.recruiter_routers import (
     router as recruiter_webapp_router,
@@ -52,6 +59,14 @@ from backend.core.messenger.max_recovery import MaxDeliveryRecoveryWorker
 from backend.core.messenger.protocol import MessengerPlatform
 from backend.core.messenger.registry import unregister_adapter
 from backend.core.settings import get_settings
+from backend.domain.analytics_buffer import (
+    analytics_buffer_config_from_settings,
+    start_analytics_buffer,
+    stop_analytics_buffer,
+)
+from backend.core.table_versions import install_table_version_hooks
+from backend.domain.kpi_counters import install_kpi_counter_hooks
+from backend.domain.max_webhook_inbox import max_webhook_queue_snapshot
 
 logger = logging.getLogger(__name__)
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
@@ -111,7 +126,20 @@ async def lifespan(app: FastAPI):
 
     max_adapter = None
     recovery_worker = None
+    webhook_worker = None
+    invalidation_stop = asyncio.Event()
+    invalidation_task = None
     try:
+        if settings.analytics_buffer_enabled:
+            start_analytics_buffer(analytics_buffer_config_from_settings(settings))
+        if redis_url and settings.candidate_access_cache_ttl_seconds > 0:
+            invalidation_task = asyncio.create_task(
+                run_candidate_access_invalidation_listener(
+                    redis_url=redis_url,
+                    stop_event=invalidation_stop,
+                ),
+                name="candidate_access_invalidations",
+            )
         try:
             max_adapter = await ensure_max_adapter(settings=settings)
         except Exception:
@@ -120,8 +148,25 @@ async def lifespan(app: FastAPI):
             recovery_worker = MaxDeliveryRecoveryWorker(settings=settings)
             recovery_worker.start()
             app.state.max_delivery_recovery_worker = recovery_worker
+        if settings.max_webhook_ingest_mode == "queue":
+            webhook_worker = MaxWebhookIngestWorker(settings=settings, handler=dispatch_max_update)
+            webhook_worker.start()
+            app.state.max_webhook_worker = webhook_worker
         yield
     finally:
+        if webhook_worker is not None:
+            try:
+                await webhook_worker.shutdown()
+            except Exception:
+                logger.debug("admin_api.max_webhook_worker_shutdown_error", exc_info=True)
+            app.state.max_webhook_worker = None
+        if invalidation_task is not None:
+            invalidation_stop.set()
+            try:
+                await asyncio.wait_for(invalidation_task, timeout=5)
+            except Exception:
+                invalidation_task.cancel()
+                logger.debug("admin_api.candidate_access_invalidations_stop_error", exc_info=True)
         if recovery_worker is not None:
             try:
                 await recovery_worker.shutdown()
@@ -133,6 +178,10 @@ async def lifespan(app: FastAPI):
             except Exception:
                 logger.debug("admin_api.max_adapter_close_error", exc_info=True)
             unregister_adapter(MessengerPlatform.MAX)
+        try:
+            await stop_analytics_buffer()
+        except Exception:
+            logger.debug("admin_api.analytics_buffer_stop_error", exc_info=True)
         # Disconnect cache
         try:
             await disconnect_cache()
@@ -143,6 +192,9 @@ async def lifespan(app: FastAPI):
 def create_app() -> FastAPI:
     settings = get_settings()
     configure_logging(settings)
+    install_candidate_access_invalidation_hooks()
+    install_kpi_counter_hooks()
+    install_table_version_hooks()
     app = FastAPI(title="TG Bot Admin API", lifespan=lifespan)
     assets_dir = SPA_DIST_DIR / "assets"
     if assets_dir.exists():
@@ -272,6 +324,16 @@ def create_app() -> FastAPI:
                 "note": "Redis is not configured",
             }
 
+        if current_settings.max_webhook_ingest_mode == "queue":
+            try:
+                queue_component: dict[str, Any] = {"status": "up", **await max_webhook_queue_snapshot()}
+            except Exception:
+                queue_component = {"status": "down", "error": "queue_unavailable"}
+            worker = getattr(app.state, "max_webhook_worker", None)
+            if worker is not None:
+                queue_component.update(worker.lag_snapshot())
+            components["max_webhook_queue"] = queue_component
+
         payload = {
             "status": overall_status,
             "timestamp": datetime.now(UTC).isoformat(),
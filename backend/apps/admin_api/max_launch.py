@@ -10,13 +10,15 @@ from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, Field
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.apps.admin_api.max_auth import MaxInitData, validate_max_init_data
+from backend.apps.admin_ui.security import get_client_ip
 from backend.core.dependencies import get_async_session
+from backend.core.rate_limit import RateLimit, RateLimitScope, get_rate_limiter
 from backend.core.settings import Settings, get_settings
 from backend.domain.applications import ApplicationEventType
 from backend.domain.applications.idempotency import (
@@ -50,6 +52,9 @@ router = APIRouter(tags=["max"])
 
 MAX_START_PARAM_RE = re.compile(r"^[A-Za-z0-9_-]{1,512}$")
 MAX_ACCESS_SESSION_IDLE_TTL = timedelta(hours=8)
+# Shared (Redis) launch budgets: per client IP and per start_param (invite/intake link).
+LAUNCH_IP_RATE_LIMIT = RateLimit(30, 60)
+LAUNCH_START_PARAM_RATE_LIMIT = RateLimit(300, 60)
 _ACTIVE_REPEAT_BLOCKING_CANDIDATE_STATUSES = {
     CandidateStatus.SLOT_PENDING,
     CandidateStatus.INTERVIEW_SCHEDULED,
@@ -987,9 +992,32 @@ def _raise_max_http_error(
     )
 
 
+async def _enforce_launch_rate_limit(
+    http_request: Request,
+    request: MaxLaunchRequest,
+    settings: Settings,
+) -> None:
+    if not getattr(settings, "rate_limit_enabled", False):
+        return
+    decision = await get_rate_limiter().check(
+        "max:launch",
+        [
+            RateLimitScope("ip", get_client_ip(http_request), LAUNCH_IP_RATE_LIMIT),
+            RateLimitScope("start_param", str(request.start_param or "").strip(), LAUNCH_START_PARAM_RATE_LIMIT),
+        ],
+    )
+    if not decision.allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={"code": "rate_limited", "message": "Too many MAX launch attempts. Try again later."},
+            headers={"Retry-After": str(decision.retry_after_seconds)},
+        )
+
+
 @router.post("/launch", response_model=MaxLaunchResponse)
 async def launch_max_miniapp(
     request: MaxLaunchRequest,
+    http_request: Request,
     session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> MaxLaunchResponse:
     settings = get_settings()
@@ -999,6 +1027,7 @@ async def launch_max_miniapp(
             code="max_adapter_disabled",
             message="MAX adapter is disabled.",
         )
+    await _enforce_launch_rate_limit(http_request, request, settings)
     max_bot_token = str(getattr(settings, "max_bot_token", "") or "").strip()
     if not max_bot_token:
         _raise_max_http_error(
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import hashlib
 import hmac
+import json
 import logging
 from datetime import UTC, datetime
 from typing import Annotated, Any
@@ -23,6 +25,7 @@ from backend.apps.admin_api.max_candidate_chat import (
     wants_max_chat_handoff,
 )
 from backend.apps.admin_api.max_launch import MaxLaunchError
+from backend.apps.admin_api.max_webhook_worker import MAX_WEBHOOK_UPDATES_TOTAL
 from backend.apps.bot.services.broadcast import notify_recruiters_manual_availability
 from backend.apps.bot.services.slot_flow import _parse_manual_availability_window
 from backend.core.db import async_session
@@ -51,19 +54,24 @@ from backend.domain.idempotency import (
     max_bot_started_session_id,
     max_webhook_inbound_message_key,
     max_webhook_outbound_key,
+    max_webhook_update_key_for,
 )
+from backend.domain.max_webhook_inbox import enqueue_max_webhook_update
 from backend.domain.repositories import find_city_by_plain_name, register_callback
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["max"])
 
+SUPPORTED_UPDATE_TYPES = frozenset({"bot_started", "message_created", "message_callback"})
+
 
 class MaxWebhookAck(BaseModel):
     ok: bool = True
     handled: bool = True
     update_type: str | None = None
     duplicate: bool = False
+    queued: bool = False
     ignored_reason: str | None = None
 
 
@@ -803,6 +811,65 @@ async def _handle_message_callback(payload: dict[str, Any], *, settings: Setting
     return MaxWebhookAck(update_type="message_callback")
 
 
+def max_webhook_update_key(payload: dict[str, Any]) -> str:
+    """Stable dedup key of a raw update; MAX redeliveries map to the same key."""
+    update_type = _update_type(payload) or "unknown"
+    if update_type == "message_created":
+        _, provider_message_id = _extract_message(payload)
+        if provider_message_id:
+            return max_webhook_update_key_for(update_type, provider_message_id)
+    elif update_type == "message_callback":
+        callback_id, _ = _extract_callback(payload)
+        if callback_id:
+            return max_webhook_update_key_for(update_type, callback_id)
+    elif update_type == "bot_started":
+        return max_webhook_update_key_for(
+            update_type,
+            _extract_user_id(payload),
+            payload.get("timestamp"),
+            payload.get("payload"),
+        )
+    fingerprint = hashlib.sha256(
+        json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str).encode(
+            "utf-8"
+        )
+    ).hexdigest()
+    return max_webhook_update_key_for(update_type, fingerprint)
+
+
+async def dispatch_max_update(payload: dict[str, Any], settings: Settings) -> MaxWebhookAck:
+    update_type = _update_type(payload)
+    if update_type == "bot_started":
+        return await _handle_bot_started(payload, settings=settings)
+    if update_type == "message_created":
+        return await _handle_message_created(payload, settings=settings)
+    if update_type == "message_callback":
+        return await _handle_message_callback(payload, settings=settings)
+    return MaxWebhookAck(
+        handled=False,
+        update_type=update_type or None,
+        ignored_reason="unsupported_update_type",
+    )
+
+
+async def _enqueue_max_update(request: Request, payload: dict[str, Any]) -> MaxWebhookAck:
+    update_type = _update_type(payload)
+    update_id = await enqueue_max_webhook_update(
+        update_key=max_webhook_update_key(payload),
+        update_type=update_type,
+        max_user_id=_extract_user_id(payload),
+        payload=payload,
+    )
+    if update_id is None:
+        MAX_WEBHOOK_UPDATES_TOTAL.labels(outcome="duplicate").inc()
+        return MaxWebhookAck(update_type=update_type, duplicate=True, queued=True)
+    MAX_WEBHOOK_UPDATES_TOTAL.labels(outcome="enqueued").inc()
+    worker = getattr(request.app.state, "max_webhook_worker", None)
+    if worker is not None:
+        worker.wake()
+    return MaxWebhookAck(update_type=update_type, queued=True)
+
+
 @router.post(
     "/webhook",
     response_model=MaxWebhookAck,
@@ -820,17 +887,15 @@ async def receive_max_webhook(
         )
 
     update_type = _update_type(payload)
-    if update_type == "bot_started":
-        return await _handle_bot_started(payload, settings=settings)
-    if update_type == "message_created":
-        return await _handle_message_created(payload, settings=settings)
-    if update_type == "message_callback":
-        return await _handle_message_callback(payload, settings=settings)
-    return MaxWebhookAck(
-        handled=False,
-        update_type=update_type or None,
-        ignored_reason="unsupported_update_type",
-    )
+    if update_type not in SUPPORTED_UPDATE_TYPES:
+        return MaxWebhookAck(
+            handled=False,
+            update_type=update_type or None,
+            ignored_reason="unsupported_update_type",
+        )
+    if getattr(settings, "max_webhook_ingest_mode", "inline") == "queue":
+        return await _enqueue_max_update(request, payload)
+    return await dispatch_max_update(payload, settings)
 
 
-__all__ = ["router", "receive_max_webhook"]
+__all__ = ["router", "receive_max_webhook", "dispatch_max_update", "max_webhook_update_key"]
@@ -0,0 +1,206 @@
+"""Worker pool draining the durable MAX webhook inbox."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from collections import deque
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from prometheus_client import Counter, Histogram
+
+from backend.core.messenger.max_recovery import compute_max_delivery_next_retry_at
+from backend.core.settings import Settings
+from backend.domain.max_webhook_inbox import (
+    ClaimedMaxWebhookUpdate,
+    claim_max_webhook_updates,
+    mark_max_webhook_update_failed,
+    mark_max_webhook_update_processed,
+)
+
+logger = logging.getLogger(__name__)
+
+MaxUpdateHandler = Callable[[dict[str, Any], Settings], Awaitable[Any]]
+
+MAX_WEBHOOK_UPDATES_TOTAL = Counter(
+    "max_webhook_updates_total",
+    "MAX webhook updates seen by the ingest queue, by outcome.",
+    labelnames=("outcome",),
+)
+MAX_WEBHOOK_INGEST_LAG_SECONDS = Histogram(
+    "max_webhook_ingest_lag_seconds",
+    "Time from webhook ingest to processed update.",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0),
+)
+
+
+@dataclass(frozen=True)
+class MaxWebhookWorkerConfig:
+    concurrency: int
+    batch_size: int
+    poll_interval: float
+    lock_timeout_seconds: int
+    max_attempts: int
+    retry_base_seconds: int
+    retry_max_seconds: int
+
+
+class _LagWindow:
+    def __init__(self, *, max_samples: int = 1024) -> None:
+        self._samples: deque[float] = deque(maxlen=max_samples)
+
+    def record(self, value: float) -> None:
+        self._samples.append(value)
+
+    def snapshot(self) -> dict[str, float]:
+        values = sorted(self._samples)
+        if not values:
+            return {"lag_p50_seconds": 0.0, "lag_p95_seconds": 0.0, "lag_max_seconds": 0.0}
+
+        def _nearest_rank(q: float) -> float:
+            return values[max(0, min(len(values) - 1, int(math.ceil(q * len(values))) - 1))]
+
+        return {
+            "lag_p50_seconds": round(_nearest_rank(0.5), 4),
+            "lag_p95_seconds": round(_nearest_rank(0.95), 4),
+            "lag_max_seconds": round(values[-1], 4),
+        }
+
+
+class MaxWebhookIngestWorker:
+    """Process queued MAX updates with bounded concurrency and per-user ordering.
+
+    Ordering is enforced by the claim query (only the oldest unfinished update of a
+    user is claimable), so a claimed batch never holds two updates of one user and
+    can be processed fully in parallel.
+    """
+
+    def __init__(
+        self,
+        *,
+        settings: Settings,
+        handler: MaxUpdateHandler,
+        config: MaxWebhookWorkerConfig | None = None,
+    ) -> None:
+        self._settings = settings
+        self._handler = handler
+        concurrency = max(1, int(getattr(settings, "max_webhook_worker_concurrency", 8)))
+        self._config = config or MaxWebhookWorkerConfig(
+            concurrency=concurrency,
+            batch_size=concurrency * 4,
+            poll_interval=1.0,
+            lock_timeout_seconds=120,
+            max_attempts=max(1, int(getattr(settings, "max_webhook_worker_max_attempts", 5))),
+            retry_base_seconds=5,
+            retry_max_seconds=300,
+        )
+        self._task: asyncio.Task | None = None
+        self._stopped = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        self._lag = _LagWindow()
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._run_loop(), name="max_webhook_ingest")
+
+    async def shutdown(self, *, grace_seconds: float = 10.0) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        if self._task is not None:
+            # Let the in-flight batch finish; anything cut off is reclaimed after
+            # the lock timeout by another worker.
+            try:
+                await asyncio.wait_for(asyncio.shield(self._task), timeout=grace_seconds)
+            except (TimeoutError, asyncio.CancelledError):
+                self._task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await self._task
+            self._task = None
+
+    def wake(self) -> None:
+        """Skip the poll delay after a new update was enqueued by this process."""
+        self._wakeup.set()
+
+    def lag_snapshot(self) -> dict[str, float]:
+        return self._lag.snapshot()
+
+    async def run_once(self) -> int:
+        claimed = await claim_max_webhook_updates(
+            batch_size=self._config.batch_size,
+            lock_timeout=timedelta(seconds=self._config.lock_timeout_seconds),
+        )
+        if not claimed:
+            return 0
+        semaphore = asyncio.Semaphore(self._config.concurrency)
+
+        async def _guarded(item: ClaimedMaxWebhookUpdate) -> None:
+            async with semaphore:
+                await self._process(item)
+
+        await asyncio.gather(*(_guarded(item) for item in claimed))
+        return len(claimed)
+
+    async def _run_loop(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.clear()
+            try:
+                if await self.run_once():
+                    # A user's next update becomes claimable once its predecessor
+                    # is done, so keep draining while there is work.
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("max.webhook_queue.loop_failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._config.poll_interval)
+            except TimeoutError:
+                continue
+
+    async def _process(self, item: ClaimedMaxWebhookUpdate) -> None:
+        try:
+            await self._handler(item.payload, self._settings)
+        except Exception as exc:
+            logger.exception(
+                "max.webhook_queue.process_failed",
+                extra={"update_id": item.id, "update_type": item.update_type, "attempt": item.attempts},
+            )
+            await self._mark_failure(item, error=f"{type(exc).__name__}: {exc}")
+            return
+        processed_at = datetime.now(UTC)
+        await mark_max_webhook_update_processed(item.id, processed_at=processed_at)
+        lag = max(0.0, (processed_at - item.received_at).total_seconds())
+        self._lag.record(lag)
+        MAX_WEBHOOK_INGEST_LAG_SECONDS.observe(lag)
+        MAX_WEBHOOK_UPDATES_TOTAL.labels(outcome="processed").inc()
+
+    async def _mark_failure(self, item: ClaimedMaxWebhookUpdate, *, error: str) -> None:
+        if item.attempts >= self._config.max_attempts:
+            await mark_max_webhook_update_failed(item.id, error=error, next_attempt_at=None)
+            MAX_WEBHOOK_UPDATES_TOTAL.labels(outcome="dead").inc()
+            return
+        await mark_max_webhook_update_failed(
+            item.id,
+            error=error,
+            next_attempt_at=compute_max_delivery_next_retry_at(
+                attempt=item.attempts,
+                retry_base_seconds=self._config.retry_base_seconds,
+                retry_max_seconds=self._config.retry_max_seconds,
+            ),
+        )
+        MAX_WEBHOOK_UPDATES_TOTAL.labels(outcome="retry").inc()
+
+
+__all__ = [
+    "MAX_WEBHOOK_INGEST_LAG_SECONDS",
+    "MAX_WEBHOOK_UPDATES_TOTAL",
+    "MaxWebhookIngestWorker",
+    "MaxWebhookWorkerConfig",
+]
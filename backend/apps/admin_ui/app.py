@@ -17,7 +17,6 @@ except ImportError:
     SENTRY_AVAILABLE = False
 
 from fastapi import Depends, FastAPI, Request, status
-from fastapi.staticfiles import StaticFiles
 from slowapi.middleware import SlowAPIMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from starlette_wtf import CSRFProtectMiddleware
@@ -28,11 +27,26 @@ from starlette.websockets import WebSocket, WebSocketDisconnect
 from backend.apps.admin_ui.background_tasks import (
     periodic_hh_auto_import,
     periodic_hh_sync_job_worker,
+    periodic_kb_index_backfill,
+    periodic_kpi_counter_maintenance,
+    periodic_max_webhook_queue_prune,
+    periodic_staff_blob_sweep,
     periodic_stalled_candidate_checker,
     periodic_past_free_slot_cleanup,
+    periodic_reservation_lock_sweep,
 )
 from backend.apps.hh_integration_webhooks import router as hh_integration_webhook_router
+from backend.apps.admin_api.candidate_access.session_cache import (
+    install_candidate_access_invalidation_hooks,
+)
 from backend.apps.admin_ui.config import STATIC_DIR, register_template_globals
+from backend.apps.admin_ui.principal_cache import (
+    get_last_seen_recorder,
+    install_admin_principal_invalidation_hooks,
+    run_admin_principal_invalidation_listener,
+)
+from backend.core.table_versions import install_table_version_hooks
+from backend.domain.kpi_counters import install_kpi_counter_hooks
 from backend.domain.tests.bootstrap import bootstrap_test_questions
 from pathlib import Path
 from backend.apps.admin_ui.routers import (
@@ -73,8 +87,15 @@ from backend.apps.admin_ui.middleware import (
     DegradedDatabaseMiddleware,
     RequestIDMiddleware,
     SecureHeadersMiddleware,
+    TableVersionBarrierMiddleware,
+)
+from backend.apps.admin_ui.perf.limits.admission import (
+    AdmissionControlMiddleware,
+    build_admission_controller,
+    install_pool_wait_probe,
 )
 from backend.apps.admin_ui.perf.metrics.http_metrics import HTTPMetricsMiddleware
+from backend.apps.admin_ui.static_assets import PrecompressedStaticFiles, spa_file_response
 from backend.apps.admin_ui.perf.metrics.db_metrics import (
     install_sqlalchemy_metrics,
     start_db_stats_task,
@@ -82,6 +103,14 @@ from backend.apps.admin_ui.perf.metrics.db_metrics import (
 )
 from backend.apps.admin_ui.perf.metrics import prometheus as perf_prometheus
 from backend.apps.admin_ui.perf.metrics.context import mark_degraded
+from backend.core.fleet_metrics import build_fleet_metrics_backend, get_fleet_metrics
+from backend.core.leader_election import (
+    InMemoryLeaseBackend,
+    LeaderElector,
+    RedisLeaseBackend,
+    build_lease_backend,
+)
+from backend.core.kdf_executor import shutdown_kdf_executor
 from backend.core.logging import configure_logging
 from backend.core.settings import get_settings
 from backend.core.db import async_engine, async_session
@@ -93,6 +122,11 @@ from backend.core.error_handler import (
 )
 from backend.migrations.runner import upgrade_to_head
 from backend.core.redis_factory import parse_redis_target
+from backend.domain.analytics_buffer import (
+    analytics_buffer_config_from_settings,
+    start_analytics_buffer,
+    stop_analytics_buffer,
+)
 from backend.domain.models import recruiter_city_association
 from sqlalchemy.exc import OperationalError, TimeoutError as SQLAlchemyTimeoutError
 
@@ -100,7 +134,7 @@ try:  # pragma: no cover - optional depending on installed DB driver
     from asyncpg.exceptions import TooManyConnectionsError as AsyncpgTooManyConnectionsError  # type: ignore
 except Exception:  # pragma: no cover
     AsyncpgTooManyConnectionsError = None  # type: ignore[assignment]
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, FileResponse
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from fastapi.exception_handlers import http_exception_handler
 from fastapi import HTTPException
 
@@ -393,6 +427,9 @@ async def lifespan(app: FastAPI):
 
     # Install DB/pool instrumentation early (no-op when metrics are disabled).
     install_sqlalchemy_metrics(async_engine)
+    admission_controller = getattr(app.state, "admission_controller", None)
+    if admission_controller is not None:
+        install_pool_wait_probe(async_engine, admission_controller)
 
     if _auto_upgrade_schema_if_needed(settings):
         logger.info("Development database migrated to latest revision")
@@ -511,6 +548,26 @@ async def lifespan(app: FastAPI):
         except Exception as exc:  # pragma: no cover - optional diagnostics
             logger.debug("SQL profile flusher not started: %s", exc)
 
+    # Merge latency sketches and counters of all workers for /metrics scrapes.
+    fleet_metrics_stop = asyncio.Event()
+    if not is_test_mode and settings.metrics_fleet_sync_interval_seconds > 0:
+        try:
+            fleet_backend = build_fleet_metrics_backend(settings)
+            if fleet_backend is not None:
+                shutdown_manager.add_task(
+                    asyncio.create_task(
+                        get_fleet_metrics().run(
+                            fleet_backend,
+                            stop_event=fleet_metrics_stop,
+                            interval_seconds=settings.metrics_fleet_sync_interval_seconds,
+                        ),
+                        name="fleet_metrics_sync",
+                    )
+                )
+                logger.info("Fleet metrics sync started")
+        except Exception as exc:  # pragma: no cover - optional diagnostics
+            logger.debug("Fleet metrics sync not started: %s", exc)
+
     # Initialize cache with retry logic
     cache_task = None
     if not is_test_mode:
@@ -525,13 +582,66 @@ async def lifespan(app: FastAPI):
     else:
         logger.info("Test mode: skipping cache supervisor")
 
+    # Batch analytics inserts from request handlers into multi-row writes.
+    if settings.analytics_buffer_enabled:
+        try:
+            start_analytics_buffer(analytics_buffer_config_from_settings(settings))
+            logger.info("Analytics event buffer started")
+        except Exception as exc:
+            logger.error("Failed to start analytics event buffer: %s", exc, exc_info=True)
+
+    # Staff principal cache: cross-worker invalidations and coalesced last_seen_at writes.
+    principal_cache_stop = asyncio.Event()
+    if not is_test_mode:
+        try:
+            last_seen_task = asyncio.create_task(
+                get_last_seen_recorder().run(
+                    stop_event=principal_cache_stop,
+                    interval_seconds=settings.admin_last_seen_flush_interval_seconds,
+                ),
+                name="recruiter_last_seen_flusher",
+            )
+            shutdown_manager.add_task(last_seen_task)
+            if settings.redis_url and settings.admin_principal_cache_ttl_seconds > 0:
+                shutdown_manager.add_task(
+                    asyncio.create_task(
+                        run_admin_principal_invalidation_listener(
+                            redis_url=settings.redis_url,
+                            stop_event=principal_cache_stop,
+                        ),
+                        name="admin_principal_invalidations",
+                    )
+                )
+        except Exception as exc:
+            logger.error("Failed to start principal cache tasks: %s", exc, exc_info=True)
+
+    # Singleton scans run on one worker only (see backend/core/leader_election.py).
+    app.state.leader_electors = {}
+    leader_backend = None
+    if not is_test_mode:
+        try:
+            leader_backend = build_lease_backend(settings)
+            logger.info("Leader election backend: %s", type(leader_backend).__name__)
+        except Exception as exc:
+            logger.error("Leader election backend unavailable, using local leases: %s", exc)
+            leader_backend = InMemoryLeaseBackend()
+
+    def _start_leader_task(name: str, job_factory) -> asyncio.Task:
+        elector = LeaderElector(
+            name,
+            leader_backend,
+            ttl_seconds=settings.leader_election_ttl_seconds,
+        )
+        app.state.leader_electors[name] = elector
+        return asyncio.create_task(elector.run(job_factory), name=name)
+
     # Start background task for stalled candidate checker (runs hourly)
     stalled_checker_task = None
     if not is_test_mode:
         try:
-            stalled_checker_task = asyncio.create_task(
-                periodic_stalled_candidate_checker(interval_hours=1, app=app),
-                name="stalled_candidate_checker",
+            stalled_checker_task = _start_leader_task(
+                "stalled_candidate_checker",
+                lambda: periodic_stalled_candidate_checker(interval_hours=1, app=app),
             )
             app.state.stalled_checker_task = stalled_checker_task
             shutdown_manager.add_task(stalled_checker_task)
@@ -545,9 +655,9 @@ async def lifespan(app: FastAPI):
     slot_cleanup_task = None
     if not is_test_mode:
         try:
-            slot_cleanup_task = asyncio.create_task(
-                periodic_past_free_slot_cleanup(app=app),
-                name="past_free_slot_cleanup",
+            slot_cleanup_task = _start_leader_task(
+                "past_free_slot_cleanup",
+                lambda: periodic_past_free_slot_cleanup(app=app),
             )
             app.state.slot_cleanup_task = slot_cleanup_task
             shutdown_manager.add_task(slot_cleanup_task)
@@ -557,6 +667,89 @@ async def lifespan(app: FastAPI):
     else:
         logger.info("Test mode: skipping past free slot cleanup")
 
+    # Bootstrap KPI counters and finalize weekly snapshots at rollover
+    kpi_counter_task = None
+    if not is_test_mode:
+        try:
+            kpi_counter_task = _start_leader_task(
+                "kpi_counter_maintenance",
+                lambda: periodic_kpi_counter_maintenance(app=app),
+            )
+            app.state.kpi_counter_task = kpi_counter_task
+            shutdown_manager.add_task(kpi_counter_task)
+            logger.info("KPI counter maintenance started")
+        except Exception as exc:
+            logger.error("Failed to start KPI counter maintenance: %s", exc, exc_info=True)
+    else:
+        logger.info("Test mode: skipping KPI counter maintenance")
+
+    # Expired reservation locks are swept here instead of inside every booking
+    lock_sweep_task = None
+    if not is_test_mode:
+        try:
+            lock_sweep_task = _start_leader_task(
+                "reservation_lock_sweep",
+                lambda: periodic_reservation_lock_sweep(app=app),
+            )
+            app.state.lock_sweep_task = lock_sweep_task
+            shutdown_manager.add_task(lock_sweep_task)
+            logger.info("Reservation lock sweep started")
+        except Exception as exc:
+            logger.error("Failed to start reservation lock sweep: %s", exc, exc_info=True)
+    else:
+        logger.info("Test mode: skipping reservation lock sweep")
+
+    # Finished MAX webhook queue rows are pruned after the retention window
+    max_webhook_prune_task = None
+    if not is_test_mode:
+        try:
+            max_webhook_prune_task = _start_leader_task(
+                "max_webhook_queue_prune",
+                lambda: periodic_max_webhook_queue_prune(app=app),
+            )
+            app.state.max_webhook_prune_task = max_webhook_prune_task
+            shutdown_manager.add_task(max_webhook_prune_task)
+            logger.info("MAX webhook queue pruning started")
+        except Exception as exc:
+            logger.error("Failed to start MAX webhook queue pruning: %s", exc, exc_info=True)
+    else:
+        logger.info("Test mode: skipping MAX webhook queue pruning")
+
+    # Attachment blobs left behind by failed staff chat messages
+    staff_blob_sweep_task = None
+    if not is_test_mode:
+        try:
+            staff_blob_sweep_task = _start_leader_task(
+                "staff_blob_sweep",
+                lambda: periodic_staff_blob_sweep(app=app),
+            )
+            app.state.staff_blob_sweep_task = staff_blob_sweep_task
+            shutdown_manager.add_task(staff_blob_sweep_task)
+            logger.info("Staff attachment blob sweep started")
+        except Exception as exc:
+            logger.error("Failed to start staff attachment blob sweep: %s", exc, exc_info=True)
+    else:
+        logger.info("Test mode: skipping staff attachment blob sweep")
+
+    # Knowledge base chunks stored before the inverted index are indexed here,
+    # so searches after a deploy do not pay for the backfill.
+    kb_backfill_task = None
+    if not is_test_mode:
+        try:
+            kb_backfill_task = _start_leader_task(
+                "kb_index_backfill",
+                lambda: periodic_kb_index_backfill(app=app),
+            )
+            app.state.kb_backfill_task = kb_backfill_task
+            shutdown_manager.add_task(kb_backfill_task)
+            logger.info("Knowledge base index backfill started")
+        except Exception as exc:
+            logger.error("Failed to start knowledge base index backfill: %s", exc, exc_info=True)
+    else:
+        logger.info("Test mode: skipping knowledge base index backfill")
+
+    # HH sync jobs are claimed with FOR UPDATE SKIP LOCKED, so every worker
+    # drains the queue and jobs are sharded across processes without a leader.
     hh_sync_worker_task = None
     if not is_test_mode:
         try:
@@ -575,9 +768,9 @@ async def lifespan(app: FastAPI):
     hh_auto_import_task = None
     if not is_test_mode:
         try:
-            hh_auto_import_task = asyncio.create_task(
-                periodic_hh_auto_import(app=app),
-                name="hh_auto_import",
+            hh_auto_import_task = _start_leader_task(
+                "hh_auto_import",
+                lambda: periodic_hh_auto_import(app=app),
             )
             app.state.hh_auto_import_task = hh_auto_import_task
             shutdown_manager.add_task(hh_auto_import_task)
@@ -618,8 +811,18 @@ async def lifespan(app: FastAPI):
         logger.info("Shutting down application...")
 
         # Graceful shutdown of all background tasks
+        principal_cache_stop.set()
+        fleet_metrics_stop.set()
         await shutdown_manager.shutdown()
 
+        # Flush buffered analytics events before the engine goes away
+        try:
+            await stop_analytics_buffer()
+        except Exception as exc:
+            logger.error("Error flushing analytics event buffer: %s", exc)
+
+        shutdown_kdf_executor()
+
         # Shutdown bot integration
         try:
             await integration.shutdown()
@@ -627,6 +830,12 @@ async def lifespan(app: FastAPI):
         except Exception as exc:
             logger.error("Error during bot integration shutdown: %s", exc)
 
+        if isinstance(leader_backend, RedisLeaseBackend):
+            try:
+                await leader_backend.close()
+            except Exception as exc:
+                logger.error("Error closing leader election backend: %s", exc)
+
         # Disconnect cache
         try:
             await disconnect_cache()
@@ -644,6 +853,10 @@ def create_app() -> FastAPI:
     openapi_url = "/openapi.json" if settings.admin_docs_enabled else None
 
     limiter.enabled = settings.rate_limit_enabled
+    install_candidate_access_invalidation_hooks()
+    install_admin_principal_invalidation_hooks()
+    install_kpi_counter_hooks()
+    install_table_version_hooks()
     app = FastAPI(
         title="TG Bot Admin UI",
         lifespan=lifespan,
@@ -671,16 +884,24 @@ def create_app() -> FastAPI:
         same_site=settings.session_cookie_samesite,
         https_only=settings.session_cookie_secure,
     )
+    app.add_middleware(TableVersionBarrierMiddleware)
     app.add_middleware(DegradedDatabaseMiddleware)
+    app.state.admission_controller = build_admission_controller(settings)
+    if app.state.admission_controller is not None:
+        app.add_middleware(AdmissionControlMiddleware, controller=app.state.admission_controller)
     app.add_middleware(SecureHeadersMiddleware)
     app.add_middleware(CacheHeadersMiddleware)
     app.add_middleware(RequestIDMiddleware)
     app.add_middleware(HTTPMetricsMiddleware)
-    app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+    app.mount("/static", PrecompressedStaticFiles(directory=str(STATIC_DIR)), name="static")
     if SPA_DIST_DIR.exists():
         assets_dir = SPA_DIST_DIR / "assets"
         if assets_dir.exists():
-            app.mount("/assets", StaticFiles(directory=str(assets_dir)), name="spa-assets")
+            app.mount(
+                "/assets",
+                PrecompressedStaticFiles(directory=str(assets_dir), immutable_hashed=True),
+                name="spa-assets",
+            )
     else:
         logger.warning("SPA dist directory not found at %s. Build frontend to enable /app.", SPA_DIST_DIR)
 
@@ -740,10 +961,10 @@ def create_app() -> FastAPI:
 
     if SPA_DIST_DIR.exists():
         @app.get("/app", include_in_schema=False)
-        async def spa_index() -> Response:
+        async def spa_index(request: Request) -> Response:
             index_file = SPA_DIST_DIR / "index.html"
             if index_file.exists():
-                return FileResponse(index_file)
+                return spa_file_response(request, index_file, revalidate=True)
             return PlainTextResponse("SPA build not found", status_code=404)
 
         @app.get("/candidate", include_in_schema=False)
@@ -762,27 +983,27 @@ def create_app() -> FastAPI:
         return Response(status_code=204)
 
     @app.get("/manifest.json", include_in_schema=False)
-    async def spa_manifest() -> Response:
+    async def spa_manifest(request: Request) -> Response:
         target = (SPA_DIST_DIR / "manifest.json").resolve()
         if target.exists() and target.is_file() and target.is_relative_to(SPA_DIST_DIR):
-            return FileResponse(target)
+            return spa_file_response(request, target)
         return PlainTextResponse("Manifest not found", status_code=404)
 
     @app.get("/icons/{path:path}", include_in_schema=False)
-    async def spa_icons(path: str) -> Response:
+    async def spa_icons(request: Request, path: str) -> Response:
         target = (SPA_DIST_DIR / "icons" / path).resolve()
         if target.exists() and target.is_file() and target.is_relative_to(SPA_DIST_DIR):
-            return FileResponse(target)
+            return spa_file_response(request, target)
         return PlainTextResponse("Icon not found", status_code=404)
 
     @app.get("/app/{path:path}", include_in_schema=False)
-    async def spa_assets(path: str) -> Response:
+    async def spa_assets(request: Request, path: str) -> Response:
         target = (SPA_DIST_DIR / path).resolve()
         if target.exists() and target.is_file() and target.is_relative_to(SPA_DIST_DIR):
-            return FileResponse(target)
+            return spa_file_response(request, target, revalidate=target.name == "index.html")
         index_file = SPA_DIST_DIR / "index.html"
         if index_file.exists():
-            return FileResponse(index_file)
+            return spa_file_response(request, index_file, revalidate=True)
         return PlainTextResponse("SPA build not found", status_code=404)
 
     @app.get("/candidate/{path:path}", include_in_schema=False)
@@ -801,7 +1022,7 @@ def create_app() -> FastAPI:
                 if "." not in Path(path).name:
                     index_file = SPA_DIST_DIR / "index.html"
                     if index_file.exists():
-                        return FileResponse(index_file)
+                        return spa_file_response(request, index_file, revalidate=True)
         if (
             exc.status_code == status.HTTP_401_UNAUTHORIZED
             and "text/html" in request.headers.get("accept", "")
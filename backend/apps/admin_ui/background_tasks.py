@@ -4,6 +4,11 @@ This module contains periodic tasks that run in the background:
 - Stalled candidate detection (marks candidates waiting >24h for slots)
 - Hourly digest of waiting candidates for recruiters
 - Cleanup of past free slots (auto-removal once time has passed)
+- Weekly KPI counter bootstrap and rollover finalization
+- Sweep of expired slot reservation locks
+- Retention pruning of finished MAX webhook queue rows
+- Sweep of staff chat attachment blobs no message references
+- Backfill of knowledge base chunks indexed before postings existed
 """
 
 import asyncio
@@ -15,9 +20,10 @@ from typing import Dict, List, Optional
 
 from fastapi import FastAPI
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.orm import selectinload
 
+from backend.core.ai.knowledge_base import backfill_pending_chunks
 from backend.core.db import async_session
 from backend.core.settings import get_settings
 from backend.core.error_handler import resilient_task
@@ -26,98 +32,111 @@ from backend.domain.candidates.status import CandidateStatus
 from backend.domain.hh_integration.contracts import HHConnectionStatus
 from backend.domain.hh_integration.jobs import enqueue_hh_sync_job, process_pending_hh_sync_jobs
 from backend.domain.hh_integration.models import HHConnection
+from backend.domain.max_webhook_inbox import prune_max_webhook_updates
 from backend.domain.models import City, Recruiter
-from backend.domain.repositories import get_active_recruiters_for_city
+from backend.domain.repositories import (
+    get_active_recruiters_for_city,
+    sweep_expired_reservation_locks,
+)
 from backend.domain.candidate_status_service import CandidateStatusService
+from backend.apps.admin_ui.services.kpi_counters import run_kpi_counter_maintenance
 from backend.apps.admin_ui.services.slots import delete_past_free_slots
+from backend.apps.admin_ui.services.staff_chat import sweep_orphan_attachment_blobs
 
 logger = logging.getLogger(__name__)
 _candidate_status_service = CandidateStatusService()
 
 
-async def mark_stalled_waiting_candidates() -> int:
+async def mark_stalled_waiting_candidates(*, batch_size: int = 500) -> int:
     """Mark candidates waiting for slot >24h as stalled.
 
+    The transition is applied set-based in chunks of ``batch_size`` rows (see
+    ``CandidateStatusService.bulk_force``), so the job never loads the waiting
+    candidates as ORM objects or holds row locks for the whole set.
+
     Returns:
         Number of candidates marked as stalled
     """
     threshold = datetime.now(timezone.utc) - timedelta(hours=24)
 
-    async with async_session() as session:
-        # Find candidates in waiting_slot status for >24h
-        stmt = (
-            select(User)
-            .where(
-                User.candidate_status == CandidateStatus.WAITING_SLOT,
-                User.status_changed_at <= threshold,
-            )
-        )
-        result = await session.execute(stmt)
-        candidates = result.scalars().all()
-
-        if not candidates:
-            logger.debug("No stalled waiting candidates found")
-            return 0
-
-        for candidate in candidates:
-            await _candidate_status_service.force(
-                candidate,
-                CandidateStatus.STALLED_WAITING_SLOT,
-                reason="mark stalled waiting candidates",
-            )
+    result = await _candidate_status_service.bulk_force(
+        [
+            User.candidate_status == CandidateStatus.WAITING_SLOT,
+            User.status_changed_at <= threshold,
+        ],
+        CandidateStatus.STALLED_WAITING_SLOT,
+        reason="mark stalled waiting candidates",
+        batch_size=batch_size,
+    )
 
-        await session.commit()
+    if not result.updated:
+        logger.debug("No stalled waiting candidates found")
+        return 0
 
-        logger.info(
-            "Marked %d candidates as stalled (waiting >24h): %s",
-            len(candidates),
-            [c.id for c in candidates],
-        )
-        return len(candidates)
+    logger.info(
+        "Marked %d candidates as stalled (waiting >24h) in %d batch(es)",
+        result.updated,
+        result.batches,
+    )
+    return result.updated
 
 
-async def get_waiting_candidates_summary() -> Dict[str, List[Dict]]:
+async def get_waiting_candidates_summary(*, per_city_limit: int = 50) -> Dict[str, List[Dict]]:
     """Get summary of candidates waiting for slots, grouped by city.
 
+    Grouping, ordering and the per-city cap (longest waiting first) are done
+    in SQL with a window function; only the selected columns are fetched.
+
     Returns:
         Dictionary mapping city_name to list of candidate info dicts
         Each candidate dict contains: id, name, status, waiting_since, telegram_id
     """
-    async with async_session() as session:
-        stmt = (
-            select(User)
-            .where(
-                User.candidate_status.in_([
-                    CandidateStatus.WAITING_SLOT,
-                    CandidateStatus.STALLED_WAITING_SLOT,
-                ])
-            )
-            .order_by(User.status_changed_at.asc())
+    city_name = func.coalesce(func.nullif(User.city, ""), "Unknown").label("city_name")
+    ranked = (
+        select(
+            User.id,
+            User.telegram_id,
+            User.fio,
+            User.candidate_status,
+            User.status_changed_at,
+            city_name,
+            func.row_number()
+            .over(partition_by=city_name, order_by=(User.status_changed_at.asc(), User.id.asc()))
+            .label("rn"),
         )
-        result = await session.execute(stmt)
-        candidates = result.scalars().all()
-
-        # Group by city (using city name from User)
-        by_city: Dict[str, List[Dict]] = defaultdict(list)
-        for candidate in candidates:
-            city_name = candidate.city or "Unknown"
-
-            waiting_time = (
-                datetime.now(timezone.utc) - candidate.status_changed_at
-                if candidate.status_changed_at
-                else timedelta(0)
-            )
-
-            by_city[city_name].append({
-                "id": candidate.id,
-                "telegram_id": candidate.telegram_id,
-                "name": candidate.full_name or f"User {candidate.telegram_id}",
-                "status": candidate.candidate_status.value if candidate.candidate_status else "unknown",
-                "waiting_since": candidate.status_changed_at,
-                "waiting_hours": int(waiting_time.total_seconds() / 3600),
-            })
-
-        return dict(by_city)
+        .where(
+            User.candidate_status.in_([
+                CandidateStatus.WAITING_SLOT,
+                CandidateStatus.STALLED_WAITING_SLOT,
+            ])
+        )
+        .subquery()
+    )
+    stmt = (
+        select(ranked)
+        .where(ranked.c.rn <= max(1, int(per_city_limit)))
+        .order_by(ranked.c.city_name.asc(), ranked.c.rn.asc())
+    )
+    async with async_session() as session:
+        rows = (await session.execute(stmt)).all()
+
+    now = datetime.now(timezone.utc)
+    by_city: Dict[str, List[Dict]] = defaultdict(list)
+    for row in rows:
+        waiting_since = row.status_changed_at
+        if waiting_since is not None and waiting_since.tzinfo is None:
+            waiting_since = waiting_since.replace(tzinfo=timezone.utc)
+        waiting_time = now - waiting_since if waiting_since else timedelta(0)
+        by_city[row.city_name].append({
+            "id": row.id,
+            "telegram_id": row.telegram_id,
+            "name": row.fio or f"User {row.telegram_id}",
+            "status": row.candidate_status.value if row.candidate_status else "unknown",
+            "waiting_since": row.status_changed_at,
+            "waiting_hours": int(waiting_time.total_seconds() / 3600),
+        })
+
+    return dict(by_city)
 
 
 @resilient_task(
@@ -234,6 +253,236 @@ async def periodic_past_free_slot_cleanup(
             raise
 
 
+@resilient_task(
+    task_name="periodic_kpi_counter_maintenance",
+    retry_on_error=True,
+    retry_delay=300.0,
+    log_errors=True,
+)
+async def periodic_kpi_counter_maintenance(
+    *,
+    app: Optional[FastAPI] = None,
+) -> None:
+    """Bootstrap materialized KPI counters and finalize weeks once they roll over."""
+    interval = get_settings().kpi_rollover_interval_seconds
+    logger.info("Started KPI counter maintenance (interval: %ds)", interval)
+    last_db_warning = 0.0
+    warning_interval = 600.0
+
+    while True:
+        try:
+            if app is not None and not getattr(app.state, "db_available", True):
+                now = time.monotonic()
+                if now - last_db_warning >= warning_interval:
+                    logger.warning("DB unavailable, KPI counter maintenance paused")
+                    last_db_warning = now
+                await asyncio.sleep(min(warning_interval, interval))
+                continue
+
+            await run_kpi_counter_maintenance()
+        except asyncio.CancelledError:
+            logger.info("KPI counter maintenance cancelled, shutting down")
+            raise
+        except Exception as exc:
+            now = time.monotonic()
+            if now - last_db_warning >= warning_interval:
+                logger.warning("KPI counter maintenance skipped due to error: %s", exc)
+                last_db_warning = now
+
+        try:
+            await asyncio.sleep(interval)
+        except asyncio.CancelledError:
+            logger.info("KPI counter maintenance cancelled during sleep")
+            raise
+
+
+@resilient_task(
+    task_name="periodic_reservation_lock_sweep",
+    retry_on_error=True,
+    retry_delay=60.0,
+    log_errors=True,
+)
+async def periodic_reservation_lock_sweep(
+    *,
+    app: Optional[FastAPI] = None,
+) -> None:
+    """Delete expired slot reservation locks off the booking hot path."""
+    interval = get_settings().slot_lock_sweep_interval_seconds
+    logger.info("Started reservation lock sweep (interval: %ds)", interval)
+    last_db_warning = 0.0
+    warning_interval = 600.0
+
+    while True:
+        try:
+            if app is not None and not getattr(app.state, "db_available", True):
+                now = time.monotonic()
+                if now - last_db_warning >= warning_interval:
+                    logger.warning("DB unavailable, reservation lock sweep paused")
+                    last_db_warning = now
+                await asyncio.sleep(min(warning_interval, interval))
+                continue
+
+            deleted = await sweep_expired_reservation_locks()
+            if deleted > 0:
+                logger.info("Deleted %d expired reservation locks", deleted)
+        except asyncio.CancelledError:
+            logger.info("Reservation lock sweep cancelled, shutting down")
+            raise
+        except Exception as exc:
+            now = time.monotonic()
+            if now - last_db_warning >= warning_interval:
+                logger.warning("Reservation lock sweep skipped due to error: %s", exc)
+                last_db_warning = now
+
+        try:
+            await asyncio.sleep(interval)
+        except asyncio.CancelledError:
+            logger.info("Reservation lock sweep cancelled during sleep")
+            raise
+
+
+@resilient_task(
+    task_name="periodic_max_webhook_queue_prune",
+    retry_on_error=True,
+    retry_delay=300.0,
+    log_errors=True,
+)
+async def periodic_max_webhook_queue_prune(
+    *,
+    app: Optional[FastAPI] = None,
+    interval_seconds: int = 3600,
+) -> None:
+    """Delete processed/dead MAX webhook updates older than the retention window."""
+    retention = timedelta(days=get_settings().max_webhook_retention_days)
+    logger.info(
+        "Started MAX webhook queue pruning (interval: %ds, retention: %s)",
+        interval_seconds,
+        retention,
+    )
+    last_db_warning = 0.0
+    warning_interval = 600.0
+
+    while True:
+        try:
+            if app is not None and not getattr(app.state, "db_available", True):
+                now = time.monotonic()
+                if now - last_db_warning >= warning_interval:
+                    logger.warning("DB unavailable, MAX webhook queue pruning paused")
+                    last_db_warning = now
+                await asyncio.sleep(min(warning_interval, interval_seconds))
+                continue
+
+            deleted = await prune_max_webhook_updates(
+                older_than=datetime.now(timezone.utc) - retention,
+            )
+            if deleted > 0:
+                logger.info("Pruned %d finished MAX webhook updates", deleted)
+        except asyncio.CancelledError:
+            logger.info("MAX webhook queue pruning cancelled, shutting down")
+            raise
+        except Exception as exc:
+            now = time.monotonic()
+            if now - last_db_warning >= warning_interval:
+                logger.warning("MAX webhook queue pruning skipped due to error: %s", exc)
+                last_db_warning = now
+
+        try:
+            await asyncio.sleep(interval_seconds)
+        except asyncio.CancelledError:
+            logger.info("MAX webhook queue pruning cancelled during sleep")
+            raise
+
+
+@resilient_task(
+    task_name="periodic_staff_blob_sweep",
+    retry_on_error=True,
+    retry_delay=300.0,
+    log_errors=True,
+)
+async def periodic_staff_blob_sweep(
+    *,
+    app: Optional[FastAPI] = None,
+    interval_seconds: int = 3600,
+) -> None:
+    """Delete staff chat attachment blobs left behind by failed messages."""
+    logger.info("Started staff attachment blob sweep (interval: %ds)", interval_seconds)
+    last_db_warning = 0.0
+    warning_interval = 600.0
+
+    while True:
+        try:
+            if app is not None and not getattr(app.state, "db_available", True):
+                now = time.monotonic()
+                if now - last_db_warning >= warning_interval:
+                    logger.warning("DB unavailable, staff attachment blob sweep paused")
+                    last_db_warning = now
+                await asyncio.sleep(min(warning_interval, interval_seconds))
+                continue
+
+            deleted = await sweep_orphan_attachment_blobs()
+            if deleted > 0:
+                logger.info("Removed %d orphan staff attachment blobs", deleted)
+        except asyncio.CancelledError:
+            logger.info("Staff attachment blob sweep cancelled, shutting down")
+            raise
+        except Exception as exc:
+            now = time.monotonic()
+            if now - last_db_warning >= warning_interval:
+                logger.warning("Staff attachment blob sweep skipped due to error: %s", exc)
+                last_db_warning = now
+
+        try:
+            await asyncio.sleep(interval_seconds)
+        except asyncio.CancelledError:
+            logger.info("Staff attachment blob sweep cancelled during sleep")
+            raise
+
+
+@resilient_task(
+    task_name="periodic_kb_index_backfill",
+    retry_on_error=True,
+    retry_delay=300.0,
+    log_errors=True,
+)
+async def periodic_kb_index_backfill(
+    *,
+    app: Optional[FastAPI] = None,
+    interval_seconds: int = 600,
+) -> None:
+    """Index knowledge base chunks that have no postings yet, off the search path."""
+    logger.info("Started knowledge base index backfill (interval: %ds)", interval_seconds)
+    last_db_warning = 0.0
+    warning_interval = 600.0
+
+    while True:
+        try:
+            if app is not None and not getattr(app.state, "db_available", True):
+                now = time.monotonic()
+                if now - last_db_warning >= warning_interval:
+                    logger.warning("DB unavailable, knowledge base index backfill paused")
+                    last_db_warning = now
+                await asyncio.sleep(min(warning_interval, interval_seconds))
+                continue
+
+            indexed = await backfill_pending_chunks()
+            if indexed > 0:
+                logger.info("Indexed %d pending knowledge base chunks", indexed)
+        except asyncio.CancelledError:
+            logger.info("Knowledge base index backfill cancelled, shutting down")
+            raise
+        except Exception as exc:
+            now = time.monotonic()
+            if now - last_db_warning >= warning_interval:
+                logger.warning("Knowledge base index backfill skipped due to error: %s", exc)
+                last_db_warning = now
+
+        try:
+            await asyncio.sleep(interval_seconds)
+        except asyncio.CancelledError:
+            logger.info("Knowledge base index backfill cancelled during sleep")
+            raise
+
+
 async def enqueue_hh_auto_import_jobs() -> tuple[int, int]:
     """Enqueue periodic HH vacancy and negotiation imports for active connections."""
     async with async_session() as session:
@@ -10,6 +10,7 @@ from typing import Any
 
 from backend.apps.admin_ui.perf.degraded.middleware import DegradedDatabaseMiddleware
 from backend.core.logging import reset_request_id, set_request_id
+from backend.core.table_versions import wait_for_pending_bumps
 
 
 def _setdefault_header(headers: list[tuple[bytes, bytes]], name: bytes, value: str) -> None:
@@ -204,9 +205,35 @@ class CacheHeadersMiddleware:
         await self.app(scope, receive, send_wrapper)
 
 
+class TableVersionBarrierMiddleware:
+    """Hold write responses until their table version bumps reached Redis.
+
+    Otherwise a client could revalidate on another worker before the bump and
+    get ``304`` for data it has just changed.
+    """
+
+    _safe_methods = frozenset({"GET", "HEAD", "OPTIONS"})
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope.get("type") != "http" or str(scope.get("method") or "GET").upper() in self._safe_methods:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: dict[str, Any]) -> None:
+            if message.get("type") == "http.response.start":
+                await wait_for_pending_bumps()
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
 __all__ = [
     "CacheHeadersMiddleware",
     "SecureHeadersMiddleware",
+    "TableVersionBarrierMiddleware",
     "DegradedDatabaseMiddleware",
     "RequestIDMiddleware",
 ]
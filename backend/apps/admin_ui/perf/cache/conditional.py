@@ -0,0 +1,130 @@
+"""Conditional GET (ETag / ``304``) for hot admin JSON endpoints.
+
+The SPA polls the dashboard, incoming queue, calendar, candidate list and
+notifications feed; most polls return exactly what the client already has.
+
+- the ETag is a content hash of the rendered body; when a response is sent,
+  its ETag and size are stored in the read-through cache (microcache + Redis)
+  under the endpoint cache key plus the version signature of the tables the
+  payload is built from (``backend.core.table_versions``);
+- a request whose ``If-None-Match`` matches the stored ETag for the *current*
+  signature is answered with ``304`` before any DB query or serialization;
+- a commit to one of those tables changes the signature, so the stored ETag is
+  no longer found and the next request renders again. Writes the counters do
+  not see (raw SQL, other services) are bounded by the validator TTL, which
+  matches the payload cache TTL of the endpoint.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Sequence
+from hashlib import blake2b
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+from backend.apps.admin_ui.perf.cache.readthrough import _cache_bypass_enabled, get_cached, set_cached
+from backend.apps.admin_ui.perf.metrics import prometheus
+from backend.core.settings import get_settings
+from backend.core.table_versions import version_signature
+
+# Browsers keep the body and revalidate on every poll.
+CONDITIONAL_CACHE_CONTROL = "private, no-cache"
+
+# Tables each payload is built from; a commit to any of them invalidates its ETag.
+DASHBOARD_COUNTS_TABLES = ("recruiters", "cities", "slots", "users")
+DASHBOARD_INCOMING_TABLES = (
+    "users",
+    "slots",
+    "slot_assignments",
+    "slot_reschedule_requests",
+    "chat_messages",
+    "ai_outputs",
+    "recruiters",
+    "cities",
+)
+CALENDAR_EVENTS_TABLES = ("slots", "calendar_tasks", "recruiters", "cities", "users")
+CANDIDATES_LIST_TABLES = ("users", "slots", "slot_assignments", "test_results", "recruiters", "cities")
+NOTIFICATIONS_FEED_TABLES = ("outbox_notifications",)
+
+
+def etag_for(body: bytes) -> str:
+    return f'"{blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison as required for ``If-None-Match``."""
+
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def validator_key(key: str, signature: str) -> str:
+    return f"etag:v1:{key}@{signature}"
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"etag": etag, "cache-control": CONDITIONAL_CACHE_CONTROL})
+
+
+async def conditional_json(
+    request: Request,
+    *,
+    key: str,
+    depends_on: Sequence[str],
+    ttl_seconds: float,
+    render: Callable[[], Awaitable[Response]],
+) -> Response:
+    """Serve ``render()`` with an ETag; answer a matching ``If-None-Match`` with ``304``.
+
+    ``key`` must be the (principal-scoped) cache key of the payload. Only
+    ``200`` JSON responses get an ETag; errors and degraded payloads pass through.
+    """
+
+    if not get_settings().admin_conditional_get_enabled or _cache_bypass_enabled():
+        return await render()
+
+    route = prometheus.current_route_label()
+    if_none_match = request.headers.get("if-none-match")
+    stored_key = validator_key(key, await version_signature(depends_on))
+    if if_none_match:
+        cached = await get_cached(stored_key, expected_type=dict, ttl_seconds=ttl_seconds)
+        if cached is not None and not cached[1]:
+            stored = cached[0]
+            if etag_matches(if_none_match, str(stored.get("etag") or "")):
+                prometheus.conditional_get(
+                    route=route, result="not_modified", saved_bytes=int(stored.get("size") or 0)
+                )
+                return _not_modified(str(stored["etag"]))
+
+    response = await render()
+    if response.status_code != 200 or not isinstance(response, JSONResponse):
+        return response
+    etag = etag_for(response.body)
+    await set_cached(stored_key, {"etag": etag, "size": len(response.body)}, ttl_seconds=ttl_seconds)
+    if etag_matches(if_none_match, etag):
+        # Signature moved but the payload did not (e.g. a write to an unrelated row).
+        prometheus.conditional_get(route=route, result="not_modified", saved_bytes=len(response.body))
+        return _not_modified(etag)
+    prometheus.conditional_get(route=route, result="modified" if if_none_match else "unconditional")
+    response.headers["etag"] = etag
+    response.headers["cache-control"] = CONDITIONAL_CACHE_CONTROL
+    return response
+
+
+__all__ = [
+    "CALENDAR_EVENTS_TABLES",
+    "CANDIDATES_LIST_TABLES",
+    "CONDITIONAL_CACHE_CONTROL",
+    "DASHBOARD_COUNTS_TABLES",
+    "DASHBOARD_INCOMING_TABLES",
+    "NOTIFICATIONS_FEED_TABLES",
+    "conditional_json",
+    "etag_for",
+    "etag_matches",
+    "validator_key",
+]
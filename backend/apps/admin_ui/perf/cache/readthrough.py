@@ -4,6 +4,8 @@ This module centralizes:
 - process-local microcache reads/writes
 - Redis cache reads/writes (best-effort)
 - request-scoped cache markers (HIT/MISS + STALE) for metrics/diagnostics
+- pre-serialized JSON bodies (``get_or_compute_json``): cache hits are sent
+  as stored bytes without decoding or re-encoding
 
 Security note:
 - Keys must be built so that *personalized* responses are scoped by principal/role.
@@ -24,6 +26,7 @@ from backend.apps.admin_ui.perf.cache.microcache import set_value as microcache_
 from backend.apps.admin_ui.perf.limits.refresh_limiter import GLOBAL_REFRESH_LIMITER
 from backend.apps.admin_ui.perf.metrics import prometheus
 from backend.core.cache import get_cache
+from backend.core.json_response import encode_json
 from backend.core.settings import get_settings
 
 T = TypeVar("T")
@@ -69,8 +72,14 @@ async def redis_get(key: str, *, expected_type: type[T]) -> tuple[T, bool] | Non
         return None
 
     try:
-        cached = await cache.get(key, default=None)
-        value = cached.unwrap_or(None)
+        if expected_type is bytes:
+            # Stored raw by redis_set; the client may decode responses to str.
+            value = await cache.client.get(key) if cache.client is not None else None
+            if isinstance(value, str):
+                value = value.encode("utf-8")
+        else:
+            cached = await cache.get(key, default=None)
+            value = cached.unwrap_or(None)
     except Exception:
         add_cache_event(backend="redis", state="miss", freshness=_freshness())
         return None
@@ -90,7 +99,11 @@ async def redis_set(key: str, value: Any, *, ttl_seconds: float) -> None:
     except RuntimeError:
         return
     try:
-        await cache.set(key, value, ttl=timedelta(seconds=ttl_seconds))
+        if isinstance(value, bytes):
+            if cache.client is not None:
+                await cache.client.setex(key, max(1, int(ttl_seconds)), value)
+        else:
+            await cache.set(key, value, ttl=timedelta(seconds=ttl_seconds))
     except Exception:
         return
 
@@ -243,3 +256,30 @@ async def get_or_compute(
         value = await compute()
         await set_cached(key, value, ttl_seconds=ttl_seconds, stale_seconds=stale_seconds)
         return value
+
+
+async def get_or_compute_json(
+    key: str,
+    *,
+    ttl_seconds: float,
+    stale_seconds: float = 0.0,
+    compute: Callable[[], Awaitable[Any]],
+) -> bytes:
+    """``get_or_compute`` for JSON payloads cached as encoded bytes.
+
+    The payload returned by ``compute`` is encoded once with ``encode_json``;
+    hits (microcache and Redis) return the body as-is, to be sent with
+    ``FastJSONResponse(EncodedJSON(body))``. Bytes are stored under
+    ``<key>:json`` so they never collide with decoded entries for ``key``.
+    """
+
+    async def _compute_encoded() -> bytes:
+        return encode_json(await compute())
+
+    return await get_or_compute(
+        f"{key}:json",
+        expected_type=bytes,
+        ttl_seconds=ttl_seconds,
+        stale_seconds=stale_seconds,
+        compute=_compute_encoded,
+    )
@@ -0,0 +1,388 @@
+"""Adaptive admission control and priority load shedding for admin_ui.
+
+The concurrency limit follows AIMD: it grows by ``1/limit`` per completed
+request while it is actually used and is multiplied by ``backoff_ratio`` (at
+most once per ``decrease_cooldown_seconds``) when the EWMA of request service
+time or of DB pool-acquire wait exceeds its target. Pool wait is the earliest
+overload signal here: requests queue on ``QueuePool`` long before Postgres
+itself slows down.
+
+Requests are split into three classes:
+
+- ``CRITICAL`` — writes and auth; may use the whole limit and wait longest;
+- ``INTERACTIVE`` — ordinary API reads;
+- ``BACKGROUND`` — polled widgets (System page, outbox feed, reminder jobs)
+  and anything sent with ``X-Request-Priority: background``; never queued.
+
+Each class is admitted only while in-flight work is below its share of the
+limit, so a read spike cannot take the headroom that writes rely on. Waiters
+are served in priority order; when the queue budget of a class runs out the
+request is rejected with ``503`` + ``Retry-After`` before it touches the DB.
+Long-poll ``/updates`` endpoints mostly sleep, so they hold no slot and are
+only shed while the limiter is saturated. AI generation routes and multipart
+uploads are slow by design (provider round-trips, client bandwidth); they take
+a slot but their service time is not a latency sample, otherwise a handful of
+them would drag the limit down to ``min_limit`` on an idle database.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import time
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Callable
+
+from backend.apps.admin_ui.perf.metrics import prometheus
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    CRITICAL = 0
+    INTERACTIVE = 1
+    BACKGROUND = 2
+
+
+_EXEMPT_PREFIXES: tuple[str, ...] = (
+    "/static",
+    "/assets",
+    "/app",
+    "/health",
+    "/metrics",
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+)
+_EXEMPT_PATHS: frozenset[str] = frozenset({"/", "/favicon.ico"})
+_AUTH_PREFIXES: tuple[str, ...] = ("/auth", "/api/auth", "/api/csrf")
+# Endpoints the SPA refetches on a timer; a missed poll is invisible to users.
+_BACKGROUND_PREFIXES: tuple[str, ...] = (
+    "/api/system/",
+    "/api/integrations/hh/",
+    "/api/notifications/feed",
+    "/api/notifications/logs",
+    "/api/bot/reminders/jobs",
+    "/api/simulator/",
+)
+_LONG_POLL_SUFFIX = "/updates"
+# Service time here is dominated by the AI provider, not by this process or the DB.
+_UNSAMPLED_PREFIXES: tuple[str, ...] = ("/api/ai/",)
+_SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+_PRIORITY_HEADER = b"x-request-priority"
+_CONTENT_TYPE_HEADER = b"content-type"
+_MULTIPART = b"multipart/form-data"
+
+
+@dataclass(frozen=True)
+class Route:
+    priority: Priority
+    long_poll: bool = False
+    # Whether the service time feeds the AIMD latency signal.
+    sampled: bool = True
+
+
+def classify(method: str, path: str, headers: list[tuple[bytes, bytes]] | None = None) -> Route | None:
+    """Return the admission route of a request, or ``None`` when it is exempt."""
+
+    if path in _EXEMPT_PATHS or path.startswith(_EXEMPT_PREFIXES):
+        return None
+    priority_value = content_type = b""
+    for key, value in headers or ():
+        key = key.lower()
+        if key == _PRIORITY_HEADER and not priority_value:
+            priority_value = value.strip().lower()
+        elif key == _CONTENT_TYPE_HEADER and not content_type:
+            content_type = value.strip().lower()
+    sampled = not (path.startswith(_UNSAMPLED_PREFIXES) or content_type.startswith(_MULTIPART))
+    if method.upper() not in _SAFE_METHODS or path.startswith(_AUTH_PREFIXES):
+        return Route(Priority.CRITICAL, sampled=sampled)
+    if path.endswith(_LONG_POLL_SUFFIX):
+        return Route(Priority.BACKGROUND, long_poll=True)
+    if path.startswith(_BACKGROUND_PREFIXES):
+        return Route(Priority.BACKGROUND)
+    # Clients may only lower their own priority.
+    if priority_value == b"background":
+        return Route(Priority.BACKGROUND, sampled=sampled)
+    return Route(Priority.INTERACTIVE, sampled=sampled)
+
+
+@dataclass(frozen=True)
+class AdmissionConfig:
+    min_limit: int = 8
+    max_limit: int = 200
+    initial_limit: int = 40
+    latency_target_seconds: float = 0.5
+    pool_wait_target_seconds: float = 0.05
+    queue_timeout_seconds: float = 0.3
+    backoff_ratio: float = 0.8
+    decrease_cooldown_seconds: float = 1.0
+    ewma_alpha: float = 0.2
+    # Fraction of the limit each class may occupy.
+    interactive_share: float = 0.85
+    background_share: float = 0.5
+
+
+class AimdLimit:
+    """Additive-increase/multiplicative-decrease concurrency limit."""
+
+    def __init__(self, config: AdmissionConfig, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._config = config
+        self._clock = clock
+        self.limit = float(min(max(config.initial_limit, config.min_limit), config.max_limit))
+        self.latency_ewma = 0.0
+        self.pool_wait_ewma = 0.0
+        self._pool_wait_at = float("-inf")
+        self._last_decrease = float("-inf")
+
+    def observe_pool_wait(self, seconds: float) -> None:
+        alpha = self._config.ewma_alpha
+        self.pool_wait_ewma += alpha * (max(0.0, seconds) - self.pool_wait_ewma)
+        self._pool_wait_at = self._clock()
+
+    def on_sample(self, service_seconds: float, *, inflight: int) -> None:
+        config = self._config
+        self.latency_ewma += config.ewma_alpha * (max(0.0, service_seconds) - self.latency_ewma)
+        now = self._clock()
+        # Pool wait is sampled only on checkout; an old high value must not pin the limit down.
+        pool_fresh = now - self._pool_wait_at <= 2 * config.decrease_cooldown_seconds
+        overloaded = self.latency_ewma > config.latency_target_seconds or (
+            pool_fresh and self.pool_wait_ewma > config.pool_wait_target_seconds
+        )
+        if overloaded:
+            if now - self._last_decrease >= config.decrease_cooldown_seconds:
+                self.limit = max(float(config.min_limit), self.limit * config.backoff_ratio)
+                self._last_decrease = now
+        elif inflight * 2 >= self.limit:
+            self.limit = min(float(config.max_limit), self.limit + 1.0 / self.limit)
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, *, retry_after: int) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+_RETRY_AFTER = {Priority.CRITICAL: 1, Priority.INTERACTIVE: 2, Priority.BACKGROUND: 10}
+
+
+class AdmissionController:
+    """Priority-aware gate in front of the adaptive limit (single event loop)."""
+
+    def __init__(self, config: AdmissionConfig | None = None, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self.config = config or AdmissionConfig()
+        self._aimd = AimdLimit(self.config, clock=clock)
+        self._shares = {
+            Priority.CRITICAL: 1.0,
+            Priority.INTERACTIVE: self.config.interactive_share,
+            Priority.BACKGROUND: self.config.background_share,
+        }
+        self._budgets = {
+            Priority.CRITICAL: self.config.queue_timeout_seconds * 4,
+            Priority.INTERACTIVE: self.config.queue_timeout_seconds,
+            Priority.BACKGROUND: 0.0,
+        }
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._seq = itertools.count()
+        self.inflight = 0
+        prometheus.ADMISSION_LIMIT.set(self._aimd.limit)
+
+    @property
+    def limit(self) -> float:
+        return self._aimd.limit
+
+    @property
+    def saturated(self) -> bool:
+        return bool(self._waiters) or self.inflight >= self.capacity(Priority.BACKGROUND)
+
+    def capacity(self, priority: Priority) -> int:
+        return max(1, int(self._aimd.limit * self._shares[priority]))
+
+    def observe_pool_wait(self, seconds: float) -> None:
+        self._aimd.observe_pool_wait(seconds)
+
+    def check_long_poll(self) -> None:
+        if self.saturated:
+            self._reject(Priority.BACKGROUND, "long_poll_shed")
+
+    async def acquire(self, priority: Priority) -> float:
+        """Take a slot for ``priority``; returns seconds spent queued."""
+
+        if self.inflight < self.capacity(priority) and not self._has_waiter_at_or_above(priority):
+            self._admit()
+            return 0.0
+        budget = self._budgets[priority]
+        if budget <= 0:
+            self._reject(priority, "background_shed")
+        if len(self._waiters) >= self.config.max_limit:
+            self._reject(priority, "queue_full")
+
+        started = time.perf_counter()
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), future))
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=budget)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                # Admitted by release() in the same tick the timer fired.
+                self._release_slot()
+            future.cancel()
+            self._reject(priority, "queue_timeout")
+        except BaseException:
+            if future.done() and not future.cancelled():
+                self._release_slot()
+            future.cancel()
+            raise
+        waited = time.perf_counter() - started
+        prometheus.ADMISSION_QUEUE_WAIT_SECONDS.labels(priority=priority.name.lower()).observe(waited)
+        return waited
+
+    def release(self, priority: Priority, *, service_seconds: float, sampled: bool = True) -> None:
+        if sampled and priority != Priority.BACKGROUND:
+            self._aimd.on_sample(service_seconds, inflight=self.inflight)
+            prometheus.ADMISSION_LIMIT.set(self._aimd.limit)
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        self.inflight -= 1
+        prometheus.ADMISSION_INFLIGHT.set(self.inflight)
+        self._wake()
+
+    def _admit(self) -> None:
+        self.inflight += 1
+        prometheus.ADMISSION_INFLIGHT.set(self.inflight)
+
+    def _wake(self) -> None:
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self.inflight >= self.capacity(Priority(priority)):
+                # Lower classes have smaller shares, so nobody behind the head fits either.
+                return
+            heapq.heappop(self._waiters)
+            self._admit()
+            future.set_result(None)
+
+    def _has_waiter_at_or_above(self, priority: Priority) -> bool:
+        return any(waiter[0] <= priority and not waiter[2].done() for waiter in self._waiters)
+
+    def _reject(self, priority: Priority, reason: str) -> None:
+        prometheus.ADMISSION_SHED_TOTAL.labels(priority=priority.name.lower(), reason=reason).inc()
+        raise AdmissionRejected(reason, retry_after=_RETRY_AFTER[priority])
+
+
+class AdmissionControlMiddleware:
+    """ASGI gate: classify, wait for a slot within budget or answer ``503`` early."""
+
+    def __init__(self, app, controller: AdmissionController) -> None:
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope.get("type") != "http":
+            await self.app(scope, receive, send)
+            return
+        route = classify(str(scope.get("method") or "GET"), str(scope.get("path") or ""), scope.get("headers"))
+        if route is None:
+            await self.app(scope, receive, send)
+            return
+
+        controller = self.controller
+        try:
+            if route.long_poll:
+                controller.check_long_poll()
+            else:
+                await controller.acquire(route.priority)
+        except AdmissionRejected as exc:
+            await _send_overloaded(send, exc)
+            return
+        if route.long_poll:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(
+                route.priority,
+                service_seconds=time.perf_counter() - started,
+                sampled=route.sampled,
+            )
+
+
+async def _send_overloaded(send: Callable, exc: AdmissionRejected) -> None:
+    body = json.dumps({"status": "overloaded", "reason": exc.reason}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(exc.retry_after).encode()),
+                (b"cache-control", b"no-store"),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+def install_pool_wait_probe(async_engine: Any, controller: AdmissionController) -> None:
+    """Feed pool checkout wait into the limiter (idempotent, independent of METRICS_ENABLED)."""
+
+    pool = async_engine.sync_engine.pool
+    if getattr(pool, "_admission_do_get_wrapped", False) or not hasattr(pool, "_do_get"):
+        return
+    try:
+        orig_do_get = pool._do_get  # type: ignore[attr-defined]
+
+        def _wrapped_do_get():  # type: ignore[no-redef]
+            start = time.perf_counter()
+            try:
+                return orig_do_get()
+            finally:
+                controller.observe_pool_wait(time.perf_counter() - start)
+
+        pool._do_get = _wrapped_do_get  # type: ignore[attr-defined]
+        setattr(pool, "_admission_do_get_wrapped", True)
+    except Exception:
+        logger.exception("Failed to install admission pool wait probe")
+
+
+def build_admission_controller(settings: Any) -> AdmissionController | None:
+    if not getattr(settings, "admission_control_enabled", False):
+        return None
+    min_limit = settings.admission_min_limit
+    max_limit = max(min_limit, settings.admission_max_limit)
+    return AdmissionController(
+        AdmissionConfig(
+            min_limit=min_limit,
+            max_limit=max_limit,
+            initial_limit=min(max_limit, max(min_limit, max_limit // 4)),
+            latency_target_seconds=settings.admission_latency_target_ms / 1000.0,
+            pool_wait_target_seconds=settings.admission_pool_wait_target_ms / 1000.0,
+            queue_timeout_seconds=settings.admission_queue_timeout_ms / 1000.0,
+        )
+    )
+
+
+__all__ = [
+    "AdmissionConfig",
+    "AdmissionControlMiddleware",
+    "AdmissionController",
+    "AdmissionRejected",
+    "AimdLimit",
+    "Priority",
+    "Route",
+    "build_admission_controller",
+    "classify",
+    "install_pool_wait_probe",
+]
@@ -19,7 +19,7 @@ import os
 import random
 import re
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from threading import Lock
 
@@ -30,6 +30,8 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 from backend.apps.admin_ui.perf.metrics import context as perf_context
 from backend.apps.admin_ui.perf.metrics import prometheus
 from backend.core.db import async_session
+from backend.core.fleet_metrics import get_fleet_metrics
+from backend.core.quantile_sketch import LatencySketch
 from backend.core.settings import get_settings
 
 logger = logging.getLogger(__name__)
@@ -83,6 +85,9 @@ def _fingerprint_sql(statement: str) -> str:
     return s[:200]
 
 
+SQL_FINGERPRINT_FAMILY = "sql_fingerprint"
+
+
 @dataclass
 class _SQLStat:
     count: int = 0
@@ -90,10 +95,15 @@ class _SQLStat:
     max_seconds: float = 0.0
     example: str = ""
     last_route: str = ""
+    sketch: LatencySketch = field(default_factory=LatencySketch)
 
 
 class SQLProfileCollector:
-    """Best-effort in-process SQL profile collector (sampled, bounded)."""
+    """Best-effort SQL profile collector (sampled, bounded).
+
+    Per-fingerprint latencies are kept as mergeable sketches, so the JSON dump
+    covers every worker that publishes through ``backend.core.fleet_metrics``.
+    """
 
     def __init__(self) -> None:
         self._enabled = _sql_profile_enabled()
@@ -126,6 +136,7 @@ class SQLProfileCollector:
             stat.total_seconds += float(elapsed_seconds)
             stat.max_seconds = max(stat.max_seconds, float(elapsed_seconds))
             stat.last_route = route
+            stat.sketch.add(elapsed_seconds)
 
     def snapshot(self) -> dict[str, _SQLStat]:
         """Return a shallow copy snapshot."""
@@ -133,24 +144,37 @@ class SQLProfileCollector:
         with self._lock:
             return dict(self._stats)
 
+    def sketches(self) -> dict[str, LatencySketch]:
+        """Copies of the per-fingerprint sketches (fleet metrics source)."""
+
+        with self._lock:
+            return {fp: st.sketch.copy() for fp, st in self._stats.items()}
+
     def dump_json(self, path: Path) -> None:
-        """Write a JSON summary to disk (best-effort)."""
-
-        snap = self.snapshot()
-        items = [
-            {
-                "fingerprint": fp,
-                "count": st.count,
-                "total_ms": round(st.total_seconds * 1000.0, 3),
-                "max_ms": round(st.max_seconds * 1000.0, 3),
-                "last_route": st.last_route,
-            }
-            for fp, st in snap.items()
-        ]
+        """Write a fleet-wide JSON summary to disk (best-effort)."""
+
+        local = self.snapshot()
+        items = []
+        for fp, sketch in get_fleet_metrics().sketches(SQL_FINGERPRINT_FAMILY).items():
+            if not sketch.count:
+                continue
+            items.append(
+                {
+                    "fingerprint": fp,
+                    "count": sketch.count,
+                    "total_ms": round(sketch.sum * 1000.0, 3),
+                    "p50_ms": round((sketch.quantile(0.50) or 0.0) * 1000.0, 3),
+                    "p95_ms": round((sketch.quantile(0.95) or 0.0) * 1000.0, 3),
+                    "p99_ms": round((sketch.quantile(0.99) or 0.0) * 1000.0, 3),
+                    "max_ms": round((sketch.quantile(1.0) or 0.0) * 1000.0, 3),
+                    "last_route": local[fp].last_route if fp in local else "",
+                }
+            )
         top_by_total = sorted(items, key=lambda r: r["total_ms"], reverse=True)[:50]
         top_by_count = sorted(items, key=lambda r: r["count"], reverse=True)[:50]
         payload = {
             "sample_rate": self._sample_rate,
+            "workers": get_fleet_metrics().worker_count,
             "unique_fingerprints": len(items),
             "top_by_total_ms": top_by_total,
             "top_by_count": top_by_count,
@@ -160,6 +184,7 @@ class SQLProfileCollector:
 
 
 _SQL_PROFILE = SQLProfileCollector()
+get_fleet_metrics().register_sketches(SQL_FINGERPRINT_FAMILY, _SQL_PROFILE.sketches)
 
 
 async def _sql_profile_flusher(output_path: Path, interval_seconds: float) -> None:
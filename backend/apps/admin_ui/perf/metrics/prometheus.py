@@ -7,21 +7,23 @@ Design goals:
 - minimal overhead on the request path
 
 Note: quantiles (p50/p95/p99) are exposed as *approximate* rolling-window gauges
-to make diagnostics trivial during local load testing. Histograms are also exported
-for accurate Prometheus-side quantiles/recording rules.
+to make diagnostics trivial during local load testing. They come from mergeable
+DDSketches (1% relative error) that are aggregated across workers through
+``backend.core.fleet_metrics``, so any worker answers a scrape with fleet-wide
+values. Histograms are also exported for accurate Prometheus-side
+quantiles/recording rules.
 """
 
 from __future__ import annotations
 
-import math
-from collections import deque
 from collections.abc import Iterable
-from threading import Lock
 
 from prometheus_client import REGISTRY, Counter, Gauge, Histogram
 from prometheus_client.core import GaugeMetricFamily
 
 from backend.apps.admin_ui.perf.metrics import context as perf_context
+from backend.core.fleet_metrics import get_fleet_metrics
+from backend.core.quantile_sketch import SlidingSketchWindow
 
 # ----------------------------
 # HTTP metrics
@@ -95,6 +97,18 @@ HTTP_CACHE_REFRESH_ERRORS_TOTAL = Counter(
     labelnames=("route",),
 )
 
+CONDITIONAL_GET_TOTAL = Counter(
+    "conditional_get_total",
+    "Hot JSON reads by ETag outcome (not_modified, modified, unconditional).",
+    labelnames=("route", "result"),
+)
+
+CONDITIONAL_GET_BYTES_SAVED_TOTAL = Counter(
+    "conditional_get_bytes_saved_total",
+    "Response body bytes not sent thanks to 304 Not Modified.",
+    labelnames=("route",),
+)
+
 SLOT_PROPOSE_404_TOTAL = Counter(
     "slot_propose_404_total",
     "404 responses for slot propose flow by reason.",
@@ -220,50 +234,49 @@ DB_ACTIVE_CONNECTIONS = Gauge(
 
 
 # ----------------------------
-# Rolling quantiles collector
+# Admission control
 # ----------------------------
 
-_LatencyKey = tuple[str, str, str, str]  # route, method, status, outcome
-
-
-class _LatencyWindow:
-    def __init__(self, *, max_samples: int = 1024) -> None:
-        self._max_samples = max_samples
-        self._lock = Lock()
-        self._samples: dict[_LatencyKey, deque[float]] = {}
-
-    def record(self, key: _LatencyKey, value: float) -> None:
-        with self._lock:
-            dq = self._samples.get(key)
-            if dq is None:
-                dq = deque(maxlen=self._max_samples)
-                self._samples[key] = dq
-            dq.append(value)
-
-    def snapshot(self) -> dict[_LatencyKey, list[float]]:
-        with self._lock:
-            return {k: list(v) for k, v in self._samples.items()}
+ADMISSION_LIMIT = Gauge(
+    "admission_concurrency_limit",
+    "Current adaptive concurrency limit of admin_ui admission control.",
+)
+ADMISSION_INFLIGHT = Gauge(
+    "admission_inflight_requests",
+    "Requests holding an admission slot.",
+)
+ADMISSION_SHED_TOTAL = Counter(
+    "admission_shed_total",
+    "Requests rejected with 503 by admission control, by priority/reason.",
+    labelnames=("priority", "reason"),
+)
+ADMISSION_QUEUE_WAIT_SECONDS = Histogram(
+    "admission_queue_wait_seconds",
+    "Time queued requests waited for an admission slot, by priority.",
+    labelnames=("priority",),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
 
 
-_LAT_WINDOW = _LatencyWindow(max_samples=2048)
+# ----------------------------
+# Rolling quantiles collector
+# ----------------------------
 
+HTTP_LATENCY_FAMILY = "http_latency"
+# Keys are "route, method, status, outcome" joined with a unit separator so
+# they survive the JSON round-trip of fleet snapshots.
+_KEY_SEP = "\x1f"
 
-def _quantile(values: list[float], q: float) -> float | None:
-    if not values:
-        return None
-    values.sort()
-    n = len(values)
-    # Nearest-rank (1-indexed) quantile.
-    rank = int(math.ceil(q * n))
-    idx = max(0, min(n - 1, rank - 1))
-    return float(values[idx])
+_LAT_WINDOW: SlidingSketchWindow[str] = SlidingSketchWindow(window_seconds=60.0, slices=6)
+get_fleet_metrics().register_sketches(HTTP_LATENCY_FAMILY, _LAT_WINDOW.merged)
 
 
 class _LatencyQuantilesCollector:
     """Expose per-route rolling quantiles as gauges for easy diagnostics."""
 
     def collect(self) -> Iterable[GaugeMetricFamily]:
-        snap = _LAT_WINDOW.snapshot()
+        fleet = get_fleet_metrics()
+        snap = fleet.sketches(HTTP_LATENCY_FAMILY)
 
         p50 = GaugeMetricFamily(
             "latency_p50_seconds",
@@ -281,22 +294,25 @@ class _LatencyQuantilesCollector:
             labels=("route", "method", "status", "outcome"),
         )
 
-        for (route, method, status, outcome), vals in snap.items():
-            if not vals:
+        for key, sketch in snap.items():
+            labels = key.split(_KEY_SEP)
+            if len(labels) != 4 or not sketch.count:
                 continue
-            q50 = _quantile(vals, 0.50)
-            q95 = _quantile(vals, 0.95)
-            q99 = _quantile(vals, 0.99)
-            if q50 is not None:
-                p50.add_metric([route, method, status, outcome], q50)
-            if q95 is not None:
-                p95.add_metric([route, method, status, outcome], q95)
-            if q99 is not None:
-                p99.add_metric([route, method, status, outcome], q99)
+            q50, q95, q99 = sketch.quantiles((0.50, 0.95, 0.99))
+            p50.add_metric(labels, q50)
+            p95.add_metric(labels, q95)
+            p99.add_metric(labels, q99)
+
+        workers = GaugeMetricFamily(
+            "metrics_fleet_workers",
+            "Workers whose samples are merged into the rolling-window quantiles.",
+        )
+        workers.add_metric([], fleet.worker_count)
 
         yield p50
         yield p95
         yield p99
+        yield workers
 
 
 _collector_registered = False
@@ -332,7 +348,7 @@ def observe_http(
         HTTP_ERRORS_TOTAL.labels(route=route, method=method, status=status, outcome=outcome).inc()
 
     ensure_registered()
-    _LAT_WINDOW.record((route, method, status, outcome), duration_seconds)
+    _LAT_WINDOW.record(_KEY_SEP.join((route, method, status, outcome)), duration_seconds)
 
 
 def observe_cache(*, route: str, backend: str, freshness: str) -> None:
@@ -362,6 +378,14 @@ def refresh_finished() -> None:
     HTTP_CACHE_REFRESH_INFLIGHT.dec()
 
 
+def conditional_get(*, route: str, result: str, saved_bytes: int = 0) -> None:
+    """Record the ETag outcome of a hot JSON read."""
+
+    CONDITIONAL_GET_TOTAL.labels(route=route, result=result).inc()
+    if saved_bytes > 0:
+        CONDITIONAL_GET_BYTES_SAVED_TOTAL.labels(route=route).inc(saved_bytes)
+
+
 def current_route_label() -> str:
     """Return best-known route label for the current request."""
 
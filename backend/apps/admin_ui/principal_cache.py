@@ -0,0 +1,368 @@
+"""Short-lived cache of JWT-resolved staff principals.
+
+Every SPA API call with a bearer token used to load ``AuthAccount`` by the token
+subject and then the ``Recruiter`` row before the handler ran, and committed
+``last_seen_at`` every few minutes on top. Resolved principals are now kept per
+process for ``admin_principal_cache_ttl_seconds``:
+
+- entries are keyed by token subject and stamped with the subject's account
+  version; any account or recruiter change that can revoke access (deactivation,
+  role / principal change, deletion) bumps the version on commit, so a stale
+  entry is never served even if a lookup raced with the change;
+- changes are broadcast over Redis so other admin_ui workers bump too;
+- ``last_seen_at`` touches are coalesced in memory and written by a periodic
+  flush with one bulk UPDATE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import Session
+
+from backend.core.content_updates import (
+    ContentUpdateEvent,
+    publish_content_update,
+    run_content_updates_subscriber,
+)
+from backend.core.db import async_session
+from backend.core.settings import get_settings
+from backend.domain.auth_account import AuthAccount
+from backend.domain.models import Recruiter
+
+logger = logging.getLogger(__name__)
+
+ADMIN_PRINCIPAL_INVALIDATION_CHANNEL = "recruitsmart:admin_principal_invalidations"
+KIND_ADMIN_PRINCIPAL_INVALIDATED = "admin_principal_invalidated"
+
+DEFAULT_MAX_ENTRIES = 2048
+LAST_SEEN_MIN_INTERVAL = timedelta(minutes=5)
+_SESSION_INFO_KEY = "admin_principal_invalidations"
+_ACCOUNT_ACCESS_FIELDS = ("username", "is_active", "principal_type", "principal_id", "password_hash")
+
+
+@dataclass(frozen=True)
+class CachedPrincipal:
+    principal: Any
+    username: str
+    recruiter_id: int | None
+    account_version: int
+    expires_at: float
+
+
+@dataclass
+class PrincipalCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    invalidations: int = 0
+
+
+class AdminPrincipalCache:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: int,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = max(0, int(ttl_seconds))
+        self.max_entries = max(1, int(max_entries))
+        self.stats = PrincipalCacheStats()
+        self._clock = clock
+        self._entries: OrderedDict[str, CachedPrincipal] = OrderedDict()
+        self._versions: dict[str, int] = {}
+        self._subjects_by_recruiter: dict[int, set[str]] = {}
+        self._generation = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def version(self, subject: str) -> int:
+        """Current account version; capture it before the DB lookup and pass it to ``put``."""
+        return self._generation * 1_000_000 + self._versions.get(subject, 0)
+
+    def get(self, subject: str) -> CachedPrincipal | None:
+        entry = self._entries.get(subject)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        if entry.expires_at <= self._clock() or entry.account_version != self.version(subject):
+            self._drop(subject)
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(subject)
+        self.stats.hits += 1
+        return entry
+
+    def put(
+        self,
+        subject: str,
+        principal: Any,
+        *,
+        username: str,
+        recruiter_id: int | None,
+        account_version: int,
+    ) -> None:
+        if not self.enabled or account_version != self.version(subject):
+            return
+        self._drop(subject)
+        self._entries[subject] = CachedPrincipal(
+            principal=principal,
+            username=username,
+            recruiter_id=recruiter_id,
+            account_version=account_version,
+            expires_at=self._clock() + self.ttl_seconds,
+        )
+        if recruiter_id is not None:
+            self._subjects_by_recruiter.setdefault(recruiter_id, set()).add(subject)
+        self.stats.stores += 1
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    def invalidate(
+        self,
+        *,
+        subjects: Iterable[str] = (),
+        recruiter_ids: Iterable[int] = (),
+    ) -> None:
+        affected = set(subjects)
+        for recruiter_id in recruiter_ids:
+            affected.update(self._subjects_by_recruiter.get(int(recruiter_id), ()))
+        for subject in affected:
+            self._versions[subject] = self._versions.get(subject, 0) + 1
+            self._drop(subject)
+        self.stats.invalidations += len(affected)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+        self._versions.clear()
+        self._subjects_by_recruiter.clear()
+
+    def _drop(self, subject: str) -> None:
+        entry = self._entries.pop(subject, None)
+        if entry is None or entry.recruiter_id is None:
+            return
+        subjects = self._subjects_by_recruiter.get(entry.recruiter_id)
+        if subjects is not None:
+            subjects.discard(subject)
+            if not subjects:
+                self._subjects_by_recruiter.pop(entry.recruiter_id, None)
+
+
+_cache: AdminPrincipalCache | None = None
+
+
+def get_admin_principal_cache() -> AdminPrincipalCache:
+    global _cache
+    ttl = get_settings().admin_principal_cache_ttl_seconds
+    if _cache is None or _cache.ttl_seconds != ttl:
+        _cache = AdminPrincipalCache(ttl_seconds=ttl)
+    return _cache
+
+
+class RecruiterLastSeenRecorder:
+    """Coalesce ``Recruiter.last_seen_at`` writes into periodic bulk updates."""
+
+    def __init__(self, *, min_interval: timedelta = LAST_SEEN_MIN_INTERVAL) -> None:
+        self.min_interval = min_interval
+        self._pending: dict[int, datetime] = {}
+        self._known: dict[int, datetime] = {}
+        self.running = False
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def touch(self, recruiter_id: int, *, now: datetime, stored: datetime | None = None) -> None:
+        """Schedule a write if the stored ``last_seen_at`` is older than ``min_interval``."""
+        if stored is not None:
+            if stored.tzinfo is None:
+                stored = stored.replace(tzinfo=timezone.utc)
+            known = self._known.get(recruiter_id)
+            if known is None or stored > known:
+                self._known[recruiter_id] = stored
+        last = self._pending.get(recruiter_id) or self._known.get(recruiter_id)
+        if last is not None and now - last <= self.min_interval:
+            return
+        self._pending[recruiter_id] = now
+
+    async def flush(self) -> int:
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, {}
+        try:
+            async with async_session() as session:
+                await session.execute(
+                    update(Recruiter),
+                    [{"id": recruiter_id, "last_seen_at": seen} for recruiter_id, seen in batch.items()],
+                )
+                await session.commit()
+        except Exception:
+            logger.warning("admin_ui.last_seen_flush_failed", extra={"recruiters": len(batch)}, exc_info=True)
+            for recruiter_id, seen in batch.items():
+                self._pending.setdefault(recruiter_id, seen)
+            return 0
+        self._known.update(batch)
+        return len(batch)
+
+    async def run(self, *, stop_event: asyncio.Event, interval_seconds: float) -> None:
+        self.running = True
+        try:
+            while not stop_event.is_set():
+                try:
+                    await asyncio.wait_for(stop_event.wait(), timeout=interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                await self.flush()
+        finally:
+            self.running = False
+            await self.flush()
+
+
+_last_seen_recorder = RecruiterLastSeenRecorder()
+
+
+def get_last_seen_recorder() -> RecruiterLastSeenRecorder:
+    return _last_seen_recorder
+
+
+async def invalidate_admin_principals(
+    *,
+    subjects: Iterable[str] = (),
+    recruiter_ids: Iterable[int] = (),
+) -> None:
+    """Drop cached principals here and broadcast the change to other workers."""
+    subject_list = sorted({str(value) for value in subjects})
+    recruiter_list = sorted({int(value) for value in recruiter_ids})
+    if not subject_list and not recruiter_list:
+        return
+    get_admin_principal_cache().invalidate(subjects=subject_list, recruiter_ids=recruiter_list)
+    await publish_content_update(
+        KIND_ADMIN_PRINCIPAL_INVALIDATED,
+        {"subjects": subject_list, "recruiter_ids": recruiter_list},
+        channel=ADMIN_PRINCIPAL_INVALIDATION_CHANNEL,
+    )
+
+
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _track_background(coro) -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        coro.close()
+        return
+    task = loop.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _changed(obj: Any, name: str) -> bool:
+    return inspect(obj).attrs[name].history.has_changes()
+
+
+def _collect_invalidations(session: Session, flush_context, instances) -> None:
+    subjects: set[str] = set()
+    recruiter_ids: set[int] = set()
+    for obj in session.dirty:
+        if isinstance(obj, AuthAccount):
+            if any(_changed(obj, name) for name in _ACCOUNT_ACCESS_FIELDS):
+                subjects.add(str(obj.username))
+                subjects.update(str(value) for value in inspect(obj).attrs.username.history.deleted or ())
+        elif isinstance(obj, Recruiter) and obj.id is not None:
+            if _changed(obj, "active"):
+                recruiter_ids.add(int(obj.id))
+    for obj in session.deleted:
+        if isinstance(obj, AuthAccount):
+            subjects.add(str(obj.username))
+        elif isinstance(obj, Recruiter) and obj.id is not None:
+            recruiter_ids.add(int(obj.id))
+    if subjects or recruiter_ids:
+        pending = session.info.setdefault(_SESSION_INFO_KEY, (set(), set()))
+        pending[0].update(subjects)
+        pending[1].update(recruiter_ids)
+
+
+def _apply_invalidations(session: Session) -> None:
+    pending = session.info.pop(_SESSION_INFO_KEY, None)
+    if not pending:
+        return
+    subjects, recruiter_ids = pending
+    get_admin_principal_cache().invalidate(subjects=subjects, recruiter_ids=recruiter_ids)
+    _track_background(invalidate_admin_principals(subjects=subjects, recruiter_ids=recruiter_ids))
+
+
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_SESSION_INFO_KEY, None)
+
+
+def install_admin_principal_invalidation_hooks() -> None:
+    """Register ORM hooks that invalidate cached principals on commit (idempotent)."""
+    if event.contains(Session, "before_flush", _collect_invalidations):
+        return
+    event.listen(Session, "before_flush", _collect_invalidations)
+    event.listen(Session, "after_commit", _apply_invalidations)
+    event.listen(Session, "after_rollback", _discard_invalidations)
+
+
+async def _apply_invalidation_event(event_: ContentUpdateEvent) -> None:
+    if event_.kind != KIND_ADMIN_PRINCIPAL_INVALIDATED:
+        return
+    try:
+        subjects = [str(value) for value in event_.payload.get("subjects") or ()]
+        recruiter_ids = [int(value) for value in event_.payload.get("recruiter_ids") or ()]
+    except (TypeError, ValueError):
+        return
+    get_admin_principal_cache().invalidate(subjects=subjects, recruiter_ids=recruiter_ids)
+
+
+async def run_admin_principal_invalidation_listener(
+    *,
+    redis_url: str,
+    stop_event: asyncio.Event,
+    retry_delay_seconds: float = 5.0,
+) -> None:
+    """Apply invalidation broadcasts from other workers until ``stop_event`` is set."""
+    while not stop_event.is_set():
+        try:
+            await run_content_updates_subscriber(
+                redis_url=redis_url,
+                stop_event=stop_event,
+                on_event=_apply_invalidation_event,
+                channel=ADMIN_PRINCIPAL_INVALIDATION_CHANNEL,
+            )
+        except Exception:
+            logger.warning("admin_principal_cache.listener_failed", exc_info=True)
+        if stop_event.is_set():
+            break
+        # Broadcasts sent while disconnected are lost; start from an empty cache.
+        get_admin_principal_cache().clear()
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=retry_delay_seconds)
+        except asyncio.TimeoutError:
+            pass
+
+
+__all__ = [
+    "ADMIN_PRINCIPAL_INVALIDATION_CHANNEL",
+    "AdminPrincipalCache",
+    "CachedPrincipal",
+    "PrincipalCacheStats",
+    "RecruiterLastSeenRecorder",
+    "get_admin_principal_cache",
+    "get_last_seen_recorder",
+    "install_admin_principal_invalidation_hooks",
+    "invalidate_admin_principals",
+    "run_admin_principal_invalidation_listener",
+]
@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import os
 import secrets
 from datetime import date as date_type
 from datetime import datetime, time, timedelta, timezone
@@ -25,11 +27,19 @@ from sqlalchemy import func, or_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 from starlette.datastructures import UploadFile as StarletteUploadFile
-from starlette.responses import FileResponse
+from starlette.responses import FileResponse, Response
 from starlette_wtf import csrf_token
 
 from backend.apps.admin_ui.perf.cache import keys as cache_keys
-from backend.apps.admin_ui.perf.cache.readthrough import get_cached, get_or_compute
+from backend.apps.admin_ui.perf.cache.conditional import (
+    CALENDAR_EVENTS_TABLES,
+    CANDIDATES_LIST_TABLES,
+    DASHBOARD_COUNTS_TABLES,
+    DASHBOARD_INCOMING_TABLES,
+    NOTIFICATIONS_FEED_TABLES,
+    conditional_json,
+)
+from backend.apps.admin_ui.perf.cache.readthrough import get_cached, get_or_compute_json
 from backend.apps.admin_ui.perf.metrics import prometheus as perf_prometheus
 from backend.apps.admin_ui.routers import content_api
 from backend.apps.admin_ui.routers.directory import router as directory_router
@@ -135,14 +145,18 @@ from backend.apps.admin_ui.services.slots import (
     set_slot_outcome,
 )
 from backend.apps.admin_ui.services.slots.core import (
+    BULK_CREATE_CONFLICT_ERROR,
     api_slots_payload,
-    bulk_create_slots,
+    bulk_create_slots_for_recruiters,
     bulk_delete_slots,
     bulk_schedule_reminders,
 )
 from backend.apps.admin_ui.services.staff_chat import (
     add_thread_members as staff_add_thread_members,
 )
+from backend.apps.admin_ui.services.staff_chat import (
+    attachment_etag as staff_attachment_etag,
+)
 from backend.apps.admin_ui.services.staff_chat import (
     create_group_thread,
     create_or_get_direct_thread,
@@ -195,6 +209,7 @@ from backend.core.audit import log_audit_action
 from backend.core.content_updates import KIND_REMINDERS_CHANGED, publish_content_update
 from backend.core.db import async_session
 from backend.core.guards import ensure_slot_scope
+from backend.core.json_response import EncodedJSON, FastJSONResponse
 from backend.core.messenger.channel_state import mark_messenger_channel_healthy
 from backend.core.sanitizers import sanitize_plain_text
 from backend.core.settings import get_settings
@@ -422,20 +437,29 @@ async def api_health():
 async def api_dashboard_summary(
     request: Request,
     principal: Principal = Depends(require_principal),
-) -> JSONResponse:
-    if not getattr(request.app.state, "db_available", True):
-        cache_key = cache_keys.dashboard_counts(principal=principal).value
-        cached_payload = await get_cached(
-            cache_key,
-            expected_type=dict,
-            ttl_seconds=DASHBOARD_COUNTS_CACHE_TTL_SECONDS,
-            stale_seconds=DASHBOARD_COUNTS_CACHE_STALE_SECONDS,
-        )
-        if cached_payload is not None and isinstance(cached_payload[0], dict):
-            return JSONResponse(cached_payload[0])
-        return JSONResponse({"status": "degraded", "reason": "database_unavailable"}, status_code=503)
-
-    return JSONResponse(await dashboard_counts(principal=principal))
+) -> Response:
+    cache_key = cache_keys.dashboard_counts(principal=principal).value
+
+    async def _render() -> JSONResponse:
+        if not getattr(request.app.state, "db_available", True):
+            cached_payload = await get_cached(
+                cache_key,
+                expected_type=dict,
+                ttl_seconds=DASHBOARD_COUNTS_CACHE_TTL_SECONDS,
+                stale_seconds=DASHBOARD_COUNTS_CACHE_STALE_SECONDS,
+            )
+            if cached_payload is not None and isinstance(cached_payload[0], dict):
+                return JSONResponse(cached_payload[0])
+            return JSONResponse({"status": "degraded", "reason": "database_unavailable"}, status_code=503)
+        return JSONResponse(await dashboard_counts(principal=principal))
+
+    return await conditional_json(
+        request,
+        key=cache_key,
+        depends_on=DASHBOARD_COUNTS_TABLES,
+        ttl_seconds=DASHBOARD_COUNTS_CACHE_TTL_SECONDS,
+        render=_render,
+    )
 
 
 class DashboardIncomingResponse(BaseModel):
@@ -465,7 +489,7 @@ async def api_dashboard_incoming(
     ai_level: str = Query(default="all"),
     sort: str = Query(default="priority"),
     principal: Principal = Depends(require_principal),
-) -> JSONResponse:
+) -> Response:
     """Unified incoming queue with server-driven paging, filtering, and advisory AI signals."""
     normalized_page = normalize_waiting_candidates_page(page)
     normalized_page_size = (
@@ -474,43 +498,11 @@ async def api_dashboard_incoming(
         else WAITING_CANDIDATES_DEFAULT_PAGE_SIZE
     )
     normalized_limit = normalize_waiting_candidates_limit(limit) if limit is not None else None
-    if not getattr(request.app.state, "db_available", True):
-        cache_key = cache_keys.dashboard_incoming(
-            principal=principal,
-            limit=normalized_limit,
-            page=normalized_page,
-            page_size=normalized_page_size,
-            city_id=city_id,
-            status=status,
-            channel=channel,
-            owner=owner,
-            waiting=waiting,
-            ai_level=ai_level,
-            sort=sort,
-            search=search,
-        ).value
-        cached_payload = await get_cached(
-            cache_key,
-            expected_type=dict,
-            ttl_seconds=DASHBOARD_INCOMING_CACHE_TTL_SECONDS,
-            stale_seconds=DASHBOARD_INCOMING_CACHE_STALE_SECONDS,
-        )
-        if cached_payload is not None and isinstance(cached_payload[0], dict):
-            return JSONResponse(
-                normalize_waiting_candidates_payload_shape(
-                    cached_payload[0],
-                    page=normalized_page,
-                    page_size=normalized_page_size,
-                    sort=sort,
-                )
-            )
-        return JSONResponse({"status": "degraded", "reason": "database_unavailable"}, status_code=503)
-
-    payload = await get_waiting_candidates_payload(
+    cache_key = cache_keys.dashboard_incoming(
+        principal=principal,
         limit=normalized_limit,
         page=normalized_page,
         page_size=normalized_page_size,
-        search=search,
         city_id=city_id,
         status=status,
         channel=channel,
@@ -518,15 +510,57 @@ async def api_dashboard_incoming(
         waiting=waiting,
         ai_level=ai_level,
         sort=sort,
-        principal=principal,
-    )
-    return JSONResponse(
-        normalize_waiting_candidates_payload_shape(
-            payload,
+        search=search,
+    ).value
+
+    async def _render() -> JSONResponse:
+        if not getattr(request.app.state, "db_available", True):
+            cached_payload = await get_cached(
+                cache_key,
+                expected_type=dict,
+                ttl_seconds=DASHBOARD_INCOMING_CACHE_TTL_SECONDS,
+                stale_seconds=DASHBOARD_INCOMING_CACHE_STALE_SECONDS,
+            )
+            if cached_payload is not None and isinstance(cached_payload[0], dict):
+                return JSONResponse(
+                    normalize_waiting_candidates_payload_shape(
+                        cached_payload[0],
+                        page=normalized_page,
+                        page_size=normalized_page_size,
+                        sort=sort,
+                    )
+                )
+            return JSONResponse({"status": "degraded", "reason": "database_unavailable"}, status_code=503)
+
+        payload = await get_waiting_candidates_payload(
+            limit=normalized_limit,
             page=normalized_page,
             page_size=normalized_page_size,
+            search=search,
+            city_id=city_id,
+            status=status,
+            channel=channel,
+            owner=owner,
+            waiting=waiting,
+            ai_level=ai_level,
             sort=sort,
+            principal=principal,
         )
+        return FastJSONResponse(
+            normalize_waiting_candidates_payload_shape(
+                payload,
+                page=normalized_page,
+                page_size=normalized_page_size,
+                sort=sort,
+            )
+        )
+
+    return await conditional_json(
+        request,
+        key=cache_key,
+        depends_on=DASHBOARD_INCOMING_TABLES,
+        ttl_seconds=DASHBOARD_INCOMING_CACHE_TTL_SECONDS,
+        render=_render,
     )
 
 
@@ -600,6 +634,7 @@ async def api_candidate_chat_threads(
     unread_only: bool = Query(default=False),
     folder: str = Query(default="inbox"),
     limit: int = Query(default=100, ge=1, le=200),
+    offset: int = Query(default=0, ge=0),
     principal: Principal = Depends(require_principal),
 ) -> JSONResponse:
     payload = await list_candidate_chat_threads(
@@ -608,6 +643,7 @@ async def api_candidate_chat_threads(
         unread_only=unread_only,
         folder=_normalize_candidate_chat_folder(folder),  # type: ignore[arg-type]
         limit=limit,
+        offset=offset,
     )
     return JSONResponse(jsonable_encoder(payload))
 
@@ -620,6 +656,7 @@ async def api_candidate_chat_threads_updates(
     unread_only: bool = Query(default=False),
     folder: str = Query(default="inbox"),
     limit: int = Query(default=100, ge=1, le=200),
+    offset: int = Query(default=0, ge=0),
     principal: Principal = Depends(require_principal),
 ) -> JSONResponse:
     since_dt = _parse_datetime_param(since)
@@ -631,6 +668,7 @@ async def api_candidate_chat_threads_updates(
         unread_only=unread_only,
         folder=_normalize_candidate_chat_folder(folder),  # type: ignore[arg-type]
         limit=limit,
+        offset=offset,
     )
     return JSONResponse(jsonable_encoder(payload))
 
@@ -811,17 +849,35 @@ async def api_staff_mark_read(
 @router.get("/staff/attachments/{attachment_id}")
 async def api_staff_attachment(
     attachment_id: int,
+    request: Request,
     principal: Principal = Depends(require_principal),
-) -> FileResponse:
+) -> Response:
     attachment = await staff_get_attachment(attachment_id, principal)
     settings = get_settings()
     base_dir = Path(settings.data_dir).resolve()
     file_path = (base_dir / attachment.storage_path).resolve()
     if not str(file_path).startswith(str(base_dir)):
         raise HTTPException(status_code=403, detail={"message": "Нет доступа"})
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail={"message": "Файл не найден"})
-    return FileResponse(file_path, filename=attachment.filename, media_type=attachment.mime_type or "application/octet-stream")
+    etag = staff_attachment_etag(attachment.storage_path)
+    headers = {"Cache-Control": "private, no-cache"}
+    if etag:
+        # Content-addressed blobs never change, so the hash is a strong validator
+        # for both If-None-Match and If-Range (Range itself is handled by FileResponse).
+        headers["ETag"] = etag
+        if_none_match = request.headers.get("if-none-match") or ""
+        if etag in {tag.strip() for tag in if_none_match.split(",")} or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=headers)
+    try:
+        stat_result = await asyncio.to_thread(os.stat, file_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail={"message": "Файл не найден"}) from None
+    return FileResponse(
+        file_path,
+        filename=attachment.filename,
+        media_type=attachment.mime_type or "application/octet-stream",
+        headers=headers,
+        stat_result=stat_result,
+    )
 
 
 @router.get("/staff/threads/{thread_id}/members")
@@ -943,37 +999,47 @@ async def api_calendar_events(
     if principal.type == "recruiter":
         effective_recruiter_id = principal.id
 
-    if not getattr(request.app.state, "db_available", True):
-        from backend.apps.admin_ui.utils import DEFAULT_TZ as _DEFAULT_TZ
-        cache_key = cache_keys.calendar_events(
-            start_date=start_date,
-            end_date=end_date,
-            recruiter_id=effective_recruiter_id,
-            city_id=city_id,
-            statuses=status,
-            tz_name=_DEFAULT_TZ,
-            include_canceled=False,
-            include_tasks=include_tasks,
-        ).value
-        cached_payload = await get_cached(
-            cache_key,
-            expected_type=dict,
-            ttl_seconds=2.0,
-            stale_seconds=10.0,
-        )
-        if cached_payload is not None and isinstance(cached_payload[0], dict) and "events" in cached_payload[0]:
-            return JSONResponse({"ok": True, **cached_payload[0]})
-        return JSONResponse({"ok": False, "error": "database_unavailable"}, status_code=503)
-
-    result = await get_calendar_events(
+    from backend.apps.admin_ui.utils import DEFAULT_TZ as _DEFAULT_TZ
+    cache_key = cache_keys.calendar_events(
         start_date=start_date,
         end_date=end_date,
         recruiter_id=effective_recruiter_id,
         city_id=city_id,
         statuses=status,
+        tz_name=_DEFAULT_TZ,
+        include_canceled=False,
         include_tasks=include_tasks,
+    ).value
+
+    async def _render() -> JSONResponse:
+        if not getattr(request.app.state, "db_available", True):
+            cached_payload = await get_cached(
+                cache_key,
+                expected_type=dict,
+                ttl_seconds=2.0,
+                stale_seconds=10.0,
+            )
+            if cached_payload is not None and isinstance(cached_payload[0], dict) and "events" in cached_payload[0]:
+                return JSONResponse({"ok": True, **cached_payload[0]})
+            return JSONResponse({"ok": False, "error": "database_unavailable"}, status_code=503)
+
+        result = await get_calendar_events(
+            start_date=start_date,
+            end_date=end_date,
+            recruiter_id=effective_recruiter_id,
+            city_id=city_id,
+            statuses=status,
+            include_tasks=include_tasks,
+        )
+        return FastJSONResponse({"ok": True, **result})
+
+    return await conditional_json(
+        request,
+        key=cache_key,
+        depends_on=CALENDAR_EVENTS_TABLES,
+        ttl_seconds=2.0,
+        render=_render,
     )
-    return JSONResponse({"ok": True, **result})
 
 
 @router.post("/calendar/tasks")
@@ -1109,6 +1175,7 @@ async def api_slots(
 
 class SlotsBulkCreatePayload(BaseModel):
     recruiter_id: int
+    recruiter_ids: Optional[list[int]] = None
     city_id: int
     start_date: str
     end_date: str
@@ -1130,10 +1197,14 @@ async def api_slots_bulk_create(
     _ = await require_csrf_token(request)
     recruiter_id = int(payload.recruiter_id)
     if principal.type == "recruiter":
-        recruiter_id = int(principal.id)
+        recruiter_ids = [int(principal.id)]
+    elif payload.recruiter_ids:
+        recruiter_ids = [int(rid) for rid in payload.recruiter_ids]
+    else:
+        recruiter_ids = [recruiter_id]
 
-    created, error = await bulk_create_slots(
-        recruiter_id=recruiter_id,
+    reports, error = await bulk_create_slots_for_recruiters(
+        recruiter_ids,
         city_id=int(payload.city_id),
         start_date=str(payload.start_date),
         end_date=str(payload.end_date),
@@ -1145,9 +1216,19 @@ async def api_slots_bulk_create(
         include_weekends=bool(payload.include_weekends),
         use_break=bool(payload.use_break),
     )
+    if not error and len(recruiter_ids) == 1:
+        report = reports[recruiter_ids[0]]
+        if report.conflicts and not report.created:
+            error = BULK_CREATE_CONFLICT_ERROR
     if error:
         return JSONResponse({"ok": False, "error": error, "created": 0}, status_code=400)
-    return JSONResponse({"ok": True, "created": int(created)})
+    return JSONResponse(
+        {
+            "ok": True,
+            "created": sum(report.created for report in reports.values()),
+            "recruiters": [report.as_dict() for report in reports.values()],
+        }
+    )
 
 
 class SlotOutcomePayload(BaseModel):
@@ -2012,13 +2093,23 @@ async def api_notifications_feed(
         list_outbox_notifications,
     )
 
-    payload = await list_outbox_notifications(
-        after_id=after_id,
-        limit=limit,
-        status=status,
-        type=type,
+    async def _render() -> JSONResponse:
+        payload = await list_outbox_notifications(
+            after_id=after_id,
+            limit=limit,
+            status=status,
+            type=type,
+        )
+        return JSONResponse({**payload, "degraded": False})
+
+    # Admin-only and not personalized: one validator per filter set.
+    return await conditional_json(
+        request,
+        key=f"notifications:feed:v1:a{after_id}:l{limit}:s{status or 'all'}:t{type or 'all'}",
+        depends_on=NOTIFICATIONS_FEED_TABLES,
+        ttl_seconds=5.0,
+        render=_render,
     )
-    return JSONResponse({**payload, "degraded": False})
 
 
 @router.get("/notifications/logs")
@@ -2662,6 +2753,7 @@ async def api_candidate_delete(
 
 @router.get("/candidates")
 async def api_candidates_list(
+    request: Request,
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=5, le=100),
     search: Optional[str] = Query(None),
@@ -2734,17 +2826,26 @@ async def api_candidates_list(
             f"from:{range_start.isoformat() if range_start else 'none'}:"
             f"to:{range_end.isoformat() if range_end else 'none'}"
         )
-        payload = await get_or_compute(
-            key,
-            expected_type=dict,
+
+        async def _render() -> JSONResponse:
+            body = await get_or_compute_json(
+                key,
+                ttl_seconds=8.0,
+                stale_seconds=12.0,
+                compute=_compute_payload,
+            )
+            return FastJSONResponse(EncodedJSON(body))
+
+        return await conditional_json(
+            request,
+            key=key,
+            depends_on=CANDIDATES_LIST_TABLES,
             ttl_seconds=8.0,
-            stale_seconds=12.0,
-            compute=_compute_payload,
+            render=_render,
         )
-        return JSONResponse(jsonable_encoder(payload))
 
     payload = await _compute_payload()
-    return JSONResponse(jsonable_encoder(payload))
+    return FastJSONResponse(payload)
 
 
 @router.post("/candidates/{candidate_id}/actions/{action_key}")
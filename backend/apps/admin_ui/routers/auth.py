@@ -16,11 +16,12 @@ from backend.apps.admin_ui.security import (
     PrincipalType,
     admin_principal,
     get_client_ip,
-    limiter,
 )
 from backend.core.audit import AuditContext, log_audit_action
-from backend.core.auth import create_access_token, verify_password
+from backend.core.auth import create_access_token, verify_password_async
 from backend.core.db import async_session
+from backend.core.kdf_executor import KDFOverloadedError
+from backend.core.rate_limit import RateLimit, RateLimitScope, get_rate_limiter
 from backend.core.settings import get_settings
 from backend.domain.auth_account import AuthAccount
 from backend.domain.models import Recruiter
@@ -32,6 +33,8 @@ _LOGIN_LOCK_UNTIL: dict[str, float] = {}
 _BRUTE_WINDOW_SECONDS = 15 * 60
 _BRUTE_MAX_ATTEMPTS = 8
 _BRUTE_LOCK_SECONDS = 15 * 60
+# Login attempts per client IP, shared by all workers through Redis.
+LOGIN_RATE_LIMIT = RateLimit(5, 60)
 
 
 def _get_audit_context(request: Request, username: str) -> AuditContext:
@@ -42,9 +45,20 @@ def _get_audit_context(request: Request, username: str) -> AuditContext:
     )
 
 
-# Rate limit key function for failed login attempts - uses IP to prevent brute force
-def _login_key_func(request: Request) -> str:
-    return f"login:{get_client_ip(request)}"
+async def _enforce_login_rate_limit(request: Request) -> None:
+    settings = get_settings()
+    if not settings.rate_limit_enabled or settings.environment == "test":
+        return
+    decision = await get_rate_limiter().check(
+        "admin_ui:login",
+        [RateLimitScope("ip", get_client_ip(request), LOGIN_RATE_LIMIT)],
+    )
+    if not decision.allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Rate limit exceeded: {decision.rule}",
+            headers={"Retry-After": str(decision.retry_after_seconds)},
+        )
 
 
 def _principal_login_key(request: Request, username: str) -> str:
@@ -52,6 +66,25 @@ def _principal_login_key(request: Request, username: str) -> str:
     return f"{get_client_ip(request)}:{uname}"
 
 
+async def _check_credentials(account: AuthAccount | None, password: str, login_key: str) -> bool:
+    """Verify ``password`` on the KDF pool instead of the event loop."""
+    if account is None:
+        return False
+    try:
+        return await verify_password_async(password, account.password_hash, identifier=login_key)
+    except KDFOverloadedError as exc:
+        logger.warning("auth.login.kdf_overloaded", extra={"reason": exc.reason})
+        raise HTTPException(
+            status_code=(
+                status.HTTP_429_TOO_MANY_REQUESTS
+                if exc.reason == "identifier_busy"
+                else status.HTTP_503_SERVICE_UNAVAILABLE
+            ),
+            detail="Login is temporarily unavailable. Try again shortly.",
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
+
+
 def _is_locked(login_key: str) -> tuple[bool, int]:
     now = time.time()
     lock_until = _LOGIN_LOCK_UNTIL.get(login_key, 0)
@@ -90,7 +123,6 @@ oauth_form_dep = Depends(OAuth2PasswordRequestForm)
 
 
 @router.post("/token")
-@limiter.limit("5/minute", key_func=_login_key_func)
 async def login_for_access_token(
     request: Request,
     form_data: OAuth2PasswordRequestForm = oauth_form_dep,
@@ -98,6 +130,7 @@ async def login_for_access_token(
     """
     OAuth2 compatible token login, get an access token for future requests.
     """
+    await _enforce_login_rate_limit(request)
     settings = get_settings()
     login_key = _principal_login_key(request, form_data.username)
     brute_force_enabled = _is_bruteforce_enabled()
@@ -142,9 +175,7 @@ async def login_for_access_token(
                 AuthAccount.is_active.is_(True),
             )
         )
-        if not account or not verify_password(
-            form_data.password, account.password_hash
-        ):
+        if not await _check_credentials(account, form_data.password, login_key):
             if brute_force_enabled:
                 _register_failure(login_key)
             await log_audit_action(
@@ -184,13 +215,13 @@ async def _resolve_principal(account: AuthAccount) -> Principal:
 
 
 @router.post("/login")
-@limiter.limit("5/minute", key_func=_login_key_func)
 async def login(
     request: Request,
     username: str = Form(...),
     password: str = Form(...),
     redirect_to: str | None = Form("/"),
 ):
+    await _enforce_login_rate_limit(request)
     audit_ctx = _get_audit_context(request, username)
     settings = get_settings()
     login_key = _principal_login_key(request, username)
@@ -241,7 +272,7 @@ async def login(
                 AuthAccount.username == username, AuthAccount.is_active.is_(True)
             )
         )
-        if not account or not verify_password(password, account.password_hash):
+        if not await _check_credentials(account, password, login_key):
             if brute_force_enabled:
                 _register_failure(login_key)
             await log_audit_action(
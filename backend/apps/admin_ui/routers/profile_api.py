@@ -19,9 +19,10 @@ from backend.apps.admin_ui.security import Principal, require_csrf_token, requir
 from backend.apps.admin_ui.services.dashboard import dashboard_counts
 from backend.apps.bot.reminders import get_reminder_service
 from backend.core.audit import log_audit_action
-from backend.core.auth import verify_password as verify_auth_password
+from backend.core.auth import verify_password_async as verify_auth_password
 from backend.core.db import async_session
-from backend.core.passwords import hash_password
+from backend.core.kdf_executor import KDFOverloadedError
+from backend.core.passwords import hash_password_async
 from backend.core.sanitizers import sanitize_plain_text
 from backend.domain.auth_account import AuthAccount
 from backend.domain.candidates.models import User
@@ -456,10 +457,17 @@ async def api_profile_change_password(
         )
         if account is None:
             raise HTTPException(status_code=404, detail={"message": "Учётная запись рекрутёра не найдена"})
-        if not verify_auth_password(current_password, account.password_hash):
-            raise HTTPException(status_code=400, detail={"message": "Текущий пароль указан неверно"})
-
-        account.password_hash = hash_password(new_password)
+        identifier = f"recruiter:{principal.id}"
+        try:
+            if not await verify_auth_password(current_password, account.password_hash, identifier=identifier):
+                raise HTTPException(status_code=400, detail={"message": "Текущий пароль указан неверно"})
+            account.password_hash = await hash_password_async(new_password, identifier=identifier)
+        except KDFOverloadedError as exc:
+            raise HTTPException(
+                status_code=503,
+                detail={"message": "Сервис временно перегружен, повторите попытку позже"},
+                headers={"Retry-After": str(exc.retry_after)},
+            ) from exc
         await session.commit()
 
     await log_audit_action(
@@ -8,7 +8,7 @@ import os
 import secrets
 from contextvars import ContextVar
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from typing import Literal, Optional
 
 import jwt
@@ -21,6 +21,11 @@ from sqlalchemy import select
 from starlette.requests import HTTPConnection
 from starlette_wtf import csrf_token
 
+from backend.apps.admin_ui.principal_cache import (
+    LAST_SEEN_MIN_INTERVAL,
+    get_admin_principal_cache,
+    get_last_seen_recorder,
+)
 from backend.core.audit import AuditContext, set_audit_context
 from backend.core.db import async_session
 from backend.core.settings import get_settings
@@ -286,6 +291,31 @@ def _assign_principal(
     return principal
 
 
+def _touch_recruiter_last_seen(recruiter_id: int) -> None:
+    recorder = get_last_seen_recorder()
+    if recorder.running:
+        recorder.touch(recruiter_id, now=datetime.now(timezone.utc))
+
+
+async def _record_recruiter_last_seen(session, recruiter: Recruiter) -> None:
+    """Refresh ``last_seen_at`` at most every few minutes.
+
+    With the periodic flusher running the write is coalesced into its next bulk
+    update; otherwise (tests, scripts) it is committed inline.
+    """
+    now = datetime.now(timezone.utc)
+    last_seen = getattr(recruiter, "last_seen_at", None)
+    if last_seen and last_seen.tzinfo is None:
+        last_seen = last_seen.replace(tzinfo=timezone.utc)
+    recorder = get_last_seen_recorder()
+    if recorder.running:
+        recorder.touch(int(recruiter.id), now=now, stored=last_seen)
+        return
+    if last_seen is None or (now - last_seen) > LAST_SEEN_MIN_INTERVAL:
+        recruiter.last_seen_at = now
+        await session.commit()
+
+
 async def _resolve_session_principal(
     connection: Request | HTTPConnection,
 ) -> Optional[Principal]:
@@ -306,13 +336,7 @@ async def _resolve_session_principal(
         async with async_session() as session:
             recruiter = await session.get(Recruiter, p_id)
             if recruiter and getattr(recruiter, "active", True):
-                now = datetime.now(timezone.utc)
-                last_seen = getattr(recruiter, "last_seen_at", None)
-                if last_seen and last_seen.tzinfo is None:
-                    last_seen = last_seen.replace(tzinfo=timezone.utc)
-                if last_seen is None or (now - last_seen) > timedelta(minutes=5):
-                    recruiter.last_seen_at = now
-                    await session.commit()
+                await _record_recruiter_last_seen(session, recruiter)
                 session_username = connection.session.get("username") if hasattr(connection, "session") else None
                 return _assign_principal(
                     connection,
@@ -368,6 +392,13 @@ async def _resolve_current_principal(
                     username=f"admin:{username}",
                 )
             if username:
+                principal_cache = get_admin_principal_cache()
+                cached = principal_cache.get(username) if principal_cache.enabled else None
+                if cached is not None:
+                    if cached.recruiter_id is not None:
+                        _touch_recruiter_last_seen(cached.recruiter_id)
+                    return _assign_principal(connection, cached.principal, username=cached.username)
+                account_version = principal_cache.version(username)
                 async with async_session() as session:
                     account = await session.scalar(
                         select(AuthAccount).where(
@@ -378,24 +409,34 @@ async def _resolve_current_principal(
                     if account:
                         account_type = (account.principal_type or "").strip().lower()
                         if account_type == "admin":
+                            principal = Principal(type="admin", id=int(account.principal_id))
+                            principal_cache.put(
+                                username,
+                                principal,
+                                username=f"admin:{username}",
+                                recruiter_id=None,
+                                account_version=account_version,
+                            )
                             return _assign_principal(
                                 connection,
-                                Principal(type="admin", id=int(account.principal_id)),
+                                principal,
                                 username=f"admin:{username}",
                             )
                         if account_type == "recruiter":
                             recruiter = await session.get(Recruiter, int(account.principal_id))
                             if recruiter and getattr(recruiter, "active", True):
-                                now = datetime.now(timezone.utc)
-                                last_seen = getattr(recruiter, "last_seen_at", None)
-                                if last_seen and last_seen.tzinfo is None:
-                                    last_seen = last_seen.replace(tzinfo=timezone.utc)
-                                if last_seen is None or (now - last_seen) > timedelta(minutes=5):
-                                    recruiter.last_seen_at = now
-                                    await session.commit()
+                                await _record_recruiter_last_seen(session, recruiter)
+                                principal = Principal(type="recruiter", id=recruiter.id)
+                                principal_cache.put(
+                                    username,
+                                    principal,
+                                    username=f"recruiter:{recruiter.id}",
+                                    recruiter_id=int(recruiter.id),
+                                    account_version=account_version,
+                                )
                                 return _assign_principal(
                                     connection,
-                                    Principal(type="recruiter", id=recruiter.id),
+                                    principal,
                                     username=f"recruiter:{recruiter.id}",
                                 )
                 if token_provided:
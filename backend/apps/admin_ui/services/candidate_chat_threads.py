@@ -5,7 +5,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Any, Literal, Optional
 
 from fastapi import HTTPException, status
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import String, and_, case, cast, func, not_, or_, select
 from sqlalchemy.exc import IntegrityError
 
 from backend.apps.admin_ui.security import (
@@ -18,13 +18,13 @@ from backend.core.db import async_session
 from backend.domain.ai.models import AIOutput
 from backend.domain.candidates.models import (
     CandidateChatRead,
+    CandidateChatThread,
     CandidateChatWorkspace,
-    ChatMessage,
     User,
 )
 from backend.domain.candidates.status import CandidateStatus, get_status_label, is_terminal_status
 from backend.domain.models import Recruiter, recruiter_city_association
-from backend.domain.repositories import find_city_by_plain_name
+from backend.domain.repositories import find_city_by_plain_name, resolve_city_id_and_tz_by_plain_name
 
 _REPLY_SLA_HOURS = 6
 _FOLLOW_UP_HOURS = 24
@@ -43,6 +43,7 @@ _BLOCKED_STATUSES = {
     CandidateStatus.INTRO_DAY_SCHEDULED,
     CandidateStatus.INTRO_DAY_CONFIRMED_PRELIMINARY,
 }
+_TERMINAL_STATUSES = tuple(item for item in CandidateStatus if is_terminal_status(item))
 
 
 def _normalize_principal(principal: Principal) -> Principal:
@@ -286,108 +287,212 @@ async def _load_accessible_user(
     return user
 
 
+def _read_join(principal: Principal):
+    return and_(
+        CandidateChatRead.candidate_id == CandidateChatThread.candidate_id,
+        CandidateChatRead.principal_type == principal.type,
+        CandidateChatRead.principal_id == principal.id,
+    )
+
+
+def _thread_select(principal: Principal, *columns):
+    return (
+        select(*columns)
+        .select_from(CandidateChatThread)
+        .join(User, User.id == CandidateChatThread.candidate_id)
+        .outerjoin(CandidateChatRead, _read_join(principal))
+        .outerjoin(
+            CandidateChatWorkspace,
+            CandidateChatWorkspace.candidate_id == CandidateChatThread.candidate_id,
+        )
+    )
+
+
+def _unread_expr():
+    return CandidateChatThread.inbound_count - func.coalesce(CandidateChatRead.inbound_seen, 0)
+
+
+def _archived_expr():
+    return and_(
+        CandidateChatRead.archived_at.is_not(None),
+        or_(
+            CandidateChatThread.last_message_at.is_(None),
+            CandidateChatThread.last_message_at <= CandidateChatRead.archived_at,
+        ),
+    )
+
+
+def _priority_rank_expr(now: datetime):
+    """SQL mirror of ``_priority_payload`` used for ordering and inbox filtering."""
+    kind = CandidateChatThread.last_message_kind
+    last_at = CandidateChatThread.last_message_at
+    terminal = and_(User.candidate_status.is_not(None), User.candidate_status.in_(_TERMINAL_STATUSES))
+    requires_reply = and_(kind == "candidate", not_(terminal))
+    aging = case(
+        (last_at <= now - timedelta(hours=_FOLLOW_UP_HOURS), _PRIORITY_BUCKETS["follow_up"]),
+        else_=_PRIORITY_BUCKETS["waiting_candidate"],
+    )
+    return case(
+        (and_(requires_reply, last_at <= now - timedelta(hours=_REPLY_SLA_HOURS)), _PRIORITY_BUCKETS["overdue"]),
+        (requires_reply, _PRIORITY_BUCKETS["needs_reply"]),
+        (
+            and_(
+                CandidateChatWorkspace.follow_up_due_at.is_not(None),
+                CandidateChatWorkspace.follow_up_due_at <= now,
+            ),
+            _PRIORITY_BUCKETS["follow_up"],
+        ),
+        (
+            and_(User.candidate_status.in_(tuple(_BLOCKED_STATUSES)), not_(terminal)),
+            _PRIORITY_BUCKETS["blocked"],
+        ),
+        (terminal, _PRIORITY_BUCKETS["terminal"]),
+        (kind == "recruiter", aging),
+        (kind.in_(("bot", "system")), _PRIORITY_BUCKETS["system"]),
+        else_=aging,
+    )
+
+
+async def _scope_clause(
+    principal: Principal,
+    *,
+    recruiter_city_ids: set[int],
+    city_cache: dict[str, Optional[int]],
+):
+    """SQL equivalent of ``_is_accessible_user`` for the thread list.
+
+    Unassigned candidates store free-form city names, so the distinct names
+    present in the inbox are resolved once and matched with ``IN``.
+    """
+    if principal.type == "admin":
+        return None
+    own = User.responsible_recruiter_id == principal.id
+    if not recruiter_city_ids:
+        return own
+    async with async_session() as session:
+        raw_cities = (
+            await session.execute(
+                select(User.city)
+                .distinct()
+                .join(CandidateChatThread, CandidateChatThread.candidate_id == User.id)
+                .where(User.responsible_recruiter_id.is_(None), User.city.is_not(None))
+            )
+        ).scalars().all()
+    city_names: list[str] = []
+    for raw_city in raw_cities:
+        if not raw_city:
+            continue
+        city_key = raw_city.strip().lower()
+        if city_key not in city_cache:
+            city_id, _tz = await resolve_city_id_and_tz_by_plain_name(raw_city)
+            city_cache[city_key] = int(city_id) if city_id is not None else None
+        if city_cache[city_key] in recruiter_city_ids:
+            city_names.append(raw_city)
+    if not city_names:
+        return own
+    return or_(own, and_(User.responsible_recruiter_id.is_(None), User.city.in_(city_names)))
+
+
+def _thread_filters(
+    scope,
+    *,
+    search: Optional[str],
+    unread_only: bool,
+    folder: Literal["inbox", "archive", "all"],
+    now: datetime,
+) -> list:
+    clauses = [scope] if scope is not None else []
+    if unread_only:
+        clauses.append(_unread_expr() > 0)
+    query = (search or "").strip()
+    if query:
+        clauses.append(
+            or_(
+                User.fio.icontains(query, autoescape=True),
+                User.city.icontains(query, autoescape=True),
+                User.telegram_username.icontains(query, autoescape=True),
+                cast(User.telegram_id, String).icontains(query, autoescape=True),
+                CandidateChatThread.last_message_text.icontains(query, autoescape=True),
+            )
+        )
+    if folder == "inbox":
+        clauses.append(not_(_archived_expr()))
+        clauses.append(
+            or_(
+                _priority_rank_expr(now).not_in(
+                    (_PRIORITY_BUCKETS["system"], _PRIORITY_BUCKETS["terminal"])
+                ),
+                _unread_expr() > 0,
+            )
+        )
+    elif folder == "archive":
+        clauses.append(_archived_expr())
+    return clauses
+
+
+async def _latest_event_at(session, principal: Principal, filters: list) -> Optional[datetime]:
+    row = (
+        await session.execute(
+            _thread_select(
+                principal,
+                func.max(CandidateChatThread.last_message_at),
+                func.max(CandidateChatRead.last_read_at),
+                func.max(CandidateChatRead.archived_at),
+                func.max(CandidateChatWorkspace.updated_at),
+            ).where(*filters)
+        )
+    ).one()
+    return max((_as_utc(value) for value in row if value is not None), default=None)
+
+
 async def _load_thread_rows(
     principal: Principal,
+    scope,
+    *,
+    search: Optional[str],
+    unread_only: bool,
+    folder: Literal["inbox", "archive", "all"],
+    limit: int,
+    offset: int,
 ) -> tuple[
-    list[tuple[User, str | None, datetime | None, str | None, str | None, str | None, str | None, dict | None]],
-    dict[int, Optional[datetime]],
-    dict[int, Optional[datetime]],
-    dict[int, int],
-    dict[int, CandidateChatWorkspace],
+    list[tuple[User, CandidateChatThread, Optional[datetime], Optional[datetime], Optional[CandidateChatWorkspace], int]],
+    bool,
+    Optional[datetime],
     dict[int, str],
     dict[int, dict[str, object]],
 ]:
-    latest_sq = (
-        select(
-            ChatMessage.candidate_id.label("candidate_id"),
-            ChatMessage.text.label("text"),
-            ChatMessage.created_at.label("created_at"),
-            ChatMessage.direction.label("direction"),
-            ChatMessage.author_label.label("author_label"),
-            ChatMessage.status.label("status"),
-            ChatMessage.error.label("error"),
-            ChatMessage.payload_json.label("payload_json"),
-            func.row_number()
-            .over(
-                partition_by=ChatMessage.candidate_id,
-                order_by=(ChatMessage.created_at.desc(), ChatMessage.id.desc()),
-            )
-            .label("rn"),
-        )
-    ).subquery()
+    now = datetime.now(timezone.utc)
+    filters = _thread_filters(scope, search=search, unread_only=unread_only, folder=folder, now=now)
 
     async with async_session() as session:
         rows = (
             await session.execute(
-                select(
+                _thread_select(
+                    principal,
                     User,
-                    latest_sq.c.text,
-                    latest_sq.c.created_at,
-                    latest_sq.c.direction,
-                    latest_sq.c.author_label,
-                    latest_sq.c.status,
-                    latest_sq.c.error,
-                    latest_sq.c.payload_json,
+                    CandidateChatThread,
+                    CandidateChatRead.last_read_at,
+                    CandidateChatRead.archived_at,
+                    CandidateChatWorkspace,
+                    _unread_expr().label("unread_count"),
                 )
-                .join(latest_sq, latest_sq.c.candidate_id == User.id)
-                .where(latest_sq.c.rn == 1)
-                .order_by(latest_sq.c.created_at.desc())
+                .where(*filters)
+                .order_by(
+                    _priority_rank_expr(now),
+                    CandidateChatThread.last_message_at.desc(),
+                    CandidateChatThread.candidate_id.desc(),
+                )
+                .offset(offset)
+                .limit(limit + 1)
             )
         ).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        latest_event_at = await _latest_event_at(session, principal, filters)
 
         candidate_ids = [int(row[0].id) for row in rows]
         if not candidate_ids:
-            return [], {}, {}, {}, {}, {}, {}
-
-        read_rows = (
-            await session.execute(
-                select(CandidateChatRead).where(
-                    CandidateChatRead.candidate_id.in_(candidate_ids),
-                    CandidateChatRead.principal_type == principal.type,
-                    CandidateChatRead.principal_id == principal.id,
-                )
-            )
-        ).scalars().all()
-        read_map = {int(row.candidate_id): _as_utc(row.last_read_at) for row in read_rows}
-        archived_map = {
-            int(row.candidate_id): _as_utc(getattr(row, "archived_at", None))
-            for row in read_rows
-        }
-
-        unread_rows = (
-            await session.execute(
-                select(
-                    ChatMessage.candidate_id,
-                    func.count(ChatMessage.id),
-                )
-                .select_from(ChatMessage)
-                .outerjoin(
-                    CandidateChatRead,
-                    and_(
-                        CandidateChatRead.candidate_id == ChatMessage.candidate_id,
-                        CandidateChatRead.principal_type == principal.type,
-                        CandidateChatRead.principal_id == principal.id,
-                    ),
-                )
-                .where(
-                    ChatMessage.candidate_id.in_(candidate_ids),
-                    ChatMessage.direction == "inbound",
-                    or_(
-                        CandidateChatRead.last_read_at.is_(None),
-                        ChatMessage.created_at > CandidateChatRead.last_read_at,
-                    ),
-                )
-                .group_by(ChatMessage.candidate_id)
-            )
-        ).all()
-        unread_map = {int(candidate_id): int(total or 0) for candidate_id, total in unread_rows}
-
-        workspace_rows = (
-            await session.execute(
-                select(CandidateChatWorkspace).where(CandidateChatWorkspace.candidate_id.in_(candidate_ids))
-            )
-        ).scalars().all()
-        workspace_map = {int(row.candidate_id): row for row in workspace_rows}
+            return [], has_more, latest_event_at, {}, {}
 
         recruiter_map: dict[int, str] = {}
         recruiter_ids = {
@@ -432,67 +537,50 @@ async def _load_thread_rows(
                 created_at=created_at,
             )
 
-    return rows, read_map, archived_map, unread_map, workspace_map, recruiter_map, ai_fit_map
+    page = [
+        (user, thread, last_read_at, archived_at, workspace, max(0, int(unread or 0)))
+        for user, thread, last_read_at, archived_at, workspace, unread in rows
+    ]
+    return page, has_more, latest_event_at, recruiter_map, ai_fit_map
 
 
-async def list_threads(
+async def _list_scoped_threads(
     principal: Principal,
+    scope,
     *,
-    search: Optional[str] = None,
-    unread_only: bool = False,
-    folder: Literal["inbox", "archive", "all"] = "inbox",
-    limit: int = 100,
+    search: Optional[str],
+    unread_only: bool,
+    folder: Literal["inbox", "archive", "all"],
+    limit: int,
+    offset: int,
 ) -> dict[str, object]:
-    principal = _normalize_principal(principal)
-    recruiter_city_ids = await _recruiter_city_ids(principal)
-    city_cache: dict[str, Optional[int]] = {}
-    rows, read_map, archived_map, unread_map, workspace_map, recruiter_map, ai_fit_map = await _load_thread_rows(principal)
+    rows, has_more, latest_event_at, recruiter_map, ai_fit_map = await _load_thread_rows(
+        principal,
+        scope,
+        search=search,
+        unread_only=unread_only,
+        folder=folder,
+        limit=max(1, min(limit, 200)),
+        offset=max(0, offset),
+    )
 
-    query = (search or "").strip().lower()
     threads: list[dict[str, object]] = []
-    latest_event_at: Optional[datetime] = None
-
-    for user, last_text, last_created_at, last_direction, last_author_label, last_status, last_error, last_payload_json in rows:
-        if not await _is_accessible_user(
-            user,
-            principal,
-            recruiter_city_ids=recruiter_city_ids,
-            city_cache=city_cache,
-        ):
-            continue
-
-        unread_count = unread_map.get(int(user.id), 0)
-        if unread_only and unread_count <= 0:
-            continue
-
+    for user, thread, last_read_at, archived_at, workspace, unread_count in rows:
+        last_text = thread.last_message_text
+        last_direction = thread.last_direction
         preview = compact_chat_preview(
             last_text,
             fallback="Системное сообщение" if last_direction == "outbound" else "Переписка ещё не началась",
         )
-        haystack = " ".join(
-            value
-            for value in [
-                user.fio,
-                user.city,
-                user.telegram_username,
-                str(user.telegram_id) if user.telegram_id is not None else "",
-                preview,
-            ]
-            if value
-        ).lower()
-        if query and query not in haystack:
-            continue
-
-        last_message_at = _as_utc(last_created_at)
-        last_read_at = read_map.get(int(user.id))
-        archived_at = archived_map.get(int(user.id))
-        workspace = workspace_map.get(int(user.id))
+        last_message_at = _as_utc(thread.last_message_at)
+        last_read_at = _as_utc(last_read_at)
+        archived_at = _as_utc(archived_at)
         workspace_updated_at = _as_utc(workspace.updated_at) if workspace else None
         is_archived = archived_at is not None and (last_message_at is None or last_message_at <= archived_at)
-        last_message_kind = derive_chat_message_kind(
+        last_message_kind = thread.last_message_kind or derive_chat_message_kind(
             last_direction,
-            author_label=last_author_label,
-            payload_json=last_payload_json if isinstance(last_payload_json, dict) else None,
+            author_label=thread.last_author_label,
+            payload_json=thread.last_payload_json if isinstance(thread.last_payload_json, dict) else None,
         )
         priority = _priority_payload(
             user=user,
@@ -501,12 +589,6 @@ async def list_threads(
             follow_up_due_at=workspace.follow_up_due_at if workspace else None,
         )
         priority_bucket = str(priority["priority_bucket"])
-        if folder == "inbox" and is_archived:
-            continue
-        if folder == "archive" and not is_archived:
-            continue
-        if folder == "inbox" and priority_bucket in {"system", "terminal"} and unread_count <= 0:
-            continue
 
         ai_fit = ai_fit_map.get(int(user.id), {})
         risk_hint = str(ai_fit.get("risk_hint") or "").strip() or _default_risk_hint(
@@ -523,8 +605,6 @@ async def list_threads(
             ],
             default=last_message_at,
         )
-        if event_at and (latest_event_at is None or event_at > latest_event_at):
-            latest_event_at = event_at
 
         threads.append(
             {
@@ -567,32 +647,45 @@ async def list_threads(
                     "direction": last_direction,
                     "kind": last_message_kind,
                 },
-                "latest_send_status": str(last_status or "").strip().lower() or None,
-                "latest_send_error": str(last_error or "").strip() or None,
+                "latest_send_status": str(thread.last_status or "").strip().lower() or None,
+                "latest_send_error": str(thread.last_error or "").strip() or None,
                 "unread_count": unread_count,
             }
         )
 
-    threads.sort(
-        key=lambda item: (
-            int(item["priority_rank"]) if isinstance(item.get("priority_rank"), int) else 999,
-            -int(
-                datetime.fromisoformat(
-                    str(
-                        item.get("last_message_at")
-                        or item.get("created_at")
-                        or datetime.now(timezone.utc).isoformat()
-                    )
-                ).timestamp()
-            ),
-        ),
-    )
     return {
-        "threads": threads[: max(1, min(limit, 200))],
+        "threads": threads,
         "latest_event_at": _iso(latest_event_at),
+        "has_more": has_more,
     }
 
 
+async def list_threads(
+    principal: Principal,
+    *,
+    search: Optional[str] = None,
+    unread_only: bool = False,
+    folder: Literal["inbox", "archive", "all"] = "inbox",
+    limit: int = 100,
+    offset: int = 0,
+) -> dict[str, object]:
+    principal = _normalize_principal(principal)
+    scope = await _scope_clause(
+        principal,
+        recruiter_city_ids=await _recruiter_city_ids(principal),
+        city_cache={},
+    )
+    return await _list_scoped_threads(
+        principal,
+        scope,
+        search=search,
+        unread_only=unread_only,
+        folder=folder,
+        limit=limit,
+        offset=offset,
+    )
+
+
 async def wait_for_thread_updates(
     principal: Principal,
     *,
@@ -602,27 +695,44 @@ async def wait_for_thread_updates(
     unread_only: bool = False,
     folder: Literal["inbox", "archive", "all"] = "inbox",
     limit: int = 100,
+    offset: int = 0,
 ) -> dict[str, object]:
     deadline = datetime.now(timezone.utc) + timedelta(seconds=max(timeout, 5))
     since_utc = _as_utc(since)
+    principal = _normalize_principal(principal)
+    scope = await _scope_clause(
+        principal,
+        recruiter_city_ids=await _recruiter_city_ids(principal),
+        city_cache={},
+    )
 
     while True:
-        payload = await list_threads(
-            principal,
+        # Poll the cheap aggregate and only build the page once something changed.
+        filters = _thread_filters(
+            scope,
             search=search,
             unread_only=unread_only,
             folder=folder,
-            limit=limit,
+            now=datetime.now(timezone.utc),
         )
-        latest_event_at = payload.get("latest_event_at")
-        latest_dt = _as_utc(datetime.fromisoformat(latest_event_at)) if latest_event_at else None
+        async with async_session() as session:
+            latest_dt = await _latest_event_at(session, principal, filters)
         if since_utc is None or (latest_dt and latest_dt > since_utc):
+            payload = await _list_scoped_threads(
+                principal,
+                scope,
+                search=search,
+                unread_only=unread_only,
+                folder=folder,
+                limit=limit,
+                offset=offset,
+            )
             payload["updated"] = True
             return payload
         if datetime.now(timezone.utc) >= deadline:
             return {
                 "threads": [],
-                "latest_event_at": latest_event_at,
+                "latest_event_at": _iso(latest_dt),
                 "updated": False,
             }
         await asyncio.sleep(1.0)
@@ -717,16 +827,23 @@ async def mark_read(candidate_id: int, principal: Principal) -> None:
             )
         )
         now = datetime.now(timezone.utc)
+        inbound_seen = (
+            select(func.coalesce(func.max(CandidateChatThread.inbound_count), 0))
+            .where(CandidateChatThread.candidate_id == candidate_id)
+            .scalar_subquery()
+        )
         if state is None:
             state = CandidateChatRead(
                 candidate_id=candidate_id,
                 principal_type=principal.type,
                 principal_id=principal.id,
                 last_read_at=now,
+                inbound_seen=inbound_seen,
             )
             session.add(state)
         else:
             state.last_read_at = now
+            state.inbound_seen = inbound_seen
         try:
             await session.commit()
         except IntegrityError:
@@ -742,6 +859,7 @@ async def mark_read(candidate_id: int, principal: Principal) -> None:
             if state is None:
                 raise
             state.last_read_at = now
+            state.inbound_seen = inbound_seen
             await session.commit()
 
 
@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Dict, Iterable, Optional
 
 from sqlalchemy import select
 
@@ -39,14 +39,7 @@ GLOBAL_DEFAULTS = ReminderPolicyData(
 )
 
 
-async def get_city_reminder_policy(city_id: int) -> ReminderPolicyData:
-    """Return per-city policy if exists, otherwise return global defaults."""
-    async with async_session() as session:
-        row = await session.scalar(
-            select(CityReminderPolicy).where(CityReminderPolicy.city_id == city_id)
-        )
-    if row is None:
-        return GLOBAL_DEFAULTS
+def _policy_from_row(row: CityReminderPolicy) -> ReminderPolicyData:
     return ReminderPolicyData(
         city_id=row.city_id,
         confirm_6h_enabled=row.confirm_6h_enabled,
@@ -59,6 +52,29 @@ async def get_city_reminder_policy(city_id: int) -> ReminderPolicyData:
     )
 
 
+async def get_city_reminder_policy(city_id: int) -> ReminderPolicyData:
+    """Return per-city policy if exists, otherwise return global defaults."""
+    async with async_session() as session:
+        row = await session.scalar(
+            select(CityReminderPolicy).where(CityReminderPolicy.city_id == city_id)
+        )
+    if row is None:
+        return GLOBAL_DEFAULTS
+    return _policy_from_row(row)
+
+
+async def get_city_reminder_policies(city_ids: Iterable[int]) -> Dict[int, ReminderPolicyData]:
+    """Return custom policies for ``city_ids`` in one query; cities without overrides are omitted."""
+    ids = sorted({int(city_id) for city_id in city_ids if city_id is not None})
+    if not ids:
+        return {}
+    async with async_session() as session:
+        rows = await session.scalars(
+            select(CityReminderPolicy).where(CityReminderPolicy.city_id.in_(ids))
+        )
+        return {row.city_id: _policy_from_row(row) for row in rows}
+
+
 async def upsert_city_reminder_policy(
     city_id: int,
     *,
@@ -89,16 +105,7 @@ async def upsert_city_reminder_policy(
         await session.commit()
         await session.refresh(row)
 
-    return ReminderPolicyData(
-        city_id=row.city_id,
-        confirm_6h_enabled=row.confirm_6h_enabled,
-        confirm_3h_enabled=row.confirm_3h_enabled,
-        confirm_2h_enabled=row.confirm_2h_enabled,
-        intro_remind_3h_enabled=row.intro_remind_3h_enabled,
-        quiet_hours_start=row.quiet_hours_start,
-        quiet_hours_end=row.quiet_hours_end,
-        is_custom=True,
-    )
+    return _policy_from_row(row)
 
 
 async def delete_city_reminder_policy(city_id: int) -> bool:
@@ -31,7 +31,7 @@ from backend.apps.admin_ui.services.reschedule_intents import (
 )
 from backend.apps.admin_ui.timezones import DEFAULT_TZ
 from backend.apps.admin_ui.utils import fmt_local, safe_zone
-from backend.apps.bot.metrics import get_test1_metrics_snapshot
+from backend.apps.bot.metrics import get_fleet_test1_metrics_snapshot
 from backend.core.ai.candidate_scorecard import fit_level_from_score
 from backend.core.ai.service import schedule_warm_candidates_ai_outputs
 from backend.core.cache import CacheTTL, get_cache
@@ -397,7 +397,7 @@ async def dashboard_counts(principal: Optional[Principal] = None) -> Dict[str, o
                 select(func.count()).select_from(candidate_stmt.subquery())
             )
 
-        test1_metrics = await get_test1_metrics_snapshot()
+        test1_metrics = await get_fleet_test1_metrics_snapshot()
 
         status_map: Dict[str, int] = {
             (status.value if hasattr(status, "value") else status): count for status, count in rows
@@ -0,0 +1,245 @@
+"""Read, rollover and reconciliation side of the materialized weekly KPI counters.
+
+Member rows are written by ``backend.domain.kpi_counters`` on every slot and
+test-result flush. This module counts them for the dashboard, bootstraps a
+timezone the first time it is materialized, finalizes ``kpi_weekly``
+snapshots once a week rolls over and compares the counters against a full
+recomputation.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.core.db import async_session
+from backend.domain.kpi_counters import (
+    COMPANY_SCOPE,
+    COUNTER_METRICS,
+    company_timezone_name,
+    count_members,
+    counter_timezones,
+    expected_contributions,
+    prune_weeks_before,
+    rebuild_week,
+    resolve_zone,
+    stored_counters,
+    supports_counters,
+    week_start_for,
+)
+from backend.domain.models import KPICounterState, KPIWeekly, KPIWeeklyMember
+
+__all__ = [
+    "CounterReconciliation",
+    "ensure_counters_materialized",
+    "finalize_due_weeks",
+    "load_counter_metrics",
+    "reconcile_kpi_counters",
+    "run_kpi_counter_maintenance",
+]
+
+logger = logging.getLogger(__name__)
+
+_OPTIONAL_TABLES = ("kpi_counter_state", "kpi_weekly_members")
+_WARNED = False
+
+
+@dataclass
+class CounterReconciliation:
+    tz: str
+    week_start: date
+    mismatches: List[Dict[str, object]] = field(default_factory=list)
+    fixed: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+
+def _is_missing_table_error(exc: Exception) -> bool:
+    message = str(exc).lower()
+    return any(name in message for name in _OPTIONAL_TABLES) and (
+        "does not exist" in message or "no such table" in message or "undefinedtable" in message
+    )
+
+
+def _metrics_from_rows(values: Dict[str, int]) -> Dict[str, int]:
+    metrics = {metric: int(values.get(metric, 0)) for metric in COUNTER_METRICS}
+    metrics["completed_test"] = metrics["tested"]
+    return metrics
+
+
+async def load_counter_metrics(
+    tz_key: str,
+    week_starts: Sequence[date],
+    *,
+    scope_ids: Sequence[int] = (COMPANY_SCOPE,),
+) -> Optional[Dict[Tuple[date, int], Dict[str, int]]]:
+    """Materialized metrics keyed by ``(week_start, scope_id)``.
+
+    Only weeks covered by the counters are returned; ``None`` means the
+    timezone is not materialized at all and callers fall back to SQL.
+    """
+    global _WARNED
+    if tz_key not in counter_timezones():
+        return None
+    try:
+        async with async_session() as session:
+            state = await session.get(KPICounterState, tz_key)
+            if state is None:
+                return None
+            weeks = [week for week in week_starts if week >= state.materialized_since]
+            if not weeks:
+                return {}
+            rows = await session.execute(
+                select(KPIWeeklyMember.week_start, KPIWeeklyMember.scope_id, KPIWeeklyMember.metric, func.count())
+                .where(
+                    KPIWeeklyMember.tz == tz_key,
+                    KPIWeeklyMember.week_start.in_(weeks),
+                    KPIWeeklyMember.scope_id.in_(list(scope_ids)),
+                )
+                .group_by(KPIWeeklyMember.week_start, KPIWeeklyMember.scope_id, KPIWeeklyMember.metric)
+            )
+    except SQLAlchemyError as exc:
+        if not _is_missing_table_error(exc):
+            raise
+        if not _WARNED:
+            _WARNED = True
+            logger.warning("kpis.counters_unavailable", extra={"error": str(exc)})
+        return None
+
+    values: Dict[Tuple[date, int], Dict[str, int]] = {
+        (week, int(scope_id)): {} for week in weeks for scope_id in scope_ids
+    }
+    for week_start, scope_id, metric, value in rows:
+        values[(week_start, int(scope_id))][metric] = int(value)
+    return {key: _metrics_from_rows(metrics) for key, metrics in values.items()}
+
+
+async def ensure_counters_materialized(now: Optional[datetime] = None) -> List[str]:
+    """Bootstrap counters for timezones that have never been materialized.
+
+    The current and the previous week are rebuilt from the source tables;
+    from then on the flush hook keeps them up to date.
+    """
+    current = now or datetime.now(timezone.utc)
+    bootstrapped: List[str] = []
+    for tz in counter_timezones():
+        async with async_session() as session:
+            async with session.begin():
+                conn = await session.connection()
+                if not await conn.run_sync(supports_counters):
+                    return bootstrapped
+                if await session.get(KPICounterState, tz) is not None:
+                    continue
+                week_start = week_start_for(current, resolve_zone(tz))
+                previous_start = week_start - timedelta(days=7)
+                for week in (previous_start, week_start):
+                    await conn.run_sync(rebuild_week, tz, week)
+                session.add(
+                    KPICounterState(
+                        tz=tz,
+                        materialized_since=previous_start,
+                        reconciled_at=datetime.now(timezone.utc),
+                    )
+                )
+        bootstrapped.append(tz)
+        logger.info("kpis.counters_bootstrapped", extra={"tz": tz})
+    return bootstrapped
+
+
+async def finalize_due_weeks(now: Optional[datetime] = None) -> List[Tuple[str, date]]:
+    """Finalize the week that just ended in every materialized timezone.
+
+    For the company timezone the finished week is stored in ``kpi_weekly``
+    (unless a snapshot already exists); in every timezone counters older
+    than the finished week are pruned. The state row is claimed with a
+    conditional update, so concurrent workers finalize each week once.
+    """
+    current = now or datetime.now(timezone.utc)
+    company_tz = resolve_zone(company_timezone_name()).key
+    finalized: List[Tuple[str, date]] = []
+    for tz in counter_timezones():
+        previous_start = week_start_for(current, resolve_zone(tz)) - timedelta(days=7)
+        async with async_session() as session:
+            async with session.begin():
+                state = await session.get(KPICounterState, tz)
+                if state is None or (
+                    state.finalized_week_start is not None and state.finalized_week_start >= previous_start
+                ):
+                    continue
+                claimed = await session.execute(
+                    update(KPICounterState)
+                    .where(
+                        KPICounterState.tz == tz,
+                        or_(
+                            KPICounterState.finalized_week_start.is_(None),
+                            KPICounterState.finalized_week_start < previous_start,
+                        ),
+                    )
+                    .values(finalized_week_start=previous_start)
+                )
+                if claimed.rowcount != 1:
+                    continue
+                conn = await session.connection()
+                if tz == company_tz and await session.get(KPIWeekly, previous_start) is None:
+                    if previous_start >= state.materialized_since:
+                        counts = await conn.run_sync(stored_counters, tz, previous_start)
+                    else:
+                        contributions = await conn.run_sync(expected_contributions, tz, previous_start)
+                        counts = count_members(contributions)
+                    metrics = _metrics_from_rows(
+                        {metric: value for (metric, scope_id), value in counts.items() if scope_id == COMPANY_SCOPE}
+                    )
+                    session.add(
+                        KPIWeekly(
+                            week_start=previous_start,
+                            computed_at=datetime.now(timezone.utc),
+                            **metrics,
+                        )
+                    )
+                await conn.run_sync(prune_weeks_before, tz, previous_start)
+        finalized.append((tz, previous_start))
+        logger.info("kpis.week_finalized", extra={"tz": tz, "week_start": previous_start.isoformat()})
+    return finalized
+
+
+async def run_kpi_counter_maintenance(now: Optional[datetime] = None) -> None:
+    await ensure_counters_materialized(now)
+    await finalize_due_weeks(now)
+
+
+async def reconcile_kpi_counters(
+    week_start: date,
+    *,
+    tz_name: Optional[str] = None,
+    fix: bool = False,
+) -> CounterReconciliation:
+    """Compare a week's counters with a full recomputation from slots and test results."""
+    tz = resolve_zone(tz_name or company_timezone_name()).key
+    report = CounterReconciliation(tz=tz, week_start=week_start)
+    async with async_session() as session:
+        async with session.begin():
+            conn = await session.connection()
+            contributions = await conn.run_sync(expected_contributions, tz, week_start)
+            expected = count_members(contributions)
+            actual = await conn.run_sync(stored_counters, tz, week_start)
+            for metric, scope_id in sorted(set(expected) | set(actual)):
+                want = expected.get((metric, scope_id), 0)
+                have = actual.get((metric, scope_id), 0)
+                if want != have:
+                    report.mismatches.append(
+                        {"metric": metric, "scope_id": scope_id, "expected": want, "actual": have}
+                    )
+            if fix and report.mismatches:
+                await conn.run_sync(rebuild_week, tz, week_start)
+                report.fixed = True
+            state = await session.get(KPICounterState, tz)
+            if state is not None:
+                state.reconciled_at = datetime.now(timezone.utc)
+    return report
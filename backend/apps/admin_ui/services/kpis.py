@@ -15,6 +15,17 @@ from sqlalchemy.sql import Select
 
 from backend.core.db import async_session
 from backend.domain.candidates.models import TestResult, User
+from backend.apps.admin_ui.services.kpi_counters import load_counter_metrics
+from backend.domain.kpi_counters import (
+    BOOKING_STATES,
+    BOOKING_STATES_LOWER,
+    COMPANY_SCOPE,
+    CONFIRMED_STATUS,
+    DEFAULT_COMPANY_TZ,
+    INTRO_ATTEND_STATES,
+    INTRO_ATTEND_STATES_LOWER,
+    SUCCESS_OUTCOMES,
+)
 try:
     from backend.domain.models import City, KPIWeekly, Recruiter, Slot, SlotStatus
 except ImportError:  # pragma: no cover - optional KPI storage
@@ -35,17 +46,6 @@ if TYPE_CHECKING:  # pragma: no cover - type hints only
 
 logger = logging.getLogger(__name__)
 
-DEFAULT_COMPANY_TZ = "Europe/Moscow"
-BOOKING_STATES = {
-    SlotStatus.PENDING,
-    SlotStatus.BOOKED,
-    SlotStatus.CONFIRMED_BY_CANDIDATE,
-}
-BOOKING_STATES_LOWER = tuple(state.lower() for state in BOOKING_STATES)
-SUCCESS_OUTCOMES = {"success", "passed", "accepted", "hired"}
-INTRO_ATTEND_STATES = {SlotStatus.CONFIRMED_BY_CANDIDATE}
-INTRO_ATTEND_STATES_LOWER = tuple(state.lower() for state in INTRO_ATTEND_STATES)
-CONFIRMED_STATUS = SlotStatus.CONFIRMED_BY_CANDIDATE.lower()
 _CACHE_TTL_SECONDS = 60
 
 
@@ -538,8 +538,12 @@ async def _load_previous_metrics(
     week_start: date,
     start_utc: datetime,
     end_utc: datetime,
+    *,
+    materialized: Optional[Dict[str, int]] = None,
 ) -> Tuple[Dict[str, int], Optional[str]]:
     if KPIWeekly is None:
+        if materialized is not None:
+            return dict(materialized), None
         async with async_session() as session:
             metrics = await _query_metrics(session, start_utc, end_utc)
             return metrics, None
@@ -570,6 +574,8 @@ async def _load_previous_metrics(
         else:
             raise
 
+    if materialized is not None:
+        return dict(materialized), None
     async with async_session() as fresh_session:
         metrics = await _query_metrics(fresh_session, start_utc, end_utc)
         return metrics, None
@@ -600,13 +606,24 @@ async def _compute_payload(
     recruiter_id: Optional[int] = None,
 ) -> Dict[str, object]:
     window = window or get_week_window(now=reference_now, tz_name=tz_name)
+    previous_start = window.week_start_date - timedelta(days=7)
+    scope_id = recruiter_id if recruiter_id is not None else COMPANY_SCOPE
+    # Materialized counters answer both weeks with one indexed lookup; weeks
+    # or timezones that are not materialized yet fall back to the SQL path.
+    materialized = await load_counter_metrics(
+        getattr(window.tz, "key", str(window.tz)),
+        [window.week_start_date, previous_start],
+        scope_ids=sorted({scope_id, COMPANY_SCOPE}),
+    ) or {}
     async with async_session() as session:
-        metrics = await _query_metrics(
-            session,
-            window.week_start_utc,
-            window.week_end_utc,
-            recruiter_id=recruiter_id,
-        )
+        metrics = materialized.get((window.week_start_date, scope_id))
+        if metrics is None:
+            metrics = await _query_metrics(
+                session,
+                window.week_start_utc,
+                window.week_end_utc,
+                recruiter_id=recruiter_id,
+            )
         details = await _collect_details(
             session,
             window.week_start_utc,
@@ -615,12 +632,12 @@ async def _compute_payload(
             recruiter_id=recruiter_id,
         )
 
-    previous_start = window.week_start_date - timedelta(days=7)
     previous_window = _window_for_week_start(previous_start, window.tz)
     previous_metrics, previous_computed = await _load_previous_metrics(
         previous_start,
         previous_window.week_start_utc,
         previous_window.week_end_utc,
+        materialized=materialized.get((previous_start, COMPANY_SCOPE)),
     )
 
     cards = _serialize_cards(metrics, previous_metrics, details)
@@ -13,6 +13,7 @@ from backend.core.content_updates import (
     KIND_QUESTIONS_CHANGED,
     publish_content_update,
 )
+from backend.domain.content_versions import QUESTIONS_BANK, bump_content_version
 from backend.domain.tests.models import AnswerOption, Question, Test
 
 __all__ = [
@@ -300,6 +301,7 @@ async def update_test_question(
                 )
 
         try:
+            await bump_content_version(session, QUESTIONS_BANK)
             await session.commit()
         except IntegrityError:
             await session.rollback()
@@ -391,6 +393,7 @@ async def create_test_question(
                 )
 
         try:
+            await bump_content_version(session, QUESTIONS_BANK)
             await session.commit()
         except IntegrityError:
             await session.rollback()
@@ -451,6 +454,7 @@ async def clone_test_question(question_id: int) -> Tuple[bool, Optional[int], Op
             )
 
         try:
+            await bump_content_version(session, QUESTIONS_BANK)
             await session.commit()
         except IntegrityError:
             await session.rollback()
@@ -516,6 +520,7 @@ async def reorder_test_questions(
         for idx, qid in enumerate(normalized):
             by_id[qid].order = int(idx)
 
+        await bump_content_version(session, QUESTIONS_BANK)
         await session.commit()
 
     await publish_content_update(KIND_QUESTIONS_CHANGED, {"test_id": clean_test_id})
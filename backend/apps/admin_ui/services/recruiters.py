@@ -16,7 +16,7 @@ from sqlalchemy.orm import selectinload
 
 from backend.apps.admin_ui.utils import format_optional_local
 from backend.core.audit import log_audit_action
-from backend.core.passwords import hash_password
+from backend.core.passwords import hash_password_async
 from backend.core.db import async_session
 from backend.domain.models import City, Recruiter, Slot, SlotStatus, recruiter_city_association
 from backend.domain.auth_account import AuthAccount
@@ -189,7 +189,7 @@ async def create_recruiter(
                     session.add(
                         AuthAccount(
                             username=login,
-                            password_hash=hash_password(password),
+                            password_hash=await hash_password_async(password),
                             principal_type="recruiter",
                             principal_id=recruiter.id,
                             is_active=True,
@@ -257,7 +257,7 @@ async def reset_recruiter_password(recruiter_id: int) -> Dict[str, object]:
             # Create a new auth account if missing (defensive).
             account = AuthAccount(
                 username=login,
-                password_hash=hash_password(temp_password),
+                password_hash=await hash_password_async(temp_password),
                 principal_type="recruiter",
                 principal_id=recruiter_id,
                 is_active=True,
@@ -266,7 +266,7 @@ async def reset_recruiter_password(recruiter_id: int) -> Dict[str, object]:
         else:
             # Keep username in sync with current policy (id).
             account.username = login
-            account.password_hash = hash_password(temp_password)
+            account.password_hash = await hash_password_async(temp_password)
             account.is_active = True
 
         await session.commit()
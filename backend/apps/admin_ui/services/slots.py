@@ -50,6 +50,7 @@ from backend.domain.candidate_status_service import CandidateStatusService
 from backend.domain.candidates.models import User
 from backend.domain.candidates.status import CandidateStatus
 from backend.domain.errors import SlotOverlapError
+from backend.domain.kpi_counters import release_deleted_slots
 from backend.domain.models import (
     DEFAULT_INTERVIEW_DURATION_MIN,
     SLOT_MIN_DURATION_MIN,
@@ -67,6 +68,12 @@ from backend.domain.repositories import (
     reserve_slot,
     slot_status_free_clause,
 )
+from backend.domain.slot_generation import (
+    SlotGenerationReport,
+    SlotTemplate,
+    insert_generated_slots,
+    plan_slot_starts,
+)
 from backend.domain.slot_service import SlotValidationError, ensure_slot_not_in_past
 
 
@@ -84,6 +91,8 @@ __all__ = [
     "recruiters_for_slot_form",
     "create_slot",
     "bulk_create_slots",
+    "bulk_create_slots_for_recruiters",
+    "BULK_CREATE_CONFLICT_ERROR",
     "api_slots_payload",
     "delete_slot",
     "delete_all_slots",
@@ -109,6 +118,9 @@ logger = logging.getLogger(__name__)
 DEFAULT_COMPANY_NAME = "SMART SERVICE"
 DEFAULT_SLOT_TZ = DEFAULT_TZ
 REJECTION_TEMPLATE_KEY = "result_fail"
+BULK_CREATE_CONFLICT_ERROR = (
+    "У рекрутера уже есть слоты в выбранное время. Проверьте расписание и попробуйте другой интервал."
+)
 
 
 NotificationAction = Literal["reschedule", "reject"]
@@ -199,84 +211,46 @@ async def generate_default_day_slots(
         recruiter_tz = getattr(recruiter, "tz", None) or DEFAULT_TZ
         candidate_tz = getattr(target_city, "tz", None) or recruiter_tz
         duration_min = max(duration_min, SLOT_MIN_DURATION_MIN)
-        tz = ZoneInfo(recruiter_tz)
-        tz_name = candidate_tz  # Для сохранения в слоты
         resolved_city_id = getattr(target_city, "id", None)
 
-        def _period(start_h: int, end_h: int) -> List[datetime]:
-            times: List[datetime] = []
-            current = datetime.combine(
-                day, time_type(hour=start_h, minute=0), tzinfo=tz
-            )
-            end_dt = datetime.combine(day, time_type(hour=end_h, minute=0), tzinfo=tz)
-            while current < end_dt:
-                times.append(current)
-                current += timedelta(minutes=duration_min)
-            return times
-
-        local_times = _period(9, 12) + _period(13, 18)
-        start_utc_list = [
-            ensure_aware_utc(dt.astimezone(timezone.utc)) for dt in local_times
-        ]
-
-        # Filter existing slots by exact UTC window of the requested local day to avoid TZ drift.
-        day_start_local = datetime.combine(day, time_type.min, tzinfo=tz)
-        day_end_local = datetime.combine(day, time_type.max, tzinfo=tz)
-        day_start_utc = ensure_aware_utc(day_start_local.astimezone(timezone.utc))
-        day_end_utc = ensure_aware_utc(day_end_local.astimezone(timezone.utc))
-
-        # Ensure no conflicts across recruiters: each recruiter keeps own schedule,
-        # but we still avoid duplicates for the same recruiter/time.
-        existing_rows = await session.scalars(
-            select(Slot.start_utc, Slot.recruiter_id, Slot.city_id).where(
-                Slot.start_utc >= day_start_utc,
-                Slot.start_utc <= day_end_utc,
-                Slot.recruiter_id == recruiter_id,
-            )
+        template = SlotTemplate(
+            start_date=day,
+            end_date=day,
+            window_start=time_type(hour=9),
+            window_end=time_type(hour=18),
+            break_start=time_type(hour=12),
+            break_end=time_type(hour=13),
+            step_min=duration_min,
+            include_weekends=True,
+            restart_after_break=True,
+        )
+        plans = {recruiter_id: plan_slot_starts(template, recruiter_tz)}
+        reports = await insert_generated_slots(
+            session,
+            plans,
+            row_defaults={
+                recruiter_id: {
+                    "city_id": resolved_city_id,
+                    "candidate_city_id": resolved_city_id,
+                    "tz_name": candidate_tz,
+                }
+            },
+            duration_min=duration_min,
         )
-        existing = {
-            ensure_aware_utc(row[0])
-            for row in existing_rows
-            if row and row[0] is not None
-        }
-
-        created = 0
-
-        for start_utc in start_utc_list:
-            try:
-                ensure_slot_not_in_past(
-                    start_utc,
-                    slot_tz=recruiter_tz,
-                )
-            except SlotValidationError:
-                # Stop generation once we hit a past slot to match previous behaviour.
-                return created
-            if start_utc in existing:
-                continue
-            slot = Slot(
-                recruiter_id=recruiter_id,
-                city_id=resolved_city_id,
-                candidate_city_id=resolved_city_id,
-                purpose="interview",
-                tz_name=tz_name,
-                start_utc=start_utc,
-                duration_min=duration_min,
-                status=SlotStatus.FREE,
-            )
-            session.add(slot)
-            created += 1
         await session.commit()
+        report = reports[recruiter_id]
         logger.info(
             "slots.generate_default",
             extra={
                 "recruiter_id": recruiter_id,
                 "city_id": resolved_city_id,
-                "tz": tz_name,
+                "tz": candidate_tz,
                 "day": day.isoformat(),
-                "created_slots": created,
+                "created_slots": report.created,
+                "conflicts": len(report.conflicts),
             },
         )
-        return created
+        return report.created
 
 
 async def list_slots(
@@ -627,6 +601,7 @@ async def delete_all_slots(
             result = await session.execute(base_query)
             slot_ids = [row[0] for row in result]
             await session.execute(delete(Slot).where(Slot.id.in_(slot_ids)))
+            await release_deleted_slots(session, slot_ids)
             await session.commit()
             remaining_after = 0
         else:
@@ -641,6 +616,7 @@ async def delete_all_slots(
             if not slot_ids:
                 return 0, total_before
             await session.execute(delete(Slot).where(Slot.id.in_(slot_ids)))
+            await release_deleted_slots(session, slot_ids)
             await session.commit()
             remaining_after = (
                 await session.scalar(
@@ -719,6 +695,7 @@ async def delete_past_free_slots(
             return 0, 0
 
         await sess.execute(delete(Slot).where(Slot.id.in_(stale_ids)))
+        await release_deleted_slots(sess, stale_ids)
         await sess.commit()
         return count, count
 
@@ -1870,13 +1847,58 @@ def _normalize_utc(dt: datetime) -> datetime:
     return dt.astimezone(timezone.utc).replace(tzinfo=None)
 
 
-def _as_utc(dt: datetime) -> datetime:
-    """Ensure datetime is timezone-aware UTC for database comparisons."""
-    return ensure_aware_utc(dt)
+def _parse_bulk_template(
+    start_date: str,
+    end_date: str,
+    start_time: str,
+    end_time: str,
+    break_start: str,
+    break_end: str,
+    step_min: int,
+    include_weekends: bool,
+    use_break: bool,
+) -> Tuple[Optional[SlotTemplate], Optional[str]]:
+    try:
+        start = date_type.fromisoformat(start_date)
+        end = date_type.fromisoformat(end_date)
+    except ValueError:
+        return None, "Некорректные даты"
+    if end < start:
+        return None, "Дата окончания раньше даты начала"
 
+    try:
+        window_start = time_type.fromisoformat(start_time)
+        window_end = time_type.fromisoformat(end_time)
+        pause_start = time_type.fromisoformat(break_start)
+        pause_end = time_type.fromisoformat(break_end)
+    except ValueError:
+        return None, "Некорректное время"
+
+    if window_end <= window_start:
+        return None, "Время окончания должно быть позже времени начала"
+    if step_min < SLOT_MIN_DURATION_MIN:
+        return None, f"Шаг должен быть не меньше {SLOT_MIN_DURATION_MIN} минут"
+
+    if use_break and pause_end <= pause_start:
+        return None, "Время окончания перерыва должно быть позже его начала"
+
+    return (
+        SlotTemplate(
+            start_date=start,
+            end_date=end,
+            window_start=window_start,
+            window_end=window_end,
+            step_min=step_min,
+            include_weekends=include_weekends,
+            break_start=pause_start if use_break else None,
+            break_end=pause_end if use_break else None,
+        ),
+        None,
+    )
 
-async def bulk_create_slots(
-    recruiter_id: int,
+
+async def bulk_create_slots_for_recruiters(
+    recruiter_ids: List[int],
     start_date: str,
     end_date: str,
     start_time: str,
@@ -1888,162 +1910,125 @@ async def bulk_create_slots(
     use_break: bool,
     *,
     city_id: int,
-) -> Tuple[int, Optional[str]]:
+) -> Tuple[Dict[int, SlotGenerationReport], Optional[str]]:
+    """Apply one working-hours template to several recruiters in a single transaction.
+
+    Times are interpreted in each recruiter's timezone. Slots that collide with an
+    existing schedule are reported per recruiter in ``conflicts`` instead of
+    aborting the whole batch.
+    """
+    recruiter_ids = list(dict.fromkeys(int(rid) for rid in recruiter_ids))
+    if not recruiter_ids:
+        return {}, "Рекрутёр не найден"
+
+    template, error = _parse_bulk_template(
+        start_date,
+        end_date,
+        start_time,
+        end_time,
+        break_start,
+        break_end,
+        step_min,
+        include_weekends,
+        use_break,
+    )
+    if error:
+        return {}, error
+
     async with async_session() as session:
-        recruiter = await session.get(
-            Recruiter,
-            recruiter_id,
-            options=[selectinload(Recruiter.cities)],
+        recruiters = list(
+            await session.scalars(
+                select(Recruiter)
+                .where(Recruiter.id.in_(recruiter_ids))
+                .options(selectinload(Recruiter.cities))
+            )
         )
-        if not recruiter:
-            return 0, "Рекрутёр не найден"
+        if len(recruiters) != len(recruiter_ids):
+            return {}, "Рекрутёр не найден"
 
         city = await session.get(City, city_id)
         if not city:
-            return 0, "Город не найден"
-        linked = _ensure_recruiter_city_link(recruiter, city)
-
-        try:
-            start = date_type.fromisoformat(start_date)
-            end = date_type.fromisoformat(end_date)
-        except ValueError:
-            return 0, "Некорректные даты"
-        if end < start:
-            return 0, "Дата окончания раньше даты начала"
-
-        try:
-            window_start = time_type.fromisoformat(start_time)
-            window_end = time_type.fromisoformat(end_time)
-            pause_start = time_type.fromisoformat(break_start)
-            pause_end = time_type.fromisoformat(break_end)
-        except ValueError:
-            return 0, "Некорректное время"
-
-        if window_end <= window_start:
-            return 0, "Время окончания должно быть позже времени начала"
-        if step_min < SLOT_MIN_DURATION_MIN:
-            return 0, f"Шаг должен быть не меньше {SLOT_MIN_DURATION_MIN} минут"
-
-        if use_break and pause_end <= pause_start:
-            return 0, "Время окончания перерыва должно быть позже его начала"
-
-        start_minutes = window_start.hour * 60 + window_start.minute
-        end_minutes = window_end.hour * 60 + window_end.minute
-        break_start_minutes = pause_start.hour * 60 + pause_start.minute
-        break_end_minutes = pause_end.hour * 60 + pause_end.minute
-
-        recruiter_tz = getattr(recruiter, "tz", None) or DEFAULT_SLOT_TZ
-        city_tz = getattr(city, "tz", None) or recruiter_tz
-
-        planned_pairs: List[Tuple[datetime, datetime]] = []  # (original, normalized)
-        planned_norms = set()
-        current_date = start
-        while current_date <= end:
-            if include_weekends or current_date.weekday() < 5:
-                current_minutes = start_minutes
-                while current_minutes < end_minutes:
-                    if (
-                        use_break
-                        and break_start_minutes < break_end_minutes
-                        and break_start_minutes <= current_minutes < break_end_minutes
-                    ):
-                        current_minutes += step_min
-                        continue
-
-                    hours, minutes = divmod(current_minutes, 60)
-                    time_str = f"{hours:02d}:{minutes:02d}"
-                    # Время задаётся в часовом поясе рекрутера, конвертируется в UTC.
-                    dt_utc = recruiter_time_to_utc(
-                        current_date.isoformat(), time_str, recruiter_tz
-                    )
-                    if not dt_utc:
-                        return 0, "Не удалось преобразовать время в UTC"
-
-                    # Пропускаем прошлые даты/время (валидация через domain service).
-                    try:
-                        ensure_slot_not_in_past(dt_utc, slot_tz=recruiter_tz)
-                    except SlotValidationError:
-                        current_minutes += step_min
-                        continue
-
-                    norm_dt = _normalize_utc(dt_utc)
-                    if norm_dt not in planned_norms:
-                        planned_norms.add(norm_dt)
-                        planned_pairs.append((dt_utc, norm_dt))
-                    current_minutes += step_min
-            current_date += timedelta(days=1)
-
-        if not planned_pairs:
-            return 0, "Нет доступных слотов для создания"
-
-        norm_values = [norm for _, norm in planned_pairs]
-        range_start = min(norm_values)
-        range_end = max(norm_values)
-
-        existing_rows = await session.scalars(
-            select(Slot.start_utc)
-            .where(Slot.recruiter_id == recruiter_id)
-            .where(Slot.start_utc >= _as_utc(range_start))
-            .where(Slot.start_utc <= _as_utc(range_end))
-        )
-        existing_norms = {_normalize_utc(dt) for dt in existing_rows}
-
-        to_insert = [
-            original for original, norm in planned_pairs if norm not in existing_norms
-        ]
-        if not to_insert:
-            return 0, None
+            return {}, "Город не найден"
+        linked = [rec.id for rec in recruiters if _ensure_recruiter_city_link(rec, city)]
+        if linked:
+            await session.flush()
+
+        plans: Dict[int, List[datetime]] = {}
+        row_defaults: Dict[int, Dict[str, object]] = {}
+        for recruiter in recruiters:
+            recruiter_tz = getattr(recruiter, "tz", None) or DEFAULT_SLOT_TZ
+            city_tz = getattr(city, "tz", None) or recruiter_tz
+            # Время задаётся в часовом поясе рекрутера, конвертируется в UTC.
+            plans[recruiter.id] = plan_slot_starts(template, recruiter_tz)
+            row_defaults[recruiter.id] = {
+                "city_id": city_id,
+                "candidate_city_id": city_id,
+                "tz_name": city_tz,
+                "candidate_tz": city_tz,
+            }
 
-        status_free = getattr(SlotStatus, "FREE", "FREE")
-        if hasattr(status_free, "value"):
-            status_free = status_free.value
+        if not any(plans.values()):
+            return {}, "Нет доступных слотов для создания"
 
-        session.add_all(
-            [
-                Slot(
-                    recruiter_id=recruiter_id,
-                    city_id=city_id,
-                    candidate_city_id=city_id,
-                    start_utc=dt,
-                    status=status_free,
-                    duration_min=max(step_min, SLOT_MIN_DURATION_MIN),
-                    tz_name=city_tz,
-                    candidate_tz=city_tz,
-                )
-                for dt in to_insert
-            ]
+        reports = await insert_generated_slots(
+            session,
+            plans,
+            row_defaults=row_defaults,
+            duration_min=template.slot_duration_min,
         )
+        await session.commit()
 
-        # Commit with proper error handling for exclusion constraint violations
-        try:
-            await session.commit()
-        except IntegrityError as exc:
-            await session.rollback()
-            # Check if this is a slot overlap exclusion constraint violation
-            error_msg = str(exc.orig) if hasattr(exc, "orig") else str(exc)
-            if (
-                "slots_no_recruiter_time_overlap_excl" in error_msg
-                or "overlaps" in error_msg.lower()
-            ):
-                return (
-                    0,
-                    "У рекрутера уже есть слоты в выбранное время. Проверьте расписание и попробуйте другой интервал.",
-                )
-            # Re-raise other integrity errors
-            raise
-
+    created_total = sum(report.created for report in reports.values())
+    conflicts_total = sum(len(report.conflicts) for report in reports.values())
+    if created_total or conflicts_total:
         await log_audit_action(
             "slots_bulk_created",
             "slot",
             None,
             changes={
-                "created": len(to_insert),
-                "recruiter_id": recruiter_id,
+                "created": created_total,
+                "conflicts": conflicts_total,
+                "recruiter_ids": recruiter_ids,
                 "city_id": city_id,
                 "city_linked": linked,
             },
         )
-        return len(to_insert), None
+    return reports, None
+
+
+async def bulk_create_slots(
+    recruiter_id: int,
+    start_date: str,
+    end_date: str,
+    start_time: str,
+    end_time: str,
+    break_start: str,
+    break_end: str,
+    step_min: int,
+    include_weekends: bool,
+    use_break: bool,
+    *,
+    city_id: int,
+) -> Tuple[int, Optional[str]]:
+    reports, error = await bulk_create_slots_for_recruiters(
+        [recruiter_id],
+        start_date,
+        end_date,
+        start_time,
+        end_time,
+        break_start,
+        break_end,
+        step_min,
+        include_weekends,
+        use_break,
+        city_id=city_id,
+    )
+    if error:
+        return 0, error
+    report = reports[recruiter_id]
+    if report.conflicts and not report.created:
+        return 0, BULK_CREATE_CONFLICT_ERROR
+    return report.created, None
 
 
 def _format_slot_local_time(slot: Slot, tz_override: Optional[str] = None) -> str:
@@ -17,6 +17,7 @@ from backend.apps.admin_ui.utils import (
     validate_timezone_name,
 )
 from backend.core.db import async_session
+from backend.domain.kpi_counters import release_deleted_slots
 from backend.domain.models import (
     City,
     Recruiter,
@@ -236,6 +237,7 @@ async def delete_all_slots(*, force: bool = False, principal=None) -> Tuple[int,
             slot_ids = [row[0] for row in result]
             if slot_ids:
                 await session.execute(delete(Slot).where(Slot.id.in_(slot_ids)))
+                await release_deleted_slots(session, slot_ids)
                 await session.commit()
             remaining_after = 0
         else:
@@ -250,6 +252,7 @@ async def delete_all_slots(*, force: bool = False, principal=None) -> Tuple[int,
             if not slot_ids:
                 return 0, total_before
             await session.execute(delete(Slot).where(Slot.id.in_(slot_ids)))
+            await release_deleted_slots(session, slot_ids)
             await session.commit()
             remaining_after = (
                 await session.scalar(select(func.count()).select_from(base_query.subquery())) or 0
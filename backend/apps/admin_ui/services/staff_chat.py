@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
+import os
+import re
 import uuid
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import BinaryIO, Iterable, List, Optional
 
 from fastapi import HTTPException, UploadFile, status
 from sqlalchemy import select, func, and_, or_
@@ -38,6 +41,10 @@ ALLOWED_MIME_TYPES = {
 }
 
 MAX_ATTACHMENT_SIZE_MB = 20
+ATTACHMENT_CHUNK_SIZE = 1024 * 1024
+# Unreferenced blobs younger than this may still belong to an in-flight message.
+ORPHAN_BLOB_GRACE = timedelta(hours=1)
+_SHA256_HEX_RE = re.compile(r"[0-9a-f]{64}")
 DEFAULT_GROUP_TITLE = "Общий чат отдела"
 
 
@@ -613,35 +620,147 @@ async def list_messages(thread_id: int, principal: Principal, limit: int = 50, b
         }
 
 
-def _store_attachment(thread_id: int, upload: UploadFile) -> dict:
+def _attachment_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail={"message": f"Файл слишком большой (лимит {MAX_ATTACHMENT_SIZE_MB} МБ)"},
+    )
+
+
+def _copy_upload_to_disk(source: BinaryIO, target: Path, limit: int) -> tuple[int, str]:
+    """Copy an upload to ``target`` chunk by chunk, hashing as we go.
+
+    Runs in a worker thread. Returns ``(size, sha256)``; raises ``OverflowError``
+    as soon as more than ``limit`` bytes were read so the caller can abort early.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with target.open("wb") as handle:
+        while True:
+            chunk = source.read(ATTACHMENT_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > limit:
+                raise OverflowError(size)
+            digest.update(chunk)
+            handle.write(chunk)
+    return size, digest.hexdigest()
+
+
+def _commit_blob(tmp_path: Path, blob_path: Path) -> None:
+    """Move a fully written upload into content-addressed storage (dedup by hash).
+
+    Blobs are shared between attachments and never removed on the request path;
+    a reused blob gets a fresh mtime so the orphan sweep leaves it alone until
+    the referencing message has had time to commit.
+    """
+    blob_path.parent.mkdir(parents=True, exist_ok=True)
+    if blob_path.exists():
+        tmp_path.unlink(missing_ok=True)
+        try:
+            os.utime(blob_path)
+        except FileNotFoundError:
+            # Swept between the check and the touch: store this copy instead.
+            pass
+        else:
+            return
+    os.replace(tmp_path, blob_path)
+
+
+def _stale_blob_paths(blob_root: Path, cutoff: float) -> List[Path]:
+    if not blob_root.is_dir():
+        return []
+    return [path for path in blob_root.rglob("*") if path.is_file() and path.stat().st_mtime < cutoff]
+
+
+def _unlink_if_stale(path: Path, cutoff: float) -> bool:
+    try:
+        if path.stat().st_mtime >= cutoff:
+            return False
+        path.unlink()
+    except FileNotFoundError:
+        return False
+    return True
+
+
+async def sweep_orphan_attachment_blobs(
+    *,
+    grace: timedelta = ORPHAN_BLOB_GRACE,
+    batch_size: int = 500,
+) -> int:
+    """Delete stored blobs no ``StaffMessageAttachment`` references.
+
+    Orphans are left behind by messages that failed after their files were
+    stored. Only blobs untouched for ``grace`` are considered, and the mtime is
+    re-checked right before unlinking, so uploads still in flight keep theirs.
+    """
+    data_dir = Path(get_settings().data_dir)
+    blob_root = data_dir / "staff_uploads" / "blobs"
+    cutoff = (datetime.now(timezone.utc) - grace).timestamp()
+    candidates = await asyncio.to_thread(_stale_blob_paths, blob_root, cutoff)
+    removed = 0
+    for start in range(0, len(candidates), batch_size):
+        chunk = {str(path.relative_to(data_dir)): path for path in candidates[start : start + batch_size]}
+        async with async_session() as session:
+            referenced = set(
+                (
+                    await session.scalars(
+                        select(StaffMessageAttachment.storage_path).where(
+                            StaffMessageAttachment.storage_path.in_(list(chunk))
+                        )
+                    )
+                ).all()
+            )
+        for storage_path, path in chunk.items():
+            if storage_path not in referenced and await asyncio.to_thread(_unlink_if_stale, path, cutoff):
+                removed += 1
+    return removed
+
+
+async def _store_attachment(thread_id: int, upload: UploadFile) -> dict:
     settings = get_settings()
     data_dir = Path(settings.data_dir)
-    upload_dir = data_dir / "staff_uploads" / f"thread_{thread_id}"
-    upload_dir.mkdir(parents=True, exist_ok=True)
+    limit = MAX_ATTACHMENT_SIZE_MB * 1024 * 1024
+    if upload.size is not None and upload.size > limit:
+        raise _attachment_too_large()
+
+    tmp_dir = data_dir / "staff_uploads" / "tmp"
+    await asyncio.to_thread(tmp_dir.mkdir, parents=True, exist_ok=True)
+    tmp_path = tmp_dir / f"thread_{thread_id}_{uuid.uuid4().hex}.part"
 
     original_name = upload.filename or "file"
-    ext = Path(original_name).suffix
-    storage_name = f"{uuid.uuid4().hex}{ext}"
-    storage_path = upload_dir / storage_name
-
-    contents = upload.file.read()
-    size = len(contents)
-    if size > MAX_ATTACHMENT_SIZE_MB * 1024 * 1024:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail={"message": f"Файл слишком большой (лимит {MAX_ATTACHMENT_SIZE_MB} МБ)"},
-        )
+    ext = Path(original_name).suffix.lower()[:16]
+
+    try:
+        size, sha256 = await asyncio.to_thread(_copy_upload_to_disk, upload.file, tmp_path, limit)
+    except OverflowError:
+        await asyncio.to_thread(tmp_path.unlink, missing_ok=True)
+        raise _attachment_too_large() from None
+    except BaseException:
+        await asyncio.to_thread(tmp_path.unlink, missing_ok=True)
+        raise
 
-    storage_path.write_bytes(contents)
+    blob_path = data_dir / "staff_uploads" / "blobs" / sha256[:2] / f"{sha256}{ext}"
+    await asyncio.to_thread(_commit_blob, tmp_path, blob_path)
 
     return {
         "filename": original_name,
         "mime_type": upload.content_type,
         "size": size,
-        "storage_path": str(storage_path.relative_to(data_dir)),
+        "sha256": sha256,
+        "storage_path": str(blob_path.relative_to(data_dir)),
     }
 
 
+def attachment_etag(storage_path: str) -> Optional[str]:
+    """Strong ETag for content-addressed attachments, ``None`` for legacy files."""
+    stem = Path(storage_path).stem
+    if _SHA256_HEX_RE.fullmatch(stem):
+        return f'"{stem}"'
+    return None
+
+
 async def send_message(
     thread_id: int,
     principal: Principal,
@@ -666,13 +785,15 @@ async def send_message(
         await session.flush()
 
         attachments = []
+        # Blobs stored before a later failure (e.g. the next file hits the size
+        # limit) stay on disk; sweep_orphan_attachment_blobs removes them.
         for upload in files or []:
             if upload.content_type and upload.content_type not in ALLOWED_MIME_TYPES:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail={"message": "Недопустимый тип файла"},
                 )
-            meta = _store_attachment(thread_id, upload)
+            meta = await _store_attachment(thread_id, upload)
             attachments.append(
                 StaffMessageAttachment(
                     message_id=msg.id,
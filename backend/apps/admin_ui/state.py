@@ -45,6 +45,7 @@ from backend.apps.bot.services import (
     configure as configure_bot_services,
 )
 from backend.apps.bot.state_store import build_state_manager, can_connect_redis
+from backend.core.messenger.delivery_engine import MessageDeliveryEngine
 from backend.core.messenger.max_recovery import MaxDeliveryRecoveryWorker
 from backend.core.redis_factory import create_redis_client
 from backend.core.settings import get_settings
@@ -152,6 +153,7 @@ class BotIntegration:
     bot_runner_stop: asyncio.Event | None = None
     notification_watch_task: asyncio.Task | None = None
     max_delivery_recovery_worker: MaxDeliveryRecoveryWorker | None = None
+    message_delivery_engine: MessageDeliveryEngine | None = None
 
     @classmethod
     def null_integration(cls) -> BotIntegration:
@@ -225,6 +227,11 @@ class BotIntegration:
                 await self.max_delivery_recovery_worker.shutdown()
             except Exception:
                 logger.exception("Failed to shutdown MAX delivery recovery worker cleanly")
+        if self.message_delivery_engine is not None:
+            try:
+                await self.message_delivery_engine.shutdown()
+            except Exception:
+                logger.exception("Failed to shutdown message delivery engine cleanly")
 
 
 def _build_bot(settings) -> tuple[Bot | None, bool]:
@@ -596,6 +603,12 @@ async def setup_bot_state(app: FastAPI) -> BotIntegration:
         integration.max_delivery_recovery_worker = worker
         app.state.max_delivery_recovery_worker = worker
 
+    if bool(getattr(settings, "message_delivery_engine_enabled", False)):
+        engine = MessageDeliveryEngine(settings=settings)
+        engine.start()
+        integration.message_delivery_engine = engine
+        app.state.message_delivery_engine = engine
+
     return integration
 
 
@@ -0,0 +1,226 @@
+"""Static asset serving for the admin SPA build.
+
+- Precompressed variants: ``frontend/app/scripts/precompress-assets.mjs`` writes
+  ``.br``/``.gz`` next to the build output; we pick one by ``Accept-Encoding``
+  and send it unchanged, so no worker spends CPU compressing bundles.
+- Hashed filenames (``name-<hash>.js``) get ``immutable`` year-long caching;
+  ``index.html`` is revalidated with a strong content-hash ETag (``304``).
+- Bodies go out via the ASGI ``zerocopysend``/``pathsend`` extensions when the
+  server offers them (``sendfile``), including single byte ranges; otherwise
+  Starlette's chunked reads are used.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mimetypes
+import os
+import re
+import stat
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Receive, Scope, Send
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Vite emits `[name]-[hash].[ext]` with an 8-char base64url hash.
+_HASHED_NAME_RE = re.compile(r"-[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$")
+# Preferred first; only encodings the build step produces.
+_ENCODINGS: tuple[tuple[str, str], ...] = (("br", ".br"), ("gzip", ".gz"))
+
+_etag_lock = Lock()
+_etag_cache: dict[str, tuple[int, int, str]] = {}
+
+
+def is_hashed_asset(path: str | os.PathLike[str]) -> bool:
+    return bool(_HASHED_NAME_RE.search(os.path.basename(path)))
+
+
+def accepted_encodings(accept_encoding: str | None) -> list[str]:
+    """Encodings from ``_ENCODINGS`` the client accepts (q > 0), in server preference order."""
+
+    if not accept_encoding:
+        return []
+    weights: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[token.strip()] = quality
+    wildcard = weights.get("*", 0.0)
+    return [name for name, _ in _ENCODINGS if weights.get(name, wildcard) > 0]
+
+
+def select_variant(
+    path: str | os.PathLike[str],
+    stat_result: os.stat_result,
+    accept_encoding: str | None,
+) -> tuple[str, os.stat_result, str | None]:
+    """Return ``(path, stat, content_encoding)`` of the best precompressed sibling, if any."""
+
+    encodings = accepted_encodings(accept_encoding)
+    if encodings:
+        for name, suffix in _ENCODINGS:
+            if name not in encodings:
+                continue
+            candidate = f"{os.fspath(path)}{suffix}"
+            try:
+                candidate_stat = os.stat(candidate)
+            except OSError:
+                continue
+            # A variant older than its source is left over from a previous build
+            # (whole seconds: the build step copies mtimes with ms precision).
+            if stat.S_ISREG(candidate_stat.st_mode) and int(candidate_stat.st_mtime) >= int(stat_result.st_mtime):
+                return candidate, candidate_stat, name
+    return os.fspath(path), stat_result, None
+
+
+def strong_etag(path: str | os.PathLike[str], stat_result: os.stat_result) -> str:
+    """Content-hash ETag, recomputed only when size or mtime changes."""
+
+    key = os.fspath(path)
+    with _etag_lock:
+        cached = _etag_cache.get(key)
+    if cached is not None and cached[0] == stat_result.st_mtime_ns and cached[1] == stat_result.st_size:
+        return cached[2]
+    digest = hashlib.sha256()
+    with open(key, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 16), b""):
+            digest.update(chunk)
+    etag = f'"{digest.hexdigest()[:32]}"'
+    with _etag_lock:
+        _etag_cache[key] = (stat_result.st_mtime_ns, stat_result.st_size, etag)
+    return etag
+
+
+class ZeroCopyFileResponse(FileResponse):
+    """``FileResponse`` that hands the file to the server for ``sendfile`` when possible."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self._zerocopy = (
+            "http.response.zerocopysend" in scope.get("extensions", {}) and scope["method"].upper() != "HEAD"
+        )
+        await super().__call__(scope, receive, send)
+
+    async def _handle_simple(self, send: Send, send_header_only: bool, send_pathsend: bool) -> None:
+        if not getattr(self, "_zerocopy", False) or send_header_only:
+            await super()._handle_simple(send, send_header_only, send_pathsend)
+            return
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        await self._zerocopy_send(send, offset=None, count=None)
+
+    async def _handle_single_range(
+        self, send: Send, start: int, end: int, file_size: int, send_header_only: bool
+    ) -> None:
+        if not getattr(self, "_zerocopy", False) or send_header_only:
+            await super()._handle_single_range(send, start, end, file_size, send_header_only)
+            return
+        self.headers["content-range"] = f"bytes {start}-{end - 1}/{file_size}"
+        self.headers["content-length"] = str(end - start)
+        await send({"type": "http.response.start", "status": 206, "headers": self.raw_headers})
+        await self._zerocopy_send(send, offset=start, count=end - start)
+
+    async def _zerocopy_send(self, send: Send, *, offset: int | None, count: int | None) -> None:
+        fd = await anyio.to_thread.run_sync(os.open, os.fspath(self.path), os.O_RDONLY)
+        try:
+            message: dict[str, Any] = {"type": "http.response.zerocopysend", "file": fd, "more_body": False}
+            if offset is not None:
+                message["offset"] = offset
+            if count is not None:
+                message["count"] = count
+            await send(message)
+        finally:
+            os.close(fd)
+
+
+def _file_response(
+    path: str | os.PathLike[str],
+    stat_result: os.stat_result,
+    request_headers: Headers,
+    *,
+    status_code: int = 200,
+    revalidate: bool = False,
+    immutable_hashed: bool = False,
+) -> ZeroCopyFileResponse:
+    served_path, served_stat, encoding = select_variant(path, stat_result, request_headers.get("accept-encoding"))
+    headers: dict[str, str] = {}
+    if encoding is not None:
+        headers["content-encoding"] = encoding
+    if revalidate:
+        headers["cache-control"] = REVALIDATE_CACHE_CONTROL
+        headers["etag"] = strong_etag(served_path, served_stat)
+    elif immutable_hashed and is_hashed_asset(path):
+        headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+    headers["vary"] = "Accept-Encoding"
+    return ZeroCopyFileResponse(
+        served_path,
+        status_code=status_code,
+        headers=headers,
+        # Content type follows the original name, not the `.br`/`.gz` suffix.
+        media_type=mimetypes.guess_type(os.fspath(path))[0] or "text/plain",
+        stat_result=served_stat,
+    )
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """``StaticFiles`` serving precompressed variants; ``immutable_hashed`` marks hashed names immutable."""
+
+    def __init__(self, *args: Any, immutable_hashed: bool = False, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.immutable_hashed = immutable_hashed
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        response = _file_response(
+            full_path,
+            stat_result,
+            request_headers,
+            status_code=status_code,
+            immutable_hashed=self.immutable_hashed,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def spa_file_response(request: Request, path: Path, *, revalidate: bool = False) -> Response:
+    """Serve a file of the SPA build; ``revalidate`` is for ``index.html`` (strong ETag, ``304``)."""
+
+    stat_result = os.stat(path)
+    response = _file_response(path, stat_result, request.headers, revalidate=revalidate, immutable_hashed=True)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and response.headers["etag"] in [tag.strip(" W/") for tag in if_none_match.split(",")]:
+        return NotModifiedResponse(response.headers)
+    return response
+
+
+__all__ = [
+    "IMMUTABLE_CACHE_CONTROL",
+    "PrecompressedStaticFiles",
+    "REVALIDATE_CACHE_CONTROL",
+    "ZeroCopyFileResponse",
+    "accepted_encodings",
+    "is_hashed_asset",
+    "select_variant",
+    "spa_file_response",
+    "strong_etag",
+]
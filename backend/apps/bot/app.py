@@ -22,8 +22,11 @@ from backend.core.content_updates import (
     ContentUpdateEvent,
     run_content_updates_subscriber,
 )
+from backend.core.fleet_metrics import build_fleet_metrics_backend, get_fleet_metrics
 from backend.core.logging import configure_logging
 from backend.core.settings import get_settings
+from backend.core.table_versions import install_table_version_hooks
+from backend.domain.kpi_counters import install_kpi_counter_hooks
 
 from .config import BOT_TOKEN, DEFAULT_BOT_PROPERTIES
 from .handlers import register_routers
@@ -115,6 +118,8 @@ async def create_application(
     token: str | None = None,
 ) -> tuple[Bot, Dispatcher, StateManager, ReminderService, NotificationService]:
     """Create and configure the bot application components."""
+    install_kpi_counter_hooks()
+    install_table_version_hooks()
     bot = create_bot(token)
     dispatcher = create_dispatcher()
     settings = get_settings()
@@ -153,6 +158,7 @@ async def main() -> None:
     heartbeat_task: asyncio.Task | None = None
     content_updates_stop = asyncio.Event()
     content_updates_task: asyncio.Task | None = None
+    fleet_metrics_task: asyncio.Task | None = None
     bot: Bot | None = None
     reminder_service: ReminderService | None = None
     notification_service: NotificationService | None = None
@@ -190,6 +196,13 @@ async def main() -> None:
 
     try:
         bot, dispatcher, _, reminder_service, notification_service = await create_application()
+        if getattr(settings, "analytics_buffer_enabled", False):
+            from backend.domain.analytics_buffer import (
+                analytics_buffer_config_from_settings,
+                start_analytics_buffer,
+            )
+
+            start_analytics_buffer(analytics_buffer_config_from_settings(settings))
         # Start notification service to process outbox queue only in runtimes
         # that explicitly own delivery responsibilities.
         if settings.bot_notification_runtime_enabled:
@@ -200,10 +213,10 @@ async def main() -> None:
 
         async def _handle_content_update(event: ContentUpdateEvent) -> None:
             if event.kind == KIND_QUESTIONS_CHANGED:
-                # refresh_questions_bank uses sync SQLAlchemy session; run it off the event loop.
-                from backend.apps.bot.config import refresh_questions_bank
+                from backend.apps.bot.config import ensure_questions_bank, invalidate_questions_bank
 
-                await asyncio.to_thread(refresh_questions_bank)
+                invalidate_questions_bank()
+                await ensure_questions_bank()
                 logging.info("Content update applied: questions refreshed")
                 return
 
@@ -263,6 +276,17 @@ async def main() -> None:
 
         if settings.redis_url:
             content_updates_task = asyncio.create_task(_content_updates_supervisor(settings.redis_url))
+        fleet_sync_interval = getattr(settings, "metrics_fleet_sync_interval_seconds", 0)
+        fleet_backend = build_fleet_metrics_backend(settings) if fleet_sync_interval > 0 else None
+        if fleet_backend is not None:
+            # Publish bot counters so admin_ui workers report fleet-wide totals.
+            fleet_metrics_task = asyncio.create_task(
+                get_fleet_metrics().run(
+                    fleet_backend,
+                    stop_event=content_updates_stop,
+                    interval_seconds=fleet_sync_interval,
+                )
+            )
 
         await bot.delete_webhook(drop_pending_updates=False)
         me = await bot.get_me()
@@ -317,6 +341,10 @@ async def main() -> None:
             content_updates_task.cancel()
             with suppress(asyncio.CancelledError):
                 await content_updates_task
+        if fleet_metrics_task is not None:
+            fleet_metrics_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await fleet_metrics_task
         with suppress(FileNotFoundError):
             heartbeat_file.unlink()
         if reminder_service is not None:
@@ -324,6 +352,12 @@ async def main() -> None:
         if notification_service is not None:
             await notification_service.shutdown()
         reset_bootstrap_notification_service()
+        try:
+            from backend.domain.analytics_buffer import stop_analytics_buffer
+
+            await stop_analytics_buffer()
+        except Exception:
+            logging.debug("bot.analytics_buffer_stop_error", exc_info=True)
         if bot is not None:
             with suppress(Exception):
                 await bot.session.close()
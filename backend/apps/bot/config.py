@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
 import logging
@@ -14,7 +15,8 @@ from aiogram.client.bot import DefaultBotProperties
 from aiogram.enums import ParseMode
 
 from backend.core.settings import get_settings
-from backend.domain.test_questions import load_all_test_questions
+from backend.domain.content_versions import QUESTIONS_BANK, get_content_version
+from backend.domain.test_questions import load_all_test_questions, load_all_test_questions_async
 from backend.domain.tests.bootstrap import DEFAULT_TEST_QUESTIONS
 
 settings = get_settings()
@@ -83,38 +85,30 @@ _QUESTIONS_BANK_VERSION: int = 0
 _QUESTIONS_BANK_HASH: str = ""
 _QUESTIONS_BANK_LOADED_AT: float = 0.0
 _QUESTIONS_BANK_SOURCE: str = "unknown"
+# ``content_versions`` revision the bank was loaded at (None: unknown, e.g. sync refresh).
+_QUESTIONS_BANK_DB_VERSION: int | None = None
+_QUESTIONS_BANK_CHECKED_AT: float = 0.0
+_QUESTIONS_BANK_STALE: bool = True
+_QUESTIONS_BANK_SYNC: asyncio.Task | None = None
+# Readers compare revisions at most this often; pushed updates skip the wait.
+QUESTIONS_BANK_CHECK_INTERVAL_SECONDS = 1.0
 _OPENAPI_MODE_ENV = "RECRUITSMART_OPENAPI_MODE"
 
 
-def refresh_questions_bank(*, include_inactive: bool = False) -> None:
-    """
-    Reload test questions from the database so admin UI changes are visible to the bot
-    without restarting the process.
-    """
+def _with_defaults(loaded: dict[str, list[dict[str, Any]]], source: str) -> tuple[dict[str, list[dict[str, Any]]], str]:
+    if not loaded:
+        return deepcopy(DEFAULT_TEST_QUESTIONS), "default"
+    for key, default_questions in DEFAULT_TEST_QUESTIONS.items():
+        if not loaded.get(key):
+            loaded[key] = deepcopy(default_questions)
+    return loaded, source
 
+
+def _apply_questions_bank(loaded: dict[str, list[dict[str, Any]]], source: str) -> None:
     global _QUESTIONS_BANK, TEST1_QUESTIONS, TEST2_QUESTIONS
 
     global _QUESTIONS_BANK_VERSION, _QUESTIONS_BANK_HASH, _QUESTIONS_BANK_LOADED_AT, _QUESTIONS_BANK_SOURCE
 
-    source = "db"
-    try:
-        loaded = load_all_test_questions(include_inactive=include_inactive)
-    except Exception as exc:  # pragma: no cover - fallback for missing DB tables
-        logger.warning(
-            "Falling back to empty questions; database is not available. error=%s",
-            exc,
-        )
-        loaded = deepcopy(DEFAULT_TEST_QUESTIONS)
-        source = "fallback"
-
-    if not loaded:
-        loaded = deepcopy(DEFAULT_TEST_QUESTIONS)
-        source = "default"
-    else:
-        for key, default_questions in DEFAULT_TEST_QUESTIONS.items():
-            if not loaded.get(key):
-                loaded[key] = deepcopy(default_questions)
-
     _QUESTIONS_BANK = loaded
     TEST1_QUESTIONS = _QUESTIONS_BANK.get("test1", []).copy()
     TEST2_QUESTIONS = _QUESTIONS_BANK.get("test2", []).copy()
@@ -145,6 +139,100 @@ def refresh_questions_bank(*, include_inactive: bool = False) -> None:
             _QUESTIONS_BANK_HASH = new_hash
 
 
+def refresh_questions_bank(*, include_inactive: bool = False) -> None:
+    """
+    Reload test questions from the database so admin UI changes are visible to the bot
+    without restarting the process.
+
+    Synchronous (blocks the event loop): used for the import-time warmup and
+    tooling. Request paths call ``ensure_questions_bank()`` instead.
+    """
+
+    global _QUESTIONS_BANK_DB_VERSION, _QUESTIONS_BANK_STALE
+
+    source = "db"
+    try:
+        loaded = load_all_test_questions(include_inactive=include_inactive)
+    except Exception as exc:  # pragma: no cover - fallback for missing DB tables
+        logger.warning(
+            "Falling back to empty questions; database is not available. error=%s",
+            exc,
+        )
+        loaded = deepcopy(DEFAULT_TEST_QUESTIONS)
+        source = "fallback"
+
+    _apply_questions_bank(*_with_defaults(loaded, source))
+    # The DB revision was not read with this load: the first ensure_questions_bank() reloads.
+    _QUESTIONS_BANK_DB_VERSION = None
+    _QUESTIONS_BANK_STALE = True
+
+
+def invalidate_questions_bank() -> None:
+    """Mark the bank stale so the next ``ensure_questions_bank()`` checks the DB revision now."""
+
+    global _QUESTIONS_BANK_STALE
+    _QUESTIONS_BANK_STALE = True
+
+
+async def _sync_questions_bank() -> None:
+    global _QUESTIONS_BANK_DB_VERSION, _QUESTIONS_BANK_CHECKED_AT, _QUESTIONS_BANK_STALE
+
+    # Cleared before any await: an invalidation that arrives during the load marks it stale again.
+    _QUESTIONS_BANK_STALE = False
+    try:
+        db_version: int | None = await get_content_version(QUESTIONS_BANK)
+    except Exception as exc:  # missing content_versions table or DB outage
+        logger.debug("questions_bank.version_check_failed: %s", exc)
+        db_version = None
+
+    if db_version is None or db_version != _QUESTIONS_BANK_DB_VERSION:
+        try:
+            loaded = await load_all_test_questions_async()
+        except Exception as exc:
+            logger.warning("Keeping the current question bank; database is not available. error=%s", exc)
+            if not _QUESTIONS_BANK:
+                _apply_questions_bank(deepcopy(DEFAULT_TEST_QUESTIONS), "fallback")
+        else:
+            _apply_questions_bank(*_with_defaults(loaded, "db"))
+            _QUESTIONS_BANK_DB_VERSION = db_version
+    _QUESTIONS_BANK_CHECKED_AT = time.monotonic()
+
+
+async def ensure_questions_bank() -> int:
+    """Bring the in-memory bank up to date with the DB without blocking the event loop.
+
+    Readers reuse the bank while it was checked less than
+    ``QUESTIONS_BANK_CHECK_INTERVAL_SECONDS`` ago and no content update was
+    pushed; otherwise one primary-key read of ``content_versions`` decides
+    whether to reload. Concurrent callers share a single check/reload.
+
+    Returns:
+        The current in-memory question bank revision.
+    """
+
+    global _QUESTIONS_BANK_SYNC
+
+    if (
+        not _QUESTIONS_BANK_STALE
+        and time.monotonic() - _QUESTIONS_BANK_CHECKED_AT < QUESTIONS_BANK_CHECK_INTERVAL_SECONDS
+    ):
+        return int(_QUESTIONS_BANK_VERSION)
+
+    loop = asyncio.get_running_loop()
+    task = _QUESTIONS_BANK_SYNC
+    if task is None or task.done() or task.get_loop() is not loop:
+        task = loop.create_task(_sync_questions_bank(), name="questions_bank_sync")
+        _QUESTIONS_BANK_SYNC = task
+    await asyncio.shield(task)
+    return int(_QUESTIONS_BANK_VERSION)
+
+
+def get_questions(test_id: str) -> list[dict[str, Any]]:
+    """Return a copy of the current in-memory questions of ``test_id``."""
+
+    return list(_QUESTIONS_BANK.get(test_id, []))
+
+
 def maybe_prime_questions_bank() -> None:
     """Prime the in-memory bank unless tooling explicitly requests quiet schema mode."""
 
@@ -172,6 +260,7 @@ def get_questions_bank_meta() -> dict[str, object]:
         "version": int(_QUESTIONS_BANK_VERSION),
         "hash": _QUESTIONS_BANK_HASH,
         "loaded_at": _QUESTIONS_BANK_LOADED_AT,
+        "db_version": _QUESTIONS_BANK_DB_VERSION,
         "source": _QUESTIONS_BANK_SOURCE,
         "counts": {
             "test1": len(TEST1_QUESTIONS),
@@ -7,6 +7,11 @@ from collections import Counter
 from dataclasses import dataclass
 from typing import Dict, Optional
 
+from backend.core.fleet_metrics import get_fleet_metrics
+
+TEST1_FLEET_FAMILY = "bot_test1"
+_REJECTION_PREFIX = "rejection:"
+
 
 @dataclass
 class Test1MetricsSnapshot:
@@ -55,8 +60,16 @@ class _Test1Metrics:
             self._rejections.clear()
             self._completions = 0
 
+    def counters(self) -> Dict[str, float]:
+        """Flat counter totals for fleet aggregation."""
+        values: Dict[str, float] = {"completions": self._completions}
+        for reason, count in self._rejections.items():
+            values[f"{_REJECTION_PREFIX}{reason}"] = count
+        return values
+
 
 _test1_metrics = _Test1Metrics()
+get_fleet_metrics().register_counters(TEST1_FLEET_FAMILY, _test1_metrics.counters)
 
 
 @dataclass
@@ -311,6 +324,21 @@ async def get_test1_metrics_snapshot() -> Test1MetricsSnapshot:
     return await _test1_metrics.snapshot()
 
 
+async def get_fleet_test1_metrics_snapshot() -> Test1MetricsSnapshot:
+    """Test 1 counters summed over every worker publishing fleet metrics."""
+    counters = get_fleet_metrics().counters(TEST1_FLEET_FAMILY)
+    breakdown = {
+        key[len(_REJECTION_PREFIX):]: int(value)
+        for key, value in counters.items()
+        if key.startswith(_REJECTION_PREFIX)
+    }
+    return Test1MetricsSnapshot(
+        rejections_total=sum(breakdown.values()),
+        completions_total=int(counters.get("completions", 0)),
+        rejection_breakdown=breakdown,
+    )
+
+
 async def reset_test1_metrics() -> None:
     await _test1_metrics.reset()
 
@@ -415,6 +443,7 @@ async def reset_reminder_metrics() -> None:
 
 __all__ = [
     "Test1MetricsSnapshot",
+    "get_fleet_test1_metrics_snapshot",
     "get_test1_metrics_snapshot",
     "record_test1_completion",
     "record_test1_rejection",
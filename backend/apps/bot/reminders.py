@@ -10,8 +10,11 @@ from functools import lru_cache
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError, available_timezones
-from sqlalchemy import select
+from sqlalchemy import and_, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 try:  # pragma: no cover - optional dependency handling
     from apscheduler.jobstores.base import JobLookupError
@@ -121,6 +124,7 @@ _QUIET_HOURS_START = 22  # 22:00 local time
 _QUIET_HOURS_END = 8     # 08:00 local time
 _QUIET_GRACE = timedelta(minutes=30)
 _MIN_TIME_BEFORE_IMMEDIATE = timedelta(hours=2)  # Не отправлять immediate, если до встречи больше 2 часов
+_BULK_CHUNK = 500  # rows per statement for bulk reminder sync
 
 
 class ReminderKind(str, Enum):
@@ -133,6 +137,15 @@ class ReminderKind(str, Enum):
     INTRO_REMIND_3H = "intro_remind_3h"
 
 
+@dataclass(frozen=True)
+class _ActiveSlotRow:
+    slot_id: int
+    start_utc: datetime
+    purpose: str
+    city_id: Optional[int]
+    tz: str
+
+
 @dataclass(frozen=True)
 class ReminderPlan:
     kind: ReminderKind
@@ -151,6 +164,10 @@ class ReminderService:
     ) -> None:
         self._scheduler = scheduler
         self._lock = asyncio.Lock()
+        # slot_id -> scheduled job ids (and the reverse), so cancellation does not
+        # have to scan every scheduler job by prefix.
+        self._slot_jobs: Dict[int, set[str]] = {}
+        self._job_index: Dict[str, int] = {}
 
     def start(self) -> None:
         if not self._scheduler.running:
@@ -161,219 +178,79 @@ class ReminderService:
             self._scheduler.shutdown(wait=True)
 
     async def sync_jobs(self) -> None:
-        """Ensure persisted jobs exist in the scheduler."""
+        """Ensure persisted jobs exist in the scheduler.
 
-        reminder_policy, _ = await get_reminder_policy_config()
+        Persisted rows are diffed against the scheduler's job set in one pass. When
+        the table is empty (clean DB after a restart) reminders are planned in bulk
+        from the active slots instead.
+        """
+
+        self._reindex_scheduler_jobs()
         try:
             async with async_session() as session:
                 result = await session.execute(SlotReminderJob.__table__.select())
                 rows = list(result)
-                # Восстановление задач даже если таблица пуста (например, при чистой БД после рестарта)
-                if not rows:
-                    slot_rows = await session.scalars(
-                        select(Slot).where(
-                            Slot.status.in_(
-                                [SlotStatus.BOOKED, SlotStatus.CONFIRMED_BY_CANDIDATE]
-                            ),
-                            Slot.start_utc >= datetime.now(timezone.utc),
-                        )
-                    )
-                    for slot in slot_rows:
-                        if not await self._slot_has_delivery_target(session, slot):
-                            continue
-                        slot_id = slot.id
-                        try:
-                            candidate_tz = await self._resolve_slot_timezone(slot)
-                            plans = self._build_schedule(
-                                slot.start_utc,
-                                candidate_tz,
-                                getattr(slot, "purpose", None) or "interview",
-                                policy=reminder_policy,
-                            )
-                        except Exception:
-                            continue
-                        for plan in plans:
-                            job_id = self._job_id(slot_id, plan.kind)
-                            if self._scheduler.get_job(job_id) is None and plan.run_at_utc > datetime.now(timezone.utc):
-                                self._scheduler.add_job(
-                                    execute_reminder_job,
-                                    "date",
-                                    run_date=_ensure_aware(plan.run_at_utc),
-                                    id=job_id,
-                                    args=[slot_id, plan.kind.value],
-                                    replace_existing=True,
-                                )
-                                await session.execute(
-                                    SlotReminderJob.__table__.insert().values(
-                                        slot_id=slot_id,
-                                        kind=plan.kind.value,
-                                        job_id=job_id,
-                                        scheduled_at=_ensure_aware(plan.run_at_utc),
-                                        created_at=datetime.now(timezone.utc),
-                                        updated_at=datetime.now(timezone.utc),
-                                    )
-                                )
-                    await session.commit()
-                else:
-                    rows = rows
         except Exception as exc:
             logger.warning("reminder.sync_jobs.skipped: %s", exc)
             return
 
+        if not rows:
+            # Восстановление задач даже если таблица пуста (например, при чистой БД после рестарта)
+            try:
+                slot_rows = await self._load_active_slot_rows()
+                planned, _ = await self._plan_active_slots(slot_rows)
+                async with self._lock:
+                    await self._apply_bulk_plans(planned)
+            except Exception as exc:
+                logger.warning("reminder.sync_jobs.rebuild_failed: %s", exc)
+            return
+
+        now = datetime.now(timezone.utc)
+        unknown_job_ids: List[str] = []
+        desired: Dict[str, tuple[int, ReminderKind, datetime]] = {}
+        overdue: Dict[int, tuple[int, ReminderKind, datetime, str]] = {}
+        slots_with_future_jobs: set[int] = set()
         for row in rows:
-            job_id = row.job_id
             try:
                 kind = ReminderKind(row.kind)
             except ValueError:
                 logger.warning(
                     "Removing unknown reminder kind '%s' for slot %s", row.kind, row.slot_id
                 )
-                async with async_session() as session:
-                    await session.execute(
-                        SlotReminderJob.__table__.delete().where(
-                            SlotReminderJob.job_id == job_id
-                        )
-                    )
-                    await session.commit()
+                unknown_job_ids.append(row.job_id)
                 continue
-            if self._scheduler.get_job(job_id) is None:
-                run_at = _ensure_aware(row.scheduled_at)
-                if run_at <= datetime.now(timezone.utc):
-                    continue
-                self._scheduler.add_job(
-                    execute_reminder_job,
-                    "date",
-                    run_date=run_at,
-                    id=job_id,
-                    args=[row.slot_id, kind.value],
-                    replace_existing=True,
-                )
-
-        # Гарантируем, что на каждый слот есть хотя бы одна задача
-        try:
-            current_ids = {job.id for job in self._scheduler.get_jobs()}
-        except Exception:
-            current_ids = set()
-        for row in rows:
-            slot_prefix = f"slot:{row.slot_id}"
-            if not any(jid.startswith(slot_prefix) for jid in current_ids):
-                try:
-                    kind = ReminderKind(row.kind)
-                except ValueError:
-                    continue
-                run_at = _ensure_aware(row.scheduled_at)
-                if run_at <= datetime.now(timezone.utc):
-                    run_at = datetime.now(timezone.utc) + timedelta(minutes=5)
-                job_id = row.job_id or f"{slot_prefix}:{kind.value}"
-                self._scheduler.add_job(
-                    execute_reminder_job,
-                    "date",
-                    run_date=run_at,
-                    id=job_id,
-                    args=[row.slot_id, kind.value],
-                    replace_existing=True,
-                )
-                current_ids.add(job_id)
+            run_at = _ensure_aware(row.scheduled_at)
+            job_id = row.job_id or self._job_id(row.slot_id, kind)
+            if run_at > now:
+                desired[job_id] = (row.slot_id, kind, run_at)
+                slots_with_future_jobs.add(row.slot_id)
+                continue
+            # Missed while the worker was down: keep the most recent one per slot.
+            current = overdue.get(row.slot_id)
+            if current is None or run_at > current[2]:
+                overdue[row.slot_id] = (row.slot_id, kind, run_at, job_id)
 
-        # Если по каким-либо причинам задачи не восстановились, добавляем грубый бэкап из таблицы
-        if not self._scheduler.get_jobs() and rows:
-            for row in rows:
-                try:
-                    kind = ReminderKind(row.kind)
-                except ValueError:
-                    continue
-                run_at = _ensure_aware(row.scheduled_at)
-                if run_at <= datetime.now(timezone.utc):
-                    run_at = datetime.now(timezone.utc) + timedelta(minutes=5)
-                job_id = row.job_id
-                self._scheduler.add_job(
-                    execute_reminder_job,
-                    "date",
-                    run_date=run_at,
-                    id=job_id,
-                    args=[row.slot_id, kind.value],
-                    replace_existing=True,
+        if unknown_job_ids:
+            async with async_session() as session:
+                await session.execute(
+                    SlotReminderJob.__table__.delete().where(
+                        SlotReminderJob.job_id.in_(unknown_job_ids)
+                    )
                 )
+                await session.commit()
 
-        # Fallback: если после синка нет задач, попытаться восстановить по слотам напрямую
-        if not self._scheduler.get_jobs():
-            try:
-                async with async_session() as session:
-                    slot_rows = await session.scalars(
-                        select(Slot).where(
-                            Slot.status.in_(
-                                [SlotStatus.BOOKED, SlotStatus.CONFIRMED_BY_CANDIDATE]
-                            ),
-                            Slot.start_utc >= datetime.now(timezone.utc),
-                        )
-                    )
-                    for slot in slot_rows:
-                        if not await self._slot_has_delivery_target(session, slot):
-                            continue
-                        candidate_tz = await self._resolve_slot_timezone(slot)
-                        plans = self._build_schedule(
-                            slot.start_utc,
-                            candidate_tz,
-                            getattr(slot, "purpose", None) or "interview",
-                        )
-                        for plan in plans:
-                            if plan.run_at_utc <= datetime.now(timezone.utc):
-                                continue
-                            job_id = self._job_id(slot.id, plan.kind)
-                            self._scheduler.add_job(
-                                execute_reminder_job,
-                                "date",
-                                run_date=_ensure_aware(plan.run_at_utc),
-                                id=job_id,
-                                args=[slot.id, plan.kind.value],
-                                replace_existing=True,
-                            )
-                            await session.execute(
-                                SlotReminderJob.__table__.delete().where(
-                                    SlotReminderJob.slot_id == slot.id,
-                                    SlotReminderJob.kind == plan.kind.value,
-                                )
-                            )
-                            await session.execute(
-                                SlotReminderJob.__table__.insert().values(
-                                    slot_id=slot.id,
-                                    kind=plan.kind.value,
-                                    job_id=job_id,
-                                    scheduled_at=_ensure_aware(plan.run_at_utc),
-                                    created_at=datetime.now(timezone.utc),
-                                    updated_at=datetime.now(timezone.utc),
-                                )
-                            )
-                    await session.commit()
-            except Exception as exc:  # pragma: no cover - defensive
-                logger.warning("reminder.sync_jobs.fallback_failed: %s", exc)
+        current_ids = set(self._job_index)
+        for job_id, (slot_id, kind, run_at) in desired.items():
+            if job_id in current_ids:
+                continue
+            self._add_job(slot_id, kind, run_at, job_id=job_id)
 
-        # Последний рубеж: если всё ещё нет задач, создаём защитный job на ближайшие слоты
-        if not self._scheduler.get_jobs():
-            try:
-                async with async_session() as session:
-                    slot_ids = list(await session.scalars(
-                        select(Slot.id).where(
-                            Slot.status.in_(
-                                [SlotStatus.BOOKED, SlotStatus.CONFIRMED_BY_CANDIDATE]
-                            ),
-                            Slot.start_utc >= datetime.now(timezone.utc),
-                        )
-                    ))
-                for sid in slot_ids:
-                    job_id = f"slot:{sid}:rebuild"
-                    if self._scheduler.get_job(job_id):
-                        continue
-                    self._scheduler.add_job(
-                        execute_reminder_job,
-                        "date",
-                        run_date=datetime.now(timezone.utc) + timedelta(minutes=5),
-                        id=job_id,
-                        args=[sid, ReminderKind.CONFIRM_2H.value],
-                        replace_existing=True,
-                    )
-            except Exception:
-                pass
+        # Гарантируем, что на каждый слот есть хотя бы одна задача
+        retry_at = now + timedelta(minutes=5)
+        for slot_id, (_, kind, _run_at, job_id) in overdue.items():
+            if slot_id in slots_with_future_jobs or self._slot_jobs.get(slot_id):
+                continue
+            self._add_job(slot_id, kind, retry_at, job_id=job_id)
 
     async def schedule_for_slot(
         self, slot_id: int, *, skip_confirmation_prompts: bool = False
@@ -411,12 +288,7 @@ class ReminderService:
                 purpose,
                 policy=reminder_policy,
                 dedupe_by_time=False,
-                city_quiet_start=city_policy_data.quiet_hours_start if city_policy_data and city_policy_data.is_custom else None,
-                city_quiet_end=city_policy_data.quiet_hours_end if city_policy_data and city_policy_data.is_custom else None,
-                city_confirm_6h_enabled=city_policy_data.confirm_6h_enabled if city_policy_data and city_policy_data.is_custom else None,
-                city_confirm_3h_enabled=city_policy_data.confirm_3h_enabled if city_policy_data and city_policy_data.is_custom else None,
-                city_confirm_2h_enabled=city_policy_data.confirm_2h_enabled if city_policy_data and city_policy_data.is_custom else None,
-                city_intro_remind_3h_enabled=city_policy_data.intro_remind_3h_enabled if city_policy_data and city_policy_data.is_custom else None,
+                **_city_policy_overrides(city_policy_data),
             )
             if skip_confirmation_prompts:
                 confirm_kinds = {
@@ -530,15 +402,7 @@ class ReminderService:
                         immediate=False,
                         adjusted=plan.adjusted_reason is not None,
                     )
-                    job_id = self._job_id(slot_id, plan.kind)
-                    self._scheduler.add_job(
-                        execute_reminder_job,
-                        "date",
-                        run_date=_ensure_aware(plan.run_at_utc),
-                        id=job_id,
-                        args=[slot_id, plan.kind.value],
-                        replace_existing=True,
-                    )
+                    job_id = self._add_job(slot_id, plan.kind, plan.run_at_utc)
                     await session.execute(
                         SlotReminderJob.__table__.delete().where(
                             SlotReminderJob.slot_id == slot_id,
@@ -609,6 +473,7 @@ class ReminderService:
             self._scheduler.remove_job(job_id)
         except Exception:
             pass  # job may have already fired or not exist in scheduler
+        self._untrack_job(job_id)
 
         async with async_session() as session:
             from sqlalchemy import delete as sa_delete
@@ -639,22 +504,26 @@ class ReminderService:
         }
 
     async def reschedule_active_slots(self) -> Dict[str, int]:
-        """Rebuild reminder jobs for all active slots."""
+        """Rebuild reminder jobs for all active slots.
+
+        Plans are computed in one pass from a single joined query, persisted with one
+        upsert and diffed against the scheduler. Only slots that need an immediate
+        reminder right now go through ``schedule_for_slot`` individually.
+        """
+
+        slot_rows = await self._load_active_slot_rows()
+        planned, immediate_slot_ids = await self._plan_active_slots(slot_rows)
+        active_ids = {row.slot_id for row in slot_rows}
+        # Active slots whose plan came out empty (every reminder already in the
+        # past) must lose their old jobs too, like schedule_for_slot did.
+        unplanned_ids = active_ids - set(planned) - set(immediate_slot_ids)
+        async with self._lock:
+            await self._apply_bulk_plans(planned)
+            await self._cancel_slots_except(active_ids, also=unplanned_ids)
 
-        async with async_session() as session:
-            slot_ids = list(
-                await session.scalars(
-                    select(Slot.id).where(
-                        Slot.status.in_(
-                            [SlotStatus.BOOKED, SlotStatus.CONFIRMED_BY_CANDIDATE]
-                        ),
-                        Slot.start_utc >= datetime.now(timezone.utc),
-                    )
-                )
-            )
-        scheduled = 0
+        scheduled = len(planned)
         failed = 0
-        for slot_id in slot_ids:
+        for slot_id in immediate_slot_ids:
             try:
                 await self.schedule_for_slot(slot_id)
                 scheduled += 1
@@ -666,6 +535,340 @@ class ReminderService:
                 )
         return {"scheduled": scheduled, "failed": failed}
 
+    async def _load_active_slot_rows(self) -> List["_ActiveSlotRow"]:
+        """Load booked future slots with everything needed for planning in one query."""
+
+        target_city = aliased(City)
+        stmt = (
+            select(
+                Slot.id,
+                Slot.start_utc,
+                Slot.purpose,
+                Slot.city_id,
+                Slot.candidate_tz,
+                Slot.candidate_tg_id,
+                target_city.tz,
+                Recruiter.tz,
+                User.max_user_id,
+            )
+            .select_from(Slot)
+            .outerjoin(
+                target_city,
+                target_city.id == func.coalesce(Slot.candidate_city_id, Slot.city_id),
+            )
+            .outerjoin(Recruiter, Recruiter.id == Slot.recruiter_id)
+            .outerjoin(
+                User,
+                and_(Slot.candidate_tg_id.is_(None), User.candidate_id == Slot.candidate_id),
+            )
+            .where(
+                Slot.status.in_([SlotStatus.BOOKED, SlotStatus.CONFIRMED_BY_CANDIDATE]),
+                Slot.start_utc >= datetime.now(timezone.utc),
+            )
+        )
+        async with async_session() as session:
+            result = await session.execute(stmt)
+            rows: Dict[int, _ActiveSlotRow] = {}
+            for (
+                slot_id,
+                start_utc,
+                purpose,
+                city_id,
+                candidate_tz,
+                candidate_tg_id,
+                city_tz,
+                recruiter_tz,
+                max_user_id,
+            ) in result:
+                has_target = candidate_tg_id is not None or bool(str(max_user_id or "").strip())
+                if not has_target:
+                    continue
+                rows[slot_id] = _ActiveSlotRow(
+                    slot_id=slot_id,
+                    start_utc=_ensure_aware(start_utc),
+                    purpose=purpose or "interview",
+                    city_id=city_id,
+                    tz=(
+                        _normalized_tz_name(candidate_tz)
+                        or _normalized_tz_name(city_tz)
+                        or _normalized_tz_name(recruiter_tz)
+                        or DEFAULT_TZ
+                    ),
+                )
+        return list(rows.values())
+
+    async def _plan_active_slots(
+        self, slot_rows: List["_ActiveSlotRow"]
+    ) -> tuple[Dict[int, List[ReminderPlan]], List[int]]:
+        """Return future plans per slot plus slots that need an immediate dispatch."""
+
+        if not slot_rows:
+            return {}, []
+        reminder_policy, _ = await get_reminder_policy_config()
+        city_policies: Dict[int, Any] = {}
+        try:
+            from backend.apps.admin_ui.services.city_reminder_policy import get_city_reminder_policies
+
+            city_policies = await get_city_reminder_policies(row.city_id for row in slot_rows)
+        except Exception:
+            logger.warning("Failed to load city reminder policies for bulk planning")
+
+        now_utc = datetime.now(timezone.utc)
+        planned: Dict[int, List[ReminderPlan]] = {}
+        immediate: List[int] = []
+        for row in slot_rows:
+            city_policy_data = city_policies.get(row.city_id) if row.city_id is not None else None
+            try:
+                plans = self._build_schedule(
+                    row.start_utc,
+                    row.tz,
+                    row.purpose,
+                    policy=reminder_policy,
+                    dedupe_by_time=False,
+                    **_city_policy_overrides(city_policy_data),
+                )
+            except Exception:
+                logger.warning("reminder.plan.failed", extra={"slot_id": row.slot_id}, exc_info=True)
+                continue
+            if not plans:
+                continue
+            threshold = timedelta(
+                hours=self._immediate_threshold_hours(
+                    reminder_policy,
+                    purpose=row.purpose,
+                    city_intro_remind_3h_enabled=(
+                        city_policy_data.intro_remind_3h_enabled
+                        if city_policy_data and city_policy_data.is_custom
+                        else None
+                    ),
+                )
+            )
+            time_until_meeting = row.start_utc - now_utc
+            future: List[ReminderPlan] = []
+            seen_local: set[datetime] = set()
+            needs_immediate = False
+            for plan in sorted(plans, key=lambda item: item.run_at_local):
+                if plan.run_at_utc <= now_utc:
+                    if time_until_meeting <= threshold:
+                        needs_immediate = True
+                    continue
+                rounded_local = plan.run_at_local.replace(second=0, microsecond=0)
+                if rounded_local in seen_local:
+                    continue
+                seen_local.add(rounded_local)
+                future.append(plan)
+            if needs_immediate:
+                immediate.append(row.slot_id)
+            elif future:
+                planned[row.slot_id] = future
+        return planned, immediate
+
+    async def _apply_bulk_plans(self, planned: Dict[int, List[ReminderPlan]]) -> None:
+        """Persist ``planned`` with one upsert and diff it against the scheduler."""
+
+        if not planned:
+            return
+        now = datetime.now(timezone.utc)
+        records = [
+            {
+                "slot_id": slot_id,
+                "kind": plan.kind.value,
+                "job_id": self._job_id(slot_id, plan.kind),
+                "scheduled_at": _ensure_aware(plan.run_at_utc),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for slot_id, plans in planned.items()
+            for plan in plans
+        ]
+        desired_ids = {record["job_id"] for record in records}
+        slot_ids = list(planned)
+
+        async with async_session() as session:
+            stale_ids: List[str] = []
+            for offset in range(0, len(slot_ids), _BULK_CHUNK):
+                chunk = slot_ids[offset : offset + _BULK_CHUNK]
+                existing = await session.scalars(
+                    select(SlotReminderJob.job_id).where(SlotReminderJob.slot_id.in_(chunk))
+                )
+                stale_ids.extend(job_id for job_id in existing if job_id not in desired_ids)
+            for offset in range(0, len(stale_ids), _BULK_CHUNK):
+                await session.execute(
+                    SlotReminderJob.__table__.delete().where(
+                        SlotReminderJob.job_id.in_(stale_ids[offset : offset + _BULK_CHUNK])
+                    )
+                )
+            insert_factory = _dialect_insert(session)
+            for offset in range(0, len(records), _BULK_CHUNK):
+                stmt = insert_factory(SlotReminderJob).values(records[offset : offset + _BULK_CHUNK])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[SlotReminderJob.slot_id, SlotReminderJob.kind],
+                    set_={
+                        "job_id": stmt.excluded.job_id,
+                        "scheduled_at": stmt.excluded.scheduled_at,
+                        "updated_at": stmt.excluded.updated_at,
+                    },
+                )
+                await session.execute(stmt)
+            await session.commit()
+
+        current = self._scheduled_run_times()
+        for slot_id, plans in planned.items():
+            for job_id in list(self._slot_jobs.get(slot_id, ())):
+                if job_id not in desired_ids:
+                    self._remove_job(job_id)
+            for plan in plans:
+                job_id = self._job_id(slot_id, plan.kind)
+                run_at = _ensure_aware(plan.run_at_utc)
+                if current.get(job_id) == run_at:
+                    self._track_job(slot_id, job_id)
+                    continue
+                await record_reminder_scheduled(
+                    plan.kind,
+                    immediate=False,
+                    adjusted=plan.adjusted_reason is not None,
+                )
+                self._add_job(slot_id, plan.kind, run_at, job_id=job_id)
+        logger.info(
+            "reminder.bulk_sync.applied",
+            extra={"slots": len(planned), "jobs": len(records)},
+        )
+
+    async def _cancel_slots_except(self, keep_ids: set[int], *, also: set[int]) -> None:
+        """Cancel jobs and delete persisted rows of slots outside ``keep_ids`` plus ``also``."""
+
+        async with async_session() as session:
+            persisted = await session.execute(
+                select(SlotReminderJob.slot_id, SlotReminderJob.job_id)
+            )
+            rows = [
+                (slot_id, job_id)
+                for slot_id, job_id in persisted
+                if slot_id not in keep_ids or slot_id in also
+            ]
+            cancel_ids = {slot_id for slot_id, _ in rows}
+            cancel_ids.update(slot_id for slot_id in self._slot_jobs if slot_id not in keep_ids)
+            cancel_ids.update(also)
+            slot_ids = list(cancel_ids)
+            for offset in range(0, len(slot_ids), _BULK_CHUNK):
+                await session.execute(
+                    SlotReminderJob.__table__.delete().where(
+                        SlotReminderJob.slot_id.in_(slot_ids[offset : offset + _BULK_CHUNK])
+                    )
+                )
+            await session.commit()
+
+        job_ids = {str(job_id) for _, job_id in rows if job_id}
+        job_ids |= self._scheduler_job_ids(exclude=keep_ids - also)
+        for slot_id in slot_ids:
+            job_ids -= self._drop_slot_jobs(slot_id)
+        for job_id in job_ids:
+            self._remove_job(job_id)
+
+    def _scheduled_run_times(self) -> Dict[str, Optional[datetime]]:
+        try:
+            jobs = self._scheduler.get_jobs()
+        except Exception:
+            return {}
+        run_times: Dict[str, Optional[datetime]] = {}
+        for job in jobs:
+            next_run = getattr(job, "next_run_time", None)
+            run_times[str(job.id)] = _ensure_aware(next_run) if next_run else None
+        return run_times
+
+    def _add_job(
+        self,
+        slot_id: int,
+        kind: ReminderKind,
+        run_at: datetime,
+        *,
+        job_id: Optional[str] = None,
+    ) -> str:
+        job_id = job_id or self._job_id(slot_id, kind)
+        self._scheduler.add_job(
+            execute_reminder_job,
+            "date",
+            run_date=_ensure_aware(run_at),
+            id=job_id,
+            args=[slot_id, kind.value],
+            replace_existing=True,
+        )
+        self._track_job(slot_id, job_id)
+        return job_id
+
+    def _track_job(self, slot_id: int, job_id: str) -> None:
+        self._slot_jobs.setdefault(slot_id, set()).add(job_id)
+        self._job_index[job_id] = slot_id
+
+    def _untrack_job(self, job_id: str) -> None:
+        slot_id = self._job_index.pop(job_id, None)
+        if slot_id is None:
+            return
+        jobs = self._slot_jobs.get(slot_id)
+        if jobs is not None:
+            jobs.discard(job_id)
+            if not jobs:
+                self._slot_jobs.pop(slot_id, None)
+
+    def _remove_job(self, job_id: str) -> None:
+        try:
+            self._scheduler.remove_job(job_id)
+        except JobLookupError:
+            pass
+        self._untrack_job(job_id)
+
+    def _drop_slot_jobs(self, slot_id: int) -> set[str]:
+        job_ids = set(self._slot_jobs.pop(slot_id, set()))
+        for job_id in job_ids:
+            self._job_index.pop(job_id, None)
+            try:
+                self._scheduler.remove_job(job_id)
+            except JobLookupError:
+                continue
+        return job_ids
+
+    def _scheduler_job_ids(
+        self,
+        slot_ids: Optional[set[int]] = None,
+        *,
+        exclude: set[int] = frozenset(),
+    ) -> set[str]:
+        """Live ``slot:<id>:...`` scheduler jobs, including ones missing from the index.
+
+        Matches the jobs of ``slot_ids`` or, when it is ``None``, of every slot
+        outside ``exclude``.
+        """
+
+        if slot_ids is not None and not slot_ids:
+            return set()
+        try:
+            jobs = self._scheduler.get_jobs()
+        except Exception:
+            return set()
+        job_ids: set[str] = set()
+        for job in jobs:
+            job_id = str(getattr(job, "id", "") or "")
+            slot_id = _slot_id_from_job_id(job_id)
+            if slot_id is None or slot_id in exclude:
+                continue
+            if slot_ids is None or slot_id in slot_ids:
+                job_ids.add(job_id)
+        return job_ids
+
+    def _reindex_scheduler_jobs(self) -> None:
+        """Rebuild the slot→job index from the scheduler (persistent job stores)."""
+
+        self._slot_jobs.clear()
+        self._job_index.clear()
+        try:
+            jobs = self._scheduler.get_jobs()
+        except Exception:
+            return
+        for job in jobs:
+            slot_id = _slot_id_from_job_id(str(getattr(job, "id", "") or ""))
+            if slot_id is not None:
+                self._track_job(slot_id, str(job.id))
+
     async def _cancel_jobs(self, slot_id: int) -> None:
         job_ids: set[str] = set()
         async with async_session() as session:
@@ -683,22 +886,13 @@ class ReminderService:
                 )
                 await session.commit()
 
-        slot_job_prefix = f"slot:{slot_id}:"
-        try:
-            for job in self._scheduler.get_jobs():
-                job_id = str(getattr(job, "id", "") or "")
-                if job_id.startswith(slot_job_prefix):
-                    job_ids.add(job_id)
-        except Exception:
-            pass
-
+        job_ids |= self._scheduler_job_ids({slot_id})
+        job_ids -= self._drop_slot_jobs(slot_id)
         for job_id in job_ids:
-            try:
-                self._scheduler.remove_job(job_id)
-            except JobLookupError:
-                continue
+            self._remove_job(job_id)
 
     async def _execute_job(self, slot_id: int, kind: ReminderKind) -> None:
+        self._untrack_job(self._job_id(slot_id, kind))
         async with async_session() as session:
             await session.execute(
                 SlotReminderJob.__table__.delete().where(
@@ -1102,6 +1296,36 @@ __all__ = [
 ]
 
 
+def _city_policy_overrides(city_policy_data: Any) -> Dict[str, Any]:
+    """Map a custom per-city reminder policy onto ``_build_schedule`` keyword overrides."""
+    if not city_policy_data or not getattr(city_policy_data, "is_custom", False):
+        return {}
+    return {
+        "city_quiet_start": city_policy_data.quiet_hours_start,
+        "city_quiet_end": city_policy_data.quiet_hours_end,
+        "city_confirm_6h_enabled": city_policy_data.confirm_6h_enabled,
+        "city_confirm_3h_enabled": city_policy_data.confirm_3h_enabled,
+        "city_confirm_2h_enabled": city_policy_data.confirm_2h_enabled,
+        "city_intro_remind_3h_enabled": city_policy_data.intro_remind_3h_enabled,
+    }
+
+
+def _slot_id_from_job_id(job_id: str) -> Optional[int]:
+    parts = job_id.split(":")
+    if len(parts) < 3 or parts[0] != "slot":
+        return None
+    try:
+        return int(parts[1])
+    except ValueError:
+        return None
+
+
+def _dialect_insert(session: AsyncSession):
+    bind = session.get_bind()
+    dialect_name = bind.dialect.name if bind is not None else ""
+    return pg_insert if dialect_name == "postgresql" else sqlite_insert
+
+
 def _safe_zone(tz: Optional[str]) -> ZoneInfo:
     if not tz:
         return _DEFAULT_ZONE
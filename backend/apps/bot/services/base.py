@@ -123,6 +123,7 @@ from ..config import (
     TEST2_QUESTIONS,
     TIME_FMT,
     TIME_LIMIT,
+    ensure_questions_bank,
     get_questions_bank_version,
     refresh_questions_bank,
 )
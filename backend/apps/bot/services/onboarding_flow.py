@@ -78,7 +78,7 @@ async def _send_active_candidate_summary(user_id: int, *, candidate: User) -> No
 
 async def begin_interview(user_id: int, username: Optional[str] = None) -> None:
     # Ensure we use the freshest question set after admin edits.
-    refresh_questions_bank()
+    await ensure_questions_bank()
     questions_version = get_questions_bank_version()
 
     state_manager = get_state_manager()
@@ -278,7 +278,7 @@ async def handle_recruiter_identity_command(message: Message) -> None:
 
 async def start_introday_flow(message: Message) -> None:
     # Ensure we use the freshest question set after admin edits.
-    refresh_questions_bank()
+    await ensure_questions_bank()
     questions_version = get_questions_bank_version()
 
     state_manager = get_state_manager()
@@ -499,9 +499,12 @@ async def handle_pick_slot(callback: CallbackQuery) -> None:
                 pass
             await show_recruiter_menu(user_id, notice=text)
         else:
+            # Alternatives come with the reservation result: no second lookup
+            # while everyone is racing for the same slots.
             kb = await kb_slots_for_recruiter(
                 recruiter_id,
                 state.get("candidate_tz", DEFAULT_TZ),
+                slots=reservation.alternatives or None,
                 city_id=city_id,
             )
             try:
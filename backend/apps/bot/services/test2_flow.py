@@ -110,7 +110,7 @@ async def launch_test2(candidate_id: int) -> None:
 
 async def start_test2(user_id: int) -> None:
     # Refresh questions so admin changes are reflected without restart.
-    refresh_questions_bank()
+    await ensure_questions_bank()
     questions_version = get_questions_bank_version()
 
     bot = get_bot()
@@ -3,6 +3,8 @@
 Main functions:
 - ``build_candidate_ai_context()`` — aggregates candidate profile, tests, chat,
   slots, city criteria, and KB excerpts into a single dict for the LLM.
+- ``build_candidate_ai_contexts()`` — the same for a set of candidates, loaded
+  with one query per table and assembled in memory.
 - ``build_city_candidate_recommendations_context()`` — aggregates city + candidate
   list for recommendation ranking.
 - ``compute_input_hash()`` — deterministic SHA-256 of context dict for caching.
@@ -10,15 +12,20 @@ Main functions:
 
 from __future__ import annotations
 
+import copy
 import hashlib
 import html
 import json
 import re
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, or_, select
+from sqlalchemy import and_, bindparam, case, func, or_, select
 from sqlalchemy import text as sql_text
 
 from backend.apps.admin_ui.security import Principal
@@ -33,7 +40,7 @@ from backend.domain.candidates.models import (
     User,
 )
 from backend.domain.models import City, Recruiter, Slot, recruiter_city_association
-from backend.domain.repositories import find_city_by_plain_name
+from backend.domain.repositories import find_city_by_plain_name, resolve_city_id_and_tz_by_plain_name
 
 
 def compute_input_hash(payload: dict) -> str:
@@ -171,350 +178,524 @@ async def _ensure_candidate_scope(user: User, principal: Principal) -> None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Candidate not found")
 
 
-async def build_candidate_ai_context(
-    candidate_id: int,
-    *,
-    principal: Principal,
-    include_pii: bool = False,
-) -> dict[str, Any]:
-    now = datetime.now(UTC)
-    async with async_session() as session:
-        user = await session.get(User, candidate_id)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Candidate not found")
-        await _ensure_candidate_scope(user, principal)
+_MAX_TESTS_PER_CANDIDATE = 50
+_MAX_SLOTS_PER_CANDIDATE = 30
+_MAX_RECENT_CHAT_PER_CANDIDATE = 14
+_MAX_EVENTS_PER_CANDIDATE = 50
 
-        candidate_fio_for_redaction = user.fio
+_prefetched_contexts: ContextVar[dict[tuple[str, int, bool, int], dict[str, Any]] | None] = ContextVar(
+    "ai_prefetched_candidate_contexts",
+    default=None,
+)
 
-        recruiter_record: Recruiter | None = None
-        try:
-            rid = getattr(user, "responsible_recruiter_id", None)
-            if rid is not None:
-                recruiter_record = await session.get(Recruiter, int(rid))
-        except Exception:
-            recruiter_record = None
 
-        city_profile: dict[str, Any] | None = None
-        city_record: City | None = None
+@dataclass
+class _CandidateBatch:
+    """Rows for a set of candidates, loaded with one query per table."""
+
+    users: list[User]
+    recruiters: dict[int, Recruiter] = field(default_factory=dict)
+    cities: dict[int, City] = field(default_factory=dict)
+    tests: dict[int, list[TestResult]] = field(default_factory=dict)
+    answers: dict[int, list[QuestionAnswer]] = field(default_factory=dict)
+    notes: dict[int, InterviewNote] = field(default_factory=dict)
+    notes_failed: bool = False
+    slots: dict[int, list[Any]] = field(default_factory=dict)
+    chat_counts: dict[int, dict[str, int]] = field(default_factory=dict)
+    chat_last_at: dict[int, dict[str, datetime]] = field(default_factory=dict)
+    chat_failed: dict[int, int] = field(default_factory=dict)
+    recent_chat: dict[int, list[Any]] = field(default_factory=dict)
+    events: dict[int, list[tuple[Any, Any]]] = field(default_factory=dict)
+    events_failed: bool = False
+
+
+async def _scoped_users(session, users: list[User], principal: Principal) -> list[User]:
+    """Batch counterpart of ``_ensure_candidate_scope``: drop users outside the principal's scope."""
+    if principal.type == "admin":
+        return users
+    pending = [u for u in users if u.responsible_recruiter_id != principal.id]
+    if not pending:
+        return users
+    rows = await session.execute(
+        select(recruiter_city_association.c.city_id).where(recruiter_city_association.c.recruiter_id == principal.id)
+    )
+    allowed_city_ids = {row[0] for row in rows}
+    denied: set[int] = set()
+    for user in pending:
+        city_id = None
         if user.city:
-            city_record = await find_city_by_plain_name(user.city)
-        if city_record is not None:
-            criteria_raw = city_record.criteria or ""
-            criteria_value = None
-            if criteria_raw and criteria_raw.strip():
-                if include_pii:
-                    criteria_value = criteria_raw.strip()[:2000]
-                else:
-                    from .redaction import redact_text
-
-                    criteria_redaction = redact_text(criteria_raw, candidate_fio=candidate_fio_for_redaction, max_len=2000)
-                    if criteria_redaction.safe_to_send and criteria_redaction.text.strip():
-                        criteria_value = criteria_redaction.text
-
-            city_profile = {
-                "id": int(city_record.id),
-                "name": html.unescape(city_record.name or "") or None,
-                "tz": city_record.tz or None,
-                "active": bool(city_record.active),
-                # Used for AI vacancy fit assessment. Best-effort redaction is applied.
-                "criteria": criteria_value,
-                "plan_week": city_record.plan_week,
-                "plan_month": city_record.plan_month,
-            }
+            city_id, _tz = await resolve_city_id_and_tz_by_plain_name(user.city)
+        if city_id is None or city_id not in allowed_city_ids:
+            denied.add(int(user.id))
+    return [u for u in users if int(u.id) not in denied]
 
-        # Latest tests summary (+ best-effort redacted answers for the latest attempt)
-        tests: dict[str, Any] = {"latest": {}, "total": 0}
-        rows = (
+
+async def _load_candidate_batch(
+    session,
+    candidate_ids: list[int],
+    *,
+    principal: Principal,
+    include_pii: bool,
+    now: datetime,
+) -> _CandidateBatch:
+    users = list((await session.execute(select(User).where(User.id.in_(candidate_ids)))).scalars().all())
+    users = await _scoped_users(session, users, principal)
+    batch = _CandidateBatch(users=users)
+    if not users:
+        return batch
+    ids = [int(u.id) for u in users]
+
+    user_city_ids: dict[int, int] = {}
+    for user in users:
+        if user.city:
+            city_id, _tz = await resolve_city_id_and_tz_by_plain_name(user.city)
+            if city_id is not None:
+                user_city_ids[int(user.id)] = city_id
+    if user_city_ids:
+        cities = (
+            await session.execute(select(City).where(City.id.in_(set(user_city_ids.values()))))
+        ).scalars().all()
+        by_id = {int(city.id): city for city in cities}
+        batch.cities = {uid: by_id[cid] for uid, cid in user_city_ids.items() if cid in by_id}
+
+    recruiter_ids = {int(u.responsible_recruiter_id) for u in users if u.responsible_recruiter_id is not None}
+    if recruiter_ids:
+        recruiters = (await session.execute(select(Recruiter).where(Recruiter.id.in_(recruiter_ids)))).scalars().all()
+        batch.recruiters = {int(r.id): r for r in recruiters}
+
+    test_rows = (
+        await session.execute(
+            select(TestResult)
+            .where(TestResult.user_id.in_(ids))
+            .order_by(TestResult.user_id.asc(), TestResult.created_at.desc(), TestResult.id.desc())
+        )
+    ).scalars().all()
+    for item in test_rows:
+        bucket = batch.tests.setdefault(int(item.user_id), [])
+        if len(bucket) < _MAX_TESTS_PER_CANDIDATE:
+            bucket.append(item)
+    latest_ids = {
+        result_id
+        for rows in batch.tests.values()
+        for result_id in _latest_test_result_ids(rows).values()
+    }
+    if latest_ids:
+        ans_rows = (
             await session.execute(
-                select(TestResult)
-                .where(TestResult.user_id == user.id)
-                .order_by(TestResult.created_at.desc(), TestResult.id.desc())
-                .limit(50)
+                select(QuestionAnswer)
+                .where(QuestionAnswer.test_result_id.in_(latest_ids))
+                .order_by(QuestionAnswer.test_result_id.asc(), QuestionAnswer.question_index.asc())
             )
         ).scalars().all()
-        tests["total"] = len(rows)
-        latest_result_ids: dict[str, int] = {}
-        for item in rows:
-            rating = (item.rating or "").strip().upper()
-            if rating in {"TEST1", "TEST2"} and rating not in tests["latest"]:
-                tests["latest"][rating] = {
-                    "test_result_id": int(item.id),
-                    "final_score": item.final_score,
-                    "raw_score": item.raw_score,
-                    "total_time_sec": item.total_time,
-                    "created_at": _iso(item.created_at),
-                }
-                latest_result_ids[rating] = int(item.id)
-
-        # Add question-level answers for latest test results (best-effort, redacted, optional).
-        if latest_result_ids:
-            extracted: dict[str, Any] = {}
-            result_id_to_rating = {int(v): str(k) for (k, v) in latest_result_ids.items()}
-
-            ans_rows = (
-                await session.execute(
-                    select(QuestionAnswer)
-                    .where(QuestionAnswer.test_result_id.in_(set(latest_result_ids.values())))
-                    .order_by(QuestionAnswer.test_result_id.asc(), QuestionAnswer.question_index.asc())
-                )
-            ).scalars().all()
-            by_result: dict[int, list[dict[str, Any]]] = {}
-            for ans in ans_rows:
-                rating = result_id_to_rating.get(int(ans.test_result_id), "")
-                q_text_raw = ans.question_text or ""
-                u_text_raw = ans.user_answer or ""
-
-                if include_pii:
-                    q_value = (ans.question_text or "")[:600] or None
-                    u_value = (ans.user_answer or "")[:600] or None
-                    c_value = (ans.correct_answer or "")[:600] or None
-                else:
-                    from .redaction import redact_text
-
-                    q_text = redact_text(ans.question_text or "", candidate_fio=candidate_fio_for_redaction, max_len=400)
-                    u_text = redact_text(ans.user_answer or "", candidate_fio=candidate_fio_for_redaction, max_len=200)
-                    c_text = redact_text(ans.correct_answer or "", candidate_fio=candidate_fio_for_redaction, max_len=200)
-                    q_value = q_text.text if q_text.safe_to_send and q_text.text.strip() else None
-                    u_value = u_text.text if u_text.safe_to_send and u_text.text.strip() else None
-                    c_value = c_text.text if c_text.safe_to_send and c_text.text.strip() else None
-
-                if rating == "TEST1":
-                    q_lc = q_text_raw.lower()
-                    u_for_extract = (u_text_raw.strip() if include_pii else (u_value or "")).strip()
-                    if extracted.get("age_years") is None:
-                        if ("полных" in q_lc and "лет" in q_lc) or ("сколько" in q_lc and "лет" in q_lc):
-                            age = _parse_int(u_for_extract or None)
-                            if age is not None and 14 <= age <= 80:
-                                extracted["age_years"] = int(age)
-                    if extracted.get("desired_income") is None:
-                        if "уровень дохода" in q_lc or ("желаемый" in q_lc and "доход" in q_lc):
-                            extracted["desired_income"] = u_for_extract[:120] if u_for_extract else None
-                    if extracted.get("work_status") is None:
-                        if ("учитесь" in q_lc and "работ" in q_lc) or ("работаете" in q_lc and "уч" in q_lc):
-                            extracted["work_status"] = u_for_extract[:120] if u_for_extract else None
-                    if extracted.get("work_experience") is None:
-                        if "опыт" in q_lc and ("продаж" in q_lc or "переговор" in q_lc or "смеж" in q_lc):
-                            extracted["work_experience"] = u_for_extract[:800] if u_for_extract else None
-                    if extracted.get("motivation") is None:
-                        if "мотивир" in q_lc:
-                            extracted["motivation"] = u_for_extract[:800] if u_for_extract else None
-                    if extracted.get("skills") is None:
-                        if "навык" in q_lc or "качества" in q_lc:
-                            extracted["skills"] = u_for_extract[:800] if u_for_extract else None
-                    if extracted.get("expectations") is None:
-                        if "ожида" in q_lc:
-                            extracted["expectations"] = u_for_extract[:800] if u_for_extract else None
-                    if extracted.get("field_format_readiness") is None:
-                        if (
-                            "полев" in q_lc
-                            or "выезд" in q_lc
-                            or "разъезд" in q_lc
-                            or "в движении" in q_lc
-                            or ("формат" in q_lc and ("работ" in q_lc or "дня" in q_lc))
-                        ):
-                            extracted["field_format_readiness"] = u_for_extract[:200] if u_for_extract else None
-                    if extracted.get("start_readiness") is None:
-                        if (
-                            "стартовать" in q_lc
-                            or "приступить" in q_lc
-                            or "сможете выйти" in q_lc
-                            or "сколько времени потребуется" in q_lc
-                            or "2–3 дня" in q_lc
-                            or "2-3 дня" in q_lc
-                        ):
-                            extracted["start_readiness"] = u_for_extract[:200] if u_for_extract else None
-
-                by_result.setdefault(int(ans.test_result_id), []).append(
-                    {
-                        "question_index": int(ans.question_index),
-                        "question_text": q_value,
-                        "user_answer": u_value,
-                        "correct_answer": c_value,
-                        "is_correct": bool(ans.is_correct),
-                        "attempts_count": int(ans.attempts_count or 0),
-                        "time_spent_sec": int(ans.time_spent or 0),
-                        "overtime": bool(ans.overtime),
-                    }
-                )
+        for ans in ans_rows:
+            batch.answers.setdefault(int(ans.test_result_id), []).append(ans)
 
-            for rating, rid in latest_result_ids.items():
-                if rating in tests["latest"]:
-                    tests["latest"][rating]["answers"] = by_result.get(rid, [])
-            if extracted:
-                tests["extracted"] = extracted
+    try:
+        notes = (await session.execute(select(InterviewNote).where(InterviewNote.user_id.in_(ids)))).scalars().all()
+        batch.notes = {int(note.user_id): note for note in notes}
+    except Exception:
+        batch.notes_failed = True
 
-        # Interview notes summary (limited, best-effort, redacted)
-        interview: dict[str, Any] = {"present": False, "fields": {}}
-        try:
-            note = await session.scalar(select(InterviewNote).where(InterviewNote.user_id == user.id))
-            if note is not None and isinstance(getattr(note, "data", None), dict):
-                interview["present"] = True
-                fields: dict[str, Any] = {}
-                if include_pii:
-                    for key, raw_val in (note.data or {}).items():
-                        if raw_val is None:
-                            continue
-                        if isinstance(raw_val, (bool, int, float)):
-                            fields[str(key)] = raw_val
-                            continue
-                        s = str(raw_val).strip()
-                        if not s:
-                            continue
-                        fields[str(key)] = s[:800]
-                    # Include interviewer name as non-critical metadata
-                    if getattr(note, "interviewer_name", None):
-                        interview["interviewer_name"] = str(note.interviewer_name)[:160]
-                else:
-                    from .redaction import redact_text
-
-                    for key in (
-                        "money_expectations",
-                        "candidate_expectations",
-                        "motivation_notes",
-                        "strengths",
-                        "risks",
-                        "recommendation",
-                    ):
-                        raw_val = (note.data or {}).get(key)
-                        if raw_val is None:
-                            continue
-                        if isinstance(raw_val, bool):
-                            fields[key] = raw_val
-                            continue
-                        if isinstance(raw_val, (int, float)):
-                            fields[key] = raw_val
-                            continue
-                        txt = redact_text(str(raw_val), candidate_fio=candidate_fio_for_redaction, max_len=240)
-                        if txt.safe_to_send and txt.text.strip():
-                            fields[key] = txt.text
-                interview["fields"] = fields
-        except Exception:
-            interview = {"present": False, "fields": {}}
-
-        # Slots summary
-        slot_filters = [Slot.candidate_id == user.candidate_id]
+    by_candidate_uid: dict[str, list[int]] = {}
+    by_tg: dict[int, list[int]] = {}
+    for user in users:
+        by_candidate_uid.setdefault(user.candidate_id, []).append(int(user.id))
         candidate_tg = user.telegram_user_id or user.telegram_id
         if candidate_tg is not None:
-            slot_filters.append(Slot.candidate_tg_id == candidate_tg)
-        slot_rows = await session.execute(
-            select(
-                Slot.id,
-                Slot.status,
-                Slot.purpose,
-                Slot.start_utc,
-                Slot.recruiter_id,
-                Slot.city_id,
-                Slot.tz_name,
-                Slot.candidate_tz,
-            )
-            .where(or_(*slot_filters))
-            .order_by(Slot.start_utc.desc(), Slot.id.desc())
-            .limit(30)
+            by_tg.setdefault(int(candidate_tg), []).append(int(user.id))
+    slot_filters = [Slot.candidate_id.in_(list(by_candidate_uid))]
+    if by_tg:
+        slot_filters.append(Slot.candidate_tg_id.in_(list(by_tg)))
+    slot_rows = await session.execute(
+        select(
+            Slot.id,
+            Slot.status,
+            Slot.purpose,
+            Slot.start_utc,
+            Slot.recruiter_id,
+            Slot.city_id,
+            Slot.tz_name,
+            Slot.candidate_tz,
+            Slot.candidate_id,
+            Slot.candidate_tg_id,
         )
-        slots = []
-        upcoming: dict[str, Any] | None = None
-        upcoming_dt: datetime | None = None
-        for row in slot_rows:
-            start_utc = row.start_utc
-            if start_utc and start_utc.tzinfo is None:
-                start_utc = start_utc.replace(tzinfo=UTC)
-            item = {
-                "id": row.id,
-                "status": (row.status or "").lower() or None,
-                "purpose": (row.purpose or "").lower() or "interview",
-                "start_utc": _iso(start_utc),
-                "recruiter_id": row.recruiter_id,
-                "city_id": row.city_id,
-                "slot_tz": row.tz_name,
-                "candidate_tz": row.candidate_tz,
-            }
-            slots.append(item)
-            if start_utc and start_utc >= now:
-                if upcoming_dt is None or start_utc < upcoming_dt:
-                    upcoming_dt = start_utc
-                    upcoming = item
-
-        # Chat summary (metadata only)
-        since = now - timedelta(days=7)
-        counts = await session.execute(
-            select(ChatMessage.direction, func.count(ChatMessage.id))
-            .where(ChatMessage.candidate_id == user.id, ChatMessage.created_at >= since)
-            .group_by(ChatMessage.direction)
+        .where(or_(*slot_filters))
+        .order_by(Slot.start_utc.desc(), Slot.id.desc())
+    )
+    for row in slot_rows:
+        owners = set(by_candidate_uid.get(row.candidate_id, ()))
+        if row.candidate_tg_id is not None:
+            owners.update(by_tg.get(int(row.candidate_tg_id), ()))
+        for uid in owners:
+            bucket = batch.slots.setdefault(uid, [])
+            if len(bucket) < _MAX_SLOTS_PER_CANDIDATE:
+                bucket.append(row)
+
+    since = now - timedelta(days=7)
+    in_window = ChatMessage.created_at >= since
+    chat_rows = await session.execute(
+        select(
+            ChatMessage.candidate_id,
+            ChatMessage.direction,
+            func.sum(case((in_window, 1), else_=0)),
+            func.max(ChatMessage.created_at),
+            func.sum(case((and_(in_window, ChatMessage.status == ChatMessageStatus.FAILED.value), 1), else_=0)),
         )
-        by_dir = {row[0]: int(row[1] or 0) for row in counts}
-        last_inbound = await session.scalar(
-            select(ChatMessage.created_at)
-            .where(
-                ChatMessage.candidate_id == user.id,
-                ChatMessage.direction == ChatMessageDirection.INBOUND.value,
+        .where(ChatMessage.candidate_id.in_(ids))
+        .group_by(ChatMessage.candidate_id, ChatMessage.direction)
+    )
+    for cid, direction, window_count, last_at, failed in chat_rows:
+        cid = int(cid)
+        batch.chat_counts.setdefault(cid, {})[direction] = int(window_count or 0)
+        batch.chat_last_at.setdefault(cid, {})[direction] = last_at
+        if direction == ChatMessageDirection.OUTBOUND.value:
+            batch.chat_failed[cid] = int(failed or 0)
+
+    if include_pii:
+        ranked = (
+            select(
+                ChatMessage.candidate_id,
+                ChatMessage.direction,
+                ChatMessage.created_at,
+                ChatMessage.author_label,
+                ChatMessage.text,
+                func.row_number()
+                .over(
+                    partition_by=ChatMessage.candidate_id,
+                    order_by=(ChatMessage.created_at.desc(), ChatMessage.id.desc()),
+                )
+                .label("rn"),
             )
-            .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
-            .limit(1)
-        )
-        last_outbound = await session.scalar(
-            select(ChatMessage.created_at)
             .where(
-                ChatMessage.candidate_id == user.id,
-                ChatMessage.direction == ChatMessageDirection.OUTBOUND.value,
+                ChatMessage.candidate_id.in_(ids),
+                ChatMessage.text.is_not(None),
+                ChatMessage.created_at >= (now - timedelta(days=14)),
             )
-            .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
-            .limit(1)
+            .subquery()
         )
-        failed_outbound = await session.scalar(
-            select(func.count(ChatMessage.id))
-            .where(
-                ChatMessage.candidate_id == user.id,
-                ChatMessage.direction == ChatMessageDirection.OUTBOUND.value,
-                ChatMessage.status == ChatMessageStatus.FAILED.value,
-                ChatMessage.created_at >= since,
-            )
+        recent_rows = await session.execute(
+            select(ranked.c.candidate_id, ranked.c.direction, ranked.c.created_at, ranked.c.author_label, ranked.c.text)
+            .where(ranked.c.rn <= _MAX_RECENT_CHAT_PER_CANDIDATE)
+            .order_by(ranked.c.candidate_id.asc(), ranked.c.rn.asc())
         )
+        for cid, direction, created_at, author_label, text_value in recent_rows:
+            batch.recent_chat.setdefault(int(cid), []).append((direction, created_at, author_label, text_value))
 
-        recent_chat: list[dict[str, Any]] = []
+    # Funnel events summary (no metadata by default)
+    try:
+        ev_rows = await session.execute(
+            sql_text(
+                """
+                SELECT candidate_id, event_name, created_at
+                FROM (
+                    SELECT candidate_id, event_name, created_at,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY candidate_id ORDER BY created_at DESC, id DESC
+                           ) AS rn
+                    FROM analytics_events
+                    WHERE candidate_id IN :cids
+                ) ranked
+                WHERE rn <= :limit
+                ORDER BY candidate_id, rn
+                """
+            ).bindparams(bindparam("cids", expanding=True)),
+            {"cids": ids, "limit": _MAX_EVENTS_PER_CANDIDATE},
+        )
+        for cid, name, dt in ev_rows.fetchall():
+            batch.events.setdefault(int(cid), []).append((name, dt))
+    except Exception:
+        batch.events_failed = True
+    return batch
+
+
+def _latest_test_result_ids(rows: list[TestResult]) -> dict[str, int]:
+    latest: dict[str, int] = {}
+    for item in rows:
+        rating = (item.rating or "").strip().upper()
+        if rating in {"TEST1", "TEST2"} and rating not in latest:
+            latest[rating] = int(item.id)
+    return latest
+
+
+def _city_profile(city_record: City | None, *, candidate_fio: str | None, include_pii: bool) -> dict[str, Any] | None:
+    if city_record is None:
+        return None
+    criteria_raw = city_record.criteria or ""
+    criteria_value = None
+    if criteria_raw and criteria_raw.strip():
         if include_pii:
-            chat_rows = await session.execute(
-                select(ChatMessage.direction, ChatMessage.created_at, ChatMessage.author_label, ChatMessage.text)
-                .where(
-                    ChatMessage.candidate_id == user.id,
-                    ChatMessage.text.is_not(None),
-                    ChatMessage.created_at >= (now - timedelta(days=14)),
-                )
-                .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
-                .limit(14)
-            )
-            for direction, created_at, author_label, text_value in reversed(chat_rows.fetchall()):
-                txt = (text_value or "").strip()
-                if not txt:
-                    continue
-                recent_chat.append(
-                    {
-                        "direction": str(direction or ""),
-                        "at": _iso(created_at),
-                        "author": (str(author_label)[:160] if author_label else None),
-                        "text": txt[:800],
-                    }
-                )
+            criteria_value = criteria_raw.strip()[:2000]
+        else:
+            from .redaction import redact_text
+
+            criteria_redaction = redact_text(criteria_raw, candidate_fio=candidate_fio, max_len=2000)
+            if criteria_redaction.safe_to_send and criteria_redaction.text.strip():
+                criteria_value = criteria_redaction.text
+
+    return {
+        "id": int(city_record.id),
+        "name": html.unescape(city_record.name or "") or None,
+        "tz": city_record.tz or None,
+        "active": bool(city_record.active),
+        # Used for AI vacancy fit assessment. Best-effort redaction is applied.
+        "criteria": criteria_value,
+        "plan_week": city_record.plan_week,
+        "plan_month": city_record.plan_month,
+    }
+
+
+def _tests_summary(
+    rows: list[TestResult],
+    answers: dict[int, list[QuestionAnswer]],
+    *,
+    candidate_fio: str | None,
+    include_pii: bool,
+) -> dict[str, Any]:
+    """Latest tests summary (+ best-effort redacted answers for the latest attempt)."""
+    tests: dict[str, Any] = {"latest": {}, "total": len(rows)}
+    latest_result_ids = _latest_test_result_ids(rows)
+    for item in rows:
+        rating = (item.rating or "").strip().upper()
+        if latest_result_ids.get(rating) == int(item.id):
+            tests["latest"][rating] = {
+                "test_result_id": int(item.id),
+                "final_score": item.final_score,
+                "raw_score": item.raw_score,
+                "total_time_sec": item.total_time,
+                "created_at": _iso(item.created_at),
+            }
+    if not latest_result_ids:
+        return tests
+
+    # Add question-level answers for latest test results (best-effort, redacted, optional).
+    extracted: dict[str, Any] = {}
+    result_id_to_rating = {int(v): str(k) for (k, v) in latest_result_ids.items()}
+    by_result: dict[int, list[dict[str, Any]]] = {}
+    ans_rows = [ans for rid in sorted(result_id_to_rating) for ans in answers.get(rid, [])]
+    for ans in ans_rows:
+        rating = result_id_to_rating.get(int(ans.test_result_id), "")
+        q_text_raw = ans.question_text or ""
+        u_text_raw = ans.user_answer or ""
+
+        if include_pii:
+            q_value = (ans.question_text or "")[:600] or None
+            u_value = (ans.user_answer or "")[:600] or None
+            c_value = (ans.correct_answer or "")[:600] or None
+        else:
+            from .redaction import redact_text
+
+            q_text = redact_text(ans.question_text or "", candidate_fio=candidate_fio, max_len=400)
+            u_text = redact_text(ans.user_answer or "", candidate_fio=candidate_fio, max_len=200)
+            c_text = redact_text(ans.correct_answer or "", candidate_fio=candidate_fio, max_len=200)
+            q_value = q_text.text if q_text.safe_to_send and q_text.text.strip() else None
+            u_value = u_text.text if u_text.safe_to_send and u_text.text.strip() else None
+            c_value = c_text.text if c_text.safe_to_send and c_text.text.strip() else None
+
+        if rating == "TEST1":
+            q_lc = q_text_raw.lower()
+            u_for_extract = (u_text_raw.strip() if include_pii else (u_value or "")).strip()
+            if extracted.get("age_years") is None:
+                if ("полных" in q_lc and "лет" in q_lc) or ("сколько" in q_lc and "лет" in q_lc):
+                    age = _parse_int(u_for_extract or None)
+                    if age is not None and 14 <= age <= 80:
+                        extracted["age_years"] = int(age)
+            if extracted.get("desired_income") is None:
+                if "уровень дохода" in q_lc or ("желаемый" in q_lc and "доход" in q_lc):
+                    extracted["desired_income"] = u_for_extract[:120] if u_for_extract else None
+            if extracted.get("work_status") is None:
+                if ("учитесь" in q_lc and "работ" in q_lc) or ("работаете" in q_lc and "уч" in q_lc):
+                    extracted["work_status"] = u_for_extract[:120] if u_for_extract else None
+            if extracted.get("work_experience") is None:
+                if "опыт" in q_lc and ("продаж" in q_lc or "переговор" in q_lc or "смеж" in q_lc):
+                    extracted["work_experience"] = u_for_extract[:800] if u_for_extract else None
+            if extracted.get("motivation") is None:
+                if "мотивир" in q_lc:
+                    extracted["motivation"] = u_for_extract[:800] if u_for_extract else None
+            if extracted.get("skills") is None:
+                if "навык" in q_lc or "качества" in q_lc:
+                    extracted["skills"] = u_for_extract[:800] if u_for_extract else None
+            if extracted.get("expectations") is None:
+                if "ожида" in q_lc:
+                    extracted["expectations"] = u_for_extract[:800] if u_for_extract else None
+            if extracted.get("field_format_readiness") is None:
+                if (
+                    "полев" in q_lc
+                    or "выезд" in q_lc
+                    or "разъезд" in q_lc
+                    or "в движении" in q_lc
+                    or ("формат" in q_lc and ("работ" in q_lc or "дня" in q_lc))
+                ):
+                    extracted["field_format_readiness"] = u_for_extract[:200] if u_for_extract else None
+            if extracted.get("start_readiness") is None:
+                if (
+                    "стартовать" in q_lc
+                    or "приступить" in q_lc
+                    or "сможете выйти" in q_lc
+                    or "сколько времени потребуется" in q_lc
+                    or "2–3 дня" in q_lc
+                    or "2-3 дня" in q_lc
+                ):
+                    extracted["start_readiness"] = u_for_extract[:200] if u_for_extract else None
+
+        by_result.setdefault(int(ans.test_result_id), []).append(
+            {
+                "question_index": int(ans.question_index),
+                "question_text": q_value,
+                "user_answer": u_value,
+                "correct_answer": c_value,
+                "is_correct": bool(ans.is_correct),
+                "attempts_count": int(ans.attempts_count or 0),
+                "time_spent_sec": int(ans.time_spent or 0),
+                "overtime": bool(ans.overtime),
+            }
+        )
+
+    for rating, rid in latest_result_ids.items():
+        if rating in tests["latest"]:
+            tests["latest"][rating]["answers"] = by_result.get(rid, [])
+    if extracted:
+        tests["extracted"] = extracted
+    return tests
+
+
+def _interview_summary(note: InterviewNote | None, *, candidate_fio: str | None, include_pii: bool) -> dict[str, Any]:
+    """Interview notes summary (limited, best-effort, redacted)."""
+    interview: dict[str, Any] = {"present": False, "fields": {}}
+    try:
+        if note is not None and isinstance(getattr(note, "data", None), dict):
+            interview["present"] = True
+            fields: dict[str, Any] = {}
+            if include_pii:
+                for key, raw_val in (note.data or {}).items():
+                    if raw_val is None:
+                        continue
+                    if isinstance(raw_val, (bool, int, float)):
+                        fields[str(key)] = raw_val
+                        continue
+                    s = str(raw_val).strip()
+                    if not s:
+                        continue
+                    fields[str(key)] = s[:800]
+                # Include interviewer name as non-critical metadata
+                if getattr(note, "interviewer_name", None):
+                    interview["interviewer_name"] = str(note.interviewer_name)[:160]
+            else:
+                from .redaction import redact_text
+
+                for key in (
+                    "money_expectations",
+                    "candidate_expectations",
+                    "motivation_notes",
+                    "strengths",
+                    "risks",
+                    "recommendation",
+                ):
+                    raw_val = (note.data or {}).get(key)
+                    if raw_val is None:
+                        continue
+                    if isinstance(raw_val, bool):
+                        fields[key] = raw_val
+                        continue
+                    if isinstance(raw_val, (int, float)):
+                        fields[key] = raw_val
+                        continue
+                    txt = redact_text(str(raw_val), candidate_fio=candidate_fio, max_len=240)
+                    if txt.safe_to_send and txt.text.strip():
+                        fields[key] = txt.text
+            interview["fields"] = fields
+    except Exception:
+        interview = {"present": False, "fields": {}}
+    return interview
+
+
+def _slots_summary(rows: list[Any], *, now: datetime) -> tuple[list[dict[str, Any]], dict[str, Any] | None]:
+    slots = []
+    upcoming: dict[str, Any] | None = None
+    upcoming_dt: datetime | None = None
+    for row in rows:
+        start_utc = row.start_utc
+        if start_utc and start_utc.tzinfo is None:
+            start_utc = start_utc.replace(tzinfo=UTC)
+        item = {
+            "id": row.id,
+            "status": (row.status or "").lower() or None,
+            "purpose": (row.purpose or "").lower() or "interview",
+            "start_utc": _iso(start_utc),
+            "recruiter_id": row.recruiter_id,
+            "city_id": row.city_id,
+            "slot_tz": row.tz_name,
+            "candidate_tz": row.candidate_tz,
+        }
+        slots.append(item)
+        if start_utc and start_utc >= now:
+            if upcoming_dt is None or start_utc < upcoming_dt:
+                upcoming_dt = start_utc
+                upcoming = item
+    return slots, upcoming
+
+
+def _recent_chat(rows: list[Any]) -> list[dict[str, Any]]:
+    recent_chat: list[dict[str, Any]] = []
+    for direction, created_at, author_label, text_value in reversed(rows):
+        txt = (text_value or "").strip()
+        if not txt:
+            continue
+        recent_chat.append(
+            {
+                "direction": str(direction or ""),
+                "at": _iso(created_at),
+                "author": (str(author_label)[:160] if author_label else None),
+                "text": txt[:800],
+            }
+        )
+    return recent_chat
+
+
+def _funnel_events(batch: _CandidateBatch, candidate_id: int) -> list[dict[str, Any]]:
+    if batch.events_failed:
+        return []
+    try:
+        return [{"event": str(name), "at": _iso(dt)} for (name, dt) in batch.events.get(candidate_id, [])]
+    except Exception:
+        return []
 
-        # Funnel events summary (no metadata by default)
-        try:
-            ev_rows = await session.execute(
-                sql_text(
-                    """
-                    SELECT event_name, created_at
-                    FROM analytics_events
-                    WHERE candidate_id = :cid
-                    ORDER BY created_at DESC, id DESC
-                    LIMIT 50
-                    """
-                ),
-                {"cid": user.id},
-            )
-            events = [
-                {"event": str(name), "at": _iso(dt)}
-                for (name, dt) in ev_rows.fetchall()
-            ]
-        except Exception:
-            events = []
+
+def _assemble_candidate_context(
+    user: User,
+    batch: _CandidateBatch,
+    *,
+    include_pii: bool,
+    now: datetime,
+) -> dict[str, Any]:
+    uid = int(user.id)
+    candidate_fio_for_redaction = user.fio
+    recruiter_record = (
+        batch.recruiters.get(int(user.responsible_recruiter_id)) if user.responsible_recruiter_id is not None else None
+    )
+    city_profile = _city_profile(
+        batch.cities.get(uid),
+        candidate_fio=candidate_fio_for_redaction,
+        include_pii=include_pii,
+    )
+    tests = _tests_summary(
+        batch.tests.get(uid, []),
+        batch.answers,
+        candidate_fio=candidate_fio_for_redaction,
+        include_pii=include_pii,
+    )
+    if batch.notes_failed:
+        interview: dict[str, Any] = {"present": False, "fields": {}}
+    else:
+        interview = _interview_summary(
+            batch.notes.get(uid),
+            candidate_fio=candidate_fio_for_redaction,
+            include_pii=include_pii,
+        )
+    slots, upcoming = _slots_summary(batch.slots.get(uid, []), now=now)
+    by_dir = batch.chat_counts.get(uid, {})
+    last_at = batch.chat_last_at.get(uid, {})
+    recent_chat = _recent_chat(batch.recent_chat.get(uid, [])) if include_pii else []
+    events = _funnel_events(batch, uid)
 
     candidate_status = getattr(user, "candidate_status", None)
     status_slug = getattr(candidate_status, "value", None) if candidate_status is not None else None
@@ -565,7 +746,7 @@ async def build_candidate_ai_context(
             }
         )
 
-    ctx: dict[str, Any] = {
+    return {
         "candidate": candidate_obj,
         "city_profile": city_profile,
         "recruiter": (
@@ -613,9 +794,9 @@ async def build_candidate_ai_context(
             "window_days": 7,
             "inbound_count": int(by_dir.get(ChatMessageDirection.INBOUND.value, 0) or 0),
             "outbound_count": int(by_dir.get(ChatMessageDirection.OUTBOUND.value, 0) or 0),
-            "failed_outbound_count": int(failed_outbound or 0),
-            "last_inbound_at": _iso(last_inbound),
-            "last_outbound_at": _iso(last_outbound),
+            "failed_outbound_count": int(batch.chat_failed.get(uid, 0) or 0),
+            "last_inbound_at": _iso(last_at.get(ChatMessageDirection.INBOUND.value)),
+            "last_outbound_at": _iso(last_at.get(ChatMessageDirection.OUTBOUND.value)),
             "recent": (recent_chat if include_pii else []),
         },
         "funnel_events": {
@@ -625,18 +806,93 @@ async def build_candidate_ai_context(
         "interview_notes": interview,
     }
 
+
+def _candidate_kb_query(ctx: dict[str, Any], user: User) -> str:
     kb_query_parts: list[str] = ["критерии оценки кандидатов"]
+    city_profile = ctx.get("city_profile")
     if city_profile and city_profile.get("criteria"):
         kb_query_parts.append(str(city_profile.get("criteria")))
     if user.desired_position:
         kb_query_parts.append(str(user.desired_position))
+    status_slug = ctx["candidate"].get("status")
     if status_slug:
         kb_query_parts.append(str(status_slug))
-    ctx = await _attach_kb_excerpts(ctx, query=" ".join(kb_query_parts), limit=3)
+    return " ".join(kb_query_parts)
+
+
+async def build_candidate_ai_contexts(
+    candidate_ids: list[int] | tuple[int, ...] | set[int],
+    *,
+    principal: Principal,
+    include_pii: bool = False,
+) -> dict[int, dict[str, Any]]:
+    """Build AI contexts for many candidates with a fixed number of set-based queries.
+
+    Each context is identical to what ``build_candidate_ai_context`` returns for
+    that candidate. Unknown candidates and candidates outside the principal's
+    scope are left out of the result.
+    """
+    ids = sorted({int(candidate_id) for candidate_id in candidate_ids})
+    if not ids:
+        return {}
+    now = datetime.now(UTC)
+    async with async_session() as session:
+        batch = await _load_candidate_batch(session, ids, principal=principal, include_pii=include_pii, now=now)
+
+    contexts: dict[int, dict[str, Any]] = {}
+    queries: list[tuple[dict[str, Any], str]] = []
+    for user in batch.users:
+        ctx = _assemble_candidate_context(user, batch, include_pii=include_pii, now=now)
+        contexts[int(user.id)] = ctx
+        queries.append((ctx, _candidate_kb_query(ctx, user)))
+    await _attach_kb_excerpts_many(queries, limit=3)
+    return contexts
+
+
+@asynccontextmanager
+async def prefetch_candidate_ai_contexts(
+    candidate_ids: list[int] | tuple[int, ...] | set[int],
+    *,
+    principal: Principal,
+    include_pii: bool = False,
+) -> AsyncIterator[None]:
+    """Serve ``build_candidate_ai_context`` calls inside the block from one batched load.
+
+    Used by bulk jobs (AI warm-up) that walk many candidates through the regular
+    per-candidate service methods.
+    """
+    contexts = await build_candidate_ai_contexts(candidate_ids, principal=principal, include_pii=include_pii)
+    prefetched = dict(_prefetched_contexts.get() or {})
+    for candidate_id, ctx in contexts.items():
+        prefetched[(principal.type, int(principal.id), bool(include_pii), candidate_id)] = ctx
+    token = _prefetched_contexts.set(prefetched)
+    try:
+        yield
+    finally:
+        _prefetched_contexts.reset(token)
+
+
+async def build_candidate_ai_context(
+    candidate_id: int,
+    *,
+    principal: Principal,
+    include_pii: bool = False,
+) -> dict[str, Any]:
+    prefetched = _prefetched_contexts.get()
+    if prefetched:
+        ctx = prefetched.get((principal.type, int(principal.id), bool(include_pii), int(candidate_id)))
+        if ctx is not None:
+            return copy.deepcopy(ctx)
+    contexts = await build_candidate_ai_contexts([candidate_id], principal=principal, include_pii=include_pii)
+    ctx = contexts.get(int(candidate_id))
+    if ctx is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Candidate not found")
     return ctx
 
 
-async def _attach_kb_excerpts(ctx: dict[str, Any], *, query: str, limit: int = 3) -> dict[str, Any]:
+async def _attach_kb_excerpts_many(items: list[tuple[dict[str, Any], str]], *, limit: int = 3) -> None:
+    if not items:
+        return
     from .knowledge_base import (
         kb_state_snapshot,
         list_active_documents,
@@ -645,16 +901,21 @@ async def _attach_kb_excerpts(ctx: dict[str, Any], *, query: str, limit: int = 3
 
     kb_state = await kb_state_snapshot()
     kb_docs = await list_active_documents(limit=8)
-    excerpts = []
-    query_clean = (query or "").strip()
-    if query_clean:
-        excerpts = await search_excerpts(query_clean, limit=limit)
-    ctx["knowledge_base"] = {
-        "query": query_clean or None,
-        "documents": kb_docs,
-        "excerpts": excerpts,
-        "state": kb_state,
-    }
+    excerpts_by_query: dict[str, list[dict[str, Any]]] = {}
+    for ctx, query in items:
+        query_clean = (query or "").strip()
+        if query_clean and query_clean not in excerpts_by_query:
+            excerpts_by_query[query_clean] = await search_excerpts(query_clean, limit=limit)
+        ctx["knowledge_base"] = {
+            "query": query_clean or None,
+            "documents": copy.deepcopy(kb_docs),
+            "excerpts": copy.deepcopy(excerpts_by_query.get(query_clean, [])),
+            "state": dict(kb_state),
+        }
+
+
+async def _attach_kb_excerpts(ctx: dict[str, Any], *, query: str, limit: int = 3) -> dict[str, Any]:
+    await _attach_kb_excerpts_many([(ctx, query)], limit=limit)
     return ctx
 
 
@@ -1,12 +1,17 @@
 """Knowledge Base chunking, indexing, and search.
 
 Documents are stored in ``KnowledgeBaseDocument`` and split into overlapping
-character-based chunks (``KnowledgeBaseChunk``).  Search uses keyword matching
-with TF-IDF ranking.
+character-based chunks (``KnowledgeBaseChunk``).  Every chunk is tokenized
+once, at index time, into stemmed terms stored in ``KnowledgeBasePosting``
+(term → chunk, tf) with the chunk length in ``token_count``.  A query is a
+top-k BM25 aggregation over the postings of its terms; results are cached
+in-process per KB version.
 
 Key functions:
-- ``reindex_document(doc_id)`` — re-chunk a document after content change.
+- ``reindex_document(doc_id)`` — re-chunk and re-index a document after content change.
+- ``delete_document(doc_id)`` — remove a document together with its chunks and postings.
 - ``search_excerpts(query)`` — return top KB excerpts for a natural-language query.
+- ``backfill_pending_chunks()`` — index chunks stored before postings existed (background job).
 - ``list_active_documents()`` — list all active KB documents.
 - ``kb_state_snapshot()`` — lightweight stats (count, last updated).
 """
@@ -14,15 +19,24 @@ Key functions:
 from __future__ import annotations
 
 import hashlib
+import math
 import re
-from collections.abc import Iterable
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any
 
-from sqlalchemy import delete, func, or_, select
+from sqlalchemy import case, delete, func, insert, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.db import async_session
-from backend.domain.ai.models import KnowledgeBaseChunk, KnowledgeBaseDocument
+from backend.domain.ai.models import (
+    KnowledgeBaseChunk,
+    KnowledgeBaseDocument,
+    KnowledgeBasePosting,
+)
 
 _WORD_RE = re.compile(r"[A-Za-zА-Яа-яЁё0-9_]{3,}")
 
@@ -59,6 +73,36 @@ _STOPWORDS = {
 }
 
 
+# Light suffix stripping + truncation: "опытом"/"опыт" and
+# "кандидатов"/"кандидат" land on the same term, which the old substring
+# LIKE search matched implicitly.
+_SUFFIXES = tuple(
+    sorted(
+        {
+            "ами", "ями", "ого", "его", "ому", "ему", "ыми", "ими", "ешь", "ете", "ите",
+            "ов", "ев", "ей", "ом", "ем", "ой", "ый", "ий", "ая", "яя", "ое", "ее", "ые",
+            "ие", "ых", "их", "ую", "юю", "ам", "ям", "ах", "ях", "ть", "ет", "ит", "ут",
+            "ют", "ат", "ят", "а", "я", "о", "е", "ы", "и", "у", "ю", "ь", "s",
+        },
+        key=len,
+        reverse=True,
+    )
+)
+_MIN_STEM = 4
+_MAX_STEM = 6
+
+# BM25 parameters (Robertson/Sparck Jones defaults).
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+# Pending chunks a single search may index inline before ranking.
+_INLINE_BACKFILL_BATCH = 50
+
+_SEARCH_CACHE_SIZE = 256
+_search_cache: OrderedDict[tuple, list[dict[str, Any]]] = OrderedDict()
+_search_cache_version: tuple | None = None
+
+
 def _sha256(text: str) -> str:
     return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
 
@@ -121,98 +165,273 @@ def extract_query_tokens(text: str, *, max_terms: int = 10) -> list[str]:
     return terms
 
 
+def index_term(word: str) -> str:
+    """Normalize a word to its index term (lowercase, ё→е, stripped suffix, ≤6 chars)."""
+    term = (word or "").lower().replace("ё", "е")
+    for suffix in _SUFFIXES:
+        if term.endswith(suffix) and len(term) - len(suffix) >= _MIN_STEM:
+            term = term[: -len(suffix)]
+            break
+    return term[:_MAX_STEM]
+
+
+def index_terms(text: str) -> Counter[str]:
+    """Term frequencies of a chunk, using the same filtering as query tokens."""
+    counts: Counter[str] = Counter()
+    for word in _WORD_RE.findall((text or "").lower()):
+        if len(word) < 4 or word.isdigit() or word in _STOPWORDS:
+            continue
+        counts[index_term(word)] += 1
+    return counts
+
+
+async def _index_chunks(session: AsyncSession, chunks: list[KnowledgeBaseChunk]) -> None:
+    """Write postings and ``token_count`` for freshly flushed chunks."""
+
+    rows: list[dict[str, Any]] = []
+    for chunk in chunks:
+        counts = index_terms(chunk.content_text or "")
+        chunk.token_count = sum(counts.values())
+        rows.extend(
+            {"term": term, "chunk_id": int(chunk.id), "document_id": int(chunk.document_id), "tf": tf}
+            for term, tf in counts.items()
+        )
+    if not rows:
+        return
+    # Concurrent searches may backfill the same pending chunks; the loser's
+    # duplicate postings are skipped instead of raising IntegrityError.
+    dialect_name = session.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        stmt = pg_insert(KnowledgeBasePosting).on_conflict_do_nothing(index_elements=["term", "chunk_id"])
+    elif dialect_name == "sqlite":
+        stmt = sqlite_insert(KnowledgeBasePosting).on_conflict_do_nothing(index_elements=["term", "chunk_id"])
+    else:
+        stmt = insert(KnowledgeBasePosting)
+    await session.execute(stmt, rows)
+
+
 async def reindex_document(document_id: int) -> int:
-    """(Re)create chunks for a document. Returns chunks total."""
+    """(Re)create chunks and postings for a document. Returns chunks total."""
 
     async with async_session() as session:
         doc = await session.get(KnowledgeBaseDocument, document_id)
         if doc is None:
             return 0
 
+        await session.execute(delete(KnowledgeBasePosting).where(KnowledgeBasePosting.document_id == doc.id))
         await session.execute(delete(KnowledgeBaseChunk).where(KnowledgeBaseChunk.document_id == doc.id))
 
         chunks = chunk_text(doc.content_text or "")
         now = datetime.now(UTC)
-        for idx, chunk in enumerate(chunks):
-            session.add(
-                KnowledgeBaseChunk(
-                    document_id=int(doc.id),
-                    chunk_index=int(idx),
-                    content_text=chunk,
-                    content_hash=_sha256(chunk),
-                    created_at=now,
-                )
+        rows = [
+            KnowledgeBaseChunk(
+                document_id=int(doc.id),
+                chunk_index=int(idx),
+                content_text=chunk,
+                content_hash=_sha256(chunk),
+                created_at=now,
             )
+            for idx, chunk in enumerate(chunks)
+        ]
+        session.add_all(rows)
+        await session.flush()
+        await _index_chunks(session, rows)
 
-        # Touch updated_at so AI caches invalidate even if only chunks change.
+        # Touch updated_at so AI caches (and the search cache) invalidate even if only chunks change.
         doc.updated_at = now
         await session.commit()
         return len(chunks)
 
 
-async def _candidate_chunks_for_terms(
-    terms: list[str],
-    *,
-    limit: int,
-    categories: list[str] | None = None,
-) -> list[KnowledgeBaseChunk]:
-    if not terms:
-        return []
-
-    clauses = []
-    for t in terms[:10]:
-        pat = f"%{t}%"
-        clauses.append(func.lower(KnowledgeBaseChunk.content_text).like(pat))
-    categories_norm = [str(c).strip().lower() for c in (categories or []) if str(c).strip()]
+async def delete_document(document_id: int) -> bool:
+    """Delete a document with its chunks and postings. Returns False if it did not exist."""
 
     async with async_session() as session:
-        stmt = (
-            select(KnowledgeBaseChunk)
-            .join(KnowledgeBaseDocument, KnowledgeBaseChunk.document_id == KnowledgeBaseDocument.id)
-            .where(
-                KnowledgeBaseDocument.is_active.is_(True),
-                or_(*clauses),
+        doc = await session.get(KnowledgeBaseDocument, document_id)
+        if doc is None:
+            return False
+        # Explicit deletes: SQLite does not enforce ON DELETE CASCADE by default.
+        await session.execute(delete(KnowledgeBasePosting).where(KnowledgeBasePosting.document_id == doc.id))
+        await session.execute(delete(KnowledgeBaseChunk).where(KnowledgeBaseChunk.document_id == doc.id))
+        await session.delete(doc)
+        await session.commit()
+    _search_cache.clear()
+    return True
+
+
+@dataclass(frozen=True)
+class _IndexStats:
+    version: tuple
+    chunks_total: int
+    avg_length: float
+    pending: int
+
+
+_stats_cache: _IndexStats | None = None
+
+
+async def _kb_version(session: AsyncSession) -> tuple:
+    """Cheap KB version: every reindex/(de)activation touches ``updated_at``, deletes change the count."""
+
+    total, last_updated = (
+        await session.execute(
+            select(func.count(KnowledgeBaseDocument.id), func.max(KnowledgeBaseDocument.updated_at)).where(
+                KnowledgeBaseDocument.is_active.is_(True)
             )
         )
-        if categories_norm:
-            stmt = stmt.where(func.lower(KnowledgeBaseDocument.category).in_(categories_norm))
-        rows = (
+    ).one()
+    return (int(total or 0), _iso(last_updated))
+
+
+async def _index_stats(session: AsyncSession) -> _IndexStats:
+    """BM25 corpus statistics for active documents, recomputed only when the KB version changes."""
+
+    global _stats_cache
+    version = await _kb_version(session)
+    cached = _stats_cache
+    if cached is not None and cached.version == version and not cached.pending:
+        return cached
+
+    chunks_total, tokens_total, pending = (
+        await session.execute(
+            select(
+                func.count(KnowledgeBaseChunk.id),
+                func.coalesce(func.sum(KnowledgeBaseChunk.token_count), 0),
+                func.count(KnowledgeBaseChunk.id) - func.count(KnowledgeBaseChunk.token_count),
+            )
+            .join(KnowledgeBaseDocument, KnowledgeBaseChunk.document_id == KnowledgeBaseDocument.id)
+            .where(KnowledgeBaseDocument.is_active.is_(True))
+        )
+    ).one()
+    chunks_total = int(chunks_total or 0)
+    stats = _IndexStats(
+        version=version,
+        chunks_total=chunks_total,
+        avg_length=float(tokens_total or 0) / chunks_total if chunks_total else 0.0,
+        pending=int(pending or 0),
+    )
+    _stats_cache = stats
+    return stats
+
+
+async def _index_pending_chunks(session: AsyncSession, *, batch_size: int) -> int:
+    """Index one batch of chunks written before postings existed (``token_count`` IS NULL)."""
+
+    chunks = list(
+        (
             await session.execute(
-                stmt.limit(int(limit))
+                select(KnowledgeBaseChunk)
+                .where(KnowledgeBaseChunk.token_count.is_(None))
+                .order_by(KnowledgeBaseChunk.id)
+                .limit(batch_size)
             )
-        ).scalars().all()
-        return list(rows)
+        ).scalars()
+    )
+    if not chunks:
+        return 0
+    await session.execute(
+        delete(KnowledgeBasePosting).where(KnowledgeBasePosting.chunk_id.in_([int(c.id) for c in chunks]))
+    )
+    await _index_chunks(session, chunks)
+    await session.flush()
+    return len(chunks)
 
 
-def _rank_chunks(chunks: Iterable[KnowledgeBaseChunk], terms: list[str]) -> list[KnowledgeBaseChunk]:
-    """Rank chunks using TF-IDF-like scoring: term frequency weighted by inverse document frequency."""
-    terms_lc = [t.lower() for t in terms if t]
-    chunk_list = list(chunks)
-    if not chunk_list or not terms_lc:
-        return chunk_list
+async def backfill_pending_chunks(*, batch_size: int = 500) -> int:
+    """Index every pending chunk, committing per batch; returns the number indexed."""
 
-    # Compute IDF: how many chunks contain each term
-    doc_freq: dict[str, int] = {}
-    for t in terms_lc:
-        doc_freq[t] = sum(1 for ch in chunk_list if t in (ch.content_text or "").lower())
+    indexed = 0
+    while True:
+        async with async_session() as session:
+            count = await _index_pending_chunks(session, batch_size=batch_size)
+            await session.commit()
+        indexed += count
+        if count < batch_size:
+            return indexed
 
-    total = len(chunk_list)
 
-    import math
+async def _bm25_top_chunks(
+    session: AsyncSession,
+    terms: list[str],
+    stats: _IndexStats,
+    *,
+    limit: int,
+    categories: list[str],
+) -> list[KnowledgeBaseChunk]:
+    """Top-``limit`` chunks by BM25, aggregated in SQL over the terms' postings."""
+
+    active = [KnowledgeBaseDocument.is_active.is_(True)]
+    if categories:
+        active.append(func.lower(KnowledgeBaseDocument.category).in_(categories))
+
+    df_rows = (
+        await session.execute(
+            select(KnowledgeBasePosting.term, func.count())
+            .join(KnowledgeBaseDocument, KnowledgeBasePosting.document_id == KnowledgeBaseDocument.id)
+            .where(KnowledgeBasePosting.term.in_(terms), KnowledgeBaseDocument.is_active.is_(True))
+            .group_by(KnowledgeBasePosting.term)
+        )
+    ).all()
+    if not df_rows:
+        return []
+    n = stats.chunks_total
+    idf = {
+        str(term): math.log(1.0 + (n - int(df) + 0.5) / (int(df) + 0.5))
+        for term, df in df_rows
+    }
+
+    tf = KnowledgeBasePosting.tf
+    length_norm = literal(_BM25_K1 * (1 - _BM25_B)) + literal(_BM25_K1 * _BM25_B / (stats.avg_length or 1.0)) * func.coalesce(
+        KnowledgeBaseChunk.token_count, 0
+    )
+    term_weight = case(
+        *((KnowledgeBasePosting.term == term, literal(weight)) for term, weight in idf.items()),
+        else_=literal(0.0),
+    )
+    score = func.sum(term_weight * tf * literal(_BM25_K1 + 1) / (tf + length_norm)).label("score")
+    ranked = (
+        await session.execute(
+            select(KnowledgeBasePosting.chunk_id, score)
+            .join(KnowledgeBaseChunk, KnowledgeBasePosting.chunk_id == KnowledgeBaseChunk.id)
+            .join(KnowledgeBaseDocument, KnowledgeBasePosting.document_id == KnowledgeBaseDocument.id)
+            .where(KnowledgeBasePosting.term.in_(list(idf)), *active)
+            .group_by(KnowledgeBasePosting.chunk_id)
+            .order_by(score.desc(), KnowledgeBasePosting.chunk_id.asc())
+            .limit(int(limit))
+        )
+    ).all()
+    chunk_ids = [int(chunk_id) for chunk_id, _ in ranked]
+    if not chunk_ids:
+        return []
+    by_id = {
+        int(chunk.id): chunk
+        for chunk in (
+            await session.execute(select(KnowledgeBaseChunk).where(KnowledgeBaseChunk.id.in_(chunk_ids)))
+        ).scalars()
+    }
+    return [by_id[chunk_id] for chunk_id in chunk_ids if chunk_id in by_id]
+
+
+def _cache_lookup(version: tuple, key: tuple) -> list[dict[str, Any]] | None:
+    global _search_cache_version
+    if _search_cache_version != version:
+        _search_cache.clear()
+        _search_cache_version = version
+        return None
+    cached = _search_cache.get(key)
+    if cached is None:
+        return None
+    _search_cache.move_to_end(key)
+    return [dict(item) for item in cached]
 
-    def score(ch: KnowledgeBaseChunk) -> float:
-        txt = (ch.content_text or "").lower()
-        txt_len = len(txt) or 1
-        s = 0.0
-        for t in terms_lc:
-            tf = txt.count(t) / (txt_len / 100)  # normalized TF per 100 chars
-            df = doc_freq.get(t, 0)
-            idf = math.log(1 + total / (1 + df))
-            s += tf * idf
-        return s
 
-    ranked = sorted(chunk_list, key=score, reverse=True)
-    return ranked
+def _cache_store(version: tuple, key: tuple, results: list[dict[str, Any]]) -> None:
+    if _search_cache_version != version:
+        return
+    _search_cache[key] = [dict(item) for item in results]
+    _search_cache.move_to_end(key)
+    while len(_search_cache) > _SEARCH_CACHE_SIZE:
+        _search_cache.popitem(last=False)
 
 
 async def search_excerpts(
@@ -223,20 +442,30 @@ async def search_excerpts(
 ) -> list[dict[str, Any]]:
     """Return top KB excerpts for a query (anonymized; no PII expected)."""
 
-    terms = extract_query_tokens(query, max_terms=10)
-    # Fetch a bit more for ranking stability.
-    candidates = await _candidate_chunks_for_terms(
-        terms,
-        limit=max(20, limit * 6),
-        categories=categories,
-    )
-    ranked = _rank_chunks(candidates, terms)
+    terms = list(dict.fromkeys(index_term(t) for t in extract_query_tokens(query, max_terms=10)))
+    if not terms:
+        return []
+    categories_norm = sorted({str(c).strip().lower() for c in (categories or []) if str(c).strip()})
+    cache_key = (tuple(terms), int(limit), tuple(categories_norm))
 
-    # Fetch titles for returned docs.
-    doc_ids = {int(ch.document_id) for ch in ranked[:limit]}
-    docs_meta: dict[int, dict[str, Any]] = {}
-    if doc_ids:
-        async with async_session() as session:
+    async with async_session() as session:
+        stats = await _index_stats(session)
+        if stats.pending:
+            # The background backfill does the bulk; a search only takes a small bite.
+            await _index_pending_chunks(session, batch_size=_INLINE_BACKFILL_BATCH)
+            await session.commit()
+            stats = await _index_stats(session)
+
+        cached = _cache_lookup(stats.version, cache_key)
+        if cached is not None:
+            return cached
+
+        ranked = await _bm25_top_chunks(session, terms, stats, limit=limit, categories=categories_norm)
+
+        # Fetch titles for returned docs.
+        doc_ids = {int(ch.document_id) for ch in ranked}
+        docs_meta: dict[int, dict[str, Any]] = {}
+        if doc_ids:
             rows = (
                 await session.execute(
                     select(
@@ -257,7 +486,7 @@ async def search_excerpts(
             }
 
     results: list[dict[str, Any]] = []
-    for ch in ranked[:limit]:
+    for ch in ranked:
         text = (ch.content_text or "").strip()
         if len(text) > 700:
             text = text[:700].rstrip() + "…"
@@ -271,6 +500,7 @@ async def search_excerpts(
                 "excerpt": text,
             }
         )
+    _cache_store(stats.version, cache_key, results)
     return results
 
 
@@ -52,11 +52,13 @@ from .context import (
     build_city_candidate_recommendations_context,
     compute_input_hash,
     get_last_inbound_message_text,
+    prefetch_candidate_ai_contexts,
 )
 from .interview_script_builder import build_structured_interview_script
 from .llm_script_generator import (
     KB_INTERVIEW_SCRIPT_CATEGORIES,
     PROMPT_VERSION_INTERVIEW_SCRIPT,
+    ScriptGenerationResult,
     build_base_risk_flags,
     build_interview_script_fallback,
     generate_interview_script,
@@ -75,7 +77,7 @@ from .prompts import (
     dashboard_insight_prompts,
     recruiter_next_best_action_prompts,
 )
-from .providers import AIProvider, AIProviderError, FakeProvider, OpenAIProvider
+from .providers import AIProvider, AIProviderError, FakeProvider, OpenAIProvider, Usage
 from .redaction import redact_text
 from .schemas import (
     AgentChatReplyV1,
@@ -90,8 +92,10 @@ from .schemas import (
     InterviewScriptPayload,
     RecruiterNextBestActionV1,
 )
+from .single_flight import get_ai_single_flight, single_flight_key
 
 logger = logging.getLogger(__name__)
+_WARM_CONTEXT_BATCH_SIZE = 50
 _CANDIDATE_AI_KINDS = (
     "candidate_summary_v1",
     "candidate_coach_v1",
@@ -1136,8 +1140,16 @@ async def warm_candidates_ai_outputs(
     from backend.apps.admin_ui.security import admin_principal
 
     principal_value = principal or admin_principal()
-    for candidate_id in ids:
-        await _warm_candidate_ai_outputs(candidate_id, principal=principal_value, refresh=refresh)
+    settings = get_settings()
+    if not settings.ai_enabled:
+        return
+    include_pii = (settings.ai_pii_mode or "").strip().lower() == "full"
+    for offset in range(0, len(ids), _WARM_CONTEXT_BATCH_SIZE):
+        chunk = ids[offset : offset + _WARM_CONTEXT_BATCH_SIZE]
+        # One batched context load per chunk instead of ~20 queries per candidate and call.
+        async with prefetch_candidate_ai_contexts(chunk, principal=principal_value, include_pii=include_pii):
+            for candidate_id in chunk:
+                await _warm_candidate_ai_outputs(candidate_id, principal=principal_value, refresh=refresh)
 
 
 def schedule_warm_candidate_ai_outputs(
@@ -1262,6 +1274,37 @@ class AIService:
                 logger.warning("ai.budget.exceeded", extra={"spent_usd": round(spent, 4), "budget_usd": budget})
                 raise AIRateLimitedError("daily_budget_exceeded")
 
+    async def _generate_json(
+        self,
+        *,
+        kind: str,
+        scope_type: str,
+        scope_id: int,
+        input_hash: str,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        timeout_seconds: int,
+        max_tokens: int,
+    ) -> tuple[dict, Usage]:
+        """Call the provider once per identical in-flight generation.
+
+        Concurrent callers with the same ``(kind, scope, input_hash)`` share the
+        leader's result (see ``single_flight``); waiters get zero usage so the
+        tokens are logged once.
+        """
+        return await get_ai_single_flight().run(
+            single_flight_key(kind, scope_type, scope_id, input_hash),
+            lambda: self._provider.generate_json(
+                model=model,
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                timeout_seconds=timeout_seconds,
+                max_tokens=max_tokens,
+            ),
+            kind=kind,
+        )
+
     async def get_candidate_summary(
         self,
         candidate_id: int,
@@ -1349,7 +1392,11 @@ class AIService:
             max_tokens = 1800
         started = time.monotonic()
         try:
-            payload, usage = await self._provider.generate_json(
+            payload, usage = await self._generate_json(
+                kind=kind,
+                scope_type="candidate",
+                scope_id=candidate_id,
+                input_hash=input_hash,
                 model=model,
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
@@ -1503,7 +1550,11 @@ class AIService:
             max_tokens = 1600
         started = time.monotonic()
         try:
-            payload, usage = await self._provider.generate_json(
+            payload, usage = await self._generate_json(
+                kind=kind,
+                scope_type="candidate",
+                scope_id=candidate_id,
+                input_hash=input_hash,
                 model=model,
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
@@ -1610,7 +1661,11 @@ class AIService:
         model = self._settings.openai_model
         started = time.monotonic()
         try:
-            payload, usage = await self._provider.generate_json(
+            payload, usage = await self._generate_json(
+                kind=kind,
+                scope_type="candidate",
+                scope_id=candidate_id,
+                input_hash=input_hash,
                 model=model,
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
@@ -1736,7 +1791,11 @@ class AIService:
         model = self._settings.openai_model
         started = time.monotonic()
         try:
-            payload, usage = await self._provider.generate_json(
+            payload, usage = await self._generate_json(
+                kind=kind,
+                scope_type="candidate",
+                scope_id=candidate_id,
+                input_hash=input_hash,
                 model=model,
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
@@ -1857,7 +1916,11 @@ class AIService:
         model = self._settings.openai_model
         started = time.monotonic()
         try:
-            payload, usage = await self._provider.generate_json(
+            payload, usage = await self._generate_json(
+                kind=kind,
+                scope_type="candidate",
+                scope_id=candidate_id,
+                input_hash=input_hash,
                 model=model,
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
@@ -2019,7 +2082,11 @@ class AIService:
         model = self._settings.openai_model
         started = time.monotonic()
         try:
-            payload, usage = await self._provider.generate_json(
+            payload, usage = await self._generate_json(
+                kind=kind,
+                scope_type="candidate",
+                scope_id=candidate_id,
+                input_hash=input_hash,
                 model=model,
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
@@ -2135,7 +2202,11 @@ class AIService:
         model = self._settings.openai_model
         started = time.monotonic()
         try:
-            payload, usage = await self._provider.generate_json(
+            payload, usage = await self._generate_json(
+                kind=kind,
+                scope_type="candidate",
+                scope_id=candidate_id,
+                input_hash=input_hash,
                 model=model,
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
@@ -2232,7 +2303,11 @@ class AIService:
         model = self._settings.openai_model
         started = time.monotonic()
         try:
-            payload, usage = await self._provider.generate_json(
+            payload, usage = await self._generate_json(
+                kind=kind,
+                scope_type="dashboard",
+                scope_id=scope_id,
+                input_hash=input_hash,
                 model=model,
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
@@ -2324,7 +2399,11 @@ class AIService:
         model = self._settings.openai_model
         started = time.monotonic()
         try:
-            payload, usage = await self._provider.generate_json(
+            payload, usage = await self._generate_json(
+                kind=kind,
+                scope_type="city",
+                scope_id=city_id,
+                input_hash=input_hash,
                 model=model,
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
@@ -2714,8 +2793,8 @@ class AIService:
         timeout_seconds = int(getattr(self._settings, "ai_interview_script_timeout_seconds", self._settings.ai_timeout_seconds))
         cache_ttl_hours = int(getattr(self._settings, "ai_interview_script_cache_ttl_hours", 24) or 24)
 
-        try:
-            generated = await generate_interview_script(
+        async def _generate_script() -> tuple[dict, Usage]:
+            result = await generate_interview_script(
                 candidate_state=candidate_state,
                 candidate_profile=candidate_profile,
                 hh_resume=hh_resume_norm,
@@ -2728,6 +2807,15 @@ class AIService:
                 max_tokens=max(512, script_tokens),
                 retries=2,
             )
+            return result.payload, result.usage
+
+        try:
+            script, script_usage = await get_ai_single_flight().run(
+                single_flight_key(kind, "candidate", candidate_id, input_hash),
+                _generate_script,
+                kind=kind,
+            )
+            generated = ScriptGenerationResult(payload=script, usage=script_usage)
             script_payload = InterviewScriptPayload.model_validate(
                 build_structured_interview_script(
                     script_payload=generated.payload,
@@ -0,0 +1,227 @@
+"""Single-flight coalescing for identical AI generations.
+
+Concurrent callers that ask for the same ``(kind, scope_type, scope_id,
+input_hash)`` share one provider call instead of each paying for it:
+
+- inside a process, the first caller (the leader) registers a future and the
+  others await it;
+- across workers, the leader also holds a Redis lock (``SET NX PX``) and
+  publishes the result under a short-lived key; callers in other processes
+  poll that key instead of calling the provider.
+
+Waiters receive a copy of the leader's payload with zero usage, so request
+logs and the daily budget estimate count the tokens exactly once. Redis
+problems never fail a generation: the coordinator falls back to in-process
+coalescing only, and a waiter that outlives the lock TTL calls the provider
+itself.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from prometheus_client import Counter
+
+from backend.core.settings import get_settings
+
+from .providers.base import Usage
+
+logger = logging.getLogger(__name__)
+
+AI_SINGLE_FLIGHT_COALESCED = Counter(
+    "ai_single_flight_coalesced_total",
+    "AI generations served from a concurrent identical call instead of the provider.",
+    labelnames=("kind", "source"),
+)
+AI_SINGLE_FLIGHT_SAVED_USD = Counter(
+    "ai_single_flight_saved_usd_total",
+    "Estimated provider spend avoided by single-flight coalescing (USD).",
+    labelnames=("kind",),
+)
+
+# Same approximation as the daily budget estimate in ``service.py``.
+_USD_PER_TOKEN_IN = 0.30 / 1_000_000
+_USD_PER_TOKEN_OUT = 1.20 / 1_000_000
+
+GenerateFn = Callable[[], Awaitable[tuple[dict[str, Any], Usage]]]
+
+
+class _LeaderCancelled(Exception):
+    """Set on the shared future when the leader's own task was cancelled."""
+
+
+def estimate_cost_usd(usage: Usage) -> float:
+    return usage.tokens_in * _USD_PER_TOKEN_IN + usage.tokens_out * _USD_PER_TOKEN_OUT
+
+
+def single_flight_key(kind: str, scope_type: str, scope_id: int, input_hash: str) -> str:
+    return f"{kind}:{scope_type}:{int(scope_id)}:{input_hash}"
+
+
+class SingleFlight:
+    """Coalesce concurrent identical generations in-process and across workers."""
+
+    def __init__(
+        self,
+        redis: Any | None = None,
+        *,
+        lock_ttl_seconds: float = 60.0,
+        result_ttl_seconds: float = 30.0,
+        poll_interval: float = 0.1,
+        prefix: str = "ai:sf",
+    ) -> None:
+        self._redis = redis
+        self._lock_ttl_ms = max(1, int(lock_ttl_seconds * 1000))
+        self._result_ttl_ms = max(1, int(result_ttl_seconds * 1000))
+        self._poll_interval = poll_interval
+        self._prefix = prefix
+        self._inflight: dict[str, asyncio.Future[tuple[dict[str, Any], Usage]]] = {}
+
+    async def run(self, key: str, fn: GenerateFn, *, kind: str = "") -> tuple[dict[str, Any], Usage]:
+        """Return ``fn()``'s result, sharing it with identical concurrent calls."""
+        kind = kind or key.split(":", 1)[0]
+        while True:
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            try:
+                payload, usage = await asyncio.shield(pending)
+            except _LeaderCancelled:
+                # Nobody cancelled this request: take over as leader or join
+                # whichever waiter got there first.
+                continue
+            return self._coalesced(kind, "local", payload, usage)
+
+        future: asyncio.Future[tuple[dict[str, Any], Usage]] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            payload, usage, source = await self._run_leader(key, fn)
+        except asyncio.CancelledError:
+            # The cancellation belongs to the leader's caller only; waiters retry.
+            if not future.done():
+                future.set_exception(_LeaderCancelled())
+                future.exception()
+            raise
+        except BaseException as exc:
+            if not future.done():
+                future.set_exception(exc)
+                # Mark retrieved so a leader without local waiters does not warn.
+                future.exception()
+            raise
+        else:
+            future.set_result((copy.deepcopy(payload), usage))
+        finally:
+            self._inflight.pop(key, None)
+        if source == "remote":
+            return self._coalesced(kind, "remote", payload, usage)
+        return payload, usage
+
+    def _coalesced(
+        self,
+        kind: str,
+        source: str,
+        payload: dict[str, Any],
+        usage: Usage,
+    ) -> tuple[dict[str, Any], Usage]:
+        AI_SINGLE_FLIGHT_COALESCED.labels(kind=kind, source=source).inc()
+        AI_SINGLE_FLIGHT_SAVED_USD.labels(kind=kind).inc(estimate_cost_usd(usage))
+        return copy.deepcopy(payload), Usage()
+
+    async def _run_leader(self, key: str, fn: GenerateFn) -> tuple[dict[str, Any], Usage, str]:
+        if self._redis is None:
+            payload, usage = await fn()
+            return payload, usage, "provider"
+
+        lock_key = f"{self._prefix}:lock:{key}"
+        result_key = f"{self._prefix}:result:{key}"
+        token = uuid.uuid4().hex
+        waited = 0.0
+        while True:
+            try:
+                shared = await self._redis.get(result_key)
+                if shared is not None:
+                    data = json.loads(shared)
+                    usage = Usage(int(data["tokens_in"]), int(data["tokens_out"]))
+                    return data["payload"], usage, "remote"
+                acquired = await self._redis.set(lock_key, token, nx=True, px=self._lock_ttl_ms)
+            except Exception:
+                logger.warning("ai.single_flight.redis_unavailable", exc_info=True)
+                payload, usage = await fn()
+                return payload, usage, "provider"
+            if acquired:
+                break
+            if waited * 1000 >= self._lock_ttl_ms:
+                # The remote leader is stuck; do not wait forever.
+                payload, usage = await fn()
+                return payload, usage, "provider"
+            await asyncio.sleep(self._poll_interval)
+            waited += self._poll_interval
+
+        try:
+            payload, usage = await fn()
+            try:
+                await self._redis.set(
+                    result_key,
+                    json.dumps(
+                        {"payload": payload, "tokens_in": usage.tokens_in, "tokens_out": usage.tokens_out},
+                        ensure_ascii=False,
+                    ),
+                    px=self._result_ttl_ms,
+                )
+            except Exception:
+                logger.warning("ai.single_flight.publish_failed", exc_info=True)
+            return payload, usage, "provider"
+        finally:
+            await self._release(lock_key, token)
+
+    async def _release(self, lock_key: str, token: str) -> None:
+        try:
+            current = await self._redis.get(lock_key)
+            if current is not None and (current.decode() if isinstance(current, bytes) else current) == token:
+                await self._redis.delete(lock_key)
+        except Exception:
+            logger.debug("ai.single_flight.release_failed", exc_info=True)
+
+
+_single_flight: SingleFlight | None = None
+
+
+def get_ai_single_flight() -> SingleFlight:
+    """Process-wide coordinator; uses Redis when ``REDIS_URL`` is configured."""
+    global _single_flight
+    if _single_flight is None:
+        settings = get_settings()
+        redis_url = getattr(settings, "redis_url", "") or ""
+        redis = None
+        if redis_url:
+            try:
+                from backend.core.redis_factory import create_redis_client
+
+                redis = create_redis_client(redis_url, component="ai_single_flight")
+            except Exception:
+                logger.warning("ai.single_flight.redis_client_init_failed", exc_info=True)
+        timeout = float(getattr(settings, "ai_timeout_seconds", 30) or 30)
+        _single_flight = SingleFlight(redis, lock_ttl_seconds=timeout * 2)
+    return _single_flight
+
+
+def reset_ai_single_flight() -> None:
+    global _single_flight
+    _single_flight = None
+
+
+__all__ = [
+    "AI_SINGLE_FLIGHT_COALESCED",
+    "AI_SINGLE_FLIGHT_SAVED_USD",
+    "SingleFlight",
+    "estimate_cost_usd",
+    "get_ai_single_flight",
+    "reset_ai_single_flight",
+    "single_flight_key",
+]
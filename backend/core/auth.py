@@ -6,6 +6,7 @@ from typing import Optional
 import jwt
 from passlib.context import CryptContext
 
+from backend.core.kdf_executor import get_kdf_executor
 from backend.core.passwords import verify_password as verify_legacy_pbkdf2
 from backend.core.settings import get_settings
 
@@ -28,6 +29,19 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(
+    plain_password: str, hashed_password: str, *, identifier: Optional[str] = None
+) -> bool:
+    """``verify_password`` on the bounded KDF pool.
+
+    Raises ``KDFOverloadedError`` when the pool (or ``identifier``'s share of
+    it) is saturated.
+    """
+    return await get_kdf_executor().run(
+        verify_password, plain_password, hashed_password, identifier=identifier
+    )
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create JWT access token.
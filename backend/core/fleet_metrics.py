@@ -0,0 +1,217 @@
+"""Fleet-wide aggregation of process-local metrics.
+
+Each worker registers *sources* (callables returning its current sketches or
+counter totals) and periodically publishes a snapshot to a shared backend
+under its own key with a TTL. The same tick reads the snapshots of the other
+live workers and merges them into a cache. Readers combine that cache with
+the fresh local snapshot, so a scrape on any worker reports fleet-wide
+values at O(keys) cost and never waits on the backend.
+
+Backends follow ``leader_election``: Redis when ``REDIS_URL`` is set,
+otherwise none (single-process deployments read local values only).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from collections.abc import Callable, Mapping
+from threading import Lock
+from typing import Any, Protocol
+
+from backend.core.quantile_sketch import LatencySketch
+
+logger = logging.getLogger(__name__)
+
+SketchSource = Callable[[], Mapping[str, LatencySketch]]
+CounterSource = Callable[[], Mapping[str, float]]
+
+
+class FleetMetricsBackend(Protocol):
+    async def publish(self, worker_id: str, payload: dict[str, Any], *, ttl_seconds: float) -> None: ...
+
+    async def collect(self, *, exclude: str) -> list[dict[str, Any]]: ...
+
+
+class InMemoryFleetMetricsBackend:
+    """Process-local backend; several :class:`FleetMetrics` may share one (tests, benchmarks)."""
+
+    def __init__(self, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._payloads: dict[str, tuple[float, dict[str, Any]]] = {}
+
+    async def publish(self, worker_id: str, payload: dict[str, Any], *, ttl_seconds: float) -> None:
+        self._payloads[worker_id] = (self._clock() + ttl_seconds, json.loads(json.dumps(payload)))
+
+    async def collect(self, *, exclude: str) -> list[dict[str, Any]]:
+        now = self._clock()
+        self._payloads = {key: value for key, value in self._payloads.items() if value[0] > now}
+        return [payload for key, (_, payload) in self._payloads.items() if key != exclude]
+
+
+class RedisFleetMetricsBackend:
+    """One ``SET .. EX`` key per worker plus a sorted set of last-seen timestamps."""
+
+    def __init__(self, redis: Any, *, prefix: str = "fleet_metrics") -> None:
+        self._redis = redis
+        self._workers_key = f"{prefix}:workers"
+        self._payload_prefix = f"{prefix}:worker:"
+
+    async def publish(self, worker_id: str, payload: dict[str, Any], *, ttl_seconds: float) -> None:
+        now = time.time()
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.set(
+            f"{self._payload_prefix}{worker_id}",
+            json.dumps(payload, separators=(",", ":")),
+            ex=max(1, int(ttl_seconds)),
+        )
+        pipe.zadd(self._workers_key, {worker_id: now})
+        pipe.zremrangebyscore(self._workers_key, "-inf", now - ttl_seconds)
+        await pipe.execute()
+
+    async def collect(self, *, exclude: str) -> list[dict[str, Any]]:
+        members = await self._redis.zrange(self._workers_key, 0, -1)
+        worker_ids = [
+            member.decode() if isinstance(member, bytes) else str(member) for member in members
+        ]
+        worker_ids = [worker_id for worker_id in worker_ids if worker_id != exclude]
+        if not worker_ids:
+            return []
+        raw_payloads = await self._redis.mget([f"{self._payload_prefix}{worker_id}" for worker_id in worker_ids])
+        payloads: list[dict[str, Any]] = []
+        for raw in raw_payloads:
+            if raw is None:
+                continue
+            try:
+                payloads.append(json.loads(raw))
+            except (TypeError, ValueError):
+                continue
+        return payloads
+
+
+class FleetMetrics:
+    def __init__(self, *, worker_id: str | None = None) -> None:
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._sketch_sources: dict[str, SketchSource] = {}
+        self._counter_sources: dict[str, CounterSource] = {}
+        self._lock = Lock()
+        self._remote_sketches: dict[str, dict[str, LatencySketch]] = {}
+        self._remote_counters: dict[str, dict[str, float]] = {}
+        self._remote_workers = 0
+
+    def register_sketches(self, family: str, source: SketchSource) -> None:
+        self._sketch_sources[family] = source
+
+    def register_counters(self, family: str, source: CounterSource) -> None:
+        self._counter_sources[family] = source
+
+    @property
+    def worker_count(self) -> int:
+        return 1 + self._remote_workers
+
+    def sketches(self, family: str) -> dict[str, LatencySketch]:
+        """Fresh local sketches of ``family`` merged with the cached remote ones."""
+        source = self._sketch_sources.get(family)
+        merged = {key: sketch.copy() for key, sketch in (source() if source else {}).items()}
+        with self._lock:
+            remote = self._remote_sketches.get(family, {})
+            for key, sketch in remote.items():
+                target = merged.get(key)
+                if target is None:
+                    merged[key] = sketch.copy()
+                else:
+                    target.merge(sketch)
+        return merged
+
+    def counters(self, family: str) -> dict[str, float]:
+        source = self._counter_sources.get(family)
+        merged = dict(source() if source else {})
+        with self._lock:
+            for key, value in self._remote_counters.get(family, {}).items():
+                merged[key] = merged.get(key, 0) + value
+        return merged
+
+    def local_payload(self) -> dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "sketches": {
+                family: {key: sketch.to_dict() for key, sketch in source().items() if sketch.count}
+                for family, source in self._sketch_sources.items()
+            },
+            "counters": {family: dict(source()) for family, source in self._counter_sources.items()},
+        }
+
+    async def sync_once(self, backend: FleetMetricsBackend, *, ttl_seconds: float) -> int:
+        """Publish the local snapshot and refresh the remote cache; returns remote worker count."""
+        await backend.publish(self.worker_id, self.local_payload(), ttl_seconds=ttl_seconds)
+        payloads = await backend.collect(exclude=self.worker_id)
+        sketches: dict[str, dict[str, LatencySketch]] = {}
+        counters: dict[str, dict[str, float]] = {}
+        for payload in payloads:
+            for family, items in (payload.get("sketches") or {}).items():
+                target = sketches.setdefault(family, {})
+                for key, raw in items.items():
+                    sketch = LatencySketch.from_dict(raw)
+                    if key in target:
+                        target[key].merge(sketch)
+                    else:
+                        target[key] = sketch
+            for family, items in (payload.get("counters") or {}).items():
+                target_counters = counters.setdefault(family, {})
+                for key, value in items.items():
+                    target_counters[key] = target_counters.get(key, 0) + value
+        with self._lock:
+            self._remote_sketches = sketches
+            self._remote_counters = counters
+            self._remote_workers = len(payloads)
+        return len(payloads)
+
+    async def run(
+        self,
+        backend: FleetMetricsBackend,
+        *,
+        stop_event: asyncio.Event,
+        interval_seconds: float = 5.0,
+    ) -> None:
+        """Sync every ``interval_seconds`` until ``stop_event`` is set."""
+        interval = max(0.5, float(interval_seconds))
+        while not stop_event.is_set():
+            try:
+                await self.sync_once(backend, ttl_seconds=interval * 3)
+            except Exception:
+                logger.warning("fleet_metrics.sync_failed", exc_info=True)
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+def build_fleet_metrics_backend(settings: Any) -> FleetMetricsBackend | None:
+    redis_url = getattr(settings, "redis_url", "") or ""
+    if not redis_url:
+        return None
+    from backend.core.redis_factory import create_redis_client
+
+    return RedisFleetMetricsBackend(create_redis_client(redis_url, component="fleet_metrics"))
+
+
+_fleet_metrics = FleetMetrics()
+
+
+def get_fleet_metrics() -> FleetMetrics:
+    return _fleet_metrics
+
+
+__all__ = [
+    "FleetMetrics",
+    "FleetMetricsBackend",
+    "InMemoryFleetMetricsBackend",
+    "RedisFleetMetricsBackend",
+    "build_fleet_metrics_backend",
+    "get_fleet_metrics",
+]
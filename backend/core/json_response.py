@@ -0,0 +1,86 @@
+"""Fast JSON encoding for large API payloads (opt-in per endpoint).
+
+``FastJSONResponse`` renders with orjson: datetimes, dates, UUIDs, enums and
+dataclasses are encoded natively in a single pass, so handlers return raw
+payloads instead of running ``jsonable_encoder`` first and stdlib ``json``
+after it. Anything orjson does not know (``Decimal``, sets, pydantic models,
+``bytes``) goes through ``jsonable_encoder`` for that value only.
+
+The output is the same JSON as ``JSONResponse(jsonable_encoder(payload))``
+(compact, UTF-8); only float spelling may differ (``1e-5`` vs ``1e-05``).
+Without orjson, with ``ADMIN_FAST_JSON_ENABLED=0`` or for values orjson
+rejects (integers over 64 bits) the stdlib path is used.
+
+``EncodedJSON`` wraps bytes produced by ``encode_json`` earlier (e.g. cached
+by ``get_or_compute_json``) so the response sends them without re-encoding.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from backend.core.settings import get_settings
+
+try:  # optional: falls back to stdlib json
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+@dataclass(frozen=True)
+class EncodedJSON:
+    """JSON document that is already encoded to UTF-8 bytes."""
+
+    body: bytes
+
+
+def _default(value: Any) -> Any:
+    return jsonable_encoder(value)
+
+
+def encode_json_stdlib(content: Any) -> bytes:
+    """Previous encoding path: ``jsonable_encoder`` + Starlette's ``json.dumps`` settings."""
+
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def fast_json_enabled() -> bool:
+    return orjson is not None and get_settings().admin_fast_json_enabled
+
+
+def encode_json(content: Any) -> bytes:
+    if fast_json_enabled():
+        try:
+            return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:  # orjson.JSONEncodeError, e.g. int over 64 bits
+            pass
+    return encode_json_stdlib(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` encoding raw payloads with orjson (see module docstring)."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, EncodedJSON):
+            return content.body
+        return encode_json(content)
+
+
+__all__ = [
+    "EncodedJSON",
+    "FastJSONResponse",
+    "encode_json",
+    "encode_json_stdlib",
+    "fast_json_enabled",
+]
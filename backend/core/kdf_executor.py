@@ -0,0 +1,161 @@
+"""Bounded thread pool for password hashing and verification.
+
+PBKDF2 and bcrypt are deliberately slow and CPU-bound; running them inline in
+an ``async def`` route stalls every other request on the event loop for the
+duration of the hash. :class:`KDFExecutor` moves that work onto a small
+dedicated thread pool (``hashlib.pbkdf2_hmac`` and the bcrypt C extension
+release the GIL while hashing) and refuses new work instead of queueing it
+without bound:
+
+- at most ``max_workers + max_queue`` KDF jobs may be in flight process-wide;
+- at most ``per_identifier_limit`` of them may belong to one identifier
+  (e.g. ``ip:username`` for a login attempt).
+
+Rejected submissions raise :class:`KDFOverloadedError` immediately, so callers
+can answer with 429/503 and ``Retry-After`` rather than piling up latency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, TypeVar
+
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+KDF_IN_FLIGHT = Gauge(
+    "password_kdf_in_flight",
+    "Password hashing jobs currently queued or running.",
+)
+KDF_REJECTED_TOTAL = Counter(
+    "password_kdf_rejected_total",
+    "Password hashing jobs rejected because the KDF pool was saturated.",
+    labelnames=("reason",),
+)
+
+
+class KDFOverloadedError(RuntimeError):
+    """Raised when the KDF pool cannot accept more work right now."""
+
+    def __init__(self, reason: str, *, retry_after: int = 1) -> None:
+        super().__init__(f"password hashing pool overloaded: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class KDFExecutor:
+    """Thread pool with a global queue-depth limit and per-identifier caps."""
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = 4,
+        max_queue: int = 64,
+        per_identifier_limit: int = 2,
+    ) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        self.per_identifier_limit = max(1, int(per_identifier_limit))
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="kdf")
+        # Counters are touched from the event loop only, but several loops may
+        # share the executor (tests, bot + admin in one process).
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._per_identifier: dict[str, int] = {}
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _acquire(self, identifier: Optional[str]) -> None:
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                KDF_REJECTED_TOTAL.labels(reason="queue_full").inc()
+                raise KDFOverloadedError("queue_full")
+            if identifier is not None and self._per_identifier.get(identifier, 0) >= self.per_identifier_limit:
+                KDF_REJECTED_TOTAL.labels(reason="identifier_busy").inc()
+                raise KDFOverloadedError("identifier_busy")
+            self._in_flight += 1
+            if identifier is not None:
+                self._per_identifier[identifier] = self._per_identifier.get(identifier, 0) + 1
+        KDF_IN_FLIGHT.inc()
+
+    def _release(self, identifier: Optional[str]) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if identifier is not None:
+                remaining = self._per_identifier.get(identifier, 1) - 1
+                if remaining > 0:
+                    self._per_identifier[identifier] = remaining
+                else:
+                    self._per_identifier.pop(identifier, None)
+        KDF_IN_FLIGHT.dec()
+
+    async def run(self, fn: Callable[..., T], *args: object, identifier: Optional[str] = None) -> T:
+        """Run ``fn(*args)`` on the pool or raise :class:`KDFOverloadedError`."""
+
+        self._acquire(identifier)
+        try:
+            loop = asyncio.get_running_loop()
+            # Shield the pool future: a cancelled request must not release its
+            # slot while the thread is still burning CPU on the hash.
+            future = loop.run_in_executor(self._pool, fn, *args)
+        except BaseException:
+            self._release(identifier)
+            raise
+        future.add_done_callback(lambda _f: self._release(identifier))
+        return await asyncio.shield(future)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_executor: Optional[KDFExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_kdf_executor() -> KDFExecutor:
+    """Return the process-wide KDF pool, sized from settings on first use."""
+
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                from backend.core.settings import get_settings
+
+                settings = get_settings()
+                _executor = KDFExecutor(
+                    max_workers=settings.password_hash_workers,
+                    max_queue=settings.password_hash_max_queue,
+                    per_identifier_limit=settings.password_hash_per_identifier_limit,
+                )
+    return _executor
+
+
+def shutdown_kdf_executor() -> None:
+    """Tear down the process-wide pool; the next call to ``get_kdf_executor`` rebuilds it."""
+
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown()
+
+
+__all__ = [
+    "KDFExecutor",
+    "KDFOverloadedError",
+    "get_kdf_executor",
+    "shutdown_kdf_executor",
+]
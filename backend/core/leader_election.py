@@ -0,0 +1,376 @@
+"""Lease-based leader election for singleton background loops.
+
+A job run through :meth:`LeaderElector.run` executes in at most one process at
+a time. The holder renews its lease every ``renew_interval``; when it dies the
+lease expires after ``ttl_seconds`` and another process picks it up on its next
+attempt.
+
+This is a lease-only lock, not a fenced one: the job is cancelled as soon as a
+renewal fails, but a leader that stalls past its TTL (GC pause, blocked loop)
+can still finish a write it already started after a standby took over. The
+guarded jobs are idempotent periodic scans, so a rare overlap only repeats
+work; anything that cannot tolerate that needs its own row-level guard.
+
+Backends:
+- :class:`RedisLeaseBackend` – ``SET NX PX`` lease keyed by holder id;
+- :class:`PostgresAdvisoryLockBackend` – session advisory locks held on one
+  connection per process, outside the application pool (a lock lives exactly
+  as long as that connection);
+- :class:`InMemoryLeaseBackend` – process-local stand-in for tests and
+  single-process deployments.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import socket
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+LEADER_IS_LEADER = Gauge(
+    "leader_election_is_leader",
+    "1 when this process currently holds the lease for the job.",
+    labelnames=("job",),
+)
+LEADER_TRANSITIONS_TOTAL = Counter(
+    "leader_election_transitions_total",
+    "Leadership transitions of this process by job and event.",
+    labelnames=("job", "event"),
+)
+LEADER_BACKEND_ERRORS_TOTAL = Counter(
+    "leader_election_backend_errors_total",
+    "Lease backend failures by job and operation.",
+    labelnames=("job", "operation"),
+)
+
+
+@dataclass(frozen=True)
+class Lease:
+    name: str
+    holder_id: str
+    acquired_at: float
+
+
+class LeaseBackend(Protocol):
+    async def acquire(self, name: str, holder_id: str, ttl_seconds: float) -> Lease | None: ...
+
+    async def renew(self, lease: Lease, ttl_seconds: float) -> bool: ...
+
+    async def release(self, lease: Lease) -> None: ...
+
+
+def default_holder_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class InMemoryLeaseBackend:
+    """Leases shared by electors using the same backend instance."""
+
+    def __init__(self, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._leases: dict[str, tuple[str, float]] = {}
+
+    async def acquire(self, name: str, holder_id: str, ttl_seconds: float) -> Lease | None:
+        now = self._clock()
+        current = self._leases.get(name)
+        if current is not None and current[1] > now and current[0] != holder_id:
+            return None
+        self._leases[name] = (holder_id, now + ttl_seconds)
+        return Lease(name=name, holder_id=holder_id, acquired_at=now)
+
+    async def renew(self, lease: Lease, ttl_seconds: float) -> bool:
+        now = self._clock()
+        current = self._leases.get(lease.name)
+        if current is None or current[0] != lease.holder_id or current[1] <= now:
+            return False
+        self._leases[lease.name] = (lease.holder_id, now + ttl_seconds)
+        return True
+
+    async def release(self, lease: Lease) -> None:
+        current = self._leases.get(lease.name)
+        if current is not None and current[0] == lease.holder_id:
+            del self._leases[lease.name]
+
+
+class RedisLeaseBackend:
+    """Redis leases; compare-and-set steps use WATCH/MULTI instead of Lua."""
+
+    def __init__(self, client: Any, *, prefix: str = "leader") -> None:
+        self._client = client
+        self._prefix = prefix
+
+    def _lease_key(self, name: str) -> str:
+        return f"{self._prefix}:{name}:lease"
+
+    async def acquire(self, name: str, holder_id: str, ttl_seconds: float) -> Lease | None:
+        ttl_ms = max(1, int(ttl_seconds * 1000))
+        if not await self._client.set(self._lease_key(name), holder_id, nx=True, px=ttl_ms):
+            return None
+        return Lease(name=name, holder_id=holder_id, acquired_at=time.monotonic())
+
+    async def _compare_and(self, lease: Lease, apply: Callable[[Any, str], None]) -> bool:
+        from redis.exceptions import WatchError
+
+        key = self._lease_key(lease.name)
+        expected = lease.holder_id
+        async with self._client.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                current = await pipe.get(key)
+                if isinstance(current, bytes):
+                    current = current.decode()
+                if current != expected:
+                    await pipe.unwatch()
+                    return False
+                pipe.multi()
+                apply(pipe, key)
+                await pipe.execute()
+                return True
+            except WatchError:
+                return False
+
+    async def renew(self, lease: Lease, ttl_seconds: float) -> bool:
+        ttl_ms = max(1, int(ttl_seconds * 1000))
+        return await self._compare_and(lease, lambda pipe, key: pipe.pexpire(key, ttl_ms))
+
+    async def release(self, lease: Lease) -> None:
+        await self._compare_and(lease, lambda pipe, key: pipe.delete(key))
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def _advisory_key(name: str) -> int:
+    digest = hashlib.sha256(f"leader:{name}".encode()).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+class PostgresAdvisoryLockBackend:
+    """Session advisory locks on one shared connection per process.
+
+    Every lock this process holds lives on the same connection, so leader jobs
+    cost one connection in total instead of pinning one each. Pass an engine
+    that is not the application pool (see :func:`build_lease_backend`).
+    ``ttl_seconds`` is unused: the server drops the locks as soon as the
+    connection goes away, and then every lease held on it is lost together.
+    """
+
+    def __init__(self, engine: Any) -> None:
+        self._engine = engine
+        self._conn: Any = None
+        self._held: set[str] = set()
+        self._io = asyncio.Lock()
+
+    async def acquire(self, name: str, holder_id: str, ttl_seconds: float) -> Lease | None:
+        from sqlalchemy import text
+
+        async with self._io:
+            if name in self._held:
+                return None
+            try:
+                if self._conn is None:
+                    self._conn = await self._engine.connect()
+                acquired = (
+                    await self._conn.execute(
+                        text("SELECT pg_try_advisory_lock(:key)"),
+                        {"key": _advisory_key(name)},
+                    )
+                ).scalar_one()
+                await self._conn.commit()
+            except Exception:
+                await self._drop_connection()
+                raise
+            if not acquired:
+                return None
+            self._held.add(name)
+        return Lease(name=name, holder_id=holder_id, acquired_at=time.monotonic())
+
+    async def renew(self, lease: Lease, ttl_seconds: float) -> bool:
+        from sqlalchemy import text
+
+        async with self._io:
+            if lease.name not in self._held or self._conn is None:
+                return False
+            try:
+                await self._conn.execute(text("SELECT 1"))
+                await self._conn.commit()
+                return True
+            except Exception:
+                await self._drop_connection()
+                return False
+
+    async def release(self, lease: Lease) -> None:
+        from sqlalchemy import text
+
+        async with self._io:
+            if lease.name not in self._held:
+                return
+            self._held.discard(lease.name)
+            try:
+                await self._conn.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": _advisory_key(lease.name)}
+                )
+                await self._conn.commit()
+            except Exception:
+                await self._drop_connection()
+                raise
+
+    async def _drop_connection(self) -> None:
+        # The server released every lock held on this connection with it.
+        conn, self._conn = self._conn, None
+        self._held.clear()
+        if conn is None:
+            return
+        with suppress(Exception):
+            await conn.invalidate()
+        with suppress(Exception):
+            await conn.close()
+
+
+class LeaderElector:
+    """Run a job only while this process holds the lease for ``name``."""
+
+    def __init__(
+        self,
+        name: str,
+        backend: LeaseBackend,
+        *,
+        ttl_seconds: float = 30.0,
+        renew_interval: float | None = None,
+        retry_interval: float | None = None,
+        holder_id: str | None = None,
+    ) -> None:
+        self.name = name
+        self.holder_id = holder_id or default_holder_id()
+        self._backend = backend
+        self._ttl = float(ttl_seconds)
+        self._renew_interval = renew_interval if renew_interval is not None else self._ttl / 3
+        self._retry_interval = retry_interval if retry_interval is not None else self._ttl / 3
+        self._lease: Lease | None = None
+        LEADER_IS_LEADER.labels(job=name).set(0)
+
+    @property
+    def is_leader(self) -> bool:
+        return self._lease is not None
+
+    async def run(self, job_factory: Callable[[], Awaitable[Any]]) -> None:
+        """Contend for the lease forever, running ``job_factory()`` while leader.
+
+        The job is cancelled as soon as a renewal fails. If the job itself
+        returns or raises, the lease is released and its outcome propagates.
+        """
+        while True:
+            lease = await self._try_acquire()
+            if lease is None:
+                await asyncio.sleep(self._retry_interval)
+                continue
+
+            self._set_leader(lease)
+            job_task = asyncio.ensure_future(job_factory())
+            lost = False
+            try:
+                lost = await self._hold(lease, job_task)
+            finally:
+                if not job_task.done():
+                    job_task.cancel()
+                    with suppress(asyncio.CancelledError, Exception):
+                        await job_task
+                if not lost:
+                    try:
+                        await self._backend.release(lease)
+                    except Exception:
+                        LEADER_BACKEND_ERRORS_TOTAL.labels(job=self.name, operation="release").inc()
+                        logger.warning("leader_election.release_failed", extra={"job": self.name}, exc_info=True)
+                self._clear_leader(event="lost" if lost else "released")
+
+            if not lost:
+                # The job finished on its own: surface its result or exception.
+                job_task.result()
+                return
+
+    async def _try_acquire(self) -> Lease | None:
+        try:
+            return await self._backend.acquire(self.name, self.holder_id, self._ttl)
+        except Exception:
+            LEADER_BACKEND_ERRORS_TOTAL.labels(job=self.name, operation="acquire").inc()
+            logger.warning("leader_election.acquire_failed", extra={"job": self.name}, exc_info=True)
+            return None
+
+    async def _hold(self, lease: Lease, job_task: asyncio.Future) -> bool:
+        """Renew until the job ends (returns False) or the lease is lost (True)."""
+        while True:
+            done, _ = await asyncio.wait({job_task}, timeout=self._renew_interval)
+            if done:
+                return False
+            try:
+                renewed = await self._backend.renew(lease, self._ttl)
+            except Exception:
+                LEADER_BACKEND_ERRORS_TOTAL.labels(job=self.name, operation="renew").inc()
+                logger.warning("leader_election.renew_failed", extra={"job": self.name}, exc_info=True)
+                renewed = False
+            if not renewed:
+                logger.warning("leader_election.lease_lost", extra={"job": self.name})
+                return True
+
+    def _set_leader(self, lease: Lease) -> None:
+        self._lease = lease
+        LEADER_IS_LEADER.labels(job=self.name).set(1)
+        LEADER_TRANSITIONS_TOTAL.labels(job=self.name, event="acquired").inc()
+        logger.info("leader_election.acquired", extra={"job": self.name})
+
+    def _clear_leader(self, *, event: str) -> None:
+        self._lease = None
+        LEADER_IS_LEADER.labels(job=self.name).set(0)
+        LEADER_TRANSITIONS_TOTAL.labels(job=self.name, event=event).inc()
+
+
+def build_lease_backend(settings: Any) -> LeaseBackend:
+    """Pick the lease backend for this deployment.
+
+    ``LEADER_ELECTION_BACKEND=auto`` prefers Redis when ``REDIS_URL`` is set,
+    then Postgres advisory locks, and falls back to process-local leases (which
+    keep the previous run-everywhere behaviour) for SQLite development setups.
+    """
+    choice = getattr(settings, "leader_election_backend", "auto")
+    redis_url = getattr(settings, "redis_url", "") or ""
+    if choice == "redis" or (choice == "auto" and redis_url):
+        from backend.core.redis_factory import create_redis_client
+
+        return RedisLeaseBackend(create_redis_client(redis_url, component="leader_election"))
+    if choice in {"postgres", "auto"}:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from sqlalchemy.pool import NullPool
+
+        from backend.core.db import async_engine
+
+        if async_engine.dialect.name == "postgresql":
+            # Own engine so the lock connection never counts against the app pool.
+            return PostgresAdvisoryLockBackend(create_async_engine(async_engine.url, poolclass=NullPool))
+        if choice == "postgres":
+            raise RuntimeError("LEADER_ELECTION_BACKEND=postgres requires a PostgreSQL DATABASE_URL")
+    return InMemoryLeaseBackend()
+
+
+__all__ = [
+    "InMemoryLeaseBackend",
+    "LEADER_IS_LEADER",
+    "LEADER_TRANSITIONS_TOTAL",
+    "Lease",
+    "LeaseBackend",
+    "LeaderElector",
+    "PostgresAdvisoryLockBackend",
+    "RedisLeaseBackend",
+    "build_lease_backend",
+    "default_holder_id",
+]
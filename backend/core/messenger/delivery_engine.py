@@ -0,0 +1,295 @@
+"""Concurrent dispatcher for ``message_deliveries``.
+
+The engine claims due deliveries with ``SKIP LOCKED``, sends them through
+per-channel adapters and hands every outcome back to
+:mod:`backend.domain.messaging.delivery`, which owns retry scheduling and
+channel fallback. Claimed deliveries run as a pool of at most ``batch_size``
+tasks that is topped up as soon as any of them finishes. Each channel has its
+own token bucket, taken before one of the ``concurrency`` send slots, so a
+throttled provider waits without holding a slot the others could use.
+Deliveries for a channel without an adapter (the candidate portal has none)
+are handed straight back for fallback without waiting on either.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Mapping
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Protocol
+
+from prometheus_client import Counter
+
+from backend.core.messenger.max_recovery import deserialize_inline_buttons
+from backend.core.messenger.protocol import MessengerPlatform, MessengerProtocol, SendResult
+from backend.core.messenger.registry import get_registry
+from backend.core.messenger.reliability import classify_delivery_failure
+from backend.core.settings import Settings
+from backend.domain.messaging.delivery import (
+    CHANNEL_MAX,
+    CHANNEL_TELEGRAM,
+    FAILURE_HARD,
+    FAILURE_SOFT,
+    FAILURE_TEMPORARY,
+    ClaimedDelivery,
+    DeliveryOutcome,
+    RetryPolicy,
+    claim_due_deliveries,
+    complete_delivery,
+)
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_DELIVERIES_TOTAL = Counter(
+    "message_deliveries_total",
+    "Delivery attempts dispatched by the delivery engine, by channel and outcome.",
+    labelnames=("channel", "outcome"),
+)
+
+_FAILURE_CLASS_BY_RELIABILITY = {
+    "permanent": FAILURE_HARD,
+    "misconfiguration": FAILURE_SOFT,
+    "transient": FAILURE_TEMPORARY,
+}
+
+
+class DeliveryChannelAdapter(Protocol):
+    channel: str
+
+    async def send(self, delivery: ClaimedDelivery) -> SendResult: ...
+
+
+class MessengerChannelAdapter:
+    """Expose a registered :class:`MessengerProtocol` adapter as a delivery channel."""
+
+    def __init__(self, channel: str, adapter: MessengerProtocol) -> None:
+        self.channel = channel
+        self._adapter = adapter
+
+    async def send(self, delivery: ClaimedDelivery) -> SendResult:
+        return await self._adapter.send_message(
+            delivery.destination,
+            delivery.text,
+            buttons=deserialize_inline_buttons(delivery.payload.get("buttons")),
+            correlation_id=str(delivery.payload.get("correlation_id") or "").strip() or None,
+        )
+
+
+def registry_channel_adapters() -> dict[str, DeliveryChannelAdapter]:
+    """Channel adapters backed by the messenger registry (Telegram, MAX)."""
+    registry = get_registry()
+    adapters: dict[str, DeliveryChannelAdapter] = {}
+    for channel, platform in ((CHANNEL_TELEGRAM, MessengerPlatform.TELEGRAM), (CHANNEL_MAX, MessengerPlatform.MAX)):
+        adapter = registry.get(platform)
+        if adapter is not None:
+            adapters[channel] = MessengerChannelAdapter(channel, adapter)
+    return adapters
+
+
+class ChannelRateLimiter:
+    """Token bucket for one channel; ``acquire`` waits until a send is allowed."""
+
+    def __init__(self, rate_per_sec: float, *, burst: int | None = None) -> None:
+        self._rate = max(0.1, float(rate_per_sec))
+        self._capacity = float(max(1, burst if burst is not None else int(self._rate)))
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait_time = (1.0 - self._tokens) / self._rate
+            await asyncio.sleep(wait_time)
+
+
+def classify_send_result(channel: str, result: SendResult) -> DeliveryOutcome:
+    if result.success:
+        return DeliveryOutcome(success=True, provider_message_id=result.message_id)
+    failure = classify_delivery_failure(channel=channel, error=result.error)
+    retry_after = None
+    raw = result.raw_response if isinstance(result.raw_response, Mapping) else {}
+    parameters = raw.get("parameters") if isinstance(raw.get("parameters"), Mapping) else {}
+    raw_retry_after = raw.get("retry_after", parameters.get("retry_after"))
+    if isinstance(raw_retry_after, (int, float)):
+        retry_after = float(raw_retry_after)
+    return DeliveryOutcome(
+        success=False,
+        failure_class=_FAILURE_CLASS_BY_RELIABILITY.get(failure.failure_class, FAILURE_TEMPORARY),
+        failure_code=failure.failure_code,
+        retry_after=retry_after,
+    )
+
+
+@dataclass(frozen=True)
+class MessageDeliveryEngineConfig:
+    concurrency: int
+    batch_size: int
+    poll_interval: float
+    lease_seconds: int
+    rate_per_sec: Mapping[str, float]
+    retry_policy: RetryPolicy
+
+
+class MessageDeliveryEngine:
+    def __init__(
+        self,
+        *,
+        settings: Settings,
+        adapters: Mapping[str, DeliveryChannelAdapter] | None = None,
+        config: MessageDeliveryEngineConfig | None = None,
+    ) -> None:
+        self._settings = settings
+        concurrency = max(1, int(getattr(settings, "message_delivery_concurrency", 8)))
+        self._config = config or MessageDeliveryEngineConfig(
+            concurrency=concurrency,
+            batch_size=concurrency * 4,
+            poll_interval=1.0,
+            lease_seconds=120,
+            rate_per_sec={
+                CHANNEL_TELEGRAM: float(getattr(settings, "message_delivery_telegram_rate_per_sec", 25)),
+                CHANNEL_MAX: float(getattr(settings, "message_delivery_max_rate_per_sec", 10)),
+            },
+            retry_policy=RetryPolicy(
+                max_attempts_per_channel=max(1, int(getattr(settings, "message_delivery_max_attempts", 3))),
+            ),
+        )
+        self._adapters = dict(adapters) if adapters is not None else None
+        self._limiters = {
+            channel: ChannelRateLimiter(rate) for channel, rate in self._config.rate_per_sec.items()
+        }
+        self._send_slots = asyncio.Semaphore(self._config.concurrency)
+        self._in_flight: set[asyncio.Task] = set()
+        self._missing_adapters: set[str] = set()
+        self._task: asyncio.Task | None = None
+        self._stopped = asyncio.Event()
+        self._wakeup = asyncio.Event()
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._run_loop(), name="message_delivery_engine")
+
+    async def shutdown(self, *, grace_seconds: float = 10.0) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        if self._task is not None:
+            # Deliveries cut off mid-send are reclaimed once their lease expires.
+            try:
+                await asyncio.wait_for(asyncio.shield(self._task), timeout=grace_seconds)
+            except (TimeoutError, asyncio.CancelledError):
+                self._task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await self._task
+            self._task = None
+
+    def wake(self) -> None:
+        """Skip the poll delay after a message was enqueued by this process."""
+        self._wakeup.set()
+
+    async def run_once(self) -> int:
+        """Claim one round of due deliveries and wait until all in-flight sends finish."""
+        claimed = await self._fill()
+        await self._drain()
+        return claimed
+
+    async def _fill(self) -> int:
+        room = self._config.batch_size - len(self._in_flight)
+        if room <= 0:
+            return 0
+        claimed = await claim_due_deliveries(
+            batch_size=room,
+            lease=timedelta(seconds=self._config.lease_seconds),
+        )
+        if not claimed:
+            return 0
+        adapters = self._adapters if self._adapters is not None else registry_channel_adapters()
+        for item in claimed:
+            task = asyncio.create_task(self._dispatch(item, adapters.get(item.channel)))
+            self._in_flight.add(task)
+            task.add_done_callback(self._on_dispatched)
+        return len(claimed)
+
+    def _on_dispatched(self, task: asyncio.Task) -> None:
+        self._in_flight.discard(task)
+        # A freed pool slot is claimed again right away instead of after the poll delay.
+        self._wakeup.set()
+
+    async def _drain(self) -> None:
+        while self._in_flight:
+            await asyncio.wait(set(self._in_flight))
+
+    async def _run_loop(self) -> None:
+        try:
+            while not self._stopped.is_set():
+                self._wakeup.clear()
+                try:
+                    if await self._fill():
+                        continue
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.exception("message_delivery.loop_failed")
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self._config.poll_interval)
+                except TimeoutError:
+                    continue
+            await self._drain()
+        finally:
+            for task in list(self._in_flight):
+                task.cancel()
+
+    async def _dispatch(self, item: ClaimedDelivery, adapter: DeliveryChannelAdapter | None) -> None:
+        if adapter is None:
+            if item.channel not in self._missing_adapters:
+                self._missing_adapters.add(item.channel)
+                logger.warning("message_delivery.adapter_missing", extra={"channel": item.channel})
+            outcome = DeliveryOutcome(success=False, failure_class=FAILURE_SOFT, failure_code="adapter_missing")
+        else:
+            limiter = self._limiters.get(item.channel)
+            if limiter is not None:
+                await limiter.acquire()
+            try:
+                async with self._send_slots:
+                    result = await adapter.send(item)
+            except Exception as exc:
+                logger.exception(
+                    "message_delivery.send_failed",
+                    extra={"delivery_id": item.id, "channel": item.channel},
+                )
+                result = SendResult(success=False, error=f"{type(exc).__name__}: {exc}")
+            outcome = classify_send_result(item.channel, result)
+        try:
+            resolution = await complete_delivery(item.id, outcome, retry_policy=self._config.retry_policy)
+        except Exception:
+            logger.exception(
+                "message_delivery.complete_failed",
+                extra={"delivery_id": item.id, "channel": item.channel},
+            )
+            return
+        MESSAGE_DELIVERIES_TOTAL.labels(channel=item.channel, outcome=resolution).inc()
+        if resolution in {"retry", "fallback"}:
+            self.wake()
+
+
+__all__ = [
+    "MESSAGE_DELIVERIES_TOTAL",
+    "ChannelRateLimiter",
+    "DeliveryChannelAdapter",
+    "MessageDeliveryEngine",
+    "MessageDeliveryEngineConfig",
+    "MessengerChannelAdapter",
+    "classify_send_result",
+    "registry_channel_adapters",
+]
@@ -4,7 +4,9 @@ import base64
 import hashlib
 import hmac
 import os
-from typing import Tuple
+from typing import Optional, Tuple
+
+from backend.core.kdf_executor import get_kdf_executor
 
 PBKDF2_ITERATIONS = 120_000
 SALT_BYTES = 16
@@ -25,6 +27,11 @@ def hash_password(password: str) -> str:
     )
 
 
+async def hash_password_async(password: str, *, identifier: Optional[str] = None) -> str:
+    """``hash_password`` on the bounded KDF pool instead of the event loop."""
+    return await get_kdf_executor().run(hash_password, password, identifier=identifier)
+
+
 def verify_password(password: str, stored: str) -> bool:
     try:
         if not stored.startswith("pbkdf2$"):
@@ -0,0 +1,218 @@
+"""Mergeable latency sketches (DDSketch) and a sliding window over them.
+
+A :class:`LatencySketch` stores counts in logarithmic buckets, so every
+quantile it reports is within ``relative_accuracy`` of the true value and two
+sketches merge by adding bucket counts. That makes per-worker sketches
+combinable into fleet-wide quantiles, unlike rolling sample buffers.
+
+:class:`SlidingSketchWindow` keeps one sketch per key and time slice;
+recording is O(1) and reading merges the live slices, so cost depends on the
+number of keys and buckets, not on the number of samples.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from bisect import bisect_right
+from collections.abc import Callable, Hashable, Mapping, Sequence
+from itertools import accumulate
+from threading import Lock
+from typing import Any, Generic, TypeVar
+
+_MIN_INDEXABLE_VALUE = 1e-9
+
+K = TypeVar("K", bound=Hashable)
+
+
+class LatencySketch:
+    """DDSketch with a bounded bucket store (lowest buckets collapse first)."""
+
+    __slots__ = ("relative_accuracy", "max_buckets", "_gamma_log", "_buckets", "zero_count", "count", "sum")
+
+    def __init__(self, *, relative_accuracy: float = 0.01, max_buckets: int = 2048) -> None:
+        if not 0.0 < relative_accuracy < 1.0:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max(16, int(max_buckets))
+        gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._gamma_log = math.log(gamma)
+        self._buckets: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+
+    def add(self, value: float, weight: int = 1) -> None:
+        value = float(value)
+        if weight <= 0 or math.isnan(value):
+            return
+        self.count += weight
+        self.sum += value * weight
+        if value <= _MIN_INDEXABLE_VALUE:
+            self.zero_count += weight
+            return
+        index = math.ceil(math.log(value) / self._gamma_log)
+        self._buckets[index] = self._buckets.get(index, 0) + weight
+        if len(self._buckets) > self.max_buckets:
+            self._collapse()
+
+    def merge(self, other: LatencySketch) -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches with different relative accuracy")
+        for index, bucket_count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + bucket_count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        if len(self._buckets) > self.max_buckets:
+            self._collapse()
+
+    def quantile(self, q: float) -> float | None:
+        return self.quantiles((q,))[0]
+
+    def quantiles(self, qs: Sequence[float]) -> list[float | None]:
+        """Several quantiles from one cumulative pass over the sorted buckets."""
+        if self.count <= 0:
+            return [None] * len(qs)
+        indexes = sorted(self._buckets)
+        cumulative = list(accumulate((self._buckets[index] for index in indexes), initial=self.zero_count))
+        scale = 2.0 / (1.0 + math.exp(self._gamma_log))
+        results: list[float | None] = []
+        for q in qs:
+            # Nearest-rank (1-indexed), as the previous sample-buffer quantiles.
+            rank = max(0, math.ceil(max(0.0, min(1.0, q)) * self.count) - 1)
+            position = bisect_right(cumulative, rank)
+            if position == 0:
+                results.append(0.0)
+            else:
+                index = indexes[min(position, len(indexes)) - 1]
+                results.append(scale * math.exp(index * self._gamma_log))
+        return results
+
+    def copy(self) -> LatencySketch:
+        clone = LatencySketch(relative_accuracy=self.relative_accuracy, max_buckets=self.max_buckets)
+        clone._buckets = dict(self._buckets)
+        clone.zero_count = self.zero_count
+        clone.count = self.count
+        clone.sum = self.sum
+        return clone
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "a": self.relative_accuracy,
+            "z": self.zero_count,
+            "c": self.count,
+            "s": self.sum,
+            "b": {str(index): bucket_count for index, bucket_count in self._buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, Any], *, max_buckets: int = 2048) -> LatencySketch:
+        sketch = cls(relative_accuracy=float(payload.get("a", 0.01)), max_buckets=max_buckets)
+        sketch._buckets = {int(index): int(bucket_count) for index, bucket_count in (payload.get("b") or {}).items()}
+        sketch.zero_count = int(payload.get("z", 0))
+        sketch.count = int(payload.get("c", 0))
+        sketch.sum = float(payload.get("s", 0.0))
+        return sketch
+
+    def subtract(self, other: LatencySketch) -> bool:
+        """Remove ``other``'s samples; returns False when buckets no longer line up (after a collapse)."""
+        if any(self._buckets.get(index, 0) < bucket_count for index, bucket_count in other._buckets.items()):
+            return False
+        for index, bucket_count in other._buckets.items():
+            remaining = self._buckets[index] - bucket_count
+            if remaining:
+                self._buckets[index] = remaining
+            else:
+                del self._buckets[index]
+        self.zero_count -= other.zero_count
+        self.count -= other.count
+        self.sum -= other.sum
+        return True
+
+    def _collapse(self) -> None:
+        ordered = sorted(self._buckets)
+        overflow = len(ordered) - self.max_buckets
+        target = ordered[overflow]
+        for index in ordered[:overflow]:
+            self._buckets[target] += self._buckets.pop(index)
+
+
+class SlidingSketchWindow(Generic[K]):
+    """Per-key sketches over the last ``window_seconds``, rotated in ``slices`` steps.
+
+    A running total per key is kept next to the slices; expiring a slice
+    subtracts it, so reads copy one sketch per key instead of merging slices.
+    """
+
+    def __init__(
+        self,
+        *,
+        window_seconds: float = 60.0,
+        slices: int = 6,
+        relative_accuracy: float = 0.01,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._slice_seconds = max(0.001, float(window_seconds) / max(1, slices))
+        self._slices = max(1, int(slices))
+        self._relative_accuracy = relative_accuracy
+        self._clock = clock
+        self._lock = Lock()
+        # slice number -> key -> sketch
+        self._data: dict[int, dict[K, LatencySketch]] = {}
+        self._totals: dict[K, LatencySketch] = {}
+
+    def record(self, key: K, value: float) -> None:
+        slot = int(self._clock() // self._slice_seconds)
+        with self._lock:
+            bucket = self._data.get(slot)
+            if bucket is None:
+                bucket = self._data[slot] = {}
+                self._expire(slot)
+            sketch = bucket.get(key)
+            if sketch is None:
+                sketch = bucket[key] = LatencySketch(relative_accuracy=self._relative_accuracy)
+            sketch.add(value)
+            total = self._totals.get(key)
+            if total is None:
+                total = self._totals[key] = LatencySketch(relative_accuracy=self._relative_accuracy)
+            total.add(value)
+
+    def merged(self) -> dict[K, LatencySketch]:
+        slot = int(self._clock() // self._slice_seconds)
+        with self._lock:
+            self._expire(slot)
+            return {key: total.copy() for key, total in self._totals.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._totals.clear()
+
+    def _expire(self, current_slot: int) -> None:
+        oldest = current_slot - self._slices + 1
+        for slot in [slot for slot in self._data if slot < oldest]:
+            for key, sketch in self._data.pop(slot).items():
+                total = self._totals.get(key)
+                if total is None or not total.subtract(sketch):
+                    self._rebuild_total(key)
+                elif not total.count:
+                    del self._totals[key]
+
+    def _rebuild_total(self, key: K) -> None:
+        rebuilt: LatencySketch | None = None
+        for bucket in self._data.values():
+            sketch = bucket.get(key)
+            if sketch is None:
+                continue
+            if rebuilt is None:
+                rebuilt = sketch.copy()
+            else:
+                rebuilt.merge(sketch)
+        if rebuilt is None:
+            self._totals.pop(key, None)
+        else:
+            self._totals[key] = rebuilt
+
+
+__all__ = ["LatencySketch", "SlidingSketchWindow"]
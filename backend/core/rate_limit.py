@@ -0,0 +1,227 @@
+"""Shared GCRA rate limiter for candidate-facing and login endpoints.
+
+One check covers a hierarchy of scopes (for example IP, session and campaign):
+the request passes only if every scope has budget left, and a refused request
+consumes none of them.
+
+- Each scope keeps a single value, its theoretical arrival time (GCRA), so a
+  key costs the same whatever the limit and expires once it is idle for a
+  period.
+- With Redis (the shared cache client) all scopes of a check are evaluated
+  and updated by one Lua script against the Redis clock, so every worker and
+  process sees the same budget. Keys carry a ``PX`` TTL of at most one period.
+- Without Redis, or when it fails, a process-local LRU store takes over. It is
+  capped at ``RATE_LIMIT_LOCAL_MAX_KEYS`` entries; evicting the least recently
+  seen key only forgets a budget that was about to refill.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from backend.core.cache import get_cache
+from backend.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "rl"
+# Longer scope values (tokens, user agents) are hashed into the key.
+_MAX_VALUE_LENGTH = 64
+_REDIS_FAILURE_LOG_INTERVAL = 60.0
+
+# KEYS: one per scope; ARGV: emission interval and period (ms) per scope.
+# Returns {allowed, index of the refusing scope, retry after in ms}.
+_GCRA_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local tats = {}
+for i = 1, #KEYS do
+  local emission = tonumber(ARGV[2 * i - 1])
+  local period = tonumber(ARGV[2 * i])
+  local tat = tonumber(redis.call('GET', KEYS[i]) or now)
+  if tat < now then
+    tat = now
+  end
+  local new_tat = tat + emission
+  local wait = new_tat - now - period
+  if wait > 0 then
+    return {0, i, math.ceil(wait)}
+  end
+  tats[i] = new_tat
+end
+for i = 1, #KEYS do
+  redis.call('SET', KEYS[i], tats[i], 'PX', math.max(1, tats[i] - now))
+end
+return {1, 0, 0}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """``limit`` requests per ``period_seconds``, refilled evenly (bursts up to ``limit``)."""
+
+    limit: int
+    period_seconds: float
+
+    @property
+    def emission_ms(self) -> int:
+        return max(1, math.ceil(self.period_seconds * 1000 / max(1, self.limit)))
+
+    @property
+    def period_ms(self) -> int:
+        # Burst tolerance: ``limit`` back-to-back requests fit in one period.
+        return self.emission_ms * max(1, self.limit)
+
+    def __str__(self) -> str:
+        return f"{self.limit} per {self.period_seconds:g}s"
+
+
+@dataclass(frozen=True)
+class RateLimitScope:
+    """One level of a hierarchical key, e.g. ``RateLimitScope("ip", "203.0.113.7", rule)``."""
+
+    name: str
+    value: str
+    rule: RateLimit
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    retry_after: float = 0.0
+    scope: str | None = None
+    rule: RateLimit | None = None
+
+    @property
+    def retry_after_seconds(self) -> int:
+        return max(1, math.ceil(self.retry_after))
+
+
+def _scope_key(namespace: str, scope: RateLimitScope) -> str:
+    value = str(scope.value)
+    if len(value) > _MAX_VALUE_LENGTH:
+        value = hashlib.sha256(value.encode("utf-8")).hexdigest()[:32]
+    return f"{REDIS_KEY_PREFIX}:{namespace}:{scope.name}:{value}"
+
+
+class LocalRateLimitStore:
+    """Process-local GCRA state in an LRU dict capped at ``max_keys`` entries."""
+
+    def __init__(self, max_keys: int, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_keys = max(1, int(max_keys))
+        self._clock = clock
+        self._tats: OrderedDict[str, int] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    def acquire(self, keys: Sequence[str], rules: Sequence[RateLimit]) -> tuple[bool, int, int]:
+        now = int(self._clock() * 1000)
+        new_tats: list[int] = []
+        for index, (key, rule) in enumerate(zip(keys, rules)):
+            tat = max(self._tats.get(key, now), now)
+            new_tat = tat + rule.emission_ms
+            wait = new_tat - now - rule.period_ms
+            if wait > 0:
+                return False, index, wait
+            new_tats.append(new_tat)
+        for key, new_tat in zip(keys, new_tats):
+            self._tats[key] = new_tat
+            self._tats.move_to_end(key)
+        while len(self._tats) > self.max_keys:
+            self._tats.popitem(last=False)
+        return True, -1, 0
+
+    def clear(self) -> None:
+        self._tats.clear()
+
+
+class RateLimiter:
+    """GCRA checks over hierarchical scopes, shared through Redis when available."""
+
+    def __init__(self, *, local_max_keys: int) -> None:
+        self.local = LocalRateLimitStore(local_max_keys)
+        self._scripts: dict[int, Any] = {}
+        self._last_redis_warning = 0.0
+
+    def _redis(self) -> Any | None:
+        try:
+            return get_cache().client
+        except RuntimeError:
+            return None
+
+    async def _acquire_redis(self, client: Any, keys: list[str], rules: list[RateLimit]) -> tuple[bool, int, int]:
+        script = self._scripts.get(id(client))
+        if script is None:
+            script = client.register_script(_GCRA_SCRIPT)
+            self._scripts = {id(client): script}
+        args: list[int] = []
+        for rule in rules:
+            args.extend((rule.emission_ms, rule.period_ms))
+        allowed, index, wait = await script(keys=keys, args=args)
+        return bool(int(allowed)), int(index) - 1, int(wait)
+
+    async def check(self, namespace: str, scopes: Sequence[RateLimitScope]) -> RateLimitDecision:
+        active = [scope for scope in scopes if scope.value]
+        if not active:
+            return RateLimitDecision(allowed=True)
+        keys = [_scope_key(namespace, scope) for scope in active]
+        rules = [scope.rule for scope in active]
+
+        client = self._redis()
+        result: tuple[bool, int, int] | None = None
+        if client is not None:
+            try:
+                result = await self._acquire_redis(client, keys, rules)
+            except Exception as exc:
+                now = time.monotonic()
+                if now - self._last_redis_warning >= _REDIS_FAILURE_LOG_INTERVAL:
+                    self._last_redis_warning = now
+                    logger.warning("rate_limit.redis_unavailable", extra={"error": str(exc)})
+        if result is None:
+            result = self.local.acquire(keys, rules)
+
+        allowed, index, wait_ms = result
+        if allowed:
+            return RateLimitDecision(allowed=True)
+        refused = active[index]
+        return RateLimitDecision(
+            allowed=False,
+            retry_after=wait_ms / 1000.0,
+            scope=refused.name,
+            rule=refused.rule,
+        )
+
+
+_limiter: RateLimiter | None = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter(local_max_keys=get_settings().rate_limit_local_max_keys)
+    return _limiter
+
+
+def reset_rate_limiter() -> None:
+    """Forget all process-local state (tests, settings reload)."""
+    global _limiter
+    _limiter = None
+
+
+__all__ = [
+    "LocalRateLimitStore",
+    "RateLimit",
+    "RateLimitDecision",
+    "RateLimitScope",
+    "RateLimiter",
+    "get_rate_limiter",
+    "reset_rate_limiter",
+]
@@ -143,11 +143,48 @@ class Settings:
     max_webhook_secret: str
     max_webhook_url: str
     max_init_data_max_age_seconds: int
+    max_webhook_ingest_mode: str
+    max_webhook_worker_concurrency: int
+    max_webhook_worker_max_attempts: int
+    max_webhook_retention_days: int
     candidate_web_pilot_enabled: bool
     candidate_web_public_intake_enabled: bool
     candidate_web_public_intake_allowed_providers: tuple[str, ...]
     candidate_web_public_intake_token_ttl_seconds: int
     candidate_web_public_handoff_ttl_seconds: int
+    candidate_access_cache_ttl_seconds: int
+    leader_election_backend: str
+    leader_election_ttl_seconds: int
+    analytics_buffer_enabled: bool
+    analytics_buffer_max_events: int
+    analytics_buffer_flush_size: int
+    analytics_buffer_flush_interval_seconds: float
+    analytics_buffer_drop_policy: str
+    admin_principal_cache_ttl_seconds: int
+    admin_last_seen_flush_interval_seconds: int
+    password_hash_workers: int
+    password_hash_max_queue: int
+    password_hash_per_identifier_limit: int
+    log_queue_size: int
+    log_duplicate_window_seconds: float
+    kpi_counter_timezones: tuple[str, ...]
+    kpi_rollover_interval_seconds: int
+    message_delivery_engine_enabled: bool
+    message_delivery_concurrency: int
+    message_delivery_max_attempts: int
+    message_delivery_telegram_rate_per_sec: int
+    message_delivery_max_rate_per_sec: int
+    metrics_fleet_sync_interval_seconds: int
+    admission_control_enabled: bool
+    admission_min_limit: int
+    admission_max_limit: int
+    admission_latency_target_ms: int
+    admission_pool_wait_target_ms: int
+    admission_queue_timeout_ms: int
+    admin_conditional_get_enabled: bool
+    admin_fast_json_enabled: bool
+    slot_lock_sweep_interval_seconds: int
+    rate_limit_local_max_keys: int
 
 def _get_int(name: str, default: int, *, minimum: int | None = None) -> int:
     raw = os.getenv(name)
@@ -1043,6 +1080,24 @@ def get_settings() -> Settings:
         86400,
         minimum=60,
     )
+    max_webhook_ingest_mode = os.getenv("MAX_WEBHOOK_INGEST_MODE", "inline").strip().lower()
+    if max_webhook_ingest_mode not in {"inline", "queue"}:
+        max_webhook_ingest_mode = "inline"
+    max_webhook_worker_concurrency = _get_int(
+        "MAX_WEBHOOK_WORKER_CONCURRENCY",
+        8,
+        minimum=1,
+    )
+    max_webhook_worker_max_attempts = _get_int(
+        "MAX_WEBHOOK_WORKER_MAX_ATTEMPTS",
+        5,
+        minimum=1,
+    )
+    max_webhook_retention_days = _get_int(
+        "MAX_WEBHOOK_RETENTION_DAYS",
+        7,
+        minimum=1,
+    )
     candidate_web_pilot_enabled = _get_bool(
         "CANDIDATE_WEB_PILOT_ENABLED",
         default=False,
@@ -1074,6 +1129,76 @@ def get_settings() -> Settings:
         minimum=60,
     )
 
+    # Validated candidate-access principals are cached briefly; off by default in
+    # tests, like the other process-local caches.
+    candidate_access_cache_ttl_seconds = _get_int(
+        "CANDIDATE_ACCESS_CACHE_TTL_SECONDS",
+        0 if environment == "test" else 30,
+        minimum=0,
+    )
+    leader_election_backend = os.getenv("LEADER_ELECTION_BACKEND", "auto").strip().lower()
+    if leader_election_backend not in {"auto", "redis", "postgres", "memory"}:
+        leader_election_backend = "auto"
+    leader_election_ttl_seconds = _get_int("LEADER_ELECTION_TTL_SECONDS", 30, minimum=3)
+    analytics_buffer_enabled = _get_bool("ANALYTICS_BUFFER_ENABLED", environment != "test")
+    analytics_buffer_max_events = _get_int("ANALYTICS_BUFFER_MAX_EVENTS", 10_000, minimum=1)
+    analytics_buffer_flush_size = _get_int("ANALYTICS_BUFFER_FLUSH_SIZE", 500, minimum=1)
+    analytics_buffer_flush_interval_seconds = _get_float(
+        "ANALYTICS_BUFFER_FLUSH_INTERVAL_SECONDS",
+        1.0,
+        minimum=0.01,
+    )
+    analytics_buffer_drop_policy = os.getenv("ANALYTICS_BUFFER_DROP_POLICY", "drop_newest").strip().lower()
+    if analytics_buffer_drop_policy not in {"drop_newest", "drop_oldest", "block"}:
+        analytics_buffer_drop_policy = "drop_newest"
+    admin_principal_cache_ttl_seconds = _get_int(
+        "ADMIN_PRINCIPAL_CACHE_TTL_SECONDS",
+        0 if environment == "test" else 15,
+        minimum=0,
+    )
+    admin_last_seen_flush_interval_seconds = _get_int(
+        "ADMIN_LAST_SEEN_FLUSH_INTERVAL_SECONDS",
+        30,
+        minimum=1,
+    )
+    password_hash_workers = _get_int(
+        "PASSWORD_HASH_WORKERS",
+        min(4, os.cpu_count() or 1),
+        minimum=1,
+    )
+    password_hash_max_queue = _get_int("PASSWORD_HASH_MAX_QUEUE", 32, minimum=0)
+    password_hash_per_identifier_limit = _get_int("PASSWORD_HASH_PER_IDENTIFIER_LIMIT", 2, minimum=1)
+    log_queue_size = _get_int("LOG_QUEUE_SIZE", 10000, minimum=0)
+    log_duplicate_window_seconds = _get_float("LOG_DUPLICATE_WINDOW_SECONDS", 5.0, minimum=0.0)
+    kpi_counter_timezones = tuple(
+        dict.fromkeys(
+            item.strip()
+            for item in os.getenv("KPI_COUNTER_TIMEZONES", "").split(",")
+            if item.strip()
+        )
+    )
+    kpi_rollover_interval_seconds = _get_int("KPI_ROLLOVER_INTERVAL_SECONDS", 300, minimum=30)
+    message_delivery_engine_enabled = _get_bool("MESSAGE_DELIVERY_ENGINE_ENABLED", False)
+    message_delivery_concurrency = _get_int("MESSAGE_DELIVERY_CONCURRENCY", 8, minimum=1)
+    message_delivery_max_attempts = _get_int("MESSAGE_DELIVERY_MAX_ATTEMPTS", 3, minimum=1)
+    message_delivery_telegram_rate_per_sec = _get_int(
+        "MESSAGE_DELIVERY_TELEGRAM_RATE_PER_SEC",
+        25,
+        minimum=1,
+    )
+    message_delivery_max_rate_per_sec = _get_int("MESSAGE_DELIVERY_MAX_RATE_PER_SEC", 10, minimum=1)
+    metrics_fleet_sync_interval_seconds = _get_int("METRICS_FLEET_SYNC_INTERVAL_SECONDS", 5, minimum=0)
+    admission_control_enabled = _get_bool("ADMISSION_CONTROL_ENABLED", False)
+    admission_min_limit = _get_int("ADMISSION_MIN_LIMIT", 8, minimum=1)
+    admission_max_limit = _get_int("ADMISSION_MAX_LIMIT", 160, minimum=1)
+    admission_latency_target_ms = _get_int("ADMISSION_LATENCY_TARGET_MS", 500, minimum=10)
+    admission_pool_wait_target_ms = _get_int("ADMISSION_POOL_WAIT_TARGET_MS", 50, minimum=1)
+    admission_queue_timeout_ms = _get_int("ADMISSION_QUEUE_TIMEOUT_MS", 300, minimum=0)
+    admin_conditional_get_enabled = _get_bool("ADMIN_CONDITIONAL_GET_ENABLED", True)
+    admin_fast_json_enabled = _get_bool("ADMIN_FAST_JSON_ENABLED", True)
+    slot_lock_sweep_interval_seconds = _get_int("SLOT_LOCK_SWEEP_INTERVAL_SECONDS", 60, minimum=5)
+    rate_limit_local_max_keys = _get_int("RATE_LIMIT_LOCAL_MAX_KEYS", 100_000, minimum=100)
+
     settings = Settings(
         environment=environment,
         data_dir=data_dir,
@@ -1201,6 +1326,10 @@ def get_settings() -> Settings:
         max_webhook_secret=max_webhook_secret,
         max_webhook_url=max_webhook_url,
         max_init_data_max_age_seconds=max_init_data_max_age_seconds,
+        max_webhook_ingest_mode=max_webhook_ingest_mode,
+        max_webhook_worker_concurrency=max_webhook_worker_concurrency,
+        max_webhook_worker_max_attempts=max_webhook_worker_max_attempts,
+        max_webhook_retention_days=max_webhook_retention_days,
         candidate_web_pilot_enabled=candidate_web_pilot_enabled,
         candidate_web_public_intake_enabled=candidate_web_public_intake_enabled,
         candidate_web_public_intake_allowed_providers=allowed_public_providers,
@@ -1208,6 +1337,39 @@ def get_settings() -> Settings:
             candidate_web_public_intake_token_ttl_seconds
         ),
         candidate_web_public_handoff_ttl_seconds=candidate_web_public_handoff_ttl_seconds,
+        candidate_access_cache_ttl_seconds=candidate_access_cache_ttl_seconds,
+        leader_election_backend=leader_election_backend,
+        leader_election_ttl_seconds=leader_election_ttl_seconds,
+        analytics_buffer_enabled=analytics_buffer_enabled,
+        analytics_buffer_max_events=analytics_buffer_max_events,
+        analytics_buffer_flush_size=analytics_buffer_flush_size,
+        analytics_buffer_flush_interval_seconds=analytics_buffer_flush_interval_seconds,
+        analytics_buffer_drop_policy=analytics_buffer_drop_policy,
+        admin_principal_cache_ttl_seconds=admin_principal_cache_ttl_seconds,
+        admin_last_seen_flush_interval_seconds=admin_last_seen_flush_interval_seconds,
+        password_hash_workers=password_hash_workers,
+        password_hash_max_queue=password_hash_max_queue,
+        password_hash_per_identifier_limit=password_hash_per_identifier_limit,
+        log_queue_size=log_queue_size,
+        log_duplicate_window_seconds=log_duplicate_window_seconds,
+        kpi_counter_timezones=kpi_counter_timezones,
+        kpi_rollover_interval_seconds=kpi_rollover_interval_seconds,
+        message_delivery_engine_enabled=message_delivery_engine_enabled,
+        message_delivery_concurrency=message_delivery_concurrency,
+        message_delivery_max_attempts=message_delivery_max_attempts,
+        message_delivery_telegram_rate_per_sec=message_delivery_telegram_rate_per_sec,
+        message_delivery_max_rate_per_sec=message_delivery_max_rate_per_sec,
+        metrics_fleet_sync_interval_seconds=metrics_fleet_sync_interval_seconds,
+        admission_control_enabled=admission_control_enabled,
+        admission_min_limit=admission_min_limit,
+        admission_max_limit=admission_max_limit,
+        admission_latency_target_ms=admission_latency_target_ms,
+        admission_pool_wait_target_ms=admission_pool_wait_target_ms,
+        admission_queue_timeout_ms=admission_queue_timeout_ms,
+        admin_conditional_get_enabled=admin_conditional_get_enabled,
+        admin_fast_json_enabled=admin_fast_json_enabled,
+        slot_lock_sweep_interval_seconds=slot_lock_sweep_interval_seconds,
+        rate_limit_local_max_keys=rate_limit_local_max_keys,
     )
 
     # Validate production configuration (fails fast with clear error messages)
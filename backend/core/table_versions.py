@@ -0,0 +1,170 @@
+"""Per-table change counters used as cache validators.
+
+Every committed ORM write bumps a counter for each table it touched. Readers
+combine the counters of the tables a response depends on into a version
+signature: while the signature is unchanged, nothing those tables hold has
+been committed through the ORM, so a validator (ETag) computed under it is
+still valid.
+
+- tables are collected from flushes (new/dirty/deleted instances) and from
+  ORM bulk ``insert``/``update``/``delete`` statements run through a Session;
+- on commit the counters are bumped in process and with ``HINCRBY`` in Redis,
+  so all admin_ui workers, admin_api and the bot read the same versions;
+- raw SQL (``text()``) and writes from other services are not seen, so readers
+  must still bound staleness with a TTL.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import secrets
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from backend.core.cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY = "perf:table_versions"
+# Random per Redis dataset: counters restarting from zero after a flush never
+# repeat a signature that is still cached in some worker's microcache.
+_EPOCH_FIELD = "__epoch__"
+_SESSION_INFO_KEY = "table_versions_pending"
+
+_local_versions: dict[str, int] = {}
+_local_epoch = secrets.token_hex(4)
+_pending_bumps: set[asyncio.Task] = set()
+
+
+def _redis() -> Any | None:
+    try:
+        return get_cache().client
+    except RuntimeError:
+        return None
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return "0"
+    if isinstance(value, bytes):
+        return value.decode("ascii", "replace")
+    return str(value)
+
+
+def local_version(table: str) -> int:
+    return _local_versions.get(table, 0)
+
+
+async def version_signature(tables: Sequence[str]) -> str:
+    """Signature of the current versions of ``tables`` (shared via Redis when available)."""
+
+    client = _redis()
+    if client is not None:
+        try:
+            values = await client.hmget(REDIS_KEY, [_EPOCH_FIELD, *tables])
+            if values[0] is None:
+                await client.hsetnx(REDIS_KEY, _EPOCH_FIELD, secrets.token_hex(4))
+                values = await client.hmget(REDIS_KEY, [_EPOCH_FIELD, *tables])
+            return "r" + ".".join(_text(value) for value in values)
+        except Exception:
+            logger.debug("table_versions.read_failed", exc_info=True)
+    # Process-local fallback: never equal to a Redis-backed signature.
+    return "l" + ".".join([_local_epoch, *(str(local_version(table)) for table in tables)])
+
+
+async def _publish(tables: Sequence[str]) -> None:
+    client = _redis()
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline(transaction=False)
+        for table in tables:
+            pipe.hincrby(REDIS_KEY, table, 1)
+        await pipe.execute()
+    except Exception:
+        logger.debug("table_versions.publish_failed", extra={"tables": list(tables)}, exc_info=True)
+
+
+def bump_tables(tables: Sequence[str]) -> None:
+    """Bump versions after a commit; the Redis update runs in the background."""
+
+    names = sorted(set(tables))
+    if not names:
+        return
+    for table in names:
+        _local_versions[table] = _local_versions.get(table, 0) + 1
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(_publish(names))
+    _pending_bumps.add(task)
+    task.add_done_callback(_pending_bumps.discard)
+
+
+async def wait_for_pending_bumps(timeout: float = 0.5) -> None:
+    """Wait until bumps of commits made so far reached Redis (bounded by ``timeout``)."""
+
+    if _pending_bumps:
+        await asyncio.wait(set(_pending_bumps), timeout=timeout)
+
+
+def _table_name(obj: Any) -> str | None:
+    return getattr(getattr(type(obj), "__table__", None), "name", None)
+
+
+def _pending(session: Session) -> set[str]:
+    return session.info.setdefault(_SESSION_INFO_KEY, set())
+
+
+def _collect_flush(session: Session, flush_context) -> None:
+    # `after_flush` still sees the pre-flush new/dirty/deleted collections.
+    tables = {
+        name
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if (name := _table_name(obj)) is not None
+    }
+    if tables:
+        _pending(session).update(tables)
+
+
+def _collect_bulk(orm_execute_state: ORMExecuteState) -> None:
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    name = getattr(getattr(orm_execute_state.statement, "table", None), "name", None)
+    if name:
+        _pending(orm_execute_state.session).add(name)
+
+
+def _apply_bumps(session: Session) -> None:
+    tables = session.info.pop(_SESSION_INFO_KEY, None)
+    if tables:
+        bump_tables(tuple(tables))
+
+
+def _discard_bumps(session: Session) -> None:
+    session.info.pop(_SESSION_INFO_KEY, None)
+
+
+def install_table_version_hooks() -> None:
+    """Register ORM hooks that bump table versions on commit (idempotent)."""
+    if event.contains(Session, "after_flush", _collect_flush):
+        return
+    event.listen(Session, "after_flush", _collect_flush)
+    event.listen(Session, "do_orm_execute", _collect_bulk)
+    event.listen(Session, "after_commit", _apply_bumps)
+    event.listen(Session, "after_rollback", _discard_bumps)
+
+
+__all__ = [
+    "REDIS_KEY",
+    "bump_tables",
+    "install_table_version_hooks",
+    "local_version",
+    "version_signature",
+    "wait_for_pending_bumps",
+]
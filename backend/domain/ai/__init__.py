@@ -9,6 +9,7 @@ from .models import (
     CandidateHHResume,
     KnowledgeBaseChunk,
     KnowledgeBaseDocument,
+    KnowledgeBasePosting,
 )
 
 __all__ = [
@@ -16,6 +17,7 @@ __all__ = [
     "AIRequestLog",
     "KnowledgeBaseDocument",
     "KnowledgeBaseChunk",
+    "KnowledgeBasePosting",
     "AIAgentThread",
     "AIAgentMessage",
     "CandidateHHResume",
@@ -114,6 +114,8 @@ class KnowledgeBaseChunk(Base):
     chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
     content_text: Mapped[str] = mapped_column(Text, nullable=False, default="")
     content_hash: Mapped[str] = mapped_column(String(64), nullable=False, default="")
+    # Number of indexed terms (BM25 document length); NULL until postings exist.
+    token_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
@@ -121,6 +123,22 @@ class KnowledgeBaseChunk(Base):
     document: Mapped["KnowledgeBaseDocument"] = relationship(back_populates="chunks")
 
 
+class KnowledgeBasePosting(Base):
+    """Inverted index entry: one stemmed term occurring ``tf`` times in a chunk."""
+
+    __tablename__ = "knowledge_base_postings"
+    __table_args__ = (Index("ix_kb_postings_document", "document_id"),)
+
+    term: Mapped[str] = mapped_column(String(32), primary_key=True)
+    chunk_id: Mapped[int] = mapped_column(
+        ForeignKey("knowledge_base_chunks.id", ondelete="CASCADE"), primary_key=True
+    )
+    document_id: Mapped[int] = mapped_column(
+        ForeignKey("knowledge_base_documents.id", ondelete="CASCADE"), nullable=False
+    )
+    tf: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
 class AIAgentThread(Base):
     __tablename__ = "ai_agent_threads"
     __table_args__ = (
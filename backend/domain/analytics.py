@@ -21,6 +21,7 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.dependencies import get_async_session
+from backend.domain.analytics_buffer import get_analytics_buffer
 
 logger = logging.getLogger(__name__)
 
@@ -59,7 +60,10 @@ async def log_event(
         slot_id: Slot ID (if applicable)
         booking_id: Booking ID (if applicable)
         metadata: Additional event metadata (stored as JSON)
-        session: Optional SQLAlchemy session (if None, creates new one)
+        session: Optional SQLAlchemy session. When given, the row is written
+            synchronously as part of the caller's transaction; otherwise it is
+            handed to the batching buffer if one is running, or inserted with a
+            fresh session.
 
     Example:
         await log_event(
@@ -100,9 +104,14 @@ async def log_event(
         "created_at": datetime.now(timezone.utc),
     }
 
-    # Use provided session or create a new one
+    # Use provided session, the batching buffer, or a fresh session
     if session:
         await session.execute(query, params)
+        return
+
+    buffer = get_analytics_buffer()
+    if buffer is not None and buffer.accepts_from_current_loop():
+        await buffer.submit(params)
     else:
         async for db_session in get_async_session():
             try:
@@ -0,0 +1,211 @@
+"""In-process buffer that batches analytics event inserts.
+
+``log_event`` calls without an explicit session are appended to a bounded
+buffer and written by a background flusher as one multi-row INSERT per batch,
+either when ``flush_size`` rows are waiting or every ``flush_interval``
+seconds. Analytics are best-effort, so a full buffer never blocks a booking
+flow indefinitely: the drop policy decides what gives.
+
+Drop policies:
+- ``drop_newest`` – reject the incoming event (default);
+- ``drop_oldest`` – evict the oldest buffered event to make room;
+- ``block`` – wait up to ``block_timeout`` seconds for space, then drop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import insert
+
+from backend.core.db import async_session
+from backend.domain.analytics_models import analytics_events
+
+logger = logging.getLogger(__name__)
+
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+DROP_POLICIES = (DROP_NEWEST, DROP_OLDEST, BLOCK)
+
+
+@dataclass(frozen=True)
+class AnalyticsBufferConfig:
+    max_events: int = 10_000
+    flush_size: int = 500
+    flush_interval: float = 1.0
+    drop_policy: str = DROP_NEWEST
+    block_timeout: float = 0.05
+
+
+@dataclass
+class AnalyticsBufferStats:
+    enqueued: int = 0
+    flushed: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+    dropped: dict[str, int] = field(default_factory=dict)
+
+    def count_drop(self, reason: str, amount: int = 1) -> None:
+        self.dropped[reason] = self.dropped.get(reason, 0) + amount
+
+
+class AnalyticsEventBuffer:
+    def __init__(self, config: AnalyticsBufferConfig | None = None) -> None:
+        self.config = config or AnalyticsBufferConfig()
+        if self.config.drop_policy not in DROP_POLICIES:
+            raise ValueError(f"unknown analytics drop policy: {self.config.drop_policy}")
+        self.stats = AnalyticsBufferStats()
+        self._rows: deque[dict[str, Any]] = deque()
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._stopping = False
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done() and not self._stopping
+
+    def accepts_from_current_loop(self) -> bool:
+        if not self.running:
+            return False
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._stopping = False
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.create_task(self._run(), name="analytics_event_flusher")
+
+    async def stop(self) -> None:
+        """Stop accepting events and flush everything still buffered."""
+        self._stopping = True
+        self._wakeup.set()
+        self._space.set()
+        if self._task is not None:
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        while self._rows:
+            if not await self.flush():
+                break
+        if self._rows:
+            self.stats.count_drop("shutdown", len(self._rows))
+            self._rows.clear()
+
+    async def submit(self, row: dict[str, Any]) -> bool:
+        """Buffer one row; return False when it was dropped."""
+        if self._stopping:
+            self.stats.count_drop("stopped")
+            return False
+        if len(self._rows) >= self.config.max_events:
+            policy = self.config.drop_policy
+            if policy == DROP_OLDEST:
+                self._rows.popleft()
+                self.stats.count_drop(DROP_OLDEST)
+            elif policy == BLOCK:
+                self._wakeup.set()
+                self._space.clear()
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(self._space.wait(), timeout=self.config.block_timeout)
+                if len(self._rows) >= self.config.max_events or self._stopping:
+                    self.stats.count_drop("block_timeout")
+                    return False
+            else:
+                self.stats.count_drop(DROP_NEWEST)
+                return False
+        self._rows.append(row)
+        self.stats.enqueued += 1
+        if len(self._rows) >= self.config.flush_size:
+            self._wakeup.set()
+        return True
+
+    async def flush(self) -> bool:
+        """Write up to ``flush_size`` rows in one statement; False on DB failure."""
+        if not self._rows:
+            return True
+        batch = [self._rows.popleft() for _ in range(min(self.config.flush_size, len(self._rows)))]
+        self._space.set()
+        try:
+            async with async_session() as session:
+                await session.execute(insert(analytics_events), batch)
+                await session.commit()
+        except Exception:
+            self.stats.failed_flushes += 1
+            self.stats.count_drop("flush_failed", len(batch))
+            logger.exception("analytics.buffer.flush_failed", extra={"events": len(batch)})
+            return False
+        self.stats.flushes += 1
+        self.stats.flushed += len(batch)
+        return True
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.config.flush_interval)
+            self._wakeup.clear()
+            while self._rows and not self._stopping:
+                await self.flush()
+                if len(self._rows) < self.config.flush_size:
+                    break
+
+
+_buffer: AnalyticsEventBuffer | None = None
+
+
+def get_analytics_buffer() -> AnalyticsEventBuffer | None:
+    return _buffer
+
+
+def start_analytics_buffer(config: AnalyticsBufferConfig | None = None) -> AnalyticsEventBuffer:
+    """Start the process-wide buffer on the running loop (idempotent)."""
+    global _buffer
+    if _buffer is None or not _buffer.running:
+        _buffer = AnalyticsEventBuffer(config)
+        _buffer.start()
+    return _buffer
+
+
+async def stop_analytics_buffer() -> None:
+    global _buffer
+    buffer, _buffer = _buffer, None
+    if buffer is not None:
+        await buffer.stop()
+
+
+def analytics_buffer_config_from_settings(settings: Any) -> AnalyticsBufferConfig:
+    return AnalyticsBufferConfig(
+        max_events=settings.analytics_buffer_max_events,
+        flush_size=settings.analytics_buffer_flush_size,
+        flush_interval=settings.analytics_buffer_flush_interval_seconds,
+        drop_policy=settings.analytics_buffer_drop_policy,
+    )
+
+
+__all__ = [
+    "AnalyticsBufferConfig",
+    "AnalyticsBufferStats",
+    "AnalyticsEventBuffer",
+    "BLOCK",
+    "DROP_NEWEST",
+    "DROP_OLDEST",
+    "DROP_POLICIES",
+    "analytics_buffer_config_from_settings",
+    "get_analytics_buffer",
+    "start_analytics_buffer",
+    "stop_analytics_buffer",
+]
@@ -6,11 +6,27 @@ It does not depend on transport layers (HTTP/Telegram/UI).
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional, Union
+from typing import Any, Callable, Optional, Sequence, Union
 
-from backend.domain.candidates.models import User
-from backend.domain.candidates.journey import append_journey_event, stage_for_status, sync_candidate_lifecycle
+from sqlalchemy import ColumnElement, case, func, insert, or_, select, update
+
+from backend.domain.candidates.models import CandidateJourneyEvent, User
+from backend.domain.candidates.journey import (
+    ARCHIVE_STAGE_BY_STATUS,
+    FINAL_OUTCOME_ATTACHED,
+    FINAL_OUTCOME_NOT_ATTACHED,
+    FINAL_OUTCOME_NOT_COUNTED,
+    LIFECYCLE_ACTIVE,
+    LIFECYCLE_ARCHIVED,
+    NEGATIVE_ARCHIVE_STATUSES,
+    append_journey_event,
+    final_outcome_for_status,
+    is_not_counted_reason,
+    stage_for_status,
+    sync_candidate_lifecycle,
+)
 from backend.domain.candidates.status import CandidateStatus, can_transition
 from backend.domain.candidates.workflow import WorkflowStatus
 from backend.domain.candidates.workflow import workflow_status_for_candidate_status
@@ -22,6 +38,57 @@ class CandidateStatusTransitionError(Exception):
 
 StatusLike = Union[CandidateStatus, str, None]
 
+_KEPT_FINAL_OUTCOMES = (FINAL_OUTCOME_ATTACHED, FINAL_OUTCOME_NOT_ATTACHED, FINAL_OUTCOME_NOT_COUNTED)
+
+
+@dataclass(frozen=True)
+class BulkTransitionResult:
+    """Outcome of :meth:`CandidateStatusService.bulk_force`."""
+
+    updated: int
+    batches: int
+
+
+def _bulk_lifecycle_values(target: Optional[CandidateStatus], reason: str, now: datetime) -> dict[str, Any]:
+    """Column values equivalent to ``sync_candidate_lifecycle`` for a forced transition.
+
+    A forced transition always carries a non-empty reason, so the resolved
+    archive/outcome reason is that reason and only ``final_outcome`` and
+    ``archived_at`` still depend on the row being updated.
+    """
+    if target in NEGATIVE_ARCHIVE_STATUSES:
+        values: dict[str, Any] = {
+            "lifecycle_state": LIFECYCLE_ARCHIVED,
+            "archive_stage": ARCHIVE_STAGE_BY_STATUS.get(target, stage_for_status(target)),
+            "archive_reason": reason,
+            "archived_at": func.coalesce(User.archived_at, now),
+        }
+    else:
+        values = {
+            "lifecycle_state": LIFECYCLE_ACTIVE,
+            "archive_stage": None,
+            "archive_reason": None,
+            "archived_at": None,
+        }
+
+    kept = User.final_outcome.in_(_KEPT_FINAL_OUTCOMES)
+    if target in {CandidateStatus.HIRED, CandidateStatus.NOT_HIRED}:
+        values["final_outcome"] = final_outcome_for_status(target, reason=reason)
+        values["final_outcome_reason"] = reason
+    elif target in {CandidateStatus.INTRO_DAY_DECLINED_INVITATION, CandidateStatus.INTRO_DAY_DECLINED_DAY_OF}:
+        if is_not_counted_reason(reason):
+            values["final_outcome"] = FINAL_OUTCOME_NOT_COUNTED
+            values["final_outcome_reason"] = reason
+        else:
+            # ``existing or not_attached``; an unknown existing outcome is left untouched.
+            missing = or_(User.final_outcome.is_(None), User.final_outcome == "")
+            values["final_outcome"] = case((missing, FINAL_OUTCOME_NOT_ATTACHED), else_=User.final_outcome)
+            values["final_outcome_reason"] = case((or_(kept, missing), reason), else_=User.final_outcome_reason)
+    else:
+        values["final_outcome"] = case((kept, User.final_outcome), else_=None)
+        values["final_outcome_reason"] = case((kept, reason), else_=None)
+    return values
+
 
 class CandidateStatusService:
     """Validate and apply candidate status transitions."""
@@ -148,5 +215,113 @@ class CandidateStatusService:
             actor_id=actor_id,
         )
 
+    async def bulk_force(
+        self,
+        where: Sequence[ColumnElement[bool]],
+        new_status: StatusLike,
+        *,
+        reason: str,
+        actor_type: Optional[str] = None,
+        actor_id: Optional[int] = None,
+        batch_size: int = 500,
+        session_factory: Optional[Callable[[], Any]] = None,
+    ) -> BulkTransitionResult:
+        """Force ``new_status`` on every candidate matching ``where``.
+
+        Equivalent to calling :meth:`force` for each matching candidate (same
+        column values and one ``status_changed`` journey event per candidate),
+        but applied with set-based UPDATE/INSERT statements in chunks of
+        ``batch_size`` rows, each chunk in its own transaction. Rows locked by
+        another transaction are skipped and picked up on the next run.
+        """
+        if not reason:
+            raise CandidateStatusTransitionError("Force transition requires reason")
+        if session_factory is None:
+            from backend.core.db import async_session
+
+            session_factory = async_session
+
+        target = self._normalize(new_status)
+        workflow_status = workflow_status_for_candidate_status(target)
+        if workflow_status is None and target is not None:
+            workflow_status = WorkflowStatus.WAITING_FOR_SLOT
+        differs = (
+            User.candidate_status.is_not(None)
+            if target is None
+            else or_(User.candidate_status.is_(None), User.candidate_status != target)
+        )
+        event_actor_type = (str(actor_type or "system").strip() or None)
+        event_summary = str(reason).strip() or None
+        target_slug = target.value if target else None
+
+        updated = 0
+        batches = 0
+        last_id = 0
+        while True:
+            async with session_factory() as session:
+                rows = (
+                    await session.execute(
+                        select(User.id, User.candidate_status)
+                        .where(*where, differs, User.id > last_id)
+                        .order_by(User.id.asc())
+                        .limit(max(1, int(batch_size)))
+                        .with_for_update(skip_locked=True)
+                    )
+                ).all()
+                if not rows:
+                    break
+                last_id = int(rows[-1].id)
+                now = self._now()
+                values = {
+                    "candidate_status": target,
+                    "status_changed_at": now,
+                    "workflow_status": workflow_status.value if workflow_status is not None else None,
+                    **_bulk_lifecycle_values(target, reason, now),
+                }
+                by_current: dict[Optional[CandidateStatus], list[int]] = {}
+                for row in rows:
+                    by_current.setdefault(row.candidate_status, []).append(int(row.id))
+
+                events: list[dict[str, Any]] = []
+                for current, ids in by_current.items():
+                    status_guard = (
+                        User.candidate_status.is_(None) if current is None else User.candidate_status == current
+                    )
+                    changed = (
+                        await session.execute(
+                            update(User)
+                            .where(User.id.in_(ids), status_guard)
+                            .values(**values)
+                            .returning(User.id)
+                            .execution_options(synchronize_session=False)
+                        )
+                    ).scalars().all()
+                    from_slug = current.value if current else None
+                    events.extend(
+                        {
+                            "candidate_id": int(candidate_id),
+                            "event_key": "status_changed",
+                            "stage": stage_for_status(target),
+                            "status_slug": target_slug,
+                            "actor_type": event_actor_type,
+                            "actor_id": actor_id,
+                            "summary": event_summary,
+                            "payload_json": {
+                                "from_status": from_slug,
+                                "to_status": target_slug,
+                                "force": True,
+                                "reason": reason,
+                            },
+                            "created_at": now,
+                        }
+                        for candidate_id in changed
+                    )
+                if events:
+                    await session.execute(insert(CandidateJourneyEvent), events)
+                await session.commit()
+                updated += len(events)
+                batches += 1
+        return BulkTransitionResult(updated=updated, batches=batches)
+
 
-__all__ = ["CandidateStatusService", "CandidateStatusTransitionError"]
+__all__ = ["BulkTransitionResult", "CandidateStatusService", "CandidateStatusTransitionError"]
@@ -3,6 +3,7 @@
 from typing import Any
 
 from . import models  # noqa: F401  # ensure models are registered
+from . import chat_threads  # noqa: F401  # keep candidate_chat_threads in sync with chat writes
 
 _SERVICE_EXPORTS = {
     "create_or_update_user",
@@ -0,0 +1,235 @@
+"""Denormalized candidate chat thread summaries.
+
+``candidate_chat_threads`` keeps one row per candidate with a snapshot of the
+latest chat message, the latest inbound timestamp and a running count of
+inbound messages. Unread counters are derived per principal as
+``inbound_count - candidate_chat_reads.inbound_seen``.
+
+Rows are maintained by mapper events on :class:`ChatMessage`: inserts are
+folded in with a single upsert, edits of the latest message patch the
+snapshot and anything that can move a message between threads (deletes,
+``candidate_id``/``created_at``/``direction`` changes) recomputes the
+affected threads from ``chat_messages``. Bulk ``update()``/``delete()``
+statements bypass the mapper and must call :func:`refresh_thread_summaries`.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import and_, case, delete, event, func, inspect, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+
+from backend.domain.candidates.models import CandidateChatThread, ChatMessage, ChatMessageDirection
+
+SYSTEM_PAYLOAD_KINDS = {
+    "system",
+    "workflow",
+    "status_change",
+    "slot_update",
+    "intro_day",
+    "service",
+}
+
+_SNAPSHOT_COLUMNS = (
+    "last_message_id",
+    "last_message_text",
+    "last_message_at",
+    "last_direction",
+    "last_author_label",
+    "last_status",
+    "last_error",
+    "last_payload_json",
+    "last_message_kind",
+)
+# Changing any of these may move a message to another thread or change which
+# message is the latest, so the thread is recomputed instead of patched.
+_RECOMPUTE_ATTRS = {"candidate_id", "created_at", "direction"}
+_SNAPSHOT_ATTRS = {"text", "status", "error", "author_label", "payload_json"}
+
+
+def derive_chat_message_kind(
+    direction: str | None,
+    *,
+    author_label: str | None = None,
+    payload_json: dict[str, Any] | None = None,
+) -> str:
+    normalized_direction = str(direction or "").strip().lower()
+    if normalized_direction == ChatMessageDirection.INBOUND.value:
+        return "candidate"
+
+    payload = payload_json if isinstance(payload_json, dict) else {}
+    payload_kind = str(
+        payload.get("kind")
+        or payload.get("event")
+        or payload.get("message_kind")
+        or ""
+    ).strip().lower()
+    normalized_author = str(author_label or "").strip().lower()
+
+    if payload_kind in SYSTEM_PAYLOAD_KINDS:
+        return "system"
+    if normalized_author in {"system", "система", "automation"}:
+        return "system"
+    if "bot" in normalized_author or normalized_author in {"candidate_max", "max"}:
+        return "bot"
+    return "recruiter"
+
+
+def _snapshot(message: Any) -> dict[str, Any]:
+    payload_json = message.payload_json if isinstance(message.payload_json, dict) else None
+    return {
+        "last_message_id": message.id,
+        "last_message_text": message.text,
+        "last_message_at": message.created_at,
+        "last_direction": message.direction,
+        "last_author_label": message.author_label,
+        "last_status": message.status,
+        "last_error": message.error,
+        "last_payload_json": payload_json,
+        "last_message_kind": derive_chat_message_kind(
+            message.direction,
+            author_label=message.author_label,
+            payload_json=payload_json,
+        ),
+    }
+
+
+def _is_inbound(direction: Optional[str]) -> bool:
+    return str(direction or "").strip().lower() == ChatMessageDirection.INBOUND.value
+
+
+def _dialect_insert(conn: Connection):
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        return pg_insert
+    if dialect == "sqlite":
+        return sqlite_insert
+    return None
+
+
+def record_new_message(conn: Connection, message: ChatMessage) -> None:
+    """Fold a freshly inserted message into its thread with one upsert."""
+    dialect_insert = _dialect_insert(conn)
+    if dialect_insert is None:
+        refresh_thread_summaries(conn, [message.candidate_id])
+        return
+
+    inbound = _is_inbound(message.direction)
+    values = {
+        "candidate_id": message.candidate_id,
+        **_snapshot(message),
+        "last_inbound_at": message.created_at if inbound else None,
+        "inbound_count": 1 if inbound else 0,
+        "updated_at": datetime.now(timezone.utc),
+    }
+    table = CandidateChatThread.__table__
+    stmt = dialect_insert(table).values(**values)
+    excluded = stmt.excluded
+    is_newer = or_(
+        table.c.last_message_at.is_(None),
+        excluded.last_message_at > table.c.last_message_at,
+        and_(
+            excluded.last_message_at == table.c.last_message_at,
+            excluded.last_message_id > table.c.last_message_id,
+        ),
+    )
+    set_ = {name: case((is_newer, excluded[name]), else_=table.c[name]) for name in _SNAPSHOT_COLUMNS}
+    set_["last_inbound_at"] = case(
+        (
+            or_(table.c.last_inbound_at.is_(None), excluded.last_inbound_at > table.c.last_inbound_at),
+            excluded.last_inbound_at,
+        ),
+        else_=table.c.last_inbound_at,
+    )
+    set_["inbound_count"] = table.c.inbound_count + excluded.inbound_count
+    set_["updated_at"] = excluded.updated_at
+    conn.execute(stmt.on_conflict_do_update(index_elements=[table.c.candidate_id], set_=set_))
+
+
+def refresh_thread_summaries(conn: Connection, candidate_ids: Iterable[int]) -> None:
+    """Recompute thread rows for ``candidate_ids`` from ``chat_messages``.
+
+    Each candidate costs one ``LIMIT 1`` lookup on the
+    ``(candidate_id, created_at)`` index plus one inbound aggregate.
+    """
+    table = CandidateChatThread.__table__
+    dialect_insert = _dialect_insert(conn)
+    for candidate_id in sorted({int(item) for item in candidate_ids if item is not None}):
+        latest = conn.execute(
+            select(
+                ChatMessage.id,
+                ChatMessage.text,
+                ChatMessage.created_at,
+                ChatMessage.direction,
+                ChatMessage.author_label,
+                ChatMessage.status,
+                ChatMessage.error,
+                ChatMessage.payload_json,
+            )
+            .where(ChatMessage.candidate_id == candidate_id)
+            .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+            .limit(1)
+        ).first()
+        if latest is None:
+            conn.execute(delete(table).where(table.c.candidate_id == candidate_id))
+            continue
+        inbound_count, last_inbound_at = conn.execute(
+            select(func.count(ChatMessage.id), func.max(ChatMessage.created_at)).where(
+                ChatMessage.candidate_id == candidate_id,
+                ChatMessage.direction == ChatMessageDirection.INBOUND.value,
+            )
+        ).one()
+        values = {
+            **_snapshot(latest),
+            "last_inbound_at": last_inbound_at,
+            "inbound_count": int(inbound_count or 0),
+            "updated_at": datetime.now(timezone.utc),
+        }
+        if dialect_insert is None:
+            conn.execute(delete(table).where(table.c.candidate_id == candidate_id))
+            conn.execute(insert(table).values(candidate_id=candidate_id, **values))
+            continue
+        stmt = dialect_insert(table).values(candidate_id=candidate_id, **values)
+        conn.execute(stmt.on_conflict_do_update(index_elements=[table.c.candidate_id], set_=values))
+
+
+@event.listens_for(ChatMessage, "after_insert")
+def _chat_message_inserted(mapper, connection, target: ChatMessage) -> None:
+    record_new_message(connection, target)
+
+
+@event.listens_for(ChatMessage, "after_update")
+def _chat_message_updated(mapper, connection, target: ChatMessage) -> None:
+    state = inspect(target)
+    changed = {attr.key for attr in state.attrs if attr.history.has_changes()}
+    if changed & _RECOMPUTE_ATTRS:
+        previous = state.attrs.candidate_id.history.deleted or ()
+        refresh_thread_summaries(connection, [target.candidate_id, *previous])
+    elif changed & _SNAPSHOT_ATTRS:
+        table = CandidateChatThread.__table__
+        snapshot = _snapshot(target)
+        connection.execute(
+            update(table)
+            .where(table.c.candidate_id == target.candidate_id, table.c.last_message_id == target.id)
+            .values(
+                **{name: value for name, value in snapshot.items() if name != "last_message_id"},
+                updated_at=datetime.now(timezone.utc),
+            )
+        )
+
+
+@event.listens_for(ChatMessage, "after_delete")
+def _chat_message_deleted(mapper, connection, target: ChatMessage) -> None:
+    refresh_thread_summaries(connection, [target.candidate_id])
+
+
+__all__ = [
+    "SYSTEM_PAYLOAD_KINDS",
+    "derive_chat_message_kind",
+    "record_new_message",
+    "refresh_thread_summaries",
+]
@@ -423,6 +423,8 @@ class CandidateChatRead(Base):
         DateTime(timezone=True),
         nullable=True,
     )
+    # Value of ``candidate_chat_threads.inbound_count`` when the principal last read the thread.
+    inbound_seen: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -444,6 +446,39 @@ class CandidateChatRead(Base):
         )
 
 
+class CandidateChatThread(Base):
+    """Per-candidate chat summary kept in sync with ``chat_messages`` writes."""
+
+    __tablename__ = "candidate_chat_threads"
+    __table_args__ = (
+        Index("ix_candidate_chat_threads_last_message_at", "last_message_at"),
+    )
+
+    candidate_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    last_message_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_message_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    last_message_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_direction: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
+    last_author_label: Mapped[Optional[str]] = mapped_column(String(160), nullable=True)
+    last_status: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    last_payload_json: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    last_message_kind: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
+    last_inbound_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    inbound_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover - repr helper
+        return f"<CandidateChatThread candidate={self.candidate_id} last={self.last_message_id}>"
+
+
 class CandidateChatWorkspace(Base):
     __tablename__ = "candidate_chat_workspaces"
     __table_args__ = (
@@ -15,6 +15,7 @@ from sqlalchemy import func, or_, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from .chat_threads import refresh_thread_summaries
 from .models import (
     AutoMessage,
     CandidateAccessToken,
@@ -1138,6 +1139,10 @@ async def bind_telegram_to_candidate(
                     .where(ChatMessage.candidate_id == existing.id)
                     .values(candidate_id=candidate.id)
                 )
+                merged_ids = [existing.id, candidate.id]
+                await session.run_sync(
+                    lambda sync_session: refresh_thread_summaries(sync_session.connection(), merged_ids)
+                )
                 await session.execute(
                     update(InterviewNote)
                     .where(InterviewNote.user_id == existing.id)
@@ -0,0 +1,53 @@
+"""DB-side revision counters for admin-editable content.
+
+Writers bump the counter of the content they change in the same transaction
+(``bump_content_version``), so every process that caches that content can
+tell whether its copy is current with a single primary-key read
+(``get_content_version``) instead of reloading and hashing it.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.db import async_session
+from backend.domain.models import ContentVersion
+
+# Test 1 / Test 2 questions with their answer options.
+QUESTIONS_BANK = "questions_bank"
+
+
+async def bump_content_version(session: AsyncSession, key: str) -> None:
+    """Increment the revision of ``key`` inside the caller's transaction."""
+
+    table = ContentVersion.__table__
+    conn = await session.connection()
+    factory = {"postgresql": pg_insert, "sqlite": sqlite_insert}.get(conn.dialect.name)
+    if factory is None:
+        result = await session.execute(
+            update(table).where(table.c.key == key).values(version=table.c.version + 1)
+        )
+        if not result.rowcount:
+            await session.execute(insert(table).values(key=key, version=1))
+        return
+    stmt = factory(table).values(key=key, version=1)
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={"version": table.c.version + 1},
+        )
+    )
+
+
+async def get_content_version(key: str) -> int:
+    """Current revision of ``key`` (``0`` until the first bump)."""
+
+    async with async_session() as session:
+        value = await session.scalar(select(ContentVersion.version).where(ContentVersion.key == key))
+    return int(value or 0)
+
+
+__all__ = ["QUESTIONS_BANK", "bump_content_version", "get_content_version"]
@@ -36,6 +36,10 @@ def max_webhook_outbound_key(kind: str, source_id: object) -> str:
     return max_idempotency_key(kind, source_id)
 
 
+def max_webhook_update_key_for(update_type: object, *parts: object) -> str:
+    return max_idempotency_key(f"update-{_normalize_part(update_type) or 'unknown'}", *parts)
+
+
 def max_bot_started_key(
     *,
     max_user_id: object,
@@ -115,4 +119,5 @@ __all__ = [
     "max_rollout_invite_send_key",
     "max_webhook_inbound_message_key",
     "max_webhook_outbound_key",
+    "max_webhook_update_key_for",
 ]
@@ -0,0 +1,494 @@
+"""Incrementally maintained weekly KPI counters.
+
+The weekly dashboard counts distinct candidates per metric. Instead of
+re-running ``count(distinct ...)`` over slots and test results on every read,
+each slot/test-result write updates two small tables in the same
+transaction:
+
+- ``kpi_weekly_contributions``: which (metric, timezone, week) every source
+  row currently counts towards. Writes are diffed against it, so a status
+  change or an ``updated_at`` bump moves the contribution between weeks.
+- ``kpi_weekly_members``: one row per distinct candidate and scope with a
+  reference count of contributing sources.
+
+Scope ``0`` is the company-wide value; other scopes are recruiter ids (slot
+owner for slot metrics, the candidate's responsible recruiter for tests).
+The distinct counts are ``count(*)`` over a week's member rows, taken at read
+time: a write only touches rows keyed by its own candidate, so concurrent
+bookings never queue behind one shared per-week counter row (the
+``kpi_weekly_counters`` table from migration 0109 is no longer written).
+The hook runs in every process that installs it. Core ``delete(Slot)``
+statements bypass it, so their callers release the deleted ids with
+``release_deleted_slots``; anything else that bypasses the ORM (FK cascades)
+is picked up by the reconciliation pass.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, NamedTuple, Optional, Sequence, Set, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import delete, event, func, inspect, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.core.settings import get_settings
+from backend.domain.candidates.models import TestResult, User
+from backend.domain.models import (
+    KPIWeeklyContribution,
+    KPIWeeklyMember,
+    Slot,
+    SlotStatus,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COMPANY_TZ = "Europe/Moscow"
+BOOKING_STATES = {
+    SlotStatus.PENDING,
+    SlotStatus.BOOKED,
+    SlotStatus.CONFIRMED_BY_CANDIDATE,
+}
+BOOKING_STATES_LOWER = tuple(state.lower() for state in BOOKING_STATES)
+SUCCESS_OUTCOMES = {"success", "passed", "accepted", "hired"}
+INTRO_ATTEND_STATES = {SlotStatus.CONFIRMED_BY_CANDIDATE}
+INTRO_ATTEND_STATES_LOWER = tuple(state.lower() for state in INTRO_ATTEND_STATES)
+CONFIRMED_STATUS = SlotStatus.CONFIRMED_BY_CANDIDATE.lower()
+
+# ``completed_test`` mirrors ``tested`` and is derived on read.
+COUNTER_METRICS: Tuple[str, ...] = ("tested", "booked", "confirmed", "interview_passed", "intro_day")
+COMPANY_SCOPE = 0
+
+SOURCE_SLOT = "slot"
+SOURCE_TEST = "test"
+
+
+class Contribution(NamedTuple):
+    source_type: str
+    source_id: int
+    metric: str
+    tz: str
+    week_start: date
+    candidate_key: int
+    recruiter_id: Optional[int]
+
+    def scopes(self) -> Tuple[int, ...]:
+        if self.recruiter_id:
+            return (COMPANY_SCOPE, int(self.recruiter_id))
+        return (COMPANY_SCOPE,)
+
+
+def company_timezone_name() -> str:
+    return os.getenv("COMPANY_TZ") or os.getenv("TZ") or DEFAULT_COMPANY_TZ
+
+
+def resolve_zone(tz_name: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+def counter_timezones() -> Tuple[str, ...]:
+    """Timezone keys whose weeks are materialized (company timezone first)."""
+    names = (company_timezone_name(), *get_settings().kpi_counter_timezones)
+    return tuple(dict.fromkeys(resolve_zone(name).key for name in names))
+
+
+def week_start_for(moment: datetime, tz: ZoneInfo) -> date:
+    """Local Sunday that starts the KPI week containing ``moment``."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    local = moment.astimezone(tz)
+    return (local - timedelta(days=(local.weekday() + 1) % 7)).date()
+
+
+def slot_metrics(purpose: Optional[str], status: Optional[str], outcome: Optional[str]) -> Tuple[str, ...]:
+    """Metrics a slot in this state counts towards (same predicates as the SQL path)."""
+    purpose_value = (purpose or "").lower()
+    status_value = (status or "").lower()
+    metrics = []
+    if purpose_value == "interview":
+        if status_value in BOOKING_STATES_LOWER:
+            metrics.append("booked")
+        if status_value == CONFIRMED_STATUS:
+            metrics.append("confirmed")
+        if (outcome or "").lower() in SUCCESS_OUTCOMES:
+            metrics.append("interview_passed")
+    elif purpose_value == "intro_day":
+        if status_value in INTRO_ATTEND_STATES_LOWER:
+            metrics.append("intro_day")
+    return tuple(metrics)
+
+
+def _slot_contributions(rows: Iterable[Sequence], tzs: Sequence[str]) -> Set[Contribution]:
+    result: Set[Contribution] = set()
+    for slot_id, candidate_tg_id, purpose, status, outcome, updated_at, recruiter_id in rows:
+        if candidate_tg_id is None or updated_at is None:
+            continue
+        metrics = slot_metrics(purpose, status, outcome)
+        if not metrics:
+            continue
+        for tz in tzs:
+            week_start = week_start_for(updated_at, resolve_zone(tz))
+            for metric in metrics:
+                result.add(
+                    Contribution(
+                        SOURCE_SLOT, int(slot_id), metric, tz, week_start, int(candidate_tg_id), recruiter_id
+                    )
+                )
+    return result
+
+
+def _test_contributions(rows: Iterable[Sequence], tzs: Sequence[str]) -> Set[Contribution]:
+    result: Set[Contribution] = set()
+    for result_id, user_id, created_at, recruiter_id in rows:
+        if created_at is None:
+            continue
+        for tz in tzs:
+            week_start = week_start_for(created_at, resolve_zone(tz))
+            result.add(Contribution(SOURCE_TEST, int(result_id), "tested", tz, week_start, int(user_id), recruiter_id))
+    return result
+
+
+_SLOT_COLUMNS = (
+    Slot.id,
+    Slot.candidate_tg_id,
+    Slot.purpose,
+    Slot.status,
+    Slot.interview_outcome,
+    Slot.updated_at,
+    Slot.recruiter_id,
+)
+
+
+def _test_query():
+    # Inner join: the SQL path only counts test results of existing users.
+    return select(
+        TestResult.id,
+        TestResult.user_id,
+        TestResult.created_at,
+        User.responsible_recruiter_id,
+    ).join(User, User.id == TestResult.user_id)
+
+
+def _insert_factory(conn: Connection):
+    name = conn.dialect.name
+    if name == "postgresql":
+        return pg_insert
+    if name == "sqlite":
+        return sqlite_insert
+    return None
+
+
+def supports_counters(conn: Connection) -> bool:
+    return _insert_factory(conn) is not None
+
+
+def _acquire_member(conn: Connection, item: Contribution, scope_id: int) -> None:
+    table = KPIWeeklyMember.__table__
+    stmt = _insert_factory(conn)(table).values(
+        tz=item.tz,
+        week_start=item.week_start,
+        metric=item.metric,
+        scope_id=scope_id,
+        candidate_key=item.candidate_key,
+        refs=1,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.tz, table.c.week_start, table.c.metric, table.c.scope_id, table.c.candidate_key],
+        set_={"refs": table.c.refs + 1},
+    )
+    conn.execute(stmt)
+
+
+def _release_member(conn: Connection, item: Contribution, scope_id: int) -> None:
+    table = KPIWeeklyMember.__table__
+    key = (
+        table.c.tz == item.tz,
+        table.c.week_start == item.week_start,
+        table.c.metric == item.metric,
+        table.c.scope_id == scope_id,
+        table.c.candidate_key == item.candidate_key,
+    )
+    refs = conn.execute(
+        update(table).where(*key).values(refs=table.c.refs - 1).returning(table.c.refs)
+    ).scalar_one_or_none()
+    if refs is None:
+        # The week was pruned after rollover; nothing left to decrement.
+        return
+    if refs <= 0:
+        conn.execute(delete(table).where(*key))
+
+
+def _apply(conn: Connection, removed: Iterable[Contribution], added: Iterable[Contribution]) -> None:
+    """Move member refs only for contribution rows this call actually deleted or inserted.
+
+    A concurrent ``rebuild_week`` may have written (or dropped) the same keys
+    already; those rows are skipped instead of failing the caller's write or
+    counting the candidate twice.
+    """
+    table = KPIWeeklyContribution.__table__
+    for item in removed:
+        deleted = conn.execute(
+            delete(table)
+            .where(
+                table.c.source_type == item.source_type,
+                table.c.source_id == item.source_id,
+                table.c.metric == item.metric,
+                table.c.tz == item.tz,
+            )
+            .returning(table.c.source_id)
+        ).first()
+        if deleted is None:
+            continue
+        for scope_id in item.scopes():
+            _release_member(conn, item, scope_id)
+    insert_factory = _insert_factory(conn)
+    for item in added:
+        inserted = conn.execute(
+            insert_factory(table)
+            .values(**item._asdict())
+            .on_conflict_do_nothing(
+                index_elements=[table.c.source_type, table.c.source_id, table.c.metric, table.c.tz]
+            )
+            .returning(table.c.source_id)
+        ).first()
+        if inserted is None:
+            continue
+        for scope_id in item.scopes():
+            _acquire_member(conn, item, scope_id)
+
+
+def sync_sources(
+    conn: Connection,
+    *,
+    slot_ids: Iterable[int] = (),
+    test_ids: Iterable[int] = (),
+    user_ids: Iterable[int] = (),
+    tzs: Optional[Sequence[str]] = None,
+) -> None:
+    """Bring the contributions of the given rows in line with their current state."""
+    if not supports_counters(conn):
+        return
+    tzs = tuple(tzs or counter_timezones())
+    table = KPIWeeklyContribution.__table__
+    slot_ids = {int(value) for value in slot_ids}
+    test_ids = {int(value) for value in test_ids}
+    user_ids = {int(value) for value in user_ids}
+    if user_ids:
+        # A reassigned candidate moves their test contributions to another recruiter scope.
+        test_ids.update(
+            conn.execute(
+                select(table.c.source_id).where(
+                    table.c.source_type == SOURCE_TEST,
+                    table.c.candidate_key.in_(user_ids),
+                )
+            ).scalars()
+        )
+    if not slot_ids and not test_ids:
+        return
+
+    desired: Set[Contribution] = set()
+    source_filters = []
+    if slot_ids:
+        desired |= _slot_contributions(conn.execute(select(*_SLOT_COLUMNS).where(Slot.id.in_(slot_ids))), tzs)
+        source_filters.append((table.c.source_type == SOURCE_SLOT) & table.c.source_id.in_(slot_ids))
+    if test_ids:
+        desired |= _test_contributions(conn.execute(_test_query().where(TestResult.id.in_(test_ids))), tzs)
+        source_filters.append((table.c.source_type == SOURCE_TEST) & table.c.source_id.in_(test_ids))
+
+    existing = {
+        Contribution(*row)
+        for row in conn.execute(
+            select(
+                table.c.source_type,
+                table.c.source_id,
+                table.c.metric,
+                table.c.tz,
+                table.c.week_start,
+                table.c.candidate_key,
+                table.c.recruiter_id,
+            ).where(or_(*source_filters), table.c.tz.in_(tzs))
+        )
+    }
+    _apply(conn, existing - desired, desired - existing)
+
+
+def expected_contributions(conn: Connection, tz: str, week_start: date) -> Set[Contribution]:
+    """Recompute a week's contributions from the source tables."""
+    zone = resolve_zone(tz)
+    start_local = datetime.combine(week_start, datetime.min.time(), tzinfo=zone)
+    start_utc = start_local.astimezone(timezone.utc)
+    end_utc = (start_local + timedelta(days=7)).astimezone(timezone.utc)
+    slot_rows = conn.execute(
+        select(*_SLOT_COLUMNS).where(
+            Slot.candidate_tg_id.isnot(None),
+            func.lower(Slot.purpose).in_(("interview", "intro_day")),
+            Slot.updated_at >= start_utc,
+            Slot.updated_at < end_utc,
+        )
+    )
+    test_rows = conn.execute(
+        _test_query().where(TestResult.created_at >= start_utc, TestResult.created_at < end_utc)
+    )
+    contributions = _slot_contributions(slot_rows, (tz,)) | _test_contributions(test_rows, (tz,))
+    return {item for item in contributions if item.week_start == week_start}
+
+
+def count_members(contributions: Iterable[Contribution]) -> Dict[Tuple[str, int], int]:
+    """Distinct candidates per ``(metric, scope_id)``."""
+    members: Dict[Tuple[str, int], Set[int]] = defaultdict(set)
+    for item in contributions:
+        for scope_id in item.scopes():
+            members[(item.metric, scope_id)].add(item.candidate_key)
+    return {key: len(values) for key, values in members.items()}
+
+
+def stored_counters(conn: Connection, tz: str, week_start: date) -> Dict[Tuple[str, int], int]:
+    """Distinct candidates per ``(metric, scope_id)`` as maintained in the member rows."""
+    table = KPIWeeklyMember.__table__
+    rows = conn.execute(
+        select(table.c.metric, table.c.scope_id, func.count())
+        .where(table.c.tz == tz, table.c.week_start == week_start)
+        .group_by(table.c.metric, table.c.scope_id)
+    )
+    return {(metric, int(scope_id)): int(value) for metric, scope_id, value in rows if value}
+
+
+def rebuild_week(conn: Connection, tz: str, week_start: date) -> Dict[Tuple[str, int], int]:
+    """Replace a week's contributions and members with a full recomputation."""
+    contributions = expected_contributions(conn, tz, week_start)
+    contribution_table = KPIWeeklyContribution.__table__
+    member_table = KPIWeeklyMember.__table__
+
+    conn.execute(
+        delete(member_table).where(member_table.c.tz == tz, member_table.c.week_start == week_start)
+    )
+    conn.execute(
+        delete(contribution_table).where(
+            contribution_table.c.tz == tz,
+            contribution_table.c.week_start == week_start,
+        )
+    )
+    # Sources now counted in this week cannot also count in another one.
+    for source_type in (SOURCE_SLOT, SOURCE_TEST):
+        source_ids = sorted({item.source_id for item in contributions if item.source_type == source_type})
+        for offset in range(0, len(source_ids), 500):
+            conn.execute(
+                delete(contribution_table).where(
+                    contribution_table.c.tz == tz,
+                    contribution_table.c.source_type == source_type,
+                    contribution_table.c.source_id.in_(source_ids[offset : offset + 500]),
+                )
+            )
+
+    refs: Dict[Tuple[str, int, int], int] = defaultdict(int)
+    for item in contributions:
+        for scope_id in item.scopes():
+            refs[(item.metric, scope_id, item.candidate_key)] += 1
+    counts = count_members(contributions)
+
+    if contributions:
+        conn.execute(contribution_table.insert(), [item._asdict() for item in contributions])
+        conn.execute(
+            member_table.insert(),
+            [
+                {
+                    "tz": tz,
+                    "week_start": week_start,
+                    "metric": metric,
+                    "scope_id": scope_id,
+                    "candidate_key": candidate_key,
+                    "refs": value,
+                }
+                for (metric, scope_id, candidate_key), value in refs.items()
+            ],
+        )
+    return counts
+
+
+def prune_weeks_before(conn: Connection, tz: str, week_start: date) -> None:
+    for model in (KPIWeeklyContribution, KPIWeeklyMember):
+        table = model.__table__
+        conn.execute(delete(table).where(table.c.tz == tz, table.c.week_start < week_start))
+
+
+def _state_id(obj) -> Optional[int]:
+    value = inspect(obj).dict.get("id")
+    return int(value) if value is not None else None
+
+
+def _sync_after_flush(session: Session, flush_context) -> None:
+    slot_ids: Set[int] = set()
+    test_ids: Set[int] = set()
+    user_ids: Set[int] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Slot):
+            target = slot_ids
+        elif isinstance(obj, TestResult):
+            target = test_ids
+        elif isinstance(obj, User) and obj in session.dirty:
+            if not inspect(obj).attrs.responsible_recruiter_id.history.has_changes():
+                continue
+            target = user_ids
+        else:
+            continue
+        obj_id = _state_id(obj)
+        if obj_id is not None:
+            target.add(obj_id)
+    if slot_ids or test_ids or user_ids:
+        sync_sources(session.connection(), slot_ids=slot_ids, test_ids=test_ids, user_ids=user_ids)
+
+
+async def release_deleted_slots(session: AsyncSession, slot_ids: Iterable[int]) -> None:
+    """Drop the contributions of slots removed with a Core ``delete(Slot)``.
+
+    Must run in the same transaction as the delete, after it; a no-op when the
+    counter hooks are not installed in this process.
+    """
+    ids = {int(value) for value in slot_ids}
+    if not ids or not event.contains(Session, "after_flush", _sync_after_flush):
+        return
+    await session.run_sync(lambda sync_session: sync_sources(sync_session.connection(), slot_ids=ids))
+
+
+def install_kpi_counter_hooks() -> None:
+    """Maintain KPI counters from ORM slot/test writes (idempotent)."""
+    if event.contains(Session, "after_flush", _sync_after_flush):
+        return
+    event.listen(Session, "after_flush", _sync_after_flush)
+
+
+def uninstall_kpi_counter_hooks() -> None:
+    if event.contains(Session, "after_flush", _sync_after_flush):
+        event.remove(Session, "after_flush", _sync_after_flush)
+
+
+__all__ = [
+    "COMPANY_SCOPE",
+    "COUNTER_METRICS",
+    "Contribution",
+    "company_timezone_name",
+    "count_members",
+    "counter_timezones",
+    "expected_contributions",
+    "install_kpi_counter_hooks",
+    "prune_weeks_before",
+    "release_deleted_slots",
+    "rebuild_week",
+    "resolve_zone",
+    "slot_metrics",
+    "stored_counters",
+    "supports_counters",
+    "sync_sources",
+    "uninstall_kpi_counter_hooks",
+    "week_start_for",
+]
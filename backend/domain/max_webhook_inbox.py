@@ -0,0 +1,255 @@
+"""Durable inbox for MAX webhook updates.
+
+Updates are written once per ``update_key`` and acknowledged to MAX immediately;
+workers claim them later. Only the oldest unfinished update of each MAX user is
+claimable, so updates from one user are processed strictly in arrival order
+even with several workers (or processes) draining the table.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import and_, delete, func, insert, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import aliased
+
+from backend.core.db import async_session
+from backend.domain.models import MaxWebhookUpdate
+
+STATUS_PENDING = "pending"
+STATUS_PROCESSING = "processing"
+STATUS_PROCESSED = "processed"
+STATUS_DEAD = "dead"
+
+_UNFINISHED = (STATUS_PENDING, STATUS_PROCESSING)
+
+
+@dataclass(frozen=True)
+class ClaimedMaxWebhookUpdate:
+    id: int
+    update_type: str
+    max_user_id: str | None
+    payload: dict[str, Any]
+    attempts: int
+    received_at: datetime
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+async def enqueue_max_webhook_update(
+    *,
+    update_key: str,
+    update_type: str,
+    max_user_id: str | None,
+    payload: dict[str, Any],
+) -> int | None:
+    """Persist an update; return its id, or ``None`` when ``update_key`` was already stored."""
+    values = {
+        "update_key": update_key,
+        "update_type": update_type,
+        "max_user_id": max_user_id,
+        "payload_json": payload,
+        "status": STATUS_PENDING,
+        "attempts": 0,
+        "received_at": datetime.now(UTC),
+    }
+    async with async_session() as session:
+        async with session.begin():
+            dialect_name = session.get_bind().dialect.name
+            if dialect_name == "postgresql":
+                stmt = pg_insert(MaxWebhookUpdate).values(values).on_conflict_do_nothing()
+            elif dialect_name == "sqlite":
+                stmt = sqlite_insert(MaxWebhookUpdate).values(values).on_conflict_do_nothing()
+            else:
+                existing = await session.scalar(
+                    select(MaxWebhookUpdate.id).where(MaxWebhookUpdate.update_key == update_key)
+                )
+                if existing is not None:
+                    return None
+                stmt = insert(MaxWebhookUpdate).values(values)
+            inserted = await session.scalar(stmt.returning(MaxWebhookUpdate.id))
+    return int(inserted) if inserted is not None else None
+
+
+async def claim_max_webhook_updates(
+    *,
+    batch_size: int,
+    lock_timeout: timedelta,
+) -> list[ClaimedMaxWebhookUpdate]:
+    """Lock up to ``batch_size`` due updates that head their user's queue."""
+    now = datetime.now(UTC)
+    stale_before = now - lock_timeout
+    earlier = aliased(MaxWebhookUpdate)
+    claimable = or_(
+        and_(
+            MaxWebhookUpdate.status == STATUS_PENDING,
+            or_(
+                MaxWebhookUpdate.next_attempt_at.is_(None),
+                MaxWebhookUpdate.next_attempt_at <= now,
+            ),
+        ),
+        and_(
+            MaxWebhookUpdate.status == STATUS_PROCESSING,
+            MaxWebhookUpdate.locked_at <= stale_before,
+        ),
+    )
+    blocked_by_earlier = (
+        select(earlier.id)
+        .where(
+            earlier.max_user_id == MaxWebhookUpdate.max_user_id,
+            earlier.id < MaxWebhookUpdate.id,
+            earlier.status.in_(_UNFINISHED),
+        )
+        .exists()
+    )
+    async with async_session() as session:
+        async with session.begin():
+            rows = list(
+                (
+                    await session.execute(
+                        select(MaxWebhookUpdate)
+                        .where(claimable, ~blocked_by_earlier)
+                        .order_by(MaxWebhookUpdate.id.asc())
+                        .limit(max(1, batch_size))
+                        .with_for_update(skip_locked=True)
+                    )
+                ).scalars().all()
+            )
+            for row in rows:
+                row.status = STATUS_PROCESSING
+                row.locked_at = now
+                row.attempts = int(row.attempts or 0) + 1
+            if rows:
+                await session.flush()
+            return [
+                ClaimedMaxWebhookUpdate(
+                    id=int(row.id),
+                    update_type=str(row.update_type or ""),
+                    max_user_id=row.max_user_id,
+                    payload=dict(row.payload_json or {}),
+                    attempts=int(row.attempts),
+                    received_at=_as_utc(row.received_at) or now,
+                )
+                for row in rows
+            ]
+
+
+async def mark_max_webhook_update_processed(update_id: int, *, processed_at: datetime) -> None:
+    async with async_session() as session:
+        async with session.begin():
+            row = await session.get(MaxWebhookUpdate, update_id, with_for_update=True)
+            if row is None:
+                return
+            row.status = STATUS_PROCESSED
+            row.processed_at = processed_at
+            row.locked_at = None
+            row.next_attempt_at = None
+            row.last_error = None
+
+
+async def mark_max_webhook_update_failed(
+    update_id: int,
+    *,
+    error: str,
+    next_attempt_at: datetime | None,
+) -> None:
+    """Schedule a retry at ``next_attempt_at`` or dead-letter the update when it is ``None``."""
+    async with async_session() as session:
+        async with session.begin():
+            row = await session.get(MaxWebhookUpdate, update_id, with_for_update=True)
+            if row is None:
+                return
+            row.last_error = error[:2000]
+            row.locked_at = None
+            if next_attempt_at is None:
+                row.status = STATUS_DEAD
+                row.next_attempt_at = None
+            else:
+                row.status = STATUS_PENDING
+                row.next_attempt_at = next_attempt_at
+
+
+async def prune_max_webhook_updates(*, older_than: datetime, batch_size: int = 1000) -> int:
+    """Delete processed and dead updates received before ``older_than``.
+
+    Rows are removed in id batches so one run never holds a long lock. Pruned
+    ``update_key`` values no longer dedup, so the retention window must stay far
+    longer than MAX's redelivery horizon.
+    """
+    cutoff = _as_utc(older_than)
+    deleted = 0
+    while True:
+        async with async_session() as session:
+            async with session.begin():
+                ids = list(
+                    (
+                        await session.scalars(
+                            select(MaxWebhookUpdate.id)
+                            .where(
+                                MaxWebhookUpdate.status.in_((STATUS_PROCESSED, STATUS_DEAD)),
+                                MaxWebhookUpdate.received_at < cutoff,
+                            )
+                            .order_by(MaxWebhookUpdate.id.asc())
+                            .limit(max(1, batch_size))
+                        )
+                    ).all()
+                )
+                if ids:
+                    await session.execute(delete(MaxWebhookUpdate).where(MaxWebhookUpdate.id.in_(ids)))
+        deleted += len(ids)
+        if len(ids) < max(1, batch_size):
+            return deleted
+
+
+async def max_webhook_queue_snapshot() -> dict[str, Any]:
+    """Backlog counters for health reporting."""
+    now = datetime.now(UTC)
+    async with async_session() as session:
+        counts = dict(
+            (
+                await session.execute(
+                    select(MaxWebhookUpdate.status, func.count())
+                    .where(MaxWebhookUpdate.status.in_((*_UNFINISHED, STATUS_DEAD)))
+                    .group_by(MaxWebhookUpdate.status)
+                )
+            ).all()
+        )
+        oldest = await session.scalar(
+            select(func.min(MaxWebhookUpdate.received_at)).where(
+                MaxWebhookUpdate.status.in_(_UNFINISHED)
+            )
+        )
+    oldest_utc = _as_utc(oldest)
+    return {
+        "pending": int(counts.get(STATUS_PENDING, 0)),
+        "processing": int(counts.get(STATUS_PROCESSING, 0)),
+        "dead": int(counts.get(STATUS_DEAD, 0)),
+        "oldest_unfinished_age_seconds": (
+            round(max(0.0, (now - oldest_utc).total_seconds()), 3) if oldest_utc else 0.0
+        ),
+    }
+
+
+__all__ = [
+    "ClaimedMaxWebhookUpdate",
+    "STATUS_DEAD",
+    "STATUS_PENDING",
+    "STATUS_PROCESSED",
+    "STATUS_PROCESSING",
+    "claim_max_webhook_updates",
+    "enqueue_max_webhook_update",
+    "mark_max_webhook_update_failed",
+    "mark_max_webhook_update_processed",
+    "max_webhook_queue_snapshot",
+    "prune_max_webhook_updates",
+]
@@ -0,0 +1,710 @@
+"""Delivery state machine on ``messages`` / ``message_deliveries``.
+
+Every provider attempt is its own ``message_deliveries`` row: a retry on the
+same channel bumps ``channel_attempt_no``, a fallback to the next channel
+bumps ``route_order``. Rows are created ``planned`` with ``next_retry_at``
+as the due time; a claim flips them to ``sending`` and reuses
+``next_retry_at`` as the lease expiry, so the ``(delivery_status,
+next_retry_at)`` index serves both due and stale claims.
+
+Failure classes follow RS-ADR-005:
+
+- ``temporary`` retries the same channel with backoff until the per-channel
+  budget is spent, then falls back;
+- ``hard`` marks the identity unreachable and falls back immediately;
+- ``soft`` (policy/capability skip) falls back without touching health.
+
+The route (Telegram -> MAX -> browser link by default) is recomputed from the
+contact policy and channel identities whenever a fallback is needed, so
+reachability changes made by receipts are honoured.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any, Sequence
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.db import async_session
+from backend.domain.candidates.models import User
+from backend.domain.messaging.models import (
+    CandidateContactPolicy,
+    Message,
+    MessageDelivery,
+    MessageThread,
+    ProviderReceipt,
+)
+from backend.domain.models import CandidateChannelIdentity
+
+CHANNEL_TELEGRAM = "telegram"
+CHANNEL_MAX = "max"
+CHANNEL_WEB = "browser_link"
+DEFAULT_ROUTE = (CHANNEL_TELEGRAM, CHANNEL_MAX, CHANNEL_WEB)
+_PROVIDERS = {CHANNEL_TELEGRAM: "telegram_bot", CHANNEL_MAX: "max_bot", CHANNEL_WEB: "candidate_portal"}
+
+DELIVERY_PLANNED = "planned"
+DELIVERY_SENDING = "sending"
+DELIVERY_PROVIDER_ACCEPTED = "provider_accepted"
+DELIVERY_DELIVERED = "delivered"
+DELIVERY_READ = "read"
+DELIVERY_FAILED = "failed"
+DELIVERY_SKIPPED = "skipped"
+DELIVERY_CANCELLED = "cancelled"
+_DELIVERY_PROGRESS = {
+    DELIVERY_SENDING: 0,
+    DELIVERY_PROVIDER_ACCEPTED: 1,
+    DELIVERY_DELIVERED: 2,
+    DELIVERY_READ: 3,
+}
+
+FAILURE_HARD = "hard"
+FAILURE_SOFT = "soft"
+FAILURE_TEMPORARY = "temporary"
+
+INTENT_ROUTING = "routing"
+INTENT_IN_FLIGHT = "in_flight"
+INTENT_COMPLETED = "completed"
+INTENT_FAILED = "failed"
+
+RESULT_SENT = "sent"
+RESULT_RETRY = "retry"
+RESULT_FALLBACK = "fallback"
+RESULT_FAILED = "failed"
+RESULT_IGNORED = "ignored"
+
+RECEIPT_APPLIED = "applied"
+RECEIPT_DUPLICATE = "duplicate"
+RECEIPT_UNMATCHED = "unmatched"
+
+_HARD_RECEIPTS = {"blocked": "blocked_user", "bounced": "invalid_recipient"}
+_UNREACHABLE_CODES = {"blocked_user", "invalid_recipient"}
+
+
+@dataclass(frozen=True)
+class RouteStep:
+    channel: str
+    destination: str
+    identity_id: int | None = None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts_per_channel: int = 3
+    base_seconds: int = 10
+    max_seconds: int = 600
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        backoff = min(self.max_seconds, self.base_seconds * (2 ** max(0, attempt - 1)))
+        return max(float(backoff), float(retry_after or 0.0))
+
+
+@dataclass(frozen=True)
+class DeliveryOutcome:
+    success: bool
+    provider_message_id: str | None = None
+    failure_class: str | None = None
+    failure_code: str | None = None
+    retry_after: float | None = None
+
+
+@dataclass(frozen=True)
+class ClaimedDelivery:
+    id: int
+    message_id: int
+    candidate_id: int
+    channel: str
+    provider: str
+    destination: str
+    payload: dict[str, Any]
+    route_order: int
+    channel_attempt_no: int
+    overall_attempt_no: int
+    idempotency_key: str
+
+    @property
+    def text(self) -> str:
+        return str(self.payload.get("text") or "")
+
+
+def _identity_destination(identities: Sequence[CandidateChannelIdentity], channel: str) -> tuple[bool, RouteStep | None]:
+    """Pick the best identity of ``channel``; the flag says whether any identity exists."""
+    matching = [identity for identity in identities if identity.channel == channel]
+    usable = [
+        identity
+        for identity in matching
+        if identity.external_user_id and identity.reachability_status != "unreachable"
+    ]
+    usable.sort(key=lambda identity: (not identity.is_primary, -int(identity.id or 0)))
+    if not usable:
+        return bool(matching), None
+    chosen = usable[0]
+    return True, RouteStep(channel=channel, destination=str(chosen.external_user_id), identity_id=int(chosen.id))
+
+
+def plan_route(
+    user: User,
+    *,
+    policy: CandidateContactPolicy | None,
+    identities: Sequence[CandidateChannelIdentity] = (),
+) -> list[RouteStep]:
+    """Ordered channels a message for ``user`` may go through; empty means policy stop."""
+    if policy is not None and (policy.do_not_contact or policy.consent_status == "revoked"):
+        return []
+    order: list[str] = []
+    preferred = (policy.preferred_channel if policy is not None else None) or None
+    fallback = list(policy.fallback_order_json or []) if policy is not None else []
+    for channel in [preferred, *(fallback or DEFAULT_ROUTE)]:
+        normalized = str(channel or "").strip().lower()
+        if normalized in _PROVIDERS and normalized not in order:
+            order.append(normalized)
+
+    steps: list[RouteStep] = []
+    for channel in order:
+        has_identity, step = _identity_destination(identities, channel)
+        if step is None and not has_identity:
+            legacy: object = None
+            if channel == CHANNEL_TELEGRAM:
+                legacy = user.telegram_user_id or user.telegram_id
+            elif channel == CHANNEL_MAX:
+                legacy = user.max_user_id
+            elif channel == CHANNEL_WEB:
+                legacy = user.candidate_id
+            if legacy:
+                step = RouteStep(channel=channel, destination=str(legacy))
+        if step is not None:
+            steps.append(step)
+    if policy is not None and not policy.fallback_enabled:
+        return steps[:1]
+    return steps
+
+
+async def _load_route(
+    session: AsyncSession,
+    candidate_id: int,
+    *,
+    application_id: int | None,
+    purpose_scope: str,
+) -> list[RouteStep]:
+    user = await session.get(User, candidate_id)
+    if user is None:
+        return []
+    policies = (
+        await session.execute(
+            select(CandidateContactPolicy).where(
+                CandidateContactPolicy.candidate_id == candidate_id,
+                CandidateContactPolicy.purpose_scope == purpose_scope,
+                or_(
+                    CandidateContactPolicy.application_id.is_(None),
+                    CandidateContactPolicy.application_id == application_id,
+                ),
+            )
+        )
+    ).scalars().all()
+    # An application-specific policy overrides the candidate-wide one.
+    policy = next(
+        (item for item in policies if application_id is not None and item.application_id == application_id),
+        next((item for item in policies if item.application_id is None), None),
+    )
+    identities = (
+        await session.execute(
+            select(CandidateChannelIdentity).where(CandidateChannelIdentity.candidate_id == candidate_id)
+        )
+    ).scalars().all()
+    return plan_route(user, policy=policy, identities=identities)
+
+
+def _delivery_key(message_id: int, route_order: int, channel_attempt_no: int) -> str:
+    return f"msg:{message_id}:r{route_order}:a{channel_attempt_no}"
+
+
+def _new_delivery(
+    message: Message,
+    step: RouteStep,
+    *,
+    route_order: int,
+    channel_attempt_no: int,
+    overall_attempt_no: int,
+    due_at: datetime,
+) -> MessageDelivery:
+    return MessageDelivery(
+        message_id=message.id,
+        thread_id=message.thread_id,
+        candidate_id=message.candidate_id,
+        application_id=message.application_id,
+        channel=step.channel,
+        provider=_PROVIDERS[step.channel],
+        identity_id=step.identity_id,
+        destination_fingerprint=step.destination,
+        route_order=route_order,
+        channel_attempt_no=channel_attempt_no,
+        overall_attempt_no=overall_attempt_no,
+        delivery_status=DELIVERY_PLANNED,
+        rendered_payload_json=dict(message.canonical_payload_json or {}),
+        idempotency_key=_delivery_key(int(message.id), route_order, channel_attempt_no),
+        next_retry_at=due_at,
+    )
+
+
+async def enqueue_message(
+    *,
+    candidate_id: int,
+    intent_key: str,
+    text: str,
+    idempotency_key: str,
+    purpose_scope: str = "recruiting",
+    thread_kind: str = "recruiting",
+    sender_type: str = "system",
+    sender_id: str | None = None,
+    application_id: int | None = None,
+    buttons: list[list[dict[str, Any]]] | None = None,
+    correlation_id: str | None = None,
+) -> int:
+    """Create an outbound message intent with its first planned delivery.
+
+    Idempotent on ``idempotency_key``: repeated calls return the existing message id.
+    """
+    now = datetime.now(UTC)
+    async with async_session() as session:
+        try:
+            async with session.begin():
+                existing = await session.scalar(
+                    select(Message.id).where(Message.idempotency_key == idempotency_key)
+                )
+                if existing is not None:
+                    return int(existing)
+                thread = await session.scalar(
+                    select(MessageThread)
+                    .where(
+                        MessageThread.candidate_id == candidate_id,
+                        MessageThread.purpose_scope == purpose_scope,
+                        MessageThread.thread_kind == thread_kind,
+                        MessageThread.closed_at.is_(None),
+                    )
+                    .order_by(MessageThread.updated_at.desc(), MessageThread.id.desc())
+                    .limit(1)
+                )
+                if thread is None:
+                    thread = MessageThread(
+                        candidate_id=candidate_id,
+                        application_id=application_id,
+                        thread_kind=thread_kind,
+                        purpose_scope=purpose_scope,
+                        status="active",
+                    )
+                    session.add(thread)
+                    await session.flush()
+                payload: dict[str, Any] = {"text": text}
+                if buttons:
+                    payload["buttons"] = buttons
+                if correlation_id:
+                    payload["correlation_id"] = correlation_id
+                message = Message(
+                    thread_id=thread.id,
+                    candidate_id=candidate_id,
+                    application_id=application_id,
+                    direction="outbound",
+                    intent_key=intent_key,
+                    purpose_scope=purpose_scope,
+                    sender_type=sender_type,
+                    sender_id=sender_id,
+                    canonical_payload_json=payload,
+                    idempotency_key=idempotency_key,
+                    correlation_id=correlation_id,
+                    intent_status=INTENT_ROUTING,
+                    created_at=now,
+                )
+                session.add(message)
+                await session.flush()
+                route = await _load_route(
+                    session,
+                    candidate_id,
+                    application_id=application_id,
+                    purpose_scope=purpose_scope,
+                )
+                if not route:
+                    message.intent_status = INTENT_FAILED
+                    message.completed_at = now
+                else:
+                    message.intent_status = INTENT_IN_FLIGHT
+                    session.add(
+                        _new_delivery(
+                            message,
+                            route[0],
+                            route_order=1,
+                            channel_attempt_no=1,
+                            overall_attempt_no=1,
+                            due_at=now,
+                        )
+                    )
+                    thread.current_primary_channel = route[0].channel
+                thread.last_message_id = message.id
+                thread.last_outbound_at = now
+                message_id = int(message.id)
+        except IntegrityError:
+            # A concurrent enqueue with the same idempotency key won the race.
+            async with async_session() as retry_session:
+                existing = await retry_session.scalar(
+                    select(Message.id).where(Message.idempotency_key == idempotency_key)
+                )
+            if existing is None:
+                raise
+            return int(existing)
+    return message_id
+
+
+async def claim_due_deliveries(*, batch_size: int, lease: timedelta) -> list[ClaimedDelivery]:
+    """Lock up to ``batch_size`` due deliveries (``SKIP LOCKED``) and lease them for sending."""
+    now = datetime.now(UTC)
+    claimable = or_(
+        and_(
+            MessageDelivery.delivery_status == DELIVERY_PLANNED,
+            or_(MessageDelivery.next_retry_at.is_(None), MessageDelivery.next_retry_at <= now),
+        ),
+        and_(
+            MessageDelivery.delivery_status == DELIVERY_SENDING,
+            MessageDelivery.next_retry_at <= now,
+        ),
+    )
+    async with async_session() as session:
+        async with session.begin():
+            rows = list(
+                (
+                    await session.execute(
+                        select(MessageDelivery)
+                        .where(claimable)
+                        .order_by(MessageDelivery.next_retry_at.asc(), MessageDelivery.id.asc())
+                        .limit(max(1, batch_size))
+                        .with_for_update(skip_locked=True)
+                    )
+                ).scalars().all()
+            )
+            for row in rows:
+                row.delivery_status = DELIVERY_SENDING
+                row.next_retry_at = now + lease
+            if rows:
+                await session.flush()
+            return [
+                ClaimedDelivery(
+                    id=int(row.id),
+                    message_id=int(row.message_id),
+                    candidate_id=int(row.candidate_id),
+                    channel=row.channel,
+                    provider=row.provider,
+                    destination=str(row.destination_fingerprint or ""),
+                    payload=dict(row.rendered_payload_json or {}),
+                    route_order=int(row.route_order),
+                    channel_attempt_no=int(row.channel_attempt_no),
+                    overall_attempt_no=int(row.overall_attempt_no),
+                    idempotency_key=row.idempotency_key,
+                )
+                for row in rows
+            ]
+
+
+async def _mark_identity(
+    session: AsyncSession,
+    identity_id: int | None,
+    *,
+    now: datetime,
+    success: bool,
+    failure_code: str | None = None,
+) -> None:
+    if identity_id is None:
+        return
+    identity = await session.get(CandidateChannelIdentity, identity_id)
+    if identity is None:
+        return
+    if success:
+        identity.last_successful_delivery_at = now
+        identity.reachability_status = "reachable"
+        identity.delivery_health = "healthy"
+        return
+    identity.last_failed_delivery_at = now
+    identity.last_hard_fail_code = failure_code
+    if failure_code in _UNREACHABLE_CODES:
+        identity.reachability_status = "unreachable"
+
+
+async def _fall_back(session: AsyncSession, delivery: MessageDelivery, message: Message, *, now: datetime) -> str:
+    attempted = set(
+        (
+            await session.execute(
+                select(MessageDelivery.channel).where(MessageDelivery.message_id == message.id)
+            )
+        ).scalars().all()
+    )
+    overall = await session.scalar(
+        select(func.max(MessageDelivery.overall_attempt_no)).where(MessageDelivery.message_id == message.id)
+    )
+    route = await _load_route(
+        session,
+        message.candidate_id,
+        application_id=message.application_id,
+        purpose_scope=message.purpose_scope,
+    )
+    next_step = next((step for step in route if step.channel not in attempted), None)
+    if next_step is None:
+        message.intent_status = INTENT_FAILED
+        message.completed_at = now
+        return RESULT_FAILED
+    session.add(
+        _new_delivery(
+            message,
+            next_step,
+            route_order=int(delivery.route_order) + 1,
+            channel_attempt_no=1,
+            overall_attempt_no=int(overall or 0) + 1,
+            due_at=now,
+        )
+    )
+    message.intent_status = INTENT_IN_FLIGHT
+    thread = await session.get(MessageThread, message.thread_id)
+    if thread is not None:
+        thread.current_primary_channel = next_step.channel
+    return RESULT_FALLBACK
+
+
+async def _apply_failure(
+    session: AsyncSession,
+    delivery: MessageDelivery,
+    *,
+    failure_class: str,
+    failure_code: str,
+    retry_policy: RetryPolicy,
+    retry_after: float | None,
+    now: datetime,
+) -> str:
+    message = await session.get(Message, delivery.message_id)
+    delivery.failure_class = failure_class
+    delivery.failure_code = failure_code[:64]
+    delivery.terminal_at = now
+    delivery.next_retry_at = None
+    delivery.delivery_status = DELIVERY_SKIPPED if failure_class == FAILURE_SOFT else DELIVERY_FAILED
+    if message is None:
+        return RESULT_FAILED
+    if failure_class == FAILURE_HARD:
+        await _mark_identity(session, delivery.identity_id, now=now, success=False, failure_code=failure_code)
+    if failure_class == FAILURE_TEMPORARY and int(delivery.channel_attempt_no) < retry_policy.max_attempts_per_channel:
+        overall = await session.scalar(
+            select(func.max(MessageDelivery.overall_attempt_no)).where(MessageDelivery.message_id == message.id)
+        )
+        step = RouteStep(
+            channel=delivery.channel,
+            destination=str(delivery.destination_fingerprint or ""),
+            identity_id=delivery.identity_id,
+        )
+        session.add(
+            _new_delivery(
+                message,
+                step,
+                route_order=int(delivery.route_order),
+                channel_attempt_no=int(delivery.channel_attempt_no) + 1,
+                overall_attempt_no=int(overall or 0) + 1,
+                due_at=now + timedelta(seconds=retry_policy.delay(int(delivery.channel_attempt_no), retry_after)),
+            )
+        )
+        return RESULT_RETRY
+    return await _fall_back(session, delivery, message, now=now)
+
+
+async def complete_delivery(
+    delivery_id: int,
+    outcome: DeliveryOutcome,
+    *,
+    retry_policy: RetryPolicy,
+) -> str:
+    """Record a send attempt; schedules the retry or fallback delivery in the same transaction."""
+    now = datetime.now(UTC)
+    async with async_session() as session:
+        async with session.begin():
+            delivery = await session.get(MessageDelivery, delivery_id, with_for_update=True)
+            if delivery is None or delivery.delivery_status != DELIVERY_SENDING:
+                return RESULT_IGNORED
+            if not outcome.success:
+                return await _apply_failure(
+                    session,
+                    delivery,
+                    failure_class=outcome.failure_class or FAILURE_TEMPORARY,
+                    failure_code=outcome.failure_code or "unknown_error",
+                    retry_policy=retry_policy,
+                    retry_after=outcome.retry_after,
+                    now=now,
+                )
+            delivery.delivery_status = DELIVERY_PROVIDER_ACCEPTED
+            delivery.provider_message_id = outcome.provider_message_id
+            delivery.sent_at = now
+            delivery.next_retry_at = None
+            message = await session.get(Message, delivery.message_id)
+            if message is not None:
+                message.intent_status = INTENT_COMPLETED
+                message.completed_at = now
+                thread = await session.get(MessageThread, message.thread_id)
+                if thread is not None:
+                    thread.current_primary_channel = delivery.channel
+                    thread.last_outbound_at = now
+            return RESULT_SENT
+
+
+async def _store_receipt(session: AsyncSession, values: dict[str, Any]) -> bool:
+    dialect_name = session.get_bind().dialect.name
+    if values.get("provider_event_id") and dialect_name in {"postgresql", "sqlite"}:
+        dialect_insert = pg_insert if dialect_name == "postgresql" else sqlite_insert
+        stmt = (
+            dialect_insert(ProviderReceipt)
+            .values(values)
+            .on_conflict_do_nothing(
+                index_elements=["provider", "provider_event_id"],
+                index_where=ProviderReceipt.provider_event_id.is_not(None),
+            )
+            .returning(ProviderReceipt.id)
+        )
+        return await session.scalar(stmt) is not None
+    duplicate = select(ProviderReceipt.id).where(
+        ProviderReceipt.delivery_id == values["delivery_id"],
+        ProviderReceipt.receipt_type == values["receipt_type"],
+    )
+    if values.get("provider_event_id"):
+        duplicate = duplicate.where(
+            ProviderReceipt.provider == values["provider"],
+            ProviderReceipt.provider_event_id == values["provider_event_id"],
+        )
+    else:
+        duplicate = duplicate.where(ProviderReceipt.occurred_at == values["occurred_at"])
+    if await session.scalar(duplicate.limit(1)) is not None:
+        return False
+    session.add(ProviderReceipt(**values))
+    await session.flush()
+    return True
+
+
+async def ingest_provider_receipt(
+    *,
+    provider: str,
+    receipt_type: str,
+    provider_message_id: str | None,
+    provider_event_id: str | None = None,
+    occurred_at: datetime | None = None,
+    status_code: str | None = None,
+    status_text: str | None = None,
+    failure_class: str | None = None,
+    raw_payload: dict[str, Any] | None = None,
+    retry_policy: RetryPolicy = RetryPolicy(),
+) -> str:
+    """Store a provider receipt once and advance the matching delivery.
+
+    ``delivered``/``read`` move the delivery forward (never backwards) and
+    mark the identity reachable; ``blocked``/``bounced``/``failed`` fail it
+    and trigger the same retry/fallback path as a failed send.
+    """
+    now = datetime.now(UTC)
+    normalized_type = str(receipt_type or "").strip().lower()
+    async with async_session() as session:
+        async with session.begin():
+            delivery = await session.scalar(
+                select(MessageDelivery)
+                .where(
+                    MessageDelivery.provider == provider,
+                    MessageDelivery.provider_message_id == provider_message_id,
+                )
+                .order_by(MessageDelivery.id.desc())
+                .limit(1)
+                .with_for_update()
+            )
+            if delivery is None or not provider_message_id:
+                return RECEIPT_UNMATCHED
+            failure_code = _HARD_RECEIPTS.get(normalized_type) or (status_code or "provider_failed")
+            is_failure = normalized_type in {"failed", *_HARD_RECEIPTS}
+            normalized_class = (
+                (FAILURE_HARD if normalized_type in _HARD_RECEIPTS else failure_class or FAILURE_HARD)
+                if is_failure
+                else None
+            )
+            stored = await _store_receipt(
+                session,
+                {
+                    "delivery_id": delivery.id,
+                    "message_id": delivery.message_id,
+                    "channel": delivery.channel,
+                    "provider": provider,
+                    "provider_message_id": provider_message_id,
+                    "provider_event_id": provider_event_id,
+                    "receipt_type": normalized_type,
+                    "provider_status_code": status_code,
+                    "provider_status_text": status_text,
+                    "normalized_failure_class": normalized_class,
+                    "normalized_failure_code": failure_code if is_failure else None,
+                    "raw_payload_json": raw_payload,
+                    "occurred_at": occurred_at or now,
+                    "received_at": now,
+                },
+            )
+            if not stored:
+                return RECEIPT_DUPLICATE
+
+            current = delivery.delivery_status
+            if is_failure:
+                if current in _DELIVERY_PROGRESS:
+                    await _apply_failure(
+                        session,
+                        delivery,
+                        failure_class=normalized_class or FAILURE_HARD,
+                        failure_code=failure_code,
+                        retry_policy=retry_policy,
+                        retry_after=None,
+                        now=now,
+                    )
+                return RECEIPT_APPLIED
+
+            target = {
+                "accepted": DELIVERY_PROVIDER_ACCEPTED,
+                "delivered": DELIVERY_DELIVERED,
+                "read": DELIVERY_READ,
+            }.get(normalized_type)
+            if target is not None and current in _DELIVERY_PROGRESS:
+                if _DELIVERY_PROGRESS[target] > _DELIVERY_PROGRESS[current]:
+                    delivery.delivery_status = target
+                    delivery.next_retry_at = None
+                    delivery.sent_at = delivery.sent_at or occurred_at or now
+                if target in {DELIVERY_DELIVERED, DELIVERY_READ}:
+                    await _mark_identity(session, delivery.identity_id, now=now, success=True)
+                message = await session.get(Message, delivery.message_id)
+                if message is not None and message.intent_status != INTENT_COMPLETED:
+                    message.intent_status = INTENT_COMPLETED
+                    message.completed_at = now
+            return RECEIPT_APPLIED
+
+
+__all__ = [
+    "CHANNEL_MAX",
+    "CHANNEL_TELEGRAM",
+    "CHANNEL_WEB",
+    "DEFAULT_ROUTE",
+    "DELIVERY_DELIVERED",
+    "DELIVERY_FAILED",
+    "DELIVERY_PLANNED",
+    "DELIVERY_PROVIDER_ACCEPTED",
+    "DELIVERY_READ",
+    "DELIVERY_SENDING",
+    "DELIVERY_SKIPPED",
+    "FAILURE_HARD",
+    "FAILURE_SOFT",
+    "FAILURE_TEMPORARY",
+    "INTENT_COMPLETED",
+    "INTENT_FAILED",
+    "INTENT_IN_FLIGHT",
+    "ClaimedDelivery",
+    "DeliveryOutcome",
+    "RetryPolicy",
+    "RouteStep",
+    "claim_due_deliveries",
+    "complete_delivery",
+    "enqueue_message",
+    "ingest_provider_receipt",
+    "plan_route",
+]
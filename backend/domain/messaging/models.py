@@ -22,6 +22,10 @@ from sqlalchemy import (
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
+# SQLite only autoincrements INTEGER PRIMARY KEY columns (tests, local dev).
+_BIGINT_PK = BigInteger().with_variant(Integer, "sqlite")
+
+
 def _uuid_str() -> str:
     return str(uuid.uuid4())
 
@@ -34,7 +38,7 @@ class MessageThread(Base):
         Index("ix_message_threads_status_updated", "status", "updated_at"),
     )
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(_BIGINT_PK, primary_key=True, autoincrement=True)
     thread_uuid: Mapped[str] = mapped_column(
         String(36), nullable=False, default=_uuid_str, index=True
     )
@@ -113,7 +117,7 @@ class Message(Base):
         Index("ix_messages_dedupe_created", "dedupe_scope_key", "created_at"),
     )
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(_BIGINT_PK, primary_key=True, autoincrement=True)
     message_uuid: Mapped[str] = mapped_column(
         String(36), nullable=False, default=_uuid_str, index=True
     )
@@ -201,7 +205,7 @@ class MessageDelivery(Base):
         Index("ix_message_deliveries_provider_message", "provider", "provider_message_id"),
     )
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(_BIGINT_PK, primary_key=True, autoincrement=True)
     delivery_uuid: Mapped[str] = mapped_column(
         String(36), nullable=False, default=_uuid_str, index=True
     )
@@ -281,7 +285,7 @@ class ProviderReceipt(Base):
         Index("ix_provider_receipts_provider_message", "provider", "provider_message_id"),
     )
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(_BIGINT_PK, primary_key=True, autoincrement=True)
     receipt_uuid: Mapped[str] = mapped_column(
         String(36), nullable=False, default=_uuid_str, index=True
     )
@@ -341,7 +345,7 @@ class CandidateContactPolicy(Base):
         Index("ix_candidate_contact_policies_do_not_contact_updated", "do_not_contact", "updated_at"),
     )
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(_BIGINT_PK, primary_key=True, autoincrement=True)
     candidate_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("users.id", ondelete="CASCADE"),
@@ -387,7 +391,7 @@ class ChannelHealthRegistry(Base):
         Index("ix_channel_health_registry_health_updated", "health_status", "updated_at"),
     )
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(_BIGINT_PK, primary_key=True, autoincrement=True)
     channel: Mapped[str] = mapped_column(String(32), nullable=False)
     provider: Mapped[str] = mapped_column(String(32), nullable=False)
     runtime_surface: Mapped[str] = mapped_column(String(32), nullable=False)
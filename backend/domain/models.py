@@ -38,6 +38,9 @@ DEFAULT_INTRO_DAY_DURATION_MIN = 60  # Intro day slots remain 1 hour by default
 SLOT_MIN_DURATION_MIN = 10  # Minimum 10 minutes
 SLOT_MAX_DURATION_MIN = 240  # Maximum 4 hours
 
+# Predicate of the partial "active slot" indexes (see migration 0112).
+_ACTIVE_SLOT_STATUS_SQL = "status IN ('pending', 'booked', 'confirmed', 'confirmed_by_candidate')"
+
 
 _TIMEZONE_ALIASES = {
     "europe/tomsk": "Asia/Tomsk",
@@ -387,6 +390,19 @@ class Slot(Base):
         Index("ix_slots_recruiter_start", "recruiter_id", "start_utc"),
         Index("ix_slots_candidate_id", "candidate_id"),
         Index("ix_slots_city_id", "city_id"),
+        # Reservation duplicate checks: a candidate's active slots only.
+        Index(
+            "ix_slots_active_candidate_id",
+            "candidate_id",
+            postgresql_where=text(_ACTIVE_SLOT_STATUS_SQL),
+            sqlite_where=text(_ACTIVE_SLOT_STATUS_SQL),
+        ),
+        Index(
+            "ix_slots_active_candidate_tg_id",
+            "candidate_tg_id",
+            postgresql_where=text(_ACTIVE_SLOT_STATUS_SQL),
+            sqlite_where=text(_ACTIVE_SLOT_STATUS_SQL),
+        ),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -447,6 +463,10 @@ class Slot(Base):
         raw_value = value.value if hasattr(value, "value") else value
         return str(raw_value).strip().lower()
 
+    @validates("purpose")
+    def _normalize_purpose(self, _key, value: Optional[str]) -> str:
+        return str(value or "interview").strip().lower()
+
     @validates("tz_name")
     def _validate_slot_timezone(self, _key, value: Optional[str]) -> str:
         return validate_timezone_name(value)
@@ -545,6 +565,7 @@ class SlotReservationLock(Base):
             unique=True,
         ),
         Index("ix_slot_reservation_locks_candidate_id", "candidate_id"),
+        Index("ix_slot_reservation_locks_expires_at", "expires_at"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -1028,6 +1049,57 @@ class KPIWeekly(Base):
         )
 
 
+class KPIWeeklyContribution(Base):
+    """Which weekly KPI member a slot or test result currently contributes to."""
+
+    __tablename__ = "kpi_weekly_contributions"
+    __table_args__ = (
+        Index("ix_kpi_weekly_contributions_week", "tz", "week_start"),
+        Index("ix_kpi_weekly_contributions_candidate", "source_type", "candidate_key"),
+    )
+
+    source_type: Mapped[str] = mapped_column(String(16), primary_key=True)
+    source_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    metric: Mapped[str] = mapped_column(String(32), primary_key=True)
+    tz: Mapped[str] = mapped_column(String(64), primary_key=True)
+    week_start: Mapped[date] = mapped_column(Date, nullable=False)
+    candidate_key: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    recruiter_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+
+class KPIWeeklyMember(Base):
+    """Distinct candidate counted by a weekly KPI, with a reference count of sources."""
+
+    __tablename__ = "kpi_weekly_members"
+
+    tz: Mapped[str] = mapped_column(String(64), primary_key=True)
+    week_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    metric: Mapped[str] = mapped_column(String(32), primary_key=True)
+    scope_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    candidate_key: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    refs: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class KPICounterState(Base):
+    """Per-timezone bookkeeping for the materialized weekly KPI counters."""
+
+    __tablename__ = "kpi_counter_state"
+
+    tz: Mapped[str] = mapped_column(String(64), primary_key=True)
+    materialized_since: Mapped[date] = mapped_column(Date, nullable=False)
+    finalized_week_start: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    reconciled_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class ContentVersion(Base):
+    """Revision counter of admin-editable content, bumped in the writing transaction."""
+
+    __tablename__ = "content_versions"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
 class OutboxNotification(Base):
     __tablename__ = "outbox_notifications"
     __table_args__ = (
@@ -1077,6 +1149,35 @@ class OutboxNotification(Base):
         return f"<OutboxNotification {self.type} booking={self.booking_id} status={self.status}>"
 
 
+class MaxWebhookUpdate(Base):
+    """Raw MAX webhook update persisted before asynchronous processing."""
+
+    __tablename__ = "max_webhook_updates"
+    __table_args__ = (
+        UniqueConstraint("update_key", name="uq_max_webhook_updates_update_key"),
+        Index("ix_max_webhook_updates_status_next_attempt", "status", "next_attempt_at"),
+        Index("ix_max_webhook_updates_user_status", "max_user_id", "status", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    update_key: Mapped[str] = mapped_column(String(64), nullable=False)
+    update_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    max_user_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    payload_json: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="pending")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    received_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+    locked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    next_attempt_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:  # pragma: no cover - repr helper
+        return f"<MaxWebhookUpdate {self.update_type} key={self.update_key} status={self.status}>"
+
+
 class ManualSlotAuditLog(Base):
     """Audit log for manually assigned slots via admin UI."""
     __tablename__ = "manual_slot_audit_logs"
@@ -1291,7 +1392,7 @@ class CandidateChannelIdentity(Base):
         ),
     )
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
     candidate_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
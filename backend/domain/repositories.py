@@ -4,7 +4,7 @@ import re
 import uuid
 import asyncio
 from collections.abc import Iterable
-from dataclasses import MISSING, dataclass
+from dataclasses import MISSING, dataclass, field
 from datetime import UTC, datetime, timedelta
 from typing import Any, Literal
 
@@ -541,6 +541,8 @@ async def get_message_template(
 class ReservationResult:
     status: Literal["reserved", "slot_taken", "duplicate_candidate", "already_reserved"]
     slot: Slot | None = None
+    # Nearest free slots of the same recruiter/purpose, filled for ``slot_taken``.
+    alternatives: list[Slot] = field(default_factory=list)
 
 
 @dataclass
@@ -1580,6 +1582,74 @@ async def reserve_slot(
         )
 
 
+_RESERVATION_ALTERNATIVES_LIMIT = 6
+
+
+class _SlotClaimLost(Exception):
+    """Another reservation claimed the slot first; rolls the attempt back."""
+
+
+async def _reservation_alternatives(
+    session: AsyncSession,
+    *,
+    slot_id: int,
+    recruiter_id: int | None,
+    purpose: str,
+    city_id: int | None,
+    now_utc: datetime,
+) -> list[Slot]:
+    """Nearest free future slots to offer instead of a lost one."""
+    if recruiter_id is None:
+        # Plain read: never waits for the row lock the winner holds.
+        recruiter_id = await session.scalar(select(Slot.recruiter_id).where(Slot.id == slot_id))
+        if recruiter_id is None:
+            return []
+    query = (
+        select(Slot)
+        .where(
+            Slot.recruiter_id == recruiter_id,
+            Slot.status == SlotStatus.FREE,
+            Slot.purpose == purpose,
+            Slot.start_utc > now_utc,
+            Slot.id != slot_id,
+        )
+        .order_by(Slot.start_utc.asc())
+        .limit(_RESERVATION_ALTERNATIVES_LIMIT)
+    )
+    if city_id is not None:
+        query = query.where(Slot.city_id == city_id)
+    alternatives = list(await session.scalars(query))
+    for item in alternatives:
+        item.start_utc = _to_aware_utc(item.start_utc)
+    return alternatives
+
+
+async def sweep_expired_reservation_locks(
+    now_utc: datetime | None = None,
+    *,
+    batch_size: int = 1000,
+) -> int:
+    """Delete expired reservation locks in short batches; returns the count."""
+    now_utc = now_utc or datetime.now(UTC)
+    deleted = 0
+    while True:
+        async with async_session() as session:
+            async with session.begin():
+                ids = list(
+                    await session.scalars(
+                        select(SlotReservationLock.id)
+                        .where(SlotReservationLock.expires_at <= now_utc)
+                        .order_by(SlotReservationLock.expires_at.asc())
+                        .limit(batch_size)
+                    )
+                )
+                if ids:
+                    await session.execute(delete(SlotReservationLock).where(SlotReservationLock.id.in_(ids)))
+        deleted += len(ids)
+        if len(ids) < batch_size:
+            return deleted
+
+
 async def _reserve_slot_impl(
     slot_id: int,
     candidate_tg_id: int | None,
@@ -1613,15 +1683,27 @@ async def _reserve_slot_impl(
                 if candidate_uuid is None:
                     candidate_uuid = f"tg:{candidate_tg_id}" if candidate_tg_id is not None else str(uuid.uuid4())
 
+                # A slot another reservation holds right now is skipped rather
+                # than waited for: the loser answers at once with alternatives.
                 slot = await session.scalar(
                     select(Slot)
                     .options(selectinload(Slot.recruiter), selectinload(Slot.city))
                     .where(Slot.id == slot_id)
-                    .with_for_update()
+                    .with_for_update(skip_locked=True)
                 )
 
                 if not slot:
-                    return ReservationResult(status="slot_taken")
+                    return ReservationResult(
+                        status="slot_taken",
+                        alternatives=await _reservation_alternatives(
+                            session,
+                            slot_id=slot_id,
+                            recruiter_id=expected_recruiter_id,
+                            purpose=slot_purpose,
+                            city_id=expected_city_id,
+                            now_utc=now_utc,
+                        ),
+                    )
 
                 slot_recruiter_id = slot.recruiter_id
 
@@ -1633,7 +1715,18 @@ async def _reserve_slot_impl(
                 # Не позволяем бронировать слоты, которые уже в прошлом.
                 slot_start = _to_aware_utc(slot.start_utc)
                 if slot_start <= now_utc:
-                    return ReservationResult(status="slot_taken", slot=slot)
+                    return ReservationResult(
+                        status="slot_taken",
+                        slot=slot,
+                        alternatives=await _reservation_alternatives(
+                            session,
+                            slot_id=slot.id,
+                            recruiter_id=slot.recruiter_id,
+                            purpose=slot_purpose,
+                            city_id=expected_city_id,
+                            now_utc=now_utc,
+                        ),
+                    )
 
                 if status_value != SlotStatus.FREE:
                     if (
@@ -1646,7 +1739,18 @@ async def _reserve_slot_impl(
                     ):
                         slot.start_utc = _to_aware_utc(slot.start_utc)
                         return ReservationResult(status="already_reserved", slot=slot)
-                    return ReservationResult(status="slot_taken", slot=slot)
+                    return ReservationResult(
+                        status="slot_taken",
+                        slot=slot,
+                        alternatives=await _reservation_alternatives(
+                            session,
+                            slot_id=slot.id,
+                            recruiter_id=slot.recruiter_id,
+                            purpose=slot_purpose,
+                            city_id=expected_city_id,
+                            now_utc=now_utc,
+                        ),
+                    )
 
                 if expected_recruiter_id is not None and slot.recruiter_id != expected_recruiter_id:
                     return ReservationResult(status="slot_taken")
@@ -1654,20 +1758,29 @@ async def _reserve_slot_impl(
                 if expected_city_id is not None and slot.city_id != expected_city_id:
                     return ReservationResult(status="slot_taken")
 
-                # Cross-purpose guard: candidate cannot hold active interview + intro_day at the same time.
+                # One indexed lookup of the candidate's active slots (partial
+                # indexes on candidate_id / candidate_tg_id) serves both
+                # duplicate rules below.
                 candidate_match = [Slot.candidate_id == candidate_uuid]
                 if candidate_tg_id is not None:
                     candidate_match.append(Slot.candidate_tg_id == candidate_tg_id)
-                cross_purpose_active = await session.scalar(
-                    select(Slot)
-                    .options(selectinload(Slot.recruiter), selectinload(Slot.city))
-                    .where(
-                        Slot.id != slot.id,
-                        or_(*candidate_match),
-                        func.lower(Slot.purpose) != slot_purpose,
-                        func.lower(Slot.status).in_(list(_ACTIVE_SLOT_STATUSES)),
+                active_slots = list(
+                    await session.scalars(
+                        select(Slot)
+                        .options(selectinload(Slot.recruiter), selectinload(Slot.city))
+                        .where(
+                            or_(*candidate_match),
+                            Slot.status.in_(list(_ACTIVE_SLOT_STATUSES)),
+                            Slot.id != slot.id,
+                        )
+                        .order_by(Slot.start_utc.asc())
                     )
-                    .order_by(Slot.start_utc.asc())
+                )
+
+                # Cross-purpose guard: candidate cannot hold active interview + intro_day at the same time.
+                cross_purpose_active = next(
+                    (item for item in active_slots if (item.purpose or "interview").lower() != slot_purpose),
+                    None,
                 )
                 if cross_purpose_active:
                     cross_purpose_active.start_utc = _to_aware_utc(cross_purpose_active.start_utc)
@@ -1675,16 +1788,15 @@ async def _reserve_slot_impl(
 
                 # Keep legacy interview duplicate rule: same candidate + same recruiter + same purpose.
                 # If allow_candidate_replace=True, free the existing slot and continue booking.
-                existing_active = await session.scalar(
-                    select(Slot)
-                    .options(selectinload(Slot.recruiter), selectinload(Slot.city))
-                    .where(
-                        Slot.candidate_id == candidate_uuid,
-                        Slot.recruiter_id == slot.recruiter_id,  # Same recruiter only
-                        func.lower(Slot.purpose) == slot_purpose,
-                        Slot.id != slot.id,
-                        func.lower(Slot.status).in_(list(_ACTIVE_SLOT_STATUSES)),
-                    )
+                existing_active = next(
+                    (
+                        item
+                        for item in active_slots
+                        if item.candidate_id == candidate_uuid
+                        and item.recruiter_id == slot.recruiter_id  # Same recruiter only
+                        and (item.purpose or "interview").lower() == slot_purpose
+                    ),
+                    None,
                 )
                 if existing_active:
                     if allow_candidate_replace:
@@ -1707,8 +1819,18 @@ async def _reserve_slot_impl(
 
                 reservation_date = _to_aware_utc(slot.start_utc).date()
 
+                # Expired locks are swept in the background; only this
+                # candidate's own stale lock for the day may block the insert.
+                lock_owner = [SlotReservationLock.candidate_id == candidate_uuid]
+                if candidate_tg_id is not None:
+                    lock_owner.append(SlotReservationLock.candidate_tg_id == candidate_tg_id)
                 await session.execute(
-                    delete(SlotReservationLock).where(SlotReservationLock.expires_at <= now_utc)
+                    delete(SlotReservationLock).where(
+                        or_(*lock_owner),
+                        SlotReservationLock.recruiter_id == slot.recruiter_id,
+                        SlotReservationLock.reservation_date == reservation_date,
+                        SlotReservationLock.expires_at <= now_utc,
+                    )
                 )
 
                 existing_lock = await session.scalar(
@@ -1732,6 +1854,18 @@ async def _reserve_slot_impl(
                         return ReservationResult(status="already_reserved", slot=existing_slot)
                     await session.delete(existing_lock)
 
+                # Compare-and-set claim: of the reservations that all saw the
+                # slot free, exactly one matches. Without row locks (SQLite)
+                # this is what keeps the slot from being booked twice.
+                claimed = await session.execute(
+                    update(Slot)
+                    .where(Slot.id == slot.id, Slot.status == SlotStatus.FREE)
+                    .values(status=SlotStatus.PENDING)
+                    .execution_options(synchronize_session=False)
+                )
+                if claimed.rowcount != 1:
+                    raise _SlotClaimLost()
+
                 slot.status = SlotStatus.PENDING
                 slot.candidate_id = candidate_uuid
                 slot.candidate_tg_id = candidate_tg_id
@@ -1756,6 +1890,19 @@ async def _reserve_slot_impl(
                     city = await session.get(City, candidate_city_id)
                     if city:
                         city_name = city.name_plain
+        except _SlotClaimLost:
+            # The transaction is rolled back (including a replaced booking).
+            return ReservationResult(
+                status="slot_taken",
+                alternatives=await _reservation_alternatives(
+                    session,
+                    slot_id=slot_id,
+                    recruiter_id=slot_recruiter_id,
+                    purpose=slot_purpose,
+                    city_id=expected_city_id,
+                    now_utc=now_utc,
+                ),
+            )
         except IntegrityError:
             await session.rollback()
             if candidate_tg_id is None:
@@ -1766,7 +1913,7 @@ async def _reserve_slot_impl(
                     .options(selectinload(Slot.recruiter), selectinload(Slot.city))
                     .where(
                         Slot.candidate_tg_id == candidate_tg_id,
-                        func.lower(Slot.status).in_(list(_ACTIVE_SLOT_STATUSES)),
+                        Slot.status.in_(list(_ACTIVE_SLOT_STATUSES)),
                     )
                     .order_by(Slot.start_utc.asc())
                 )
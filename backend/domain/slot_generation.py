@@ -0,0 +1,306 @@
+"""Set-based slot generation.
+
+Slot start times for a whole date range are planned with one timezone offset
+lookup per day and written with chunked multi-row ``INSERT ... ON CONFLICT DO
+NOTHING`` statements. Rows rejected by the overlap constraint are reported one by
+one instead of rolling back the whole batch.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Any
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.timezone_utils import parse_timezone
+from backend.domain.models import SLOT_MIN_DURATION_MIN, Slot, SlotStatus
+
+__all__ = [
+    "INSERT_CHUNK_ROWS",
+    "SlotGenerationReport",
+    "SlotTemplate",
+    "insert_generated_slots",
+    "plan_slot_starts",
+]
+
+# Slot has ~12 insertable columns; 1000 rows keeps a statement well below the
+# 32767 bind-parameter limit of asyncpg/libpq.
+INSERT_CHUNK_ROWS = 1000
+
+_MINUTES_PER_DAY = 24 * 60
+
+
+@dataclass(frozen=True, slots=True)
+class SlotTemplate:
+    """Working-hours template expanded into slots for every matching day."""
+
+    start_date: date
+    end_date: date
+    window_start: time
+    window_end: time
+    step_min: int
+    include_weekends: bool = False
+    break_start: time | None = None
+    break_end: time | None = None
+    duration_min: int | None = None
+    # ``False`` keeps one step grid across the whole window and drops starts that
+    # fall inside the break (bulk_create_slots); ``True`` restarts the grid at
+    # ``break_end`` so afternoon slots start on the hour (default working day).
+    restart_after_break: bool = False
+
+    @property
+    def slot_duration_min(self) -> int:
+        return max(self.duration_min or self.step_min, SLOT_MIN_DURATION_MIN)
+
+    def minute_offsets(self) -> list[int]:
+        """Local minute-of-day offsets of every slot start, computed once per template."""
+        start = self.window_start.hour * 60 + self.window_start.minute
+        end = self.window_end.hour * 60 + self.window_end.minute
+        pause: tuple[int, int] | None = None
+        if self.break_start is not None and self.break_end is not None:
+            pause_start = self.break_start.hour * 60 + self.break_start.minute
+            pause_end = self.break_end.hour * 60 + self.break_end.minute
+            if pause_start < pause_end:
+                pause = (pause_start, pause_end)
+        end = min(end, _MINUTES_PER_DAY)
+        step = max(self.step_min, 1)
+        if pause is not None and self.restart_after_break:
+            return list(range(start, min(pause[0], end), step)) + list(
+                range(max(pause[1], start), end, step)
+            )
+        return [
+            minute
+            for minute in range(start, end, step)
+            if pause is None or not (pause[0] <= minute < pause[1])
+        ]
+
+    def days(self) -> Iterable[date]:
+        current = self.start_date
+        while current <= self.end_date:
+            if self.include_weekends or current.weekday() < 5:
+                yield current
+            current += timedelta(days=1)
+
+
+@dataclass(slots=True)
+class SlotGenerationReport:
+    """Per-recruiter outcome of a generation run."""
+
+    recruiter_id: int
+    planned: int = 0
+    created_ids: list[int] = field(default_factory=list)
+    skipped_existing: list[datetime] = field(default_factory=list)
+    conflicts: list[datetime] = field(default_factory=list)
+
+    @property
+    def created(self) -> int:
+        return len(self.created_ids)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "recruiter_id": self.recruiter_id,
+            "planned": self.planned,
+            "created": self.created,
+            "skipped_existing": len(self.skipped_existing),
+            "conflicts": [dt.isoformat() for dt in self.conflicts],
+        }
+
+
+def plan_slot_starts(
+    template: SlotTemplate,
+    tz_name: str | None,
+    *,
+    now: datetime | None = None,
+) -> list[datetime]:
+    """Return UTC-aware slot starts for ``template`` in the ``tz_name`` wall clock.
+
+    The UTC offset is resolved once per day; only days whose offset changes inside
+    the working window (DST switch) fall back to per-slot conversion. Starts at or
+    before ``now`` are dropped, mirroring ``ensure_slot_not_in_past``.
+    """
+    tz = parse_timezone(tz_name)
+    offsets = template.minute_offsets()
+    if not offsets:
+        return []
+    cutoff = now.astimezone(UTC) if now is not None else datetime.now(UTC)
+    first_minute, last_minute = offsets[0], offsets[-1]
+
+    seen: set[datetime] = set()
+    planned: list[datetime] = []
+    for day in template.days():
+        first_local = datetime.combine(day, time(*divmod(first_minute, 60)), tzinfo=tz)
+        last_local = datetime.combine(day, time(*divmod(last_minute, 60)), tzinfo=tz)
+        day_offset = first_local.utcoffset()
+        if day_offset == last_local.utcoffset():
+            midnight_utc = datetime(day.year, day.month, day.day, tzinfo=UTC) - day_offset
+            starts: Iterable[datetime] = (
+                midnight_utc + timedelta(minutes=minute) for minute in offsets
+            )
+        else:
+            starts = (
+                datetime.combine(day, time(*divmod(minute, 60)), tzinfo=tz).astimezone(UTC)
+                for minute in offsets
+            )
+        for start in starts:
+            if start <= cutoff or start in seen:
+                continue
+            seen.add(start)
+            planned.append(start)
+    return planned
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def _purpose_key(value: str | None) -> str:
+    return (value or "interview").strip().lower()
+
+
+class _ExistingSlots:
+    """Existing slots of one recruiter, sorted by start for overlap lookups."""
+
+    __slots__ = ("starts", "rows", "max_duration")
+
+    def __init__(self, rows: Sequence[tuple[datetime, int, str]]):
+        ordered = sorted(rows, key=lambda row: row[0])
+        self.rows = ordered
+        self.starts = [row[0] for row in ordered]
+        self.max_duration = max((row[1] for row in ordered), default=SLOT_MIN_DURATION_MIN)
+
+    def has_exact(self, start: datetime) -> bool:
+        idx = bisect_left(self.starts, start)
+        return idx < len(self.starts) and self.starts[idx] == start
+
+    def overlaps(self, start: datetime, duration_min: int, purpose: str) -> bool:
+        if purpose == "intro_day":
+            return False
+        end = start + timedelta(minutes=duration_min)
+        lower = start - timedelta(minutes=self.max_duration)
+        idx = bisect_left(self.starts, end)
+        while idx > 0:
+            idx -= 1
+            existing_start, existing_duration, existing_purpose = self.rows[idx]
+            if existing_start <= lower:
+                break
+            if existing_purpose != purpose:
+                continue
+            if start < existing_start + timedelta(minutes=existing_duration):
+                return True
+        return False
+
+
+async def _load_existing(
+    session: AsyncSession,
+    recruiter_ids: Sequence[int],
+    range_start: datetime,
+    range_end: datetime,
+) -> dict[int, _ExistingSlots]:
+    # One range query for every recruiter; widened by a day so long slots that
+    # started before the range still participate in overlap checks.
+    rows = await session.execute(
+        select(Slot.recruiter_id, Slot.start_utc, Slot.duration_min, Slot.purpose).where(
+            Slot.recruiter_id.in_(list(recruiter_ids)),
+            Slot.start_utc >= range_start - timedelta(days=1),
+            Slot.start_utc <= range_end + timedelta(days=1),
+        )
+    )
+    grouped: dict[int, list[tuple[datetime, int, str]]] = {rid: [] for rid in recruiter_ids}
+    for recruiter_id, start_utc, duration_min, purpose in rows:
+        if start_utc is None:
+            continue
+        grouped.setdefault(recruiter_id, []).append(
+            (
+                _as_utc(start_utc),
+                max(duration_min or SLOT_MIN_DURATION_MIN, SLOT_MIN_DURATION_MIN),
+                _purpose_key(purpose),
+            )
+        )
+    return {rid: _ExistingSlots(items) for rid, items in grouped.items()}
+
+
+def _insert_factory(session: AsyncSession):
+    bind = session.get_bind()
+    dialect_name = bind.dialect.name if bind is not None else ""
+    if dialect_name == "postgresql":
+        return dialect_name, pg_insert
+    if dialect_name == "sqlite":
+        return dialect_name, sqlite_insert
+    return dialect_name, None
+
+
+async def insert_generated_slots(
+    session: AsyncSession,
+    plans: Mapping[int, Sequence[datetime]],
+    *,
+    row_defaults: Mapping[int, Mapping[str, Any]],
+    duration_min: int,
+    purpose: str = "interview",
+) -> dict[int, SlotGenerationReport]:
+    """Insert planned slots for several recruiters in chunked multi-row statements.
+
+    ``plans`` maps recruiter id to planned UTC starts; ``row_defaults`` carries the
+    per-recruiter column values (city, tz names). Exact duplicates of existing
+    slots are skipped, rows violating the recruiter overlap rule are reported in
+    ``conflicts`` and everything else is created. The caller owns the commit.
+    """
+    reports = {rid: SlotGenerationReport(recruiter_id=rid, planned=len(starts)) for rid, starts in plans.items()}
+    all_starts = [start for starts in plans.values() for start in starts]
+    if not all_starts:
+        return reports
+
+    purpose_key = _purpose_key(purpose)
+    existing = await _load_existing(session, list(plans), min(all_starts), max(all_starts))
+    dialect_name, insert_factory = _insert_factory(session)
+    status_free = getattr(SlotStatus.FREE, "value", SlotStatus.FREE)
+
+    pending: list[dict[str, Any]] = []
+    for recruiter_id, starts in plans.items():
+        report = reports[recruiter_id]
+        known = existing.get(recruiter_id) or _ExistingSlots([])
+        defaults = dict(row_defaults.get(recruiter_id) or {})
+        for start in starts:
+            if known.has_exact(start):
+                report.skipped_existing.append(start)
+                continue
+            # PostgreSQL enforces overlaps through slots_no_recruiter_time_overlap_excl
+            # and ON CONFLICT DO NOTHING; other backends rely on this pre-check.
+            if dialect_name != "postgresql" and known.overlaps(start, duration_min, purpose_key):
+                report.conflicts.append(start)
+                continue
+            pending.append(
+                {
+                    **defaults,
+                    "recruiter_id": recruiter_id,
+                    "start_utc": start,
+                    "duration_min": duration_min,
+                    "purpose": purpose,
+                    "status": status_free,
+                }
+            )
+
+    for offset in range(0, len(pending), INSERT_CHUNK_ROWS):
+        chunk = pending[offset : offset + INSERT_CHUNK_ROWS]
+        if insert_factory is not None:
+            stmt = insert_factory(Slot).values(chunk).on_conflict_do_nothing()
+        else:
+            stmt = insert(Slot).values(chunk)
+        result = await session.execute(stmt.returning(Slot.id, Slot.recruiter_id, Slot.start_utc))
+        inserted: set[tuple[int, datetime]] = set()
+        for slot_id, recruiter_id, start_utc in result:
+            reports[recruiter_id].created_ids.append(slot_id)
+            inserted.add((recruiter_id, _as_utc(start_utc)))
+        for row in chunk:
+            key = (row["recruiter_id"], row["start_utc"])
+            if key not in inserted:
+                reports[row["recruiter_id"]].conflicts.append(row["start_utc"])
+    return reports
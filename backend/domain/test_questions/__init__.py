@@ -1,5 +1,5 @@
 """Helpers for working with test questions."""
 
-from .services import load_all_test_questions, load_test_questions
+from .services import load_all_test_questions, load_all_test_questions_async, load_test_questions
 
-__all__ = ["load_all_test_questions", "load_test_questions"]
+__all__ = ["load_all_test_questions", "load_all_test_questions_async", "load_test_questions"]
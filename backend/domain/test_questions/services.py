@@ -1,4 +1,4 @@
-"""Synchronous helpers for reading question bank entries."""
+"""Helpers for reading question bank entries (sync and async)."""
 
 from __future__ import annotations
 
@@ -9,7 +9,7 @@ import sqlalchemy as sa
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
-from backend.core.db import sync_session
+from backend.core.db import async_session, sync_session
 from backend.domain.tests.models import Test, Question, AnswerOption
 
 
@@ -46,19 +46,11 @@ def load_test_questions(test_id: str, *, include_inactive: bool = False) -> List
     return result
 
 
-def load_all_test_questions(*, include_inactive: bool = False) -> Dict[str, List[Dict[str, object]]]:
-    """Return questions grouped by test id with defaults as fallback."""
+def _all_tests_stmt():
+    return select(Test).options(selectinload(Test.questions).selectinload(Question.answer_options))
 
-    with sync_session() as session:
-        # Fetch all tests and questions
-        stmt = (
-            select(Test)
-            .options(
-                selectinload(Test.questions).selectinload(Question.answer_options)
-            )
-        )
-        tests = session.execute(stmt).scalars().all()
-        
+
+def _group_questions(tests, *, include_inactive: bool) -> Dict[str, List[Dict[str, object]]]:
     grouped: Dict[str, List[Dict[str, object]]] = {}
     
     for t in tests:
@@ -75,6 +67,22 @@ def load_all_test_questions(*, include_inactive: bool = False) -> Dict[str, List
     return grouped
 
 
+def load_all_test_questions(*, include_inactive: bool = False) -> Dict[str, List[Dict[str, object]]]:
+    """Return questions grouped by test id with defaults as fallback."""
+
+    with sync_session() as session:
+        tests = session.execute(_all_tests_stmt()).scalars().all()
+        return _group_questions(tests, include_inactive=include_inactive)
+
+
+async def load_all_test_questions_async(*, include_inactive: bool = False) -> Dict[str, List[Dict[str, object]]]:
+    """``load_all_test_questions`` on the async engine (does not block the event loop)."""
+
+    async with async_session() as session:
+        tests = (await session.execute(_all_tests_stmt())).scalars().all()
+        return _group_questions(tests, include_inactive=include_inactive)
+
+
 def _format_question(q: Question) -> Dict[str, Any]:
     # Base payload from JSON column
     data = dict(q.payload or {})
@@ -121,4 +129,4 @@ def _format_question(q: Question) -> Dict[str, Any]:
     return data
 
 
-__all__ = ["load_all_test_questions", "load_test_questions"]
+__all__ = ["load_all_test_questions", "load_all_test_questions_async", "load_test_questions"]
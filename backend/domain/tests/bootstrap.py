@@ -2,6 +2,7 @@ import logging
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.domain.content_versions import QUESTIONS_BANK, bump_content_version
 from backend.domain.tests.models import Test, Question, AnswerOption
 
 logger = logging.getLogger(__name__)
@@ -141,7 +142,8 @@ async def bootstrap_test_questions(session: AsyncSession) -> None:
     Populate the database with default test questions if they don't exist.
     """
     logger.info("Checking for default test questions...")
-    
+    created = False
+
     for test_slug, questions_data in DEFAULT_TEST_QUESTIONS.items():
         # Check if test exists
         result = await session.execute(select(Test).where(Test.slug == test_slug))
@@ -206,6 +208,9 @@ async def bootstrap_test_questions(session: AsyncSession) -> None:
                             sort_order=opt_idx,
                         )
                         session.add(answer)
-            
+            created = True
+
+    if created:
+        await bump_content_version(session, QUESTIONS_BANK)
     await session.commit()
     logger.info("Test questions bootstrap complete.")
@@ -0,0 +1,62 @@
+"""Add durable ingest queue for MAX webhook updates.
+
+This migration is additive-only:
+- it creates max_webhook_updates, used when MAX_WEBHOOK_INGEST_MODE=queue;
+- the inline webhook path keeps working without it.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+
+from backend.migrations.utils import index_exists, table_exists
+
+revision = "0107_max_webhook_updates_queue"
+down_revision = "0106_chat_message_delivery_recovery_fields"
+branch_labels = None
+depends_on = None
+
+
+def _build_table(metadata: sa.MetaData) -> sa.Table:
+    return sa.Table(
+        "max_webhook_updates",
+        metadata,
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("update_key", sa.String(length=64), nullable=False),
+        sa.Column("update_type", sa.String(length=32), nullable=False),
+        sa.Column("max_user_id", sa.String(length=64), nullable=True),
+        sa.Column("payload_json", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "received_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.Column("locked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.UniqueConstraint("update_key", name="uq_max_webhook_updates_update_key"),
+        sa.Index("ix_max_webhook_updates_status_next_attempt", "status", "next_attempt_at"),
+        sa.Index("ix_max_webhook_updates_user_status", "max_user_id", "status", "id"),
+    )
+
+
+def upgrade(conn: Connection) -> None:
+    metadata = sa.MetaData()
+    table = _build_table(metadata)
+
+    if not table_exists(conn, table.name):
+        table.create(bind=conn)
+
+    for index in table.indexes:
+        if not index_exists(conn, table.name, index.name):
+            index.create(bind=conn)
+
+
+def downgrade(conn: Connection) -> None:
+    """Additive-only policy: no destructive downgrade."""
+    _ = conn
@@ -0,0 +1,66 @@
+"""Add an inverted index for knowledge base retrieval.
+
+This migration is additive-only:
+- knowledge_base_chunks.token_count holds the BM25 document length;
+- knowledge_base_postings maps stemmed terms to chunks with term frequency.
+
+Existing chunks keep token_count NULL and are indexed lazily on the next
+search (see ``backend.core.ai.knowledge_base``).
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+
+from backend.migrations.utils import column_exists, index_exists, table_exists
+
+revision = "0108_kb_inverted_index"
+down_revision = "0107_max_webhook_updates_queue"
+branch_labels = None
+depends_on = None
+
+
+def _build_table(metadata: sa.MetaData) -> sa.Table:
+    sa.Table("knowledge_base_documents", metadata, sa.Column("id", sa.Integer(), primary_key=True))
+    sa.Table("knowledge_base_chunks", metadata, sa.Column("id", sa.Integer(), primary_key=True))
+    return sa.Table(
+        "knowledge_base_postings",
+        metadata,
+        sa.Column("term", sa.String(length=32), primary_key=True),
+        sa.Column(
+            "chunk_id",
+            sa.Integer(),
+            sa.ForeignKey("knowledge_base_chunks.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "document_id",
+            sa.Integer(),
+            sa.ForeignKey("knowledge_base_documents.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("tf", sa.Integer(), nullable=False),
+        sa.Index("ix_kb_postings_document", "document_id"),
+    )
+
+
+def upgrade(conn: Connection) -> None:
+    if table_exists(conn, "knowledge_base_chunks") and not column_exists(
+        conn, "knowledge_base_chunks", "token_count"
+    ):
+        conn.execute(sa.text("ALTER TABLE knowledge_base_chunks ADD COLUMN token_count INTEGER"))
+
+    metadata = sa.MetaData()
+    table = _build_table(metadata)
+    if not table_exists(conn, table.name):
+        table.create(bind=conn)
+
+    for index in table.indexes:
+        if not index_exists(conn, table.name, index.name):
+            index.create(bind=conn)
+
+
+def downgrade(conn: Connection) -> None:
+    """Additive-only policy: no destructive downgrade."""
+    _ = conn
@@ -0,0 +1,85 @@
+"""Add materialized weekly KPI counters.
+
+This migration is additive-only:
+- kpi_weekly_contributions records which week/metric each slot or test result
+  currently counts towards, per timezone;
+- kpi_weekly_members keeps distinct candidates per week/metric/scope with a
+  reference count of contributing rows;
+- kpi_weekly_counters holds the resulting distinct counts;
+- kpi_counter_state tracks bootstrap and rollover per timezone.
+
+Counters are filled by the first rollover/bootstrap pass after deploy (see
+``backend.apps.admin_ui.services.kpi_counters``); until then the dashboard
+keeps computing KPIs from the source tables.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+
+from backend.migrations.utils import index_exists, table_exists
+
+revision = "0109_kpi_weekly_counters"
+down_revision = "0108_kb_inverted_index"
+branch_labels = None
+depends_on = None
+
+
+def _build_tables(metadata: sa.MetaData) -> list[sa.Table]:
+    contributions = sa.Table(
+        "kpi_weekly_contributions",
+        metadata,
+        sa.Column("source_type", sa.String(length=16), primary_key=True),
+        sa.Column("source_id", sa.Integer(), primary_key=True),
+        sa.Column("metric", sa.String(length=32), primary_key=True),
+        sa.Column("tz", sa.String(length=64), primary_key=True),
+        sa.Column("week_start", sa.Date(), nullable=False),
+        sa.Column("candidate_key", sa.BigInteger(), nullable=False),
+        sa.Column("recruiter_id", sa.Integer(), nullable=True),
+        sa.Index("ix_kpi_weekly_contributions_week", "tz", "week_start"),
+        sa.Index("ix_kpi_weekly_contributions_candidate", "source_type", "candidate_key"),
+    )
+    members = sa.Table(
+        "kpi_weekly_members",
+        metadata,
+        sa.Column("tz", sa.String(length=64), primary_key=True),
+        sa.Column("week_start", sa.Date(), primary_key=True),
+        sa.Column("metric", sa.String(length=32), primary_key=True),
+        sa.Column("scope_id", sa.Integer(), primary_key=True),
+        sa.Column("candidate_key", sa.BigInteger(), primary_key=True),
+        sa.Column("refs", sa.Integer(), nullable=False, server_default="0"),
+    )
+    counters = sa.Table(
+        "kpi_weekly_counters",
+        metadata,
+        sa.Column("tz", sa.String(length=64), primary_key=True),
+        sa.Column("week_start", sa.Date(), primary_key=True),
+        sa.Column("metric", sa.String(length=32), primary_key=True),
+        sa.Column("scope_id", sa.Integer(), primary_key=True),
+        sa.Column("value", sa.Integer(), nullable=False, server_default="0"),
+    )
+    state = sa.Table(
+        "kpi_counter_state",
+        metadata,
+        sa.Column("tz", sa.String(length=64), primary_key=True),
+        sa.Column("materialized_since", sa.Date(), nullable=False),
+        sa.Column("finalized_week_start", sa.Date(), nullable=True),
+        sa.Column("reconciled_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    return [contributions, members, counters, state]
+
+
+def upgrade(conn: Connection) -> None:
+    metadata = sa.MetaData()
+    for table in _build_tables(metadata):
+        if not table_exists(conn, table.name):
+            table.create(bind=conn)
+        for index in table.indexes:
+            if not index_exists(conn, table.name, index.name):
+                index.create(bind=conn)
+
+
+def downgrade(conn: Connection) -> None:
+    """Additive-only policy: no destructive downgrade."""
+    _ = conn
@@ -0,0 +1,163 @@
+"""Add denormalized candidate chat thread summaries.
+
+This migration is additive-only:
+- candidate_chat_threads keeps the latest message snapshot, the latest inbound
+  timestamp and the inbound message count per candidate;
+- candidate_chat_reads.inbound_seen stores the inbound count a principal has
+  already read, so unread counters no longer scan chat_messages.
+
+Both are backfilled from chat_messages; afterwards they are maintained by the
+ChatMessage mapper events in ``backend.domain.candidates.chat_threads``.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+
+from backend.domain.candidates.chat_threads import derive_chat_message_kind
+from backend.migrations.utils import column_exists, index_exists, table_exists
+
+revision = "0110_candidate_chat_threads"
+down_revision = "0109_kpi_weekly_counters"
+branch_labels = None
+depends_on = None
+
+_BATCH_SIZE = 1000
+
+
+def _build_threads_table(metadata: sa.MetaData) -> sa.Table:
+    return sa.Table(
+        "candidate_chat_threads",
+        metadata,
+        sa.Column(
+            "candidate_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("last_message_id", sa.Integer(), nullable=True),
+        sa.Column("last_message_text", sa.Text(), nullable=True),
+        sa.Column("last_message_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_direction", sa.String(length=16), nullable=True),
+        sa.Column("last_author_label", sa.String(length=160), nullable=True),
+        sa.Column("last_status", sa.String(length=16), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("last_payload_json", sa.JSON(), nullable=True),
+        sa.Column("last_message_kind", sa.String(length=16), nullable=True),
+        sa.Column("last_inbound_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("inbound_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Index("ix_candidate_chat_threads_last_message_at", "last_message_at"),
+    )
+
+
+def _backfill_threads(conn: Connection, threads: sa.Table) -> None:
+    messages = sa.table(
+        "chat_messages",
+        sa.column("id", sa.Integer),
+        sa.column("candidate_id", sa.Integer),
+        sa.column("direction", sa.String),
+        sa.column("text", sa.Text),
+        sa.column("payload_json", sa.JSON),
+        sa.column("status", sa.String),
+        sa.column("error", sa.Text),
+        sa.column("author_label", sa.String),
+        sa.column("created_at", sa.DateTime(timezone=True)),
+    )
+    ranked = sa.select(
+        messages,
+        sa.func.row_number()
+        .over(
+            partition_by=messages.c.candidate_id,
+            order_by=(messages.c.created_at.desc(), messages.c.id.desc()),
+        )
+        .label("row_no"),
+    ).subquery()
+    inbound = (
+        sa.select(
+            messages.c.candidate_id,
+            sa.func.count().label("inbound_count"),
+            sa.func.max(messages.c.created_at).label("last_inbound_at"),
+        )
+        .where(messages.c.direction == "inbound")
+        .group_by(messages.c.candidate_id)
+        .subquery()
+    )
+    rows = conn.execute(
+        sa.select(ranked, inbound.c.inbound_count, inbound.c.last_inbound_at)
+        .outerjoin(inbound, inbound.c.candidate_id == ranked.c.candidate_id)
+        .where(ranked.c.row_no == 1)
+    )
+    now = datetime.now(timezone.utc)
+    batch: list[dict] = []
+    for row in rows:
+        payload_json = row.payload_json if isinstance(row.payload_json, dict) else None
+        batch.append(
+            {
+                "candidate_id": row.candidate_id,
+                "last_message_id": row.id,
+                "last_message_text": row.text,
+                "last_message_at": row.created_at,
+                "last_direction": row.direction,
+                "last_author_label": row.author_label,
+                "last_status": row.status,
+                "last_error": row.error,
+                "last_payload_json": payload_json,
+                "last_message_kind": derive_chat_message_kind(
+                    row.direction,
+                    author_label=row.author_label,
+                    payload_json=payload_json,
+                ),
+                "last_inbound_at": row.last_inbound_at,
+                "inbound_count": int(row.inbound_count or 0),
+                "updated_at": now,
+            }
+        )
+        if len(batch) >= _BATCH_SIZE:
+            conn.execute(threads.insert(), batch)
+            batch = []
+    if batch:
+        conn.execute(threads.insert(), batch)
+
+
+def upgrade(conn: Connection) -> None:
+    if not table_exists(conn, "chat_messages"):
+        return
+
+    metadata = sa.MetaData()
+    sa.Table("users", metadata, sa.Column("id", sa.Integer(), primary_key=True))
+    threads = _build_threads_table(metadata)
+    if not table_exists(conn, threads.name):
+        threads.create(bind=conn)
+        _backfill_threads(conn, threads)
+    for index in threads.indexes:
+        if not index_exists(conn, threads.name, index.name):
+            index.create(bind=conn)
+
+    if table_exists(conn, "candidate_chat_reads") and not column_exists(
+        conn, "candidate_chat_reads", "inbound_seen"
+    ):
+        conn.execute(sa.text("ALTER TABLE candidate_chat_reads ADD COLUMN inbound_seen INTEGER"))
+        conn.execute(
+            sa.text(
+                """
+                UPDATE candidate_chat_reads
+                SET inbound_seen = (
+                    SELECT COUNT(*)
+                    FROM chat_messages
+                    WHERE chat_messages.candidate_id = candidate_chat_reads.candidate_id
+                      AND chat_messages.direction = 'inbound'
+                      AND chat_messages.created_at <= candidate_chat_reads.last_read_at
+                )
+                WHERE last_read_at IS NOT NULL
+                """
+            )
+        )
+
+
+def downgrade(conn: Connection) -> None:
+    """Additive-only policy: no destructive downgrade."""
+    _ = conn
@@ -0,0 +1,48 @@
+"""Add DB-side revision counters for admin-editable content.
+
+This migration is additive-only:
+- content_versions holds one monotonically increasing counter per content key;
+- the ``questions_bank`` row is seeded so readers and writers start from 1.
+
+Admin question edits bump the counter in their transaction; the bot and
+admin_api compare it with the revision their in-memory question bank was
+loaded at (see ``backend.domain.content_versions``).
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+
+from backend.migrations.utils import table_exists
+
+revision = "0111_content_versions"
+down_revision = "0110_candidate_chat_threads"
+branch_labels = None
+depends_on = None
+
+_SEEDED_KEYS = ("questions_bank",)
+
+
+def _build_table(metadata: sa.MetaData) -> sa.Table:
+    return sa.Table(
+        "content_versions",
+        metadata,
+        sa.Column("key", sa.String(length=64), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+
+
+def upgrade(conn: Connection) -> None:
+    table = _build_table(sa.MetaData())
+    if not table_exists(conn, table.name):
+        table.create(bind=conn)
+    existing = set(conn.execute(sa.select(table.c.key)).scalars())
+    missing = [{"key": key, "version": 1} for key in _SEEDED_KEYS if key not in existing]
+    if missing:
+        conn.execute(table.insert(), missing)
+
+
+def downgrade(conn: Connection) -> None:
+    """Additive-only policy: no destructive downgrade."""
+    _ = conn
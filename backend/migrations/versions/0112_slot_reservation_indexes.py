@@ -0,0 +1,84 @@
+"""Index the slot reservation hot path.
+
+Schema changes (additive):
+- partial indexes on a candidate's active slots (by ``candidate_id`` and by
+  ``candidate_tg_id``) serve the duplicate checks of ``reserve_slot``;
+- ``slot_reservation_locks.expires_at`` is indexed for the background sweep
+  of expired reservation locks.
+
+Data change (in place, not reversible): legacy slot statuses and purposes are
+rewritten to lowercase (the ORM already writes them so), letting reservation
+checks compare plain columns instead of ``lower(...)`` expressions. The
+rewrite is idempotent and touches only rows that are not lowercase yet.
+"""
+
+from __future__ import annotations
+
+import logging
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+
+from backend.migrations.utils import index_exists, table_exists
+
+revision = "0112_slot_reservation_indexes"
+down_revision = "0111_content_versions"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger(__name__)
+
+_ACTIVE_PREDICATE = "status IN ('pending', 'booked', 'confirmed', 'confirmed_by_candidate')"
+
+_SLOT_INDEXES = (
+    ("ix_slots_active_candidate_id", "candidate_id"),
+    ("ix_slots_active_candidate_tg_id", "candidate_tg_id"),
+)
+
+
+def _normalize_slots(conn: Connection) -> None:
+    # The active-slot unique index already filters on lower(status), so
+    # lowercasing statuses cannot make two rows collide.
+    conn.execute(sa.text("UPDATE slots SET status = lower(status) WHERE status <> lower(status)"))
+
+    # Purpose is part of that unique index: skip on conflicting legacy rows
+    # instead of failing the deploy (reservations still compare in Python).
+    savepoint = conn.begin_nested()
+    try:
+        conn.execute(
+            sa.text(
+                "UPDATE slots SET purpose = lower(trim(purpose)) "
+                "WHERE purpose <> lower(trim(purpose))"
+            )
+        )
+    except IntegrityError:
+        savepoint.rollback()
+        logger.warning("Skipping slot purpose normalization in %s due conflicting data.", revision)
+    else:
+        savepoint.commit()
+
+
+def upgrade(conn: Connection) -> None:
+    if table_exists(conn, "slots"):
+        _normalize_slots(conn)
+        for name, column in _SLOT_INDEXES:
+            if not index_exists(conn, "slots", name):
+                conn.execute(
+                    sa.text(f"CREATE INDEX IF NOT EXISTS {name} ON slots ({column}) WHERE {_ACTIVE_PREDICATE}")
+                )
+
+    if table_exists(conn, "slot_reservation_locks") and not index_exists(
+        conn, "slot_reservation_locks", "ix_slot_reservation_locks_expires_at"
+    ):
+        conn.execute(
+            sa.text(
+                "CREATE INDEX IF NOT EXISTS ix_slot_reservation_locks_expires_at "
+                "ON slot_reservation_locks (expires_at)"
+            )
+        )
+
+
+def downgrade(conn: Connection) -> None:
+    """No downgrade: the indexes are harmless and the original casing is not kept."""
+    _ = conn
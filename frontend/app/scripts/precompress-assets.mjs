@@ -0,0 +1,69 @@
+import fs from 'node:fs'
+import path from 'node:path'
+import zlib from 'node:zlib'
+import { fileURLToPath } from 'node:url'
+
+// Writes `.br` and `.gz` siblings for compressible build output so the admin_ui
+// static server can send them as-is (no per-request compression in Python).
+
+const __filename = fileURLToPath(import.meta.url)
+const __dirname = path.dirname(__filename)
+const distDir = path.resolve(__dirname, '../../dist')
+
+const compressible = new Set(['.js', '.mjs', '.css', '.html', '.svg', '.json', '.webmanifest', '.txt', '.map', '.wasm'])
+const minBytes = Number(process.env.PRECOMPRESS_MIN_BYTES || 1024)
+// Keep a variant only when it saves at least 5% over the original.
+const maxRatio = 0.95
+
+function* walk(dir) {
+  for (const entry of fs.readdirSync(dir, { withFileTypes: true })) {
+    const fullPath = path.join(dir, entry.name)
+    if (entry.isDirectory()) {
+      yield* walk(fullPath)
+    } else if (entry.isFile()) {
+      yield fullPath
+    }
+  }
+}
+
+function writeVariant(source, suffix, data, stat) {
+  const target = `${source}${suffix}`
+  if (data.length > stat.size * maxRatio) {
+    fs.rmSync(target, { force: true })
+    return 0
+  }
+  fs.writeFileSync(target, data)
+  // Same mtime as the source: the server ignores variants older than their source.
+  fs.utimesSync(target, stat.atime, stat.mtime)
+  return data.length
+}
+
+if (!fs.existsSync(distDir)) {
+  console.error(`Build output not found: ${distDir}`)
+  process.exit(1)
+}
+
+let files = 0
+let rawBytes = 0
+let brBytes = 0
+let gzBytes = 0
+for (const file of walk(distDir)) {
+  if (!compressible.has(path.extname(file))) continue
+  const stat = fs.statSync(file)
+  if (stat.size < minBytes) continue
+  const data = fs.readFileSync(file)
+  const br = zlib.brotliCompressSync(data, {
+    params: {
+      [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY,
+      [zlib.constants.BROTLI_PARAM_SIZE_HINT]: data.length,
+    },
+  })
+  const gz = zlib.gzipSync(data, { level: zlib.constants.Z_BEST_COMPRESSION })
+  files += 1
+  rawBytes += stat.size
+  brBytes += writeVariant(file, '.br', br, stat) || stat.size
+  gzBytes += writeVariant(file, '.gz', gz, stat) || stat.size
+}
+
+const kb = (bytes) => `${(bytes / 1024).toFixed(1)} KB`
+console.log(`Precompressed ${files} files: raw ${kb(rawBytes)}, br ${kb(brBytes)}, gzip ${kb(gzBytes)}`)
@@ -4338,6 +4338,8 @@ export interface components {
         SlotsBulkCreatePayload: {
             /** Recruiter Id */
             recruiter_id: number;
+            /** Recruiter Ids */
+            recruiter_ids?: number[] | null;
             /** City Id */
             city_id: number;
             /** Start Date */
@@ -9481,6 +9483,7 @@ export interface operations {
                 unread_only?: boolean;
                 folder?: string;
                 limit?: number;
+                offset?: number;
             };
             header?: never;
             path?: never;
@@ -9517,6 +9520,7 @@ export interface operations {
                 unread_only?: boolean;
                 folder?: string;
                 limit?: number;
+                offset?: number;
             };
             header?: never;
             path?: never;
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+"""Throughput of bearer-authenticated ``GET /api/profile``.
+
+Mounts the real profile API router behind ``require_principal`` and drives it
+through an in-process ASGI client, once with the staff principal cache
+disabled (AuthAccount + Recruiter lookups on every request) and once with the
+cache and the coalesced ``last_seen_at`` flusher enabled.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_admin_principal_auth.py --requests 2000 --concurrency 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from statistics import mean
+from typing import List
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, int(round((len(ordered) - 1) * percentile / 100.0)))
+    return ordered[rank]
+
+
+async def _seed_accounts(count: int) -> list[str]:
+    from backend.core.auth import create_access_token
+    from backend.core.db import async_session, init_models
+    from backend.domain.auth_account import AuthAccount
+    from backend.domain.models import Recruiter
+
+    await init_models()
+    tokens: list[str] = []
+    async with async_session() as session:
+        for idx in range(count):
+            recruiter = Recruiter(name=f"Bench Recruiter {idx}", tz="Europe/Moscow", active=True)
+            session.add(recruiter)
+            await session.flush()
+            username = f"bench.recruiter.{idx}"
+            session.add(
+                AuthAccount(
+                    username=username,
+                    password_hash="not-used",
+                    principal_type="recruiter",
+                    principal_id=recruiter.id,
+                    is_active=True,
+                )
+            )
+            tokens.append(create_access_token({"sub": username}, expires_delta=None))
+        await session.commit()
+    return tokens
+
+
+def _build_app():
+    from fastapi import Depends, FastAPI
+
+    from backend.apps.admin_ui.routers.profile_api import router as profile_api_router
+    from backend.apps.admin_ui.security import require_principal
+
+    app = FastAPI()
+    app.state.db_available = True
+    app.include_router(profile_api_router, prefix="/api", dependencies=[Depends(require_principal)])
+    return app
+
+
+async def _run_mode(mode: str, args, tokens: list[str]) -> dict:
+    import httpx
+    from sqlalchemy import event
+
+    from backend.apps.admin_ui.principal_cache import (
+        get_admin_principal_cache,
+        get_last_seen_recorder,
+        install_admin_principal_invalidation_hooks,
+    )
+    from backend.core.db import async_engine
+    from backend.core.settings import get_settings
+
+    os.environ["ADMIN_PRINCIPAL_CACHE_TTL_SECONDS"] = "30" if mode == "cached" else "0"
+    get_settings.cache_clear()
+    install_admin_principal_invalidation_hooks()
+    cache = get_admin_principal_cache()
+    cache.clear()
+
+    flusher_stop = asyncio.Event()
+    flusher = None
+    if mode == "cached":
+        flusher = asyncio.create_task(
+            get_last_seen_recorder().run(stop_event=flusher_stop, interval_seconds=30)
+        )
+        await asyncio.sleep(0)
+
+    statements = [0]
+
+    def _count_statement(*_args, **_kwargs) -> None:
+        statements[0] += 1
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _count_statement)
+
+    app = _build_app()
+    latencies: List[float] = []
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for idx in range(args.requests):
+        queue.put_nowait(idx)
+
+    transport = httpx.ASGITransport(app=app, client=("10.0.0.10", 40000))
+    async with httpx.AsyncClient(transport=transport, base_url="https://bench") as client:
+
+        async def _worker() -> None:
+            while True:
+                try:
+                    idx = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                token = tokens[idx % len(tokens)]
+                started = time.perf_counter()
+                response = await client.get("/api/profile", headers={"Authorization": f"Bearer {token}"})
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    raise RuntimeError(f"unexpected status {response.status_code}: {response.text[:200]}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    if flusher is not None:
+        flusher_stop.set()
+        await flusher
+    event.remove(async_engine.sync_engine, "before_cursor_execute", _count_statement)
+
+    return {
+        "mode": mode,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "accounts": len(tokens),
+        "duration_sec": round(elapsed, 4),
+        "throughput_rps": round(args.requests / elapsed, 2) if elapsed else 0.0,
+        "latency_avg_ms": round(mean(latencies) * 1000, 3) if latencies else 0.0,
+        "latency_p95_ms": round(_percentile(latencies, 95.0) * 1000, 3),
+        "latency_p99_ms": round(_percentile(latencies, 99.0) * 1000, 3),
+        "sql_statements_per_request": round(statements[0] / args.requests, 2),
+        "cache_hits": cache.stats.hits,
+        "cache_misses": cache.stats.misses,
+    }
+
+
+async def run(args) -> list[dict]:
+    data_dir = Path(tempfile.mkdtemp(prefix="admin-principal-bench-"))
+    os.environ["DATA_DIR"] = str(data_dir)
+    os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{data_dir / 'bench.db'}")
+    os.environ.setdefault("ENVIRONMENT", "test")
+    os.environ.setdefault("SESSION_SECRET", "bench-session-secret-0123456789abcdef0123")
+    os.environ["REDIS_URL"] = ""
+
+    tokens = await _seed_accounts(args.accounts)
+    results = []
+    for mode in args.modes:
+        results.append(await _run_mode(mode, args, tokens))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Admin bearer principal resolution benchmark")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per mode")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--accounts", type=int, default=20, help="Distinct recruiter accounts to rotate through")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["uncached", "cached"],
+        default=["uncached", "cached"],
+    )
+    parser.add_argument("--metrics-json", dest="metrics_json", default="", help="Optional path to store JSON results")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    if args.metrics_json:
+        Path(args.metrics_json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
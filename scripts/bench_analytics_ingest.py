@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""Per-event caller overhead of ``log_event``.
+
+Measures how long callers wait inside ``log_event`` with the direct path (one
+session + commit per event) and with the batching buffer, then the time to
+drain the buffer on shutdown.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_analytics_ingest.py --events 5000 --concurrency 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from statistics import mean
+from typing import List
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, int(round((len(ordered) - 1) * percentile / 100.0)))
+    return ordered[rank]
+
+
+async def _run_mode(mode: str, args) -> dict:
+    from backend.domain import analytics
+    from backend.domain.analytics_buffer import (
+        AnalyticsBufferConfig,
+        start_analytics_buffer,
+        stop_analytics_buffer,
+    )
+
+    buffer = None
+    if mode == "buffered":
+        buffer = start_analytics_buffer(
+            AnalyticsBufferConfig(
+                max_events=args.events + 1,
+                flush_size=args.flush_size,
+                flush_interval=args.flush_interval,
+            )
+        )
+
+    latencies: List[float] = []
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for idx in range(args.events):
+        queue.put_nowait(idx)
+
+    async def _worker() -> None:
+        while True:
+            try:
+                idx = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            await analytics.log_event(
+                "bench_event",
+                candidate_id=idx,
+                slot_id=idx,
+                metadata={"mode": mode, "idx": idx},
+            )
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(args.concurrency)))
+    submit_elapsed = time.perf_counter() - started
+    drain_started = time.perf_counter()
+    if buffer is not None:
+        await stop_analytics_buffer()
+    drain_elapsed = time.perf_counter() - drain_started
+
+    return {
+        "mode": mode,
+        "events": args.events,
+        "concurrency": args.concurrency,
+        "submit_duration_sec": round(submit_elapsed, 4),
+        "drain_duration_sec": round(drain_elapsed, 4),
+        "events_per_sec": round(args.events / (submit_elapsed + drain_elapsed), 2),
+        "caller_avg_us": round(mean(latencies) * 1_000_000, 1) if latencies else 0.0,
+        "caller_p95_us": round(_percentile(latencies, 95.0) * 1_000_000, 1),
+        "caller_p99_us": round(_percentile(latencies, 99.0) * 1_000_000, 1),
+        "flushes": buffer.stats.flushes if buffer is not None else args.events,
+    }
+
+
+async def run(args) -> list[dict]:
+    data_dir = Path(tempfile.mkdtemp(prefix="analytics-bench-"))
+    os.environ["DATA_DIR"] = str(data_dir)
+    os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{data_dir / 'bench.db'}")
+    os.environ.setdefault("ENVIRONMENT", "test")
+    os.environ.setdefault("SESSION_SECRET", "bench-session-secret-0123456789abcdef0123")
+    os.environ["REDIS_URL"] = ""
+
+    from backend.core.db import init_models
+
+    await init_models()
+    return [await _run_mode(mode, args) for mode in args.modes]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Analytics event ingestion benchmark")
+    parser.add_argument("--events", type=int, default=5000, help="Events per mode")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent producers")
+    parser.add_argument("--flush-size", dest="flush_size", type=int, default=500)
+    parser.add_argument("--flush-interval", dest="flush_interval", type=float, default=1.0)
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["direct", "buffered"],
+        default=["direct", "buffered"],
+    )
+    parser.add_argument("--metrics-json", dest="metrics_json", default="", help="Optional path to store JSON results")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    if args.metrics_json:
+        Path(args.metrics_json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
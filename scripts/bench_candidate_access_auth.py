@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+"""Throughput of authenticated no-op candidate-access requests.
+
+Runs a minimal FastAPI app whose only route depends on
+``get_web_candidate_access_principal`` and drives it through an in-process ASGI
+client, once with the principal cache disabled (every request validates the
+session against the database) and once with it enabled.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_candidate_access_auth.py --requests 2000 --concurrency 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from statistics import mean
+from typing import List
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, int(round((len(ordered) - 1) * percentile / 100.0)))
+    return ordered[rank]
+
+
+async def _seed_sessions(count: int) -> list[str]:
+    from backend.core.db import async_session, init_models
+    from backend.domain.candidates.models import (
+        CandidateAccessAuthMethod,
+        CandidateAccessSession,
+        CandidateJourneySession,
+        CandidateJourneySurface,
+        CandidateLaunchChannel,
+        User,
+    )
+
+    await init_models()
+    now = datetime.now(UTC)
+    tokens: list[str] = []
+    async with async_session() as session:
+        for idx in range(count):
+            candidate = User(fio=f"Bench Candidate {idx}", source="web", messenger_platform="web")
+            session.add(candidate)
+            await session.flush()
+            journey = CandidateJourneySession(candidate_id=candidate.id, session_version=1)
+            session.add(journey)
+            await session.flush()
+            # BigInteger primary keys are not auto-incremented by SQLite.
+            access = CandidateAccessSession(
+                id=idx + 1,
+                candidate_id=candidate.id,
+                journey_session_id=journey.id,
+                journey_surface=CandidateJourneySurface.STANDALONE_WEB.value,
+                auth_method=CandidateAccessAuthMethod.SIGNED_LINK.value,
+                launch_channel=CandidateLaunchChannel.WEB.value,
+                session_version_snapshot=1,
+                expires_at=now + timedelta(hours=8),
+            )
+            session.add(access)
+            await session.flush()
+            tokens.append(access.session_id)
+        await session.commit()
+    return tokens
+
+
+def _build_app():
+    from fastapi import Depends, FastAPI
+
+    from backend.apps.admin_api.candidate_access.auth import get_web_candidate_access_principal
+
+    app = FastAPI()
+
+    @app.get("/noop")
+    async def noop(principal=Depends(get_web_candidate_access_principal)):  # noqa: B008
+        return {"candidate_id": principal.candidate_id}
+
+    return app
+
+
+async def _run_mode(mode: str, args, tokens: list[str]) -> dict:
+    import httpx
+
+    from backend.apps.admin_api.candidate_access.session_cache import (
+        get_candidate_access_session_cache,
+    )
+    from backend.core.settings import get_settings
+
+    os.environ["CANDIDATE_ACCESS_CACHE_TTL_SECONDS"] = "30" if mode == "cached" else "0"
+    get_settings.cache_clear()
+    cache = get_candidate_access_session_cache()
+    cache.clear()
+
+    app = _build_app()
+    latencies: List[float] = []
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for idx in range(args.requests):
+        queue.put_nowait(idx)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def _worker() -> None:
+            while True:
+                try:
+                    idx = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                token = tokens[idx % len(tokens)]
+                started = time.perf_counter()
+                response = await client.get("/noop", headers={"X-Candidate-Access-Session": token})
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    raise RuntimeError(f"unexpected status {response.status_code}: {response.text}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "mode": mode,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "sessions": len(tokens),
+        "duration_sec": round(elapsed, 4),
+        "throughput_rps": round(args.requests / elapsed, 2) if elapsed else 0.0,
+        "latency_avg_ms": round(mean(latencies) * 1000, 3) if latencies else 0.0,
+        "latency_p95_ms": round(_percentile(latencies, 95.0) * 1000, 3),
+        "latency_p99_ms": round(_percentile(latencies, 99.0) * 1000, 3),
+        "cache_local_hits": cache.stats.local_hits,
+        "cache_misses": cache.stats.misses,
+    }
+
+
+async def run(args) -> list[dict]:
+    data_dir = Path(tempfile.mkdtemp(prefix="candidate-access-bench-"))
+    os.environ["DATA_DIR"] = str(data_dir)
+    os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{data_dir / 'bench.db'}")
+    os.environ.setdefault("ENVIRONMENT", "test")
+    os.environ.setdefault("SESSION_SECRET", "bench-session-secret-0123456789abcdef0123")
+    os.environ["CANDIDATE_WEB_PILOT_ENABLED"] = "1"
+    os.environ["REDIS_URL"] = ""
+
+    tokens = await _seed_sessions(args.sessions)
+    results = []
+    for mode in args.modes:
+        results.append(await _run_mode(mode, args, tokens))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Candidate access auth throughput benchmark")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per mode")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--sessions", type=int, default=50, help="Distinct access sessions to rotate through")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["uncached", "cached"],
+        default=["uncached", "cached"],
+    )
+    parser.add_argument("--metrics-json", dest="metrics_json", default="", help="Optional path to store JSON results")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    if args.metrics_json:
+        Path(args.metrics_json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
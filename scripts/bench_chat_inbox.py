@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+"""Latency of the candidate chat inbox as chat history grows.
+
+Compares the previous thread list (``row_number()`` over all of
+``chat_messages``, a global unread ``count`` and scope/folder filtering in
+Python, reproduced here as ``scan``) with the paginated query over
+``candidate_chat_threads`` (``summary``) and the aggregate probe that
+``/threads/updates`` polls every second (``probe``).
+
+Seeding writes rows with core inserts and builds the summaries with the
+0110 migration backfill, whose duration is reported as well.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_chat_inbox.py --candidates 100000 --messages 5000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from statistics import mean
+from typing import List
+
+_BATCH_SIZE = 20_000
+_CITY_NAMES = ("Москва", "Казань", "Самара", "Пермь", "Тула", "Омск", "Уфа", "Сочи")
+_AUTHORS = ("Рекрутер", "bot", "system", None)
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, int(round((len(ordered) - 1) * percentile / 100.0)))
+    return ordered[rank]
+
+
+async def _seed(args) -> dict:
+    from sqlalchemy import insert
+
+    from backend.core.db import async_engine, init_models
+    from backend.domain.candidates.models import CandidateChatRead, CandidateChatThread, ChatMessage, User
+    from backend.domain.models import City, Recruiter, recruiter_city_association
+
+    await init_models()
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc)
+    async with async_engine.begin() as conn:
+        await conn.execute(
+            insert(City),
+            [{"id": idx + 1, "name": name, "tz": "Europe/Moscow", "active": True} for idx, name in enumerate(_CITY_NAMES)],
+        )
+        await conn.execute(
+            insert(Recruiter),
+            [
+                {"id": idx + 1, "name": f"Рекрутер {idx + 1}", "tz": "Europe/Moscow", "active": True}
+                for idx in range(args.recruiters)
+            ],
+        )
+        await conn.execute(
+            insert(recruiter_city_association),
+            [
+                {"recruiter_id": idx + 1, "city_id": (idx % len(_CITY_NAMES)) + 1}
+                for idx in range(args.recruiters)
+            ],
+        )
+        for start in range(0, args.candidates, _BATCH_SIZE):
+            await conn.execute(
+                insert(User),
+                [
+                    {
+                        "id": idx + 1,
+                        "fio": f"Кандидат {idx + 1}",
+                        "city": rng.choice(_CITY_NAMES),
+                        "telegram_id": 70_000_000_000 + idx,
+                        "responsible_recruiter_id": (
+                            rng.randint(1, args.recruiters) if rng.random() < 0.7 else None
+                        ),
+                    }
+                    for idx in range(start, min(args.candidates, start + _BATCH_SIZE))
+                ],
+            )
+        horizon = timedelta(days=args.days).total_seconds()
+        message_id = 0
+        while message_id < args.messages:
+            batch = []
+            for _ in range(min(_BATCH_SIZE, args.messages - message_id)):
+                message_id += 1
+                inbound = rng.random() < 0.5
+                batch.append(
+                    {
+                        "id": message_id,
+                        "candidate_id": rng.randint(1, args.candidates),
+                        "direction": "inbound" if inbound else "outbound",
+                        "channel": "telegram",
+                        "text": f"Сообщение {message_id}",
+                        "status": "received" if inbound else "sent",
+                        "author_label": None if inbound else rng.choice(_AUTHORS),
+                        "delivery_attempts": 0,
+                        "created_at": now - timedelta(seconds=rng.random() * horizon),
+                    }
+                )
+            await conn.execute(insert(ChatMessage), batch)
+        read_rows = [
+            {
+                "candidate_id": rng.randint(1, args.candidates),
+                "principal_type": "recruiter",
+                "principal_id": 1,
+                "last_read_at": now - timedelta(days=rng.random() * args.days),
+            }
+            for _ in range(args.candidates // 10)
+        ]
+        unique_reads = {row["candidate_id"]: row for row in read_rows}
+        await conn.execute(insert(CandidateChatRead), list(unique_reads.values()))
+
+        await conn.run_sync(lambda sync_conn: CandidateChatThread.__table__.drop(sync_conn))
+        await conn.run_sync(
+            lambda sync_conn: sync_conn.exec_driver_sql("ALTER TABLE candidate_chat_reads DROP COLUMN inbound_seen")
+        )
+
+    migration = importlib.import_module("backend.migrations.versions.0110_candidate_chat_threads")
+    started = time.perf_counter()
+    async with async_engine.begin() as conn:
+        await conn.run_sync(migration.upgrade)
+    return {"backfill_sec": round(time.perf_counter() - started, 3)}
+
+
+async def _legacy_list(principal, *, limit: int) -> int:
+    """Pre-summary thread list: full-table window + unread count, filtering in Python."""
+    from sqlalchemy import and_, func, or_, select
+
+    from backend.apps.admin_ui.services.candidate_chat_threads import (
+        _is_accessible_user,
+        _recruiter_city_ids,
+    )
+    from backend.core.db import async_session
+    from backend.domain.candidates.models import CandidateChatRead, ChatMessage, User
+
+    latest_sq = select(
+        ChatMessage.candidate_id.label("candidate_id"),
+        ChatMessage.text.label("text"),
+        ChatMessage.created_at.label("created_at"),
+        func.row_number()
+        .over(
+            partition_by=ChatMessage.candidate_id,
+            order_by=(ChatMessage.created_at.desc(), ChatMessage.id.desc()),
+        )
+        .label("rn"),
+    ).subquery()
+    recruiter_city_ids = await _recruiter_city_ids(principal)
+    city_cache: dict = {}
+    async with async_session() as session:
+        rows = (
+            await session.execute(
+                select(User, latest_sq.c.text, latest_sq.c.created_at)
+                .join(latest_sq, latest_sq.c.candidate_id == User.id)
+                .where(latest_sq.c.rn == 1)
+                .order_by(latest_sq.c.created_at.desc())
+            )
+        ).all()
+        candidate_ids = [int(row[0].id) for row in rows]
+        unread_rows = (
+            await session.execute(
+                select(ChatMessage.candidate_id, func.count(ChatMessage.id))
+                .outerjoin(
+                    CandidateChatRead,
+                    and_(
+                        CandidateChatRead.candidate_id == ChatMessage.candidate_id,
+                        CandidateChatRead.principal_type == principal.type,
+                        CandidateChatRead.principal_id == principal.id,
+                    ),
+                )
+                .where(
+                    ChatMessage.candidate_id.in_(candidate_ids),
+                    ChatMessage.direction == "inbound",
+                    or_(
+                        CandidateChatRead.last_read_at.is_(None),
+                        ChatMessage.created_at > CandidateChatRead.last_read_at,
+                    ),
+                )
+                .group_by(ChatMessage.candidate_id)
+            )
+        ).all()
+    unread_map = dict(unread_rows)
+    visible = []
+    for user, _text, _created_at in rows:
+        if await _is_accessible_user(user, principal, recruiter_city_ids=recruiter_city_ids, city_cache=city_cache):
+            visible.append((user.id, unread_map.get(user.id, 0)))
+    return len(visible[:limit])
+
+
+async def _run_mode(mode: str, principal, iterations: int, limit: int) -> dict:
+    from backend.apps.admin_ui.services import candidate_chat_threads as threads
+    from backend.core.db import async_session
+
+    scope = await threads._scope_clause(
+        principal,
+        recruiter_city_ids=await threads._recruiter_city_ids(principal),
+        city_cache={},
+    )
+    latencies: List[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        if mode == "scan":
+            await _legacy_list(principal, limit=limit)
+        elif mode == "summary":
+            await threads.list_threads(principal, limit=limit)
+        else:
+            filters = threads._thread_filters(
+                scope, search=None, unread_only=False, folder="inbox", now=datetime.now(timezone.utc)
+            )
+            async with async_session() as session:
+                await threads._latest_event_at(session, principal, filters)
+        latencies.append(time.perf_counter() - started)
+    return {
+        "mode": mode,
+        "principal": f"{principal.type}:{principal.id}",
+        "iterations": iterations,
+        "latency_avg_ms": round(mean(latencies) * 1000, 3),
+        "latency_p95_ms": round(_percentile(latencies, 95.0) * 1000, 3),
+    }
+
+
+async def run(args) -> dict:
+    data_dir = Path(tempfile.mkdtemp(prefix="chat-inbox-bench-"))
+    os.environ["DATA_DIR"] = str(data_dir)
+    os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{data_dir / 'bench.db'}")
+    os.environ.setdefault("ENVIRONMENT", "test")
+    os.environ.setdefault("SESSION_SECRET", "bench-session-secret-0123456789abcdef0123")
+    os.environ["REDIS_URL"] = ""
+
+    seed_started = time.perf_counter()
+    seeded = await _seed(args)
+    seed_elapsed = time.perf_counter() - seed_started
+
+    from backend.apps.admin_ui.security import Principal
+
+    principals = [Principal(type="admin", id=-1), Principal(type="recruiter", id=1)]
+    results = []
+    for principal in principals:
+        for mode in args.modes:
+            iterations = args.scan_iterations if mode == "scan" else args.iterations
+            results.append(await _run_mode(mode, principal, iterations, args.limit))
+    return {
+        "candidates": args.candidates,
+        "messages": args.messages,
+        "seed_sec": round(seed_elapsed, 3),
+        **seeded,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Candidate chat inbox benchmark")
+    parser.add_argument("--candidates", type=int, default=100_000)
+    parser.add_argument("--messages", type=int, default=5_000_000)
+    parser.add_argument("--recruiters", type=int, default=20)
+    parser.add_argument("--days", type=int, default=90, help="Spread of message timestamps")
+    parser.add_argument("--limit", type=int, default=100, help="Inbox page size")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--scan-iterations", dest="scan_iterations", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["scan", "summary", "probe"],
+        default=["scan", "summary", "probe"],
+    )
+    parser.add_argument("--metrics-json", dest="metrics_json", default="", help="Optional path to store JSON results")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    if args.metrics_json:
+        Path(args.metrics_json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+"""Bandwidth and CPU of the mixed read profile with and without ETag revalidation.
+
+Replays the GET endpoints of ``scripts/loadtest_profiles/profiles/mixed.profile``
+that support conditional GET (dashboard summary/incoming, calendar events,
+candidate list, notifications feed) by weight against the real admin_ui API
+routers on a seeded SQLite database, with a shared (fake) Redis so validators
+and table versions behave as across workers.
+
+``baseline`` has conditional GET disabled (every poll renders and sends the
+full body); ``conditional`` polls like a browser with ``If-None-Match`` set to
+the last ETag it received. In both modes a slot is updated through the ORM
+every ``--write-every`` reads, which bumps the ``slots`` version.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_conditional_get.py --requests 3000
+    PYTHONPATH=. python scripts/bench_conditional_get.py --requests 3000 --write-every 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from statistics import mean
+
+_PROFILE = Path(__file__).resolve().parent / "loadtest_profiles" / "profiles" / "mixed.profile"
+_COVERED = ("/api/dashboard/", "/api/calendar/events", "/api/candidates", "/api/notifications/feed")
+_CITY_NAMES = ("Москва", "Казань", "Самара", "Пермь", "Тула", "Омск", "Уфа", "Сочи")
+
+
+def _profile_mix() -> tuple[list[tuple[str, str, float]], float]:
+    rows: list[tuple[str, str, float]] = []
+    total_weight = 0.0
+    for line in _PROFILE.read_text(encoding="utf-8").splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        name, weight, method, path, auth_kind, *_ = line.split("|")
+        if method != "GET" or auth_kind != "bearer":
+            continue
+        total_weight += float(weight)
+        if path.startswith(_COVERED):
+            rows.append((name, path, float(weight)))
+    return rows, total_weight
+
+
+async def _seed(args) -> None:
+    from sqlalchemy import insert
+
+    from backend.core.db import async_engine, init_models
+    from backend.domain.candidates.models import User
+    from backend.domain.candidates.status import CandidateStatus
+    from backend.domain.models import City, OutboxNotification, Recruiter, Slot, recruiter_city_association
+
+    await init_models()
+    rng = random.Random(args.seed)
+    start = datetime(2026, 2, 1, 7, tzinfo=timezone.utc)
+    statuses = (CandidateStatus.WAITING_SLOT, CandidateStatus.LEAD, CandidateStatus.TEST1_COMPLETED)
+    async with async_engine.begin() as conn:
+        await conn.execute(
+            insert(City),
+            [{"id": idx + 1, "name": name, "tz": "Europe/Moscow", "active": True} for idx, name in enumerate(_CITY_NAMES)],
+        )
+        await conn.execute(
+            insert(Recruiter),
+            [{"id": idx + 1, "name": f"Рекрутер {idx + 1}", "tz": "Europe/Moscow", "active": True} for idx in range(10)],
+        )
+        await conn.execute(
+            insert(recruiter_city_association),
+            [{"recruiter_id": idx + 1, "city_id": (idx % len(_CITY_NAMES)) + 1} for idx in range(10)],
+        )
+        await conn.execute(
+            insert(User),
+            [
+                {
+                    "id": idx + 1,
+                    "fio": f"Кандидат {idx + 1}",
+                    "city": rng.choice(_CITY_NAMES),
+                    "telegram_id": 71_000_000_000 + idx,
+                    "candidate_status": rng.choice(statuses),
+                    "responsible_recruiter_id": rng.randint(1, 10),
+                }
+                for idx in range(args.candidates)
+            ],
+        )
+        await conn.execute(
+            insert(Slot),
+            [
+                {
+                    "id": idx + 1,
+                    "recruiter_id": (idx % 10) + 1,
+                    "city_id": (idx % len(_CITY_NAMES)) + 1,
+                    "start_utc": start + timedelta(hours=idx % 600),
+                    "status": "free",
+                }
+                for idx in range(args.slots)
+            ],
+        )
+        await conn.execute(
+            insert(OutboxNotification),
+            [{"id": idx + 1, "type": "interview_reminder", "status": "pending"} for idx in range(200)],
+        )
+
+
+def _app():
+    from fastapi import FastAPI
+
+    from backend.apps.admin_ui.routers import api_candidates, api_dashboard, api_misc_routes
+    from backend.apps.admin_ui.security import Principal, get_current_principal
+
+    app = FastAPI()
+    for module in (api_dashboard, api_candidates, api_misc_routes):
+        app.include_router(module.router)
+    app.dependency_overrides[get_current_principal] = lambda: Principal(type="admin", id=-1)
+    return app
+
+
+async def _write(slot_id: int) -> None:
+    from backend.core.db import async_session
+    from backend.domain.models import Slot
+
+    async with async_session() as session:
+        slot = await session.get(Slot, slot_id)
+        slot.duration_min = 30 if slot.duration_min != 30 else 45
+        await session.commit()
+
+
+async def _run_mode(mode: str, args, mix: list[tuple[str, str, float]]) -> dict:
+    import httpx
+
+    from backend.core import settings as settings_module
+    from backend.core.table_versions import wait_for_pending_bumps
+
+    os.environ["ADMIN_CONDITIONAL_GET_ENABLED"] = "1" if mode == "conditional" else "0"
+    settings_module.get_settings.cache_clear()
+
+    rng = random.Random(args.seed)
+    paths = [path for _, path, _ in mix]
+    weights = [weight for _, _, weight in mix]
+    etags: dict[str, str] = {}
+    body_bytes = not_modified = writes = 0
+    durations: list[float] = []
+    transport = httpx.ASGITransport(app=_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in paths:  # warm caches and ETags
+            etags[path] = (await client.get(path)).headers.get("etag", "")
+        cpu_started = time.process_time()
+        wall_started = time.perf_counter()
+        for idx in range(args.requests):
+            if args.write_every and idx and idx % args.write_every == 0:
+                await _write(rng.randint(1, args.slots))
+                await wait_for_pending_bumps()
+                writes += 1
+            path = rng.choices(paths, weights=weights)[0]
+            headers = {"if-none-match": etags[path]} if mode == "conditional" and etags.get(path) else {}
+            started = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            durations.append(time.perf_counter() - started)
+            if response.status_code == 304:
+                not_modified += 1
+            else:
+                body_bytes += len(response.content)
+            if response.headers.get("etag"):
+                etags[path] = response.headers["etag"]
+        cpu_seconds = time.process_time() - cpu_started
+        wall_seconds = time.perf_counter() - wall_started
+    return {
+        "requests": args.requests,
+        "writes": writes,
+        "not_modified_share": round(not_modified / args.requests, 4),
+        "body_bytes_per_request": round(body_bytes / args.requests, 1),
+        "cpu_ms_per_request": round(cpu_seconds * 1000 / args.requests, 3),
+        "latency_avg_ms": round(mean(durations) * 1000, 3),
+        "rps": round(args.requests / wall_seconds, 1),
+    }
+
+
+async def run(args) -> dict:
+    data_dir = Path(tempfile.mkdtemp(prefix="conditional-get-bench-"))
+    os.environ["DATA_DIR"] = str(data_dir)
+    os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{data_dir / 'bench.db'}")
+    # Not "test": the microcache is disabled there.
+    os.environ.setdefault("ENVIRONMENT", "development")
+    os.environ.setdefault("SESSION_SECRET", "bench-session-secret-0123456789abcdef0123")
+    os.environ["REDIS_URL"] = ""
+
+    from backend.core import cache as cache_module
+    from backend.core.cache import CacheClient, CacheConfig
+
+    try:
+        from fakeredis import aioredis as fakeredis_aioredis
+    except ImportError:  # pragma: no cover - optional dependency
+        fakeredis_aioredis = None
+    if fakeredis_aioredis is not None:
+        shared = CacheClient(CacheConfig())
+        shared._client = fakeredis_aioredis.FakeRedis()
+        cache_module._cache = shared
+
+    from backend.core.table_versions import install_table_version_hooks
+
+    install_table_version_hooks()
+    await _seed(args)
+    mix, total_weight = _profile_mix()
+    baseline = await _run_mode("baseline", args, mix)
+    conditional = await _run_mode("conditional", args, mix)
+    return {
+        "profile_weight_covered": round(sum(weight for _, _, weight in mix) / total_weight, 3),
+        "shared_redis": fakeredis_aioredis is not None,
+        "baseline": baseline,
+        "conditional": conditional,
+        "bandwidth_saved": round(1 - conditional["body_bytes_per_request"] / max(1.0, baseline["body_bytes_per_request"]), 3),
+        "cpu_saved": round(1 - conditional["cpu_ms_per_request"] / max(1e-9, baseline["cpu_ms_per_request"]), 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Conditional GET savings under the mixed read profile")
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--write-every", dest="write_every", type=int, default=50, help="ORM slot update every N reads (0 disables)")
+    parser.add_argument("--candidates", type=int, default=2000)
+    parser.add_argument("--slots", type=int, default=1500)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--metrics-json", dest="metrics_json", default="", help="Optional path to store JSON results")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    if args.metrics_json:
+        Path(args.metrics_json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""CPU cost of rendering a large admin JSON payload, per response path.
+
+The payload mimics the ``/api/candidates`` list (cards with datetimes, enums
+and nested kanban/calendar views). Paths:
+
+- ``legacy_miss``: ``JSONResponse(jsonable_encoder(payload))``;
+- ``legacy_hit``: the same after the dict came back from the read-through
+  cache (Redis JSON decode + ``jsonable_encoder`` + ``json.dumps``);
+- ``fast_miss``: ``FastJSONResponse(payload)`` (orjson);
+- ``fast_hit``: ``FastJSONResponse(EncodedJSON(body))`` with the body cached
+  by ``get_or_compute_json``.
+
+``parity`` compares each document with ``legacy_miss``; ``legacy_hit`` differs
+because the Redis round trip turned datetimes into ``str()`` spelling
+(``2026-02-01 07:00:00+00:00``), which the bytes cache no longer does.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_fast_json.py --cards 100 --iterations 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import UUID
+
+_CITY_NAMES = ("Москва", "Казань", "Самара", "Пермь", "Тула", "Омск", "Уфа", "Сочи")
+
+
+def _payload(args) -> dict:
+    from backend.domain.candidates.status import CandidateStatus
+
+    rng = random.Random(args.seed)
+    start = datetime(2026, 2, 1, 7, tzinfo=timezone.utc)
+    statuses = list(CandidateStatus)
+    cards = []
+    for idx in range(args.cards):
+        moment = start + timedelta(minutes=rng.randint(0, 60 * 24 * 30))
+        cards.append(
+            {
+                "id": idx + 1,
+                "fio": f"Кандидат {idx + 1}",
+                "city": rng.choice(_CITY_NAMES),
+                "status": rng.choice(statuses),
+                "candidate_id": UUID(int=rng.getrandbits(128)),
+                "created_at": moment,
+                "last_activity": moment + timedelta(hours=3),
+                "telegram_id": 71_000_000_000 + idx,
+                "tests": [{"kind": "test1", "score": rng.random(), "passed_at": moment}],
+                "slot": {"start_utc": moment + timedelta(days=1), "duration_min": 30, "recruiter": "Рекрутер 1"},
+            }
+        )
+    columns = [
+        {"status": status, "title": status.value, "cards": [card for card in cards if card["status"] == status]}
+        for status in statuses
+    ]
+    return {
+        "items": cards,
+        "total": args.cards,
+        "page": 1,
+        "pages_total": 1,
+        "filters": {"state": [], "status": []},
+        "pipeline": "interview",
+        "pipeline_options": [{"slug": "interview", "label": "Интервью"}],
+        "views": {"candidates": cards, "kanban": {"columns": columns}},
+    }
+
+
+def _cpu_ms(render, iterations: int) -> float:
+    started = time.process_time()
+    for _ in range(iterations):
+        render()
+    return (time.process_time() - started) * 1000 / iterations
+
+
+def run(args) -> dict:
+    data_dir = Path(tempfile.mkdtemp(prefix="fast-json-bench-"))
+    os.environ["DATA_DIR"] = str(data_dir)
+    os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{data_dir / 'bench.db'}")
+    os.environ.setdefault("ENVIRONMENT", "development")
+    os.environ.setdefault("SESSION_SECRET", "bench-session-secret-0123456789abcdef0123")
+
+    from fastapi.encoders import jsonable_encoder
+    from starlette.responses import JSONResponse
+
+    from backend.core.json_response import EncodedJSON, FastJSONResponse, encode_json, fast_json_enabled
+
+    payload = _payload(args)
+    # What CacheClient.get returns for the dict stored by get_or_compute().
+    redis_value = json.dumps(payload, default=str)
+    cached_body = encode_json(payload)
+
+    paths = {
+        "legacy_miss": lambda: JSONResponse(jsonable_encoder(payload)),
+        "legacy_hit": lambda: JSONResponse(jsonable_encoder(json.loads(redis_value))),
+        "fast_miss": lambda: FastJSONResponse(payload),
+        "fast_hit": lambda: FastJSONResponse(EncodedJSON(cached_body)),
+    }
+    reference = json.loads(paths["legacy_miss"]().body)
+    results = {
+        "fast_json_enabled": fast_json_enabled(),
+        "body_bytes": len(cached_body),
+        "parity": {name: json.loads(render().body) == reference for name, render in paths.items()},
+        "cpu_ms_per_response": {name: round(_cpu_ms(render, args.iterations), 4) for name, render in paths.items()},
+    }
+    cpu = results["cpu_ms_per_response"]
+    results["speedup_miss"] = round(cpu["legacy_miss"] / max(1e-9, cpu["fast_miss"]), 1)
+    results["speedup_hit"] = round(cpu["legacy_hit"] / max(1e-9, cpu["fast_hit"]), 1)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JSON response encoding cost: stdlib vs orjson vs cached bytes")
+    parser.add_argument("--cards", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--metrics-json", dest="metrics_json", default="", help="Optional path to store JSON results")
+    args = parser.parse_args()
+
+    results = run(args)
+    print(json.dumps(results, indent=2))
+    if args.metrics_json:
+        Path(args.metrics_json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
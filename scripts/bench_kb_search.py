@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+"""Latency of knowledge base retrieval as the KB grows.
+
+Compares the previous retrieval path (``LIKE '%term%'`` candidate scan plus
+Python TF-IDF over the fetched chunks, reproduced here as ``scan``) with the
+inverted-index BM25 lookup (``index``: result cache cleared before every
+query) and repeated queries served from the per-version cache (``cached``).
+
+Usage:
+    PYTHONPATH=. python scripts/bench_kb_search.py --documents 300 --queries 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from statistics import mean
+from typing import List
+
+_VOCABULARY = (
+    "зарплата график смена офис кандидат собеседование опыт обучение стажировка договор "
+    "отпуск больничный премия бонус клиент продажи звонок оператор склад доставка курьер "
+    "медосмотр документы паспорт анкета испытательный срок наставник адрес метро пропуск "
+    "оформление выплата аванс компенсация питание форма униформа ночная дневная выходные"
+).split()
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, int(round((len(ordered) - 1) * percentile / 100.0)))
+    return ordered[rank]
+
+
+_LETTERS = "абвгдежзиклмнопрстуфхцчшщэюя"
+
+
+def _corpus_vocabulary(rng: random.Random, size: int) -> tuple[list[str], list[float]]:
+    """Domain words plus synthetic filler words with Zipf-like frequencies."""
+    filler = {"".join(rng.choice(_LETTERS) for _ in range(rng.randint(5, 9))) for _ in range(size)}
+    words = list(_VOCABULARY) + sorted(filler)
+    rng.shuffle(words)
+    weights = [1.0 / (rank + 1) for rank in range(len(words))]
+    return words, weights
+
+
+def _document_text(rng: random.Random, vocabulary: tuple[list[str], list[float]], words: int) -> str:
+    tokens, weights = vocabulary
+    sentences = []
+    for _ in range(max(1, words // 12)):
+        sentence = " ".join(rng.choices(tokens, weights=weights, k=12))
+        sentences.append(sentence.capitalize() + ".")
+    return " ".join(sentences)
+
+
+async def _seed(args) -> None:
+    from backend.core.ai.knowledge_base import reindex_document
+    from backend.core.db import async_session, init_models
+    from backend.domain.ai.models import KnowledgeBaseDocument
+
+    await init_models()
+    rng = random.Random(args.seed)
+    vocabulary = _corpus_vocabulary(rng, args.vocabulary)
+    ids: list[int] = []
+    async with async_session() as session:
+        for idx in range(args.documents):
+            doc = KnowledgeBaseDocument(
+                title=f"Документ {idx}",
+                filename=f"doc-{idx}.md",
+                mime_type="text/markdown",
+                content_text=_document_text(rng, vocabulary, args.words),
+                is_active=True,
+            )
+            session.add(doc)
+            await session.flush()
+            ids.append(int(doc.id))
+        await session.commit()
+    for doc_id in ids:
+        await reindex_document(doc_id)
+
+
+async def _legacy_search(query: str, *, limit: int = 5) -> list[int]:
+    """Pre-index retrieval: substring candidate scan + per-query TF-IDF in Python."""
+    from sqlalchemy import func, or_, select
+
+    from backend.core.ai.knowledge_base import extract_query_tokens
+    from backend.core.db import async_session
+    from backend.domain.ai.models import KnowledgeBaseChunk, KnowledgeBaseDocument
+
+    terms = extract_query_tokens(query, max_terms=10)
+    if not terms:
+        return []
+    clauses = [func.lower(KnowledgeBaseChunk.content_text).like(f"%{t}%") for t in terms]
+    async with async_session() as session:
+        chunks = list(
+            (
+                await session.execute(
+                    select(KnowledgeBaseChunk)
+                    .join(KnowledgeBaseDocument, KnowledgeBaseChunk.document_id == KnowledgeBaseDocument.id)
+                    .where(KnowledgeBaseDocument.is_active.is_(True), or_(*clauses))
+                    .limit(max(20, limit * 6))
+                )
+            ).scalars()
+        )
+    doc_freq = {t: sum(1 for ch in chunks if t in ch.content_text.lower()) for t in terms}
+
+    def score(ch) -> float:
+        txt = ch.content_text.lower()
+        length = len(txt) or 1
+        return sum(
+            txt.count(t) / (length / 100) * math.log(1 + len(chunks) / (1 + doc_freq[t])) for t in terms
+        )
+
+    return [int(ch.id) for ch in sorted(chunks, key=score, reverse=True)[:limit]]
+
+
+async def _run_mode(mode: str, queries: list[str]) -> dict:
+    from backend.core.ai import knowledge_base as kb
+
+    latencies: List[float] = []
+    for query in queries:
+        if mode == "index":
+            kb._search_cache.clear()
+        started = time.perf_counter()
+        if mode == "scan":
+            await _legacy_search(query)
+        else:
+            await kb.search_excerpts(query)
+        latencies.append(time.perf_counter() - started)
+    return {
+        "mode": mode,
+        "queries": len(queries),
+        "latency_avg_ms": round(mean(latencies) * 1000, 3),
+        "latency_p95_ms": round(_percentile(latencies, 95.0) * 1000, 3),
+        "latency_p99_ms": round(_percentile(latencies, 99.0) * 1000, 3),
+    }
+
+
+async def run(args) -> dict:
+    data_dir = Path(tempfile.mkdtemp(prefix="kb-search-bench-"))
+    os.environ["DATA_DIR"] = str(data_dir)
+    os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{data_dir / 'bench.db'}")
+    os.environ.setdefault("ENVIRONMENT", "test")
+    os.environ.setdefault("SESSION_SECRET", "bench-session-secret-0123456789abcdef0123")
+    os.environ["REDIS_URL"] = ""
+
+    seed_started = time.perf_counter()
+    await _seed(args)
+    seed_elapsed = time.perf_counter() - seed_started
+
+    from sqlalchemy import func, select
+
+    from backend.core.db import async_session
+    from backend.domain.ai.models import KnowledgeBaseChunk, KnowledgeBasePosting
+
+    async with async_session() as session:
+        chunks = await session.scalar(select(func.count()).select_from(KnowledgeBaseChunk))
+        postings = await session.scalar(select(func.count()).select_from(KnowledgeBasePosting))
+
+    rng = random.Random(args.seed + 1)
+    distinct = [" ".join(rng.sample(_VOCABULARY, 3)) for _ in range(args.distinct_queries)]
+    queries = [rng.choice(distinct) for _ in range(args.queries)]
+    return {
+        "documents": args.documents,
+        "chunks": int(chunks or 0),
+        "postings": int(postings or 0),
+        "seed_and_index_sec": round(seed_elapsed, 3),
+        "results": [await _run_mode(mode, queries) for mode in args.modes],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Knowledge base search benchmark")
+    parser.add_argument("--documents", type=int, default=300)
+    parser.add_argument("--words", type=int, default=600, help="Words per document")
+    parser.add_argument("--vocabulary", type=int, default=5000, help="Synthetic filler vocabulary size")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--distinct-queries", dest="distinct_queries", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["scan", "index", "cached"],
+        default=["scan", "index", "cached"],
+    )
+    parser.add_argument("--metrics-json", dest="metrics_json", default="", help="Optional path to store JSON results")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    if args.metrics_json:
+        Path(args.metrics_json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
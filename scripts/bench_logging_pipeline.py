@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+"""Requests/s of a small ASGI app that logs at INFO on every request.
+
+Compares the synchronous handler chain (``LOG_QUEUE_SIZE=0``: masking,
+formatting and file/console writes on the event loop) with the queued
+pipeline (records handed to a background writer thread). Console writes go
+to a sink that blocks for ``--sink-delay-ms`` to model a congested stderr
+pipe or a busy disk; pass ``0`` to measure pure CPU cost. Also reports the
+per-record cost of the four chained masking filters against the combined
+single-pass ``RedactionFilter``.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_logging_pipeline.py --requests 5000 --concurrency 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from statistics import mean
+from types import SimpleNamespace
+from typing import List
+
+SECRETS = ["bench-bot-token-0123456789", "bench-session-secret-0123456789abcdef0123"]
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, int(round((len(ordered) - 1) * percentile / 100.0)))
+    return ordered[rank]
+
+
+class _SlowSink:
+    """Console stand-in whose writes block like a congested pipe or busy disk."""
+
+    def __init__(self, delay_seconds: float) -> None:
+        self._delay = delay_seconds
+
+    def write(self, text: str) -> int:
+        if self._delay:
+            time.sleep(self._delay)
+        return len(text)
+
+    def flush(self) -> None:
+        return None
+
+
+def _configure(mode: str, args, data_dir: Path) -> None:
+    from backend.core import logging as app_logging
+
+    app_logging.shutdown_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    app_logging._configured = False
+    # The console handler binds sys.stderr when it is created.
+    sys.stderr = _SlowSink(args.sink_delay_ms / 1000.0)
+    app_logging.configure_logging(
+        SimpleNamespace(
+            log_level="INFO",
+            log_json=args.json,
+            log_file=str(data_dir / f"{mode}.log"),
+            data_dir=data_dir,
+            bot_token=SECRETS[0],
+            session_secret=SECRETS[1],
+            log_queue_size=args.queue_size if mode == "queued" else 0,
+            log_duplicate_window_seconds=0.0,
+        )
+    )
+
+
+def _build_app():
+    from fastapi import FastAPI, Request
+
+    logger = logging.getLogger("bench.http")
+    app = FastAPI()
+
+    @app.middleware("http")
+    async def _access_log(request: Request, call_next):
+        started = time.perf_counter()
+        response = await call_next(request)
+        logger.info(
+            "%s %s -> %s in %.2fms",
+            request.method,
+            request.url.path + "?" + request.url.query,
+            response.status_code,
+            (time.perf_counter() - started) * 1000,
+        )
+        return response
+
+    @app.get("/api/candidates/{candidate_id}")
+    async def _candidate(candidate_id: int):
+        logger.info(
+            "candidate viewed",
+            extra={"candidate_id": candidate_id, "phone": "+7 999 123 45 67"},
+        )
+        return {"id": candidate_id}
+
+    return app
+
+
+async def _run_mode(mode: str, args, data_dir: Path) -> dict:
+    import httpx
+
+    _configure(mode, args, data_dir)
+    app = _build_app()
+    latencies: List[float] = []
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for idx in range(args.requests):
+        queue.put_nowait(idx)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def _worker() -> None:
+            while True:
+                try:
+                    idx = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                started = time.perf_counter()
+                response = await client.get(f"/api/candidates/{idx}?token=secret-{idx}")
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    raise RuntimeError(f"unexpected status {response.status_code}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    from backend.core.logging import LOG_RECORDS_DROPPED, shutdown_logging
+
+    drain_started = time.perf_counter()
+    shutdown_logging()
+    drain_elapsed = time.perf_counter() - drain_started
+    return {
+        "mode": mode,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "duration_sec": round(elapsed, 4),
+        "throughput_rps": round(args.requests / elapsed, 2) if elapsed else 0.0,
+        "latency_avg_ms": round(mean(latencies) * 1000, 3) if latencies else 0.0,
+        "latency_p95_ms": round(_percentile(latencies, 95.0) * 1000, 3),
+        "latency_p99_ms": round(_percentile(latencies, 99.0) * 1000, 3),
+        "drain_duration_sec": round(drain_elapsed, 4),
+        "dropped_total": LOG_RECORDS_DROPPED.labels(reason="queue_full")._value.get(),
+    }
+
+
+def _filter_cost(records: int) -> dict:
+    from backend.core.logging import (
+        PhoneMaskingFilter,
+        PIIFilter,
+        RedactionFilter,
+        SecretsFilter,
+        SensitiveQueryParamFilter,
+    )
+
+    def _make() -> logging.LogRecord:
+        record = logging.LogRecord(
+            "bench", logging.INFO, __file__, 1,
+            "GET /api/candidates/%s?token=%s -> %s", ("42", "raw-token", "200"), None,
+        )
+        record.phone = "+7 999 123 45 67"
+        record.path = "/api/candidates/42"
+        return record
+
+    chain = [PIIFilter(), PhoneMaskingFilter(), SensitiveQueryParamFilter(), SecretsFilter(SECRETS)]
+    combined = RedactionFilter(SECRETS)
+    results = {}
+    for name, filters in (("chained", chain), ("combined", [combined])):
+        started = time.perf_counter()
+        for _ in range(records):
+            record = _make()
+            for item in filters:
+                item.filter(record)
+        results[f"{name}_us_per_record"] = round((time.perf_counter() - started) / records * 1_000_000, 2)
+    return results
+
+
+async def run(args) -> dict:
+    data_dir = Path(tempfile.mkdtemp(prefix="logging-bench-"))
+    os.environ["DATA_DIR"] = str(data_dir)
+    real_stderr = sys.stderr
+    try:
+        results = [await _run_mode(mode, args, data_dir) for mode in args.modes]
+    finally:
+        sys.stderr = real_stderr
+    return {"http": results, "masking": _filter_cost(args.filter_records)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Logging pipeline throughput benchmark")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per mode")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--queue-size", dest="queue_size", type=int, default=10000)
+    parser.add_argument("--filter-records", dest="filter_records", type=int, default=20000)
+    parser.add_argument(
+        "--sink-delay-ms",
+        dest="sink_delay_ms",
+        type=float,
+        default=0.2,
+        help="Simulated blocking time of each console write",
+    )
+    parser.add_argument("--json", action="store_true", help="Use the JSON formatter on the console too")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["sync", "queued"],
+        default=["sync", "queued"],
+    )
+    parser.add_argument("--metrics-json", dest="metrics_json", default="", help="Optional path to store JSON results")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    if args.metrics_json:
+        Path(args.metrics_json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
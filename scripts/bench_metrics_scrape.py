@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""Scrape cost of rolling latency quantiles: sample buffers vs DDSketches.
+
+``buffer`` reproduces the previous collector (a 2048-sample deque per key,
+copied and sorted on every scrape); ``sketch`` merges per-worker
+``SlidingSketchWindow`` snapshots the way ``backend.core.fleet_metrics``
+does and reads p50/p95/p99 from the merged sketches.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_metrics_scrape.py --keys 300 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import time
+from collections import deque
+from pathlib import Path
+from statistics import mean
+from typing import List
+
+from backend.core.quantile_sketch import LatencySketch, SlidingSketchWindow
+
+
+def _nearest_rank(values: List[float], q: float) -> float:
+    values.sort()
+    return values[max(0, min(len(values) - 1, int(math.ceil(q * len(values))) - 1))]
+
+
+def _time(fn, iterations: int) -> dict:
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - started)
+    return {
+        "scrape_avg_ms": round(mean(latencies) * 1000, 3),
+        "scrape_max_ms": round(max(latencies) * 1000, 3),
+    }
+
+
+def run(args) -> dict:
+    rng = random.Random(args.seed)
+    keys = [f"route-{idx}" for idx in range(args.keys)]
+
+    buffers = {key: deque(maxlen=2048) for key in keys}
+    windows = [SlidingSketchWindow(window_seconds=60, slices=6) for _ in range(args.workers)]
+    for _ in range(args.samples):
+        key = rng.choice(keys)
+        value = rng.lognormvariate(-3.0, 1.0)
+        buffers[key].append(value)
+        rng.choice(windows).record(key, value)
+
+    def _scrape_buffer() -> None:
+        snapshot = {key: list(values) for key, values in buffers.items()}
+        for values in snapshot.values():
+            for q in (0.5, 0.95, 0.99):
+                _nearest_rank(values, q)
+
+    remote: dict[str, LatencySketch] = {}
+    for window in windows[1:]:
+        for key, sketch in window.merged().items():
+            restored = LatencySketch.from_dict(sketch.to_dict())
+            if key in remote:
+                remote[key].merge(restored)
+            else:
+                remote[key] = restored
+
+    def _scrape_sketch() -> None:
+        merged = windows[0].merged()
+        for key, sketch in remote.items():
+            if key in merged:
+                merged[key].merge(sketch)
+            else:
+                merged[key] = sketch.copy()
+        for sketch in merged.values():
+            sketch.quantiles((0.5, 0.95, 0.99))
+
+    return {
+        "keys": args.keys,
+        "workers": args.workers,
+        "samples": args.samples,
+        "buffer": _time(_scrape_buffer, args.iterations),
+        "sketch": _time(_scrape_sketch, args.iterations),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Metrics scrape cost benchmark")
+    parser.add_argument("--keys", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--samples", type=int, default=1_000_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--metrics-json", dest="metrics_json", default="", help="Optional path to store JSON results")
+    args = parser.parse_args()
+
+    results = run(args)
+    print(json.dumps(results, indent=2))
+    if args.metrics_json:
+        Path(args.metrics_json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
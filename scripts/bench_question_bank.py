@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+"""Event-loop cost of the question bank lookup under concurrent test starts.
+
+Every Test 1 / Test 2 start used to call ``refresh_questions_bank()``: a
+synchronous ``sync_session()`` load of all tests with ``selectinload`` of
+questions and answer options plus a JSON hash of the bank, run on the event
+loop (``legacy``). Now starts call ``ensure_questions_bank()``: a coalesced,
+throttled primary-key read of ``content_versions`` (``versioned``).
+
+``--starts`` coroutines start at once; a ticker task measures how long the
+loop was blocked. An admin edit (content version bump + push invalidation)
+happens in the middle of each run.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_question_bank.py --starts 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, int(round((len(ordered) - 1) * percentile / 100.0)))
+    return ordered[rank]
+
+
+async def _seed() -> None:
+    from backend.core.db import async_engine, async_session, init_models
+    from backend.domain.tests.bootstrap import bootstrap_test_questions
+
+    await init_models()
+    async with async_engine.begin():
+        pass
+    async with async_session() as session:
+        await bootstrap_test_questions(session)
+
+
+async def _admin_edit() -> None:
+    from backend.apps.bot.config import invalidate_questions_bank
+    from backend.core.db import async_session
+    from backend.domain.content_versions import QUESTIONS_BANK, bump_content_version
+
+    async with async_session() as session:
+        await bump_content_version(session, QUESTIONS_BANK)
+        await session.commit()
+    invalidate_questions_bank()
+
+
+async def _run_mode(mode: str, args) -> dict:
+    from backend.apps.bot import config
+
+    config.invalidate_questions_bank()
+    await config.ensure_questions_bank()
+
+    async def start(index: int) -> float:
+        await asyncio.sleep(index * args.spread_ms / 1000.0 / args.starts)
+        started = time.perf_counter()
+        if mode == "legacy":
+            config.refresh_questions_bank()
+        else:
+            await config.ensure_questions_bank()
+        questions = config.get_questions("test2")
+        assert questions
+        return time.perf_counter() - started
+
+    stalls: List[float] = []
+    stop = asyncio.Event()
+
+    async def ticker() -> None:
+        interval = 0.001
+        expected = time.perf_counter() + interval
+        while not stop.is_set():
+            await asyncio.sleep(interval)
+            now = time.perf_counter()
+            stalls.append(max(0.0, now - expected))
+            expected = now + interval
+
+    async def edit_midway() -> None:
+        await asyncio.sleep(args.spread_ms / 2000.0)
+        await _admin_edit()
+
+    ticker_task = asyncio.create_task(ticker())
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    latencies, _ = await asyncio.gather(
+        asyncio.gather(*(start(idx) for idx in range(args.starts))),
+        edit_midway(),
+    )
+    wall_seconds = time.perf_counter() - wall_started
+    cpu_seconds = time.process_time() - cpu_started
+    stop.set()
+    await ticker_task
+    return {
+        "starts": args.starts,
+        "wall_ms": round(wall_seconds * 1000, 1),
+        "cpu_ms": round(cpu_seconds * 1000, 1),
+        "start_latency_p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "start_latency_p95_ms": round(_percentile(latencies, 95) * 1000, 3),
+        "start_latency_max_ms": round(max(latencies) * 1000, 3),
+        "loop_stall_max_ms": round(max(stalls or [0.0]) * 1000, 1),
+        "loop_stall_total_ms": round(sum(stalls) * 1000, 1),
+    }
+
+
+async def run(args) -> dict:
+    data_dir = Path(tempfile.mkdtemp(prefix="question-bank-bench-"))
+    os.environ["DATA_DIR"] = str(data_dir)
+    os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{data_dir / 'bench.db'}")
+    os.environ.setdefault("ENVIRONMENT", "development")
+    os.environ.setdefault("SESSION_SECRET", "bench-session-secret-0123456789abcdef0123")
+    os.environ["REDIS_URL"] = ""
+
+    await _seed()
+    from backend.apps.bot import config
+
+    legacy = await _run_mode("legacy", args)
+    versioned = await _run_mode("versioned", args)
+    return {
+        "questions": {key: len(config.get_questions(key)) for key in ("test1", "test2")},
+        "spread_ms": args.spread_ms,
+        "legacy": legacy,
+        "versioned": versioned,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Question bank lookup under concurrent test starts")
+    parser.add_argument("--starts", type=int, default=500)
+    parser.add_argument("--spread-ms", dest="spread_ms", type=float, default=0.0, help="Spread start times over N ms (0 = all at once)")
+    parser.add_argument("--metrics-json", dest="metrics_json", default="", help="Optional path to store JSON results")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    if args.metrics_json:
+        Path(args.metrics_json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
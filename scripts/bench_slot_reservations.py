@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+"""Booking rush: concurrent candidates racing ``reserve_slot`` for few slots.
+
+``--candidates`` coroutines start at once, each picking a random slot out of
+``--slots`` (spread over ``--recruiters``); a candidate that loses its slot
+retries up to ``--retries`` times with the first alternative offered by the
+``slot_taken`` result, like the bot keyboard does.
+
+Reported: throughput, reservation latency percentiles, outcome counts and a
+consistency check of the resulting rows (``double_bookings`` counts slots
+claimed by more than one winner plus candidates holding more than one
+active slot per recruiter; it must be ``0``).
+
+Runs against a temporary SQLite database by default; pass ``--database-url``
+(e.g. a scratch PostgreSQL) to exercise ``FOR UPDATE SKIP LOCKED``.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_slot_reservations.py --candidates 1000 --slots 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, int(round((len(ordered) - 1) * percentile / 100.0)))
+    return ordered[rank]
+
+
+async def _seed(args) -> tuple[int, list[tuple[int, int]]]:
+    from backend.core.db import async_session, init_models
+    from backend.domain import models
+
+    await init_models()
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+    async with async_session() as session:
+        city = models.City(name="Бенчмарк", tz="Europe/Moscow", active=True)
+        recruiters = [
+            models.Recruiter(name=f"Рекрутер {idx + 1}", tz="Europe/Moscow", active=True)
+            for idx in range(args.recruiters)
+        ]
+        session.add_all([city, *recruiters])
+        await session.flush()
+        slots = [
+            models.Slot(
+                recruiter_id=recruiters[idx % len(recruiters)].id,
+                city_id=city.id,
+                start_utc=start + timedelta(minutes=30 * (idx // len(recruiters))),
+                status=models.SlotStatus.FREE,
+            )
+            for idx in range(args.slots)
+        ]
+        session.add_all(slots)
+        await session.commit()
+        return city.id, [(slot.id, slot.recruiter_id) for slot in slots]
+
+
+async def _verify(winners: dict[int, list[int]]) -> dict:
+    from sqlalchemy import select
+
+    from backend.core.db import async_session
+    from backend.domain import models
+
+    async with async_session() as session:
+        rows = (
+            await session.execute(
+                select(models.Slot.id, models.Slot.recruiter_id, models.Slot.candidate_tg_id).where(
+                    models.Slot.status != models.SlotStatus.FREE
+                )
+            )
+        ).all()
+    holders = Counter((row.candidate_tg_id, row.recruiter_id) for row in rows)
+    claimed_twice = sum(1 for ids in winners.values() if len(ids) > 1)
+    holding_twice = sum(1 for count in holders.values() if count > 1)
+    mismatched = sum(
+        1
+        for row in rows
+        if winners.get(row.id) and winners[row.id][0] != row.candidate_tg_id
+    )
+    return {
+        "slots_taken": len(rows),
+        "double_bookings": claimed_twice + holding_twice + mismatched,
+    }
+
+
+async def run(args) -> dict:
+    data_dir = Path(tempfile.mkdtemp(prefix="slot-reservation-bench-"))
+    os.environ["DATA_DIR"] = str(data_dir)
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{data_dir / 'bench.db'}")
+    os.environ.setdefault("ENVIRONMENT", "development")
+    os.environ.setdefault("SESSION_SECRET", "bench-session-secret-0123456789abcdef0123")
+    os.environ["REDIS_URL"] = ""
+
+    from backend.domain.repositories import reserve_slot
+
+    city_id, slots = await _seed(args)
+    rng = random.Random(args.seed)
+    picks = [rng.choice(slots) for _ in range(args.candidates)]
+    outcomes: Counter = Counter()
+    winners: dict[int, list[int]] = {}
+    latencies: List[float] = []
+    alternatives_offered = 0
+    errors: Counter = Counter()
+    gate = asyncio.Semaphore(args.concurrency) if args.concurrency > 0 else None
+
+    async def attempt(tg_id: int, slot_id: int, recruiter_id: int):
+        started = time.perf_counter()
+        try:
+            if gate is None:
+                return await _reserve(tg_id, slot_id, recruiter_id)
+            async with gate:
+                return await _reserve(tg_id, slot_id, recruiter_id)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    async def _reserve(tg_id: int, slot_id: int, recruiter_id: int):
+        return await reserve_slot(
+            slot_id,
+            candidate_tg_id=tg_id,
+            candidate_fio=f"Кандидат {tg_id}",
+            candidate_tz="Europe/Moscow",
+            candidate_city_id=city_id,
+            expected_recruiter_id=recruiter_id,
+            expected_city_id=city_id,
+        )
+
+    async def candidate(index: int) -> None:
+        nonlocal alternatives_offered
+        tg_id = 90_000_000 + index
+        slot_id, recruiter_id = picks[index]
+        for _ in range(args.retries + 1):
+            try:
+                result = await attempt(tg_id, slot_id, recruiter_id)
+            except Exception as exc:
+                errors[f"{type(exc).__name__}: {str(exc).splitlines()[0][:80]}"] += 1
+                return
+            outcomes[result.status] += 1
+            if result.status == "reserved":
+                winners.setdefault(slot_id, []).append(tg_id)
+                return
+            if result.status != "slot_taken" or not result.alternatives:
+                return
+            alternatives_offered += 1
+            alternative = result.alternatives[0]
+            slot_id, recruiter_id = alternative.id, alternative.recruiter_id
+
+    started = time.perf_counter()
+    await asyncio.gather(*(candidate(idx) for idx in range(args.candidates)))
+    wall_seconds = time.perf_counter() - started
+
+    attempts = len(latencies)
+    return {
+        "database": os.environ["DATABASE_URL"].split(":", 1)[0],
+        "candidates": args.candidates,
+        "slots": args.slots,
+        "attempts": attempts,
+        "wall_ms": round(wall_seconds * 1000, 1),
+        "throughput_attempts_per_s": round(attempts / max(wall_seconds, 1e-9), 1),
+        "latency_p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "latency_p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "latency_max_ms": round(max(latencies or [0.0]) * 1000, 2),
+        "outcomes": dict(outcomes),
+        "alternatives_offered": alternatives_offered,
+        "errors": dict(errors),
+        **(await _verify(winners)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent slot reservations: throughput and double-booking check")
+    parser.add_argument("--candidates", type=int, default=1000)
+    parser.add_argument("--slots", type=int, default=50)
+    parser.add_argument("--recruiters", type=int, default=5)
+    parser.add_argument("--retries", type=int, default=1, help="Retries with the first offered alternative")
+    parser.add_argument("--concurrency", type=int, default=0, help="Max in-flight reservations (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--database-url", dest="database_url", default="", help="Database to run against (default: temp SQLite)")
+    parser.add_argument("--metrics-json", dest="metrics_json", default="", help="Optional path to store JSON results")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    if args.metrics_json:
+        Path(args.metrics_json).write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
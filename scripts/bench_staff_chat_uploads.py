@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""Measure event-loop lag while staff chat attachments are being stored.
+
+Compares the legacy inline path (read whole file + ``write_bytes`` on the loop)
+with the streaming ``_store_attachment`` implementation under concurrent uploads.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from statistics import mean
+from tempfile import SpooledTemporaryFile
+from typing import List
+
+from starlette.datastructures import Headers, UploadFile
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, int(round((len(ordered) - 1) * percentile / 100.0)))
+    return ordered[rank]
+
+
+def _make_upload(payload: bytes, index: int) -> UploadFile:
+    spooled = SpooledTemporaryFile(max_size=1024 * 1024)
+    spooled.write(payload)
+    spooled.seek(0)
+    return UploadFile(
+        spooled,
+        size=len(payload),
+        filename=f"bench_{index}.pdf",
+        headers=Headers({"content-type": "application/pdf"}),
+    )
+
+
+def _legacy_store(data_dir: Path, upload: UploadFile) -> None:
+    upload_dir = data_dir / "staff_uploads" / "legacy"
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    contents = upload.file.read()
+    (upload_dir / f"{uuid.uuid4().hex}.pdf").write_bytes(contents)
+
+
+async def _lag_probe(stop: asyncio.Event, interval: float, samples: List[float]) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - started - interval))
+
+
+async def _run_mode(mode: str, args, data_dir: Path) -> dict:
+    from backend.apps.admin_ui.services import staff_chat
+
+    payloads = [os.urandom(args.size_mb * 1024 * 1024) for _ in range(args.concurrency)]
+    uploads = [_make_upload(payload, idx) for idx, payload in enumerate(payloads)]
+
+    async def _store(upload: UploadFile) -> None:
+        if mode == "legacy":
+            _legacy_store(data_dir, upload)
+            await asyncio.sleep(0)
+        else:
+            await staff_chat._store_attachment(1, upload)
+
+    stop = asyncio.Event()
+    lag: List[float] = []
+    probe = asyncio.create_task(_lag_probe(stop, args.probe_interval, lag))
+    await asyncio.sleep(args.probe_interval * 2)
+    started = time.perf_counter()
+    await asyncio.gather(*(_store(upload) for upload in uploads))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+    for upload in uploads:
+        upload.file.close()
+
+    total_mb = args.size_mb * args.concurrency
+    return {
+        "mode": mode,
+        "uploads": args.concurrency,
+        "size_mb": args.size_mb,
+        "duration_sec": round(elapsed, 4),
+        "throughput_mb_per_sec": round(total_mb / elapsed, 2) if elapsed else 0.0,
+        "loop_lag_avg_ms": round(mean(lag) * 1000, 3) if lag else 0.0,
+        "loop_lag_p99_ms": round(_percentile(lag, 99.0) * 1000, 3),
+        "loop_lag_max_ms": round(max(lag) * 1000, 3) if lag else 0.0,
+    }
+
+
+async def run(args) -> list[dict]:
+    data_dir = Path(tempfile.mkdtemp(prefix="staff-upload-bench-"))
+    os.environ["DATA_DIR"] = str(data_dir)
+    # The service module pulls in db settings on import; nothing here touches the DB.
+    os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{data_dir / 'bench.db'}")
+    os.environ.setdefault("ENVIRONMENT", "test")
+    from backend.core.settings import get_settings
+
+    get_settings.cache_clear()
+    results = []
+    for mode in args.modes:
+        results.append(await _run_mode(mode, args, data_dir))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Staff chat upload event-loop lag benchmark")
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallel uploads per mode")
+    parser.add_argument("--size-mb", type=int, default=20, help="Size of each upload in MiB")
+    parser.add_argument("--probe-interval", type=float, default=0.005, help="Lag probe tick in seconds")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["legacy", "streaming"],
+        default=["legacy", "streaming"],
+    )
+    parser.add_argument("--metrics-json", dest="metrics_json", default="", help="Optional path to store JSON results")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    if args.metrics_json:
+        Path(args.metrics_json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+"""Bytes on the wire and serving cost of SPA assets: plain ``StaticFiles`` vs precompressed.
+
+``baseline`` is the previous setup (``StaticFiles``, identity encoding only);
+``precompressed`` is ``PrecompressedStaticFiles`` picking ``.br``/``.gz``
+siblings by ``Accept-Encoding``. ``revalidate`` replays a cold load with the
+ETags of a warm one (``index.html`` -> ``304``).
+
+By default a synthetic bundle is generated and gzip-compressed in place
+(``.br`` too when the ``brotli`` module is installed). Point ``--dist`` at a
+real ``frontend/dist`` after ``npm run build`` to measure the actual SPA.
+
+Usage:
+    PYTHONPATH=. python scripts/bench_static_assets.py --iterations 50
+    PYTHONPATH=. python scripts/bench_static_assets.py --dist frontend/dist
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from statistics import mean
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.routing import Mount, Route
+from starlette.staticfiles import StaticFiles
+
+from backend.apps.admin_ui.static_assets import PrecompressedStaticFiles, spa_file_response
+
+try:  # optional: only used to synthesize `.br` files
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+def _synthesize(dist: Path, seed: int) -> None:
+    rng = random.Random(seed)
+    words = [f"use{name}" for name in ("State", "Query", "Effect", "Memo", "Callback", "Ref")]
+    assets = dist / "assets"
+    assets.mkdir(parents=True)
+    for index, size in enumerate((480_000, 220_000, 90_000, 40_000)):
+        lines = []
+        total = 0
+        while total < size:
+            line = (
+                f"function f{rng.randrange(10_000)}(a,b){{const [s,set]={rng.choice(words)}"
+                f"({rng.randrange(100)});return a+b+s;}}\n"
+            )
+            lines.append(line)
+            total += len(line)
+        (assets / f"chunk{index}-{rng.randrange(16**8):08x}.js").write_text("".join(lines), encoding="utf-8")
+    css = "".join(f".c{idx}{{margin:{idx % 16}px;color:#{idx % 4096:03x}}}\n" for idx in range(6000))
+    (assets / f"index-{rng.randrange(16**8):08x}.css").write_text(css, encoding="utf-8")
+    scripts = "".join(f'<script type="module" src="/assets/{path.name}"></script>' for path in assets.glob("*.js"))
+    (dist / "index.html").write_text(f"<!doctype html><html><head>{scripts}</head><body></body></html>", encoding="utf-8")
+    for path in [*assets.iterdir(), dist / "index.html"]:
+        data = path.read_bytes()
+        (path.parent / f"{path.name}.gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            (path.parent / f"{path.name}.br").write_bytes(brotli.compress(data, quality=11))
+
+
+def _app(dist: Path, *, precompressed: bool) -> Starlette:
+    assets = dist / "assets"
+    if precompressed:
+        async def index(request: Request):
+            return spa_file_response(request, dist / "index.html", revalidate=True)
+
+        static = PrecompressedStaticFiles(directory=str(assets), immutable_hashed=True)
+    else:
+        async def index(request: Request):
+            from starlette.responses import FileResponse
+
+            return FileResponse(dist / "index.html")
+
+        static = StaticFiles(directory=str(assets))
+    return Starlette(routes=[Route("/app", index), Mount("/assets", static)])
+
+
+async def _load(client: httpx.AsyncClient, paths: list[str], headers: dict[str, str], etags: dict[str, str]) -> tuple[int, int]:
+    wire_bytes = 0
+    not_modified = 0
+    for path in paths:
+        request_headers = dict(headers)
+        if path in etags:
+            request_headers["if-none-match"] = etags[path]
+        response = await client.get(path, headers=request_headers)
+        # httpx decodes bodies; count what the server actually sent.
+        wire_bytes += int(response.headers.get("content-length", len(response.content)))
+        not_modified += response.status_code == 304
+    return wire_bytes, not_modified
+
+
+async def _measure(app: Starlette, paths: list[str], headers: dict[str, str], iterations: int, *, revalidate: bool) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        etags: dict[str, str] = {}
+        if revalidate:
+            for path in paths:
+                etag = (await client.get(path, headers=headers)).headers.get("etag")
+                if etag:
+                    etags[path] = etag
+        durations = []
+        wire_bytes = not_modified = 0
+        for _ in range(iterations):
+            started = time.perf_counter()
+            wire_bytes, not_modified = await _load(client, paths, headers, etags)
+            durations.append(time.perf_counter() - started)
+    return {
+        "bytes_per_load": wire_bytes,
+        "not_modified": not_modified,
+        "load_avg_ms": round(mean(durations) * 1000, 3),
+    }
+
+
+async def run(args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        dist = Path(args.dist) if args.dist else Path(tmp) / "dist"
+        if not args.dist:
+            _synthesize(dist, args.seed)
+        assets = sorted(
+            path for path in (dist / "assets").iterdir() if path.suffix in {".js", ".css"}
+        )
+        paths = ["/app", *(f"/assets/{path.name}" for path in assets)]
+        raw_bytes = (dist / "index.html").stat().st_size + sum(path.stat().st_size for path in assets)
+
+        baseline = _app(dist, precompressed=False)
+        precompressed = _app(dist, precompressed=True)
+        results = {
+            "files": len(paths),
+            "raw_bytes": raw_bytes,
+            "baseline": await _measure(baseline, paths, {"accept-encoding": "gzip, deflate, br"}, args.iterations, revalidate=False),
+        }
+        for name, encoding in (("gzip", "gzip"), ("br", "br, gzip")):
+            results[f"precompressed_{name}"] = await _measure(
+                precompressed, paths, {"accept-encoding": encoding}, args.iterations, revalidate=False
+            )
+        results["revalidate"] = await _measure(
+            precompressed, ["/app"], {"accept-encoding": "br, gzip"}, args.iterations, revalidate=True
+        )
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SPA static asset transfer benchmark")
+    parser.add_argument("--dist", default="", help="Built SPA directory (default: synthetic bundle)")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--metrics-json", dest="metrics_json", default="", help="Optional path to store JSON results")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    if args.metrics_json:
+        Path(args.metrics_json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
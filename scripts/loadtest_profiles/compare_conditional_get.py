@@ -0,0 +1,89 @@
+"""Compare the baseline and conditional phases of conditional_get.sh.
+
+Reads autocannon JSON from ``<out>/baseline`` and ``<out>/conditional`` and the
+``/metrics`` scrapes around each phase, and prints JSON with, per phase,
+requests, 304 share, body bytes per request (autocannon ``throughput.total``)
+and server CPU per 1k requests (``process_cpu_seconds_total`` delta), plus the
+relative savings of the conditional phase and the server-side
+``conditional_get_bytes_saved_total`` delta.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any
+
+_SAMPLE_RE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})?\s+([-+0-9eE.]+)\s*$")
+
+
+def _num(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except Exception:
+        return default
+
+
+def _metric(path: Path, name: str) -> float:
+    total = 0.0
+    if not path.exists():
+        return total
+    for line in path.read_text(encoding="utf-8", errors="ignore").splitlines():
+        match = _SAMPLE_RE.match(line.strip())
+        if match and match.group(1) == name:
+            total += _num(match.group(3))
+    return total
+
+
+def _delta(root: Path, phase: str, name: str) -> float:
+    return _metric(root / f"{phase}_metrics_after.txt", name) - _metric(root / f"{phase}_metrics_before.txt", name)
+
+
+def _phase(root: Path, phase: str) -> dict[str, float]:
+    requests = not_modified = body_bytes = 0.0
+    for path in sorted((root / phase).glob("*.json")):
+        raw = path.read_text(encoding="utf-8").strip()
+        if not raw:
+            continue
+        data = json.loads(raw)
+        requests += _num(data.get("requests", {}).get("total"))
+        body_bytes += _num(data.get("throughput", {}).get("total"))
+        not_modified += _num((data.get("statusCodeStats") or {}).get("304", {}).get("count"))
+    cpu_seconds = _delta(root, phase, "process_cpu_seconds_total")
+    per_request = max(1.0, requests)
+    return {
+        "requests": requests,
+        "not_modified_share": not_modified / per_request,
+        "bytes_per_request": body_bytes / per_request,
+        "cpu_ms_per_1k_requests": cpu_seconds * 1000.0 * 1000.0 / per_request,
+    }
+
+
+def _saved(baseline: float, conditional: float) -> float | None:
+    if baseline <= 0:
+        return None
+    return 1.0 - conditional / baseline
+
+
+def main(argv: list[str]) -> int:
+    if len(argv) != 2:
+        print("Usage: compare_conditional_get.py <out_parent>", file=sys.stderr)
+        return 2
+    root = Path(argv[1])
+    baseline = _phase(root, "baseline")
+    conditional = _phase(root, "conditional")
+    result = {
+        "baseline": baseline,
+        "conditional": conditional,
+        "bandwidth_saved": _saved(baseline["bytes_per_request"], conditional["bytes_per_request"]),
+        "cpu_saved": _saved(baseline["cpu_ms_per_1k_requests"], conditional["cpu_ms_per_1k_requests"]),
+        "server_bytes_saved": _delta(root, "conditional", "conditional_get_bytes_saved_total"),
+    }
+    print(json.dumps(result, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
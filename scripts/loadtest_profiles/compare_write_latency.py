@@ -0,0 +1,87 @@
+"""Compare write latency of write_under_read_spike.sh phases.
+
+Reads autocannon JSON from ``<out>/baseline/writes`` and ``<out>/spike/writes``,
+counts read-side 503s from ``<out>/spike/reads`` and the ``admission_shed_total``
+delta between ``metrics_before.txt``/``metrics_after.txt``, and prints JSON.
+
+``stable`` is true when spike write p99 stays within ``WRITE_P99_MAX_RATIO``
+(default ``2.0``) of the baseline and writes saw no non-2xx/errors/timeouts.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Any
+
+_SHED_RE = re.compile(r'^admission_shed_total\{([^}]*)\}\s+([-+0-9eE.]+)\s*$')
+
+
+def _num(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except Exception:
+        return default
+
+
+def _phase(out_dir: Path) -> dict[str, float]:
+    p50 = p99 = 0.0
+    ok = failed = 0
+    for path in sorted(out_dir.glob("*.json")):
+        raw = path.read_text(encoding="utf-8").strip()
+        if not raw:
+            continue
+        data = json.loads(raw)
+        latency = data.get("latency", {})
+        p50 = max(p50, _num(latency.get("p50")))
+        p99 = max(p99, _num(latency.get("p99")))
+        ok += int(_num(data.get("2xx")))
+        failed += int(_num(data.get("non2xx")) + _num(data.get("errors")) + _num(data.get("timeouts")))
+    return {"p50_ms": p50, "p99_ms": p99, "ok_2xx": ok, "failed": failed}
+
+
+def _shed(path: Path) -> dict[str, float]:
+    out: dict[str, float] = {}
+    if not path.exists():
+        return out
+    for line in path.read_text(encoding="utf-8", errors="ignore").splitlines():
+        match = _SHED_RE.match(line.strip())
+        if not match:
+            continue
+        labels = dict(part.split("=", 1) for part in match.group(1).split(",") if "=" in part)
+        key = "{}:{}".format(labels.get("priority", "").strip('"'), labels.get("reason", "").strip('"'))
+        out[key] = out.get(key, 0.0) + float(match.group(2))
+    return out
+
+
+def main(argv: list[str]) -> int:
+    if len(argv) != 2:
+        print("Usage: compare_write_latency.py <out_parent>", file=sys.stderr)
+        return 2
+    root = Path(argv[1])
+    baseline = _phase(root / "baseline" / "writes")
+    spike = _phase(root / "spike" / "writes")
+    reads = _phase(root / "spike" / "reads")
+    before = _shed(root / "spike" / "metrics_before.txt")
+    after = _shed(root / "spike" / "metrics_after.txt")
+    shed = {key: value - before.get(key, 0.0) for key, value in after.items() if value - before.get(key, 0.0) > 0}
+
+    max_ratio = _num(os.getenv("WRITE_P99_MAX_RATIO"), 2.0)
+    ratio = spike["p99_ms"] / baseline["p99_ms"] if baseline["p99_ms"] > 0 else None
+    result = {
+        "writes_baseline": baseline,
+        "writes_during_spike": spike,
+        "reads_during_spike": reads,
+        "write_p99_ratio": ratio,
+        "admission_shed": shed,
+        "stable": ratio is not None and ratio <= max_ratio and spike["failed"] == 0,
+    }
+    print(json.dumps(result, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,46 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# Bandwidth and CPU saved by ETag/304 revalidation under the mixed profile.
+#
+# Phase 1 (baseline):    PROFILE at TOTAL_RPS, plain GETs (full 200 bodies).
+# Phase 2 (conditional): same load with IF_NONE_MATCH=1, i.e. every Bearer GET
+#                        revalidates with the ETag of a warm-up response.
+#
+# /metrics is scraped around each phase for process CPU and the
+# conditional_get_* counters; compare_conditional_get.py prints the result.
+# Run against a single admin_ui worker so process CPU covers all requests.
+
+BASE_URL="${BASE_URL:-http://127.0.0.1:8000}"
+PROFILE="${PROFILE:-scripts/loadtest_profiles/profiles/mixed.profile}"
+TOTAL_RPS="${TOTAL_RPS:-600}"
+DURATION_SECONDS="${DURATION_SECONDS:-30}"
+
+ADMIN_USER="${ADMIN_USER:-admin}"
+ADMIN_PASSWORD="${ADMIN_PASSWORD:-admin}"
+
+STAMP="$(date +%Y%m%d_%H%M%S)"
+OUT_PARENT="${OUT_PARENT:-.local/loadtest/profiles/conditional_get_${STAMP}}"
+mkdir -p "${OUT_PARENT}"
+
+echo "Conditional GET savings"
+echo "Base URL: ${BASE_URL}"
+echo "Profile:  ${PROFILE} at ${TOTAL_RPS} rps"
+echo "Duration: ${DURATION_SECONDS}s per phase"
+echo "Output:   ${OUT_PARENT}"
+echo ""
+
+export BASE_URL ADMIN_USER ADMIN_PASSWORD DURATION_SECONDS TOTAL_RPS
+
+for phase in baseline conditional; do
+  OUT_DIR="${OUT_PARENT}/${phase}"
+  mkdir -p "${OUT_DIR}"
+  if_none_match=0
+  [[ "${phase}" == "conditional" ]] && if_none_match=1
+  curl -sS "${BASE_URL}/metrics" > "${OUT_PARENT}/${phase}_metrics_before.txt" 2>/dev/null || true
+  PROFILE_PATH="${PROFILE}" OUT_DIR="${OUT_DIR}" IF_NONE_MATCH="${if_none_match}" \
+    ./scripts/loadtest_profiles/run_profile.sh > "${OUT_PARENT}/${phase}_summary.txt"
+  curl -sS "${BASE_URL}/metrics" > "${OUT_PARENT}/${phase}_metrics_after.txt" 2>/dev/null || true
+done
+
+./.venv/bin/python scripts/loadtest_profiles/compare_conditional_get.py "${OUT_PARENT}" | tee "${OUT_PARENT}/result.json"
@@ -0,0 +1,13 @@
+# name|weight(%)|method|path|auth_kind|connections|pipelining
+#
+# Read spike for write_under_read_spike.sh:
+# interactive reads (read_heavy mix) plus the endpoints the SPA polls on a timer
+# (System page, outbox feed, reminder jobs) that admission control treats as background.
+dashboard_summary|30|GET|/api/dashboard/summary|bearer|400|1
+dashboard_incoming_50|10|GET|/api/dashboard/incoming?limit=50|bearer|400|1
+calendar_events_30d|10|GET|/api/calendar/events?start=2026-02-01&end=2026-03-02|bearer|400|1
+candidates_list_page1|15|GET|/api/candidates?page=1&per_page=20|bearer|400|1
+profile|10|GET|/api/profile|bearer|400|1
+poll_notifications_feed|10|GET|/api/notifications/feed?status=pending|bearer|200|1
+poll_reminder_jobs|8|GET|/api/bot/reminders/jobs?limit=50|bearer|200|1
+poll_messenger_health|7|GET|/api/system/messenger-health|bearer|200|1
@@ -0,0 +1,6 @@
+# name|weight(%)|method|path|auth_kind|connections|pipelining|body_file(optional)
+#
+# Constant-rate write probe for write_under_read_spike.sh:
+# - Requires PERF_CANDIDATE_ID to exist.
+# - Low rate on purpose: it measures write latency, it does not load the server.
+chat_send|100|POST|/api/candidates/__CANDIDATE_ID__/chat|bearer_csrf|50|1|scripts/loadtest_profiles/bodies/chat_send.json
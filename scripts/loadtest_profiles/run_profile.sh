@@ -14,6 +14,8 @@ set -euo pipefail
 #
 # Notes:
 # - Token is obtained once and reused for all Bearer requests.
+# - IF_NONE_MATCH=1 replays Bearer GETs as browser revalidations: the ETag of
+#   one warm-up request is sent as If-None-Match (unchanged data -> 304).
 # - This is a diagnostics harness; it will be "client capped" on laptops at high totals.
 
 BASE_URL="${BASE_URL:-http://127.0.0.1:8000}"
@@ -28,6 +30,7 @@ WORKERS="${WORKERS:-2}"
 SAMPLE_INTERVAL_MS="${SAMPLE_INTERVAL_MS:-1000}"
 
 OUT_DIR="${OUT_DIR:-}"
+IF_NONE_MATCH="${IF_NONE_MATCH:-0}"
 
 if [[ -z "${PROFILE_PATH}" ]]; then
   echo "PROFILE_PATH is required (e.g. scripts/loadtest_profiles/profiles/read_heavy.profile)" >&2
@@ -102,6 +105,13 @@ print(max(0, rate))
 PY
 }
 
+fetch_etag() {
+  local url="$1"
+  curl -sS -m 10 --connect-timeout 2 -o /dev/null -D - \
+    -H "Authorization: Bearer ${TOKEN}" "${url}" 2>/dev/null \
+    | awk 'tolower($1) == "etag:" { sub(/\r$/, "", $2); print $2 }' || true
+}
+
 run_one() {
   local name="$1"
   shift
@@ -155,6 +165,12 @@ while IFS="|" read -r name weight method path auth_kind connections pipelining b
 
   if [[ "${auth_kind}" == "bearer" ]]; then
     args=("${common_args[@]}" -m "${method}" -H "${AUTH_HEADER}")
+    if [[ "${IF_NONE_MATCH}" == "1" && "${method}" == "GET" ]]; then
+      etag="$(fetch_etag "${url}")"
+      if [[ -n "${etag}" ]]; then
+        args+=(-H "If-None-Match=${etag}")
+      fi
+    fi
     if ((${#extra_args[@]})); then
       args+=("${extra_args[@]}")
     fi
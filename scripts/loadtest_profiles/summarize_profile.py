@@ -16,6 +16,7 @@ class Row:
     latency_p90_ms: float
     latency_p99_ms: float
     ok_2xx: int
+    not_modified: int
     non2xx: int
     errors: int
     timeouts: int
@@ -44,10 +45,14 @@ def _load(path: Path) -> dict[str, Any] | None:
 
 
 def _error_rate(row: Row) -> float:
-    denom = max(1, row.ok_2xx + row.non2xx + row.errors + row.timeouts)
+    denom = max(1, row.ok_2xx + row.not_modified + row.non2xx + row.errors + row.timeouts)
     return float(row.non2xx + row.errors + row.timeouts) / float(denom)
 
 
+def _status_count(data: dict[str, Any], code: str) -> int:
+    return _int((data.get("statusCodeStats") or {}).get(code, {}).get("count", 0))
+
+
 def main(argv: list[str]) -> int:
     if len(argv) != 2:
         print("Usage: summarize_profile.py <out_dir>", file=sys.stderr)
@@ -73,7 +78,9 @@ def main(argv: list[str]) -> int:
                 latency_p90_ms=_num(data.get("latency", {}).get("p90")),
                 latency_p99_ms=_num(data.get("latency", {}).get("p99")),
                 ok_2xx=_int(data.get("2xx", 0)),
-                non2xx=_int(data.get("non2xx", 0)),
+                # `304 Not Modified` (IF_NONE_MATCH=1 runs) is a success, not an error.
+                not_modified=_status_count(data, "304"),
+                non2xx=_int(data.get("non2xx", 0)) - _status_count(data, "304"),
                 errors=_int(data.get("errors", 0)),
                 timeouts=_int(data.get("timeouts", 0)),
                 requests_total=_int(data.get("requests", {}).get("total")),
@@ -83,17 +90,19 @@ def main(argv: list[str]) -> int:
     rows.sort(key=lambda r: r.name)
     total_rps = sum(r.rps_avg for r in rows)
     total_ok = sum(r.ok_2xx for r in rows)
+    total_304 = sum(r.not_modified for r in rows)
     total_non2xx = sum(r.non2xx for r in rows)
     total_errors = sum(r.errors for r in rows)
     total_timeouts = sum(r.timeouts for r in rows)
-    total_attempts = total_ok + total_non2xx + total_errors + total_timeouts
+    total_attempts = total_ok + total_304 + total_non2xx + total_errors + total_timeouts
     total_error_rate = float(total_non2xx + total_errors + total_timeouts) / float(max(1, total_attempts))
 
     print(f"Total achieved RPS (sum avg): {total_rps:.0f}")
     print(
-        "Total attempts: {} | ok_2xx={} non2xx={} errors={} timeouts={} | error_rate={:.2%}".format(
+        "Total attempts: {} | ok_2xx={} 304={} non2xx={} errors={} timeouts={} | error_rate={:.2%}".format(
             total_attempts,
             total_ok,
+            total_304,
             total_non2xx,
             total_errors,
             total_timeouts,
@@ -109,22 +118,24 @@ def main(argv: list[str]) -> int:
         "p90_ms",
         "p99_ms",
         "ok_2xx",
+        "304",
         "non2xx",
         "errors",
         "timeouts",
         "err_rate",
     )
-    print("{:<22} {:>9} {:>8} {:>8} {:>8} {:>8} {:>7} {:>7} {:>9} {:>8}".format(*header))
-    print("-" * 110)
+    print("{:<22} {:>9} {:>8} {:>8} {:>8} {:>8} {:>7} {:>7} {:>7} {:>9} {:>8}".format(*header))
+    print("-" * 118)
     for r in rows:
         print(
-            "{:<22} {:>9.0f} {:>8.1f} {:>8.1f} {:>8.1f} {:>8} {:>7} {:>7} {:>9} {:>7.2%}".format(
+            "{:<22} {:>9.0f} {:>8.1f} {:>8.1f} {:>8.1f} {:>8} {:>7} {:>7} {:>7} {:>9} {:>7.2%}".format(
                 r.name,
                 r.rps_avg,
                 r.latency_p50_ms,
                 r.latency_p90_ms,
                 r.latency_p99_ms,
                 r.ok_2xx,
+                r.not_modified,
                 r.non2xx,
                 r.errors,
                 r.timeouts,
@@ -0,0 +1,56 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# Write latency under a read spike.
+#
+# Phase 1 (baseline): WRITE_PROFILE alone at WRITE_RPS.
+# Phase 2 (spike):    WRITE_PROFILE at the same WRITE_RPS while READ_PROFILE
+#                     runs at SPIKE_RPS (well past the read knee).
+#
+# With admission control on, write p99 in phase 2 should stay close to the
+# baseline while reads/background polls absorb the overload as 503s.
+
+BASE_URL="${BASE_URL:-http://127.0.0.1:8000}"
+WRITE_PROFILE="${WRITE_PROFILE:-scripts/loadtest_profiles/profiles/write_probe.profile}"
+READ_PROFILE="${READ_PROFILE:-scripts/loadtest_profiles/profiles/read_spike.profile}"
+
+WRITE_RPS="${WRITE_RPS:-20}"
+SPIKE_RPS="${SPIKE_RPS:-2400}"
+DURATION_SECONDS="${DURATION_SECONDS:-30}"
+
+ADMIN_USER="${ADMIN_USER:-admin}"
+ADMIN_PASSWORD="${ADMIN_PASSWORD:-admin}"
+
+STAMP="$(date +%Y%m%d_%H%M%S)"
+OUT_PARENT="${OUT_PARENT:-.local/loadtest/profiles/write_under_read_spike_${STAMP}}"
+mkdir -p "${OUT_PARENT}"
+
+echo "Write latency under read spike"
+echo "Base URL: ${BASE_URL}"
+echo "Writes:   ${WRITE_PROFILE} at ${WRITE_RPS} rps"
+echo "Reads:    ${READ_PROFILE} at ${SPIKE_RPS} rps"
+echo "Duration: ${DURATION_SECONDS}s per phase"
+echo "Output:   ${OUT_PARENT}"
+echo ""
+
+export BASE_URL ADMIN_USER ADMIN_PASSWORD DURATION_SECONDS
+
+OUT_DIR="${OUT_PARENT}/baseline/writes"
+mkdir -p "${OUT_DIR}"
+PROFILE_PATH="${WRITE_PROFILE}" TOTAL_RPS="${WRITE_RPS}" OUT_DIR="${OUT_DIR}" \
+  ./scripts/loadtest_profiles/run_profile.sh > "${OUT_DIR}/summary.txt"
+
+mkdir -p "${OUT_PARENT}/spike/writes" "${OUT_PARENT}/spike/reads"
+curl -sS "${BASE_URL}/metrics" > "${OUT_PARENT}/spike/metrics_before.txt" 2>/dev/null || true
+# Reads outlast the probe on both ends so every write is measured inside the spike.
+PROFILE_PATH="${READ_PROFILE}" TOTAL_RPS="${SPIKE_RPS}" DURATION_SECONDS="$((DURATION_SECONDS + 4))" OUT_DIR="${OUT_PARENT}/spike/reads" \
+  ./scripts/loadtest_profiles/run_profile.sh > "${OUT_PARENT}/spike/reads/summary.txt" &
+reads_pid=$!
+# Let the spike build up before the probe starts.
+sleep 2
+PROFILE_PATH="${WRITE_PROFILE}" TOTAL_RPS="${WRITE_RPS}" OUT_DIR="${OUT_PARENT}/spike/writes" \
+  ./scripts/loadtest_profiles/run_profile.sh > "${OUT_PARENT}/spike/writes/summary.txt"
+wait "${reads_pid}" || true
+curl -sS "${BASE_URL}/metrics" > "${OUT_PARENT}/spike/metrics_after.txt" 2>/dev/null || true
+
+./.venv/bin/python scripts/loadtest_profiles/compare_write_latency.py "${OUT_PARENT}" | tee "${OUT_PARENT}/result.json"
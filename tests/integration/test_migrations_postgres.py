@@ -32,7 +32,7 @@ def _drop_public_tables(engine):
         conn.commit()
 
 
-LATEST_MIGRATION = "0106_chat_message_delivery_recovery_fields"
+LATEST_MIGRATION = "0112_slot_reservation_indexes"
 
 
 def _assert_latest_schema(conn):
@@ -94,6 +94,137 @@ def _assert_latest_schema(conn):
     assert "delivery_next_retry_at" in recovery_index
     assert "delivery_locked_at" in recovery_index
 
+    result = conn.execute(
+        text(
+            """
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_schema = 'public'
+              AND table_name = 'knowledge_base_chunks'
+              AND column_name = 'token_count'
+            """
+        )
+    )
+    assert result.scalar() == "token_count"
+
+    result = conn.execute(
+        text(
+            """
+            SELECT indexname
+            FROM pg_indexes
+            WHERE schemaname = 'public'
+              AND tablename = 'knowledge_base_postings'
+            """
+        )
+    )
+    postings_indexes = {row[0] for row in result}
+    assert "ix_kb_postings_document" in postings_indexes
+    assert "knowledge_base_postings_pkey" in postings_indexes
+
+    kpi_tables = {
+        "kpi_weekly_contributions",
+        "kpi_weekly_members",
+        "kpi_weekly_counters",
+        "kpi_counter_state",
+    }
+    result = conn.execute(
+        text(
+            """
+            SELECT table_name
+            FROM information_schema.tables
+            WHERE table_schema = 'public'
+              AND table_name = ANY(:table_names)
+            """
+        ),
+        {"table_names": list(kpi_tables)},
+    )
+    assert {row[0] for row in result} == kpi_tables
+
+    result = conn.execute(
+        text(
+            """
+            SELECT indexname
+            FROM pg_indexes
+            WHERE schemaname = 'public'
+              AND tablename = 'kpi_weekly_contributions'
+            """
+        )
+    )
+    contribution_indexes = {row[0] for row in result}
+    assert "ix_kpi_weekly_contributions_week" in contribution_indexes
+    assert "ix_kpi_weekly_contributions_candidate" in contribution_indexes
+
+    result = conn.execute(
+        text(
+            """
+            SELECT indexname
+            FROM pg_indexes
+            WHERE schemaname = 'public'
+              AND tablename = 'candidate_chat_threads'
+            """
+        )
+    )
+    thread_indexes = {row[0] for row in result}
+    assert "candidate_chat_threads_pkey" in thread_indexes
+    assert "ix_candidate_chat_threads_last_message_at" in thread_indexes
+
+    result = conn.execute(
+        text(
+            """
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_schema = 'public'
+              AND table_name = 'candidate_chat_reads'
+              AND column_name = 'inbound_seen'
+            """
+        )
+    )
+    assert result.scalar() == "inbound_seen"
+
+    result = conn.execute(
+        text(
+            """
+            SELECT version
+            FROM content_versions
+            WHERE key = 'questions_bank'
+            """
+        )
+    )
+    assert result.scalar() >= 1
+
+    result = conn.execute(
+        text(
+            """
+            SELECT indexname, indexdef
+            FROM pg_indexes
+            WHERE schemaname = 'public'
+              AND tablename = 'slots'
+              AND indexname = ANY(:index_names)
+            """
+        ),
+        {"index_names": ["ix_slots_active_candidate_id", "ix_slots_active_candidate_tg_id"]},
+    )
+    active_slot_indexes = dict(result.all())
+    assert set(active_slot_indexes) == {"ix_slots_active_candidate_id", "ix_slots_active_candidate_tg_id"}
+    for indexdef in active_slot_indexes.values():
+        assert "WHERE" in indexdef
+        assert "'booked'" in indexdef
+
+    result = conn.execute(
+        text(
+            """
+            SELECT indexdef
+            FROM pg_indexes
+            WHERE schemaname = 'public'
+              AND tablename = 'slot_reservation_locks'
+              AND indexname = 'ix_slot_reservation_locks_expires_at'
+            """
+        )
+    )
+    lock_index = result.scalar()
+    assert lock_index is not None
+    assert "expires_at" in lock_index
+
 
 @pytest.mark.no_db_cleanup
 def test_migrations_on_clean_postgres():
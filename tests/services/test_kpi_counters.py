@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.orm import Session
+
+from backend.apps.admin_ui.services.kpi_counters import (
+    ensure_counters_materialized,
+    finalize_due_weeks,
+    load_counter_metrics,
+    reconcile_kpi_counters,
+)
+from backend.apps.admin_ui.services.kpis import (
+    _query_metrics,
+    get_week_window,
+    get_weekly_kpis,
+    reset_weekly_cache,
+)
+from backend.core.db import async_engine, async_session
+from backend.domain import kpi_counters
+from backend.domain.candidates.models import TestResult, User
+from backend.domain.models import (
+    City,
+    KPICounterState,
+    KPIWeekly,
+    KPIWeeklyMember,
+    Recruiter,
+    Slot,
+    SlotStatus,
+)
+
+
+@pytest.fixture
+def counter_hooks(monkeypatch):
+    monkeypatch.setenv("COMPANY_TZ", "Europe/Moscow")
+    was_installed = event.contains(Session, "after_flush", kpi_counters._sync_after_flush)
+    kpi_counters.install_kpi_counter_hooks()
+    yield
+    if not was_installed:
+        kpi_counters.uninstall_kpi_counter_hooks()
+
+
+async def _live_metrics(window, recruiter_id=None):
+    async with async_session() as session:
+        return await _query_metrics(session, window.week_start_utc, window.week_end_utc, recruiter_id=recruiter_id)
+
+
+async def _seed(now: datetime) -> dict:
+    async with async_session() as session:
+        first = Recruiter(name="Счётчик 1", tz="Europe/Moscow", active=True)
+        second = Recruiter(name="Счётчик 2", tz="Europe/Moscow", active=True)
+        city = City(name="Счётчик Сити", tz="Europe/Moscow", active=True)
+        session.add_all([first, second, city])
+        await session.flush()
+        users = [User(fio=f"Кандидат {idx}", city="Москва", responsible_recruiter_id=first.id) for idx in range(3)]
+        session.add_all(users)
+        await session.flush()
+        session.add_all(
+            [
+                TestResult(user_id=users[0].id, raw_score=1, final_score=1.0, rating="A", total_time=10, created_at=now),
+                TestResult(user_id=users[0].id, raw_score=2, final_score=2.0, rating="A", total_time=10, created_at=now),
+                TestResult(user_id=users[1].id, raw_score=3, final_score=3.0, rating="B", total_time=10, created_at=now),
+            ]
+        )
+        slots = [
+            Slot(recruiter_id=first.id, city_id=city.id, start_utc=now + timedelta(days=1), status=SlotStatus.BOOKED,
+                 purpose="interview", candidate_tg_id=501),
+            Slot(recruiter_id=second.id, city_id=city.id, start_utc=now + timedelta(days=2), status=SlotStatus.PENDING,
+                 purpose="interview", candidate_tg_id=501),
+            Slot(recruiter_id=first.id, city_id=city.id, start_utc=now + timedelta(days=3),
+                 status=SlotStatus.CONFIRMED_BY_CANDIDATE, purpose="interview", candidate_tg_id=502,
+                 interview_outcome="success"),
+            Slot(recruiter_id=second.id, city_id=city.id, start_utc=now + timedelta(days=4),
+                 status=SlotStatus.CONFIRMED_BY_CANDIDATE, purpose="intro_day", candidate_tg_id=503),
+            Slot(recruiter_id=first.id, city_id=city.id, start_utc=now + timedelta(days=5), status=SlotStatus.FREE),
+        ]
+        session.add_all(slots)
+        await session.commit()
+        return {
+            "recruiters": (first.id, second.id),
+            "users": [user.id for user in users],
+            "slots": [slot.id for slot in slots],
+        }
+
+
+async def test_flush_hook_keeps_counters_equal_to_recomputation(counter_hooks):
+    now = datetime.now(timezone.utc)
+    window = get_week_window(now=now)
+    tz = "Europe/Moscow"
+    seeded = await _seed(now)
+    first, second = seeded["recruiters"]
+
+    async with async_session() as session:
+        booked, pending, confirmed, intro, free = [await session.get(Slot, slot_id) for slot_id in seeded["slots"]]
+        booked.status = SlotStatus.CANCELED
+        confirmed.interview_outcome = None
+        free.status = SlotStatus.BOOKED
+        free.candidate_tg_id = 504
+        await session.delete(intro)
+        reassigned = await session.get(User, seeded["users"][1])
+        reassigned.responsible_recruiter_id = second
+        await session.commit()
+
+    report = await reconcile_kpi_counters(window.week_start_date, tz_name=tz)
+    assert report.ok, report.mismatches
+
+    async with async_session() as session:
+        session.add(KPICounterState(tz=tz, materialized_since=window.week_start_date))
+        await session.commit()
+    loaded = await load_counter_metrics(tz, [window.week_start_date], scope_ids=[0, first, second])
+    assert loaded[(window.week_start_date, 0)] == await _live_metrics(window)
+    assert loaded[(window.week_start_date, first)] == await _live_metrics(window, recruiter_id=first)
+    assert loaded[(window.week_start_date, second)] == await _live_metrics(window, recruiter_id=second)
+    assert loaded[(window.week_start_date, 0)]["booked"] == 3
+    assert loaded[(window.week_start_date, 0)]["tested"] == 2
+
+
+async def test_bootstrap_reads_and_rollover_finalize_snapshot(counter_hooks):
+    await reset_weekly_cache()
+    now = datetime.now(timezone.utc)
+    window = get_week_window(now=now)
+    await _seed(now)
+
+    assert await ensure_counters_materialized(now) == ["Europe/Moscow"]
+    assert await ensure_counters_materialized(now) == []
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lower())
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        payload = await get_weekly_kpis(now=now)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _record)
+    assert not [statement for statement in statements if "count(distinct" in statement]
+    values = {card["key"]: card["value"] for card in payload["current"]["metrics"]}
+    live = await _live_metrics(window)
+    assert values == live
+
+    # Writes after bootstrap are picked up without another rebuild.
+    async with async_session() as session:
+        user = User(fio="Новый кандидат", city="Москва")
+        session.add(user)
+        await session.flush()
+        session.add(TestResult(user_id=user.id, raw_score=1, final_score=1.0, rating="C", total_time=5))
+        await session.commit()
+    payload = await get_weekly_kpis(now=now)
+    tested = next(card for card in payload["current"]["metrics"] if card["key"] == "tested")
+    assert tested["value"] == live["tested"] + 1
+
+    next_week = now + timedelta(days=7)
+    finalized = await finalize_due_weeks(next_week)
+    assert finalized == [("Europe/Moscow", window.week_start_date)]
+    assert await finalize_due_weeks(next_week) == []
+
+    async with async_session() as session:
+        snapshot = await session.get(KPIWeekly, window.week_start_date)
+        assert snapshot is not None
+        assert snapshot.tested == live["tested"] + 1
+        assert snapshot.booked == live["booked"]
+        stale = await session.scalar(
+            select(KPIWeeklyMember).where(KPIWeeklyMember.week_start < window.week_start_date)
+        )
+        assert stale is None
+
+
+async def test_writes_racing_a_rebuild_skip_rows_it_already_moved(counter_hooks):
+    now = datetime.now(timezone.utc)
+    window = get_week_window(now=now)
+    tz = "Europe/Moscow"
+    seeded = await _seed(now)
+
+    async with async_session() as session:
+        conn = await session.connection()
+        await conn.run_sync(kpi_counters.rebuild_week, tz, window.week_start_date)
+        current = await conn.run_sync(kpi_counters.expected_contributions, tz, window.week_start_date)
+        booked = {item for item in current if item.source_id == seeded["slots"][0]}
+        assert booked
+        # A writer that diffed before the rebuild replays rows the rebuild already wrote or dropped.
+        gone = next(iter(booked))._replace(source_id=seeded["slots"][-1] + 1000)
+        await conn.run_sync(kpi_counters._apply, [gone], booked)
+        await session.commit()
+
+    report = await reconcile_kpi_counters(window.week_start_date, tz_name=tz)
+    assert report.ok, report.mismatches
+    async with async_session() as session:
+        refs = await session.scalar(select(func.max(KPIWeeklyMember.refs)).where(KPIWeeklyMember.tz == tz))
+    assert refs is not None and refs <= 2
+
+
+async def test_reconcile_detects_and_fixes_writes_bypassing_orm(counter_hooks):
+    now = datetime.now(timezone.utc)
+    window = get_week_window(now=now)
+    seeded = await _seed(now)
+
+    async with async_session() as session:
+        await session.execute(delete(Slot).where(Slot.id == seeded["slots"][2]))
+        await session.commit()
+
+    report = await reconcile_kpi_counters(window.week_start_date)
+    mismatched = {(item["metric"], item["scope_id"]) for item in report.mismatches}
+    assert ("confirmed", 0) in mismatched
+    assert ("interview_passed", 0) in mismatched
+    assert not report.fixed
+
+    fixed = await reconcile_kpi_counters(window.week_start_date, fix=True)
+    assert fixed.fixed
+    assert (await reconcile_kpi_counters(window.week_start_date)).ok
+
+
+async def test_bulk_slot_deletes_release_counter_contributions(counter_hooks):
+    from backend.apps.admin_ui.services.slots import delete_all_slots
+
+    now = datetime.now(timezone.utc)
+    window = get_week_window(now=now)
+    await _seed(now)
+
+    deleted, remaining = await delete_all_slots(force=True)
+    assert deleted >= 5
+    assert remaining == 0
+
+    report = await reconcile_kpi_counters(window.week_start_date)
+    assert report.ok, report.mismatches
@@ -222,3 +222,106 @@ async def test_bulk_delete_slots_respects_force():
     )
     assert deleted_force == 1
     assert failed_force == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_slots_for_recruiters_reports_conflicts_per_row():
+    from backend.apps.admin_ui.services.slots import bulk_create_slots_for_recruiters
+
+    async with async_session() as session:
+        first = models.Recruiter(name="Multi A", tz="Europe/Moscow", active=True)
+        second = models.Recruiter(name="Multi B", tz="Asia/Novosibirsk", active=True)
+        city = models.City(name="Multi City", tz="Europe/Moscow", active=True)
+        session.add_all([first, second, city])
+        await session.commit()
+        await session.refresh(first)
+        await session.refresh(second)
+        await session.refresh(city)
+
+    day = date.today() + timedelta(days=14)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+
+    # A manually created 10:10-10:40 slot blocks the 10:00 and 10:30 starts only.
+    async with async_session() as session:
+        session.add(
+            models.Slot(
+                recruiter_id=first.id,
+                city_id=city.id,
+                start_utc=local_naive_to_utc(datetime.fromisoformat(f"{day.isoformat()}T10:10"), "Europe/Moscow"),
+                duration_min=30,
+                status=models.SlotStatus.FREE,
+            )
+        )
+        await session.commit()
+
+    reports, error = await bulk_create_slots_for_recruiters(
+        [first.id, second.id],
+        city_id=city.id,
+        start_date=day.isoformat(),
+        end_date=day.isoformat(),
+        start_time="10:00",
+        end_time="12:00",
+        break_start="00:00",
+        break_end="00:00",
+        step_min=30,
+        include_weekends=False,
+        use_break=False,
+    )
+    assert error is None
+    assert reports[second.id].created == 4
+    assert reports[second.id].conflicts == []
+    assert reports[first.id].created == 2
+    assert [dt.astimezone(timezone.utc).hour for dt in reports[first.id].conflicts] == [7, 7]
+
+    async with async_session() as session:
+        novosibirsk_starts = sorted(
+            await session.scalars(
+                select(models.Slot.start_utc).where(models.Slot.recruiter_id == second.id)
+            )
+        )
+    # 10:00 in Novosibirsk (UTC+7) is 03:00 UTC.
+    assert novosibirsk_starts[0].replace(tzinfo=timezone.utc).hour == 3
+
+
+def test_plan_slot_starts_skips_past_and_weekends():
+    from datetime import time as time_type
+
+    from backend.domain.slot_generation import SlotTemplate, plan_slot_starts
+
+    monday = date(2031, 3, 3)
+    template = SlotTemplate(
+        start_date=monday - timedelta(days=2),
+        end_date=monday,
+        window_start=time_type(9, 0),
+        window_end=time_type(10, 0),
+        step_min=20,
+        break_start=time_type(9, 20),
+        break_end=time_type(9, 40),
+    )
+    now = datetime(2031, 3, 3, 6, 10, tzinfo=timezone.utc)  # 09:10 in Moscow
+    starts = plan_slot_starts(template, "Europe/Moscow", now=now)
+    assert starts == [datetime(2031, 3, 3, 6, 40, tzinfo=timezone.utc)]
+
+
+def test_slot_template_restart_after_break_aligns_afternoon_grid():
+    from datetime import time as time_type
+
+    from backend.domain.slot_generation import SlotTemplate
+
+    kwargs = dict(
+        start_date=date(2031, 3, 3),
+        end_date=date(2031, 3, 3),
+        window_start=time_type(9, 0),
+        window_end=time_type(18, 0),
+        break_start=time_type(12, 0),
+        break_end=time_type(13, 0),
+        step_min=25,
+    )
+    continuous = SlotTemplate(**kwargs).minute_offsets()
+    restarted = SlotTemplate(**kwargs, restart_after_break=True).minute_offsets()
+
+    assert 13 * 60 not in continuous
+    assert 13 * 60 in restarted
+    assert max(m for m in restarted if m < 12 * 60) == 11 * 60 + 55
+    assert restarted[-1] == 17 * 60 + 35
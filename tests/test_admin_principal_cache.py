@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from starlette.requests import Request
+
+from backend.apps.admin_ui.principal_cache import (
+    AdminPrincipalCache,
+    RecruiterLastSeenRecorder,
+    get_admin_principal_cache,
+    install_admin_principal_invalidation_hooks,
+)
+from backend.apps.admin_ui.security import Principal, _resolve_current_principal
+from backend.core.auth import create_access_token
+from backend.core.db import async_session
+from backend.domain.auth_account import AuthAccount
+from backend.domain.models import Recruiter
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _bearer_request(token: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "scheme": "https",
+            "path": "/api/profile",
+            "headers": [(b"authorization", f"Bearer {token}".encode("utf-8"))],
+            "client": ("10.20.30.40", 50000),
+            "server": ("admin.example.test", 443),
+            "session": {},
+        }
+    )
+
+
+@pytest.mark.no_db_cleanup
+def test_cache_entries_expire_and_reject_stale_versions():
+    clock = _Clock()
+    cache = AdminPrincipalCache(ttl_seconds=10, clock=clock)
+    principal = Principal(type="recruiter", id=7)
+
+    version = cache.version("anna")
+    cache.put("anna", principal, username="recruiter:7", recruiter_id=7, account_version=version)
+    assert cache.get("anna").principal == principal
+
+    clock.now += 11
+    assert cache.get("anna") is None
+
+    # A lookup that started before an invalidation must not populate the cache.
+    stale_version = cache.version("anna")
+    cache.invalidate(subjects=["anna"])
+    cache.put("anna", principal, username="recruiter:7", recruiter_id=7, account_version=stale_version)
+    assert cache.get("anna") is None
+
+    cache.put("anna", principal, username="recruiter:7", recruiter_id=7, account_version=cache.version("anna"))
+    cache.invalidate(recruiter_ids=[7])
+    assert cache.get("anna") is None
+
+
+@pytest.fixture
+def principal_cache(monkeypatch):
+    monkeypatch.setenv("ADMIN_PRINCIPAL_CACHE_TTL_SECONDS", "30")
+    from backend.core import settings as settings_module
+
+    settings_module.get_settings.cache_clear()
+    install_admin_principal_invalidation_hooks()
+    cache = get_admin_principal_cache()
+    cache.clear()
+    yield cache
+    cache.clear()
+    settings_module.get_settings.cache_clear()
+
+
+async def _seed_recruiter_account(username: str) -> int:
+    async with async_session() as session:
+        recruiter = Recruiter(name="Cached Recruiter", tz="Europe/Moscow", active=True)
+        session.add(recruiter)
+        await session.flush()
+        session.add(
+            AuthAccount(
+                username=username,
+                password_hash="not-used",
+                principal_type="recruiter",
+                principal_id=recruiter.id,
+                is_active=True,
+            )
+        )
+        await session.commit()
+        return int(recruiter.id)
+
+
+async def test_bearer_principal_is_cached_until_recruiter_is_deactivated(principal_cache):
+    recruiter_id = await _seed_recruiter_account("cached.recruiter")
+    token = create_access_token({"sub": "cached.recruiter"})
+
+    first = await _resolve_current_principal(_bearer_request(token), token=token)
+    second = await _resolve_current_principal(_bearer_request(token), token=token)
+    assert first == second == Principal(type="recruiter", id=recruiter_id)
+    assert principal_cache.stats.hits == 1
+
+    async with async_session() as session:
+        recruiter = await session.get(Recruiter, recruiter_id)
+        recruiter.active = False
+        await session.commit()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await _resolve_current_principal(_bearer_request(token), token=token)
+    assert exc_info.value.status_code == 401
+
+
+async def test_account_role_change_invalidates_cached_principal(principal_cache):
+    await _seed_recruiter_account("promoted.user")
+    token = create_access_token({"sub": "promoted.user"})
+    assert (await _resolve_current_principal(_bearer_request(token), token=token)).type == "recruiter"
+
+    async with async_session() as session:
+        account = await session.scalar(select(AuthAccount).where(AuthAccount.username == "promoted.user"))
+        account.principal_type = "admin"
+        account.principal_id = 1
+        await session.commit()
+
+    promoted = await _resolve_current_principal(_bearer_request(token), token=token)
+    assert promoted == Principal(type="admin", id=1)
+
+
+async def test_last_seen_touches_are_coalesced_into_one_flush():
+    async with async_session() as session:
+        recruiters = [Recruiter(name=f"Seen {idx}", tz="Europe/Moscow", active=True) for idx in range(2)]
+        session.add_all(recruiters)
+        await session.commit()
+        ids = [int(recruiter.id) for recruiter in recruiters]
+
+    recorder = RecruiterLastSeenRecorder()
+    now = datetime.now(timezone.utc)
+    for offset in range(5):
+        for recruiter_id in ids:
+            recorder.touch(recruiter_id, now=now + timedelta(seconds=offset))
+    assert len(recorder) == 2
+
+    assert await recorder.flush() == 2
+    async with async_session() as session:
+        for recruiter_id in ids:
+            stored = (await session.get(Recruiter, recruiter_id)).last_seen_at
+            assert stored is not None
+
+    # Within the minimum interval nothing new is scheduled.
+    recorder.touch(ids[0], now=now + timedelta(minutes=1))
+    assert len(recorder) == 0
+    recorder.touch(ids[0], now=now + timedelta(minutes=6))
+    assert len(recorder) == 1
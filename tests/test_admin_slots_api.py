@@ -1152,3 +1152,12 @@ async def test_api_slots_bulk_create_returns_created_count(admin_slots_app) -> N
     payload = response.json()
     assert payload["ok"] is True
     assert payload["created"] == 2
+    assert payload["recruiters"] == [
+        {
+            "recruiter_id": recruiter_id,
+            "planned": 2,
+            "created": 2,
+            "skipped_existing": 0,
+            "conflicts": [],
+        }
+    ]
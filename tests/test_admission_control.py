@@ -0,0 +1,154 @@
+import asyncio
+
+import httpx
+import pytest
+
+from backend.apps.admin_ui.perf.limits.admission import (
+    AdmissionConfig,
+    AdmissionControlMiddleware,
+    AdmissionController,
+    AdmissionRejected,
+    AimdLimit,
+    Priority,
+    classify,
+)
+
+
+def test_classify_routes_by_method_path_and_header() -> None:
+    assert classify("GET", "/assets/index.js") is None
+    assert classify("GET", "/health") is None
+    assert classify("POST", "/api/candidates/1/chat").priority == Priority.CRITICAL
+    assert classify("POST", "/auth/token").priority == Priority.CRITICAL
+    assert classify("GET", "/api/dashboard/summary").priority == Priority.INTERACTIVE
+    assert classify("GET", "/api/system/messenger-health").priority == Priority.BACKGROUND
+    long_poll = classify("GET", "/api/staff/threads/updates")
+    assert long_poll.priority == Priority.BACKGROUND and long_poll.long_poll
+    headers = [(b"x-request-priority", b"background")]
+    assert classify("GET", "/api/profile", headers).priority == Priority.BACKGROUND
+    # The header can lower priority, never raise it.
+    assert classify("POST", "/api/slots", headers).priority == Priority.CRITICAL
+
+
+def test_aimd_backs_off_on_latency_or_pool_wait_and_recovers() -> None:
+    now = [0.0]
+    config = AdmissionConfig(min_limit=4, max_limit=100, initial_limit=40, latency_target_seconds=0.1)
+    aimd = AimdLimit(config, clock=lambda: now[0])
+
+    aimd.on_sample(2.0, inflight=40)
+    assert aimd.limit == pytest.approx(32)
+    aimd.on_sample(2.0, inflight=40)
+    assert aimd.limit == pytest.approx(32)  # cooldown
+    now[0] = 1.5
+    aimd.on_sample(2.0, inflight=40)
+    assert aimd.limit == pytest.approx(25.6)
+
+    for _ in range(200):
+        aimd.on_sample(0.01, inflight=30)
+    now[0] = 3.0
+    aimd.observe_pool_wait(1.0)
+    limit_before = aimd.limit
+    aimd.on_sample(0.01, inflight=30)
+    assert aimd.limit == pytest.approx(limit_before * 0.8)
+
+    # Stale pool wait no longer holds the limit down; idle limit does not grow.
+    now[0] = 10.0
+    limit_before = aimd.limit
+    aimd.on_sample(0.01, inflight=30)
+    assert aimd.limit > limit_before
+    aimd.on_sample(0.01, inflight=1)
+    assert aimd.limit == pytest.approx(limit_before + 1 / limit_before)
+
+
+@pytest.mark.asyncio
+async def test_writes_keep_headroom_while_reads_queue_and_polls_are_shed() -> None:
+    controller = AdmissionController(
+        AdmissionConfig(min_limit=10, max_limit=10, initial_limit=10, queue_timeout_seconds=0.05)
+    )
+    for _ in range(5):
+        await controller.acquire(Priority.BACKGROUND)
+    with pytest.raises(AdmissionRejected) as shed:
+        await controller.acquire(Priority.BACKGROUND)
+    assert shed.value.reason == "background_shed" and shed.value.retry_after == 10
+    with pytest.raises(AdmissionRejected):
+        controller.check_long_poll()
+
+    for _ in range(3):
+        await controller.acquire(Priority.INTERACTIVE)
+    with pytest.raises(AdmissionRejected) as timed_out:
+        await controller.acquire(Priority.INTERACTIVE)
+    assert timed_out.value.reason == "queue_timeout"
+
+    # Interactive share (8 of 10) is used up, writes still get the remaining slots.
+    assert await controller.acquire(Priority.CRITICAL) == 0.0
+    assert await controller.acquire(Priority.CRITICAL) == 0.0
+    assert controller.inflight == 10
+
+    read = asyncio.create_task(controller.acquire(Priority.INTERACTIVE))
+    write = asyncio.create_task(controller.acquire(Priority.CRITICAL))
+    await asyncio.sleep(0)
+    controller.release(Priority.BACKGROUND, service_seconds=0.01)
+    await asyncio.wait_for(write, timeout=1)
+    assert not read.done()
+    # The read is admitted only once in-flight work drops below its share again.
+    for _ in range(3):
+        controller.release(Priority.BACKGROUND, service_seconds=0.01)
+    await asyncio.wait_for(read, timeout=1)
+    assert controller.inflight == 8
+
+
+@pytest.mark.asyncio
+async def test_middleware_answers_503_with_retry_after() -> None:
+    controller = AdmissionController(AdmissionConfig(min_limit=2, max_limit=2, initial_limit=2))
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    transport = httpx.ASGITransport(app=AdmissionControlMiddleware(app, controller=controller))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        assert (await client.get("/api/system/messenger-health")).status_code == 200
+        assert controller.inflight == 0
+
+        await controller.acquire(Priority.CRITICAL)
+        response = await client.get("/api/system/messenger-health")
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "10"
+        assert response.json() == {"status": "overloaded", "reason": "background_shed"}
+        assert (await client.get("/health")).status_code == 200
+        assert (await client.post("/api/slots")).status_code == 200
+
+
+def test_slow_route_classes_do_not_feed_the_latency_signal() -> None:
+    assert not classify("POST", "/api/ai/candidates/1/summary/refresh").sampled
+    assert not classify("GET", "/api/ai/candidates/1/summary").sampled
+    upload = classify("POST", "/api/staff/threads/1/messages", [(b"content-type", b"multipart/form-data; boundary=x")])
+    assert upload.priority == Priority.CRITICAL and not upload.sampled
+    assert classify("POST", "/api/slots", [(b"content-type", b"application/json")]).sampled
+
+    controller = AdmissionController(AdmissionConfig(min_limit=8, max_limit=100, initial_limit=40))
+    for _ in range(50):
+        controller.release(Priority.CRITICAL, service_seconds=30.0, sampled=False)
+    assert controller.limit == pytest.approx(40)
+    controller.release(Priority.CRITICAL, service_seconds=30.0)
+    assert controller.limit < 40
+
+
+@pytest.mark.asyncio
+async def test_middleware_skips_latency_samples_for_ai_routes() -> None:
+    controller = AdmissionController(
+        AdmissionConfig(min_limit=8, max_limit=100, initial_limit=40, latency_target_seconds=0.001)
+    )
+
+    async def app(scope, receive, send):
+        await asyncio.sleep(0.01)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    transport = httpx.ASGITransport(app=AdmissionControlMiddleware(app, controller=controller))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for _ in range(5):
+            assert (await client.post("/api/ai/candidates/1/summary/refresh")).status_code == 200
+        assert controller.limit == pytest.approx(40)
+        assert controller.inflight == 0
+        assert (await client.post("/api/slots")).status_code == 200
+        assert controller.limit < 40
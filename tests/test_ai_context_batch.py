@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, insert
+
+from backend.apps.admin_ui.security import Principal
+from backend.core.ai import context as context_module
+from backend.core.ai.context import (
+    build_candidate_ai_context,
+    build_candidate_ai_contexts,
+    compute_input_hash,
+    prefetch_candidate_ai_contexts,
+)
+from backend.core.db import async_session
+from backend.domain.analytics_models import analytics_events
+from backend.domain.candidates.models import (
+    ChatMessage,
+    InterviewNote,
+    QuestionAnswer,
+    TestResult,
+    User,
+)
+from backend.domain.candidates.status import CandidateStatus
+from backend.domain.models import City, Recruiter, Slot, recruiter_city_association
+
+NOW = datetime(2026, 3, 10, 12, 0, tzinfo=UTC)
+
+# Hashes of the contexts produced by the per-candidate query path before the
+# batched loader existed. They pin the prompt cache keys: any change here
+# invalidates every cached AI output.
+GOLDEN_HASHES = {
+    (101, False): "0355c7aca39dafd98ad40845b289fd5db281bbf8a2c2f40b02fed15351598793",
+    (101, True): "25ab9cba86f771ff30d921523b1f843a812354010fe0ddfaa6f410e8917bbe79",
+    (102, False): "86996f32f3c739e51e8686ccb06f25788804f7538c1907bb21d9a0f36f96b366",
+    (103, False): "6a58ce530460230819c3d1fbac5fafbaff5b6d08c3ac9a866cd948c21c31c524",
+}
+
+
+class _FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return NOW if tz is not None else NOW.replace(tzinfo=None)
+
+
+@pytest.fixture
+def frozen_now(monkeypatch):
+    monkeypatch.setattr(context_module, "datetime", _FrozenDatetime)
+
+
+async def _seed() -> None:
+    async with async_session() as session:
+        session.add_all(
+            [
+                City(id=11, name="Москва", tz="Europe/Moscow", criteria="Опыт продаж от 1 года", plan_week=5),
+                City(id=12, name="Казань", tz="Europe/Moscow"),
+                Recruiter(id=21, name="Анна", tz="Europe/Moscow"),
+                Recruiter(id=22, name="Олег", tz="Asia/Yekaterinburg"),
+            ]
+        )
+        await session.flush()
+        await session.execute(insert(recruiter_city_association).values(recruiter_id=22, city_id=12))
+        session.add_all(
+            [
+                User(
+                    id=101,
+                    candidate_id="00000000-0000-0000-0000-000000000101",
+                    fio="Иванов Иван",
+                    phone="+79990000101",
+                    telegram_id=700101,
+                    city="г. Москва",
+                    source="bot",
+                    desired_position="Менеджер по продажам",
+                    candidate_status=CandidateStatus.TEST1_COMPLETED,
+                    responsible_recruiter_id=21,
+                    status_changed_at=NOW - timedelta(days=2),
+                    last_activity=NOW - timedelta(hours=3),
+                ),
+                User(
+                    id=102,
+                    candidate_id="00000000-0000-0000-0000-000000000102",
+                    fio="Петров Петр",
+                    city=None,
+                    source="manual",
+                    last_activity=NOW - timedelta(days=5),
+                ),
+                User(
+                    id=103,
+                    candidate_id="00000000-0000-0000-0000-000000000103",
+                    fio="Сидорова Мария",
+                    telegram_user_id=700103,
+                    city="Казань",
+                    source="bot",
+                    candidate_status=CandidateStatus.WAITING_SLOT,
+                    responsible_recruiter_id=22,
+                    last_activity=NOW - timedelta(days=1),
+                ),
+            ]
+        )
+        await session.flush()
+        session.add_all(
+            [
+                TestResult(id=201, user_id=101, raw_score=7, final_score=7.5, rating="TEST1", total_time=300,
+                           created_at=NOW - timedelta(days=3)),
+                TestResult(id=202, user_id=101, raw_score=4, final_score=4.0, rating="TEST1", total_time=280,
+                           created_at=NOW - timedelta(days=4)),
+                TestResult(id=203, user_id=101, raw_score=9, final_score=9.0, rating="TEST2", total_time=600,
+                           created_at=NOW - timedelta(days=1)),
+                TestResult(id=204, user_id=103, raw_score=5, final_score=5.5, rating="test1", total_time=200,
+                           created_at=NOW - timedelta(days=2)),
+            ]
+        )
+        await session.flush()
+        session.add_all(
+            [
+                QuestionAnswer(test_result_id=201, question_index=0, question_text="Сколько вам полных лет?",
+                               user_answer="27", attempts_count=1, time_spent=5),
+                QuestionAnswer(test_result_id=201, question_index=1, question_text="Желаемый уровень дохода?",
+                               user_answer="от 80 000", attempts_count=1, time_spent=9),
+                QuestionAnswer(test_result_id=201, question_index=2,
+                               question_text="Есть ли у вас опыт продаж или переговоров?",
+                               user_answer="Работала бариста и администратором, общалась с клиентами",
+                               attempts_count=1, time_spent=30),
+                QuestionAnswer(test_result_id=202, question_index=0, question_text="Сколько вам полных лет?",
+                               user_answer="26"),
+                QuestionAnswer(test_result_id=203, question_index=0, question_text="Что такое CRM?",
+                               correct_answer="Система учета клиентов", user_answer="Система учета клиентов",
+                               is_correct=True, attempts_count=1, time_spent=12),
+                QuestionAnswer(test_result_id=204, question_index=0, question_text="Что вас мотивирует?",
+                               user_answer="Рост и обучение", attempts_count=2, time_spent=15, overtime=True),
+                InterviewNote(user_id=101, interviewer_name="Анна",
+                              data={"money_expectations": "90 000", "strengths": "Коммуникабельна", "ok": True}),
+                Slot(id=301, recruiter_id=21, city_id=11, start_utc=NOW + timedelta(days=2), status="booked",
+                     candidate_id="00000000-0000-0000-0000-000000000101", candidate_tz="Europe/Moscow"),
+                Slot(id=302, recruiter_id=21, city_id=11, start_utc=NOW - timedelta(days=6), status="canceled",
+                     candidate_tg_id=700101),
+                Slot(id=303, recruiter_id=22, city_id=12, start_utc=NOW + timedelta(days=1), status="pending",
+                     purpose="intro_day", candidate_tg_id=700103),
+            ]
+        )
+        messages = [
+            (101, "inbound", "received", NOW - timedelta(days=1), "Здравствуйте, когда собеседование?"),
+            (101, "outbound", "sent", NOW - timedelta(hours=20), "Завтра в 12:00"),
+            (101, "outbound", "failed", NOW - timedelta(hours=19), "Напоминание"),
+            (101, "inbound", "received", NOW - timedelta(days=10), "Старое сообщение"),
+            (103, "outbound", "sent", NOW - timedelta(days=2), "Выберите время"),
+            (103, "inbound", "received", NOW - timedelta(days=20), None),
+        ]
+        for idx, (cid, direction, status_value, created_at, text) in enumerate(messages):
+            session.add(
+                ChatMessage(
+                    id=401 + idx,
+                    candidate_id=cid,
+                    direction=direction,
+                    status=status_value,
+                    created_at=created_at,
+                    text=text,
+                    author_label="Анна" if direction == "outbound" else None,
+                )
+            )
+        await session.execute(
+            insert(analytics_events),
+            [
+                {"id": 501, "event_name": "test1_completed", "candidate_id": 101, "created_at": NOW - timedelta(days=3)},
+                {"id": 502, "event_name": "slot_booked", "candidate_id": 101, "created_at": NOW - timedelta(days=1)},
+                {"id": 503, "event_name": "waiting_slot", "candidate_id": 103, "created_at": NOW - timedelta(days=2)},
+            ],
+        )
+        await session.commit()
+
+
+async def test_candidate_context_hash_matches_golden(frozen_now):
+    await _seed()
+    admin = Principal(type="admin", id=-1)
+    for (candidate_id, include_pii), expected in GOLDEN_HASHES.items():
+        ctx = await build_candidate_ai_context(candidate_id, principal=admin, include_pii=include_pii)
+        assert compute_input_hash(ctx) == expected, (candidate_id, include_pii)
+
+
+async def test_batch_matches_single_candidate_contexts(frozen_now):
+    await _seed()
+    admin = Principal(type="admin", id=-1)
+    for include_pii in (False, True):
+        batch = await build_candidate_ai_contexts([103, 101, 102, 999], principal=admin, include_pii=include_pii)
+        assert sorted(batch) == [101, 102, 103]
+        for candidate_id, ctx in batch.items():
+            single = await build_candidate_ai_context(candidate_id, principal=admin, include_pii=include_pii)
+            assert compute_input_hash(ctx) == compute_input_hash(single)
+            golden = GOLDEN_HASHES.get((candidate_id, include_pii))
+            if golden is not None:
+                assert compute_input_hash(ctx) == golden
+
+
+async def test_batch_respects_recruiter_scope(frozen_now):
+    await _seed()
+    # Recruiter 22 owns candidate 103 and city 12 only.
+    recruiter = Principal(type="recruiter", id=22)
+    batch = await build_candidate_ai_contexts([101, 102, 103], principal=recruiter)
+    assert sorted(batch) == [103]
+    with pytest.raises(HTTPException) as exc:
+        await build_candidate_ai_context(101, principal=recruiter)
+    assert exc.value.status_code == 404
+
+
+async def test_batch_query_count_does_not_grow_with_candidates(frozen_now):
+    from sqlalchemy import event
+
+    from backend.core.db import async_engine
+
+    await _seed()
+    admin = Principal(type="admin", id=-1)
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _count)
+    try:
+        await build_candidate_ai_contexts([101], principal=admin, include_pii=True)
+        single = len(statements)
+        statements.clear()
+        await build_candidate_ai_contexts([101, 102, 103], principal=admin, include_pii=True)
+        batched = len(statements)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _count)
+    # Only KB excerpt searches depend on the number of distinct candidate queries.
+    assert batched - single <= 2 * 4
+
+
+async def test_prefetched_contexts_serve_single_lookups(frozen_now):
+    await _seed()
+    admin = Principal(type="admin", id=-1)
+    async with prefetch_candidate_ai_contexts([101, 103], principal=admin):
+        async with async_session() as session:
+            await session.execute(delete(ChatMessage))
+            await session.commit()
+        ctx = await build_candidate_ai_context(101, principal=admin)
+        assert compute_input_hash(ctx) == GOLDEN_HASHES[(101, False)]
+        ctx["candidate"]["id"] = -1
+        assert (await build_candidate_ai_context(101, principal=admin))["candidate"]["id"] == 101
+    fresh = await build_candidate_ai_context(101, principal=admin)
+    assert fresh["chat"]["inbound_count"] == 0
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from backend.core.ai.providers import FakeProvider, Usage
+from backend.core.ai.single_flight import (
+    AI_SINGLE_FLIGHT_COALESCED,
+    AI_SINGLE_FLIGHT_SAVED_USD,
+    SingleFlight,
+    reset_ai_single_flight,
+)
+
+try:  # pragma: no cover - optional dependency
+    from fakeredis import aioredis as fakeredis_aioredis
+except Exception:  # pragma: no cover
+    fakeredis_aioredis = None
+
+
+@pytest.fixture
+def fake_ai(monkeypatch):
+    monkeypatch.setenv("AI_ENABLED", "1")
+    monkeypatch.setenv("AI_PROVIDER", "fake")
+    from backend.core import settings as settings_module
+
+    settings_module.get_settings.cache_clear()
+    reset_ai_single_flight()
+    calls: list[str] = []
+    original = FakeProvider.generate_json
+
+    async def counting_generate_json(self, **kwargs):
+        calls.append(kwargs["user_prompt"])
+        await asyncio.sleep(0.05)
+        payload, _ = await original(self, **kwargs)
+        return payload, Usage(tokens_in=1000, tokens_out=500)
+
+    monkeypatch.setattr(FakeProvider, "generate_json", counting_generate_json)
+    try:
+        yield calls
+    finally:
+        reset_ai_single_flight()
+        settings_module.get_settings.cache_clear()
+
+
+async def test_concurrent_identical_generations_call_provider_once(fake_ai):
+    from backend.core.ai.service import AIService
+
+    kind = "candidate_summary_v1"
+    coalesced_before = AI_SINGLE_FLIGHT_COALESCED.labels(kind=kind, source="local")._value.get()
+    saved_before = AI_SINGLE_FLIGHT_SAVED_USD.labels(kind=kind)._value.get()
+
+    async def _request():
+        return await AIService()._generate_json(
+            kind=kind,
+            scope_type="candidate",
+            scope_id=42,
+            input_hash="hash-1",
+            model="fake-model",
+            system_prompt="system",
+            user_prompt="candidate_summary_v1",
+            timeout_seconds=5,
+            max_tokens=800,
+        )
+
+    results = await asyncio.gather(*(_request() for _ in range(50)))
+
+    assert len(fake_ai) == 1
+    payloads = [payload for payload, _ in results]
+    assert all(payload == payloads[0] for payload in payloads)
+    # Every waiter gets its own copy and the tokens are accounted for once.
+    assert len({id(payload) for payload in payloads}) == 50
+    assert sorted(usage.tokens_in for _, usage in results) == [0] * 49 + [1000]
+    assert AI_SINGLE_FLIGHT_COALESCED.labels(kind=kind, source="local")._value.get() - coalesced_before == 49
+    saved = AI_SINGLE_FLIGHT_SAVED_USD.labels(kind=kind)._value.get() - saved_before
+    assert saved == pytest.approx(49 * (1000 * 0.30 + 500 * 1.20) / 1_000_000)
+
+    # A different input hash is a different generation.
+    await AIService()._generate_json(
+        kind=kind,
+        scope_type="candidate",
+        scope_id=42,
+        input_hash="hash-2",
+        model="fake-model",
+        system_prompt="system",
+        user_prompt="candidate_summary_v1",
+        timeout_seconds=5,
+        max_tokens=800,
+    )
+    assert len(fake_ai) == 2
+
+
+async def test_leader_failure_is_shared_and_not_cached():
+    flight = SingleFlight()
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("provider down")
+
+    results = await asyncio.gather(*(flight.run("k:candidate:1:h", failing) for _ in range(5)), return_exceptions=True)
+    assert calls == 1
+    assert all(isinstance(item, RuntimeError) for item in results)
+
+    async def ok():
+        return {"ok": True}, Usage(1, 1)
+
+    assert await flight.run("k:candidate:1:h", ok) == ({"ok": True}, Usage(1, 1))
+
+
+async def test_cancelled_leader_hands_over_to_parked_waiters():
+    flight = SingleFlight()
+    calls = 0
+    leader_started = asyncio.Event()
+
+    async def generate():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            leader_started.set()
+            await asyncio.Event().wait()
+        await asyncio.sleep(0.01)
+        return {"ok": calls}, Usage(10, 5)
+
+    leader = asyncio.create_task(flight.run("k:candidate:2:h", generate))
+    await leader_started.wait()
+    waiters = [asyncio.create_task(flight.run("k:candidate:2:h", generate)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+    results = await asyncio.gather(*waiters)
+    # One waiter became the new leader; the other two joined it.
+    assert calls == 2
+    assert sorted(usage.tokens_in for _, usage in results) == [0, 0, 10]
+    assert all(payload == {"ok": 2} for payload, _ in results)
+
+
+async def test_workers_share_result_through_redis():
+    if fakeredis_aioredis is None:
+        pytest.skip("fakeredis is required for cross-worker single-flight")
+    redis = fakeredis_aioredis.FakeRedis()
+    # Two coordinators model two worker processes sharing one Redis.
+    worker_a = SingleFlight(redis, poll_interval=0.01)
+    worker_b = SingleFlight(redis, poll_interval=0.01)
+    calls = 0
+
+    async def generate():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"summary": "ok"}, Usage(100, 50)
+
+    before = AI_SINGLE_FLIGHT_COALESCED.labels(kind="kind", source="remote")._value.get()
+    first, second = await asyncio.gather(
+        worker_a.run("kind:candidate:7:h", generate),
+        worker_b.run("kind:candidate:7:h", generate),
+    )
+
+    assert calls == 1
+    assert first[0] == second[0] == {"summary": "ok"}
+    assert sorted([first[1], second[1]], key=lambda usage: usage.tokens_in) == [Usage(0, 0), Usage(100, 50)]
+    assert AI_SINGLE_FLIGHT_COALESCED.labels(kind="kind", source="remote")._value.get() - before == 1
+    assert await redis.get("ai:sf:lock:kind:candidate:7:h") is None
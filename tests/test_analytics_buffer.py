@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+from backend.core.db import async_session
+from backend.domain import analytics
+from backend.domain.analytics_buffer import (
+    AnalyticsBufferConfig,
+    AnalyticsEventBuffer,
+    start_analytics_buffer,
+    stop_analytics_buffer,
+)
+from backend.domain.analytics_models import analytics_events
+
+
+async def _event_names() -> list[str]:
+    async with async_session() as session:
+        rows = await session.execute(
+            select(analytics_events.c.event_name).order_by(analytics_events.c.id.asc())
+        )
+        return [row[0] for row in rows]
+
+
+def _row(name: str) -> dict:
+    return {
+        "event_name": name,
+        "user_id": None,
+        "candidate_id": None,
+        "city_id": None,
+        "slot_id": None,
+        "booking_id": None,
+        "metadata": None,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+@pytest.fixture
+async def analytics_buffer():
+    buffer = start_analytics_buffer(AnalyticsBufferConfig(flush_size=3, flush_interval=30.0))
+    try:
+        yield buffer
+    finally:
+        await stop_analytics_buffer()
+
+
+async def test_log_event_is_batched_by_size_and_flushed_on_shutdown(analytics_buffer):
+    for idx in range(4):
+        await analytics.log_event(f"event_{idx}", candidate_id=idx, metadata={"n": idx})
+
+    for _ in range(100):
+        if analytics_buffer.stats.flushed >= 3:
+            break
+        await asyncio.sleep(0.01)
+    assert analytics_buffer.stats.flushes == 1
+    assert await _event_names() == ["event_0", "event_1", "event_2"]
+
+    await stop_analytics_buffer()
+    assert await _event_names() == ["event_0", "event_1", "event_2", "event_3"]
+
+
+async def test_log_event_with_session_stays_synchronous(analytics_buffer):
+    async with async_session() as session:
+        await analytics.log_event("in_transaction", session=session)
+        await session.commit()
+
+    assert await _event_names() == ["in_transaction"]
+    assert len(analytics_buffer) == 0
+
+
+@pytest.mark.no_db_cleanup
+async def test_drop_policies_bound_the_buffer():
+    newest = AnalyticsEventBuffer(AnalyticsBufferConfig(max_events=2, flush_size=10, drop_policy="drop_newest"))
+    assert [await newest.submit(_row(name)) for name in ("a", "b", "c")] == [True, True, False]
+    assert [row["event_name"] for row in newest._rows] == ["a", "b"]
+    assert newest.stats.dropped == {"drop_newest": 1}
+
+    oldest = AnalyticsEventBuffer(AnalyticsBufferConfig(max_events=2, flush_size=10, drop_policy="drop_oldest"))
+    for name in ("a", "b", "c"):
+        assert await oldest.submit(_row(name)) is True
+    assert [row["event_name"] for row in oldest._rows] == ["b", "c"]
+    assert oldest.stats.dropped == {"drop_oldest": 1}
+
+    blocking = AnalyticsEventBuffer(
+        AnalyticsBufferConfig(max_events=1, flush_size=10, drop_policy="block", block_timeout=0.01)
+    )
+    assert await blocking.submit(_row("a")) is True
+    # No flusher is running, so the producer gives up after block_timeout.
+    assert await blocking.submit(_row("b")) is False
+    assert blocking.stats.dropped == {"block_timeout": 1}
+
+
+async def test_block_policy_waits_for_flush():
+    buffer = start_analytics_buffer(
+        AnalyticsBufferConfig(max_events=2, flush_size=2, flush_interval=30.0, drop_policy="block", block_timeout=2.0)
+    )
+    try:
+        results = [await buffer.submit(_row(name)) for name in ("a", "b", "c")]
+    finally:
+        await stop_analytics_buffer()
+    assert results == [True, True, True]
+    assert buffer.stats.dropped == {}
+    assert sorted(await _event_names()) == ["a", "b", "c"]
@@ -1,6 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import json
+
+import pytest
+
 from backend.apps.bot import config
+from backend.domain.content_versions import QUESTIONS_BANK, get_content_version
 
 def test_refresh_questions_bank_updates_globals(monkeypatch):
     sample = {"test1": [{"id": "q1"}], "test2": [{"id": "q2"}]}
@@ -28,3 +34,81 @@ def test_refresh_questions_bank_fallbacks(monkeypatch):
 
     assert config.TEST1_QUESTIONS  # default questions present
     assert config.TEST2_QUESTIONS
+
+
+@pytest.fixture
+def counted_bank(monkeypatch):
+    calls = {"version": 0, "load": 0}
+    db = {"version": 5, "test2": [{"text": "v1"}]}
+
+    async def fake_version(key: str) -> int:
+        calls["version"] += 1
+        await asyncio.sleep(0)
+        return db["version"]
+
+    async def fake_loader(*, include_inactive: bool = False):
+        calls["load"] += 1
+        return {"test1": [{"id": "q1"}], "test2": list(db["test2"])}
+
+    monkeypatch.setattr(config, "get_content_version", fake_version)
+    monkeypatch.setattr(config, "load_all_test_questions_async", fake_loader)
+    monkeypatch.setattr(config, "_QUESTIONS_BANK_DB_VERSION", None)
+    config.invalidate_questions_bank()
+    return calls, db
+
+
+@pytest.mark.asyncio
+async def test_ensure_questions_bank_reloads_only_on_new_db_version(counted_bank, monkeypatch):
+    calls, db = counted_bank
+
+    await config.ensure_questions_bank()
+    assert calls == {"version": 1, "load": 1}
+    assert config.get_questions("test2") == [{"text": "v1"}]
+
+    # Within the check interval readers do not touch the DB at all.
+    await config.ensure_questions_bank()
+    assert calls == {"version": 1, "load": 1}
+
+    # Pushed update with an unchanged revision: one version read, no reload.
+    config.invalidate_questions_bank()
+    await config.ensure_questions_bank()
+    assert calls == {"version": 2, "load": 1}
+
+    # Interval elapsed and admins edited the bank.
+    db.update(version=6, test2=[{"text": "v2"}])
+    monkeypatch.setattr(config, "QUESTIONS_BANK_CHECK_INTERVAL_SECONDS", 0.0)
+    version_before = config.get_questions_bank_version()
+    await config.ensure_questions_bank()
+    assert calls == {"version": 3, "load": 2}
+    assert config.TEST2_QUESTIONS == [{"text": "v2"}]
+    assert config.get_questions_bank_version() == version_before + 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_readers_share_one_check(counted_bank):
+    calls, _ = counted_bank
+
+    await asyncio.gather(*(config.ensure_questions_bank() for _ in range(50)))
+
+    assert calls == {"version": 1, "load": 1}
+
+
+@pytest.mark.asyncio
+async def test_admin_question_edit_bumps_db_version():
+    from backend.apps.admin_ui.services.questions import create_test_question
+
+    before = await get_content_version(QUESTIONS_BANK)
+    ok, question_id, error = await create_test_question(
+        title="Версионированный вопрос",
+        test_id="test2",
+        question_index=None,
+        payload=json.dumps({"text": "Версионированный вопрос", "options": ["Да", "Нет"], "correct": 0}),
+        is_active=True,
+    )
+    assert ok, error
+    assert await get_content_version(QUESTIONS_BANK) == before + 1
+
+    # What the bot does on the questions_changed broadcast.
+    config.invalidate_questions_bank()
+    await config.ensure_questions_bank()
+    assert any(item.get("text") == "Версионированный вопрос" for item in config.get_questions("test2"))
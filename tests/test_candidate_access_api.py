@@ -1518,6 +1518,94 @@ def test_candidate_access_rejects_stale_session_version(candidate_access_client)
     assert response.json()["detail"]["code"] == "stale_session_version"
 
 
+@pytest.fixture
+def cached_candidate_access_client(monkeypatch: pytest.MonkeyPatch, candidate_access_client):
+    monkeypatch.setenv("CANDIDATE_ACCESS_CACHE_TTL_SECONDS", "30")
+    from backend.apps.admin_api.candidate_access.session_cache import (
+        CandidateAccessCacheStats,
+        get_candidate_access_session_cache,
+    )
+
+    get_settings.cache_clear()
+    cache = get_candidate_access_session_cache()
+    cache.clear()
+    cache.stats = CandidateAccessCacheStats()
+    try:
+        yield candidate_access_client, cache
+    finally:
+        cache.clear()
+
+
+def test_candidate_access_cache_serves_repeat_requests(cached_candidate_access_client):
+    client, cache = cached_candidate_access_client
+    seeded = asyncio.run(_seed_candidate_access_scenario(start_param="cached_ref", user_id=710021))
+    headers, _ = _launch_headers(
+        client,
+        user_id=int(seeded["user_id"]),
+        start_param=str(seeded["start_param"]),
+    )
+
+    first = client.get("/api/candidate-access/me", headers=headers)
+    second = client.get("/api/candidate-access/me", headers=headers)
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert cache.stats.stores == 1
+    assert cache.stats.local_hits == 1
+
+    # Cached principals stay bound to the MAX launch they were issued for.
+    other_launch = dict(headers)
+    other_launch["X-Max-Init-Data"] = _generate_max_init_data(
+        user_id=int(seeded["user_id"]),
+        start_param=str(seeded["start_param"]),
+        query_id="query-other",
+    )
+    mismatch = client.get("/api/candidate-access/me", headers=other_launch)
+    assert mismatch.status_code == 403
+    assert mismatch.json()["detail"]["code"] == "provider_session_mismatch"
+
+
+def test_candidate_access_cache_revocation_applies_immediately(cached_candidate_access_client):
+    client, cache = cached_candidate_access_client
+    seeded = asyncio.run(_seed_candidate_access_scenario(start_param="cached_revoke_ref", user_id=710022))
+    headers, _ = _launch_headers(
+        client,
+        user_id=int(seeded["user_id"]),
+        start_param=str(seeded["start_param"]),
+    )
+    assert client.get("/api/candidate-access/me", headers=headers).status_code == 200
+    assert cache.stats.stores == 1
+
+    asyncio.run(
+        _mutate_access_session(
+            int(seeded["candidate_id"]),
+            lambda _session, access_session: _revoke_access_session(access_session),
+        )
+    )
+
+    response = client.get("/api/candidate-access/me", headers=headers)
+    assert response.status_code == 410
+    assert response.json()["detail"]["code"] == "candidate_access_session_revoked"
+
+
+def test_candidate_access_cache_drops_principal_on_session_version_bump(cached_candidate_access_client):
+    client, _cache = cached_candidate_access_client
+    seeded = asyncio.run(_seed_candidate_access_scenario(start_param="cached_stale_ref", user_id=710023))
+    headers, _ = _launch_headers(
+        client,
+        user_id=int(seeded["user_id"]),
+        start_param=str(seeded["start_param"]),
+    )
+    assert client.get("/api/candidate-access/me", headers=headers).status_code == 200
+
+    asyncio.run(_bump_journey_session_version(int(seeded["candidate_id"])))
+
+    response = client.get("/api/candidate-access/me", headers=headers)
+    assert response.status_code == 409
+    assert response.json()["detail"]["code"] == "stale_session_version"
+
+
 def test_candidate_access_rejects_numeric_db_session_id_as_credential(candidate_access_client):
     seeded = asyncio.run(_seed_candidate_access_scenario(start_param="numeric_ref", user_id=710014))
     headers, _ = _launch_headers(
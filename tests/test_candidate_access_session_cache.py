@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from backend.apps.admin_api.candidate_access.auth import CandidateAccessPrincipal
+from backend.apps.admin_api.candidate_access.session_cache import (
+    CACHE_KIND_MAX,
+    CACHE_KIND_WEB,
+    CandidateAccessSessionCache,
+)
+
+try:  # pragma: no cover - optional dependency
+    from fakeredis import aioredis as fakeredis_aioredis
+except Exception:  # pragma: no cover
+    fakeredis_aioredis = None
+
+SECRET = "cache-test-secret-0123456789abcdef0123456789"
+
+
+class _Clock:
+    def __init__(self, start: float = 1_000_000.0) -> None:
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _principal(candidate_id: int = 7, access_session_id: int = 11) -> CandidateAccessPrincipal:
+    return CandidateAccessPrincipal(
+        candidate_id=candidate_id,
+        application_id=None,
+        access_session_id=access_session_id,
+        surface="max_miniapp",
+        provider="max",
+        provider_user_id="9001",
+        auth_method="max_init_data",
+        session_status="active",
+        correlation_id="corr-1",
+        journey_session_id=5,
+        session_version_snapshot=1,
+    )
+
+
+def _cache(clock: _Clock, *, redis=None, ttl: int = 30, max_entries: int = 16) -> CandidateAccessSessionCache:
+    return CandidateAccessSessionCache(
+        ttl_seconds=ttl,
+        secret=SECRET,
+        max_entries=max_entries,
+        shared_client_factory=(lambda: redis) if redis is not None else None,
+        clock=clock,
+    )
+
+
+def _far_expiry() -> datetime:
+    return datetime.now(UTC) + timedelta(hours=8)
+
+
+@pytest.mark.no_db_cleanup
+async def test_local_hit_expires_after_ttl_and_is_scoped_by_kind():
+    clock = _Clock()
+    cache = _cache(clock)
+    principal = _principal()
+    await cache.put(
+        CACHE_KIND_MAX,
+        "token-1",
+        principal,
+        provider_session_id="query-1",
+        session_expires_at=_far_expiry(),
+        validated_at=clock.now,
+    )
+
+    cached = await cache.get(CACHE_KIND_MAX, "token-1")
+    assert cached is not None and cached.principal == principal
+    assert cached.provider_session_id == "query-1"
+    assert await cache.get(CACHE_KIND_WEB, "token-1") is None
+
+    clock.now += 31
+    assert await cache.get(CACHE_KIND_MAX, "token-1") is None
+
+
+@pytest.mark.no_db_cleanup
+async def test_entry_never_outlives_access_session():
+    clock = _Clock(datetime.now(UTC).timestamp())
+    cache = _cache(clock)
+    await cache.put(
+        CACHE_KIND_WEB,
+        "token-1",
+        _principal(),
+        provider_session_id=None,
+        session_expires_at=datetime.fromtimestamp(clock.now + 5, tz=UTC),
+        validated_at=clock.now,
+    )
+    assert await cache.get(CACHE_KIND_WEB, "token-1") is not None
+    clock.now += 6
+    assert await cache.get(CACHE_KIND_WEB, "token-1") is None
+
+
+@pytest.mark.no_db_cleanup
+async def test_lru_is_bounded():
+    clock = _Clock()
+    cache = _cache(clock, max_entries=4)
+    for idx in range(10):
+        await cache.put(
+            CACHE_KIND_WEB,
+            f"token-{idx}",
+            _principal(candidate_id=idx),
+            provider_session_id=None,
+            session_expires_at=_far_expiry(),
+            validated_at=clock.now,
+        )
+    assert len(cache._local) == 4
+    assert await cache.get(CACHE_KIND_WEB, "token-0") is None
+    assert await cache.get(CACHE_KIND_WEB, "token-9") is not None
+
+
+@pytest.mark.no_db_cleanup
+async def test_invalidation_drops_entries_and_rejects_racing_validation():
+    clock = _Clock()
+    cache = _cache(clock)
+    validated_before = clock.now
+    await cache.put(
+        CACHE_KIND_MAX,
+        "token-1",
+        _principal(candidate_id=7),
+        provider_session_id="q",
+        session_expires_at=_far_expiry(),
+        validated_at=validated_before,
+    )
+    clock.now += 1
+    cache.invalidate_local([7])
+    assert await cache.get(CACHE_KIND_MAX, "token-1") is None
+
+    # A request that validated before the revocation must not re-populate the cache.
+    await cache.put(
+        CACHE_KIND_MAX,
+        "token-1",
+        _principal(candidate_id=7),
+        provider_session_id="q",
+        session_expires_at=_far_expiry(),
+        validated_at=validated_before,
+    )
+    assert await cache.get(CACHE_KIND_MAX, "token-1") is None
+
+
+@pytest.mark.no_db_cleanup
+async def test_shared_entries_are_signed_and_invalidated_across_workers():
+    if fakeredis_aioredis is None:
+        pytest.skip("fakeredis is required for shared cache tests")
+    redis = fakeredis_aioredis.FakeRedis()
+    clock = _Clock(datetime.now(UTC).timestamp())
+    worker_a = _cache(clock, redis=redis)
+    worker_b = _cache(clock, redis=redis)
+    principal = _principal(candidate_id=42)
+
+    await worker_a.put(
+        CACHE_KIND_MAX,
+        "token-shared",
+        principal,
+        provider_session_id="query-9",
+        session_expires_at=_far_expiry(),
+        validated_at=clock.now,
+    )
+    keys = [key.decode() for key in await redis.keys("candidate_access:principal:*")]
+    assert keys and all("token-shared" not in key for key in keys)
+
+    shared = await worker_b.get(CACHE_KIND_MAX, "token-shared")
+    assert shared is not None and shared.principal == principal
+    assert worker_b.stats.shared_hits == 1
+
+    # Tampered payloads are ignored.
+    raw = (await redis.get(keys[0])).decode()
+    await redis.set(keys[0], raw.replace('"candidate_id":42', '"candidate_id":43'))
+    worker_c = _cache(clock, redis=redis)
+    assert await worker_c.get(CACHE_KIND_MAX, "token-shared") is None
+    assert worker_c.stats.rejected_signatures == 1
+
+    await redis.set(keys[0], raw)
+    await worker_a.invalidate_shared([42])
+    assert await redis.get(keys[0]) is None
+    worker_b.invalidate_local([42])
+    assert await worker_b.get(CACHE_KIND_MAX, "token-shared") is None
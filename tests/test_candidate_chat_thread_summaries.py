@@ -0,0 +1,171 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete, select
+
+from backend.apps.admin_ui.security import Principal
+from backend.apps.admin_ui.services.candidate_chat_threads import list_threads, mark_read
+from backend.core.db import async_session
+from backend.domain.candidates.chat_threads import refresh_thread_summaries
+from backend.domain.candidates.models import (
+    CandidateChatThread,
+    ChatMessage,
+    ChatMessageDirection,
+    ChatMessageStatus,
+    User,
+)
+from backend.domain.models import City, Recruiter
+
+
+def _message(candidate_id: int, direction: ChatMessageDirection, text: str, created_at: datetime, **kwargs) -> ChatMessage:
+    return ChatMessage(
+        candidate_id=candidate_id,
+        direction=direction.value,
+        channel="telegram",
+        text=text,
+        status=(
+            ChatMessageStatus.RECEIVED.value
+            if direction == ChatMessageDirection.INBOUND
+            else ChatMessageStatus.SENT.value
+        ),
+        created_at=created_at,
+        **kwargs,
+    )
+
+
+async def _thread(candidate_id: int) -> CandidateChatThread | None:
+    async with async_session() as session:
+        return await session.get(CandidateChatThread, candidate_id)
+
+
+async def _recomputed(candidate_id: int) -> CandidateChatThread | None:
+    async with async_session() as session:
+        await session.run_sync(lambda sync_session: refresh_thread_summaries(sync_session.connection(), [candidate_id]))
+        await session.commit()
+    return await _thread(candidate_id)
+
+
+def _summary(thread: CandidateChatThread | None) -> tuple | None:
+    if thread is None:
+        return None
+    return (
+        thread.last_message_id,
+        thread.last_message_text,
+        thread.last_direction,
+        thread.last_status,
+        thread.last_message_kind,
+        thread.inbound_count,
+        thread.last_inbound_at,
+    )
+
+
+@pytest.mark.asyncio
+async def test_chat_writes_keep_thread_summary_equal_to_recomputation() -> None:
+    now = datetime.now(timezone.utc)
+    async with async_session() as session:
+        user = User(fio="Сводка Чата", city="Москва")
+        session.add(user)
+        await session.flush()
+        session.add_all(
+            [
+                _message(user.id, ChatMessageDirection.INBOUND, "Первое", now - timedelta(minutes=10)),
+                _message(user.id, ChatMessageDirection.OUTBOUND, "Ответ", now - timedelta(minutes=5), author_label="Рекрутер"),
+            ]
+        )
+        await session.commit()
+        candidate_id = user.id
+
+    thread = await _thread(candidate_id)
+    assert thread is not None
+    assert thread.last_message_text == "Ответ"
+    assert thread.last_message_kind == "recruiter"
+    assert thread.inbound_count == 1
+
+    # A late-arriving older message must not replace the snapshot.
+    async with async_session() as session:
+        session.add(_message(candidate_id, ChatMessageDirection.INBOUND, "Старое", now - timedelta(hours=1)))
+        await session.commit()
+    thread = await _thread(candidate_id)
+    assert thread.last_message_text == "Ответ"
+    assert thread.inbound_count == 2
+    assert _summary(thread) == _summary(await _recomputed(candidate_id))
+
+    # Status changes of the latest message patch the snapshot in place.
+    async with async_session() as session:
+        latest = await session.scalar(
+            select(ChatMessage).where(ChatMessage.candidate_id == candidate_id, ChatMessage.text == "Ответ")
+        )
+        latest.status = ChatMessageStatus.FAILED.value
+        latest.error = "blocked"
+        await session.commit()
+    thread = await _thread(candidate_id)
+    assert thread.last_status == ChatMessageStatus.FAILED.value
+    assert thread.last_error == "blocked"
+
+    # Deleting the latest message falls back to the previous one.
+    async with async_session() as session:
+        latest = await session.scalar(
+            select(ChatMessage).where(ChatMessage.candidate_id == candidate_id, ChatMessage.text == "Ответ")
+        )
+        await session.delete(latest)
+        await session.commit()
+    thread = await _thread(candidate_id)
+    assert thread.last_message_text == "Первое"
+    assert thread.last_message_kind == "candidate"
+    assert _summary(thread) == _summary(await _recomputed(candidate_id))
+
+    async with async_session() as session:
+        await session.execute(delete(ChatMessage).where(ChatMessage.candidate_id == candidate_id))
+        await session.commit()
+    assert await _recomputed(candidate_id) is None
+
+
+@pytest.mark.asyncio
+async def test_unread_counter_pagination_and_recruiter_scope() -> None:
+    now = datetime.now(timezone.utc)
+    async with async_session() as session:
+        city = City(name="Счётный город", tz="Europe/Moscow", active=True)
+        recruiter = Recruiter(name="Inbox Recruiter", tz="Europe/Moscow", active=True)
+        recruiter.cities.append(city)
+        session.add_all([city, recruiter])
+        await session.flush()
+        own = User(fio="Свой кандидат", city="Другой город", responsible_recruiter_id=recruiter.id)
+        by_city = User(fio="Городской кандидат", city="Счётный город")
+        foreign = User(fio="Чужой кандидат", city="Другой город")
+        session.add_all([own, by_city, foreign])
+        await session.flush()
+        for offset, user in enumerate([own, by_city, foreign]):
+            session.add_all(
+                [
+                    _message(user.id, ChatMessageDirection.INBOUND, "Вопрос", now - timedelta(minutes=30 + offset)),
+                    _message(user.id, ChatMessageDirection.INBOUND, "Ещё вопрос", now - timedelta(minutes=20 + offset)),
+                ]
+            )
+        await session.commit()
+        recruiter_id, own_id, by_city_id, foreign_id = recruiter.id, own.id, by_city.id, foreign.id
+
+    principal = Principal(type="recruiter", id=recruiter_id)
+    payload = await list_threads(principal)
+    assert {item["candidate_id"] for item in payload["threads"]} == {own_id, by_city_id}
+    assert all(item["unread_count"] == 2 for item in payload["threads"])
+    assert payload["has_more"] is False
+
+    first_page = await list_threads(principal, limit=1)
+    second_page = await list_threads(principal, limit=1, offset=1)
+    assert first_page["has_more"] is True
+    assert second_page["has_more"] is False
+    assert {first_page["threads"][0]["candidate_id"], second_page["threads"][0]["candidate_id"]} == {own_id, by_city_id}
+
+    await mark_read(own_id, principal)
+    async with async_session() as session:
+        session.add(_message(own_id, ChatMessageDirection.INBOUND, "Новый вопрос", now))
+        await session.commit()
+
+    unread = await list_threads(principal, unread_only=True)
+    counts = {item["candidate_id"]: item["unread_count"] for item in unread["threads"]}
+    assert counts == {own_id: 1, by_city_id: 2}
+
+    admin_view = await list_threads(Principal(type="admin", id=-1))
+    admin_counts = {item["candidate_id"]: item["unread_count"] for item in admin_view["threads"]}
+    assert admin_counts[own_id] == 3
+    assert foreign_id in admin_counts
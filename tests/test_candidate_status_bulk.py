@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from backend.apps.admin_ui.background_tasks import (
+    get_waiting_candidates_summary,
+    mark_stalled_waiting_candidates,
+)
+from backend.core.db import async_session
+from backend.domain.candidate_status_service import CandidateStatusService
+from backend.domain.candidates.models import CandidateJourneyEvent, User
+from backend.domain.candidates.status import CandidateStatus
+
+_STATE_COLUMNS = (
+    "candidate_status",
+    "workflow_status",
+    "lifecycle_state",
+    "archive_stage",
+    "archive_reason",
+    "final_outcome",
+    "final_outcome_reason",
+)
+
+_START_STATES = [
+    {"candidate_status": CandidateStatus.WAITING_SLOT},
+    {"candidate_status": CandidateStatus.TEST1_COMPLETED, "final_outcome": "attached"},
+    {"candidate_status": None, "final_outcome": "legacy"},
+    {
+        "candidate_status": CandidateStatus.NOT_HIRED,
+        "lifecycle_state": "archived",
+        "archive_stage": "outcome",
+        "archive_reason": "старая причина",
+        "archived_at": datetime(2025, 1, 1, tzinfo=timezone.utc),
+    },
+]
+
+
+async def _create_users(prefix: str) -> list[int]:
+    ids = []
+    async with async_session() as session:
+        for idx, state in enumerate(_START_STATES):
+            user = User(fio=f"{prefix} {idx}", city="Москва", **state)
+            session.add(user)
+            await session.flush()
+            ids.append(int(user.id))
+        await session.commit()
+    return ids
+
+
+async def _snapshot(ids: list[int]) -> list[tuple]:
+    async with async_session() as session:
+        users = (
+            await session.execute(
+                select(User).where(User.id.in_(ids)).order_by(User.id).options(selectinload(User.journey_events))
+            )
+        ).scalars().all()
+        snapshot = []
+        for user in users:
+            events = [
+                (e.event_key, e.stage, e.status_slug, e.actor_type, e.actor_id, e.summary, e.payload_json)
+                for e in user.journey_events
+            ]
+            snapshot.append(
+                (
+                    tuple(getattr(user, column) for column in _STATE_COLUMNS),
+                    user.status_changed_at is not None,
+                    user.archived_at is not None,
+                    events,
+                )
+            )
+        return snapshot
+
+
+@pytest.mark.parametrize(
+    ("target", "reason"),
+    [
+        (CandidateStatus.STALLED_WAITING_SLOT, "mark stalled waiting candidates"),
+        (CandidateStatus.NOT_HIRED, "не пришел на собеседование"),
+        (CandidateStatus.INTRO_DAY_DECLINED_INVITATION, "отказался"),
+        (CandidateStatus.HIRED, "закреплен вручную"),
+    ],
+)
+async def test_bulk_force_matches_per_row_force(target, reason):
+    service = CandidateStatusService()
+    per_row_ids = await _create_users("row")
+    bulk_ids = await _create_users("bulk")
+
+    async with async_session() as session:
+        users = (
+            await session.execute(
+                select(User).where(User.id.in_(per_row_ids)).options(selectinload(User.journey_events))
+            )
+        ).scalars().all()
+        for user in users:
+            await service.force(user, target, reason=reason, actor_id=7)
+        await session.commit()
+
+    result = await service.bulk_force([User.id.in_(bulk_ids)], target, reason=reason, actor_id=7, batch_size=2)
+
+    expected = await _snapshot(per_row_ids)
+    assert result.updated == sum(1 for state in _START_STATES if state["candidate_status"] != target)
+    assert result.batches == 2
+    assert await _snapshot(bulk_ids) == expected
+
+
+async def test_mark_stalled_waiting_candidates_is_chunked_and_grouped_summary():
+    now = datetime.now(timezone.utc)
+    async with async_session() as session:
+        for idx in range(5):
+            session.add(
+                User(
+                    fio=f"Ожидающий {idx}",
+                    city="Казань" if idx % 2 else None,
+                    candidate_status=CandidateStatus.WAITING_SLOT,
+                    status_changed_at=now - timedelta(hours=30 + idx),
+                )
+            )
+        session.add(
+            User(
+                fio="Недавний",
+                city="Казань",
+                candidate_status=CandidateStatus.WAITING_SLOT,
+                status_changed_at=now - timedelta(hours=2),
+            )
+        )
+        await session.commit()
+
+    summary = await get_waiting_candidates_summary(per_city_limit=2)
+    assert set(summary) == {"Казань", "Unknown"}
+    assert [item["name"] for item in summary["Unknown"]] == ["Ожидающий 4", "Ожидающий 2"]
+    assert [item["name"] for item in summary["Казань"]] == ["Ожидающий 3", "Ожидающий 1"]
+    assert summary["Unknown"][0]["waiting_hours"] == 34
+
+    assert await mark_stalled_waiting_candidates(batch_size=2) == 5
+    assert await mark_stalled_waiting_candidates(batch_size=2) == 0
+
+    async with async_session() as session:
+        events = (
+            await session.execute(
+                select(CandidateJourneyEvent).where(CandidateJourneyEvent.event_key == "status_changed")
+            )
+        ).scalars().all()
+    assert len(events) == 5
+    assert {event.status_slug for event in events} == {"stalled_waiting_slot"}
+
+    summary = await get_waiting_candidates_summary()
+    statuses = sorted(item["status"] for items in summary.values() for item in items)
+    assert statuses == ["stalled_waiting_slot"] * 5 + ["waiting_slot"]
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import update
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from backend.apps.admin_ui.middleware import TableVersionBarrierMiddleware
+from backend.apps.admin_ui.perf.cache.conditional import (
+    CONDITIONAL_CACHE_CONTROL,
+    conditional_json,
+    etag_matches,
+)
+from backend.core import cache as cache_module
+from backend.core import table_versions
+from backend.core.cache import CacheClient, CacheConfig
+from backend.core.db import async_session
+from backend.core.table_versions import (
+    REDIS_KEY,
+    bump_tables,
+    install_table_version_hooks,
+    local_version,
+    wait_for_pending_bumps,
+)
+from backend.domain.models import Recruiter
+
+try:
+    from fakeredis import aioredis as fakeredis_aioredis
+except Exception:  # pragma: no cover - optional dependency
+    fakeredis_aioredis = None
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    if fakeredis_aioredis is None:
+        pytest.skip("fakeredis is required for shared cache tests")
+    client = CacheClient(CacheConfig())
+    client._client = fakeredis_aioredis.FakeRedis()
+    monkeypatch.setattr(cache_module, "_cache", client)
+    return client
+
+
+def _client(state: dict) -> httpx.AsyncClient:
+    async def endpoint(request: Request):
+        async def _render() -> JSONResponse:
+            state["renders"] += 1
+            return JSONResponse(state["payload"], status_code=state.get("status", 200))
+
+        return await conditional_json(
+            request,
+            key=f"test:conditional:{state['name']}",
+            depends_on=("test_conditional_items",),
+            ttl_seconds=30.0,
+            render=_render,
+        )
+
+    app = Starlette(routes=[Route("/items", endpoint)])
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def test_if_none_match_uses_weak_comparison() -> None:
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"abcd"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+@pytest.mark.asyncio
+async def test_matching_etag_is_answered_before_render(shared_cache) -> None:
+    state = {"name": "render", "renders": 0, "payload": {"items": [1, 2, 3]}}
+    async with _client(state) as client:
+        first = await client.get("/items")
+        etag = first.headers["etag"]
+        assert first.status_code == 200
+        assert first.headers["cache-control"] == CONDITIONAL_CACHE_CONTROL
+
+        cached = await client.get("/items", headers={"if-none-match": etag})
+        assert cached.status_code == 304
+        assert cached.headers["etag"] == etag
+        assert state["renders"] == 1
+
+        # A commit on another worker moves the signature: render again, same body -> still 304.
+        await shared_cache.client.hincrby(REDIS_KEY, "test_conditional_items", 1)
+        unchanged = await client.get("/items", headers={"if-none-match": etag})
+        assert unchanged.status_code == 304
+        assert state["renders"] == 2
+
+        state["payload"] = {"items": [1, 2, 3, 4]}
+        bump_tables(["test_conditional_items"])
+        await wait_for_pending_bumps()
+        changed = await client.get("/items", headers={"if-none-match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert changed.json() == {"items": [1, 2, 3, 4]}
+
+
+@pytest.mark.asyncio
+async def test_error_responses_get_no_validator() -> None:
+    state = {"name": "error", "renders": 0, "payload": {"status": "degraded"}, "status": 503}
+    async with _client(state) as client:
+        response = await client.get("/items", headers={"if-none-match": "*"})
+        assert response.status_code == 503
+        assert "etag" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_commits_bump_versions_of_written_tables() -> None:
+    install_table_version_hooks()
+    before = local_version("recruiters")
+    async with async_session() as session:
+        session.add(Recruiter(name="Versioned Recruiter", tz="Europe/Moscow", active=True))
+        await session.commit()
+    assert local_version("recruiters") == before + 1
+
+    async with async_session() as session:
+        await session.execute(update(Recruiter).where(Recruiter.name == "Versioned Recruiter").values(active=False))
+        await session.rollback()
+    assert local_version("recruiters") == before + 1
+
+    async with async_session() as session:
+        await session.execute(update(Recruiter).where(Recruiter.name == "Versioned Recruiter").values(active=False))
+        await session.commit()
+    assert local_version("recruiters") == before + 2
+
+
+@pytest.mark.asyncio
+async def test_write_responses_wait_for_version_bumps(monkeypatch) -> None:
+    events: list[str] = []
+
+    async def slow_publish(tables):
+        await asyncio.sleep(0.05)
+        events.append("published")
+
+    monkeypatch.setattr(table_versions, "_publish", slow_publish)
+
+    async def app(scope, receive, send):
+        bump_tables(["test_conditional_items"])
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        events.append("sent")
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    transport = httpx.ASGITransport(app=TableVersionBarrierMiddleware(app))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        assert (await client.post("/items")).status_code == 200
+    assert events == ["published", "sent"]
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import enum
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from uuid import UUID
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from pydantic import BaseModel
+
+from backend.apps.admin_ui.perf.cache import readthrough
+from backend.apps.admin_ui.routers import api_candidates
+from backend.apps.admin_ui.security import Principal, get_current_principal
+from backend.core import cache as cache_module
+from backend.core import microcache
+from backend.core import settings as settings_module
+from backend.core.cache import CacheClient, CacheConfig
+from backend.core.json_response import (
+    EncodedJSON,
+    FastJSONResponse,
+    encode_json,
+    encode_json_stdlib,
+    fast_json_enabled,
+)
+from backend.domain.candidates import services as candidate_services
+from backend.domain.candidates.status import CandidateStatus
+
+try:
+    from fakeredis import aioredis as fakeredis_aioredis
+except Exception:  # pragma: no cover - optional dependency
+    fakeredis_aioredis = None
+
+
+class _Channel(str, enum.Enum):
+    TELEGRAM = "telegram"
+    MAX = "max"
+
+
+class _Card(BaseModel):
+    id: int
+    seen_at: datetime | None = None
+
+
+@dataclass
+class _Slot:
+    start_utc: datetime
+    duration_min: int
+
+
+def _payload() -> dict:
+    moment = datetime(2026, 3, 1, 9, 30, 15, 120000, tzinfo=timezone.utc)
+    return {
+        "aware": moment,
+        "naive": datetime(2026, 3, 1, 9, 30),
+        "day": date(2026, 3, 1),
+        "at": time(9, 30),
+        "uuid": UUID("12345678-1234-5678-1234-567812345678"),
+        "amount": Decimal("12.50"),
+        "channel": _Channel.MAX,
+        "tags": ("a", "b"),
+        "card": _Card(id=7, seen_at=moment),
+        "slot": _Slot(start_utc=moment, duration_min=30),
+        "counts": {1: 2, 3: 4},
+        "text": "Кандидат «Иванов»",
+        "none": None,
+        "nested": [{"ok": True, "ratio": 0.25}],
+    }
+
+
+def _settings(monkeypatch, enabled: bool) -> None:
+    monkeypatch.setenv("ADMIN_FAST_JSON_ENABLED", "1" if enabled else "0")
+    settings_module.get_settings.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_settings():
+    yield
+    settings_module.get_settings.cache_clear()
+
+
+def test_fast_encoding_matches_legacy_encoder(monkeypatch) -> None:
+    _settings(monkeypatch, True)
+    payload = _payload()
+    legacy = encode_json_stdlib(payload)
+    assert json.loads(encode_json(payload)) == json.loads(legacy)
+    assert json.loads(FastJSONResponse(payload).body) == json.loads(legacy)
+
+    # Over 64 bits orjson refuses the value: the stdlib path takes over.
+    assert encode_json({"big": 2**70}) == encode_json_stdlib({"big": 2**70})
+
+    _settings(monkeypatch, False)
+    assert not fast_json_enabled()
+    assert encode_json(payload) == legacy
+
+
+def test_encoded_body_is_sent_as_is() -> None:
+    body = b'{"items":[],"total":0}'
+    response = FastJSONResponse(EncodedJSON(body))
+    assert response.body is body
+    assert response.headers["content-type"] == "application/json"
+
+
+@pytest.mark.asyncio
+async def test_json_readthrough_caches_encoded_bytes(monkeypatch) -> None:
+    if fakeredis_aioredis is None:
+        pytest.skip("fakeredis is required for shared cache tests")
+    client = CacheClient(CacheConfig())
+    client._client = fakeredis_aioredis.FakeRedis()
+    monkeypatch.setattr(cache_module, "_cache", client)
+    monkeypatch.setenv("ENVIRONMENT", "development")
+    monkeypatch.delenv("PYTEST_CURRENT_TEST", raising=False)
+    microcache.clear()
+
+    calls = 0
+
+    async def compute() -> dict:
+        nonlocal calls
+        calls += 1
+        return {"at": datetime(2026, 3, 1, tzinfo=timezone.utc), "calls": calls}
+
+    first = await readthrough.get_or_compute_json("perf:test:json:v1", ttl_seconds=30.0, compute=compute)
+    assert json.loads(first) == {"at": "2026-03-01T00:00:00+00:00", "calls": 1}
+    assert await client.client.get("perf:test:json:v1:json") in (first, first.decode("utf-8"))
+
+    # Another worker: microcache is cold, Redis returns the stored body.
+    microcache.clear()
+    second = await readthrough.get_or_compute_json("perf:test:json:v1", ttl_seconds=30.0, compute=compute)
+    assert second == first
+    assert calls == 1
+    microcache.clear()
+
+
+@pytest.mark.asyncio
+async def test_candidates_list_body_is_unchanged_by_fast_path(monkeypatch) -> None:
+    candidate = await candidate_services.create_or_update_user(
+        telegram_id=79991230471,
+        fio="Кандидат Fast JSON",
+        city="Москва",
+        username="candidate_fast_json",
+        initial_status=CandidateStatus.LEAD,
+    )
+    assert candidate is not None
+
+    app = FastAPI()
+    app.include_router(api_candidates.router)
+    app.dependency_overrides[get_current_principal] = lambda: Principal(type="admin", id=-1)
+
+    bodies = {}
+    for enabled in (False, True):
+        _settings(monkeypatch, enabled)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            # Cached first page and uncached search page.
+            cached = await client.get("/api/candidates?page=1&per_page=20&pipeline=interview")
+            searched = await client.get("/api/candidates?page=1&per_page=20&search=Fast%20JSON")
+        assert cached.status_code == 200
+        assert searched.status_code == 200
+        bodies[enabled] = (cached.json(), searched.json())
+
+    assert bodies[True] == bodies[False]
+    cards = bodies[True][1]["views"]["candidates"]
+    assert any(card.get("id") == candidate.id for card in cards)
@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from backend.core.fleet_metrics import FleetMetrics, InMemoryFleetMetricsBackend
+from backend.core.quantile_sketch import LatencySketch, SlidingSketchWindow
+
+
+def _exact(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_sketch_quantiles_stay_within_relative_accuracy_after_merge() -> None:
+    rng = random.Random(11)
+    left_values = [rng.lognormvariate(-3.0, 1.0) for _ in range(5000)]
+    right_values = [rng.lognormvariate(-1.0, 0.5) for _ in range(5000)]
+    left, right = LatencySketch(), LatencySketch()
+    for value in left_values:
+        left.add(value)
+    for value in right_values:
+        right.add(value)
+
+    restored = LatencySketch.from_dict(right.to_dict())
+    left.merge(restored)
+    combined = left_values + right_values
+    assert left.count == len(combined)
+    assert left.sum == pytest.approx(sum(combined))
+    for q in (0.5, 0.95, 0.99):
+        assert left.quantile(q) == pytest.approx(_exact(combined, q), rel=0.02)
+
+
+def test_sliding_window_expires_old_slices() -> None:
+    now = [0.0]
+    window: SlidingSketchWindow[str] = SlidingSketchWindow(window_seconds=60, slices=6, clock=lambda: now[0])
+    window.record("a", 1.0)
+    now[0] = 30.0
+    window.record("a", 2.0)
+    assert window.merged()["a"].count == 2
+    now[0] = 65.0
+    assert window.merged()["a"].count == 1
+    now[0] = 200.0
+    assert window.merged() == {}
+
+
+@pytest.mark.asyncio
+async def test_workers_merge_sketches_and_counters_through_shared_backend() -> None:
+    backend = InMemoryFleetMetricsBackend()
+    windows = {name: SlidingSketchWindow(window_seconds=60, slices=6) for name in ("w1", "w2")}
+    counters = {"w1": {"completions": 3}, "w2": {"completions": 4, "rejection:age": 1}}
+    workers = {}
+    for name in ("w1", "w2"):
+        fleet = FleetMetrics(worker_id=name)
+        fleet.register_sketches("http_latency", windows[name].merged)
+        fleet.register_counters("bot_test1", lambda name=name: counters[name])
+        workers[name] = fleet
+
+    for _ in range(100):
+        windows["w1"].record("GET /api", 0.010)
+        windows["w2"].record("GET /api", 0.200)
+    windows["w2"].record("POST /api", 0.050)
+
+    await workers["w1"].sync_once(backend, ttl_seconds=15)
+    assert await workers["w2"].sync_once(backend, ttl_seconds=15) == 1
+    await workers["w1"].sync_once(backend, ttl_seconds=15)
+
+    for fleet in workers.values():
+        assert fleet.worker_count == 2
+        merged = fleet.sketches("http_latency")
+        assert merged["GET /api"].count == 200
+        assert merged["POST /api"].count == 1
+        assert merged["GET /api"].quantile(0.95) == pytest.approx(0.2, rel=0.02)
+        assert fleet.counters("bot_test1") == {"completions": 7, "rejection:age": 1}
+
+    # Fresh local samples are visible before the next sync; remote ones are cached.
+    windows["w1"].record("GET /api", 0.010)
+    assert workers["w1"].sketches("http_latency")["GET /api"].count == 201
+
+
+def test_prometheus_collector_reports_sketch_quantiles() -> None:
+    from backend.apps.admin_ui.perf.metrics import prometheus
+
+    for value in (0.01, 0.02, 0.03, 0.5):
+        prometheus.observe_http(
+            route="/fleet-test", method="GET", status_code=200, outcome="success", duration_seconds=value
+        )
+    families = {family.name: family for family in prometheus._LatencyQuantilesCollector().collect()}
+    samples = {
+        sample.labels["route"]: sample.value
+        for sample in families["latency_p99_seconds"].samples
+        if sample.labels.get("route") == "/fleet-test"
+    }
+    assert samples["/fleet-test"] == pytest.approx(0.5, rel=0.02)
+    assert families["metrics_fleet_workers"].samples[0].value >= 1
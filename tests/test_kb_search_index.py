@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from sqlalchemy import func, select, update
+
+from backend.core.ai import knowledge_base as kb
+from backend.core.db import async_session
+from backend.domain.ai.models import KnowledgeBaseChunk, KnowledgeBaseDocument, KnowledgeBasePosting
+
+
+async def _add_document(title: str, text: str, *, category: str = "general") -> int:
+    async with async_session() as session:
+        doc = KnowledgeBaseDocument(
+            title=title,
+            filename=f"{title}.md",
+            mime_type="text/markdown",
+            category=category,
+            content_text=text,
+            is_active=True,
+            created_by_type="admin",
+            created_by_id=-1,
+        )
+        session.add(doc)
+        await session.commit()
+        doc_id = int(doc.id)
+    await kb.reindex_document(doc_id)
+    return doc_id
+
+
+async def _postings_total() -> int:
+    async with async_session() as session:
+        return int(await session.scalar(select(func.count()).select_from(KnowledgeBasePosting)) or 0)
+
+
+async def test_search_ranks_by_bm25_and_matches_word_forms():
+    salary = await _add_document(
+        "Оплата",
+        "Зарплата выплачивается дважды в месяц. Зарплата зависит от графика и опыта.",
+    )
+    schedule = await _add_document("График", "График работы сменный, опытом кандидата не ограничен.")
+    await _add_document("Офис", "Офис находится в центре города, рядом метро.")
+
+    results = await kb.search_excerpts("Какая зарплата и график?", limit=5)
+    assert [item["document_id"] for item in results] == [salary, schedule]
+    assert results[0]["document_title"] == "Оплата"
+
+    # "опыт" must find "опытом"/"опыта" like the substring search used to.
+    matched = {item["document_id"] for item in await kb.search_excerpts("требования к опыт кандидатов")}
+    assert matched == {salary, schedule}
+
+    assert await kb.search_excerpts("зарплата", categories=["faq"]) == []
+
+
+async def test_reindex_and_delete_keep_postings_and_cache_in_sync():
+    doc_id = await _add_document("Регламент", "Собеседование проводится онлайн.")
+    assert [item["document_id"] for item in await kb.search_excerpts("собеседование")] == [doc_id]
+    assert await _postings_total() > 0
+
+    async with async_session() as session:
+        doc = await session.get(KnowledgeBaseDocument, doc_id)
+        doc.content_text = "Встреча проводится в офисе."
+        await session.commit()
+    await kb.reindex_document(doc_id)
+
+    # The cached answer is tied to the previous KB version.
+    assert await kb.search_excerpts("собеседование") == []
+    assert [item["document_id"] for item in await kb.search_excerpts("встреча офис")] == [doc_id]
+
+    assert await kb.delete_document(doc_id) is True
+    assert await _postings_total() == 0
+    assert await kb.search_excerpts("встреча офис") == []
+
+
+async def test_chunks_without_postings_are_indexed_on_first_search():
+    doc_id = await _add_document("Старый документ", "Испытательный срок длится три месяца.")
+    async with async_session() as session:
+        await session.execute(KnowledgeBasePosting.__table__.delete())
+        await session.execute(update(KnowledgeBaseChunk).values(token_count=None))
+        await session.commit()
+
+    results = await kb.search_excerpts("испытательный срок")
+    assert [item["document_id"] for item in results] == [doc_id]
+    async with async_session() as session:
+        pending = await session.scalar(
+            select(func.count()).select_from(KnowledgeBaseChunk).where(KnowledgeBaseChunk.token_count.is_(None))
+        )
+    assert pending == 0
+
+
+async def test_backfill_skips_postings_written_by_a_concurrent_search():
+    await _add_document("Гонка", "Обучение проходит в первую неделю.")
+    before = await _postings_total()
+    async with async_session() as session:
+        await session.execute(update(KnowledgeBaseChunk).values(token_count=None))
+        await session.commit()
+
+    # Another search already committed the postings, but this one still sees
+    # the chunks as pending.
+    async with async_session() as session:
+        chunks = list((await session.execute(select(KnowledgeBaseChunk))).scalars())
+        await kb._index_chunks(session, chunks)
+        await session.commit()
+
+    assert await _postings_total() == before
+    assert await kb.search_excerpts("обучение")
+
+
+async def _pending_chunks() -> int:
+    async with async_session() as session:
+        return int(
+            await session.scalar(
+                select(func.count()).select_from(KnowledgeBaseChunk).where(KnowledgeBaseChunk.token_count.is_(None))
+            )
+            or 0
+        )
+
+
+async def test_search_backfills_a_bounded_batch_and_the_job_does_the_rest(monkeypatch):
+    text = " ".join(f"Раздел {idx}: адаптация сотрудников проходит по плану." for idx in range(60))
+    doc_id = await _add_document("Длинный документ", text)
+    async with async_session() as session:
+        await session.execute(KnowledgeBasePosting.__table__.delete())
+        await session.execute(update(KnowledgeBaseChunk).values(token_count=None))
+        await session.commit()
+    pending = await _pending_chunks()
+    assert pending > 2
+
+    monkeypatch.setattr(kb, "_INLINE_BACKFILL_BATCH", 1)
+    await kb.search_excerpts("адаптация сотрудников")
+    assert await _pending_chunks() == pending - 1
+
+    assert await kb.backfill_pending_chunks(batch_size=2) == pending - 1
+    assert await _pending_chunks() == 0
+    assert [item["document_id"] for item in await kb.search_excerpts("адаптация сотрудников")][:1] == [doc_id]
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import suppress
+
+import pytest
+
+from backend.core.leader_election import (
+    InMemoryLeaseBackend,
+    LeaderElector,
+    PostgresAdvisoryLockBackend,
+    RedisLeaseBackend,
+)
+
+try:  # pragma: no cover - optional dependency
+    from fakeredis import aioredis as fakeredis_aioredis
+except Exception:  # pragma: no cover
+    fakeredis_aioredis = None
+
+
+def _elector(name: str, backend, holder: str, *, ttl: float = 0.3) -> LeaderElector:
+    return LeaderElector(
+        name,
+        backend,
+        ttl_seconds=ttl,
+        renew_interval=0.05,
+        retry_interval=0.05,
+        holder_id=holder,
+    )
+
+
+async def _wait_for(predicate, *, timeout: float = 3.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached in time")
+        await asyncio.sleep(0.01)
+
+
+async def _stop(*tasks: asyncio.Task) -> None:
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+
+
+@pytest.mark.no_db_cleanup
+async def test_only_one_elector_runs_the_job_and_standby_takes_over():
+    backend = InMemoryLeaseBackend()
+    running: list[str] = []
+
+    def _job(holder: str):
+        async def _loop() -> None:
+            running.append(holder)
+            try:
+                await asyncio.Event().wait()
+            finally:
+                running.remove(holder)
+
+        return _loop
+
+    first = _elector("scan", backend, "worker-a")
+    second = _elector("scan", backend, "worker-b")
+    first_task = asyncio.create_task(first.run(_job("worker-a")))
+    await _wait_for(lambda: running == ["worker-a"])
+    second_task = asyncio.create_task(second.run(_job("worker-b")))
+
+    await asyncio.sleep(0.4)
+    assert running == ["worker-a"]
+    assert not second.is_leader
+
+    # Graceful shutdown releases the lease, so the standby takes over right away.
+    await _stop(first_task)
+    await _wait_for(lambda: running == ["worker-b"], timeout=0.5)
+    assert second.is_leader
+
+    await _stop(second_task)
+    assert running == []
+
+
+@pytest.mark.no_db_cleanup
+async def test_standby_takes_over_after_crashed_leader_lease_expires():
+    backend = InMemoryLeaseBackend()
+    # A leader that died without releasing: its lease stays until the TTL runs out.
+    dead = await backend.acquire("scan", "worker-dead", 0.3)
+    assert dead is not None
+
+    standby = _elector("scan", backend, "worker-b")
+    started = time.monotonic()
+    task = asyncio.create_task(standby.run(lambda: asyncio.Event().wait()))
+    await _wait_for(lambda: standby.is_leader)
+    assert time.monotonic() - started >= 0.25
+    await _stop(task)
+
+
+@pytest.mark.no_db_cleanup
+async def test_job_is_cancelled_when_lease_is_lost():
+    clock_offset = [0.0]
+    backend = InMemoryLeaseBackend(clock=lambda: time.monotonic() + clock_offset[0])
+    cancelled = asyncio.Event()
+
+    async def _job() -> None:
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    elector = _elector("scan", backend, "worker-a", ttl=5.0)
+    task = asyncio.create_task(elector.run(_job))
+    await _wait_for(lambda: elector.is_leader)
+
+    # Another holder steals the lease (e.g. after a long pause of this process).
+    clock_offset[0] = 10.0
+    assert await backend.acquire("scan", "worker-b", 5.0) is not None
+
+    await asyncio.wait_for(cancelled.wait(), timeout=1.0)
+    await _wait_for(lambda: not elector.is_leader)
+    await _stop(task)
+
+
+@pytest.mark.no_db_cleanup
+async def test_redis_backend_leases_are_exclusive_per_holder():
+    if fakeredis_aioredis is None:
+        pytest.skip("fakeredis is required for redis lease tests")
+    redis = fakeredis_aioredis.FakeRedis()
+    backend = RedisLeaseBackend(redis)
+
+    lease = await backend.acquire("hh_auto_import", "worker-a", 5)
+    assert lease is not None
+    assert await backend.acquire("hh_auto_import", "worker-b", 5) is None
+    assert await backend.renew(lease, 5) is True
+
+    await backend.release(lease)
+    assert await backend.renew(lease, 5) is False
+
+    next_lease = await backend.acquire("hh_auto_import", "worker-b", 5)
+    assert next_lease is not None and next_lease.holder_id == "worker-b"
+    # A stale holder can neither renew nor release the new lease.
+    await backend.release(lease)
+    assert await backend.renew(next_lease, 5) is True
+
+
+class _FakeResult:
+    def __init__(self, value) -> None:
+        self._value = value
+
+    def scalar_one(self):
+        return self._value
+
+
+class _FakeLockConnection:
+    """Session-scoped advisory locks of one connection, shared via ``owners``."""
+
+    def __init__(self, owners: dict) -> None:
+        self._owners = owners
+        self.broken = False
+        self.closed = False
+
+    async def execute(self, statement, params=None):
+        if self.broken:
+            raise ConnectionError("server closed the connection")
+        sql = str(statement)
+        key = (params or {}).get("key")
+        if "pg_try_advisory_lock" in sql:
+            owner = self._owners.setdefault(key, self)
+            return _FakeResult(owner is self)
+        if "pg_advisory_unlock" in sql:
+            return _FakeResult(self._owners.pop(key, None) is self)
+        return _FakeResult(1)
+
+    async def commit(self) -> None:
+        return None
+
+    async def invalidate(self) -> None:
+        self._release_all()
+
+    async def close(self) -> None:
+        self.closed = True
+        self._release_all()
+
+    def _release_all(self) -> None:
+        for key in [key for key, owner in self._owners.items() if owner is self]:
+            del self._owners[key]
+
+
+class _FakeLockEngine:
+    def __init__(self, owners: dict) -> None:
+        self._owners = owners
+        self.connections: list[_FakeLockConnection] = []
+
+    async def connect(self) -> _FakeLockConnection:
+        conn = _FakeLockConnection(self._owners)
+        self.connections.append(conn)
+        return conn
+
+
+@pytest.mark.no_db_cleanup
+async def test_postgres_backend_holds_all_leases_on_one_connection():
+    owners: dict = {}
+    engine_a, engine_b = _FakeLockEngine(owners), _FakeLockEngine(owners)
+    backend_a = PostgresAdvisoryLockBackend(engine_a)
+    backend_b = PostgresAdvisoryLockBackend(engine_b)
+
+    leases = [await backend_a.acquire(name, "a", 1.0) for name in ("kpi", "sweep", "prune")]
+    assert all(lease is not None for lease in leases)
+    assert len(engine_a.connections) == 1
+    # Held locks are exclusive, also for a second elector in the same process.
+    assert await backend_a.acquire("kpi", "a2", 1.0) is None
+    assert await backend_b.acquire("kpi", "b", 1.0) is None
+
+    await backend_a.release(leases[0])
+    assert await backend_b.acquire("kpi", "b", 1.0) is not None
+    assert await backend_a.renew(leases[1], 1.0)
+
+    # A broken connection loses every lease held on it at once.
+    engine_a.connections[0].broken = True
+    assert not await backend_a.renew(leases[1], 1.0)
+    assert not await backend_a.renew(leases[2], 1.0)
+    assert engine_a.connections[0].closed
+    assert await backend_b.acquire("sweep", "b", 1.0) is not None
+    assert await backend_a.acquire("prune", "a", 1.0) is not None
+    assert len(engine_a.connections) == 2
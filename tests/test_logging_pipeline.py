@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import logging
+import queue
+import sys
+
+from backend.core.logging import (
+    LOG_RECORDS_DROPPED,
+    BoundedQueueHandler,
+    DuplicateSuppressionFilter,
+    JsonFormatter,
+    PhoneMaskingFilter,
+    PIIFilter,
+    RedactionFilter,
+    SecretsFilter,
+    SensitiveQueryParamFilter,
+    reset_request_id,
+    set_request_id,
+)
+
+
+def _record(msg: str, *args, level: int = logging.INFO, exc_info=None) -> logging.LogRecord:
+    return logging.LogRecord(
+        name="test.pipeline",
+        level=level,
+        pathname=__file__,
+        lineno=1,
+        msg=msg,
+        args=args,
+        exc_info=exc_info,
+    )
+
+
+def test_redaction_filter_matches_chained_filters():
+    secrets = ["bot-token-123", "session-secret"]
+    samples = [
+        ("Звонок +7 (999) 123-45-67 через /cb?code=abc&state=def", ()),
+        ("token bot-token-123 leaked for %s", ("89991234567",)),
+        ("GET /verify?TOKEN=raw&poll_token=p %s", ("session-secret",)),
+        ("nothing sensitive here", ()),
+    ]
+    chain = [PIIFilter(), PhoneMaskingFilter(), SensitiveQueryParamFilter(), SecretsFilter(secrets)]
+    combined = RedactionFilter(secrets)
+    for msg, args in samples:
+        expected = _record(msg, *args)
+        expected.phone = "+7 999 123 45 67"
+        expected.callback = "/oauth?refresh_token=r"
+        for item in chain:
+            item.filter(expected)
+        actual = _record(msg, *args)
+        actual.phone = "+7 999 123 45 67"
+        actual.callback = "/oauth?refresh_token=r"
+        assert combined.filter(actual) is True
+        assert actual.getMessage() == expected.getMessage()
+        assert actual.phone == expected.phone
+        assert actual.callback == expected.callback == "/oauth?refresh_token=REDACTED"
+
+
+def test_duplicate_suppression_is_rate_limited_per_message():
+    now = [100.0]
+    dedup = DuplicateSuppressionFilter(window_seconds=5, clock=lambda: now[0])
+    dropped_before = LOG_RECORDS_DROPPED.labels(reason="duplicate")._value.get()
+
+    assert dedup.filter(_record("poll %s", "idle")) is True
+    assert [dedup.filter(_record("poll %s", "idle")) for _ in range(3)] == [False] * 3
+    # A different message or level is never folded into the first one.
+    assert dedup.filter(_record("poll %s", "busy")) is True
+    assert dedup.filter(_record("poll %s", "idle", level=logging.WARNING)) is True
+
+    now[0] += 5
+    resumed = _record("poll %s", "idle")
+    assert dedup.filter(resumed) is True
+    assert resumed.suppressed_duplicates == 3
+    assert LOG_RECORDS_DROPPED.labels(reason="duplicate")._value.get() - dropped_before == 3
+
+
+def test_queue_handler_drops_when_full_and_keeps_request_context():
+    records: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=1)
+    handler = BoundedQueueHandler(records)
+    dropped_before = LOG_RECORDS_DROPPED.labels(reason="queue_full")._value.get()
+
+    token = set_request_id("req-1234567890")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        handler.handle(_record("failed for %s", "candidate", exc_info=sys.exc_info()))
+    finally:
+        reset_request_id(token)
+    handler.handle(_record("second"))
+
+    assert LOG_RECORDS_DROPPED.labels(reason="queue_full")._value.get() - dropped_before == 1
+    queued = records.get_nowait()
+    assert queued.msg == "failed for candidate"
+    assert queued.args is None
+    assert queued.exc_info is None
+
+    # Formatting happens on the listener thread, outside the request context.
+    payload = JsonFormatter().format(queued)
+    assert '"request_id": "req-1234567890"' in payload
+    assert "ValueError: boom" in payload
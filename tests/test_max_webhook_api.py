@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
+import time
 from datetime import UTC, datetime, timedelta
 
 import pytest
@@ -27,7 +28,8 @@ from backend.domain.candidates.models import (
 )
 from backend.domain.candidates.services import log_inbound_max_message
 from backend.domain.candidates.status import CandidateStatus
-from backend.domain.models import TelegramCallbackLog
+from backend.core.settings import get_settings
+from backend.domain.models import MaxWebhookUpdate, TelegramCallbackLog
 from backend.domain.repositories import register_callback
 from fastapi.testclient import TestClient
 from sqlalchemy import func, select
@@ -933,3 +935,181 @@ def test_max_webhook_manual_time_callback_accepts_dialog_user_without_top_level_
     assert candidate is not None
     assert candidate.manual_slot_requested_at is not None
     assert adapter.answers == ["cb-4"]
+
+
+@pytest.fixture
+def queued_max_webhook_client(monkeypatch: pytest.MonkeyPatch, request: pytest.FixtureRequest):
+    monkeypatch.setenv("MAX_WEBHOOK_INGEST_MODE", "queue")
+    return request.getfixturevalue("max_webhook_client")
+
+
+async def _webhook_update_rows() -> list[MaxWebhookUpdate]:
+    async with async_session() as session:
+        result = await session.execute(select(MaxWebhookUpdate).order_by(MaxWebhookUpdate.id.asc()))
+        return list(result.scalars().all())
+
+
+def test_max_webhook_queue_mode_acks_dedups_and_processes_in_background(
+    monkeypatch: pytest.MonkeyPatch,
+    queued_max_webhook_client,
+):
+    candidate_id = asyncio.run(_seed_max_candidate("max-user-queue"))
+
+    async def _fake_ensure_max_adapter(*, settings=None):
+        return None
+
+    monkeypatch.setattr(
+        "backend.apps.admin_api.max_webhook.ensure_max_adapter",
+        _fake_ensure_max_adapter,
+    )
+
+    payload = {
+        "update_type": "message_created",
+        "timestamp": 3,
+        "message": {
+            "sender": {"user_id": "max-user-queue", "username": "candidate_max"},
+            "body": {"mid": "mid-queue-1", "text": "Добрый день"},
+        },
+    }
+    headers = {"X-Max-Bot-Api-Secret": "test-max-secret"}
+
+    first = queued_max_webhook_client.post("/api/max/webhook", headers=headers, json=payload)
+    second = queued_max_webhook_client.post("/api/max/webhook", headers=headers, json=payload)
+
+    assert first.status_code == 200
+    assert first.json()["queued"] is True
+    assert first.json()["duplicate"] is False
+    assert second.json()["duplicate"] is True
+
+    deadline = time.monotonic() + 10
+    rows = asyncio.run(_webhook_update_rows())
+    while rows and rows[0].status != "processed" and time.monotonic() < deadline:
+        time.sleep(0.05)
+        rows = asyncio.run(_webhook_update_rows())
+
+    assert len(rows) == 1
+    assert rows[0].status == "processed"
+    assert rows[0].max_user_id == "max-user-queue"
+    history = asyncio.run(_chat_messages(candidate_id))
+    assert [(message.direction, message.channel) for message in history] == [("inbound", "max")]
+
+    health = queued_max_webhook_client.get("/health").json()
+    queue_health = health["components"]["max_webhook_queue"]
+    assert queue_health["pending"] == 0
+    assert queue_health["lag_max_seconds"] >= 0.0
+
+
+@pytest.mark.asyncio
+async def test_max_webhook_queue_preserves_per_user_order_and_retries():
+    from backend.apps.admin_api.max_webhook_worker import (
+        MaxWebhookIngestWorker,
+        MaxWebhookWorkerConfig,
+    )
+    from backend.domain.max_webhook_inbox import (
+        claim_max_webhook_updates,
+        enqueue_max_webhook_update,
+    )
+
+    for user_id, mids in (("u-1", ["a1", "a2", "a3"]), ("u-2", ["b1", "b2"])):
+        for mid in mids:
+            assert await enqueue_max_webhook_update(
+                update_key=f"test:{mid}",
+                update_type="message_created",
+                max_user_id=user_id,
+                payload={"mid": mid, "user": user_id},
+            )
+    assert await enqueue_max_webhook_update(
+        update_key="test:a1",
+        update_type="message_created",
+        max_user_id="u-1",
+        payload={"mid": "a1", "user": "u-1"},
+    ) is None
+
+    # Only the head of each user's queue is claimable.
+    heads = await claim_max_webhook_updates(batch_size=10, lock_timeout=timedelta(minutes=5))
+    assert sorted(item.payload["mid"] for item in heads) == ["a1", "b1"]
+    assert await claim_max_webhook_updates(batch_size=10, lock_timeout=timedelta(minutes=5)) == []
+    async with async_session() as session:
+        for row in (await session.execute(select(MaxWebhookUpdate))).scalars():
+            row.status = "pending"
+            row.locked_at = None
+            row.attempts = 0
+        await session.commit()
+
+    seen: list[str] = []
+    failed_once: set[str] = set()
+
+    async def _handler(payload, _settings):
+        if payload["mid"] == "b1" and "b1" not in failed_once:
+            failed_once.add("b1")
+            raise RuntimeError("transient")
+        await asyncio.sleep(0)
+        seen.append(payload["mid"])
+
+    worker = MaxWebhookIngestWorker(
+        settings=get_settings(),
+        handler=_handler,
+        config=MaxWebhookWorkerConfig(
+            concurrency=4,
+            batch_size=10,
+            poll_interval=0.05,
+            lock_timeout_seconds=60,
+            max_attempts=3,
+            retry_base_seconds=1,
+            retry_max_seconds=1,
+        ),
+    )
+    while await worker.run_once():
+        pass
+
+    # b1 failed and is waiting for its retry; b2 must not overtake it.
+    assert seen == ["a1", "a2", "a3"]
+    rows = {row.payload_json["mid"]: row for row in await _webhook_update_rows()}
+    assert rows["b1"].status == "pending"
+    assert rows["b1"].next_attempt_at is not None
+    assert rows["b2"].status == "pending"
+
+    async with async_session() as session:
+        row = await session.get(MaxWebhookUpdate, rows["b1"].id)
+        row.next_attempt_at = None
+        await session.commit()
+    while await worker.run_once():
+        pass
+
+    assert seen == ["a1", "a2", "a3", "b1", "b2"]
+    assert {row.status for row in await _webhook_update_rows()} == {"processed"}
+
+
+@pytest.mark.asyncio
+async def test_prune_max_webhook_updates_removes_only_old_finished_rows():
+    from backend.domain.max_webhook_inbox import (
+        enqueue_max_webhook_update,
+        prune_max_webhook_updates,
+    )
+
+    now = datetime.now(UTC)
+    cases = {
+        "old-processed": ("processed", now - timedelta(days=10)),
+        "old-dead": ("dead", now - timedelta(days=10)),
+        "old-pending": ("pending", now - timedelta(days=10)),
+        "fresh-processed": ("processed", now - timedelta(hours=1)),
+    }
+    for key in cases:
+        assert await enqueue_max_webhook_update(
+            update_key=f"prune:{key}",
+            update_type="message_created",
+            max_user_id=key,
+            payload={"key": key},
+        )
+    async with async_session() as session:
+        for row in (await session.execute(select(MaxWebhookUpdate))).scalars():
+            status, received_at = cases[row.payload_json["key"]]
+            row.status = status
+            row.received_at = received_at
+        await session.commit()
+
+    deleted = await prune_max_webhook_updates(older_than=now - timedelta(days=7), batch_size=1)
+
+    assert deleted == 2
+    remaining = {row.payload_json["key"] for row in await _webhook_update_rows()}
+    assert remaining == {"old-pending", "fresh-processed"}
@@ -0,0 +1,295 @@
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from backend.core.db import async_session
+from backend.core.messenger.delivery_engine import (
+    ChannelRateLimiter,
+    MessageDeliveryEngine,
+    MessageDeliveryEngineConfig,
+)
+from backend.core.messenger.protocol import SendResult
+from backend.domain.candidates.models import User
+from backend.domain.messaging.delivery import (
+    RetryPolicy,
+    claim_due_deliveries,
+    enqueue_message,
+    ingest_provider_receipt,
+)
+from backend.domain.messaging.models import CandidateContactPolicy, Message, MessageDelivery, ProviderReceipt
+from backend.domain.models import CandidateChannelIdentity
+
+
+class FakeChannelAdapter:
+    def __init__(
+        self,
+        channel: str,
+        errors: list[str] | None = None,
+        *,
+        delay: float = 0.0,
+        delays: dict[str, float] | None = None,
+        log: list[str] | None = None,
+    ) -> None:
+        self.channel = channel
+        self.errors = list(errors or [])
+        self.delay = delay
+        self.delays = dict(delays or {})
+        self.log = log
+        self.sent: list[str] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def send(self, delivery) -> SendResult:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            delay = self.delays.get(delivery.destination, self.delay)
+            if delay:
+                await asyncio.sleep(delay)
+            self.sent.append(delivery.destination)
+            if self.log is not None:
+                self.log.append(delivery.destination)
+            if self.errors:
+                return SendResult(success=False, error=self.errors.pop(0))
+            return SendResult(success=True, message_id=f"{self.channel}-{delivery.id}")
+        finally:
+            self.in_flight -= 1
+
+
+def _engine(
+    adapters: dict,
+    *,
+    concurrency: int = 4,
+    max_attempts: int = 3,
+    batch_size: int = 50,
+) -> MessageDeliveryEngine:
+    return MessageDeliveryEngine(
+        settings=SimpleNamespace(),
+        adapters=adapters,
+        config=MessageDeliveryEngineConfig(
+            concurrency=concurrency,
+            batch_size=batch_size,
+            poll_interval=0.1,
+            lease_seconds=60,
+            rate_per_sec={},
+            retry_policy=RetryPolicy(max_attempts_per_channel=max_attempts, base_seconds=30, max_seconds=300),
+        ),
+    )
+
+
+async def _candidate(**kwargs) -> int:
+    async with async_session() as session:
+        user = User(fio="Кандидат Доставки", city="Москва", **kwargs)
+        session.add(user)
+        await session.commit()
+        return int(user.id)
+
+
+async def _deliveries(message_id: int) -> list[MessageDelivery]:
+    async with async_session() as session:
+        return list(
+            (
+                await session.execute(
+                    select(MessageDelivery)
+                    .where(MessageDelivery.message_id == message_id)
+                    .order_by(MessageDelivery.id)
+                )
+            ).scalars()
+        )
+
+
+@pytest.mark.asyncio
+async def test_hard_failure_falls_back_to_max_and_marks_identity_unreachable() -> None:
+    candidate_id = await _candidate(telegram_id=501, max_user_id="max-501")
+    async with async_session() as session:
+        identity = CandidateChannelIdentity(
+            candidate_id=candidate_id, channel="telegram", external_user_id="501", is_primary=True
+        )
+        session.add(identity)
+        await session.commit()
+        identity_id = identity.id
+
+    message_id = await enqueue_message(
+        candidate_id=candidate_id, intent_key="slot_reminder", text="Напоминание", idempotency_key="remind:1"
+    )
+    assert await enqueue_message(
+        candidate_id=candidate_id, intent_key="slot_reminder", text="Напоминание", idempotency_key="remind:1"
+    ) == message_id
+
+    telegram = FakeChannelAdapter("telegram", ["Forbidden: bot was blocked by the user"])
+    max_adapter = FakeChannelAdapter("max")
+    engine = _engine({"telegram": telegram, "max": max_adapter})
+    assert await engine.run_once() == 1
+    assert await engine.run_once() == 1
+    assert await engine.run_once() == 0
+
+    rows = await _deliveries(message_id)
+    assert [(row.channel, row.route_order, row.delivery_status) for row in rows] == [
+        ("telegram", 1, "failed"),
+        ("max", 2, "provider_accepted"),
+    ]
+    assert rows[0].failure_class == "hard"
+    assert max_adapter.sent == ["max-501"]
+    async with async_session() as session:
+        assert (await session.get(CandidateChannelIdentity, identity_id)).reachability_status == "unreachable"
+        assert (await session.get(Message, message_id)).intent_status == "completed"
+
+
+@pytest.mark.asyncio
+async def test_temporary_failure_schedules_retry_then_falls_back_after_budget() -> None:
+    candidate_id = await _candidate(telegram_id=502, candidate_id="portal-502")
+    message_id = await enqueue_message(
+        candidate_id=candidate_id, intent_key="intro", text="Привет", idempotency_key="intro:1"
+    )
+    telegram = FakeChannelAdapter("telegram", ["429 Too Many Requests", "network error"])
+    engine = _engine({"telegram": telegram, "browser_link": FakeChannelAdapter("browser_link")}, max_attempts=2)
+
+    before = datetime.now(UTC)
+    await engine.run_once()
+    rows = await _deliveries(message_id)
+    assert [(row.channel, row.channel_attempt_no, row.delivery_status) for row in rows] == [
+        ("telegram", 1, "failed"),
+        ("telegram", 2, "planned"),
+    ]
+    retry_at = rows[1].next_retry_at.replace(tzinfo=UTC)
+    assert retry_at >= before + timedelta(seconds=30)
+    assert await engine.run_once() == 0
+
+    async with async_session() as session:
+        retry = await session.get(MessageDelivery, rows[1].id)
+        retry.next_retry_at = datetime.now(UTC) - timedelta(seconds=1)
+        await session.commit()
+    await engine.run_once()
+    await engine.run_once()
+    rows = await _deliveries(message_id)
+    assert [(row.channel, row.delivery_status) for row in rows] == [
+        ("telegram", "failed"),
+        ("telegram", "failed"),
+        ("browser_link", "provider_accepted"),
+    ]
+    assert rows[2].destination_fingerprint == "portal-502"
+    assert [row.overall_attempt_no for row in rows] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_contact_policy_controls_route() -> None:
+    candidate_id = await _candidate(telegram_id=503, max_user_id="max-503")
+    async with async_session() as session:
+        session.add(
+            CandidateContactPolicy(
+                candidate_id=candidate_id,
+                purpose_scope="recruiting",
+                preferred_channel="max",
+                fallback_order_json=["telegram"],
+                fallback_enabled=False,
+            )
+        )
+        await session.commit()
+    message_id = await enqueue_message(
+        candidate_id=candidate_id, intent_key="intro", text="Привет", idempotency_key="intro:policy"
+    )
+    max_adapter = FakeChannelAdapter("max", ["chat not found"])
+    await _engine({"max": max_adapter, "telegram": FakeChannelAdapter("telegram")}).run_once()
+    rows = await _deliveries(message_id)
+    assert [(row.channel, row.delivery_status) for row in rows] == [("max", "failed")]
+    async with async_session() as session:
+        assert (await session.get(Message, message_id)).intent_status == "failed"
+
+
+@pytest.mark.asyncio
+async def test_provider_receipts_are_idempotent_and_monotonic() -> None:
+    candidate_id = await _candidate(telegram_id=504)
+    message_id = await enqueue_message(
+        candidate_id=candidate_id, intent_key="intro", text="Привет", idempotency_key="intro:receipt"
+    )
+    await _engine({"telegram": FakeChannelAdapter("telegram")}).run_once()
+    delivery = (await _deliveries(message_id))[0]
+    provider_message_id = delivery.provider_message_id
+
+    receipt = dict(provider="telegram_bot", provider_message_id=provider_message_id)
+    assert await ingest_provider_receipt(receipt_type="read", provider_event_id="ev-2", **receipt) == "applied"
+    assert await ingest_provider_receipt(receipt_type="read", provider_event_id="ev-2", **receipt) == "duplicate"
+    assert await ingest_provider_receipt(receipt_type="delivered", provider_event_id="ev-1", **receipt) == "applied"
+    assert (
+        await ingest_provider_receipt(receipt_type="delivered", provider="telegram_bot", provider_message_id="nope")
+        == "unmatched"
+    )
+    assert (await _deliveries(message_id))[0].delivery_status == "read"
+    async with async_session() as session:
+        count = len((await session.execute(select(ProviderReceipt))).scalars().all())
+    assert count == 2
+
+
+@pytest.mark.asyncio
+async def test_dispatch_is_concurrent_and_rate_limited_per_channel() -> None:
+    for idx in range(6):
+        candidate_id = await _candidate(telegram_id=600 + idx)
+        await enqueue_message(
+            candidate_id=candidate_id, intent_key="bulk", text="Рассылка", idempotency_key=f"bulk:{idx}"
+        )
+    telegram = FakeChannelAdapter("telegram", delay=0.05)
+    assert await _engine({"telegram": telegram}, concurrency=3).run_once() == 6
+    assert telegram.peak_in_flight == 3
+    assert await claim_due_deliveries(batch_size=10, lease=timedelta(seconds=60)) == []
+
+    limiter = ChannelRateLimiter(20, burst=1)
+    started = time.monotonic()
+    await asyncio.gather(*(limiter.acquire() for _ in range(5)))
+    assert time.monotonic() - started >= 0.18
+
+
+@pytest.mark.asyncio
+async def test_throttled_channel_does_not_hold_send_slots_or_block_portal_fallback() -> None:
+    for idx in range(3):
+        candidate_id = await _candidate(telegram_id=700 + idx)
+        await enqueue_message(candidate_id=candidate_id, intent_key="bulk", text="Т", idempotency_key=f"tg:{idx}")
+    for idx in range(2):
+        candidate_id = await _candidate(max_user_id=f"max-70{idx}")
+        await enqueue_message(candidate_id=candidate_id, intent_key="bulk", text="М", idempotency_key=f"max:{idx}")
+    portal_id = await _candidate(candidate_id="portal-709")
+    portal_message = await enqueue_message(
+        candidate_id=portal_id, intent_key="bulk", text="П", idempotency_key="portal:1"
+    )
+
+    log: list[str] = []
+    engine = _engine(
+        {"telegram": FakeChannelAdapter("telegram", log=log), "max": FakeChannelAdapter("max", log=log)},
+        concurrency=1,
+    )
+    engine._limiters["telegram"] = ChannelRateLimiter(4, burst=1)
+    assert await engine.run_once() == 6
+
+    # MAX sends go through while Telegram waits for tokens, not after the whole Telegram backlog.
+    assert log.index("max-700") < log.index("702")
+    assert log.index("max-701") < log.index("702")
+    rows = await _deliveries(portal_message)
+    assert [(row.channel, row.delivery_status, row.failure_code) for row in rows] == [
+        ("browser_link", "skipped", "adapter_missing")
+    ]
+    assert await engine.run_once() == 0
+    async with async_session() as session:
+        assert (await session.get(Message, portal_message)).intent_status == "failed"
+
+
+@pytest.mark.asyncio
+async def test_running_engine_refills_pool_while_a_slow_send_is_in_flight() -> None:
+    for idx in range(4):
+        candidate_id = await _candidate(telegram_id=800 + idx)
+        await enqueue_message(candidate_id=candidate_id, intent_key="bulk", text="Т", idempotency_key=f"pool:{idx}")
+    log: list[str] = []
+    telegram = FakeChannelAdapter("telegram", delay=0.01, delays={"800": 0.5}, log=log)
+    engine = _engine({"telegram": telegram}, concurrency=2, batch_size=2)
+
+    engine.start()
+    try:
+        for _ in range(100):
+            if len(log) == 4:
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        await engine.shutdown(grace_seconds=2)
+    assert log == ["801", "802", "803", "800"]
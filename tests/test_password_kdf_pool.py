@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from backend.core import passwords
+from backend.core.db import async_session
+from backend.core.kdf_executor import KDFExecutor, KDFOverloadedError, shutdown_kdf_executor
+from backend.domain.auth_account import AuthAccount
+
+
+class _DummyIntegration:
+    async def shutdown(self) -> None:
+        return None
+
+
+@pytest.fixture
+def login_app(monkeypatch):
+    async def fake_setup(app):
+        app.state.bot = None
+        app.state.state_manager = None
+        app.state.bot_service = None
+        app.state.bot_integration_switch = None
+        app.state.reminder_service = None
+        return _DummyIntegration()
+
+    monkeypatch.setenv("AUTH_BRUTE_FORCE_ENABLED", "0")
+    monkeypatch.setenv("PASSWORD_HASH_WORKERS", "4")
+    monkeypatch.setenv("PASSWORD_HASH_MAX_QUEUE", "64")
+    monkeypatch.setenv("PASSWORD_HASH_PER_IDENTIFIER_LIMIT", "64")
+    from backend.core import settings as settings_module
+
+    settings_module.get_settings.cache_clear()
+    shutdown_kdf_executor()
+    monkeypatch.setattr("backend.apps.admin_ui.state.setup_bot_state", fake_setup)
+    monkeypatch.setattr("backend.apps.admin_ui.app.setup_bot_state", fake_setup)
+    from backend.apps.admin_ui.app import create_app
+
+    try:
+        yield create_app()
+    finally:
+        shutdown_kdf_executor()
+        settings_module.get_settings.cache_clear()
+
+
+async def _seed_account(username: str, password_hash: str) -> None:
+    async with async_session() as session:
+        session.add(
+            AuthAccount(
+                username=username,
+                password_hash=password_hash,
+                principal_type="admin",
+                principal_id=1,
+                is_active=True,
+            )
+        )
+        await session.commit()
+
+
+async def _post_token(client: AsyncClient, username: str, password: str):
+    return await client.post(
+        "/auth/token",
+        data={"username": username, "password": password},
+        headers={"content-type": "application/x-www-form-urlencoded"},
+    )
+
+
+@pytest.mark.no_db_cleanup
+async def test_executor_fails_fast_when_saturated():
+    executor = KDFExecutor(max_workers=1, max_queue=1, per_identifier_limit=1)
+    gate = threading.Event()
+    try:
+        first = asyncio.create_task(executor.run(gate.wait, 5, identifier="10.0.0.1:anna"))
+        await asyncio.sleep(0)
+        assert executor.in_flight == 1
+
+        with pytest.raises(KDFOverloadedError) as busy:
+            await executor.run(gate.wait, 5, identifier="10.0.0.1:anna")
+        assert busy.value.reason == "identifier_busy"
+
+        second = asyncio.create_task(executor.run(gate.wait, 5, identifier="10.0.0.2:boris"))
+        await asyncio.sleep(0)
+        with pytest.raises(KDFOverloadedError) as full:
+            await executor.run(gate.wait, 5)
+        assert full.value.reason == "queue_full"
+
+        gate.set()
+        assert await asyncio.gather(first, second) == [True, True]
+        assert executor.in_flight == 0
+        assert await executor.run(gate.wait, 0, identifier="10.0.0.1:anna") is True
+    finally:
+        gate.set()
+        executor.shutdown()
+
+
+async def test_login_storm_keeps_event_loop_responsive(login_app, monkeypatch):
+    # Expensive hashes make an inline KDF visible to the lag probe.
+    monkeypatch.setattr(passwords, "PBKDF2_ITERATIONS", 600_000)
+    password = "Storm-Password-1"
+    await _seed_account("storm.admin", passwords.hash_password(password))
+
+    lags: list[float] = []
+    stop = asyncio.Event()
+
+    async def _probe() -> None:
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - started - 0.01)
+
+    probe = asyncio.create_task(_probe())
+    transport = ASGITransport(app=login_app, client=("10.0.0.5", 40000))
+    async with AsyncClient(transport=transport, base_url="https://test") as client:
+        responses = await asyncio.gather(
+            *(_post_token(client, "storm.admin", password) for _ in range(12))
+        )
+    stop.set()
+    await probe
+
+    assert [response.status_code for response in responses] == [200] * 12
+    # A single 600k-iteration PBKDF2 hash takes a few hundred milliseconds;
+    # hashing inline would stall the probe for at least that long.
+    assert max(lags) < 0.15
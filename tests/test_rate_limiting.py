@@ -13,6 +13,7 @@ from httpx import AsyncClient, ASGITransport
 
 from backend.apps.admin_ui.app import create_app
 from backend.core import settings as settings_module
+from backend.core.rate_limit import reset_rate_limiter
 
 
 class _DummyIntegration:
@@ -43,6 +44,7 @@ def rate_limited_app(monkeypatch):
     settings_module.get_settings.cache_clear()
     from backend.apps.admin_ui.security import limiter
     limiter.reset()
+    reset_rate_limiter()
     monkeypatch.setattr("backend.apps.admin_ui.state.setup_bot_state", fake_setup)
     monkeypatch.setattr("backend.apps.admin_ui.app.setup_bot_state", fake_setup)
 
@@ -51,6 +53,7 @@ def rate_limited_app(monkeypatch):
         yield app
     finally:
         limiter.reset()
+        reset_rate_limiter()
         settings_module.get_settings.cache_clear()
 
 
@@ -76,6 +79,7 @@ def rate_limited_app_with_proxy_trust(monkeypatch):
     settings_module.get_settings.cache_clear()
     from backend.apps.admin_ui.security import limiter
     limiter.reset()
+    reset_rate_limiter()
     monkeypatch.setattr("backend.apps.admin_ui.state.setup_bot_state", fake_setup)
     monkeypatch.setattr("backend.apps.admin_ui.app.setup_bot_state", fake_setup)
 
@@ -84,6 +88,7 @@ def rate_limited_app_with_proxy_trust(monkeypatch):
         yield app
     finally:
         limiter.reset()
+        reset_rate_limiter()
         settings_module.get_settings.cache_clear()
 
 
@@ -107,6 +112,7 @@ def disabled_rate_limit_app(monkeypatch):
     settings_module.get_settings.cache_clear()
     from backend.apps.admin_ui.security import limiter
     limiter.reset()
+    reset_rate_limiter()
     monkeypatch.setattr("backend.apps.admin_ui.state.setup_bot_state", fake_setup)
     monkeypatch.setattr("backend.apps.admin_ui.app.setup_bot_state", fake_setup)
 
@@ -115,6 +121,7 @@ def disabled_rate_limit_app(monkeypatch):
         yield app
     finally:
         limiter.reset()
+        reset_rate_limiter()
         settings_module.get_settings.cache_clear()
 
 
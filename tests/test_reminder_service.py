@@ -954,3 +954,203 @@ def test_schedule_respects_non_canonical_timezone():
     local_zone = reminders[0].run_at_local.tzinfo
     assert local_zone is not None
     assert getattr(local_zone, "key", str(local_zone)) == "Asia/Novosibirsk"
+
+
+@pytest.mark.asyncio
+async def test_bulk_reschedule_plans_all_active_slots_in_one_pass(monkeypatch):
+    scheduler = create_scheduler(redis_url=None)
+    service = ReminderService(scheduler=scheduler)
+    service.start()
+
+    async def _default_policy():
+        return DEFAULT_REMINDER_POLICY, None
+
+    monkeypatch.setattr(
+        "backend.apps.bot.reminders.get_reminder_policy_config",
+        _default_policy,
+    )
+
+    candidate_zone = ZoneInfo("Europe/Moscow")
+    base_local = (datetime.now(candidate_zone) + timedelta(days=4)).replace(
+        hour=14, minute=0, second=0, microsecond=0
+    )
+    async with async_session() as session:
+        recruiter = models.Recruiter(name="Bulk Reminders", tz="Europe/Moscow", active=True)
+        city = models.City(name="Bulk Reminder City", tz="Europe/Moscow", active=True)
+        session.add_all([recruiter, city])
+        await session.commit()
+        slots = [
+            models.Slot(
+                recruiter_id=recruiter.id,
+                city_id=city.id,
+                start_utc=(base_local + timedelta(minutes=30 * idx)).astimezone(timezone.utc),
+                status=models.SlotStatus.BOOKED,
+                candidate_tg_id=9000 + idx,
+            )
+            for idx in range(5)
+        ]
+        # No telegram id and no MAX binding: must be skipped by the planner.
+        slots.append(
+            models.Slot(
+                recruiter_id=recruiter.id,
+                city_id=city.id,
+                start_utc=(base_local + timedelta(hours=5)).astimezone(timezone.utc),
+                status=models.SlotStatus.BOOKED,
+            )
+        )
+        session.add_all(slots)
+        await session.commit()
+        slot_ids = [slot.id for slot in slots]
+
+    calls = {"schedule_for_slot": 0}
+    original = service.schedule_for_slot
+
+    async def _counting_schedule(slot_id, **kwargs):
+        calls["schedule_for_slot"] += 1
+        return await original(slot_id, **kwargs)
+
+    monkeypatch.setattr(service, "schedule_for_slot", _counting_schedule)
+
+    try:
+        result = await service.reschedule_active_slots()
+        assert result == {"scheduled": 5, "failed": 0}
+        assert calls["schedule_for_slot"] == 0
+
+        job_ids = {job.id for job in scheduler.get_jobs()}
+        for slot_id in slot_ids[:5]:
+            assert f"slot:{slot_id}:{ReminderKind.CONFIRM_2H.value}" in job_ids
+        assert not any(job_id.startswith(f"slot:{slot_ids[5]}:") for job_id in job_ids)
+
+        async with async_session() as session:
+            persisted = await session.scalar(
+                select(func.count()).select_from(models.SlotReminderJob)
+            )
+        assert persisted == len(job_ids)
+
+        # Idempotent: a second pass neither duplicates rows nor jobs.
+        await service.reschedule_active_slots()
+        assert {job.id for job in scheduler.get_jobs()} == job_ids
+
+        # Cancellation uses the slot→job index instead of scanning the scheduler.
+        def _no_scan():
+            raise AssertionError("get_jobs() must not be called on cancel")
+
+        monkeypatch.setattr(scheduler, "get_jobs", _no_scan)
+        await service.cancel_for_slot(slot_ids[0])
+        monkeypatch.undo()
+        assert not any(
+            job.id.startswith(f"slot:{slot_ids[0]}:") for job in scheduler.get_jobs()
+        )
+    finally:
+        await service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_sync_jobs_rebuilds_from_slots_when_table_empty(monkeypatch):
+    scheduler = create_scheduler(redis_url=None)
+    service = ReminderService(scheduler=scheduler)
+    service.start()
+
+    slot = await _create_booked_slot(candidate_id=5511)
+    try:
+        await service.sync_jobs()
+        assert any(job.id.startswith(f"slot:{slot.id}:") for job in scheduler.get_jobs())
+        async with async_session() as session:
+            rows = await session.scalar(
+                select(func.count())
+                .select_from(models.SlotReminderJob)
+                .where(models.SlotReminderJob.slot_id == slot.id)
+            )
+        assert rows and rows > 0
+    finally:
+        await service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_bulk_reschedule_clears_jobs_for_empty_plans_and_inactive_slots(monkeypatch):
+    scheduler = create_scheduler(redis_url=None)
+    service = ReminderService(scheduler=scheduler)
+    service.start()
+
+    async def _default_policy():
+        return DEFAULT_REMINDER_POLICY, None
+
+    monkeypatch.setattr(
+        "backend.apps.bot.reminders.get_reminder_policy_config",
+        _default_policy,
+    )
+
+    empty_plan_slot = await _create_booked_slot(candidate_id=7701)
+    async with async_session() as session:
+        freed_slot = models.Slot(
+            recruiter_id=empty_plan_slot.recruiter_id,
+            city_id=empty_plan_slot.city_id,
+            start_utc=empty_plan_slot.start_utc + timedelta(hours=1),
+            status=models.SlotStatus.BOOKED,
+            candidate_tg_id=7702,
+            candidate_tz="Europe/Moscow",
+        )
+        session.add(freed_slot)
+        await session.commit()
+        await session.refresh(freed_slot)
+
+    async def _persisted_rows(slot_id: int) -> int:
+        async with async_session() as session:
+            return await session.scalar(
+                select(func.count())
+                .select_from(models.SlotReminderJob)
+                .where(models.SlotReminderJob.slot_id == slot_id)
+            )
+
+    def _scheduled_for(slot_id: int) -> list[str]:
+        return [job.id for job in scheduler.get_jobs() if job.id.startswith(f"slot:{slot_id}:")]
+
+    try:
+        await service.reschedule_active_slots()
+        for slot in (empty_plan_slot, freed_slot):
+            assert _scheduled_for(slot.id)
+            assert await _persisted_rows(slot.id) > 0
+
+        async with async_session() as session:
+            freed = await session.get(models.Slot, freed_slot.id)
+            freed.status = models.SlotStatus.FREE
+            freed.candidate_tg_id = None
+            await session.commit()
+
+        # Every reminder of the still-booked slot is now in the past.
+        monkeypatch.setattr(service, "_build_schedule", lambda *args, **kwargs: [])
+        await service.reschedule_active_slots()
+
+        for slot in (empty_plan_slot, freed_slot):
+            assert _scheduled_for(slot.id) == []
+            assert await _persisted_rows(slot.id) == 0
+    finally:
+        await service.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancel_removes_scheduler_jobs_missing_from_index_and_store():
+    scheduler = create_scheduler(redis_url=None)
+    service = ReminderService(scheduler=scheduler)
+    service.start()
+
+    async def _noop(*args, **kwargs):
+        return None
+
+    run_at = datetime.now(timezone.utc) + timedelta(hours=6)
+    try:
+        # Jobs added straight to the scheduler: neither indexed nor persisted.
+        for slot_id in (9101, 9102):
+            scheduler.add_job(_noop, "date", run_date=run_at, id=f"slot:{slot_id}:remind_2h")
+        scheduler.add_job(_noop, "date", run_date=run_at, id="slot:91011:remind_2h")
+
+        await service.cancel_for_slot(9101)
+        await service._cancel_slots_except({9102, 91011}, also={9102})
+
+        assert sorted(job.id for job in scheduler.get_jobs()) == ["slot:91011:remind_2h"]
+
+        # A live job of a slot that is no longer active is cancelled as well.
+        await service._cancel_slots_except(set(), also=set())
+        assert scheduler.get_jobs() == []
+    finally:
+        await service.shutdown()
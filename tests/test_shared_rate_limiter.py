@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import sys
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from backend.apps.admin_api import candidate_web
+from backend.core import cache as cache_module
+from backend.core import rate_limit
+from backend.core.cache import CacheClient, CacheConfig
+from backend.core.rate_limit import (
+    LocalRateLimitStore,
+    RateLimit,
+    RateLimiter,
+    RateLimitScope,
+)
+
+try:
+    from fakeredis import aioredis as fakeredis_aioredis
+except Exception:  # pragma: no cover - optional dependency
+    fakeredis_aioredis = None
+
+try:
+    import lupa  # noqa: F401  # fakeredis needs it to run Lua scripts
+except Exception:  # pragma: no cover - optional dependency
+    lupa = None
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _request(ip: str, session_token: str = "") -> Request:
+    headers = [(b"x-forwarded-for", ip.encode())]
+    if session_token:
+        headers.append((candidate_web.CANDIDATE_ACCESS_SESSION_HEADER.lower().encode(), session_token.encode()))
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": headers, "client": ("10.0.0.1", 1)})
+
+
+@pytest.fixture(autouse=True)
+def _reset_limiter(monkeypatch):
+    monkeypatch.setattr(cache_module, "_cache", None)
+    rate_limit.reset_rate_limiter()
+    yield
+    rate_limit.reset_rate_limiter()
+
+
+def test_local_gcra_allows_burst_then_refills_evenly() -> None:
+    clock = _Clock()
+    store = LocalRateLimitStore(100, clock=clock)
+    rule = RateLimit(5, 60)
+
+    assert [store.acquire(["k"], [rule])[0] for _ in range(5)] == [True] * 5
+    allowed, index, wait_ms = store.acquire(["k"], [rule])
+    assert (allowed, index) == (False, 0)
+    assert wait_ms == 12_000
+
+    # One emission interval later exactly one more request fits.
+    clock.now += 12
+    assert store.acquire(["k"], [rule])[0] is True
+    assert store.acquire(["k"], [rule])[0] is False
+
+
+def test_refused_scope_consumes_no_budget_of_the_others() -> None:
+    clock = _Clock()
+    store = LocalRateLimitStore(100, clock=clock)
+    ip_rule, session_rule = RateLimit(3, 60), RateLimit(1, 60)
+
+    assert store.acquire(["ip", "session:a"], [ip_rule, session_rule])[0] is True
+    assert store.acquire(["ip", "session:a"], [ip_rule, session_rule])[:2] == (False, 1)
+    # The refused attempt above did not spend the IP budget.
+    assert store.acquire(["ip", "session:b"], [ip_rule, session_rule])[0] is True
+    assert store.acquire(["ip", "session:c"], [ip_rule, session_rule])[0] is True
+    assert store.acquire(["ip", "session:d"], [ip_rule, session_rule])[:2] == (False, 0)
+
+
+def test_local_store_memory_is_constant_under_1m_unique_keys() -> None:
+    store = LocalRateLimitStore(10_000)
+    rules = [RateLimit(20, 60)]
+
+    def footprint() -> int:
+        tats = store._tats
+        return sys.getsizeof(tats) + sum(sys.getsizeof(key) + sys.getsizeof(tat) for key, tat in tats.items())
+
+    for idx in range(100_000):
+        store.acquire([f"198.18.{idx:07d}"], rules)
+    warm = footprint()
+    for idx in range(100_000, 1_000_000):
+        store.acquire([f"198.18.{idx:07d}"], rules)
+
+    assert len(store) == 10_000
+    assert footprint() == warm
+
+
+@pytest.mark.asyncio
+async def test_redis_budget_is_shared_between_workers(monkeypatch) -> None:
+    if fakeredis_aioredis is None or lupa is None:
+        pytest.skip("fakeredis with Lua support is required for shared limiter tests")
+    client = CacheClient(CacheConfig())
+    client._client = fakeredis_aioredis.FakeRedis()
+    monkeypatch.setattr(cache_module, "_cache", client)
+
+    workers = [RateLimiter(local_max_keys=100), RateLimiter(local_max_keys=100)]
+    scopes = [RateLimitScope("ip", "203.0.113.7", RateLimit(5, 60))]
+    decisions = [await workers[idx % 2].check("test", scopes) for idx in range(6)]
+
+    assert [decision.allowed for decision in decisions] == [True] * 5 + [False]
+    assert decisions[-1].scope == "ip"
+    assert decisions[-1].retry_after_seconds == 12
+    # Nothing lives in worker memory, and the key expires within one period.
+    assert all(len(worker.local) == 0 for worker in workers)
+    assert 0 < await client.client.pttl("rl:test:ip:203.0.113.7") <= 60_000
+
+
+@pytest.mark.asyncio
+async def test_redis_failure_falls_back_to_local_store(monkeypatch) -> None:
+    class _BrokenRedis:
+        def register_script(self, _script):
+            async def _run(**_kwargs):
+                raise ConnectionError("redis down")
+
+            return _run
+
+    monkeypatch.setattr(cache_module, "_cache", SimpleNamespace(client=_BrokenRedis()))
+    limiter = RateLimiter(local_max_keys=100)
+    scopes = [RateLimitScope("ip", "203.0.113.8", RateLimit(2, 60))]
+
+    assert [(await limiter.check("test", scopes)).allowed for _ in range(3)] == [True, True, False]
+    assert len(limiter.local) == 1
+
+
+@pytest.mark.asyncio
+async def test_candidate_web_limits_session_and_ip_scopes() -> None:
+    settings = SimpleNamespace(rate_limit_enabled=True)
+
+    for _ in range(candidate_web.MUTATION_RATE_LIMIT_MAX_ATTEMPTS):
+        await candidate_web._enforce_mutation_rate_limit(_request("198.51.100.1", "session-a"), settings)
+    with pytest.raises(HTTPException) as exc_info:
+        await candidate_web._enforce_mutation_rate_limit(_request("198.51.100.1", "session-a"), settings)
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.detail["code"] == "rate_limited"
+    assert int(exc_info.value.headers["Retry-After"]) >= 1
+
+    # Another session behind the same IP still has its own budget.
+    await candidate_web._enforce_mutation_rate_limit(_request("198.51.100.1", "session-b"), settings)
+
+    # Campaign budget is shared by every IP.
+    campaign_limit = candidate_web.BOOTSTRAP_CAMPAIGN_RATE_LIMIT.limit
+    for idx in range(campaign_limit):
+        await candidate_web._enforce_bootstrap_rate_limit(_request(f"192.0.2.{idx}"), settings, campaign="spring")
+    with pytest.raises(HTTPException):
+        await candidate_web._enforce_bootstrap_rate_limit(_request("192.0.2.250"), settings, campaign="spring")
+    await candidate_web._enforce_bootstrap_rate_limit(_request("192.0.2.250"), settings, campaign="autumn")
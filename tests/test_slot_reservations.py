@@ -8,7 +8,12 @@ from sqlalchemy.exc import IntegrityError
 from backend.core.db import async_session
 from backend.domain import models
 from backend.domain.candidates.models import User
-from backend.domain.repositories import reserve_slot, ReservationResult, reject_slot
+from backend.domain.repositories import (
+    ReservationResult,
+    reject_slot,
+    reserve_slot,
+    sweep_expired_reservation_locks,
+)
 
 
 @pytest.mark.asyncio
@@ -318,3 +323,209 @@ async def test_slot_updated_at_reflects_status_changes():
         freed_slot = await session.get(models.Slot, slot_id)
         assert freed_slot is not None
         assert freed_slot.updated_at > pending_updated_at
+
+
+@pytest.mark.asyncio
+async def test_slot_taken_offers_nearest_free_alternatives():
+    now = datetime.now(timezone.utc)
+
+    async with async_session() as session:
+        recruiter = models.Recruiter(name="Дарья", tz="Europe/Moscow", active=True)
+        city = models.City(name="Курск", tz="Europe/Moscow", active=True)
+        session.add_all([recruiter, city])
+        await session.commit()
+        await session.refresh(recruiter)
+        await session.refresh(city)
+
+        slots = [
+            models.Slot(
+                recruiter_id=recruiter.id,
+                city_id=city.id,
+                start_utc=now + timedelta(hours=idx + 1),
+                status=models.SlotStatus.FREE,
+            )
+            for idx in range(4)
+        ]
+        intro = models.Slot(
+            recruiter_id=recruiter.id,
+            city_id=city.id,
+            start_utc=now + timedelta(minutes=30),
+            purpose="intro_day",
+            status=models.SlotStatus.FREE,
+        )
+        session.add_all([*slots, intro])
+        await session.commit()
+        for slot in slots:
+            await session.refresh(slot)
+
+    winner = await reserve_slot(
+        slots[0].id,
+        candidate_tg_id=8101,
+        candidate_fio="Кандидат 1",
+        candidate_tz="Europe/Moscow",
+        candidate_city_id=city.id,
+        expected_recruiter_id=recruiter.id,
+        expected_city_id=city.id,
+    )
+    assert winner.status == "reserved"
+    assert winner.alternatives == []
+
+    loser = await reserve_slot(
+        slots[0].id,
+        candidate_tg_id=8102,
+        candidate_fio="Кандидат 2",
+        candidate_tz="Europe/Moscow",
+        candidate_city_id=city.id,
+        expected_recruiter_id=recruiter.id,
+        expected_city_id=city.id,
+    )
+    assert loser.status == "slot_taken"
+    # Same recruiter and purpose, nearest first, the lost slot excluded.
+    assert [slot.id for slot in loser.alternatives] == [slot.id for slot in slots[1:]]
+    assert all(slot.start_utc.tzinfo is not None for slot in loser.alternatives)
+
+
+@pytest.mark.asyncio
+async def test_expired_locks_are_swept_outside_reservation():
+    now = datetime.now(timezone.utc)
+
+    async with async_session() as session:
+        recruiter = models.Recruiter(name="Полина", tz="Europe/Moscow", active=True)
+        city = models.City(name="Псков", tz="Europe/Moscow", active=True)
+        session.add_all([recruiter, city])
+        await session.commit()
+        await session.refresh(recruiter)
+        await session.refresh(city)
+
+        slot_a = models.Slot(
+            recruiter_id=recruiter.id,
+            city_id=city.id,
+            start_utc=now + timedelta(hours=1),
+            status=models.SlotStatus.FREE,
+        )
+        slot_b = models.Slot(
+            recruiter_id=recruiter.id,
+            city_id=city.id,
+            start_utc=now + timedelta(hours=2),
+            status=models.SlotStatus.FREE,
+        )
+        session.add_all([slot_a, slot_b])
+        await session.commit()
+        await session.refresh(slot_a)
+        await session.refresh(slot_b)
+
+        reservation_date = slot_a.start_utc.date()
+        expired = now - timedelta(minutes=1)
+        session.add_all(
+            [
+                # The candidate's own stale lock for the same recruiter and day.
+                models.SlotReservationLock(
+                    slot_id=slot_b.id,
+                    candidate_id="tg:8201",
+                    candidate_tg_id=8201,
+                    recruiter_id=recruiter.id,
+                    reservation_date=reservation_date,
+                    expires_at=expired,
+                ),
+                # Somebody else's stale locks are left to the background sweep.
+                *[
+                    models.SlotReservationLock(
+                        slot_id=slot_b.id,
+                        candidate_id=f"tg:{8300 + idx}",
+                        candidate_tg_id=8300 + idx,
+                        recruiter_id=recruiter.id,
+                        reservation_date=reservation_date,
+                        expires_at=expired,
+                    )
+                    for idx in range(3)
+                ],
+            ]
+        )
+        await session.commit()
+
+    reservation = await reserve_slot(
+        slot_a.id,
+        candidate_tg_id=8201,
+        candidate_fio="Кандидат",
+        candidate_tz="Europe/Moscow",
+        candidate_city_id=city.id,
+        expected_recruiter_id=recruiter.id,
+        expected_city_id=city.id,
+    )
+    assert reservation.status == "reserved"
+
+    async with async_session() as session:
+        locks = (
+            await session.scalars(
+                select(models.SlotReservationLock).where(
+                    models.SlotReservationLock.recruiter_id == recruiter.id
+                )
+            )
+        ).all()
+    assert sorted(lock.candidate_tg_id for lock in locks) == [8201, 8300, 8301, 8302]
+
+    assert await sweep_expired_reservation_locks(batch_size=2) == 3
+
+    async with async_session() as session:
+        remaining = (
+            await session.scalars(
+                select(models.SlotReservationLock).where(
+                    models.SlotReservationLock.recruiter_id == recruiter.id
+                )
+            )
+        ).all()
+    assert [lock.slot_id for lock in remaining] == [slot_a.id]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_candidates_claim_slot_once():
+    now = datetime.now(timezone.utc)
+
+    async with async_session() as session:
+        recruiter = models.Recruiter(name="Зоя", tz="Europe/Moscow", active=True)
+        city = models.City(name="Орёл", tz="Europe/Moscow", active=True)
+        session.add_all([recruiter, city])
+        await session.commit()
+        await session.refresh(recruiter)
+        await session.refresh(city)
+
+        hot = models.Slot(
+            recruiter_id=recruiter.id,
+            city_id=city.id,
+            start_utc=now + timedelta(hours=1),
+            status=models.SlotStatus.FREE,
+        )
+        spare = models.Slot(
+            recruiter_id=recruiter.id,
+            city_id=city.id,
+            start_utc=now + timedelta(hours=2),
+            status=models.SlotStatus.FREE,
+        )
+        session.add_all([hot, spare])
+        await session.commit()
+        await session.refresh(hot)
+        await session.refresh(spare)
+
+    async def attempt(tg_id: int) -> ReservationResult:
+        return await reserve_slot(
+            hot.id,
+            candidate_tg_id=tg_id,
+            candidate_fio=f"Кандидат {tg_id}",
+            candidate_tz="Europe/Moscow",
+            candidate_city_id=city.id,
+            expected_recruiter_id=recruiter.id,
+            expected_city_id=city.id,
+        )
+
+    results = await asyncio.gather(*(attempt(8400 + idx) for idx in range(8)))
+    winners = [res for res in results if res.status == "reserved"]
+    assert len(winners) == 1
+    losers = [res for res in results if res.status != "reserved"]
+    assert {res.status for res in losers} == {"slot_taken"}
+    assert all([slot.id for slot in res.alternatives] == [spare.id] for res in losers)
+
+    async with async_session() as session:
+        stored = await session.get(models.Slot, hot.id)
+        assert stored is not None
+        assert stored.status == models.SlotStatus.PENDING
+        assert stored.candidate_tg_id == winners[0].slot.candidate_tg_id
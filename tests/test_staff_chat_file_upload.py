@@ -71,3 +71,166 @@ def test_staff_chat_allows_file_only_message(monkeypatch):
     assert isinstance(payload.get("attachments"), list)
     assert len(payload["attachments"]) == 1
 
+
+def _first_thread_id(client: TestClient) -> int:
+    threads = client.get("/api/staff/threads").json().get("threads") or []
+    assert threads, "Expected at least one default staff thread"
+    return threads[0]["id"]
+
+
+def test_staff_chat_attachment_dedup_etag_and_range(monkeypatch, tmp_path):
+    _configure_env(monkeypatch)
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    settings_module.get_settings.cache_clear()
+
+    from backend.apps.admin_ui import app as app_module
+    from backend.core.db import init_models
+
+    monkeypatch.setattr(app_module, "setup_bot_state", _fake_setup_bot_state)
+    app = app_module.create_app()
+    asyncio.run(init_models())
+
+    body = b"0123456789" * 1000
+    with TestClient(app) as client:
+        thread_id = _first_thread_id(client)
+        first = client.post(
+            f"/api/staff/threads/{thread_id}/messages",
+            files={"files": ("a.txt", body, "text/plain")},
+        )
+        second = client.post(
+            f"/api/staff/threads/{thread_id}/messages",
+            files={"files": ("b.txt", body, "text/plain")},
+        )
+        assert first.status_code == 200, first.text
+        assert second.status_code == 200, second.text
+        attachment_id = first.json()["attachments"][0]["id"]
+
+        full = client.get(f"/api/staff/attachments/{attachment_id}")
+        assert full.status_code == 200
+        assert full.content == body
+        etag = full.headers["etag"]
+        assert full.headers["accept-ranges"] == "bytes"
+
+        cached = client.get(
+            f"/api/staff/attachments/{attachment_id}",
+            headers={"If-None-Match": etag},
+        )
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+        partial = client.get(
+            f"/api/staff/attachments/{attachment_id}",
+            headers={"Range": "bytes=10-19", "If-Range": etag},
+        )
+        assert partial.status_code == 206
+        assert partial.content == body[10:20]
+
+    data_dir = tmp_path
+    blobs = [p for p in (data_dir / "staff_uploads" / "blobs").rglob("*") if p.is_file()]
+    assert len(blobs) == 1
+    assert not any((data_dir / "staff_uploads" / "tmp").iterdir())
+
+
+def test_staff_chat_rejects_oversized_upload_without_leftovers(monkeypatch, tmp_path):
+    _configure_env(monkeypatch)
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    settings_module.get_settings.cache_clear()
+
+    from backend.apps.admin_ui import app as app_module
+    from backend.apps.admin_ui.services import staff_chat
+    from backend.core.db import init_models
+
+    monkeypatch.setattr(app_module, "setup_bot_state", _fake_setup_bot_state)
+    monkeypatch.setattr(staff_chat, "MAX_ATTACHMENT_SIZE_MB", 1)
+    monkeypatch.setattr(staff_chat, "ATTACHMENT_CHUNK_SIZE", 64 * 1024)
+    app = app_module.create_app()
+    asyncio.run(init_models())
+
+    with TestClient(app) as client:
+        thread_id = _first_thread_id(client)
+        resp = client.post(
+            f"/api/staff/threads/{thread_id}/messages",
+            files={"files": ("big.txt", b"x" * (1024 * 1024 + 1), "text/plain")},
+        )
+
+    assert resp.status_code == 413, resp.text
+    data_dir = tmp_path
+    leftovers = [p for p in (data_dir / "staff_uploads").rglob("*") if p.is_file()]
+    assert leftovers == []
+
+
+def test_failed_message_keeps_shared_blobs_until_orphan_sweep(monkeypatch, tmp_path):
+    _configure_env(monkeypatch)
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    settings_module.get_settings.cache_clear()
+
+    from datetime import timedelta
+
+    from backend.apps.admin_ui import app as app_module
+    from backend.apps.admin_ui.services import staff_chat
+    from backend.core.db import init_models
+
+    monkeypatch.setattr(app_module, "setup_bot_state", _fake_setup_bot_state)
+    monkeypatch.setattr(staff_chat, "MAX_ATTACHMENT_SIZE_MB", 1)
+    monkeypatch.setattr(staff_chat, "ATTACHMENT_CHUNK_SIZE", 64 * 1024)
+    app = app_module.create_app()
+    asyncio.run(init_models())
+
+    blob_root = tmp_path / "staff_uploads" / "blobs"
+    with TestClient(app) as client:
+        thread_id = _first_thread_id(client)
+        failed = client.post(
+            f"/api/staff/threads/{thread_id}/messages",
+            files=[
+                ("files", ("small.txt", b"shared", "text/plain")),
+                ("files", ("big.txt", b"x" * (1024 * 1024 + 1), "text/plain")),
+            ],
+        )
+        assert failed.status_code == 413, failed.text
+        # The same bytes committed by another message must stay readable.
+        shared = client.post(
+            f"/api/staff/threads/{thread_id}/messages",
+            files={"files": ("again.txt", b"shared", "text/plain")},
+        )
+        assert shared.status_code == 200, shared.text
+        orphan = client.post(
+            f"/api/staff/threads/{thread_id}/messages",
+            files=[
+                ("files", ("orphan.txt", b"orphan", "text/plain")),
+                ("files", ("big.txt", b"x" * (1024 * 1024 + 1), "text/plain")),
+            ],
+        )
+        assert orphan.status_code == 413, orphan.text
+        assert len([p for p in blob_root.rglob("*") if p.is_file()]) == 2
+
+        # Fresh blobs are inside the grace window and survive the sweep.
+        assert asyncio.run(staff_chat.sweep_orphan_attachment_blobs()) == 0
+        assert asyncio.run(staff_chat.sweep_orphan_attachment_blobs(grace=timedelta(seconds=-60))) == 1
+
+        attachment_id = shared.json()["attachments"][0]["id"]
+        download = client.get(f"/api/staff/attachments/{attachment_id}")
+        assert download.status_code == 200
+        assert download.content == b"shared"
+
+    assert len([p for p in blob_root.rglob("*") if p.is_file()]) == 1
+    assert not any((tmp_path / "staff_uploads" / "tmp").iterdir())
+
+
+def test_copy_upload_to_disk_aborts_after_limit(tmp_path):
+    import io
+
+    from backend.apps.admin_ui.services import staff_chat
+
+    class _CountingReader(io.BytesIO):
+        reads = 0
+
+        def read(self, size=-1):
+            type(self).reads += 1
+            return super().read(size)
+
+    source = _CountingReader(b"y" * (staff_chat.ATTACHMENT_CHUNK_SIZE * 10))
+    with pytest.raises(OverflowError):
+        staff_chat._copy_upload_to_disk(
+            source, tmp_path / "out.part", staff_chat.ATTACHMENT_CHUNK_SIZE
+        )
+    assert _CountingReader.reads == 2
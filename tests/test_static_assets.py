@@ -0,0 +1,132 @@
+import gzip
+import os
+from pathlib import Path
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.routing import Mount, Route
+
+from backend.apps.admin_ui.static_assets import (
+    IMMUTABLE_CACHE_CONTROL,
+    PrecompressedStaticFiles,
+    ZeroCopyFileResponse,
+    accepted_encodings,
+    spa_file_response,
+)
+
+BUNDLE = ("export const value = 42;\n" * 400).encode()
+
+
+def _dist(tmp_path: Path) -> Path:
+    assets = tmp_path / "assets"
+    assets.mkdir()
+    bundle = assets / "index-Bx3kP9aZ.js"
+    bundle.write_bytes(BUNDLE)
+    (assets / "index-Bx3kP9aZ.js.gz").write_bytes(gzip.compress(BUNDLE))
+    # Not a real brotli stream; the server must pass variants through untouched.
+    (assets / "index-Bx3kP9aZ.js.br").write_bytes(b"br-bytes")
+    (tmp_path / "index.html").write_text("<!doctype html><div id=root></div>", encoding="utf-8")
+    return tmp_path
+
+
+def _client(dist: Path) -> httpx.AsyncClient:
+    async def index(request: Request):
+        return spa_file_response(request, dist / "index.html", revalidate=True)
+
+    app = Starlette(
+        routes=[
+            Route("/app", index),
+            Mount("/assets", PrecompressedStaticFiles(directory=str(dist / "assets"), immutable_hashed=True)),
+        ]
+    )
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def test_accepted_encodings_respects_quality_values() -> None:
+    assert accepted_encodings("gzip, deflate, br") == ["br", "gzip"]
+    assert accepted_encodings("br;q=0, gzip;q=0.5") == ["gzip"]
+    assert accepted_encodings("*") == ["br", "gzip"]
+    assert accepted_encodings("identity") == []
+
+
+@pytest.mark.asyncio
+async def test_precompressed_variant_is_chosen_by_accept_encoding(tmp_path: Path) -> None:
+    dist = _dist(tmp_path)
+    async with _client(dist) as client:
+        # Headers only: httpx would try to decode the fake brotli body.
+        async with client.stream(
+            "GET", "/assets/index-Bx3kP9aZ.js", headers={"accept-encoding": "identity, br"}
+        ) as brotli:
+            pass
+        assert brotli.headers["content-encoding"] == "br"
+        assert brotli.headers["content-length"] == str(len(b"br-bytes"))
+        assert brotli.headers["content-type"].startswith("text/javascript")
+        assert brotli.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert brotli.headers["vary"] == "Accept-Encoding"
+
+        gzipped = await client.get("/assets/index-Bx3kP9aZ.js", headers={"accept-encoding": "gzip"})
+        assert gzipped.headers["content-encoding"] == "gzip"
+        assert gzipped.content == BUNDLE
+
+        plain = await client.get("/assets/index-Bx3kP9aZ.js", headers={"accept-encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert plain.content == BUNDLE
+
+        # Representations differ, so must their validators.
+        assert len({brotli.headers["etag"], gzipped.headers["etag"], plain.headers["etag"]}) == 3
+
+        source = dist / "assets" / "index-Bx3kP9aZ.js"
+        os.utime(source, (source.stat().st_atime, source.stat().st_mtime + 60))
+        stale = await client.get("/assets/index-Bx3kP9aZ.js", headers={"accept-encoding": "br"})
+        assert "content-encoding" not in stale.headers
+        assert stale.content == BUNDLE
+
+
+@pytest.mark.asyncio
+async def test_index_html_revalidates_with_strong_etag(tmp_path: Path) -> None:
+    dist = _dist(tmp_path)
+    async with _client(dist) as client:
+        first = await client.get("/app")
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "no-cache"
+        assert not etag.startswith("W/")
+
+        cached = await client.get("/app", headers={"if-none-match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+        index = dist / "index.html"
+        index.write_text("<!doctype html><div id=app></div>", encoding="utf-8")
+        os.utime(index, (index.stat().st_atime, index.stat().st_mtime + 5))
+        changed = await client.get("/app", headers={"if-none-match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_zerocopysend_is_used_for_ranges_when_server_supports_it(tmp_path: Path) -> None:
+    path = _dist(tmp_path) / "assets" / "index-Bx3kP9aZ.js"
+    response = ZeroCopyFileResponse(path)
+    messages: list[dict] = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.zerocopysend":
+            message = {**message, "data": os.pread(message["file"], message["count"], message["offset"])}
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/assets/index-Bx3kP9aZ.js",
+        "headers": [(b"range", b"bytes=10-19")],
+        "extensions": {"http.response.zerocopysend": {}},
+    }
+    await response(scope, receive, send)
+    assert messages[0]["status"] == 206
+    assert messages[1]["type"] == "http.response.zerocopysend"
+    assert messages[1]["data"] == BUNDLE[10:20]
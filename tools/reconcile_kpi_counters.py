@@ -0,0 +1,83 @@
+"""Management script to check materialized weekly KPI counters against a full recomputation."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from datetime import date, timedelta
+
+from backend.apps.admin_ui.services.kpi_counters import (
+    ensure_counters_materialized,
+    reconcile_kpi_counters,
+)
+from backend.apps.admin_ui.services.kpis import get_week_window, reset_weekly_cache
+from backend.core.bootstrap import ensure_database_ready
+from backend.domain.kpi_counters import counter_timezones
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Reconcile weekly KPI counters")
+    parser.add_argument(
+        "--weeks",
+        type=int,
+        default=2,
+        help="Количество недель для проверки, включая текущую (по умолчанию текущая и прошлая)",
+    )
+    parser.add_argument(
+        "--timezone",
+        type=str,
+        default=None,
+        help="Проверить только указанную таймзону (по умолчанию все материализованные)",
+    )
+    parser.add_argument(
+        "--week",
+        type=str,
+        default=None,
+        help="Проверить только указанную неделю (формат YYYY-MM-DD, воскресенье)",
+    )
+    parser.add_argument(
+        "--fix",
+        action="store_true",
+        help="Пересобрать счётчики недель, в которых найдены расхождения",
+    )
+
+    args = parser.parse_args()
+
+    await ensure_database_ready()
+    await ensure_counters_materialized()
+
+    timezones = [args.timezone] if args.timezone else list(counter_timezones())
+    mismatched = 0
+    for tz_name in timezones:
+        if args.week:
+            try:
+                week_starts = [date.fromisoformat(args.week)]
+            except ValueError as exc:  # pragma: no cover - defensive
+                raise SystemExit(f"Некорректная дата недели: {args.week}") from exc
+        else:
+            base_start = get_week_window(tz_name=tz_name).week_start_date
+            week_starts = [base_start - timedelta(weeks=offset) for offset in range(max(1, args.weeks))]
+        for week_start in week_starts:
+            report = await reconcile_kpi_counters(week_start, tz_name=tz_name, fix=args.fix)
+            if not report.ok and not report.fixed:
+                mismatched += 1
+            print(
+                json.dumps(
+                    {
+                        "tz": report.tz,
+                        "week_start": report.week_start.isoformat(),
+                        "ok": report.ok,
+                        "fixed": report.fixed,
+                        "mismatches": report.mismatches,
+                    },
+                    ensure_ascii=False,
+                )
+            )
+
+    await reset_weekly_cache()
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))